@@ -29,6 +29,7 @@ import json
 # Migration SQL - Phase 4.2
 from services.goals.data_provider import GoalsDataProvider
 from services.data.normalizer import DataNormalizer
+from quantum_core.data.dna_store import load_section
 
 DATA_DIR = Path('/home/Mon_ps/data')
 
@@ -682,8 +683,8 @@ class AttackDataLoaderV6:
         print("\n📊 [3/4] Chargement teams_context_dna.json...")
         
         path = DATA_DIR / 'quantum_v2/teams_context_dna.json'
-        with open(path) as f:
-            self.context_dna = json.load(f)
+        # Store mmap partagé entre workers si converti (dna_store), sinon JSON
+        self.context_dna = load_section(path)
             
         print(f"   ✅ {len(self.context_dna)} équipes")
         
@@ -5,13 +5,14 @@
 
 import json
 import logging
-import math
 import statistics
 from pathlib import Path
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 from enum import Enum
 
+from quantum_core.probability.score_engine import poisson_over
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -172,8 +173,7 @@ class SetPieceFeatureEngineer:
                 'total_expected': round(total_expected, 2), 'home_corner_edge': round(home_expected - away_expected, 2), 'edges': edges}
     
     def _prob_over_poisson(self, expected: float, line: float) -> float:
-        prob_under = sum((expected ** k) * math.exp(-expected) / math.factorial(k) for k in range(int(line) + 1))
-        return 1 - prob_under
+        return float(poisson_over(expected, line))
 
 class SetPieceSignalGenerator:
     CORNER_OVER_THRESHOLD = 60
@@ -89,10 +89,12 @@ _generator = None
 
 
 def get_generator() -> DNANarrativeGenerator:
-    """Get or create the generator singleton."""
+    """Get or create the generator singleton (recharge si les donnees ont change)."""
     global _generator
     if _generator is None:
         _generator = DNANarrativeGenerator()
+    else:
+        _generator.refresh()
     return _generator
 
 
@@ -340,11 +342,9 @@ async def search_teams(
 
     try:
         results = []
+        profiles = generator.generate_all_profiles()["profiles"]
 
-        for team_key in generator.teams.keys():
-            profile = generator.generate_profile(team_key)
-            if not profile:
-                continue
+        for team_key, profile in profiles.items():
 
             axes_raw = profile.get("axes", {})
 
@@ -423,8 +423,9 @@ async def list_all_teams():
     generator = get_generator()
 
     teams_list = []
-    for team_key in sorted(generator.teams.keys()):
-        profile = generator.generate_profile(team_key)
+    profiles = generator.generate_all_profiles()["profiles"]
+    for team_key in sorted(profiles):
+        profile = profiles[team_key]
         if profile:
             teams_list.append({
                 "team": profile.get("team", team_key),
@@ -47,6 +47,12 @@ from decimal import Decimal
 from collections import defaultdict
 import statistics
 
+# Moteur de scores partagé: /quantum_core (Docker) ou /home/Mon_ps/quantum_core (local)
+for _root in ('/', '/home/Mon_ps'):
+    if os.path.isdir(os.path.join(_root, 'quantum_core')) and _root not in sys.path:
+        sys.path.append(_root)
+from quantum_core.probability.score_engine import ScoreDistribution, score_matrix
+
 
 def safe_float(value, default: float = 0.0) -> float:
     """
@@ -629,12 +635,6 @@ class AgentBTTSCalculatorV2:
     # MODULE 2: CALCULS STATISTIQUES (POISSON + DIXON-COLES)
     # ==========================================================================
     
-    def _poisson_probability(self, lmbda: float, k: int) -> float:
-        """Calcule P(X = k) pour une distribution de Poisson"""
-        if lmbda <= 0:
-            return 1.0 if k == 0 else 0.0
-        return (math.exp(-lmbda) * (lmbda ** k)) / math.factorial(k)
-    
     def _calculate_expected_goals(self, 
                                    attack_strength: float,
                                    defense_weakness: float,
@@ -650,79 +650,27 @@ class AgentBTTSCalculatorV2:
         
         return xg
     
-    def _apply_dixon_coles_adjustment(self, 
-                                       prob_matrix: Dict[Tuple[int, int], float]) -> Dict[Tuple[int, int], float]:
-        """
-        Applique la correction Dixon-Coles pour les scores bas
-        Le 0-0 et 1-1 sont souvent mal estimés par Poisson simple
-        """
-        rho = self.DIXON_COLES['rho']
-        
-        adjusted = prob_matrix.copy()
-        
-        # Ajustement 0-0 (augmenté car sous-estimé)
-        if (0, 0) in adjusted:
-            adjusted[(0, 0)] *= self.DIXON_COLES['tau_00']
-        
-        # Ajustement 0-1 et 1-0
-        if (0, 1) in adjusted:
-            adjusted[(0, 1)] *= self.DIXON_COLES['tau_01']
-        if (1, 0) in adjusted:
-            adjusted[(1, 0)] *= self.DIXON_COLES['tau_10']
-        
-        # Ajustement 1-1 (légèrement réduit)
-        if (1, 1) in adjusted:
-            adjusted[(1, 1)] *= self.DIXON_COLES['tau_11']
-        
-        # Renormaliser
-        total = sum(adjusted.values())
-        if total > 0:
-            adjusted = {k: v/total for k, v in adjusted.items()}
-        
-        return adjusted
-    
     def _calculate_score_probabilities(self,
                                         home_xg: float,
                                         away_xg: float,
-                                        max_goals: int = 6) -> Dict[Tuple[int, int], float]:
+                                        max_goals: int = 6) -> ScoreDistribution:
         """
         Calcule la matrice de probabilités des scores
-        Utilise Poisson puis Dixon-Coles
+        Utilise Poisson puis Dixon-Coles (multiplicateurs tau fixes, renormalisé)
         """
-        prob_matrix = {}
-        
-        for home_goals in range(max_goals + 1):
-            for away_goals in range(max_goals + 1):
-                prob_home = self._poisson_probability(home_xg, home_goals)
-                prob_away = self._poisson_probability(away_xg, away_goals)
-                prob_matrix[(home_goals, away_goals)] = prob_home * prob_away
-        
-        # Appliquer Dixon-Coles
-        prob_matrix = self._apply_dixon_coles_adjustment(prob_matrix)
-        
-        return prob_matrix
+        tau = [
+            [self.DIXON_COLES['tau_00'], self.DIXON_COLES['tau_01']],
+            [self.DIXON_COLES['tau_10'], self.DIXON_COLES['tau_11']],
+        ]
+        return score_matrix(home_xg, away_xg, max_goals=max_goals, tau=tau)
     
     def _calculate_btts_from_matrix(self, 
-                                     prob_matrix: Dict[Tuple[int, int], float]) -> Tuple[float, float]:
+                                     prob_matrix: ScoreDistribution) -> Tuple[float, float]:
         """
         Calcule P(BTTS YES) et P(BTTS NO) depuis la matrice de scores
         """
-        btts_yes = 0.0
-        btts_no = 0.0
-        
-        for (home, away), prob in prob_matrix.items():
-            if home > 0 and away > 0:
-                btts_yes += prob
-            else:
-                btts_no += prob
-        
-        # Normaliser
-        total = btts_yes + btts_no
-        if total > 0:
-            btts_yes /= total
-            btts_no /= total
-        
-        return btts_yes, btts_no
+        btts_yes = prob_matrix.btts_yes()
+        return btts_yes, 1.0 - btts_yes
 
     # ==========================================================================
     # MODULE 3: FACTEURS CONTEXTUELS
@@ -909,8 +857,8 @@ class AgentBTTSCalculatorV2:
             away_xg = away_xg * 0.4 + away_profile.xg_for_avg * 0.6  # V2.1: Poids inversés
         
         # 4. Calculer la matrice de scores (Poisson + Dixon-Coles)
-        score_matrix = self._calculate_score_probabilities(home_xg, away_xg)
-        stat_btts_yes, stat_btts_no = self._calculate_btts_from_matrix(score_matrix)
+        scores = self._calculate_score_probabilities(home_xg, away_xg)
+        stat_btts_yes, stat_btts_no = self._calculate_btts_from_matrix(scores)
         
         # 5. Appliquer régression vers la moyenne
         home_btts_regressed = self._apply_regression_to_mean(
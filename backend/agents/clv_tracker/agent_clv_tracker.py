@@ -17,6 +17,12 @@ import json
 import logging
 import os
 
+# Calibration en ligne (comme settlement_service)
+try:
+    from agents.clv_tracker import calibration_monitor
+except ImportError:
+    import calibration_monitor
+
 # Configuration
 DB_CONFIG = {
     'host': os.getenv('DB_HOST', 'localhost'),
@@ -287,6 +293,7 @@ class AgentCLVTracker:
         resolved = 0
         wins = 0
         losses = 0
+        settled = []
         
         for pick in pending:
             # Chercher le résultat
@@ -351,6 +358,7 @@ class AgentCLVTracker:
                     score_home = %s, score_away = %s, resolved_at = NOW()
                 WHERE id = %s
             """, (is_winner, profit, home, away, pick['id']))
+            settled.append((pick['id'], is_winner))
             
             resolved += 1
             if is_winner:
@@ -358,6 +366,7 @@ class AgentCLVTracker:
             else:
                 losses += 1
         
+        calibration_monitor.record_resolved(cur, settled)
         conn.commit()
         self.stats['resolved'] += resolved
         
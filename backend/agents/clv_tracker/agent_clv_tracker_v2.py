@@ -22,6 +22,12 @@ import os
 from typing import Optional, Dict, List, Tuple
 from collections import defaultdict
 
+# Calibration en ligne (comme settlement_service)
+try:
+    from agents.clv_tracker import calibration_monitor
+except ImportError:
+    import calibration_monitor
+
 # Configuration
 DB_CONFIG = {
     'host': os.getenv('DB_HOST', 'localhost'),
@@ -367,6 +373,7 @@ class AgentCLVTrackerV2:
             picks_by_match[pick['match_id']].append(pick)
         
         results = {'resolved': 0, 'wins': 0, 'losses': 0, 'pushes': 0}
+        settled = []
         
         for match_id, picks in picks_by_match.items():
             # Récupérer le résultat du match
@@ -412,9 +419,11 @@ class AgentCLVTrackerV2:
                         score_home = %s, score_away = %s, resolved_at = NOW()
                     WHERE id = %s
                 """, (is_winner, profit, home, away, pick['id']))
+                settled.append((pick['id'], is_winner))
                 
                 results['resolved'] += 1
         
+        calibration_monitor.record_resolved(cur, settled)
         conn.commit()
         cur.close()
         self.stats['resolved'] += results['resolved']
@@ -34,6 +34,16 @@ from enum import Enum
 # Note: MarketType n'est pas utilisé activement dans ce fichier mais importé pour cohérence
 from quantum.models.market_registry import MarketType
 
+# Agrégats journaliers lus par les dashboards + règlement partagé + calibration en ligne
+try:
+    from agents.clv_tracker import calibration_monitor
+    from agents.clv_tracker.clv_aggregates import refresh_today
+    from agents.clv_tracker.settlement_service import run_once as run_settlement
+except ImportError:
+    import calibration_monitor
+    from clv_aggregates import refresh_today
+    from settlement_service import run_once as run_settlement
+
 # Configuration
 DB_CONFIG = {
     'host': os.getenv('DB_HOST', 'localhost'),
@@ -92,23 +102,6 @@ class AgentCLVTrackerV3:
     
     VERSION = "3.0"
     
-    # Résolution des marchés
-    MARKET_RESOLVERS = {
-        'btts_yes': lambda h, a, o: h > 0 and a > 0,
-        'btts_no': lambda h, a, o: h == 0 or a == 0,
-        'over15': lambda h, a, o: (h + a) > 1,
-        'under15': lambda h, a, o: (h + a) < 2,
-        'over25': lambda h, a, o: (h + a) > 2,
-        'under25': lambda h, a, o: (h + a) < 3,
-        'over35': lambda h, a, o: (h + a) > 3,
-        'under35': lambda h, a, o: (h + a) < 4,
-        'dc_1x': lambda h, a, o: o in ('home', 'draw'),
-        'dc_x2': lambda h, a, o: o in ('draw', 'away'),
-        'dc_12': lambda h, a, o: o in ('home', 'away'),
-        'dnb_home': lambda h, a, o: o == 'home' if o != 'draw' else None,
-        'dnb_away': lambda h, a, o: o == 'away' if o != 'draw' else None,
-    }
-    
     def __init__(self, dry_run: bool = False):
         self.dry_run = dry_run
         self.conn = None
@@ -444,6 +437,8 @@ class AgentCLVTrackerV3:
             except Exception as e:
                 logger.warning(f"Erreur insert {pick.market_type}: {e}")
         
+        if created:
+            refresh_today(cur)
         conn.commit()
         cur.close()
         
@@ -456,85 +451,74 @@ class AgentCLVTrackerV3:
     
     def resolve_pending(self) -> dict:
         """
-        Résout les picks en attente
-        Optimisé: une seule requête pour récupérer tous les résultats
+        Résout les picks en attente via le settlement service
+        (match_results finis → picks, paris et combos en une transaction)
         """
-        conn = self.get_db()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        summary = run_settlement(self.get_db(), dry_run=self.dry_run).summary()
         
-        # Récupérer picks non résolus avec résultats disponibles (JOIN)
-        cur.execute("""
-            SELECT 
-                p.id, p.match_id, p.market_type, p.odds_taken, p.stake, p.diamond_score,
-                r.score_home, r.score_away, r.outcome
-            FROM tracking_clv_picks p
-            JOIN match_results r ON p.match_id = r.match_id
-            WHERE p.is_resolved = false 
-            AND r.is_finished = true
-        """)
-        
-        to_resolve = cur.fetchall()
-        
-        if not to_resolve:
+        if not summary['resolved']:
             logger.info("✅ Aucun pick à résoudre")
-            return {'resolved': 0, 'wins': 0, 'losses': 0, 'pushes': 0}
-        
-        logger.info(f"🔄 {len(to_resolve)} picks à résoudre")
         
-        results = {'resolved': 0, 'wins': 0, 'losses': 0, 'pushes': 0}
-        updates = []
-        
-        for pick in to_resolve:
-            market = pick['market_type']
-            resolver = self.MARKET_RESOLVERS.get(market)
-            
-            if not resolver:
-                continue
-            
-            home = pick['score_home']
-            away = pick['score_away']
-            outcome = pick['outcome']
-            
-            is_winner = resolver(home, away, outcome)
-            
-            # Calculer profit/loss
-            stake = self._safe_float(pick['stake'], 1)
-            odds = self._safe_float(pick['odds_taken'], 1)
-            
-            if is_winner is None:  # Push
-                profit = 0
-                results['pushes'] += 1
-            elif is_winner:
-                profit = stake * (odds - 1)
-                results['wins'] += 1
-            else:
-                profit = -stake
-                results['losses'] += 1
-            
-            updates.append((is_winner, profit, home, away, pick['id']))
-            results['resolved'] += 1
-        
-        # Mise à jour batch
-        if updates and not self.dry_run:
-            cur.executemany("""
-                UPDATE tracking_clv_picks
-                SET is_resolved = true, is_winner = %s, profit_loss = %s,
-                    score_home = %s, score_away = %s, resolved_at = NOW()
-                WHERE id = %s
-            """, updates)
-            conn.commit()
+        self.stats['picks_resolved'] += summary['resolved']
         
-        cur.close()
-        self.stats['picks_resolved'] += results['resolved']
-        
-        return results
+        return {k: summary[k] for k in ('resolved', 'wins', 'losses', 'pushes')}
     
     # ============================================================
     # PHASE 4: ANALYSE AVANCÉE
     # ============================================================
     
+    def _calibration_states(self) -> dict:
+        """États du calibration_monitor (mis à jour au règlement), {} si jamais alimenté"""
+        conn = self.get_db()
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        states = calibration_monitor.load_states(cur)
+        cur.close()
+        conn.commit()
+        return states
+    
     def analyze_calibration(self, days: int = 30) -> dict:
-        """Analyse de calibration avec ECE"""
+        """
+        Analyse de calibration avec ECE, lue dans le calibration_monitor
+        (fenêtre à décroissance la plus proche de `days`). Requête SQL sur
+        la fenêtre si le monitor n'a pas encore d'état.
+        """
+        state = self._calibration_states().get((calibration_monitor.ALL, calibration_monitor.ALL))
+        if state is None:
+            return self._analyze_calibration_sql(days)
+        
+        summary = calibration_monitor.summarize(state, calibration_monitor.window_for(days))
+        buckets = [b for b in summary['buckets'] if b['samples'] >= 3]
+        if not buckets:
+            return {'ece': 0, 'status': 'insufficient_data', 'buckets': []}
+        
+        total = sum(b['samples'] for b in buckets)
+        ece = sum(b['samples'] / total * abs(b['gap']) for b in buckets)
+        
+        calibration_data = [
+            {
+                'range': b['range'],
+                'predicted': b['predicted'],
+                'actual': b['actual'],
+                'gap': b['gap'],
+                'samples': round(b['samples'], 1),
+                'status': '✅' if abs(b['gap']) < 10 else '📈' if b['gap'] > 0 else '📉'
+            }
+            for b in buckets
+        ]
+        
+        status = "🎯 Excellente" if ece < 5 else "✅ Bonne" if ece < 10 else "⚠️ À améliorer"
+        
+        return {
+            'ece': round(ece, 2),
+            'status': status,
+            'buckets': calibration_data,
+            'brier': summary['brier'],
+            'log_loss': summary['log_loss'],
+            'window': summary['window']
+        }
+    
+    def _analyze_calibration_sql(self, days: int = 30) -> dict:
+        """Analyse de calibration avec ECE (GROUP BY sur la fenêtre)"""
         conn = self.get_db()
         cur = conn.cursor(cursor_factory=RealDictCursor)
         
@@ -625,7 +609,59 @@ class AgentCLVTrackerV3:
         ]
     
     def detect_weaknesses(self, days: int = 30) -> List[dict]:
-        """Détecte les faiblesses du modèle"""
+        """
+        Détecte les faiblesses du modèle depuis le calibration_monitor:
+        marchés sous-performants, surconfiance (score >= 70) et dérives en
+        cours. Requêtes SQL sur la fenêtre si le monitor n'a pas encore d'état.
+        """
+        states = self._calibration_states()
+        overall = states.get((calibration_monitor.ALL, calibration_monitor.ALL))
+        if overall is None:
+            return self._detect_weaknesses_sql(days)
+        
+        weaknesses = []
+        window = calibration_monitor.window_for(days)
+        
+        # Marchés sous-performants
+        for (market, source), state in sorted(states.items()):
+            if market == calibration_monitor.ALL or source != calibration_monitor.ALL:
+                continue
+            m = calibration_monitor.summarize(state, window)
+            if m['samples'] >= 10 and m['win_rate'] < 40:
+                weaknesses.append({
+                    'type': '🎯 Marché sous-performant',
+                    'detail': f"{market}: {round(m['win_rate'], 1)}% WR (score moyen: {round(m['avg_predicted'], 1)})",
+                    'action': f"Réduire les scores de {market} de 10-15%",
+                    'severity': 'high'
+                })
+        
+        # Overconfidence: buckets 70+
+        high_conf = [b for b in calibration_monitor.summarize(overall, window)['buckets'] if b['bucket'] >= 70]
+        total = sum(b['samples'] for b in high_conf)
+        if total >= 20:
+            wr = sum(b['actual'] * b['samples'] for b in high_conf) / total
+            if wr < 60:
+                weaknesses.append({
+                    'type': '📊 Surconfiance détectée',
+                    'detail': f"Score >= 70: {round(wr, 1)}% WR au lieu de ~70% attendu",
+                    'action': "Réduire tous les scores de 5-10%",
+                    'severity': 'high'
+                })
+        
+        # Dérives fenêtre courte vs longue
+        for (market, source), state in sorted(states.items()):
+            for a in calibration_monitor.drift_alerts(state):
+                weaknesses.append({
+                    'type': '📉 Dérive de calibration',
+                    'detail': f"{market}/{source} {a['metric']}: {a['short']} récent vs {a['long']} de fond",
+                    'action': "Vérifier les features récentes et recalibrer les scores",
+                    'severity': a['severity']
+                })
+        
+        return weaknesses
+    
+    def _detect_weaknesses_sql(self, days: int = 30) -> List[dict]:
+        """Détecte les faiblesses du modèle (requêtes SQL sur la fenêtre)"""
         weaknesses = []
         conn = self.get_db()
         cur = conn.cursor(cursor_factory=RealDictCursor)
@@ -18,10 +18,14 @@ from decimal import Decimal
 import json
 import logging
 import os
-import math
+import sys
 from typing import Dict, List, Tuple
 from dataclasses import dataclass
 
+sys.path.insert(0, '/home/Mon_ps')
+from quantum_core.probability.score_engine import score_matrix
+from quantum_core.probability.team_ratings import load_match_results, walk_forward_lambdas
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s | %(levelname)-8s | %(message)s',
@@ -42,29 +46,12 @@ DB_CONFIG = {
 # CALCULS (identiques à V4 PRO)
 # ============================================================
 
-def poisson_prob(lam: float, k: int) -> float:
-    if lam <= 0:
-        return 1.0 if k == 0 else 0.0
-    try:
-        return (math.exp(-lam) * (lam ** k)) / math.factorial(k)
-    except:
-        return 0.0
-
-
 def calculate_probabilities(home_xg: float, away_xg: float) -> Dict[str, float]:
-    max_goals = 8
-    matrix = {}
-    for h in range(max_goals):
-        for a in range(max_goals):
-            matrix[(h, a)] = poisson_prob(home_xg, h) * poisson_prob(away_xg, a)
-    
-    home_win = sum(p for (h, a), p in matrix.items() if h > a)
-    draw = sum(p for (h, a), p in matrix.items() if h == a)
-    away_win = sum(p for (h, a), p in matrix.items() if h < a)
-    btts_yes = sum(p for (h, a), p in matrix.items() if h > 0 and a > 0)
-    over_15 = sum(p for (h, a), p in matrix.items() if h + a > 1)
-    over_25 = sum(p for (h, a), p in matrix.items() if h + a > 2)
-    over_35 = sum(p for (h, a), p in matrix.items() if h + a > 3)
+    # Poisson indépendant 0-7 buts, non renormalisé (identique à V4 PRO)
+    scores = score_matrix(home_xg, away_xg, max_goals=7, normalize=False)
+    home_win, draw, away_win = scores.home_win(), scores.draw(), scores.away_win()
+    btts_yes = scores.btts_yes()
+    over_15, over_25, over_35 = scores.over(1.5), scores.over(2.5), scores.over(3.5)
     
     return {
         'home': home_win, 'draw': draw, 'away': away_win,
@@ -127,9 +114,10 @@ RESOLVERS = {
 class BacktestEngine:
     """Moteur de backtest scientifique"""
     
-    def __init__(self, min_score: int = 50, save_to_db: bool = True):
+    def __init__(self, min_score: int = 50, save_to_db: bool = True, use_ratings: bool = False):
         self.min_score = min_score
         self.save_to_db = save_to_db
+        self.use_ratings = use_ratings
         self.conn = None
         self.team_cache = {}
         self.results = {
@@ -272,6 +260,22 @@ class BacktestEngine:
         except:
             return {}
     
+    def get_rating_lambdas(self) -> Dict[Tuple[str, str, str], Tuple[float, float]]:
+        """
+        Lambdas Dixon-Coles point-in-time de tous les matchs terminés.
+
+        Un seul chargement + refits walk-forward warm-startés (aucun look-ahead),
+        indexés par (home, away, jour).
+        """
+        matches = load_match_results(self.get_db())
+        lambda_home, lambda_away = walk_forward_lambdas(matches)
+        day = matches.days.astype('datetime64[D]').astype(str)
+        return {
+            (matches.teams[h], matches.teams[a], d): (lh, la)
+            for h, a, d, lh, la in zip(matches.home_idx, matches.away_idx, day, lambda_home, lambda_away)
+            if lh == lh
+        }
+
     def run_backtest(self, limit: int = None) -> Dict:
         """Exécute le backtest complet"""
         conn = self.get_db()
@@ -302,6 +306,10 @@ class BacktestEngine:
         
         logger.info(f"📊 {len(matches)} matchs avec cotes disponibles")
         
+        rating_lambdas = self.get_rating_lambdas() if self.use_ratings else {}
+        if self.use_ratings:
+            logger.info(f"📐 Ratings walk-forward: {len(rating_lambdas)} matchs couverts")
+        
         backtest_picks = []
         
         for match in matches:
@@ -325,6 +333,11 @@ class BacktestEngine:
                 home_xg = max(0.5, min(3.5, home_xg))
                 away_xg = max(0.3, min(3.0, away_xg))
                 
+                # Ratings ajustés disponibles: remplacent l'heuristique
+                key = (match['home_team'], match['away_team'], match['commence_time'].date().isoformat())
+                if key in rating_lambdas:
+                    home_xg, away_xg = rating_lambdas[key]
+                
                 # Probabilités
                 probs = calculate_probabilities(home_xg, away_xg)
                 
@@ -526,11 +539,13 @@ def main():
     parser.add_argument('--min-score', type=int, default=50, help='Score minimum')
     parser.add_argument('--limit', type=int, default=None, help='Limite de matchs')
     parser.add_argument('--no-save', action='store_true', help='Ne pas sauvegarder en DB')
+    parser.add_argument('--ratings', action='store_true', help='xG issus des ratings Dixon-Coles walk-forward')
     args = parser.parse_args()
     
     engine = BacktestEngine(
         min_score=args.min_score,
-        save_to_db=not args.no_save
+        save_to_db=not args.no_save,
+        use_ratings=args.ratings
     )
     
     results = engine.run_backtest(limit=args.limit)
@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+"""
+🎯 CALIBRATION MONITOR - Calibration et dérive en ligne des picks résolus
+
+Problème:
+- AgentCLVTrackerV3.analyze_calibration / detect_weaknesses refaisaient
+  les buckets de calibration (GROUP BY FLOOR(diamond_score / 10)) sur toute
+  la fenêtre de lookback à chaque appel, et rien ne surveillait la dérive
+
+Solution:
+- Statistiques suffisantes en flux, par marché × source (agent), avec
+  décroissance exponentielle: poids exp(-âge / tau) pour deux fenêtres
+  (short: tau = 7 jours, long: tau = 30 jours). Une fenêtre de tau jours
+  pèse autant que tau jours de picks récents.
+- Par fenêtre: poids, victoires, probas prédites, Brier, log-loss, CLV
+  (somme + carrés) et courbe de fiabilité en 10 buckets de diamond_score
+- Mise à jour dans la transaction du settlement_service, pick par pick,
+  en O(1) par clé: (marché, source), (marché, *), (*, source), (*, *).
+  Les autres resolvers (smart_resolver...) passent par record_resolved
+- CLV: la closing n'est souvent écrite qu'après le règlement
+  (clv_calculator, après resolve dans cron_v7_master). Un pick réglé sans
+  closing compte pour la calibration; son CLV est ajouté à part
+  (observation CLV seule) quand clv_calculator écrit la closing
+- Une ligne JSONB compacte par clé (tracking_calibration_state): la lecture
+  de la calibration courante est un accès par clé primaire
+- Alertes quand la fenêtre courte s'écarte de la longue (Brier, CLV) ou
+  que sa calibration dépasse le seuil; NOTIFY calibration_drift
+
+La proba prédite est diamond_score / 100, comme les anciens buckets SQL.
+Les push (is_winner NULL) ne comptent pas.
+
+Usage:
+    python3 calibration_monitor.py --rebuild             # rejoue tout l'historique résolu
+    python3 calibration_monitor.py                       # calibration globale courante
+    python3 calibration_monitor.py --market over_25 --source agent_clv_v3
+    python3 calibration_monitor.py --alerts              # dérives en cours
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import psycopg2
+from psycopg2.extras import RealDictCursor, execute_values
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)s | %(message)s')
+logger = logging.getLogger('CalibrationMonitor')
+
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'port': 5432,
+    'database': 'monps_db',
+    'user': 'monps_user',
+    'password': os.getenv('DB_PASSWORD', 'monps_secure_password_2024')
+}
+
+STATE_TABLE = "tracking_calibration_state"
+DRIFT_CHANNEL = "calibration_drift"
+
+# Clé joker: toutes sources / tous marchés
+ALL = '*'
+
+# Fenêtres de décroissance: nom → tau en jours (poids exp(-âge / tau))
+WINDOWS = {'short': 7.0, 'long': 30.0}
+DAY_SECONDS = 86400.0
+
+# Buckets de diamond_score (0-9, 10-19, ..., 90-100)
+N_BUCKETS = 10
+
+# Proba bornée pour le log-loss (diamond_score 0 ou 100)
+PROB_EPS = 0.01
+
+# Seuils d'alerte (fenêtre courte vs longue)
+MIN_DRIFT_SAMPLES = 20.0    # poids effectif minimal de la fenêtre courte
+BRIER_DRIFT = 0.03          # Brier court - Brier long
+MAX_CALIBRATION_GAP = 10.0  # ECE de la fenêtre courte, en points de %
+CLV_DRIFT = 2.0             # CLV moyen long - CLV moyen court, en points de %
+
+SCHEMA_SQL = f"""
+    CREATE TABLE IF NOT EXISTS {STATE_TABLE} (
+        market_type TEXT NOT NULL,
+        source TEXT NOT NULL,
+        state JSONB NOT NULL,
+        updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        PRIMARY KEY (market_type, source)
+    );
+"""
+
+UPSERT_SQL = f"""
+    INSERT INTO {STATE_TABLE} (market_type, source, state, updated_at)
+    VALUES %s
+    ON CONFLICT (market_type, source)
+    DO UPDATE SET state = EXCLUDED.state, updated_at = EXCLUDED.updated_at
+"""
+UPSERT_TEMPLATE = "(%s, %s, %s::jsonb, NOW())"
+
+# CLV standard des dashboards: (odds_taken / closing_odds - 1) * 100
+_CLV = "(odds_taken / closing_odds - 1) * 100"
+
+HISTORY_SQL = f"""
+    SELECT market_type, source, diamond_score, is_winner,
+           CASE WHEN closing_odds > 0 THEN {_CLV} END AS clv,
+           EXTRACT(EPOCH FROM COALESCE(resolved_at, created_at)) AS at
+    FROM tracking_clv_picks
+    WHERE is_resolved = true AND is_winner IS NOT NULL AND diamond_score IS NOT NULL
+    ORDER BY COALESCE(resolved_at, created_at)
+"""
+
+RESOLVED_PICKS_SQL = """
+    SELECT id, market_type, source, diamond_score, odds_taken, closing_odds
+    FROM tracking_clv_picks
+    WHERE id = ANY(%s)
+"""
+
+_schema_ready = False
+_schema_txid: Optional[int] = None
+
+
+def _fetch_value(cur, column: str):
+    row = cur.fetchone()
+    if row is None:
+        return None
+    return row[column] if isinstance(row, dict) else row[0]
+
+
+def ensure_schema(cur) -> None:
+    """
+    Crée la table d'état si besoin. Le flag n'est posé qu'après le commit de
+    la transaction qui a créé la table (txid_status), pas avant: sur rollback,
+    le prochain appel relance le CREATE.
+    """
+    global _schema_ready, _schema_txid
+    if _schema_ready:
+        return
+    if _schema_txid is not None:
+        cur.execute("SELECT txid_status(%s) AS status", (_schema_txid,))
+        if _fetch_value(cur, 'status') == 'committed':
+            _schema_ready = True
+            return
+    cur.execute(SCHEMA_SQL)
+    cur.execute("SELECT txid_current() AS txid")
+    _schema_txid = _fetch_value(cur, 'txid')
+
+
+# ============================================================
+# STATISTIQUES EN FLUX (pur, sans DB)
+# ============================================================
+
+@dataclass
+class Observation:
+    """
+    Un pick résolu: proba prédite (0-1), issue, CLV en % (None si pas de closing).
+    won=None: CLV seul, pour un pick déjà compté au règlement (clv_observations).
+    """
+    market_type: str
+    source: str
+    probability: float
+    won: Optional[bool]
+    clv: Optional[float] = None
+
+    @property
+    def bucket(self) -> int:
+        return min(int(self.probability * N_BUCKETS), N_BUCKETS - 1)
+
+
+@dataclass
+class WindowStats:
+    """Sommes pondérées (décroissance exponentielle) d'une fenêtre."""
+    weight: float = 0.0
+    wins: float = 0.0
+    predicted: float = 0.0
+    brier: float = 0.0
+    log_loss: float = 0.0
+    clv_weight: float = 0.0
+    clv_sum: float = 0.0
+    clv_sq: float = 0.0
+    bucket_weight: List[float] = field(default_factory=lambda: [0.0] * N_BUCKETS)
+    bucket_predicted: List[float] = field(default_factory=lambda: [0.0] * N_BUCKETS)
+    bucket_wins: List[float] = field(default_factory=lambda: [0.0] * N_BUCKETS)
+
+    SCALARS = ('weight', 'wins', 'predicted', 'brier', 'log_loss', 'clv_weight', 'clv_sum', 'clv_sq')
+    BUCKETS = ('bucket_weight', 'bucket_predicted', 'bucket_wins')
+
+    def scale(self, factor: float) -> None:
+        for name in self.SCALARS:
+            setattr(self, name, getattr(self, name) * factor)
+        for name in self.BUCKETS:
+            setattr(self, name, [v * factor for v in getattr(self, name)])
+
+    def add(self, obs: Observation, weight: float = 1.0) -> None:
+        if obs.clv is not None:
+            self.clv_weight += weight
+            self.clv_sum += weight * obs.clv
+            self.clv_sq += weight * obs.clv ** 2
+        if obs.won is None:
+            return
+        p = min(max(obs.probability, PROB_EPS), 1 - PROB_EPS)
+        y = 1.0 if obs.won else 0.0
+        self.weight += weight
+        self.wins += weight * y
+        self.predicted += weight * obs.probability
+        self.brier += weight * (obs.probability - y) ** 2
+        self.log_loss -= weight * (y * math.log(p) + (1 - y) * math.log(1 - p))
+        b = obs.bucket
+        self.bucket_weight[b] += weight
+        self.bucket_predicted[b] += weight * obs.probability
+        self.bucket_wins[b] += weight * y
+
+    def to_list(self) -> List[float]:
+        values = [getattr(self, name) for name in self.SCALARS]
+        for name in self.BUCKETS:
+            values += getattr(self, name)
+        return [round(v, 6) for v in values]
+
+    @classmethod
+    def from_list(cls, values: Sequence[float]) -> "WindowStats":
+        n = len(cls.SCALARS)
+        stats = cls(*values[:n])
+        for i, name in enumerate(cls.BUCKETS):
+            start = n + i * N_BUCKETS
+            setattr(stats, name, list(values[start:start + N_BUCKETS]))
+        return stats
+
+
+@dataclass
+class CalibrationState:
+    """État d'une clé (marché, source): une WindowStats par fenêtre, ramenée à `updated_at`."""
+    market_type: str
+    source: str
+    updated_at: float = 0.0
+    picks: int = 0
+    windows: Dict[str, WindowStats] = field(default_factory=lambda: {w: WindowStats() for w in WINDOWS})
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.market_type, self.source)
+
+    def update(self, obs: Observation, at: float) -> None:
+        """
+        Ajoute un pick résolu à l'instant `at` (epoch). Un pick plus ancien
+        que l'état est pondéré par son âge au lieu de faire reculer l'état:
+        l'ordre d'arrivée ne change pas le résultat.
+        """
+        for name, tau in WINDOWS.items():
+            stats = self.windows[name]
+            if at >= self.updated_at:
+                stats.scale(math.exp(-(at - self.updated_at) / (tau * DAY_SECONDS)))
+                stats.add(obs)
+            else:
+                stats.add(obs, math.exp(-(self.updated_at - at) / (tau * DAY_SECONDS)))
+        self.updated_at = max(self.updated_at, at)
+        if obs.won is not None:
+            self.picks += 1
+
+    def to_json(self) -> str:
+        return json.dumps({
+            't': self.updated_at,
+            'n': self.picks,
+            'w': {name: stats.to_list() for name, stats in self.windows.items()},
+        }, separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, market_type: str, source: str, payload) -> "CalibrationState":
+        data = json.loads(payload) if isinstance(payload, str) else payload
+        windows = {w: WindowStats() for w in WINDOWS}
+        windows.update({name: WindowStats.from_list(v) for name, v in data['w'].items() if name in WINDOWS})
+        return cls(market_type, source, data['t'], data['n'], windows)
+
+
+def state_keys(obs: Observation) -> List[Tuple[str, str]]:
+    """Clés mises à jour par un pick: détail, par marché, par source, global."""
+    return [(obs.market_type, obs.source), (obs.market_type, ALL), (ALL, obs.source), (ALL, ALL)]
+
+
+def apply(states: Dict[Tuple[str, str], CalibrationState], observations: Iterable[Tuple[Observation, float]]) -> set:
+    """Ajoute les (observation, instant) aux états (créés au besoin). Retourne les clés touchées."""
+    touched = set()
+    for obs, at in observations:
+        for key in state_keys(obs):
+            if key not in states:
+                states[key] = CalibrationState(*key)
+            states[key].update(obs, at)
+            touched.add(key)
+    return touched
+
+
+def window_for(days: int) -> str:
+    """Fenêtre dont le tau est le plus proche d'un lookback en jours."""
+    return min(WINDOWS, key=lambda name: abs(WINDOWS[name] - days))
+
+
+def _ratio(num: float, den: float, scale: float = 1, digits: int = 4) -> Optional[float]:
+    if den <= 0:
+        return None
+    return round(num / den * scale, digits)
+
+
+def summarize(state: CalibrationState, window: str = 'long', at: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Métriques d'une fenêtre (probas et taux en %). `samples` est le poids
+    effectif ramené à `at` (défaut: maintenant): une clé inactive perd ses
+    échantillons, les ratios ne changent pas.
+    """
+    stats = state.windows[window]
+    at = time.time() if at is None else at
+    decay = math.exp(-max(at - state.updated_at, 0) / (WINDOWS[window] * DAY_SECONDS))
+
+    buckets = []
+    for b in range(N_BUCKETS):
+        weight = stats.bucket_weight[b]
+        if weight <= 0:
+            continue
+        predicted = stats.bucket_predicted[b] / weight * 100
+        actual = stats.bucket_wins[b] / weight * 100
+        buckets.append({
+            'bucket': b * 10,
+            'range': f"{b * 10}-{b * 10 + 10}%",
+            'predicted': round(predicted, 1),
+            'actual': round(actual, 1),
+            'gap': round(predicted - actual, 1),
+            'samples': round(weight * decay, 2),
+        })
+
+    ece = sum(abs(stats.bucket_predicted[b] - stats.bucket_wins[b]) for b in range(N_BUCKETS))
+    clv_mean = _ratio(stats.clv_sum, stats.clv_weight, 1, 3)
+    clv_std = None
+    if clv_mean is not None:
+        variance = stats.clv_sq / stats.clv_weight - (stats.clv_sum / stats.clv_weight) ** 2
+        clv_std = round(math.sqrt(max(variance, 0.0)), 3)
+
+    return {
+        'market_type': state.market_type,
+        'source': state.source,
+        'window': window,
+        'tau_days': WINDOWS[window],
+        'picks': state.picks,
+        'samples': round(stats.weight * decay, 2),
+        'win_rate': _ratio(stats.wins, stats.weight, 100, 2),
+        'avg_predicted': _ratio(stats.predicted, stats.weight, 100, 2),
+        'brier': _ratio(stats.brier, stats.weight),
+        'log_loss': _ratio(stats.log_loss, stats.weight),
+        'ece': _ratio(ece, stats.weight, 100, 2),
+        'avg_clv': clv_mean,
+        'clv_std': clv_std,
+        'clv_samples': round(stats.clv_weight * decay, 2),
+        'buckets': buckets,
+        'updated_at': datetime.fromtimestamp(state.updated_at).isoformat() if state.updated_at else None,
+    }
+
+
+def drift_alerts(state: CalibrationState, at: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Dérives de la fenêtre courte (vs longue) au-delà des seuils."""
+    short = summarize(state, 'short', at)
+    long = summarize(state, 'long', at)
+    if short['samples'] < MIN_DRIFT_SAMPLES:
+        return []
+
+    alerts = []
+
+    def alert(metric, short_value, long_value, threshold, severity):
+        alerts.append({
+            'market_type': state.market_type,
+            'source': state.source,
+            'metric': metric,
+            'short': short_value,
+            'long': long_value,
+            'threshold': threshold,
+            'samples': short['samples'],
+            'severity': severity,
+        })
+
+    brier_drift = short['brier'] - long['brier']
+    if brier_drift > BRIER_DRIFT:
+        alert('brier', short['brier'], long['brier'], BRIER_DRIFT,
+              'high' if brier_drift > 2 * BRIER_DRIFT else 'medium')
+
+    if short['ece'] > MAX_CALIBRATION_GAP:
+        alert('ece', short['ece'], long['ece'], MAX_CALIBRATION_GAP,
+              'high' if short['ece'] > 2 * MAX_CALIBRATION_GAP else 'medium')
+
+    if short['avg_clv'] is not None and long['avg_clv'] is not None and short['clv_samples'] >= MIN_DRIFT_SAMPLES:
+        clv_drop = long['avg_clv'] - short['avg_clv']
+        if clv_drop > CLV_DRIFT:
+            alert('clv', short['avg_clv'], long['avg_clv'], CLV_DRIFT,
+                  'high' if clv_drop > 2 * CLV_DRIFT else 'medium')
+
+    return alerts
+
+
+def observations(picks: Iterable[Dict], updates: Iterable[Tuple]) -> List[Observation]:
+    """
+    Lignes tracking_clv_picks (id, market_type, source, diamond_score,
+    odds_taken, closing_odds) + tuples du règlement (id, is_winner, ...)
+    → observations. Push et picks sans diamond_score ignorés.
+    """
+    by_id = {pick['id']: pick for pick in picks}
+    result = []
+    for pick_id, is_winner, *_ in updates:
+        pick = by_id.get(pick_id)
+        if pick is None or is_winner is None or pick.get('diamond_score') is None:
+            continue
+        odds, closing = pick.get('odds_taken'), pick.get('closing_odds')
+        clv = (float(odds) / float(closing) - 1) * 100 if odds and closing and float(closing) > 0 else None
+        result.append(Observation(
+            market_type=pick.get('market_type') or 'unknown',
+            source=pick.get('source') or 'unknown',
+            probability=float(pick['diamond_score']) / 100,
+            won=bool(is_winner),
+            clv=clv,
+        ))
+    return result
+
+
+def clv_observations(rows: Iterable[Dict]) -> List[Observation]:
+    """
+    Picks déjà résolus dont la closing vient d'être écrite (market_type,
+    source, diamond_score, is_winner, clv) → observations CLV seules.
+    Mêmes picks que observations(): push et sans diamond_score ignorés.
+    """
+    return [
+        Observation(
+            market_type=row.get('market_type') or 'unknown',
+            source=row.get('source') or 'unknown',
+            probability=float(row['diamond_score']) / 100,
+            won=None,
+            clv=float(row['clv']),
+        )
+        for row in rows
+        if row.get('is_winner') is not None and row.get('diamond_score') is not None and row.get('clv') is not None
+    ]
+
+
+# ============================================================
+# PERSISTANCE
+# ============================================================
+
+def _load(cur, keys: Sequence[Tuple[str, str]]) -> Dict[Tuple[str, str], CalibrationState]:
+    cur.execute(f"""
+        SELECT s.market_type, s.source, s.state
+        FROM {STATE_TABLE} s
+        JOIN unnest(%s::text[], %s::text[]) AS k(market_type, source)
+        ON s.market_type = k.market_type AND s.source = k.source
+    """, ([k[0] for k in keys], [k[1] for k in keys]))
+    return {
+        (row['market_type'], row['source']): CalibrationState.from_json(row['market_type'], row['source'], row['state'])
+        for row in cur.fetchall()
+    }
+
+
+def _save(cur, states: Iterable[CalibrationState]) -> None:
+    rows = [(s.market_type, s.source, s.to_json()) for s in states]
+    if rows:
+        execute_values(cur, UPSERT_SQL, rows, template=UPSERT_TEMPLATE)
+
+
+def record(cur, observed: Sequence[Observation], at: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Ajoute des picks résolus aux états persistés. À appeler dans la
+    transaction du règlement (cursor RealDictCursor), avant le commit.
+    Retourne les alertes de dérive des clés touchées (aussi en NOTIFY).
+    """
+    if not observed:
+        return []
+    at = time.time() if at is None else at
+
+    ensure_schema(cur)
+    # Sérialise les mises à jour concurrentes (plusieurs workers de settlement)
+    cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (STATE_TABLE,))
+    keys = sorted({key for obs in observed for key in state_keys(obs)})
+    states = _load(cur, keys)
+    touched = apply(states, ((obs, at) for obs in observed))
+    _save(cur, (states[key] for key in sorted(touched)))
+
+    alerts = [a for key in sorted(touched) for a in drift_alerts(states[key], at)]
+    if alerts:
+        for a in alerts:
+            logger.warning(f"📉 Dérive {a['metric']} {a['market_type']}/{a['source']}: {a['short']} vs {a['long']}")
+        cur.execute("SELECT pg_notify(%s, %s)", (DRIFT_CHANNEL, json.dumps(alerts[:20])))
+    return alerts
+
+
+def record_resolved(cur, settled: Sequence[Tuple]) -> List[Dict[str, Any]]:
+    """
+    record() pour les resolvers hors settlement_service (smart_resolver,
+    resolve_safe, resolve_by_teams, agent_clv_tracker v1/v2): relit les
+    picks réglés (id, is_winner, ...) dans la même transaction, avant le commit.
+    """
+    if not settled:
+        return []
+    with cur.connection.cursor(cursor_factory=RealDictCursor) as dict_cur:
+        dict_cur.execute(RESOLVED_PICKS_SQL, ([row[0] for row in settled],))
+        return record(dict_cur, observations(dict_cur.fetchall(), settled))
+
+
+def rebuild(cur) -> int:
+    """Rejoue tous les picks résolus dans l'ordre de résolution. Retourne le nombre de picks."""
+    cur.execute(HISTORY_SQL)
+    rows = cur.fetchall()
+    states: Dict[Tuple[str, str], CalibrationState] = {}
+    apply(states, (
+        (Observation(
+            market_type=row['market_type'] or 'unknown',
+            source=row['source'] or 'unknown',
+            probability=float(row['diamond_score']) / 100,
+            won=bool(row['is_winner']),
+            clv=None if row['clv'] is None else float(row['clv']),
+        ), float(row['at']))
+        for row in rows
+    ))
+
+    ensure_schema(cur)
+    cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (STATE_TABLE,))
+    cur.execute(f"DELETE FROM {STATE_TABLE}")
+    _save(cur, states.values())
+    return len(rows)
+
+
+# ============================================================
+# LECTURE
+# ============================================================
+
+def load_state(cur, market_type: str = ALL, source: str = ALL) -> Optional[CalibrationState]:
+    """État courant d'une clé (lecture par clé primaire), None si jamais alimenté."""
+    ensure_schema(cur)
+    return _load(cur, [(market_type, source)]).get((market_type, source))
+
+
+def load_states(cur) -> Dict[Tuple[str, str], CalibrationState]:
+    """Tous les états (une ligne par marché × source, plus les agrégats *)."""
+    ensure_schema(cur)
+    cur.execute(f"SELECT market_type, source, state FROM {STATE_TABLE}")
+    return {
+        (row['market_type'], row['source']): CalibrationState.from_json(row['market_type'], row['source'], row['state'])
+        for row in cur.fetchall()
+    }
+
+
+def current_calibration(cur, market_type: str = ALL, source: str = ALL, window: str = 'long') -> Optional[Dict[str, Any]]:
+    """Calibration courante d'une clé + ses alertes, None si aucun pick résolu."""
+    state = load_state(cur, market_type, source)
+    if state is None:
+        return None
+    return {**summarize(state, window), 'alerts': drift_alerts(state)}
+
+
+def current_alerts(cur) -> List[Dict[str, Any]]:
+    """Dérives en cours sur toutes les clés."""
+    return [a for key, state in sorted(load_states(cur).items()) for a in drift_alerts(state)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibration et dérive en ligne des picks résolus")
+    parser.add_argument('--rebuild', action='store_true', help="Rejouer tout l'historique résolu")
+    parser.add_argument('--market', default=ALL, help="Marché (défaut: tous)")
+    parser.add_argument('--source', default=ALL, help="Source / agent (défaut: toutes)")
+    parser.add_argument('--window', choices=sorted(WINDOWS), default='long')
+    parser.add_argument('--alerts', action='store_true', help="Lister les dérives en cours")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            if args.rebuild:
+                logger.info(f"✅ {rebuild(cur)} picks rejoués")
+            if args.alerts:
+                output = current_alerts(cur)
+            else:
+                output = current_calibration(cur, args.market, args.source, args.window)
+        conn.commit()
+    finally:
+        conn.close()
+    print(json.dumps(output, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+📊 CLV AGGREGATES - Agrégats journaliers de tracking_clv_picks
+
+Problème:
+- Les dashboards (command-center, combos, tracking-clv, pro performance)
+  recalculaient win rate / ROI / CLV avec des GROUP BY sur TOUTE la table
+  tracking_clv_picks à chaque requête → coût proportionnel à l'historique
+
+Solution:
+- Table tracking_clv_daily_agg: sommes (pas de moyennes) par
+  jour × marché × source (agent) × ligue × tier de score
+- Un jour est recalculé entièrement (DELETE + INSERT ... GROUP BY sur les
+  picks de CE jour) quand un de ses picks change: création, résolution
+  (AgentCLVTrackerV3.resolve_pending, SmartResolver), closing odds.
+  Idempotent, coût borné par le volume d'une journée.
+- Les routes lisent uniquement les agrégats via rollup(): quelques milliers
+  de lignes au plus quelle que soit la taille de l'historique
+
+La ligue est gardée telle quelle: un regroupement par tier de ligue se
+dérive à la lecture. Le tier de score reprend les buckets des dashboards.
+
+Usage:
+    python3 clv_aggregates.py --rebuild          # (re)construit tout l'historique
+    python3 clv_aggregates.py --days 3           # rattrapage: picks créés ou résolus ces 3 derniers jours (cron)
+"""
+import argparse
+import logging
+import os
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)s | %(message)s')
+logger = logging.getLogger('CLV_Aggregates')
+
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'port': 5432,
+    'database': 'monps_db',
+    'user': 'monps_user',
+    'password': os.getenv('DB_PASSWORD', 'monps_secure_password_2024')
+}
+
+AGG_TABLE = "tracking_clv_daily_agg"
+
+# Clé de l'agrégat (colonnes autorisées pour rollup(by=...) et les filtres)
+KEY_COLUMNS = ('day', 'market_type', 'source', 'league', 'score_tier')
+
+# Sommes additives: toute métrique se recompose à partir d'elles
+SUM_COLUMNS = (
+    'picks', 'resolved', 'wins', 'losses',
+    'profit', 'staked',
+    'score_sum', 'score_n',
+    'odds_sum', 'odds_n',
+    'clv_sum', 'clv_n', 'clv_positive',
+    'clv_win_sum', 'clv_win_n', 'clv_loss_sum', 'clv_loss_n',
+    'clv_pct_sum', 'clv_pct_n',
+    'kelly_sum', 'kelly_n',
+)
+
+SCHEMA_SQL = f"""
+    CREATE TABLE IF NOT EXISTS {AGG_TABLE} (
+        day DATE NOT NULL,
+        market_type TEXT NOT NULL,
+        source TEXT NOT NULL,
+        league TEXT NOT NULL,
+        score_tier TEXT NOT NULL,
+        picks INTEGER NOT NULL DEFAULT 0,
+        resolved INTEGER NOT NULL DEFAULT 0,
+        wins INTEGER NOT NULL DEFAULT 0,
+        losses INTEGER NOT NULL DEFAULT 0,
+        profit NUMERIC NOT NULL DEFAULT 0,
+        staked NUMERIC NOT NULL DEFAULT 0,
+        score_sum NUMERIC NOT NULL DEFAULT 0,
+        score_n INTEGER NOT NULL DEFAULT 0,
+        odds_sum NUMERIC NOT NULL DEFAULT 0,
+        odds_n INTEGER NOT NULL DEFAULT 0,
+        clv_sum NUMERIC NOT NULL DEFAULT 0,
+        clv_n INTEGER NOT NULL DEFAULT 0,
+        clv_positive INTEGER NOT NULL DEFAULT 0,
+        clv_win_sum NUMERIC NOT NULL DEFAULT 0,
+        clv_win_n INTEGER NOT NULL DEFAULT 0,
+        clv_loss_sum NUMERIC NOT NULL DEFAULT 0,
+        clv_loss_n INTEGER NOT NULL DEFAULT 0,
+        clv_pct_sum NUMERIC NOT NULL DEFAULT 0,
+        clv_pct_n INTEGER NOT NULL DEFAULT 0,
+        kelly_sum NUMERIC NOT NULL DEFAULT 0,
+        kelly_n INTEGER NOT NULL DEFAULT 0,
+        refreshed_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        PRIMARY KEY (day, market_type, source, league, score_tier)
+    );
+    CREATE INDEX IF NOT EXISTS idx_{AGG_TABLE}_market ON {AGG_TABLE} (market_type, day);
+"""
+
+# CLV standard des dashboards: (odds_taken / closing_odds - 1) * 100
+_CLV = "(odds_taken / closing_odds - 1) * 100"
+
+# Recalcule les groupes des jours donnés à partir des picks de ces jours uniquement
+REFRESH_SQL = f"""
+    INSERT INTO {AGG_TABLE} (
+        day, market_type, source, league, score_tier,
+        {', '.join(SUM_COLUMNS)}, refreshed_at
+    )
+    SELECT
+        created_at::date,
+        COALESCE(market_type, 'unknown'),
+        COALESCE(source, 'unknown'),
+        COALESCE(league, 'unknown'),
+        CASE
+            WHEN diamond_score >= 90 THEN 'ELITE 90+'
+            WHEN diamond_score >= 80 THEN 'DIAMOND 80+'
+            WHEN diamond_score >= 70 THEN 'STRONG 70+'
+            ELSE 'STANDARD'
+        END,
+        COUNT(*),
+        COUNT(*) FILTER (WHERE is_resolved = true),
+        COUNT(*) FILTER (WHERE is_resolved = true AND is_winner = true),
+        COUNT(*) FILTER (WHERE is_resolved = true AND is_winner = false),
+        COALESCE(SUM(profit_loss), 0),
+        COALESCE(SUM(COALESCE(stake, 1)) FILTER (WHERE is_resolved = true), 0),
+        COALESCE(SUM(diamond_score), 0),
+        COUNT(diamond_score),
+        COALESCE(SUM(odds_taken), 0),
+        COUNT(odds_taken),
+        COALESCE(SUM({_CLV}) FILTER (WHERE closing_odds > 0), 0),
+        COUNT(*) FILTER (WHERE closing_odds > 0),
+        COUNT(*) FILTER (WHERE closing_odds > 0 AND odds_taken > closing_odds),
+        COALESCE(SUM({_CLV}) FILTER (WHERE closing_odds > 0 AND is_winner = true), 0),
+        COUNT(*) FILTER (WHERE closing_odds > 0 AND is_winner = true),
+        COALESCE(SUM({_CLV}) FILTER (WHERE closing_odds > 0 AND is_winner = false), 0),
+        COUNT(*) FILTER (WHERE closing_odds > 0 AND is_winner = false),
+        COALESCE(SUM(clv_percentage), 0),
+        COUNT(clv_percentage),
+        COALESCE(SUM(kelly_pct), 0),
+        COUNT(kelly_pct),
+        NOW()
+    FROM tracking_clv_picks
+    WHERE created_at >= %(start)s AND created_at < %(end)s
+    AND created_at::date = ANY(%(days)s::date[])
+    GROUP BY 1, 2, 3, 4, 5
+"""
+
+_schema_ready = False
+# Transaction qui a exécuté SCHEMA_SQL, tant que son commit n'a pas été constaté
+_schema_txid: Optional[int] = None
+
+
+def _fetch_value(cur, column: str):
+    row = cur.fetchone()
+    if row is None:
+        return None
+    return row[column] if isinstance(row, dict) else row[0]
+
+
+def ensure_schema(cur) -> None:
+    """
+    Crée la table d'agrégats si besoin. Le DDL part dans la transaction de
+    l'appelant: le flag process n'est levé qu'une fois le commit de cette
+    transaction constaté (txid_status). Après un rollback, le DDL est rejoué.
+    """
+    global _schema_ready, _schema_txid
+    if _schema_ready:
+        return
+    if _schema_txid is not None:
+        cur.execute("SELECT txid_status(%s) AS status", (_schema_txid,))
+        if _fetch_value(cur, 'status') == 'committed':
+            _schema_ready = True
+            return
+    cur.execute(SCHEMA_SQL)
+    cur.execute("SELECT txid_current() AS txid")
+    _schema_txid = _fetch_value(cur, 'txid')
+
+
+def _as_date(value) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def refresh_days(cur, days: Iterable) -> int:
+    """
+    Recalcule les agrégats des jours donnés (dates ou datetimes de created_at).
+    À appeler dans la transaction qui a modifié les picks, avant le commit.
+    Retourne le nombre de jours recalculés.
+    """
+    days = sorted({_as_date(d) for d in days if d is not None})
+    if not days:
+        return 0
+
+    ensure_schema(cur)
+    # Sérialise les recalculs concurrents (resolver + tracker sur le même jour)
+    cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (AGG_TABLE,))
+    cur.execute(f"DELETE FROM {AGG_TABLE} WHERE day = ANY(%s::date[])", (days,))
+    cur.execute(REFRESH_SQL, {
+        'start': days[0],
+        'end': days[-1] + timedelta(days=1),
+        'days': days,
+    })
+    return len(days)
+
+
+def _days(cur) -> List[date]:
+    return [row['day'] if isinstance(row, dict) else row[0] for row in cur.fetchall()]
+
+
+def refresh_today(cur) -> int:
+    """Recalcule le jour courant de la DB (picks insérés avec created_at = NOW())."""
+    cur.execute("SELECT CURRENT_DATE AS day")
+    return refresh_days(cur, _days(cur))
+
+
+def rebuild(cur, since: Optional[date] = None) -> int:
+    """
+    Recalcule tous les jours présents dans tracking_clv_picks (depuis `since`).
+
+    Avec `since`, les jours de création des picks résolus depuis `since` sont
+    repris aussi: une résolution tardive par un writer sans hook (pick créé
+    avant la fenêtre) atteint ainsi les agrégats au rattrapage suivant.
+    """
+    if since is None:
+        cur.execute("SELECT DISTINCT created_at::date AS day FROM tracking_clv_picks WHERE created_at IS NOT NULL")
+    else:
+        cur.execute(
+            "SELECT DISTINCT created_at::date AS day FROM tracking_clv_picks "
+            "WHERE created_at >= %(since)s OR (resolved_at >= %(since)s AND created_at IS NOT NULL)",
+            {'since': since},
+        )
+    days = _days(cur)
+
+    ensure_schema(cur)
+    if since is None:
+        cur.execute(f"DELETE FROM {AGG_TABLE}")
+    else:
+        cur.execute(f"DELETE FROM {AGG_TABLE} WHERE day >= %s", (since,))
+    return refresh_days(cur, days)
+
+
+# ============================================================
+# LECTURE
+# ============================================================
+
+def _number(value) -> float:
+    if value is None:
+        return 0
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _ratio(num, den, scale: float = 1, digits: int = 2) -> Optional[float]:
+    """num / den * scale arrondi, None sans échantillon (comme NULLIF en SQL)."""
+    if not den:
+        return None
+    return round(num / den * scale, digits)
+
+
+def summarize(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Sommes d'un groupe → métriques des dashboards (None si pas d'échantillon)."""
+    out = {k: row[k] for k in KEY_COLUMNS if k in row}
+    sums = {k: _number(row.get(k)) for k in SUM_COLUMNS}
+    out.update(sums)
+    out.update({
+        'total': sums['picks'],
+        'win_rate': _ratio(sums['wins'], sums['resolved'], 100, 1),
+        'roi_percent': _ratio(sums['profit'], sums['resolved'], 100, 2),
+        'roi_staked': _ratio(sums['profit'], sums['staked'], 100, 2),
+        'avg_profit_per_bet': _ratio(sums['profit'], sums['resolved'], 1, 3),
+        'avg_score': _ratio(sums['score_sum'], sums['score_n'], 1, 1),
+        'avg_odds': _ratio(sums['odds_sum'], sums['odds_n'], 1, 2),
+        'avg_clv': _ratio(sums['clv_sum'], sums['clv_n'], 1, 3),
+        'avg_clv_winners': _ratio(sums['clv_win_sum'], sums['clv_win_n'], 1, 3),
+        'avg_clv_losers': _ratio(sums['clv_loss_sum'], sums['clv_loss_n'], 1, 3),
+        'clv_positive_rate': _ratio(sums['clv_positive'], sums['clv_n'], 100, 1),
+        'avg_clv_pct': _ratio(sums['clv_pct_sum'], sums['clv_pct_n'], 1, 4),
+        'avg_kelly': _ratio(sums['kelly_sum'], sums['kelly_n'], 1, 4),
+    })
+    return out
+
+
+def rollup(
+    cur,
+    by: Sequence[str] = (),
+    days: Optional[int] = None,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    min_picks: int = 0,
+    min_resolved: int = 0,
+    **filters,
+) -> List[Dict[str, Any]]:
+    """
+    Agrège tracking_clv_daily_agg par les colonnes `by` et retourne une ligne
+    résumée (summarize) par groupe. Sans `by`: une seule ligne (totaux).
+
+    days: fenêtre glissante arrondie au jour (jour courant inclus)
+    since/until: bornes de jours inclusives
+    filters: égalités sur les colonnes de la clé (source='agent_clv_v3', ...)
+    """
+    unknown = (set(by) | set(filters)) - set(KEY_COLUMNS)
+    if unknown:
+        raise ValueError(f"Colonnes d'agrégat inconnues: {sorted(unknown)}")
+
+    conditions, params = [], []
+    if days is not None:
+        conditions.append("day >= CURRENT_DATE - %s::int")
+        params.append(days)
+    if since is not None:
+        conditions.append("day >= %s")
+        params.append(since)
+    if until is not None:
+        conditions.append("day <= %s")
+        params.append(until)
+    for column, value in filters.items():
+        conditions.append(f"{column} = %s")
+        params.append(value)
+
+    having = []
+    if min_picks:
+        having.append("SUM(picks) >= %s")
+        params.append(min_picks)
+    if min_resolved:
+        having.append("SUM(resolved) >= %s")
+        params.append(min_resolved)
+
+    group = ", ".join(by)
+    sql = "SELECT " + ", ".join(
+        ([group] if by else []) + [f"SUM({c}) AS {c}" for c in SUM_COLUMNS]
+    ) + f" FROM {AGG_TABLE}"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    if by:
+        sql += f" GROUP BY {group}"
+    if having:
+        sql += " HAVING " + " AND ".join(having)
+    if by:
+        sql += f" ORDER BY {group}"
+
+    cur.execute(sql, params)
+    return [summarize(row) for row in cur.fetchall()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agrégats journaliers de tracking_clv_picks")
+    parser.add_argument('--rebuild', action='store_true', help="Reconstruire tout l'historique")
+    parser.add_argument('--days', type=int, default=3, help="Jours récents à recalculer")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            if args.rebuild:
+                refreshed = rebuild(cur)
+            else:
+                refreshed = rebuild(cur, since=date.today() - timedelta(days=args.days - 1))
+        conn.commit()
+    finally:
+        conn.close()
+
+    logger.info(f"✅ {refreshed} jours recalculés dans {AGG_TABLE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,14 @@ from decimal import Decimal
 import logging
 import os
 
+# Agrégats journaliers lus par les dashboards + CLV des picks déjà réglés
+try:
+    from agents.clv_tracker import calibration_monitor
+    from agents.clv_tracker.clv_aggregates import refresh_days
+except ImportError:
+    import calibration_monitor
+    from clv_aggregates import refresh_days
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)s | %(message)s')
 logger = logging.getLogger('CLV_Calculator')
 
@@ -176,7 +184,8 @@ class CLVCalculator:
         
         # Picks avec match terminé (commence_time passé)
         cur.execute("""
-            SELECT id, match_id, market_type, odds_taken
+            SELECT id, match_id, market_type, source, diamond_score, odds_taken, created_at,
+                   is_resolved, is_winner, closing_odds IS NULL AS no_closing
             FROM tracking_clv_picks
             WHERE odds_taken > 0
             AND (clv_percentage IS NULL OR closing_odds IS NULL)
@@ -188,6 +197,9 @@ class CLVCalculator:
         
         updated = 0
         total_clv = 0
+        updated_days = set()
+        # Picks réglés sans closing: le règlement n'a pas pu compter leur CLV
+        late_clv = []
         
         for pick in picks:
             try:
@@ -218,11 +230,16 @@ class CLVCalculator:
                     
                     updated += 1
                     total_clv += clv
+                    updated_days.add(pick['created_at'])
+                    if pick['is_resolved'] and pick['no_closing']:
+                        late_clv.append({**pick, 'clv': clv})
                     
             except Exception as e:
                 logger.debug(f"CLV error for {pick['id']}: {e}")
                 self.stats['errors'] += 1
         
+        refresh_days(cur, updated_days)
+        calibration_monitor.record(cur, calibration_monitor.clv_observations(late_clv))
         conn.commit()
         cur.close()
         
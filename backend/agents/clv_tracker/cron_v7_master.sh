@@ -41,6 +41,7 @@ COLLECT_TIMEOUT=300
 RESOLVE_TIMEOUT=180
 LEARN_TIMEOUT=120
 CLV_TIMEOUT=120
+RATINGS_TIMEOUT=120
 
 # Retry configuration
 MAX_RETRIES=3
@@ -296,7 +297,9 @@ do_resolve() {
     
     cd "$BASE_DIR"
     
-    local cmd="python3 $SCRIPT_DIR/smart_resolver.py"
+    # Rattrapage de la file de settlement (le worker LISTEN règle en continu),
+    # puis matching par noms d'équipes pour les picks sans match_id exploitable
+    local cmd="python3 $SCRIPT_DIR/settlement_service.py --backfill --once && python3 $SCRIPT_DIR/smart_resolver.py"
     
     if run_with_retry "$cmd" "$RESOLVE_TIMEOUT" "Smart Resolver"; then
         # Stats résolution
@@ -304,6 +307,11 @@ do_resolve() {
             "SELECT COUNT(*) FROM tracking_clv_picks WHERE is_resolved AND resolved_at > NOW() - INTERVAL '1 hour';" 2>/dev/null | tr -d ' ')
         
         log OK "Resolved $resolved picks"
+        
+        # Nouveaux scores -> refit incrémental des ratings (warm start, toutes ligues)
+        if ! run_with_retry "python3 -m quantum_core.probability.team_ratings fit" "$RATINGS_TIMEOUT" "Team Ratings"; then
+            log WARN "Team ratings refit failed, keeping previous fit"
+        fi
         return 0
     else
         return 1
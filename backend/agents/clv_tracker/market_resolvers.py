@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+🎯 MARKET RESOLVERS - Table de résolution partagée
+
+Source unique pour tous les règlements (settlement_service, SmartResolver,
+AgentCLVTrackerV3, combos, bets): chaque marché → fonction (home, away)
+qui retourne True (gagné), False (perdu) ou None (remboursé, ex: DNB sur nul).
+
+Les anciens formats (over25, o25, btts_oui, ...) sont normalisés par
+normalize_market().
+"""
+from decimal import Decimal
+from typing import Callable, Optional
+
+MarketResolver = Callable[[int, int], Optional[bool]]
+
+MARKET_RESOLVERS = {
+    # 1X2
+    'home': lambda h, a: h > a,
+    'draw': lambda h, a: h == a,
+    'away': lambda h, a: h < a,
+    # Double chance
+    'dc_1x': lambda h, a: h >= a,
+    'dc_x2': lambda h, a: h <= a,
+    'dc_12': lambda h, a: h != a,
+    # Draw no bet: remboursé sur nul
+    'dnb_home': lambda h, a: None if h == a else h > a,
+    'dnb_away': lambda h, a: None if h == a else h < a,
+    # BTTS
+    'btts_yes': lambda h, a: h > 0 and a > 0,
+    'btts_no': lambda h, a: h == 0 or a == 0,
+    # Totaux
+    'over_15': lambda h, a: (h + a) > 1,
+    'under_15': lambda h, a: (h + a) < 2,
+    'over_25': lambda h, a: (h + a) > 2,
+    'under_25': lambda h, a: (h + a) < 3,
+    'over_35': lambda h, a: (h + a) > 3,
+    'under_35': lambda h, a: (h + a) < 4,
+}
+
+# Anciens formats → clé canonique
+MARKET_ALIASES = {
+    'over15': 'over_15', 'over25': 'over_25', 'over35': 'over_35',
+    'under15': 'under_15', 'under25': 'under_25', 'under35': 'under_35',
+    'o15': 'over_15', 'o25': 'over_25', 'o35': 'over_35',
+    'u15': 'under_15', 'u25': 'under_25', 'u35': 'under_35',
+    'over_1_5': 'over_15', 'over_2_5': 'over_25', 'over_3_5': 'over_35',
+    'under_1_5': 'under_15', 'under_2_5': 'under_25', 'under_3_5': 'under_35',
+    'btts': 'btts_yes', 'btts_oui': 'btts_yes', 'btts_non': 'btts_no',
+    '1': 'home', 'x': 'draw', '2': 'away',
+    '1x': 'dc_1x', 'x2': 'dc_x2', '12': 'dc_12',
+}
+
+
+def normalize_market(market: Optional[str]) -> str:
+    """'Over 2.5' / 'over25' / 'O25' → 'over_25'."""
+    key = (market or '').strip().lower().replace(' ', '_').replace('.', '_')
+    return MARKET_ALIASES.get(key, key)
+
+
+def market_resolver(market: Optional[str]) -> Optional[MarketResolver]:
+    """Résolveur du marché, None si le marché n'est pas supporté."""
+    return MARKET_RESOLVERS.get(normalize_market(market))
+
+
+def _float(v, default: float) -> float:
+    if v is None:
+        return default
+    if isinstance(v, Decimal):
+        return float(v)
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return default
+
+
+def settle_profit(is_winner: Optional[bool], stake, odds) -> float:
+    """P&L d'un pari simple: stake * (odds - 1), -stake, 0 si remboursé."""
+    stake = _float(stake, 1)
+    if is_winner is None:
+        return 0.0
+    if is_winner:
+        return stake * (_float(odds, 1) - 1)
+    return -stake
@@ -8,6 +8,12 @@ from psycopg2.extras import RealDictCursor
 from datetime import datetime, timedelta
 import os
 
+# Calibration en ligne (comme settlement_service)
+try:
+    from agents.clv_tracker import calibration_monitor
+except ImportError:
+    import calibration_monitor
+
 DB_CONFIG = {
     'host': os.getenv('DB_HOST', 'localhost'),
     'port': 5432,
@@ -81,6 +87,7 @@ def resolve_safe():
     print(f"🏟️ {len(matches)} matchs terminés à résoudre")
     
     resolved = 0
+    settled = []
     wins = 0
     losses = 0
     
@@ -159,9 +166,11 @@ def resolve_safe():
                     score_home = %s, score_away = %s, resolved_at = NOW()
                 WHERE id = %s
             """, (is_winner, profit, home_score, away_score, pick['id']))
+            settled.append((pick['id'], is_winner))
             
             resolved += 1
     
+    calibration_monitor.record_resolved(cur, settled)
     conn.commit()
     cur.close()
     conn.close()
@@ -0,0 +1,578 @@
+#!/usr/bin/env python3
+"""
+⚡ SETTLEMENT SERVICE - Règlement événementiel des picks, paris et combos
+
+Avant:
+- SmartResolver, AgentCLVTrackerV3.resolve_pending, /api/combos/auto-resolve,
+  auto_settlement.py et resolve_tracking_picks.py scannaient chacun les
+  lignes en attente ("commence_time < NOW() - 2 hours") à chaque cron,
+  avec leur propre table de marchés
+
+Maintenant:
+1. Un trigger sur match_results met le match dans settlement_queue et
+   envoie NOTIFY match_final dès qu'un score final arrive (peu importe le
+   script qui l'écrit)
+2. Le service (LISTEN match_final) vide la file: picks tracking_clv,
+   paris (bets) et combos (fg_combo_tracking) de ces matchs sont réglés
+   dans UNE transaction, avec la table partagée market_resolvers
+3. Événements de résolution dans la même transaction: agrégats
+   journaliers (clv_aggregates.refresh_days), calibration en ligne
+   (calibration_monitor.record) + NOTIFY picks_resolved
+
+La file est réclamée avec FOR UPDATE SKIP LOCKED: plusieurs workers
+possibles, et un échec remet les matchs dans la file (rollback).
+
+Picks à marché inconnu (absent de market_resolvers): marqués
+skip_reason = 'unknown_market' au lieu d'être remis en file à chaque
+backfill. Remettre skip_reason à NULL après ajout du marché pour les régler.
+
+Picks dont le match n'est que dans fg_match_results (pas de trigger):
+settle_fg_results() les règle en rattrapage (resolve_tracking_picks.py).
+
+Usage:
+    python3 settlement_service.py --install      # table + trigger
+    python3 settlement_service.py --backfill     # met en file les matchs finis avec du pending
+    python3 settlement_service.py --once         # vide la file puis quitte (cron)
+    python3 settlement_service.py                # worker LISTEN
+"""
+import argparse
+import json
+import logging
+import os
+import select
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import psycopg2
+from psycopg2.extras import RealDictCursor, execute_values
+
+try:
+    from agents.clv_tracker import calibration_monitor
+    from agents.clv_tracker.clv_aggregates import refresh_days
+    from agents.clv_tracker.market_resolvers import market_resolver, settle_profit
+except ImportError:
+    import calibration_monitor
+    from clv_aggregates import refresh_days
+    from market_resolvers import market_resolver, settle_profit
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)s | %(message)s')
+logger = logging.getLogger('SettlementService')
+
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'port': 5432,
+    'database': 'monps_db',
+    'user': 'monps_user',
+    'password': os.getenv('DB_PASSWORD', 'monps_secure_password_2024')
+}
+
+QUEUE_TABLE = "settlement_queue"
+MATCH_FINAL_CHANNEL = "match_final"
+RESOLVED_CHANNEL = "picks_resolved"
+
+# Matchs réglés par transaction
+BATCH_SIZE = 500
+
+# Filet de sécurité si une notification est perdue (worker redémarré...)
+POLL_SECONDS = 60
+
+# Combos sans match_id: même affiche à ±1 jour de la date prévue
+COMBO_MAX_DAYS_APART = 1
+
+SCHEMA_SQL = f"""
+    CREATE TABLE IF NOT EXISTS {QUEUE_TABLE} (
+        match_id TEXT PRIMARY KEY,
+        queued_at TIMESTAMP NOT NULL DEFAULT NOW()
+    );
+
+    ALTER TABLE tracking_clv_picks ADD COLUMN IF NOT EXISTS skip_reason TEXT;
+
+    CREATE OR REPLACE FUNCTION enqueue_match_settlement() RETURNS trigger AS $$
+    BEGIN
+        IF NOT NEW.is_finished OR NEW.score_home IS NULL OR NEW.score_away IS NULL THEN
+            RETURN NEW;
+        END IF;
+        -- Les collecteurs ré-upsertent les mêmes scores: rien à faire
+        IF TG_OP = 'UPDATE' AND OLD.is_finished
+           AND OLD.score_home IS NOT DISTINCT FROM NEW.score_home
+           AND OLD.score_away IS NOT DISTINCT FROM NEW.score_away THEN
+            RETURN NEW;
+        END IF;
+        INSERT INTO {QUEUE_TABLE} (match_id) VALUES (NEW.match_id)
+        ON CONFLICT (match_id) DO UPDATE SET queued_at = NOW();
+        PERFORM pg_notify('{MATCH_FINAL_CHANNEL}', NEW.match_id::text);
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS trg_match_results_settlement ON match_results;
+    CREATE TRIGGER trg_match_results_settlement
+        AFTER INSERT OR UPDATE OF is_finished, score_home, score_away ON match_results
+        FOR EACH ROW EXECUTE FUNCTION enqueue_match_settlement();
+"""
+
+# Matchs finis ayant encore quelque chose à régler (installation, rattrapage)
+BACKFILL_SQL = f"""
+    INSERT INTO {QUEUE_TABLE} (match_id)
+    SELECT r.match_id
+    FROM match_results r
+    WHERE r.is_finished = true
+    AND r.score_home IS NOT NULL AND r.score_away IS NOT NULL
+    AND (
+        EXISTS (
+            SELECT 1 FROM tracking_clv_picks p
+            WHERE p.match_id = r.match_id AND p.is_resolved = false AND p.skip_reason IS NULL
+        )
+        OR EXISTS (SELECT 1 FROM bets b WHERE b.match_id = r.match_id AND b.status = 'pending')
+        OR EXISTS (
+            SELECT 1 FROM fg_combo_tracking c
+            WHERE c.status = 'pending'
+            AND c.selections->>'home_team' = r.home_team
+            AND c.selections->>'away_team' = r.away_team
+        )
+    )
+    ON CONFLICT (match_id) DO NOTHING
+"""
+
+CLAIM_SQL = f"""
+    DELETE FROM {QUEUE_TABLE}
+    WHERE match_id IN (
+        SELECT match_id FROM {QUEUE_TABLE}
+        ORDER BY queued_at
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING match_id
+"""
+
+UPDATE_PICKS_SQL = """
+    UPDATE tracking_clv_picks AS p
+    SET is_resolved = true, is_winner = v.is_winner, profit_loss = v.profit,
+        score_home = v.score_home, score_away = v.score_away, resolved_at = NOW()
+    FROM (VALUES %s) AS v(id, is_winner, profit, score_home, score_away)
+    WHERE p.id = v.id AND p.is_resolved = false
+"""
+PICKS_TEMPLATE = "(%s, %s::boolean, %s::numeric, %s::int, %s::int)"
+
+SKIP_PICKS_SQL = """
+    UPDATE tracking_clv_picks AS p
+    SET skip_reason = v.reason
+    FROM (VALUES %s) AS v(id, reason)
+    WHERE p.id = v.id AND p.is_resolved = false
+"""
+SKIP_TEMPLATE = "(%s, %s)"
+
+PENDING_PICKS_COLUMNS = """
+    p.id, p.match_id, p.market_type, p.source, p.diamond_score,
+    p.odds_taken, p.closing_odds, p.stake, p.created_at
+"""
+
+# Matchs absents de match_results (ou pas finis) mais présents dans fg_match_results
+FG_PICKS_SQL = f"""
+    SELECT {PENDING_PICKS_COLUMNS}, f.home_score, f.away_score
+    FROM tracking_clv_picks p
+    JOIN fg_match_results f ON f.match_id = p.match_id
+    WHERE p.is_resolved = false AND p.skip_reason IS NULL
+    AND f.home_score IS NOT NULL AND f.away_score IS NOT NULL
+    AND NOT EXISTS (
+        SELECT 1 FROM match_results r
+        WHERE r.match_id = p.match_id AND r.is_finished = true
+    )
+"""
+
+UPDATE_BETS_SQL = """
+    UPDATE bets AS b
+    SET status = v.status, result = v.status, final_score = v.final_score,
+        payout = v.payout, profit = v.profit, settled_at = NOW(), settled_by = 'auto'
+    FROM (VALUES %s) AS v(id, status, final_score, payout, profit)
+    WHERE b.id = v.id AND b.status = 'pending'
+"""
+BETS_TEMPLATE = "(%s, %s, %s, %s::numeric, %s::numeric)"
+
+UPDATE_COMBOS_SQL = """
+    UPDATE fg_combo_tracking AS c
+    SET status = v.status, outcome = v.status, winning_selections = v.winning,
+        profit_loss = v.profit, resolved_at = NOW(), selections = c.selections || v.details::jsonb
+    FROM (VALUES %s) AS v(id, status, winning, profit, details)
+    WHERE c.id = v.id AND c.status = 'pending'
+"""
+COMBOS_TEMPLATE = "(%s, %s, %s::int, %s::numeric, %s)"
+
+
+# ============================================================
+# RÈGLEMENT (pur, sans DB)
+# ============================================================
+
+@dataclass
+class MatchResult:
+    match_id: str
+    home_team: str
+    away_team: str
+    score_home: int
+    score_away: int
+    commence_time: Optional[datetime] = None
+
+    @property
+    def final_score(self) -> str:
+        return f"{self.score_home}-{self.score_away}"
+
+
+@dataclass
+class SettlementBatch:
+    """Résultat d'une transaction de règlement."""
+    match_ids: List[str] = field(default_factory=list)
+    picks: List[Tuple] = field(default_factory=list)
+    bets: List[Tuple] = field(default_factory=list)
+    combos: List[Tuple] = field(default_factory=list)
+    combo_results: List[Dict[str, Any]] = field(default_factory=list)
+    pick_days: Set[date] = field(default_factory=set)
+    skipped: List[Tuple] = field(default_factory=list)
+    drift_alerts: List[Dict[str, Any]] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, int]:
+        outcomes = [row[1] for row in self.picks]
+        return {
+            'matches': len(self.match_ids),
+            'resolved': len(self.picks),
+            'wins': outcomes.count(True),
+            'losses': outcomes.count(False),
+            'pushes': outcomes.count(None),
+            'skipped': len(self.skipped),
+            'bets': len(self.bets),
+            'combos': len(self.combos),
+        }
+
+    def extend(self, other: "SettlementBatch") -> None:
+        self.match_ids += other.match_ids
+        self.picks += other.picks
+        self.bets += other.bets
+        self.combos += other.combos
+        self.combo_results += other.combo_results
+        self.pick_days |= other.pick_days
+        self.skipped += other.skipped
+        self.drift_alerts += other.drift_alerts
+
+    def event(self) -> Dict[str, Any]:
+        """Payload NOTIFY picks_resolved (limite Postgres: 8000 octets)."""
+        return {**self.summary(), 'match_ids': self.match_ids[:100]}
+
+
+def settle_picks(picks: Iterable[Dict], results: Dict[str, MatchResult]) -> Tuple[List[Tuple], Set[date]]:
+    """Picks tracking_clv → (id, is_winner, profit, home, away) + jours created_at touchés."""
+    updates, days = [], set()
+    for pick in picks:
+        result = results.get(pick['match_id'])
+        resolver = market_resolver(pick['market_type'])
+        if result is None or resolver is None:
+            continue
+        is_winner = resolver(result.score_home, result.score_away)
+        profit = settle_profit(is_winner, pick.get('stake'), pick.get('odds_taken'))
+        updates.append((pick['id'], is_winner, round(profit, 4), result.score_home, result.score_away))
+        if pick.get('created_at') is not None:
+            created = pick['created_at']
+            days.add(created.date() if isinstance(created, datetime) else created)
+    return updates, days
+
+
+def unknown_markets(picks: Iterable[Dict], results: Dict[str, MatchResult]) -> List[Tuple]:
+    """Picks d'un match réglé dont le marché n'a pas de resolver → (id, 'unknown_market')."""
+    return [
+        (pick['id'], 'unknown_market')
+        for pick in picks
+        if pick['match_id'] in results and market_resolver(pick['market_type']) is None
+    ]
+
+
+def settle_bets(bets: Iterable[Dict], results: Dict[str, MatchResult]) -> List[Tuple]:
+    """Paris 1X2 (outcome home/draw/away) → (id, status, final_score, payout, profit)."""
+    updates = []
+    for bet in bets:
+        result = results.get(bet['match_id'])
+        resolver = market_resolver(bet['outcome'])
+        if result is None or resolver is None:
+            continue
+        won = resolver(result.score_home, result.score_away)
+        profit = settle_profit(won, bet['stake'], bet['odds'])
+        stake = float(bet['stake'])
+        status = 'void' if won is None else 'won' if won else 'lost'
+        payout = stake + profit if won is not False else 0.0
+        updates.append((bet['id'], status, result.final_score, round(payout, 2), round(profit, 2)))
+    return updates
+
+
+def _parse_time(value) -> Optional[datetime]:
+    if isinstance(value, datetime) or value is None:
+        return value
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def _same_fixture(selections: Dict, result: MatchResult) -> bool:
+    planned = _parse_time(selections.get('commence_time'))
+    if planned is None or result.commence_time is None:
+        return True
+    return abs((planned.date() - result.commence_time.date()).days) <= COMBO_MAX_DAYS_APART
+
+
+def settle_combos(combos: Iterable[Dict], results: Iterable[MatchResult]) -> Tuple[List[Tuple], List[Dict]]:
+    """
+    Combos mono-match (selections.home_team/away_team) → (id, status, winning, profit, details).
+    Tous gagnants: won, au moins un: partial (-50% stake), aucun: lost.
+    """
+    by_teams: Dict[Tuple[str, str], List[MatchResult]] = {}
+    for result in results:
+        by_teams.setdefault((result.home_team, result.away_team), []).append(result)
+
+    updates, report = [], []
+    for combo in combos:
+        selections = combo['selections'] if isinstance(combo['selections'], dict) else json.loads(combo['selections'])
+        candidates = by_teams.get((selections.get('home_team'), selections.get('away_team')), [])
+        result = next((r for r in candidates if _same_fixture(selections, r)), None)
+        if result is None:
+            continue
+
+        picks_results = []
+        for pick in selections.get('picks', []):
+            resolver = market_resolver(pick.get('market', ''))
+            won = bool(resolver and resolver(result.score_home, result.score_away))
+            picks_results.append({'market': pick.get('market', ''), 'won': won})
+        winning = sum(p['won'] for p in picks_results)
+
+        stake, total_odds = float(combo['stake']), float(combo['total_odds'])
+        if picks_results and winning == len(picks_results):
+            status, profit = 'won', stake * total_odds - stake
+        elif winning > 0:
+            status, profit = 'partial', -stake * 0.5
+        else:
+            status, profit = 'lost', -stake
+
+        details = {
+            'match_result': {'home': result.score_home, 'away': result.score_away},
+            'picks_results': picks_results,
+        }
+        updates.append((combo['id'], status, winning, round(profit, 2), json.dumps(details)))
+        report.append({
+            'combo_id': str(combo['combo_id']),
+            'match': f"{result.home_team} vs {result.away_team}",
+            'score': result.final_score,
+            'status': status,
+            'profit_loss': round(profit, 2),
+            'winning_picks': f"{winning}/{len(picks_results)}",
+        })
+    return updates, report
+
+
+# ============================================================
+# TRANSACTION
+# ============================================================
+
+def install(cur) -> None:
+    """Crée la file et le trigger sur match_results."""
+    cur.execute(SCHEMA_SQL)
+
+
+def backfill(cur) -> int:
+    """Met en file les matchs finis qui ont encore des picks/paris/combos en attente."""
+    cur.execute(BACKFILL_SQL)
+    return cur.rowcount
+
+
+def _load_results(cur, match_ids: Sequence[str]) -> Dict[str, MatchResult]:
+    cur.execute("""
+        SELECT match_id, home_team, away_team, score_home, score_away, commence_time
+        FROM match_results
+        WHERE match_id = ANY(%s) AND is_finished = true
+        AND score_home IS NOT NULL AND score_away IS NOT NULL
+    """, (list(match_ids),))
+    return {row['match_id']: MatchResult(**row) for row in cur.fetchall()}
+
+
+def _settle_pick_rows(cur, batch: SettlementBatch, pending: List[Dict], results: Dict[str, MatchResult]) -> None:
+    """Règle les picks et marque ceux à marché inconnu (plus remis en file)."""
+    batch.picks, batch.pick_days = settle_picks(pending, results)
+    batch.skipped = unknown_markets(pending, results)
+    if batch.picks:
+        execute_values(cur, UPDATE_PICKS_SQL, batch.picks, template=PICKS_TEMPLATE)
+    if batch.skipped:
+        execute_values(cur, SKIP_PICKS_SQL, batch.skipped, template=SKIP_TEMPLATE)
+        skipped_ids = {pick_id for pick_id, _ in batch.skipped}
+        markets = sorted({p['market_type'] for p in pending if p['id'] in skipped_ids})
+        logger.warning(f"⚠️ {len(batch.skipped)} picks ignorés, marchés non supportés: {markets}")
+
+
+def _resolution_events(cur, batch: SettlementBatch, pending: List[Dict]) -> None:
+    """Agrégats, calibration et NOTIFY (dans la transaction: visibles au commit seulement)."""
+    refresh_days(cur, batch.pick_days)
+    batch.drift_alerts = calibration_monitor.record(
+        cur, calibration_monitor.observations(pending, batch.picks)
+    )
+    cur.execute("SELECT pg_notify(%s, %s)", (RESOLVED_CHANNEL, json.dumps(batch.event())))
+
+
+def settle_pending(conn, batch_size: int = BATCH_SIZE, dry_run: bool = False) -> SettlementBatch:
+    """
+    Réclame jusqu'à `batch_size` matchs de la file et règle tout ce qui en
+    dépend dans une seule transaction (rollback si dry_run).
+    """
+    batch = SettlementBatch()
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    try:
+        cur.execute(CLAIM_SQL, (batch_size,))
+        batch.match_ids = [row['match_id'] for row in cur.fetchall()]
+        if not batch.match_ids:
+            conn.rollback()
+            return batch
+
+        results = _load_results(cur, batch.match_ids)
+        ids = list(results)
+
+        cur.execute(f"""
+            SELECT {PENDING_PICKS_COLUMNS}
+            FROM tracking_clv_picks p
+            WHERE p.match_id = ANY(%s) AND p.is_resolved = false AND p.skip_reason IS NULL
+        """, (ids,))
+        pending = cur.fetchall()
+        _settle_pick_rows(cur, batch, pending, results)
+
+        cur.execute("""
+            SELECT id, match_id, outcome, odds, stake
+            FROM bets
+            WHERE match_id = ANY(%s) AND status = 'pending'
+        """, (ids,))
+        batch.bets = settle_bets(cur.fetchall(), results)
+
+        cur.execute("""
+            SELECT id, combo_id, selections, total_odds, stake
+            FROM fg_combo_tracking
+            WHERE status = 'pending' AND selections->>'home_team' = ANY(%s)
+        """, (list({r.home_team for r in results.values()}),))
+        batch.combos, batch.combo_results = settle_combos(cur.fetchall(), results.values())
+
+        if batch.bets:
+            execute_values(cur, UPDATE_BETS_SQL, batch.bets, template=BETS_TEMPLATE)
+        if batch.combos:
+            execute_values(cur, UPDATE_COMBOS_SQL, batch.combos, template=COMBOS_TEMPLATE)
+
+        _resolution_events(cur, batch, pending)
+
+        if dry_run:
+            conn.rollback()
+        else:
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+    logger.info(f"⚡ Settlement: {batch.summary()}")
+    return batch
+
+
+def drain(conn, batch_size: int = BATCH_SIZE, dry_run: bool = False) -> SettlementBatch:
+    """Vide la file (plusieurs transactions de `batch_size` matchs)."""
+    total = SettlementBatch()
+    while True:
+        batch = settle_pending(conn, batch_size, dry_run=dry_run)
+        total.extend(batch)
+        # dry_run: la file n'est pas consommée, un seul passage
+        if dry_run or len(batch.match_ids) < batch_size:
+            return total
+
+
+def run_once(conn, dry_run: bool = False) -> SettlementBatch:
+    """Rattrapage + vidage: remplace les anciens resolvers à polling."""
+    with conn.cursor() as cur:
+        queued = backfill(cur)
+    if dry_run:
+        return drain(conn, dry_run=True)
+    conn.commit()
+    if queued:
+        logger.info(f"📋 {queued} matchs mis en file")
+    return drain(conn)
+
+
+def settle_fg_results(conn, dry_run: bool = False) -> SettlementBatch:
+    """
+    Rattrapage des picks dont le score n'existe que dans fg_match_results
+    (pas de trigger sur cette table): une transaction, mêmes événements.
+    """
+    batch = SettlementBatch()
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    try:
+        cur.execute(FG_PICKS_SQL)
+        pending = cur.fetchall()
+        results = {
+            row['match_id']: MatchResult(row['match_id'], '', '', row['home_score'], row['away_score'])
+            for row in pending
+        }
+        if not results:
+            conn.rollback()
+            return batch
+        batch.match_ids = list(results)
+        _settle_pick_rows(cur, batch, pending, results)
+        _resolution_events(cur, batch, pending)
+
+        if dry_run:
+            conn.rollback()
+        else:
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+    logger.info(f"⚡ Settlement fg_match_results: {batch.summary()}")
+    return batch
+
+
+def listen(connect: Callable = None, poll_seconds: float = POLL_SECONDS, batch_size: int = BATCH_SIZE) -> None:
+    """Worker: règle la file à chaque NOTIFY match_final (et toutes les poll_seconds)."""
+    connect = connect or (lambda: psycopg2.connect(**DB_CONFIG))
+    listener = connect()
+    listener.set_session(autocommit=True)
+    with listener.cursor() as cur:
+        cur.execute(f"LISTEN {MATCH_FINAL_CHANNEL}")
+    worker = connect()
+    logger.info(f"👂 LISTEN {MATCH_FINAL_CHANNEL}")
+
+    while True:
+        drain(worker, batch_size)
+        if select.select([listener], [], [], poll_seconds) != ([], [], []):
+            listener.poll()
+            listener.notifies.clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Règlement événementiel des picks, paris et combos")
+    parser.add_argument('--install', action='store_true', help="Créer la file et le trigger match_results")
+    parser.add_argument('--backfill', action='store_true', help="Mettre en file les matchs finis avec du pending")
+    parser.add_argument('--once', action='store_true', help="Vider la file puis quitter")
+    parser.add_argument('--dry-run', action='store_true', help="Régler sans commit")
+    args = parser.parse_args()
+
+    if not (args.install or args.backfill or args.once or args.dry_run):
+        listen()
+        return
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        if args.install or args.backfill:
+            with conn.cursor() as cur:
+                if args.install:
+                    install(cur)
+                queued = backfill(cur) if args.backfill else 0
+            conn.commit()
+            logger.info(f"✅ Installé / {queued} matchs mis en file")
+        if args.once or args.dry_run:
+            logger.info(f"📊 {drain(conn, dry_run=args.dry_run).summary()}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
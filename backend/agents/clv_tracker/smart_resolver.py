@@ -11,6 +11,10 @@ Solution:
 - Matching par similarité (Levenshtein)
 - Matching par mots clés principaux
 - Matching par date + premier mot
+
+Les picks dont le match_id correspond à match_results sont réglés dès
+l'arrivée du score par settlement_service; ce resolver reste le
+rattrapage par noms d'équipes pour les autres.
 """
 import psycopg2
 from psycopg2.extras import RealDictCursor
@@ -20,6 +24,17 @@ import logging
 import os
 import re
 
+# Agrégats journaliers lus par les dashboards + table de marchés partagée
+# + calibration en ligne (comme settlement_service)
+try:
+    from agents.clv_tracker import calibration_monitor
+    from agents.clv_tracker.clv_aggregates import refresh_days
+    from agents.clv_tracker.market_resolvers import market_resolver, settle_profit
+except ImportError:
+    import calibration_monitor
+    from clv_aggregates import refresh_days
+    from market_resolvers import market_resolver, settle_profit
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)s | %(message)s')
 logger = logging.getLogger('SmartResolver')
 
@@ -31,33 +46,6 @@ DB_CONFIG = {
     'password': os.getenv('DB_PASSWORD', 'monps_secure_password_2024')
 }
 
-# Résolveurs de marchés
-MARKET_RESOLVERS = {
-    'home': lambda h, a: h > a,
-    'draw': lambda h, a: h == a,
-    'away': lambda h, a: h < a,
-    'dc_1x': lambda h, a: h >= a,
-    'dc_x2': lambda h, a: h <= a,
-    'dc_12': lambda h, a: h != a,
-    'btts_yes': lambda h, a: h > 0 and a > 0,
-    'btts_no': lambda h, a: h == 0 or a == 0,
-    'over_15': lambda h, a: (h + a) > 1,
-    'under_15': lambda h, a: (h + a) < 2,
-    'over_25': lambda h, a: (h + a) > 2,
-    'under_25': lambda h, a: (h + a) < 3,
-    'over_35': lambda h, a: (h + a) > 3,
-    'under_35': lambda h, a: (h + a) < 4,
-    # Anciens formats
-    'over15': lambda h, a: (h + a) > 1,
-    'under15': lambda h, a: (h + a) < 2,
-    'over25': lambda h, a: (h + a) > 2,
-    'under25': lambda h, a: (h + a) < 3,
-    'over35': lambda h, a: (h + a) > 3,
-    'under35': lambda h, a: (h + a) < 4,
-    'dnb_home': lambda h, a: h > a,
-    'dnb_away': lambda h, a: a > h,
-}
-
 
 def normalize_team_name(name: str) -> str:
     """Normalise un nom d'équipe pour le matching"""
@@ -163,7 +151,7 @@ class SmartResolver:
         # 1. Récupérer les picks non résolus avec date passée
         cur.execute("""
             SELECT id, match_id, home_team, away_team, market_type,
-                   odds_taken, stake, commence_time
+                   odds_taken, stake, commence_time, created_at
             FROM tracking_clv_picks
             WHERE is_resolved = false
             AND commence_time IS NOT NULL
@@ -197,6 +185,8 @@ class SmartResolver:
                 results_by_date[date_key].append(r)
         
         # 3. Résoudre chaque pick
+        resolved_days = set()
+        settled = []
         for pick in pending:
             try:
                 if not pick['commence_time']:
@@ -227,20 +217,17 @@ class SmartResolver:
                 hs = matched_result['score_home']
                 as_ = matched_result['score_away']
                 
-                resolver = MARKET_RESOLVERS.get(pick['market_type'])
+                resolver = market_resolver(pick['market_type'])
                 if not resolver:
                     logger.debug(f"No resolver for {pick['market_type']}")
                     continue
                 
                 is_win = resolver(hs, as_)
+                profit = settle_profit(is_win, pick['stake'], pick['odds_taken'])
                 
                 if is_win:
-                    stake = self._float(pick['stake'], 1)
-                    odds = self._float(pick['odds_taken'], 1)
-                    profit = stake * (odds - 1)
                     self.stats['wins'] += 1
-                else:
-                    profit = -self._float(pick['stake'], 1)
+                elif is_win is False:
                     self.stats['losses'] += 1
                 
                 # Mettre à jour
@@ -256,14 +243,18 @@ class SmartResolver:
                 """, (is_win, profit, hs, as_, pick['id']))
                 
                 self.stats['resolved'] += 1
+                resolved_days.add(pick['created_at'])
+                settled.append((pick['id'], is_win))
                 
                 logger.info(f"  ✅ {pick['home_team']} vs {pick['away_team']} ({pick['market_type']}): "
-                           f"{hs}-{as_} → {'WIN' if is_win else 'LOSS'}")
+                           f"{hs}-{as_} → {'PUSH' if is_win is None else 'WIN' if is_win else 'LOSS'}")
                 
             except Exception as e:
                 logger.warning(f"  ⚠️ {pick['id']}: {e}")
                 self.stats['errors'] += 1
         
+        refresh_days(cur, resolved_days)
+        calibration_monitor.record_resolved(cur, settled)
         conn.commit()
         cur.close()
         
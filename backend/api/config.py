@@ -12,6 +12,10 @@ class Settings(BaseSettings):
     APP_VERSION: str = "1.0.0"
     ENV: str = os.getenv("ENV", "development")
     DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"
+    # Importer tous les routers au démarrage au lieu de la première requête
+    EAGER_ROUTERS: bool = os.getenv("EAGER_ROUTERS", "false").lower() == "true"
+    # Bot Telegram abonné aux deltas live (un seul worker API, sinon messages en double)
+    TELEGRAM_LIVE_UPDATES: bool = os.getenv("TELEGRAM_LIVE_UPDATES", "false").lower() == "true"
     
     # Database
     DB_HOST: str = os.getenv("DB_HOST", "localhost")
@@ -5,6 +5,7 @@ API FastAPI principale pour Mon_PS
 
 """
 
+import asyncio
 import time
 
 import uuid
@@ -19,27 +20,7 @@ from api.config import settings
 
 from api.services.logging import logger
 
-from api.routes import bets, odds, opportunities, stats, metrics
-
-from api.routes import agents_routes
-
-from api.routes import metrics_collector_routes
-
-from api.routes import settings as settings_route
-
-from api.routes import metrics_routes
-
-from api.routes import manual_bets_routes
-
-from api.routes import bets_routes
-
-from api.routes import agents_stats_routes
-
-from api.routes import agents_comparison_routes
-
-from api.routes import settlement_routes
-from api.routes import pro_score_v3_routes
-from api.routes import coach_routes
+from api.router_registry import LazyRouters, RouterSpec
 
 
 
@@ -149,41 +130,78 @@ async def log_requests(request: Request, call_next):
 
 
 
-# Routes
-
-app.include_router(bets.router, prefix="/bets", tags=["bets"])
-
-app.include_router(odds.router, prefix="/odds", tags=["odds"])
-
-app.include_router(opportunities.router, prefix="/opportunities", tags=["opportunities"])
-
-app.include_router(stats.router, prefix="/stats", tags=["stats"])
-
-app.include_router(metrics.router, tags=["metrics"])
-
-app.include_router(settings_route.router, prefix="/settings", tags=["settings"])
-
-app.include_router(metrics_routes.router)
-
-app.include_router(agents_routes.router)
-
-app.include_router(manual_bets_routes.router)
-
-app.include_router(
-
-    metrics_collector_routes.router,
-
-    tags=["Metrics Collector"]
-
-)
-
-app.include_router(bets_routes.router)
-
-app.include_router(agents_stats_routes.router)
-
-app.include_router(agents_comparison_routes.router)
-
-app.include_router(settlement_routes.router)
+# Routes: importées à la première requête sous leurs préfixes (voir api/router_registry.py).
+# L'ordre est l'ordre de résolution des routes.
+# Profil du démarrage: python -m api.startup_profile
+
+ROUTERS = [
+    RouterSpec("api.routes.bets", ("/bets",), prefix="/bets", tags=("bets",)),
+    RouterSpec("api.routes.odds", ("/odds",), prefix="/odds", tags=("odds",)),
+    RouterSpec("api.routes.opportunities", ("/opportunities",), prefix="/opportunities", tags=("opportunities",)),
+    RouterSpec("api.routes.stats", ("/stats",), prefix="/stats", tags=("stats",)),
+    RouterSpec("api.routes.metrics", ("/metrics",), tags=("metrics",)),
+    RouterSpec("api.routes.settings", ("/settings",), prefix="/settings", tags=("settings",)),
+    RouterSpec("api.routes.metrics_routes", ("/metrics",)),
+    RouterSpec("api.routes.agents_routes", ("/agents",)),
+    RouterSpec("api.routes.manual_bets_routes", ("/manual-bets",)),
+    RouterSpec("api.routes.metrics_collector_routes", ("/metrics", "/refresh"), tags=("Metrics Collector",)),
+    RouterSpec("api.routes.bets_routes", ("/bets",)),
+    RouterSpec("api.routes.agents_stats_routes", ("/agents",)),
+    RouterSpec("api.routes.agents_comparison_routes", ("/agents",)),
+    RouterSpec("api.routes.settlement_routes", ("/settlement",)),
+    # Telegram Bot Routes
+    RouterSpec("api.routes.telegram_routes", ("/telegram",)),
+    # Coach Intelligence Routes
+    RouterSpec("api.routes.coach_routes", ("/api/coach",)),
+    RouterSpec("api.routes.fullgain", ("/fullgain",)),
+    RouterSpec("api.routes.dynamic_intelligence_routes", ("/api/smart",)),
+    RouterSpec("api.routes.reality_check_routes", ("/api/reality",)),
+    # Agent Telegram Test Routes
+    RouterSpec("api.routes.agent_telegram_test", ("/agent-telegram",)),
+    # Telegram Stats Routes (HTML)
+    RouterSpec("api.routes.telegram_stats_routes", ("/telegram",)),
+    # Briefing Routes
+    RouterSpec("api.routes.briefing_routes", ("/briefing",)),
+    # Stats routes (Learning System)
+    RouterSpec("api.routes.stats_routes", ("/stats",), prefix="/stats", tags=("stats",)),
+    # Results routes (Scraper n8n / récupération résultats matchs)
+    RouterSpec("api.routes.results_routes", ("/results",), prefix="/results", tags=("results",)),
+    # Strategies routes (Meta-learning)
+    RouterSpec("api.routes.strategies_routes", ("/strategies",), prefix="/strategies", tags=("strategies",)),
+    RouterSpec("api.routes.ferrari_routes", ("/api/ferrari",), prefix="/api/ferrari", tags=("Ferrari 2.0",)),
+    RouterSpec("api.routes.ferrari_variations_routes", ("/api/ferrari",), prefix="/api/ferrari",
+               tags=("Ferrari Variations Real",)),
+    RouterSpec("api.routes.ferrari_monitoring_routes", ("/api/ferrari",), prefix="/api/ferrari",
+               tags=("Ferrari Monitoring",)),
+    RouterSpec("api.routes.ferrari_matches_routes", ("/api/ferrari",), prefix="/api/ferrari",
+               tags=("Ferrari Matches",)),
+    RouterSpec("api.routes.variations_routes", ("/strategies",), prefix="/strategies", tags=("Variations",)),
+    # Patron Diamond V3 Routes (Multi-Marchés)
+    RouterSpec("api.routes.patron_diamond_routes", ("/patron-diamond",)),
+    # Tracking CLV Routes (Dashboard Stats)
+    RouterSpec("api.routes.tracking_clv_routes", ("/api/tracking-clv",)),
+    # Combinés Intelligents Routes
+    RouterSpec("api.routes.combos_routes", ("/api/combos",)),
+    # Ferrari Intelligence Routes (FERRARI 2.0 ULTIMATE)
+    RouterSpec("api.routes.ferrari_intelligence_routes", ("/ferrari",)),
+    RouterSpec("api.routes.pro_score_v3_routes", ("/api/pro",)),
+    # PRO COMMAND CENTER & PERFORMANCE V2
+    RouterSpec("api.routes.pro_command_center", ("/api/pro",)),
+    RouterSpec("api.routes.pro_performance_v2", ("/api/pro",)),
+    # MARKET RECOMMENDATION ROUTES (ML Smart Quant 2.0)
+    RouterSpec("api.routes.market_recommendation_routes", ("/api/market-recommendation",)),
+    # ML Prediction Routes (Smart Quant 2.0)
+    RouterSpec("api.routes.ml_prediction_routes", ("/api/ml",)),
+    # ORCHESTRATOR V11 QUANT SNIPER
+    RouterSpec("api.routes.orchestrator_v11_routes", ("/api/v11",), prefix="/api/v11",
+               tags=("Orchestrator V11 Quant Sniper",)),
+    # LIVE UPDATES (SSE + WebSocket, remplace le polling pendant les slates)
+    RouterSpec("api.routes.live_routes", ("/api/live",)),
+    # BRAIN API - UNIFIEDBRAIN V2.8.0
+    RouterSpec("api.v1.brain", ("/api/v1/brain",), tags=("UnifiedBrain V2.8",)),
+]
+
+lazy_routers = LazyRouters(app, ROUTERS)
 
 
 
@@ -203,6 +221,21 @@ async def startup():
 
     )
 
+    # Deltas in-play du cache vers /api/live: l'API branche son publisher,
+    # le cache n'importe pas la couche API
+    from api.services.live_updates import publish_delta
+    from cache import smart_cache_enhanced
+    smart_cache_enhanced.set_publisher(publish_delta)
+
+    # Règlements et dérives de calibration poussés dans le chat Telegram
+    if settings.TELEGRAM_LIVE_UPDATES:
+        from services.telegram_bot import get_telegram_bot
+        app.state.telegram_live = asyncio.create_task(get_telegram_bot().follow_live_updates())
+
+    # Ancien comportement (tout importer au boot), ex: pour préchauffer un worker
+    if settings.EAGER_ROUTERS:
+        lazy_routers.load_all()
+
 
 
 @app.get("/")
@@ -223,107 +256,3 @@ def root():
 def health():
 
     return {"status": "healthy"}
-
-
-
-# Telegram Bot Routes
-from api.routes.telegram_routes import router as telegram_router
-app.include_router(telegram_router)
-
-# Coach Intelligence Routes
-app.include_router(coach_routes.router)
-from api.routes.fullgain import router as fullgain_router
-from api.routes.dynamic_intelligence_routes import router as smart_v5_router
-from api.routes.reality_check_routes import router as reality_check_router
-app.include_router(fullgain_router)
-app.include_router(smart_v5_router)
-app.include_router(reality_check_router)
-
-# Agent Telegram Test Routes
-from api.routes.agent_telegram_test import router as agent_telegram_router
-app.include_router(agent_telegram_router)
-
-
-
-
-# Telegram Stats Routes (HTML)
-from api.routes.telegram_stats_routes import router as telegram_stats_router
-app.include_router(telegram_stats_router)
-
-# Briefing Routes
-from api.routes.briefing_routes import router as briefing_router
-app.include_router(briefing_router)
-
-# Stats routes (Learning System)
-from api.routes import stats_routes
-app.include_router(stats_routes.router, prefix="/stats", tags=["stats"])
-
-# Results routes (Scraper n8n)
-from api.routes import results_routes
-app.include_router(results_routes.router, prefix="/results", tags=["results"])
-
-# Strategies routes (Meta-learning)
-from api.routes import strategies_routes
-from api.routes import ferrari_routes
-from api.routes import ferrari_variations_routes
-from api.routes import variations_routes
-app.include_router(strategies_routes.router, prefix="/strategies", tags=["strategies"])
-
-# Results routes (Récupération résultats matchs)
-from api.routes import results_routes
-from api.routes import ferrari_monitoring_routes
-from api.routes import ferrari_matches_routes
-app.include_router(results_routes.router, prefix="/results", tags=["results"])
-app.include_router(ferrari_routes.router, prefix="/api/ferrari", tags=["Ferrari 2.0"])
-app.include_router(ferrari_variations_routes.router, prefix="/api/ferrari", tags=["Ferrari Variations Real"])
-app.include_router(ferrari_monitoring_routes.router, prefix="/api/ferrari", tags=["Ferrari Monitoring"])
-app.include_router(ferrari_matches_routes.router, prefix="/api/ferrari", tags=["Ferrari Matches"])
-app.include_router(variations_routes.router, prefix="/strategies", tags=["Variations"])
-
-# Patron Diamond V3 Routes (Multi-Marchés)
-from api.routes.patron_diamond_routes import router as patron_diamond_router
-app.include_router(patron_diamond_router)
-
-# Tracking CLV Routes (Dashboard Stats)
-from api.routes.tracking_clv_routes import router as tracking_clv_router
-app.include_router(tracking_clv_router)
-
-# Combinés Intelligents Routes
-from api.routes import combos_routes
-app.include_router(combos_routes.router)
-
-# Ferrari Intelligence Routes (FERRARI 2.0 ULTIMATE)
-from api.routes.ferrari_intelligence_routes import router as ferrari_intelligence_router
-app.include_router(ferrari_intelligence_router)
-app.include_router(pro_score_v3_routes.router)
-
-# ============================================================================
-# PRO COMMAND CENTER & PERFORMANCE V2
-# ============================================================================
-from api.routes import pro_command_center
-from api.routes import pro_performance_v2
-
-app.include_router(pro_command_center.router)
-app.include_router(pro_performance_v2.router)
-
-# ============================================================================
-# MARKET RECOMMENDATION ROUTES (ML Smart Quant 2.0)
-# ============================================================================
-from api.routes.market_recommendation_routes import router as market_recommendation_router
-app.include_router(market_recommendation_router)
-
-# ML Prediction Routes (Smart Quant 2.0)
-from api.routes.ml_prediction_routes import router as ml_prediction_router
-app.include_router(ml_prediction_router)
-
-# ============================================================================
-# ORCHESTRATOR V11 QUANT SNIPER (NEW!)
-# ============================================================================
-from api.routes.orchestrator_v11_routes import router as orchestrator_v11_router
-app.include_router(orchestrator_v11_router, prefix="/api/v11", tags=["Orchestrator V11 Quant Sniper"])
-
-# ============================================================================
-# BRAIN API - UNIFIEDBRAIN V2.8.0 (NEW!)
-# ============================================================================
-from api.v1.brain import router as brain_router
-app.include_router(brain_router, tags=["UnifiedBrain V2.8"])
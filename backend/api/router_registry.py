@@ -0,0 +1,146 @@
+"""
+Chargement paresseux des routers FastAPI
+
+main.py déclare chaque router (module, préfixes d'URL servis) au lieu de
+l'importer: le boot d'un worker n'importe ni quantum_core, ni les modèles ML,
+ni les services qui ouvrent des connexions. Le module d'un router est importé
+à la première requête qui tombe sous un de ses préfixes, puis ses routes
+remplacent le placeholder à la même position (l'ordre de résolution des
+routes reste celui de main.py).
+
+/openapi.json et /docs chargent tout; EAGER_ROUTERS=true charge tout au
+démarrage (ancien comportement).
+"""
+import importlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+
+from api.services.logging import logger
+
+
+@dataclass(frozen=True)
+class RouterSpec:
+    """Un router de main.py: module, attribut, préfixes d'URL servis, options d'include."""
+    module: str
+    paths: Tuple[str, ...]
+    attr: str = "router"
+    prefix: str = ""
+    tags: Optional[Tuple[str, ...]] = None
+
+    def serves(self, path: str) -> bool:
+        """Vrai si `path` est sous un des préfixes (segments entiers)."""
+        for prefix in self.paths:
+            prefix = prefix.rstrip("/")
+            if path == prefix or path.startswith(prefix + "/"):
+                return True
+        return False
+
+
+class _LazyRouterRoute(BaseRoute):
+    """Placeholder: matche les préfixes du router et le charge au premier appel."""
+
+    def __init__(self, registry: "LazyRouters", spec: RouterSpec):
+        self.registry = registry
+        self.spec = spec
+
+    def matches(self, scope: Scope) -> Tuple[Match, Scope]:
+        if scope["type"] in ("http", "websocket") and self.spec.serves(scope["path"]):
+            return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name: str, /, **path_params):
+        raise NoMatchFound(name, path_params)
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Plusieurs routers peuvent partager un préfixe (/agents, /api/pro...):
+        # on charge tous ceux qui servent ce chemin puis on relance la résolution.
+        self.registry.load_path(scope["path"])
+        await self.registry.app.router(scope, receive, send)
+
+
+class LazyRouters:
+    """
+    Registre des routers paresseux d'une app.
+
+    Usage:
+        lazy_routers = LazyRouters(app, ROUTERS)
+        lazy_routers.load_all()        # openapi, EAGER_ROUTERS, profiler
+    """
+
+    def __init__(self, app: FastAPI, specs: Sequence[RouterSpec]):
+        self.app = app
+        self.specs = list(specs)
+        self.timings: Dict[str, float] = {}
+        self._placeholders: Dict[RouterSpec, _LazyRouterRoute] = {}
+        self._lock = threading.RLock()
+        for spec in self.specs:
+            placeholder = _LazyRouterRoute(self, spec)
+            self._placeholders[spec] = placeholder
+            app.router.routes.append(placeholder)
+
+        default_openapi = app.openapi
+
+        def openapi():
+            self.load_all()
+            return default_openapi()
+
+        app.openapi = openapi
+
+    @property
+    def pending(self) -> List[RouterSpec]:
+        return [spec for spec in self.specs if spec in self._placeholders]
+
+    def is_loaded(self, spec: RouterSpec) -> bool:
+        return spec not in self._placeholders
+
+    def load(self, spec: RouterSpec) -> List[BaseRoute]:
+        """
+        Importe le module du router et insère ses routes à la place du
+        placeholder. Retourne les routes ajoutées (vide si déjà chargé).
+        """
+        with self._lock:
+            placeholder = self._placeholders.get(spec)
+            if placeholder is None:
+                return []
+
+            t0 = time.perf_counter()
+            router = getattr(importlib.import_module(spec.module), spec.attr)
+            routes = self.app.router.routes
+            start = len(routes)
+            self.app.include_router(router, prefix=spec.prefix,
+                                    tags=list(spec.tags) if spec.tags else None)
+            added = routes[start:]
+            del routes[start:]
+            index = routes.index(placeholder)
+            routes[index:index + 1] = added
+            del self._placeholders[spec]
+            self.timings[spec.module] = time.perf_counter() - t0
+
+        uncovered = uncovered_routes(spec, added)
+        if uncovered:
+            logger.warning("router_paths_not_declared", module=spec.module, paths=uncovered)
+        logger.info("router_loaded", module=spec.module, routes=len(added),
+                    duration_ms=round(self.timings[spec.module] * 1000, 1))
+        return added
+
+    def load_path(self, path: str) -> None:
+        for spec in self.pending:
+            if spec.serves(path):
+                self.load(spec)
+
+    def load_all(self) -> None:
+        for spec in self.pending:
+            self.load(spec)
+
+
+def uncovered_routes(spec: RouterSpec, routes: Sequence[BaseRoute]) -> List[str]:
+    """Chemins de routes qu'aucun préfixe déclaré ne couvre (inaccessibles avant chargement)."""
+    return [route.path for route in routes
+            if isinstance(route, APIRoute) and not spec.serves(route.path)]
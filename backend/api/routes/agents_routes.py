@@ -1,10 +1,13 @@
 """
 Routes API pour les Agents ML - Version Complète (4 Agents)
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+import asyncio
 import datetime as import_datetime
 from typing import List, Dict, Any, Optional
+import json
 import sys
 import warnings
 
@@ -24,6 +27,10 @@ except ImportError:
 
 # Reality Check Helper
 from api.services.reality_check_helper import enrich_prediction, get_match_warnings, quick_adjust, enrich_api_response
+from api.services.agents_batch_service import (
+    DEFAULT_MAX_WORKERS, MAX_BATCH_SIZE, MAX_WORKERS, MatchInputs, build_match_info, load_batch_inputs,
+    load_conseil_outcomes, load_league_history, sport_to_league, stream_batch
+)
 
 def _enrich_conseil_response(response: dict) -> dict:
     """Enrichit la réponse conseil avec le contexte Reality Check."""
@@ -479,46 +486,26 @@ async def analyze_match_with_agents(match_id: str):
         conn.close()
         raise HTTPException(status_code=404, detail=f"Match {match_id} not found")
     
-    match_info = {
-        "match_id": match_row[0], "home_team": match_row[1],
-        "away_team": match_row[2], "sport": match_row[3],
-        "commence_time": str(match_row[4])
-    }
-    
     cur.execute("""
         SELECT bookmaker, home_odds, away_odds, draw_odds
         FROM odds_history WHERE match_id = %s ORDER BY collected_at DESC
     """, (match_id,))
     
     odds_rows = cur.fetchall()
-    if odds_rows:
-        home_odds = [float(r[1]) for r in odds_rows if r[1]]
-        away_odds = [float(r[2]) for r in odds_rows if r[2]]
-        draw_odds = [float(r[3]) for r in odds_rows if r[3]]
-        
-        best_home = max(home_odds) if home_odds else 0
-        best_away = max(away_odds) if away_odds else 0
-        best_draw = max(draw_odds) if draw_odds else 0
-        worst_home = min(home_odds) if home_odds else 0
-        worst_away = min(away_odds) if away_odds else 0
-        worst_draw = min(draw_odds) if draw_odds else 0
-        
-        spread_home = ((best_home - worst_home) / worst_home * 100) if worst_home > 0 else 0
-        spread_away = ((best_away - worst_away) / worst_away * 100) if worst_away > 0 else 0
-        spread_draw = ((best_draw - worst_draw) / worst_draw * 100) if worst_draw > 0 else 0
-        
-        match_info["odds"] = {
-            "home": {"best": best_home, "worst": worst_home, "spread_pct": round(spread_home, 2)},
-            "away": {"best": best_away, "worst": worst_away, "spread_pct": round(spread_away, 2)},
-            "draw": {"best": best_draw, "worst": worst_draw, "spread_pct": round(spread_draw, 2)}
-        }
-        match_info["bookmaker_count"] = len(set([r[0] for r in odds_rows]))
-    else:
-        match_info["odds"] = {}
-        match_info["bookmaker_count"] = 0
-    
     conn.close()
     
+    return run_agents_analysis(build_match_info(match_row, odds_rows))
+
+
+def run_agents_analysis(match_info: Dict[str, Any], league_history: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Analyse des 4 agents pour un match déjà chargé (single et batch).
+
+    league_history: stats matches_results pré-chargées (load_batch_inputs);
+    None = l'agent D les requête lui-même.
+    """
+    import psycopg2
+    
     agents_analysis = []
     
     # Agent A - Anomaly Detector
@@ -1133,33 +1120,7 @@ async def analyze_match_with_agents(match_id: str):
     home_team = match_info.get("home_team", "")
     away_team = match_info.get("away_team", "")
 
-    # DB Config
-    db_config = {
-        "host": "monps_postgres",
-        "database": "monps_db",
-        "user": "monps_user",
-        "password": "monps_secure_password_2024"
-    }
-
-    # Map sport to league
-    league_map = {
-        "soccer_epl": "Premier League",
-        "premier": "Premier League",
-        "spain": "La Liga",
-        "la_liga": "La Liga",
-        "italy": "Serie A",
-        "serie_a": "Serie A",
-        "germany": "Bundesliga",
-        "bundesliga": "Bundesliga",
-        "france": "Ligue 1",
-        "ligue_one": "Ligue 1"
-    }
-
-    league = None
-    for key, value in league_map.items():
-        if key in sport.lower():
-            league = value
-            break
+    league = sport_to_league(sport)
 
     # Stats historiques réelles
     total_matches = 0
@@ -1180,64 +1141,28 @@ async def analyze_match_with_agents(match_id: str):
 
     if league:
         try:
-            conn = psycopg2.connect(**db_config)
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-            # QUERY 1: Stats générales de la ligue
-            cursor.execute("""
-                SELECT
-                    COUNT(*) as total,
-                    SUM(CASE WHEN result = 'H' THEN 1 ELSE 0 END) as home_wins,
-                    SUM(CASE WHEN result = 'D' THEN 1 ELSE 0 END) as draws,
-                    SUM(CASE WHEN result = 'A' THEN 1 ELSE 0 END) as away_wins,
-                    AVG(home_goals) as avg_home_goals,
-                    AVG(away_goals) as avg_away_goals
-                FROM matches_results
-                WHERE league = %s
-            """, (league,))
-
-            stats = cursor.fetchone()
-            if stats and stats['total'] > 0:
-                total_matches = stats['total']
-                home_wins = stats['home_wins']
-                draws = stats['draws']
-                away_wins = stats['away_wins']
-                avg_home_goals = float(stats['avg_home_goals'] or 0)
-                avg_away_goals = float(stats['avg_away_goals'] or 0)
+            if league_history is None:
+                conn = psycopg2.connect(**DB_CONFIG)
+                cursor = conn.cursor(cursor_factory=RealDictCursor)
+                league_history = load_league_history(cursor, league, home_team, away_team)
+                conn.close()
+
+            if league_history["total"] > 0:
+                total_matches = league_history["total"]
+                home_wins = league_history["home_wins"]
+                draws = league_history["draws"]
+                away_wins = league_history["away_wins"]
+                avg_home_goals = league_history["avg_home_goals"]
+                avg_away_goals = league_history["avg_away_goals"]
 
                 home_win_rate = (home_wins / total_matches) * 100
                 draw_rate = (draws / total_matches) * 100
                 away_win_rate = (away_wins / total_matches) * 100
 
-            # QUERY 2: Performance équipe à domicile
-            cursor.execute("""
-                SELECT
-                    COUNT(*) as matches,
-                    SUM(CASE WHEN result = 'H' THEN 1 ELSE 0 END) as wins
-                FROM matches_results
-                WHERE league = %s AND home_team ILIKE %s
-            """, (league, f"%{home_team}%"))
-
-            team_home = cursor.fetchone()
-            if team_home:
-                team_home_matches = team_home['matches'] or 0
-                team_home_wins = team_home['wins'] or 0
-
-            # QUERY 3: Performance équipe en déplacement
-            cursor.execute("""
-                SELECT
-                    COUNT(*) as matches,
-                    SUM(CASE WHEN result = 'A' THEN 1 ELSE 0 END) as wins
-                FROM matches_results
-                WHERE league = %s AND away_team ILIKE %s
-            """, (league, f"%{away_team}%"))
-
-            team_away = cursor.fetchone()
-            if team_away:
-                team_away_matches = team_away['matches'] or 0
-                team_away_wins = team_away['wins'] or 0
-
-            conn.close()
+            team_home_matches = league_history["team_home_matches"]
+            team_home_wins = league_history["team_home_wins"]
+            team_away_matches = league_history["team_away_matches"]
+            team_away_wins = league_history["team_away_wins"]
 
         except Exception as e:
             pass
@@ -1492,17 +1417,22 @@ async def analyze_with_patron(match_id: str, variation_id: int = None):
     Agent Patron V2.0 : Meta-Analyste avec sélection de variation
     et score basé sur les données réelles (60 matchs analysés)
     """
-    import psycopg2
-
     # 1. Récupérer l'analyse des 4 agents
     base_analysis = await analyze_match_with_agents(match_id)
 
     if "error" in base_analysis:
         return base_analysis
 
-    agents_list = base_analysis.get("agents", [])
-
     # 2. Récupérer la variation (meilleure par défaut ou sélectionnée)
+    selected_variation = load_patron_variation(variation_id)
+
+    return build_patron_analysis(match_id, base_analysis, selected_variation)
+
+
+def load_patron_variation(variation_id: int = None) -> Optional[Dict[str, Any]]:
+    """Variation Patron sélectionnée (ou la meilleure active), None si indisponible"""
+    import psycopg2
+
     selected_variation = None
     try:
         conn = psycopg2.connect(
@@ -1551,6 +1481,14 @@ async def analyze_with_patron(match_id: str, variation_id: int = None):
     except Exception as e:
         selected_variation = None
 
+    return selected_variation
+
+
+def build_patron_analysis(match_id: str, base_analysis: Dict[str, Any],
+                          selected_variation: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Score Patron V2 à partir de l'analyse des 4 agents (sans I/O)"""
+    agents_list = base_analysis.get("agents", [])
+
     # 3. Extraire les scores de chaque agent
     scores = {}
     signals = {}
@@ -1817,56 +1755,114 @@ async def analyze_with_patron(match_id: str, variation_id: int = None):
 
     return patron_analysis
 
+PATRON_ERROR = {"score": 0, "label": "ERREUR", "color": "text-red-400"}
+
+
+def _patron_score_entry(base_analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Score Patron rapide (moyenne des confiances agents) + label/couleur UI"""
+    if "error" in base_analysis:
+        return dict(PATRON_ERROR)
+
+    agents_list = base_analysis.get("agents", [])
+
+    # Calculer score moyen
+    scores = []
+    for agent in agents_list:
+        scores.append(agent.get("confidence", 0))
+
+    avg_score = sum(scores) / len(scores) if scores else 0
+
+    # Déterminer le label et la couleur
+    if avg_score >= 70:
+        label = "FORT SIGNAL"
+        color = "text-green-400"
+    elif avg_score >= 50:
+        label = "ANALYSER"
+        color = "text-blue-400"
+    elif avg_score >= 30:
+        label = "PRUDENCE"
+        color = "text-orange-400"
+    else:
+        label = "EVITER"
+        color = "text-red-400"
+
+    return {
+        "score": round(avg_score, 1),
+        "label": label,
+        "color": color
+    }
+
+
+def _analyze_patron_entry(match_id: str, inputs: MatchInputs) -> Dict[str, Any]:
+    return _patron_score_entry(run_agents_analysis(inputs.match_info, inputs.league_history))
+
+
+# Validé par FastAPI avant l'appel (0 bloquerait le sémaphore de stream_batch)
+MaxWorkers = Query(DEFAULT_MAX_WORKERS, ge=1, le=MAX_WORKERS)
+
+
+def _load_inputs(match_ids: List[str], loader, *args):
+    """Connexion unique pour le chargement bulk d'un batch"""
+    import psycopg2
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        return loader(conn, match_ids, *args)
+    finally:
+        conn.close()
+
+
+async def _load_batch(match_ids: List[str], loader, *args):
+    """
+    Taille vérifiée et entrées chargées AVANT la réponse: une route NDJSON
+    ne peut plus renvoyer de 413 une fois le streaming commencé.
+    """
+    if len(match_ids) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch limité à {MAX_BATCH_SIZE} matchs")
+    return await asyncio.to_thread(_load_inputs, match_ids, loader, *args)
+
+
+async def _stream_patron_scores(match_ids: List[str], inputs: Dict[str, MatchInputs], max_workers: int):
+    async for match_id, entry in stream_batch(
+        match_ids, inputs, _analyze_patron_entry,
+        max_workers=max_workers, on_missing=lambda _: dict(PATRON_ERROR)
+    ):
+        if "error" in entry:
+            entry = dict(PATRON_ERROR)
+        yield match_id, entry
+
+
+def _ndjson(results):
+    """Une ligne JSON {match_id, ...} par match terminé"""
+    async def lines():
+        async for match_id, entry in results:
+            yield json.dumps({"match_id": match_id, **entry}, default=str) + "\n"
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.post("/patron/batch")
-async def batch_patron_scores(match_ids: list[str]):
+async def batch_patron_scores(match_ids: list[str], max_workers: int = MaxWorkers):
     """
     Calcule les scores Patron pour plusieurs matchs en batch
     Retourne un dictionnaire {match_id: score_info}
+
+    Entrées chargées en bulk, analyses en parallèle (max_workers).
     """
+    inputs = await _load_batch(match_ids, load_batch_inputs)
     results = {}
-    
-    for match_id in match_ids[:20]:  # Limite à 20 matchs max
-        try:
-            # Récupérer l'analyse de base
-            base_analysis = await analyze_match_with_agents(match_id)
-            
-            if "error" in base_analysis:
-                results[match_id] = {"score": 0, "label": "ERREUR", "color": "text-red-400"}
-                continue
-            
-            agents_list = base_analysis.get("agents", [])
-            
-            # Calculer score moyen
-            scores = []
-            for agent in agents_list:
-                scores.append(agent.get("confidence", 0))
-            
-            avg_score = sum(scores) / len(scores) if scores else 0
-            
-            # Déterminer le label et la couleur
-            if avg_score >= 70:
-                label = "FORT SIGNAL"
-                color = "text-green-400"
-            elif avg_score >= 50:
-                label = "ANALYSER"
-                color = "text-blue-400"
-            elif avg_score >= 30:
-                label = "PRUDENCE"
-                color = "text-orange-400"
-            else:
-                label = "EVITER"
-                color = "text-red-400"
-            
-            results[match_id] = {
-                "score": round(avg_score, 1),
-                "label": label,
-                "color": color
-            }
-        except Exception as e:
-            results[match_id] = {"score": 0, "label": "ERREUR", "color": "text-red-400"}
-    
-    return results
+    async for match_id, entry in _stream_patron_scores(match_ids, inputs, max_workers):
+        results[match_id] = entry
+    return {match_id: results[match_id] for match_id in match_ids if match_id in results}
+
 
+@router.post("/patron/batch/stream")
+async def stream_patron_scores(match_ids: list[str], max_workers: int = MaxWorkers):
+    """
+    Comme /patron/batch, mais chaque score est émis dès qu'il est prêt
+    (NDJSON: une ligne {match_id, score, label, color} par match)
+    """
+    inputs = await _load_batch(match_ids, load_batch_inputs)
+    return _ndjson(_stream_patron_scores(match_ids, inputs, max_workers))
 
 @router.post("/diamond/synthesize")
 async def diamond_synthesize(match_id: str):
@@ -2345,121 +2341,130 @@ async def analyze_conseil_ultim(match_id: str):
 
 
 
+CONSEIL_BATCH_VARIATION = 6
+
+
+def _conseil_entry(outcomes: List[Dict[str, Any]], patron_analysis: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Meilleur outcome (label, score) à partir des cotes agrégées et du Patron"""
+    patron_score = patron_analysis.get("score_v2", {}).get("score", 50)
+    patron_outcome = patron_analysis.get("score_v2", {}).get("predicted_outcome", "home")
+
+    # Analyser chaque outcome et trouver le meilleur
+    best_score = 0
+    best_outcome = None
+
+    for opp in outcomes:
+        outcome_type = opp['outcome']
+        avg_cote = float(opp['avg_cote'])
+        nb_books = opp['nb_bookmakers']
+
+        proba_implicite = (1.0 / avg_cote) * 100
+        notre_proba = proba_implicite
+
+        if outcome_type == patron_outcome:
+            if patron_score >= 80:
+                notre_proba += 15
+            elif patron_score >= 70:
+                notre_proba += 10
+            elif patron_score >= 60:
+                notre_proba += 5
+        else:
+            if patron_score >= 70:
+                notre_proba -= 5
+
+        notre_proba = max(5, min(95, notre_proba))
+        edge_reel = notre_proba - proba_implicite
+        score_liquidite = min(100, (nb_books / 20) * 100)
+
+        score_final = (
+            (notre_proba * 0.4) +
+            ((edge_reel + 20) * 0.3 * 2.5) +
+            (patron_score * 0.2) +
+            (score_liquidite * 0.1)
+        )
+        score_final = max(0, min(100, score_final))
+
+        if score_final > best_score:
+            best_score = score_final
+            best_outcome = {
+                'outcome': outcome_type,
+                'score': round(score_final, 1),
+                'home': outcomes[0]['home_team'],
+                'away': outcomes[0]['away_team']
+            }
+
+    if best_outcome:
+        # Label
+        if best_outcome['outcome'] == 'home':
+            label = f"🏠 {best_outcome['home'].split()[0].upper()}"
+        elif best_outcome['outcome'] == 'away':
+            label = f"✈️ {best_outcome['away'].split()[0].upper()}"
+        else:
+            label = "⚖️ NUL"
+
+        return {
+            'label': label,
+            'score': best_outcome['score'],
+            'outcome': best_outcome['outcome']
+        }
+    return None
+
+
+def _load_conseil_inputs(conn, match_ids: List[str]):
+    outcomes = load_conseil_outcomes(conn, match_ids)
+    ids = [match_id for match_id in match_ids if match_id in outcomes]
+    return outcomes, load_batch_inputs(conn, ids)
+
+
+async def _load_conseil_batch(match_ids: List[str]):
+    outcomes, inputs = await _load_batch(match_ids, _load_conseil_inputs)
+    variation = await asyncio.to_thread(load_patron_variation, CONSEIL_BATCH_VARIATION)
+    return outcomes, inputs, variation
+
+
+async def _stream_conseil(match_ids: List[str], loaded, max_workers: int):
+    outcomes, inputs, variation = loaded
+
+    def analyze(match_id: str, match_inputs: MatchInputs) -> Dict[str, Any]:
+        base_analysis = run_agents_analysis(match_inputs.match_info, match_inputs.league_history)
+        patron_analysis = build_patron_analysis(match_id, base_analysis, variation)
+        return _conseil_entry(outcomes[match_id], patron_analysis) or {}
+
+    async for match_id, entry in stream_batch(match_ids, inputs, analyze, max_workers=max_workers):
+        if entry and "error" not in entry:
+            yield match_id, entry
+
+
 @router.post("/conseil-ultim/batch")
-async def batch_conseil_ultim(match_ids: list[str]):
+async def batch_conseil_ultim(match_ids: list[str], max_workers: int = MaxWorkers):
     """
     Retourne les recommandations finales pour plusieurs matchs
     Format: {match_id: {label, score, conseil}}
+
+    Cotes et entrées agents chargées en bulk, analyses en parallèle (max_workers).
     """
-    import psycopg2
-    from psycopg2.extras import RealDictCursor
-    
-    results = {}
-    
     try:
-        conn = psycopg2.connect(
-            host='monps_postgres',
-            port=5432,
-            database='monps_db',
-            user='monps_user',
-            password='monps_secure_password_2024'
-        )
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        for match_id in match_ids[:50]:  # Limiter à 50
-            try:
-                # Récupérer outcomes
-                cur.execute("""
-                    SELECT 
-                        outcome,
-                        AVG(odds_value) as avg_cote,
-                        COUNT(*) as nb_bookmakers,
-                        home_team,
-                        away_team
-                    FROM odds
-                    WHERE match_id = %s
-                    GROUP BY outcome, home_team, away_team
-                """, (match_id,))
-                
-                outcomes = cur.fetchall()
-                if not outcomes:
-                    continue
-                
-                # Patron
-                patron_analysis = await analyze_with_patron(match_id, variation_id=6)
-                patron_score = patron_analysis.get("score_v2", {}).get("score", 50)
-                patron_outcome = patron_analysis.get("score_v2", {}).get("predicted_outcome", "home")
-                
-                # Analyser chaque outcome et trouver le meilleur
-                best_score = 0
-                best_outcome = None
-                
-                for opp in outcomes:
-                    outcome_type = opp['outcome']
-                    avg_cote = float(opp['avg_cote'])
-                    nb_books = opp['nb_bookmakers']
-                    
-                    proba_implicite = (1.0 / avg_cote) * 100
-                    notre_proba = proba_implicite
-                    
-                    if outcome_type == patron_outcome:
-                        if patron_score >= 80:
-                            notre_proba += 15
-                        elif patron_score >= 70:
-                            notre_proba += 10
-                        elif patron_score >= 60:
-                            notre_proba += 5
-                    else:
-                        if patron_score >= 70:
-                            notre_proba -= 5
-                    
-                    notre_proba = max(5, min(95, notre_proba))
-                    edge_reel = notre_proba - proba_implicite
-                    score_liquidite = min(100, (nb_books / 20) * 100)
-                    
-                    score_final = (
-                        (notre_proba * 0.4) +
-                        ((edge_reel + 20) * 0.3 * 2.5) +
-                        (patron_score * 0.2) +
-                        (score_liquidite * 0.1)
-                    )
-                    score_final = max(0, min(100, score_final))
-                    
-                    if score_final > best_score:
-                        best_score = score_final
-                        best_outcome = {
-                            'outcome': outcome_type,
-                            'score': round(score_final, 1),
-                            'home': outcomes[0]['home_team'],
-                            'away': outcomes[0]['away_team']
-                        }
-                
-                if best_outcome:
-                    # Label
-                    if best_outcome['outcome'] == 'home':
-                        label = f"🏠 {best_outcome['home'].split()[0].upper()}"
-                    elif best_outcome['outcome'] == 'away':
-                        label = f"✈️ {best_outcome['away'].split()[0].upper()}"
-                    else:
-                        label = "⚖️ NUL"
-                    
-                    results[match_id] = {
-                        'label': label,
-                        'score': best_outcome['score'],
-                        'outcome': best_outcome['outcome']
-                    }
-                    
-            except Exception as e:
-                continue
-        
-        cur.close()
-        conn.close()
-        return results
-        
+        loaded = await _load_conseil_batch(match_ids)
+        results = {}
+        async for match_id, entry in _stream_conseil(match_ids, loaded, max_workers):
+            results[match_id] = entry
+        return {match_id: results[match_id] for match_id in match_ids if match_id in results}
+
+    except HTTPException:
+        raise
     except Exception as e:
         return {"error": str(e)}
 
 
+@router.post("/conseil-ultim/batch/stream")
+async def stream_conseil_ultim(match_ids: list[str], max_workers: int = MaxWorkers):
+    """
+    Comme /conseil-ultim/batch, mais chaque conseil est émis dès qu'il est prêt
+    (NDJSON: une ligne {match_id, label, score, outcome} par match)
+    """
+    loaded = await _load_conseil_batch(match_ids)
+    return _ndjson(_stream_conseil(match_ids, loaded, max_workers))
+
 
 # ============================================================
 # ENDPOINTS HISTORIQUE CONSEIL ULTIM
@@ -27,6 +27,8 @@ except ImportError:
     REALITY_CHECK_ENABLED = False
 # Reality Check Helper
 from api.services.reality_check_helper import get_match_warnings, adjust_prediction, get_team_tier, enrich_match_list, enrich_api_response
+from agents.clv_tracker.clv_aggregates import rollup
+from agents.clv_tracker.settlement_service import run_once as run_settlement
 
 def _enrich_combo_response(response: dict) -> dict:
     """Enrichit la réponse combo avec Reality Check pour chaque match."""
@@ -171,24 +173,21 @@ async def get_dynamic_market_stats():
     conn = get_db_connection()
     cur = conn.cursor(cursor_factory=RealDictCursor)
     
-    cur.execute("""
-        SELECT 
-            market_type,
-            COUNT(*) as total_picks,
-            COUNT(*) FILTER (WHERE is_winner = true) as wins,
-            COUNT(*) FILTER (WHERE is_winner = false) as losses,
-            ROUND(COUNT(*) FILTER (WHERE is_winner)::numeric / NULLIF(COUNT(*), 0) * 100, 1) as win_rate,
-            ROUND(AVG(odds_taken)::numeric, 2) as avg_odds,
-            ROUND(SUM(profit_loss)::numeric, 2) as total_profit,
-            ROUND(AVG(clv_percentage)::numeric, 2) as avg_clv
-        FROM tracking_clv_picks
-        WHERE is_resolved = true AND market_type IS NOT NULL
-        GROUP BY market_type
-        HAVING COUNT(*) >= 5
-        ORDER BY total_profit DESC
-    """)
-    
-    markets = cur.fetchall()
+    markets = [
+        {
+            'market_type': m['market_type'],
+            'total_picks': m['resolved'],
+            'wins': m['wins'],
+            'losses': m['losses'],
+            'win_rate': m['win_rate'],
+            'avg_odds': m['avg_odds'],
+            'total_profit': round(m['profit'], 2),
+            'avg_clv': round(m['avg_clv_pct'], 2) if m['avg_clv_pct'] is not None else None,
+        }
+        for m in rollup(cur, by=('market_type',), min_resolved=5)
+        if m['market_type'] != 'unknown'
+    ]
+    markets.sort(key=lambda m: m['total_profit'], reverse=True)
     
     for m in markets:
         profit = float(m['total_profit'] or 0)
@@ -238,15 +237,10 @@ async def get_combo_suggestions(
     cur = conn.cursor(cursor_factory=RealDictCursor)
     
     # 1. Récupérer les stats dynamiques des marchés
-    cur.execute("""
-        SELECT market_type,
-               ROUND(COUNT(*) FILTER (WHERE is_winner)::numeric / NULLIF(COUNT(*), 0) * 100, 1) as win_rate
-        FROM tracking_clv_picks
-        WHERE is_resolved = true AND market_type IS NOT NULL
-        GROUP BY market_type
-        HAVING COUNT(*) >= 10
-    """)
-    market_stats = {row['market_type']: float(row['win_rate'] or 50) for row in cur.fetchall()}
+    market_stats = {
+        row['market_type']: float(row['win_rate'] or 50)
+        for row in rollup(cur, by=('market_type',), min_resolved=10)
+    }
     
     # 2. Récupérer les picks non résolus
     cur.execute("""
@@ -583,148 +577,21 @@ async def analyze_all_pending_combos():
 async def auto_resolve_combos():
     """
     Résout automatiquement les combos dont les matchs sont terminés
+    (settlement_service: rattrapage de la file + règlement en une transaction)
     """
     conn = get_db_connection()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
-    
-    # 1. Récupérer les combos pending dont le match est passé
-    cur.execute("""
-        SELECT id, combo_id, selections, total_odds, stake
-        FROM fg_combo_tracking
-        WHERE status = 'pending'
-    """)
-    
-    pending_combos = cur.fetchall()
-    resolved_count = 0
-    results = []
-    
-    for combo in pending_combos:
-        selections = combo['selections'] if isinstance(combo['selections'], dict) else json.loads(combo['selections'])
-        
-        # Extraire infos du match
-        home_team = selections.get('home_team', '')
-        away_team = selections.get('away_team', '')
-        commence_time = selections.get('commence_time', '')
-        
-        if not home_team or not away_team:
-            continue
-        
-        # Vérifier si le match est terminé
-        cur.execute("""
-            SELECT home_team, away_team, home_score, away_score, is_resolved
-            FROM tracking_clv_picks
-            WHERE home_team = %s AND away_team = %s
-            AND is_resolved = true
-            LIMIT 1
-        """, (home_team, away_team))
-        
-        match_result = cur.fetchone()
-        
-        if not match_result:
-            # Match pas encore terminé
-            continue
-        
-        home_score = match_result['home_score'] or 0
-        away_score = match_result['away_score'] or 0
-        total_goals = home_score + away_score
-        
-        # Vérifier chaque sélection du combo
-        all_won = True
-        winning_count = 0
-        picks_results = []
-        
-        for pick in selections.get('picks', []):
-            market = pick.get('market', '')
-            won = check_market_result(market, home_score, away_score)
-            
-            picks_results.append({
-                'market': market,
-                'won': won
-            })
-            
-            if won:
-                winning_count += 1
-            else:
-                all_won = False
-        
-        # Déterminer le status
-        if all_won:
-            status = 'won'
-            profit_loss = float(combo['stake']) * float(combo['total_odds']) - float(combo['stake'])
-        elif winning_count > 0:
-            status = 'partial'
-            profit_loss = -float(combo['stake']) * 0.5  # Perte partielle
-        else:
-            status = 'lost'
-            profit_loss = -float(combo['stake'])
-        
-        # Mettre à jour
-        cur.execute("""
-            UPDATE fg_combo_tracking
-            SET status = %s,
-                outcome = %s,
-                winning_selections = %s,
-                profit_loss = %s,
-                resolved_at = NOW(),
-                selections = selections || %s::jsonb
-            WHERE id = %s
-        """, (
-            status,
-            status,
-            winning_count,
-            round(profit_loss, 2),
-            json.dumps({'match_result': {'home': home_score, 'away': away_score}, 'picks_results': picks_results}),
-            combo['id']
-        ))
-        
-        resolved_count += 1
-        results.append({
-            'combo_id': str(combo['combo_id']),
-            'match': f"{home_team} vs {away_team}",
-            'score': f"{home_score}-{away_score}",
-            'status': status,
-            'profit_loss': round(profit_loss, 2),
-            'winning_picks': f"{winning_count}/{len(selections.get('picks', []))}"
-        })
-    
-    conn.commit()
-    cur.close()
-    conn.close()
+    try:
+        settled = run_settlement(conn)
+    finally:
+        conn.close()
     
     return {
-        "resolved_count": resolved_count,
-        "results": results,
+        "resolved_count": len(settled.combo_results),
+        "results": settled.combo_results,
         "resolved_at": datetime.now().isoformat()
     }
 
 
-def check_market_result(market: str, home_score: int, away_score: int) -> bool:
-    """Vérifie si un marché est gagnant"""
-    total = home_score + away_score
-    
-    market_checks = {
-        'home': home_score > away_score,
-        'away': away_score > home_score,
-        'draw': home_score == away_score,
-        'dc_1x': home_score >= away_score,  # Dom ou Nul
-        'dc_x2': away_score >= home_score,  # Nul ou Ext
-        'dc_12': home_score != away_score,  # Dom ou Ext (pas nul)
-        'over_15': total > 1.5,
-        'over_25': total > 2.5,
-        'over_35': total > 3.5,
-        'under_15': total < 1.5,
-        'under_25': total < 2.5,
-        'under_35': total < 3.5,
-        'under35': total < 3.5,
-        'btts_yes': home_score > 0 and away_score > 0,
-        'btts_no': home_score == 0 or away_score == 0,
-        'dnb_home': home_score > away_score,
-        'dnb_away': away_score > home_score,
-    }
-    
-    return market_checks.get(market, False)
-
-
 # ============================================================
 # HISTORIQUE
 # ============================================================
@@ -0,0 +1,105 @@
+"""
+Routes Live - Deltas cotes / prédictions / règlements poussés (SSE + WebSocket)
+
+Remplace le polling de /odds, /api/pro/command-center et
+/api/ferrari/monitoring pendant les slates: le client s'abonne une fois,
+puis ne relit une route REST que pour le match qu'un delta désigne.
+
+Filtres (listes séparées par des virgules): matches, leagues, kinds
+(odds, in_play, prediction, settlement, calibration).
+"""
+import asyncio
+import json
+from typing import Optional, Set
+
+from fastapi import APIRouter, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from api.services.live_updates import hub, publisher
+
+router = APIRouter(prefix="/api/live", tags=["Live Updates"])
+
+# Commentaire SSE / ping WS si rien n'a bougé (proxies, détection de déconnexion)
+KEEPALIVE_SECONDS = 15.0
+
+
+def _csv(value: Optional[str]) -> Optional[Set[str]]:
+    if not value:
+        return None
+    return {item.strip() for item in value.split(",") if item.strip()} or None
+
+
+@router.get("/stream")
+async def stream_updates(
+    request: Request,
+    matches: Optional[str] = Query(None, description="match_ids séparés par des virgules"),
+    leagues: Optional[str] = Query(None, description="sports/ligues (ex: soccer_epl)"),
+    kinds: Optional[str] = Query(None, description="odds,in_play,prediction,settlement,calibration"),
+):
+    """Server-Sent Events: un évènement `<kind>` par delta"""
+    sub = hub.subscribe(_csv(matches), _csv(leagues), _csv(kinds))
+
+    async def events():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                delta = await sub.get(KEEPALIVE_SECONDS)
+                if delta is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {delta.kind}\ndata: {delta.to_json()}\n\n"
+        finally:
+            hub.unsubscribe(sub)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def websocket_updates(
+    websocket: WebSocket,
+    matches: Optional[str] = None,
+    leagues: Optional[str] = None,
+    kinds: Optional[str] = None,
+):
+    """
+    WebSocket: un message JSON par delta. Le client peut changer ses filtres
+    en envoyant {"matches": [...], "leagues": [...], "kinds": [...]}.
+    """
+    await websocket.accept()
+    sub = hub.subscribe(_csv(matches), _csv(leagues), _csv(kinds))
+
+    async def receive_filters():
+        while True:
+            message = await websocket.receive_text()
+            try:
+                filters = json.loads(message)
+                sub.set_filters(filters.get("matches"), filters.get("leagues"), filters.get("kinds"))
+            except (ValueError, AttributeError):
+                await websocket.send_json({"error": "filtres attendus: {matches, leagues, kinds}"})
+
+    receiver = asyncio.create_task(receive_filters())
+    try:
+        while True:
+            getter = asyncio.create_task(sub.get(KEEPALIVE_SECONDS))
+            await asyncio.wait({receiver, getter}, return_when=asyncio.FIRST_COMPLETED)
+            if receiver.done():  # déconnexion
+                getter.cancel()
+                receiver.exception()
+                break
+            delta = getter.result()
+            await websocket.send_text(delta.to_json() if delta else '{"kind":"ping"}')
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        hub.unsubscribe(sub)
+
+
+@router.get("/stats")
+def live_stats():
+    """Abonnés, deltas reçus / livrés / perdus du worker, file de publication"""
+    return {**hub.stats(), 'publisher': publisher.stats()}
@@ -7,6 +7,8 @@ from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTEN
 from sqlalchemy import create_engine, text
 import os
 
+from cache.brain_metrics import brain_stage_metrics
+
 router = APIRouter()
 
 # Métriques métier
@@ -79,4 +81,5 @@ def calculate_metrics():
 def get_metrics():
     """Expose Prometheus metrics"""
     calculate_metrics()
-    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+    content = generate_latest() + b"\n" + brain_stage_metrics.to_prometheus().encode() + b"\n"
+    return Response(content=content, media_type=CONTENT_TYPE_LATEST)
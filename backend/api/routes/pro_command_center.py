@@ -14,6 +14,7 @@ from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 import structlog
 from api.services.database import get_db, get_cursor
+from agents.clv_tracker.clv_aggregates import rollup
 
 logger = structlog.get_logger()
 router = APIRouter(prefix="/api/pro", tags=["Pro Command Center"])
@@ -1478,33 +1479,8 @@ async def get_performance_summary(days: int = 30):
                 "systems": {}
             }
             
-            # 1. Performance tracking_clv_picks (Sweet Spots)
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total,
-                    COUNT(*) FILTER (WHERE is_resolved = true) as resolved,
-                    COUNT(*) FILTER (WHERE is_winner = true) as wins,
-                    COUNT(*) FILTER (WHERE is_winner = false AND is_resolved = true) as losses,
-                    ROUND(AVG(diamond_score)::numeric, 1) as avg_score,
-                    ROUND(SUM(profit_loss)::numeric, 2) as total_profit,
-                    ROUND(
-                        COUNT(*) FILTER (WHERE is_winner = true)::numeric / 
-                        NULLIF(COUNT(*) FILTER (WHERE is_resolved = true), 0) * 100, 1
-                    ) as win_rate,
-                    -- CLV
-                    ROUND(AVG(
-                        CASE WHEN closing_odds > 0 THEN 
-                            (odds_taken / closing_odds - 1) * 100 
-                        ELSE NULL END
-                    )::numeric, 3) as avg_clv,
-                    -- ROI
-                    ROUND(
-                        (SUM(profit_loss) / NULLIF(COUNT(*) FILTER (WHERE is_resolved = true), 0) * 100)::numeric, 
-                    2) as roi_percent
-                FROM tracking_clv_picks
-                WHERE created_at > NOW() - INTERVAL '%s days'
-            """, (days,))
-            sweet_spots = cursor.fetchone()
+            # 1-3. Performance tracking_clv_picks (Sweet Spots) - agrégats journaliers
+            sweet_spots = rollup(cursor, days=days)[0]
             result["systems"]["sweet_spots"] = {
                 "total_picks": sweet_spots['total'],
                 "resolved": sweet_spots['resolved'],
@@ -1512,79 +1488,37 @@ async def get_performance_summary(days: int = 30):
                 "losses": sweet_spots['losses'],
                 "win_rate": float(sweet_spots['win_rate'] or 0),
                 "avg_score": float(sweet_spots['avg_score'] or 0),
-                "profit": float(sweet_spots['total_profit'] or 0),
+                "profit": round(float(sweet_spots['profit'] or 0), 2),
                 "avg_clv": float(sweet_spots['avg_clv'] or 0),
                 "roi_percent": float(sweet_spots['roi_percent'] or 0)
             }
             
             # 2. Performance par tier
-            cursor.execute("""
-                SELECT 
-                    CASE 
-                        WHEN diamond_score >= 90 THEN 'ELITE 90+'
-                        WHEN diamond_score >= 80 THEN 'DIAMOND 80+'
-                        WHEN diamond_score >= 70 THEN 'STRONG 70+'
-                        ELSE 'STANDARD'
-                    END as tier,
-                    COUNT(*) as total,
-                    COUNT(*) FILTER (WHERE is_resolved = true) as resolved,
-                    COUNT(*) FILTER (WHERE is_winner = true) as wins,
-                    ROUND(
-                        COUNT(*) FILTER (WHERE is_winner = true)::numeric / 
-                        NULLIF(COUNT(*) FILTER (WHERE is_resolved = true), 0) * 100, 1
-                    ) as win_rate,
-                    ROUND(SUM(profit_loss)::numeric, 2) as profit,
-                    ROUND(AVG(
-                        CASE WHEN closing_odds > 0 THEN 
-                            (odds_taken / closing_odds - 1) * 100 
-                        ELSE NULL END
-                    )::numeric, 3) as avg_clv
-                FROM tracking_clv_picks
-                WHERE created_at > NOW() - INTERVAL '%s days'
-                GROUP BY 1
-                ORDER BY tier
-            """, (days,))
-            tiers = cursor.fetchall()
+            tiers = rollup(cursor, by=('score_tier',), days=days)
             result["systems"]["by_tier"] = [
                 {
-                    "tier": t['tier'],
+                    "tier": t['score_tier'],
                     "total": t['total'],
                     "resolved": t['resolved'],
                     "wins": t['wins'],
                     "win_rate": float(t['win_rate'] or 0),
-                    "profit": float(t['profit'] or 0),
+                    "profit": round(float(t['profit'] or 0), 2),
                     "avg_clv": float(t['avg_clv'] or 0)
                 }
                 for t in tiers
             ]
             
             # 3. Performance par type de marché
-            cursor.execute("""
-                SELECT 
-                    COALESCE(market_type, 'unknown') as market,
-                    COUNT(*) as total,
-                    COUNT(*) FILTER (WHERE is_resolved = true) as resolved,
-                    COUNT(*) FILTER (WHERE is_winner = true) as wins,
-                    ROUND(
-                        COUNT(*) FILTER (WHERE is_winner = true)::numeric / 
-                        NULLIF(COUNT(*) FILTER (WHERE is_resolved = true), 0) * 100, 1
-                    ) as win_rate,
-                    ROUND(SUM(profit_loss)::numeric, 2) as profit
-                FROM tracking_clv_picks
-                WHERE created_at > NOW() - INTERVAL '%s days'
-                GROUP BY 1
-                HAVING COUNT(*) >= 5
-                ORDER BY win_rate DESC NULLS LAST
-            """, (days,))
-            markets = cursor.fetchall()
+            markets = rollup(cursor, by=('market_type',), days=days, min_picks=5)
+            markets.sort(key=lambda m: m['win_rate'] if m['win_rate'] is not None else float('-inf'), reverse=True)
             result["systems"]["by_market"] = [
                 {
-                    "market": m['market'],
+                    "market": m['market_type'],
                     "total": m['total'],
                     "resolved": m['resolved'],
                     "wins": m['wins'],
                     "win_rate": float(m['win_rate'] or 0),
-                    "profit": float(m['profit'] or 0)
+                    "profit": round(float(m['profit'] or 0), 2)
                 }
                 for m in markets
             ]
@@ -1752,23 +1686,12 @@ async def get_performance_insights(days: int = 30):
                 })
             
             # 2. Marché sous-performant
-            cursor.execute("""
-                SELECT 
-                    market_type,
-                    ROUND(
-                        COUNT(*) FILTER (WHERE is_winner = true)::numeric / 
-                        NULLIF(COUNT(*) FILTER (WHERE is_resolved = true), 0) * 100, 1
-                    ) as win_rate,
-                    COUNT(*) FILTER (WHERE is_resolved = true) as sample
-                FROM tracking_clv_picks
-                WHERE created_at > NOW() - INTERVAL '%s days'
-                AND market_type IS NOT NULL
-                GROUP BY market_type
-                HAVING COUNT(*) FILTER (WHERE is_resolved = true) >= 10
-                AND COUNT(*) FILTER (WHERE is_winner = true)::numeric / 
-                    NULLIF(COUNT(*) FILTER (WHERE is_resolved = true), 0) * 100 < 40
-            """, (days,))
-            bad_markets = cursor.fetchall()
+            markets = rollup(cursor, by=('market_type',), days=days, min_resolved=10)
+            bad_markets = [
+                {'market_type': m['market_type'], 'win_rate': m['win_rate'], 'sample': m['resolved']}
+                for m in markets
+                if m['market_type'] != 'unknown' and m['win_rate'] < 40
+            ]
             for m in bad_markets:
                 insights.append({
                     "type": "UNDERPERFORMING_MARKET",
@@ -1779,27 +1702,12 @@ async def get_performance_insights(days: int = 30):
                 })
             
             # 3. Tier surperformant
-            cursor.execute("""
-                SELECT 
-                    CASE 
-                        WHEN diamond_score >= 90 THEN 'ELITE 90+'
-                        WHEN diamond_score >= 80 THEN 'DIAMOND 80+'
-                        WHEN diamond_score >= 70 THEN 'STRONG 70+'
-                        ELSE 'STANDARD'
-                    END as tier,
-                    ROUND(
-                        COUNT(*) FILTER (WHERE is_winner = true)::numeric / 
-                        NULLIF(COUNT(*) FILTER (WHERE is_resolved = true), 0) * 100, 1
-                    ) as win_rate,
-                    COUNT(*) FILTER (WHERE is_resolved = true) as sample
-                FROM tracking_clv_picks
-                WHERE created_at > NOW() - INTERVAL '%s days'
-                GROUP BY 1
-                HAVING COUNT(*) FILTER (WHERE is_resolved = true) >= 10
-                ORDER BY win_rate DESC
-                LIMIT 1
-            """, (days,))
-            best = cursor.fetchone()
+            tiers = rollup(cursor, by=('score_tier',), days=days, min_resolved=10)
+            best = max(
+                ({'tier': t['score_tier'], 'win_rate': t['win_rate'], 'sample': t['resolved']} for t in tiers),
+                key=lambda t: t['win_rate'],
+                default=None,
+            )
             if best and best['win_rate'] >= 55:
                 insights.append({
                     "type": "BEST_PERFORMER",
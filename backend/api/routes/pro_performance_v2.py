@@ -20,6 +20,7 @@ from typing import Optional
 import structlog
 
 from api.services.database import get_db, get_cursor
+from agents.clv_tracker.clv_aggregates import rollup
 
 logger = structlog.get_logger(__name__)
 router = APIRouter(prefix="/api/pro", tags=["Pro Performance V2"])
@@ -37,99 +38,34 @@ async def get_clv_analysis(days: int = Query(30, ge=7, le=365)):
     """
     try:
         with get_cursor() as cursor:
-            # CLV Global
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total_bets,
-                    COUNT(*) FILTER (WHERE closing_odds IS NOT NULL AND closing_odds > 0) as bets_with_clv,
-                    
-                    -- CLV moyen (formule standard)
-                    ROUND(AVG(
-                        CASE WHEN closing_odds > 0 THEN 
-                            (odds_taken / closing_odds - 1) * 100 
-                        ELSE NULL END
-                    )::numeric, 3) as avg_clv_percent,
-                    
-                    -- CLV positif vs négatif
-                    COUNT(*) FILTER (WHERE closing_odds > 0 AND odds_taken > closing_odds) as positive_clv_count,
-                    COUNT(*) FILTER (WHERE closing_odds > 0 AND odds_taken <= closing_odds) as negative_clv_count,
-                    
-                    -- CLV par résultat
-                    ROUND(AVG(
-                        CASE WHEN closing_odds > 0 AND is_winner = true THEN 
-                            (odds_taken / closing_odds - 1) * 100 
-                        ELSE NULL END
-                    )::numeric, 3) as avg_clv_winners,
-                    
-                    ROUND(AVG(
-                        CASE WHEN closing_odds > 0 AND is_winner = false THEN 
-                            (odds_taken / closing_odds - 1) * 100 
-                        ELSE NULL END
-                    )::numeric, 3) as avg_clv_losers,
-                    
-                    -- Win rate pour comparaison
-                    ROUND(
-                        COUNT(*) FILTER (WHERE is_winner = true)::numeric / 
-                        NULLIF(COUNT(*) FILTER (WHERE is_resolved = true), 0) * 100, 2
-                    ) as win_rate
-                    
-                FROM tracking_clv_picks
-                WHERE created_at > NOW() - INTERVAL '%s days'
-            """, (days,))
-            
-            global_clv = cursor.fetchone()
-            
-            # CLV par tier
-            cursor.execute("""
-                SELECT 
-                    CASE 
-                        WHEN diamond_score >= 90 THEN 'ELITE 90+'
-                        WHEN diamond_score >= 80 THEN 'DIAMOND 80+'
-                        WHEN diamond_score >= 70 THEN 'STRONG 70+'
-                        ELSE 'STANDARD'
-                    END as tier,
-                    COUNT(*) as total,
-                    ROUND(AVG(
-                        CASE WHEN closing_odds > 0 THEN 
-                            (odds_taken / closing_odds - 1) * 100 
-                        ELSE NULL END
-                    )::numeric, 3) as avg_clv,
-                    ROUND(
-                        COUNT(*) FILTER (WHERE is_winner = true)::numeric / 
-                        NULLIF(COUNT(*) FILTER (WHERE is_resolved = true), 0) * 100, 2
-                    ) as win_rate
-                FROM tracking_clv_picks
-                WHERE created_at > NOW() - INTERVAL '%s days'
-                AND closing_odds IS NOT NULL AND closing_odds > 0
-                GROUP BY 1
-                ORDER BY avg_clv DESC NULLS LAST
-            """, (days,))
+            # CLV Global (agrégats journaliers)
+            totals = rollup(cursor, days=days)[0]
+            global_clv = {
+                'total_bets': totals['picks'],
+                'bets_with_clv': totals['clv_n'],
+                'avg_clv_percent': totals['avg_clv'],
+                'positive_clv_count': totals['clv_positive'],
+                'negative_clv_count': totals['clv_n'] - totals['clv_positive'],
+                'avg_clv_winners': totals['avg_clv_winners'],
+                'avg_clv_losers': totals['avg_clv_losers'],
+                'win_rate': totals['win_rate'],
+            }
             
-            clv_by_tier = cursor.fetchall()
+            # CLV par tier (picks avec closing odds)
+            clv_by_tier = [
+                {'tier': t['score_tier'], 'total': t['clv_n'], 'avg_clv': t['avg_clv'], 'win_rate': t['win_rate']}
+                for t in rollup(cursor, by=('score_tier',), days=days)
+                if t['clv_n']
+            ]
+            clv_by_tier.sort(key=lambda t: t['avg_clv'], reverse=True)
             
             # CLV par marché
-            cursor.execute("""
-                SELECT 
-                    COALESCE(market_type, 'unknown') as market,
-                    COUNT(*) as total,
-                    ROUND(AVG(
-                        CASE WHEN closing_odds > 0 THEN 
-                            (odds_taken / closing_odds - 1) * 100 
-                        ELSE NULL END
-                    )::numeric, 3) as avg_clv,
-                    ROUND(
-                        COUNT(*) FILTER (WHERE is_winner = true)::numeric / 
-                        NULLIF(COUNT(*) FILTER (WHERE is_resolved = true), 0) * 100, 2
-                    ) as win_rate
-                FROM tracking_clv_picks
-                WHERE created_at > NOW() - INTERVAL '%s days'
-                AND closing_odds IS NOT NULL AND closing_odds > 0
-                GROUP BY 1
-                HAVING COUNT(*) >= 5
-                ORDER BY avg_clv DESC NULLS LAST
-            """, (days,))
-            
-            clv_by_market = cursor.fetchall()
+            clv_by_market = [
+                {'market': m['market_type'], 'total': m['clv_n'], 'avg_clv': m['avg_clv'], 'win_rate': m['win_rate']}
+                for m in rollup(cursor, by=('market_type',), days=days)
+                if m['clv_n'] >= 5
+            ]
+            clv_by_market.sort(key=lambda m: m['avg_clv'], reverse=True)
             
             # Interpréter le CLV
             avg_clv = float(global_clv['avg_clv_percent'] or 0)
@@ -198,61 +134,31 @@ async def get_roi_analysis(days: int = Query(30, ge=7, le=365)):
     """
     try:
         with get_cursor() as cursor:
-            # ROI global (utiliser stake si disponible, sinon 1 unité par pari)
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) FILTER (WHERE is_resolved = true) as total_resolved,
-                    
-                    -- Si stake existe, l'utiliser, sinon 1 unité par pari
-                    COALESCE(SUM(
-                        CASE WHEN is_resolved = true THEN 
-                            COALESCE(stake, 1) 
-                        ELSE 0 END
-                    ), 0) as total_staked,
-                    
-                    COALESCE(SUM(profit_loss), 0) as total_profit,
-                    
-                    -- ROI
-                    ROUND(
-                        (SUM(profit_loss) / NULLIF(SUM(COALESCE(stake, 1)), 0) * 100)::numeric, 
-                    2) as roi_percent,
-                    
-                    -- Profit moyen par pari
-                    ROUND(AVG(profit_loss)::numeric, 3) as avg_profit_per_bet,
-                    
-                    -- Stats additionnelles
-                    COUNT(*) FILTER (WHERE is_winner = true) as wins,
-                    COUNT(*) FILTER (WHERE is_winner = false AND is_resolved = true) as losses,
-                    ROUND(AVG(odds_taken)::numeric, 2) as avg_odds
-                    
-                FROM tracking_clv_picks
-                WHERE created_at > NOW() - INTERVAL '%s days'
-            """, (days,))
-            
-            roi_global = cursor.fetchone()
+            # ROI global (stake si disponible, sinon 1 unité par pari) - agrégats journaliers
+            totals = rollup(cursor, days=days)[0]
+            roi_global = {
+                'total_resolved': totals['resolved'],
+                'total_staked': totals['staked'],
+                'total_profit': totals['profit'],
+                'roi_percent': totals['roi_staked'],
+                'avg_profit_per_bet': totals['avg_profit_per_bet'],
+                'wins': totals['wins'],
+                'losses': totals['losses'],
+                'avg_odds': totals['avg_odds'],
+            }
             
             # ROI par tier
-            cursor.execute("""
-                SELECT 
-                    CASE 
-                        WHEN diamond_score >= 90 THEN 'ELITE 90+'
-                        WHEN diamond_score >= 80 THEN 'DIAMOND 80+'
-                        WHEN diamond_score >= 70 THEN 'STRONG 70+'
-                        ELSE 'STANDARD'
-                    END as tier,
-                    COUNT(*) FILTER (WHERE is_resolved = true) as resolved,
-                    ROUND(SUM(COALESCE(stake, 1))::numeric, 2) as staked,
-                    ROUND(SUM(profit_loss)::numeric, 2) as profit,
-                    ROUND(
-                        (SUM(profit_loss) / NULLIF(SUM(COALESCE(stake, 1)), 0) * 100)::numeric, 
-                    2) as roi
-                FROM tracking_clv_picks
-                WHERE created_at > NOW() - INTERVAL '%s days'
-                GROUP BY 1
-                ORDER BY roi DESC NULLS LAST
-            """, (days,))
-            
-            roi_by_tier = cursor.fetchall()
+            roi_by_tier = [
+                {
+                    'tier': t['score_tier'],
+                    'resolved': t['resolved'],
+                    'staked': round(t['staked'], 2),
+                    'profit': round(t['profit'], 2),
+                    'roi': t['roi_staked'],
+                }
+                for t in rollup(cursor, by=('score_tier',), days=days)
+            ]
+            roi_by_tier.sort(key=lambda t: t['roi'] if t['roi'] is not None else float('-inf'), reverse=True)
             
             return {
                 "period_days": days,
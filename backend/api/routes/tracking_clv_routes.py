@@ -7,6 +7,7 @@ from datetime import datetime, date, timedelta
 import structlog
 from api.services.database import get_db, get_cursor
 from psycopg2.extras import RealDictCursor
+from agents.clv_tracker.clv_aggregates import rollup
 
 logger = structlog.get_logger()
 
@@ -18,25 +19,16 @@ def get_dashboard():
     """Dashboard principal avec toutes les stats"""
     try:
         with get_cursor() as cursor:
-            # Stats globales
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total_predictions,
-                    COUNT(*) FILTER (WHERE is_resolved = true) as resolved,
-                    COUNT(*) FILTER (WHERE is_resolved = true AND is_winner = true) as wins,
-                    COUNT(*) FILTER (WHERE is_resolved = true AND is_winner = false) as losses,
-                    COALESCE(AVG(clv_percentage) FILTER (WHERE clv_percentage IS NOT NULL), 0) as avg_clv,
-                    COALESCE(SUM(profit_loss), 0) as total_profit
-                FROM tracking_clv_picks
-                WHERE created_at > NOW() - INTERVAL '30 days'
-            """)
-            global_stats = cursor.fetchone()
-            
-            if not global_stats:
-                global_stats = {
-                    'total_predictions': 0, 'resolved': 0, 'wins': 0, 
-                    'losses': 0, 'avg_clv': 0, 'total_profit': 0
-                }
+            # Stats globales (agrégats journaliers)
+            totals = rollup(cursor, days=30)[0]
+            global_stats = {
+                'total_predictions': totals['picks'],
+                'resolved': totals['resolved'],
+                'wins': totals['wins'],
+                'losses': totals['losses'],
+                'avg_clv': totals['avg_clv_pct'] or 0,
+                'total_profit': totals['profit'],
+            }
             
             resolved = global_stats.get('resolved', 0) or 0
             wins = global_stats.get('wins', 0) or 0
@@ -46,22 +38,20 @@ def get_dashboard():
             roi_pct = (global_stats.get('total_profit', 0) / resolved * 100) if resolved > 0 else 0
             
             # Stats par marché
-            cursor.execute("""
-                SELECT 
-                    market_type,
-                    COUNT(*) as total_predictions,
-                    COUNT(*) FILTER (WHERE is_resolved = true) as resolved,
-                    COUNT(*) FILTER (WHERE is_resolved = true AND is_winner = true) as wins,
-                    COUNT(*) FILTER (WHERE is_resolved = true AND is_winner = false) as losses,
-                    COALESCE(AVG(clv_percentage) FILTER (WHERE clv_percentage IS NOT NULL), 0) as avg_clv,
-                    COALESCE(AVG(kelly_pct), 0) as avg_kelly,
-                    COALESCE(SUM(profit_loss), 0) as total_profit
-                FROM tracking_clv_picks
-                WHERE created_at > NOW() - INTERVAL '30 days'
-                GROUP BY market_type
-                ORDER BY COUNT(*) FILTER (WHERE is_resolved = true AND is_winner = true) DESC
-            """)
-            markets_raw = cursor.fetchall()
+            markets_raw = [
+                {
+                    'market_type': m['market_type'],
+                    'total_predictions': m['picks'],
+                    'resolved': m['resolved'],
+                    'wins': m['wins'],
+                    'losses': m['losses'],
+                    'avg_clv': m['avg_clv_pct'] or 0,
+                    'avg_kelly': m['avg_kelly'] or 0,
+                    'total_profit': m['profit'],
+                }
+                for m in rollup(cursor, by=('market_type',), days=30)
+            ]
+            markets_raw.sort(key=lambda m: m['wins'], reverse=True)
             
             by_market = []
             for m in markets_raw:
@@ -131,21 +121,15 @@ def get_performance_by_date(
     """Performance journalière"""
     try:
         with get_cursor() as cursor:
-            cursor.execute("""
-                SELECT 
-                    DATE(created_at) as date,
-                    COUNT(*) FILTER (WHERE is_winner = true) as wins,
-                    COUNT(*) FILTER (WHERE is_winner = false) as losses,
-                    COALESCE(SUM(profit_loss), 0) as total_profit
-                FROM tracking_clv_picks
-                WHERE is_resolved = true
-                AND created_at >= COALESCE(%s::date, NOW() - INTERVAL '30 days')
-                AND created_at <= COALESCE(%s::date, NOW())
-                GROUP BY DATE(created_at)
-                ORDER BY date DESC
-            """, (start_date, end_date))
-            
-            rows = cursor.fetchall()
+            today = date.today()
+            since = date.fromisoformat(start_date) if start_date else today - timedelta(days=30)
+            until = date.fromisoformat(end_date) if end_date else today
+            rows = [
+                {'date': d['day'], 'wins': d['wins'], 'losses': d['losses'], 'total_profit': d['profit']}
+                for d in rollup(cursor, by=('day',), since=since, until=until)
+                if d['resolved']
+            ]
+            rows.reverse()
             
             result = []
             cumulative = 0
@@ -0,0 +1,351 @@
+"""
+⚡ AGENTS BATCH SERVICE V1.0
+============================
+
+Analyse agents d'un slate complet pour les endpoints batch
+(/agents/patron/batch, /agents/conseil-ultim/batch).
+
+Avant: une boucle séquentielle d'analyze_match_with_agents, chacune avec sa
+propre connexion psycopg2 et ses propres requêtes (odds_history, 3 requêtes
+matches_results pour l'agent D), limitée à 20 matchs.
+
+Maintenant:
+1. load_batch_inputs: 5 requêtes pour TOUS les match_ids (odds_history,
+   stats ligue, stats domicile/extérieur groupées par équipe)
+2. stream_batch: analyses réparties sur un pool borné de threads,
+   résultats émis dès qu'un match est terminé (NDJSON côté route)
+
+Usage:
+    from api.services.agents_batch_service import load_batch_inputs, stream_batch
+
+    inputs = load_batch_inputs(conn, match_ids)
+    async for match_id, result in stream_batch(match_ids, inputs, analyze, max_workers=8):
+        ...
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger('AgentsBatchService')
+
+# Pool d'analyse: la DB n'est plus sollicitée en lecture, le coût est CPU + écritures learning
+DEFAULT_MAX_WORKERS = 8
+MAX_WORKERS = 32
+
+# Garde-fou (l'ancien plafond était 20 matchs)
+MAX_BATCH_SIZE = 500
+
+# Sport (odds_history) → league (matches_results)
+LEAGUE_MAP = {
+    "soccer_epl": "Premier League",
+    "premier": "Premier League",
+    "spain": "La Liga",
+    "la_liga": "La Liga",
+    "italy": "Serie A",
+    "serie_a": "Serie A",
+    "germany": "Bundesliga",
+    "bundesliga": "Bundesliga",
+    "france": "Ligue 1",
+    "ligue_one": "Ligue 1"
+}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# INPUTS (communs single / batch)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class MatchInputs:
+    """Entrées pré-chargées d'un match pour run_agents_analysis."""
+    match_info: Dict[str, Any]
+    league_history: Optional[Dict[str, Any]] = None
+
+
+def sport_to_league(sport: str) -> Optional[str]:
+    """Ligue matches_results correspondant au sport odds_history (None si inconnue)."""
+    sport_lower = (sport or "").lower()
+    for key, value in LEAGUE_MAP.items():
+        if key in sport_lower:
+            return value
+    return None
+
+
+def build_match_info(match_row: Sequence, odds_rows: Sequence[Sequence]) -> Dict[str, Any]:
+    """
+    match_info + résumé des cotes (best/worst/spread par outcome).
+
+    Args:
+        match_row: (match_id, home_team, away_team, sport, commence_time)
+        odds_rows: [(bookmaker, home_odds, away_odds, draw_odds), ...]
+    """
+    match_info = {
+        "match_id": match_row[0], "home_team": match_row[1],
+        "away_team": match_row[2], "sport": match_row[3],
+        "commence_time": str(match_row[4])
+    }
+
+    if odds_rows:
+        home_odds = [float(r[1]) for r in odds_rows if r[1]]
+        away_odds = [float(r[2]) for r in odds_rows if r[2]]
+        draw_odds = [float(r[3]) for r in odds_rows if r[3]]
+
+        best_home = max(home_odds) if home_odds else 0
+        best_away = max(away_odds) if away_odds else 0
+        best_draw = max(draw_odds) if draw_odds else 0
+        worst_home = min(home_odds) if home_odds else 0
+        worst_away = min(away_odds) if away_odds else 0
+        worst_draw = min(draw_odds) if draw_odds else 0
+
+        spread_home = ((best_home - worst_home) / worst_home * 100) if worst_home > 0 else 0
+        spread_away = ((best_away - worst_away) / worst_away * 100) if worst_away > 0 else 0
+        spread_draw = ((best_draw - worst_draw) / worst_draw * 100) if worst_draw > 0 else 0
+
+        match_info["odds"] = {
+            "home": {"best": best_home, "worst": worst_home, "spread_pct": round(spread_home, 2)},
+            "away": {"best": best_away, "worst": worst_away, "spread_pct": round(spread_away, 2)},
+            "draw": {"best": best_draw, "worst": worst_draw, "spread_pct": round(spread_draw, 2)}
+        }
+        match_info["bookmaker_count"] = len(set([r[0] for r in odds_rows]))
+    else:
+        match_info["odds"] = {}
+        match_info["bookmaker_count"] = 0
+
+    return match_info
+
+
+def load_league_history(cursor, league: str, home_team: str, away_team: str) -> Dict[str, Any]:
+    """Stats matches_results de l'agent D pour un match (3 requêtes)."""
+    cursor.execute("""
+        SELECT
+            COUNT(*) as total,
+            SUM(CASE WHEN result = 'H' THEN 1 ELSE 0 END) as home_wins,
+            SUM(CASE WHEN result = 'D' THEN 1 ELSE 0 END) as draws,
+            SUM(CASE WHEN result = 'A' THEN 1 ELSE 0 END) as away_wins,
+            AVG(home_goals) as avg_home_goals,
+            AVG(away_goals) as avg_away_goals
+        FROM matches_results
+        WHERE league = %s
+    """, (league,))
+    history = _league_row(cursor.fetchone())
+
+    cursor.execute("""
+        SELECT
+            COUNT(*) as matches,
+            SUM(CASE WHEN result = 'H' THEN 1 ELSE 0 END) as wins
+        FROM matches_results
+        WHERE league = %s AND home_team ILIKE %s
+    """, (league, f"%{home_team}%"))
+    team_home = cursor.fetchone() or {}
+    history["team_home_matches"] = team_home.get('matches') or 0
+    history["team_home_wins"] = team_home.get('wins') or 0
+
+    cursor.execute("""
+        SELECT
+            COUNT(*) as matches,
+            SUM(CASE WHEN result = 'A' THEN 1 ELSE 0 END) as wins
+        FROM matches_results
+        WHERE league = %s AND away_team ILIKE %s
+    """, (league, f"%{away_team}%"))
+    team_away = cursor.fetchone() or {}
+    history["team_away_matches"] = team_away.get('matches') or 0
+    history["team_away_wins"] = team_away.get('wins') or 0
+
+    return history
+
+
+def _league_row(row: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    row = row or {}
+    return {
+        "total": row.get('total') or 0,
+        "home_wins": row.get('home_wins') or 0,
+        "draws": row.get('draws') or 0,
+        "away_wins": row.get('away_wins') or 0,
+        "avg_home_goals": float(row.get('avg_home_goals') or 0),
+        "avg_away_goals": float(row.get('avg_away_goals') or 0),
+    }
+
+
+def _team_totals(rows: List[Dict[str, Any]], team: str) -> Tuple[int, int]:
+    """Équivalent mémoire de `team ILIKE %team%` sur des lignes groupées par équipe."""
+    team_lower = team.lower()
+    matches = wins = 0
+    for row in rows:
+        if team_lower in (row['team'] or '').lower():
+            matches += row['matches'] or 0
+            wins += row['wins'] or 0
+    return matches, wins
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BULK LOADER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def load_batch_inputs(conn, match_ids: Sequence[str]) -> Dict[str, MatchInputs]:
+    """
+    Charge les entrées agents de tous les matchs en 5 requêtes.
+
+    Les match_ids absents d'odds_history ne figurent pas dans le résultat.
+    """
+    from psycopg2.extras import RealDictCursor
+
+    ids = list(dict.fromkeys(match_ids))
+    if not ids:
+        return {}
+
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT DISTINCT ON (match_id) match_id, home_team, away_team, sport, commence_time
+        FROM odds_history WHERE match_id = ANY(%s)
+    """, (ids,))
+    match_rows = {row[0]: row for row in cur.fetchall()}
+
+    cur.execute("""
+        SELECT match_id, bookmaker, home_odds, away_odds, draw_odds
+        FROM odds_history WHERE match_id = ANY(%s) ORDER BY collected_at DESC
+    """, (ids,))
+    odds_by_match: Dict[str, List[Tuple]] = {}
+    for row in cur.fetchall():
+        odds_by_match.setdefault(row[0], []).append(row[1:])
+    cur.close()
+
+    inputs = {
+        match_id: MatchInputs(build_match_info(row, odds_by_match.get(match_id, [])))
+        for match_id, row in match_rows.items()
+    }
+
+    leagues = sorted({
+        league for league in (sport_to_league(i.match_info["sport"]) for i in inputs.values()) if league
+    })
+    if leagues:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute("""
+            SELECT
+                league,
+                COUNT(*) as total,
+                SUM(CASE WHEN result = 'H' THEN 1 ELSE 0 END) as home_wins,
+                SUM(CASE WHEN result = 'D' THEN 1 ELSE 0 END) as draws,
+                SUM(CASE WHEN result = 'A' THEN 1 ELSE 0 END) as away_wins,
+                AVG(home_goals) as avg_home_goals,
+                AVG(away_goals) as avg_away_goals
+            FROM matches_results
+            WHERE league = ANY(%s)
+            GROUP BY league
+        """, (leagues,))
+        league_stats = {row['league']: row for row in cur.fetchall()}
+
+        cur.execute("""
+            SELECT league, home_team as team, COUNT(*) as matches,
+                   SUM(CASE WHEN result = 'H' THEN 1 ELSE 0 END) as wins
+            FROM matches_results
+            WHERE league = ANY(%s)
+            GROUP BY league, home_team
+        """, (leagues,))
+        home_rows: Dict[str, List[Dict[str, Any]]] = {}
+        for row in cur.fetchall():
+            home_rows.setdefault(row['league'], []).append(row)
+
+        cur.execute("""
+            SELECT league, away_team as team, COUNT(*) as matches,
+                   SUM(CASE WHEN result = 'A' THEN 1 ELSE 0 END) as wins
+            FROM matches_results
+            WHERE league = ANY(%s)
+            GROUP BY league, away_team
+        """, (leagues,))
+        away_rows: Dict[str, List[Dict[str, Any]]] = {}
+        for row in cur.fetchall():
+            away_rows.setdefault(row['league'], []).append(row)
+        cur.close()
+
+        for match_inputs in inputs.values():
+            info = match_inputs.match_info
+            league = sport_to_league(info["sport"])
+            if not league:
+                continue
+            history = _league_row(league_stats.get(league))
+            history["team_home_matches"], history["team_home_wins"] = _team_totals(
+                home_rows.get(league, []), info["home_team"] or "")
+            history["team_away_matches"], history["team_away_wins"] = _team_totals(
+                away_rows.get(league, []), info["away_team"] or "")
+            match_inputs.league_history = history
+
+    logger.info(f"Batch inputs loaded: {len(inputs)}/{len(ids)} matches, {len(leagues)} leagues")
+    return inputs
+
+
+def load_conseil_outcomes(conn, match_ids: Sequence[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Cotes moyennes par outcome (table odds) de tous les matchs, en une requête."""
+    from psycopg2.extras import RealDictCursor
+
+    ids = list(dict.fromkeys(match_ids))
+    if not ids:
+        return {}
+
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    cur.execute("""
+        SELECT
+            match_id,
+            outcome,
+            AVG(odds_value) as avg_cote,
+            COUNT(*) as nb_bookmakers,
+            home_team,
+            away_team
+        FROM odds
+        WHERE match_id = ANY(%s)
+        GROUP BY match_id, outcome, home_team, away_team
+    """, (ids,))
+    outcomes: Dict[str, List[Dict[str, Any]]] = {}
+    for row in cur.fetchall():
+        outcomes.setdefault(row['match_id'], []).append(row)
+    cur.close()
+    return outcomes
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FAN-OUT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+async def stream_batch(
+    match_ids: Sequence[str],
+    inputs: Dict[str, MatchInputs],
+    analyze: Callable[[str, MatchInputs], Dict[str, Any]],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    on_missing: Optional[Callable[[str], Dict[str, Any]]] = None,
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Exécute analyze(match_id, inputs) en parallèle et émet (match_id, résultat)
+    dans l'ordre de complétion.
+
+    Args:
+        match_ids: Matchs demandés (doublons ignorés)
+        inputs: Sortie de load_batch_inputs
+        analyze: Fonction sync (exécutée dans un thread); ses exceptions
+                 sont propagées au consommateur via le résultat {"error": ...}
+        max_workers: Nombre maximum d'analyses simultanées (>= 1)
+        on_missing: Résultat pour un match absent des inputs (sinon ignoré)
+    """
+    if max_workers < 1:
+        raise ValueError(f"max_workers doit être >= 1 (reçu {max_workers})")
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def run(match_id: str) -> Tuple[str, Dict[str, Any]]:
+        async with semaphore:
+            try:
+                return match_id, await asyncio.to_thread(analyze, match_id, inputs[match_id])
+            except Exception as e:
+                logger.warning(f"Batch analysis failed for {match_id}: {e}")
+                return match_id, {"error": str(e)}
+
+    ids = list(dict.fromkeys(match_ids))
+    for match_id in ids:
+        if match_id not in inputs and on_missing is not None:
+            yield match_id, on_missing(match_id)
+
+    tasks = [asyncio.create_task(run(match_id)) for match_id in ids if match_id in inputs]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,483 @@
+"""
+📡 LIVE UPDATES - Deltas poussés aux dashboards et au bot
+==========================================================
+
+Avant: dashboards et bot Telegram pollaient /odds, /api/pro/command-center
+et /api/ferrari/monitoring pour voir si quelque chose avait bougé, et
+chaque poll relançait les mêmes requêtes lourdes, match en cours ou non.
+
+Maintenant:
+1. Les producteurs publient des deltas (Delta: kind, match_id, league, data, match_key)
+   - collecteur de cotes (scripts/collect_all_odds.py): meilleures cotes
+     par match et marché, dans la transaction d'insertion
+   - pricing in-play (SmartCacheEnhanced.push_in_play) et recalcul des
+     prédictions (BrainRepository)
+   - règlement: le NOTIFY picks_resolved du settlement_service et le
+     NOTIFY calibration_drift du calibration_monitor sont repris tels quels
+2. Transport: NOTIFY live_updates (visible au commit du producteur), ou
+   LIVE_UPDATES_BACKEND=local: bus en mémoire du process (dev, tests)
+3. LiveHub: un seul LISTEN par worker API, fan-out vers des files asyncio
+   bornées par abonné, filtrées par match / ligue / type
+   (routes: /api/live/stream en SSE, /api/live/ws en WebSocket)
+
+Identifiants de match (filtre matches=): chaque producteur garde le sien
+dans match_id, et les deltas d'un match portent tous la même match_key
+(match_key(home, away): "arsenal_vs_chelsea"). Filtrer par match_key suit
+donc un match quel que soit le type de delta.
+    kind        match_id                        league              match_key
+    odds        event id The Odds API           sport (soccer_epl)  oui
+    in_play     clé du cache (= match_key)      si fournie          oui
+    prediction  clé de prédiction (m_<key>)     apprise des odds    oui
+    settlement  match_id de match_results       -                   -
+    calibration -                               -                   -
+Le brain ne connaît pas la ligue: le hub retient la ligue des deltas odds
+par match_key et la reporte sur les deltas du même match qui n'en ont pas.
+Un delta sans ligue connue (match jamais collecté, settlement,
+calibration) passe le filtre leagues=.
+
+Un client lent perd ses plus vieux deltas (compteur dropped), il ne bloque
+ni le listener ni les autres abonnés. Un delta trop gros pour NOTIFY part
+sans `data` (truncated): le client relit la route REST, une fois.
+
+Sans curseur producteur (cache, BrainRepository), publish() ne fait que
+déposer les deltas dans une file bornée: un thread unique les envoie par
+lots, et attend (backoff exponentiel) quand Postgres est indisponible.
+L'appelant ne bloque jamais sur une connexion.
+
+Usage:
+    from api.services.live_updates import Delta, publish, hub
+
+    publish([Delta("odds", event_id, league="soccer_epl", data={...},
+                   match_key=match_key(home, away))], cur)
+    publish_delta("in_play", match_id, data={...})   # sans curseur: file
+    sub = hub.subscribe(matches={"abc"}, kinds={"odds", "in_play"})
+    delta = await sub.get(timeout=15)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import queue
+import select
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger('LiveUpdates')
+
+CHANNEL = "live_updates"
+# Canaux existants repris par le hub (settlement_service, calibration_monitor)
+SETTLEMENT_CHANNEL = "picks_resolved"
+CALIBRATION_CHANNEL = "calibration_drift"
+LISTEN_CHANNELS = (CHANNEL, SETTLEMENT_CHANNEL, CALIBRATION_CHANNEL)
+
+# 'postgres' (NOTIFY/LISTEN) ou 'local' (bus en mémoire, un seul process)
+BACKEND = os.getenv("LIVE_UPDATES_BACKEND", "postgres")
+
+# Limite Postgres: 8000 octets par payload NOTIFY
+NOTIFY_LIMIT = 7900
+
+# File par abonné: au-delà, les plus vieux deltas sont perdus
+QUEUE_SIZE = 256
+
+LISTEN_TIMEOUT = 5.0
+RECONNECT_SECONDS = 5.0
+
+# Ligues retenues par match_key (reportées sur les deltas prediction / in_play)
+LEAGUE_MEMORY = 5000
+
+# Publication sans curseur: file du thread d'envoi, taille d'un lot NOTIFY,
+# backoff après un échec (doublé à chaque échec, plafonné)
+PUBLISH_QUEUE_SIZE = 1024
+PUBLISH_BATCH = 100
+PUBLISH_BACKOFF_MIN = 1.0
+PUBLISH_BACKOFF_MAX = 60.0
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# DELTAS
+# ═══════════════════════════════════════════════════════════════════════
+
+def match_key(home_team: str, away_team: str) -> str:
+    """
+    Clé de match commune à tous les producteurs (cache de prédiction inclus).
+
+    Sans accents, minuscules, espaces / tirets → "_":
+    ("Saint-Étienne", "Manchester United") → "saint_etienne_vs_manchester_united"
+    """
+    def normalize(team: str) -> str:
+        ascii_name = unicodedata.normalize('NFKD', team).encode('ASCII', 'ignore').decode('ASCII')
+        return ascii_name.lower().replace(" ", "_").replace("-", "_")
+
+    return f"{normalize(home_team)}_vs_{normalize(away_team)}"
+
+
+@dataclass
+class Delta:
+    """Un changement poussé aux abonnés (odds, in_play, prediction, settlement, calibration)."""
+    kind: str
+    match_id: Optional[str] = None
+    league: Optional[str] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+    match_key: Optional[str] = None
+    at: float = field(default_factory=time.time)
+    truncated: bool = False
+
+    def to_json(self) -> str:
+        """Payload compact; sans `data` (truncated) au-delà de NOTIFY_LIMIT."""
+        payload = json.dumps(asdict(self), separators=(',', ':'), default=str)
+        if len(payload.encode()) <= NOTIFY_LIMIT:
+            return payload
+        slim = Delta(self.kind, self.match_id, self.league, match_key=self.match_key,
+                     at=self.at, truncated=True)
+        return json.dumps(asdict(slim), separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, payload: str) -> "Delta":
+        return cls(**json.loads(payload))
+
+
+def from_notify(channel: str, payload: str) -> List[Delta]:
+    """Notification Postgres → deltas (canal live_updates ou canaux repris)."""
+    if channel == CHANNEL:
+        return [Delta.from_json(payload)]
+    event = json.loads(payload)
+    if channel == SETTLEMENT_CHANNEL:
+        summary = {k: v for k, v in event.items() if k != 'match_ids'}
+        return [Delta("settlement", match_id, data=summary) for match_id in event.get('match_ids', [])]
+    if channel == CALIBRATION_CHANNEL:
+        return [Delta("calibration", data={'alerts': event})]
+    return []
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# PUBLICATION
+# ═══════════════════════════════════════════════════════════════════════
+
+def _connect():
+    from api.services.database import get_db_connection
+    return get_db_connection()
+
+
+def _notify(cur, deltas: List[Delta]) -> None:
+    # Un seul aller-retour pour tout le lot
+    cur.execute(
+        "SELECT pg_notify(%s, payload) FROM unnest(%s::text[]) AS payload",
+        (CHANNEL, [delta.to_json() for delta in deltas])
+    )
+
+
+class BackgroundPublisher:
+    """
+    Envoi des deltas publiés sans curseur: file bornée + un thread.
+
+    submit() ne fait jamais d'I/O: file pleine → le plus vieux delta est
+    perdu (compteur dropped). Le thread vide la file par lots de
+    PUBLISH_BATCH sur une connexion autocommit; après un échec, le lot est
+    perdu et la connexion n'est retentée qu'après le backoff (1s, 2s, 4s...
+    jusqu'à PUBLISH_BACKOFF_MAX), au lieu d'un timeout de connexion par appel.
+    """
+
+    def __init__(self, connect: Optional[Callable] = None, maxsize: int = PUBLISH_QUEUE_SIZE,
+                 backoff_min: float = PUBLISH_BACKOFF_MIN, backoff_max: float = PUBLISH_BACKOFF_MAX):
+        self.connect = connect or _connect
+        self.queue: queue.Queue = queue.Queue(maxsize)
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+        self.backoff = 0.0
+        self.retry_at = 0.0
+        self.counters = {'published': 0, 'dropped': 0, 'failures': 0}
+        self._conn = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, deltas: List[Delta]) -> int:
+        """Met les deltas en file (jamais bloquant), retourne leur nombre."""
+        self.start()
+        for delta in deltas:
+            while True:
+                try:
+                    self.queue.put_nowait(delta)
+                    break
+                except queue.Full:
+                    try:
+                        self.queue.get_nowait()
+                        self.queue.task_done()
+                        self.counters['dropped'] += 1
+                    except queue.Empty:
+                        pass
+        return len(deltas)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="live-publish", daemon=True)
+            self._thread.start()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Attend que la file soit traitée (tests, arrêt propre)."""
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return not self.queue.unfinished_tasks
+
+    def _run(self) -> None:
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < PUBLISH_BATCH:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._send(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def _send(self, batch: List[Delta]) -> None:
+        wait = self.retry_at - time.monotonic()
+        if wait > 0:  # Postgres indisponible: les deltas attendent dans la file bornée
+            time.sleep(wait)
+        try:
+            if self._conn is None or self._conn.closed:
+                self._conn = self.connect()
+                self._conn.autocommit = True
+            with self._conn.cursor() as cur:
+                _notify(cur, batch)
+            self.counters['published'] += len(batch)
+            self.backoff = 0.0
+        except Exception as e:
+            self.counters['failures'] += 1
+            self.backoff = min(max(self.backoff * 2, self.backoff_min), self.backoff_max)
+            self.retry_at = time.monotonic() + self.backoff
+            logger.warning(f"⚠️ Live updates non publiés ({len(batch)}): {e}, "
+                           f"nouvel essai dans {self.backoff:.0f}s")
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                except Exception:
+                    pass
+            self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, 'queued': self.queue.qsize(), 'backoff': self.backoff}
+
+
+def publish(deltas: Iterable[Delta], cur=None) -> int:
+    """
+    Publie des deltas, retourne le nombre publié (ou mis en file).
+
+    Avec `cur`: NOTIFY dans la transaction du producteur (livré au commit,
+    perdu au rollback, comme picks_resolved). Sans `cur`: file du
+    BackgroundPublisher; l'appelant (cache, prédiction) ne fait aucune I/O
+    et ne voit jamais d'erreur de diffusion.
+    """
+    deltas = list(deltas)
+    if not deltas:
+        return 0
+    if hub.backend == "local":
+        for delta in deltas:
+            hub.dispatch(delta)
+        return len(deltas)
+    if cur is not None:
+        _notify(cur, deltas)
+        return len(deltas)
+    return publisher.submit(deltas)
+
+
+def publish_delta(kind: str, match_id: Optional[str] = None, league: Optional[str] = None,
+                  data: Optional[Dict[str, Any]] = None, match_key: Optional[str] = None) -> int:
+    """Un delta, sans curseur (callback des couches qui n'importent pas Delta, ex: le cache)."""
+    return publish([Delta(kind, match_id, league, data or {}, match_key)])
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# FAN-OUT
+# ═══════════════════════════════════════════════════════════════════════
+
+class Subscription:
+    """
+    File d'un client. Un filtre vide laisse tout passer; un delta sans
+    match / ligue (calibration, règlement) passe les filtres correspondants.
+    Le filtre matches accepte le match_id du producteur ou la match_key.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop,
+                 matches: Optional[Set[str]] = None,
+                 leagues: Optional[Set[str]] = None,
+                 kinds: Optional[Set[str]] = None,
+                 maxsize: int = QUEUE_SIZE):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.dropped = 0
+        self.set_filters(matches, leagues, kinds)
+
+    def set_filters(self, matches=None, leagues=None, kinds=None) -> None:
+        self.matches = set(matches) if matches else None
+        self.leagues = set(leagues) if leagues else None
+        self.kinds = set(kinds) if kinds else None
+
+    def accepts(self, delta: Delta) -> bool:
+        if self.kinds and delta.kind not in self.kinds:
+            return False
+        if self.matches:
+            ids = {delta.match_id, delta.match_key} - {None}
+            if ids and not ids & self.matches:
+                return False
+        if self.leagues and delta.league is not None and delta.league not in self.leagues:
+            return False
+        return True
+
+    def put(self, delta: Delta) -> None:
+        """Sur la boucle de l'abonné: le plus vieux delta cède sa place si la file est pleine."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(delta)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Delta]:
+        """Prochain delta, None après `timeout` secondes (keepalive côté route)."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LiveHub:
+    """
+    Fan-out des deltas vers les abonnés du worker.
+
+    Le listener Postgres tourne dans un thread (LISTEN sur LISTEN_CHANNELS,
+    reconnexion automatique); dispatch() est thread-safe et remet chaque
+    delta sur la boucle asyncio de l'abonné.
+    """
+
+    def __init__(self, backend: str = BACKEND, connect: Optional[Callable] = None,
+                 channels=LISTEN_CHANNELS):
+        self.backend = backend
+        self.connect = connect or _connect
+        self.channels = tuple(channels)
+        self._subscribers: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._leagues: "OrderedDict[str, str]" = OrderedDict()
+        self.listening = False
+        self.counters = {'received': 0, 'delivered': 0}
+
+    # ─── Abonnés ──────────────────────────────────────────────────────────
+
+    def subscribe(self, matches=None, leagues=None, kinds=None, maxsize: int = QUEUE_SIZE) -> Subscription:
+        """À appeler depuis la boucle asyncio qui consommera la file."""
+        sub = Subscription(asyncio.get_running_loop(), matches, leagues, kinds, maxsize)
+        with self._lock:
+            self._subscribers.append(sub)
+        self.start()
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+
+    def dispatch(self, delta: Delta) -> int:
+        """Remet le delta aux abonnés intéressés, retourne leur nombre."""
+        with self._lock:
+            self._resolve_league(delta)
+            targets = [sub for sub in self._subscribers if sub.accepts(delta)]
+        for sub in targets:
+            try:
+                sub.loop.call_soon_threadsafe(sub.put, delta)
+            except RuntimeError:  # boucle fermée: client parti
+                self.unsubscribe(sub)
+        self.counters['received'] += 1
+        self.counters['delivered'] += len(targets)
+        return len(targets)
+
+    def _resolve_league(self, delta: Delta) -> None:
+        """Retient la ligue d'un match_key, la reporte sur les deltas qui n'en ont pas."""
+        if delta.match_key is None:
+            return
+        if delta.league is None:
+            delta.league = self._leagues.get(delta.match_key)
+            return
+        self._leagues[delta.match_key] = delta.league
+        self._leagues.move_to_end(delta.match_key)
+        if len(self._leagues) > LEAGUE_MEMORY:
+            self._leagues.popitem(last=False)
+
+    # ─── Listener Postgres ────────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Démarre le LISTEN (une fois par process; rien en backend local)."""
+        if self.backend != "postgres" or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._listen_loop, name="live-updates", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _listen_loop(self) -> None:
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self.connect()
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    for channel in self.channels:
+                        cur.execute(f"LISTEN {channel}")
+                self.listening = True
+                logger.info(f"👂 LISTEN {', '.join(self.channels)}")
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], LISTEN_TIMEOUT) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        self._on_notify(notify.channel, notify.payload)
+            except Exception as e:
+                logger.warning(f"⚠️ Listener live updates: {e}, reconnexion dans {RECONNECT_SECONDS}s")
+                self._stop.wait(RECONNECT_SECONDS)
+            finally:
+                self.listening = False
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+    def _on_notify(self, channel: str, payload: str) -> None:
+        try:
+            deltas = from_notify(channel, payload)
+        except (ValueError, TypeError) as e:
+            logger.warning(f"⚠️ Payload {channel} illisible: {e}")
+            return
+        for delta in deltas:
+            self.dispatch(delta)
+
+    # ─── Monitoring ───────────────────────────────────────────────────────
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        return {
+            'backend': self.backend,
+            'listening': self.listening,
+            'subscribers': len(subscribers),
+            'received': self.counters['received'],
+            'delivered': self.counters['delivered'],
+            'dropped': sum(sub.dropped for sub in subscribers),
+            'queued': sum(sub.queue.qsize() for sub in subscribers),
+        }
+
+
+hub = LiveHub()
+publisher = BackgroundPublisher()
@@ -60,9 +60,9 @@ class DatabasePool:
     _pool = None
     
     def __new__(cls):
+        # Pool ouvert à la première connexion demandée (get_connection), pas à l'import
         if cls._instance is None:
             cls._instance = super().__new__(cls)
-            cls._instance._initialize_pool()
         return cls._instance
     
     def _initialize_pool(self):
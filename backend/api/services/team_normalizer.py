@@ -31,7 +31,12 @@ class TeamNormalizer:
     def __init__(self):
         self._cache: Dict[str, str] = {}
         self._reverse_cache: Dict[str, List[str]] = {}
-        self._load_mappings()
+        self._loaded = False  # Mappings chargés au premier appel (pas à l'import)
+    
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self._loaded = True
+            self._load_mappings()
     
     def _get_connection(self):
         return psycopg2.connect(**DB_CONFIG)
@@ -101,6 +106,7 @@ class TeamNormalizer:
         """
         if not team_name:
             return team_name
+        self._ensure_loaded()
             
         # Essayer le cache direct
         key = team_name.lower().strip()
@@ -130,6 +136,7 @@ class TeamNormalizer:
     
     def get_all_aliases(self, canonical_name: str) -> List[str]:
         """Retourne tous les alias d'une équipe"""
+        self._ensure_loaded()
         return self._reverse_cache.get(canonical_name, [])
     
     def get_sql_pattern(self, team_name: str) -> str:
@@ -148,6 +155,7 @@ class TeamNormalizer:
         """Recharge les mappings depuis la DB"""
         self._cache.clear()
         self._reverse_cache.clear()
+        self._loaded = True
         self._load_mappings()
 
 
@@ -0,0 +1,105 @@
+"""
+Profil du démarrage de l'API
+
+Mesure le temps d'import de api.main module par module (python -X importtime
+dans un process neuf, donc sans modules déjà en cache) et, avec --routers,
+le coût de chargement de chaque router paresseux.
+
+Usage:
+    python -m api.startup_profile                  # top 25 + contrôle du budget
+    python -m api.startup_profile --routers        # + temps de chaque router
+    python -m api.startup_profile --budget 1.5 --top 40
+
+Code de sortie 1 si l'import de api.main dépasse le budget.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+# Budget d'import de api.main (secondes, process neuf) - vérifié par les tests
+STARTUP_BUDGET_SECONDS = 2.0
+
+BACKEND_ROOT = Path(__file__).resolve().parent.parent
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_seconds: float
+    cumulative_seconds: float
+    depth: int
+
+
+def profile_imports(target: str = "api.main") -> Tuple[float, List[ImportTiming]]:
+    """
+    Importe `target` dans un interpréteur neuf avec -X importtime.
+    Retourne (durée totale mesurée de l'extérieur, timings par module).
+    """
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(BACKEND_ROOT), os.environ.get("PYTHONPATH")]))}
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=BACKEND_ROOT, env=env, capture_output=True, text=True,
+    )
+    total = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {target} failed:\n{proc.stderr[-2000:]}")
+
+    timings = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings.append(ImportTiming(
+            module=name.strip(),
+            self_seconds=int(self_us) / 1e6,
+            cumulative_seconds=int(cumulative_us) / 1e6,
+            depth=(len(name) - len(name.lstrip())) // 2,
+        ))
+    return total, timings
+
+
+def profile_routers() -> List[Tuple[str, Optional[float], Optional[str]]]:
+    """Charge chaque router de main.ROUTERS: (module, secondes, erreur)."""
+    from api.main import lazy_routers
+
+    results = []
+    for spec in lazy_routers.specs:
+        t0 = time.perf_counter()
+        try:
+            lazy_routers.load(spec)
+            results.append((spec.module, time.perf_counter() - t0, None))
+        except Exception as e:
+            results.append((spec.module, None, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Temps d'import de api.main par module")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_SECONDS, help="Budget (s)")
+    parser.add_argument("--top", type=int, default=25, help="Modules affichés (par temps cumulé)")
+    parser.add_argument("--routers", action="store_true", help="Mesurer aussi le chargement de chaque router")
+    args = parser.parse_args(argv)
+
+    total, timings = profile_imports()
+    print(f"{'cumulé ms':>10} {'self ms':>9}  module")
+    for t in sorted(timings, key=lambda t: t.cumulative_seconds, reverse=True)[:args.top]:
+        print(f"{t.cumulative_seconds * 1000:>10.1f} {t.self_seconds * 1000:>9.1f}  {'  ' * t.depth}{t.module}")
+
+    if args.routers:
+        print(f"\n{'router ms':>10}  module")
+        for module, seconds, error in sorted(profile_routers(), key=lambda r: -(r[1] or 0)):
+            print(f"{'FAILED' if error else f'{seconds * 1000:.1f}':>10}  {module}{'  ' + error if error else ''}")
+
+    status = "OK" if total <= args.budget else "OVER BUDGET"
+    print(f"\nimport api.main: {total:.2f}s (budget {args.budget:.2f}s) {status}")
+    return 0 if total <= args.budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
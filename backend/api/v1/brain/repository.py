@@ -4,17 +4,22 @@ Pattern: Dependency Injection + Circuit Breaker (Institutional Grade)
 """
 import logging
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List
 
 # Cache integration
 from cache.smart_cache import smart_cache
 from cache.key_factory import key_factory
 from cache.metrics import cache_metrics  # Direct instrumentation
-import unicodedata  # For team name normalization
+from cache.brain_metrics import brain_stage_metrics  # Per-stage brain histograms
+from api.services.live_updates import match_key, publish_delta  # Live deltas (/api/live)
 
 logger = logging.getLogger(__name__)
 
+# Goalscorer endpoint: league-average xG when no cached prediction exists yet
+DEFAULT_EXPECTED_GOALS = {"home": 1.5, "away": 1.2}
+GOALSCORERS_PER_TEAM = 5
+
 
 class BrainRepository:
     """
@@ -24,14 +29,18 @@ class BrainRepository:
     Implements circuit breaker pattern for robustness.
     """
 
-    def __init__(self, brain_client=None):
+    def __init__(self, brain_client=None, goalscorer_calculator=None):
         """
         Initialize repository
 
         Args:
             brain_client: Optional UnifiedBrain instance (for DI in tests)
                          If None, initializes real UnifiedBrain
+            goalscorer_calculator: Optional GoalscorerCalculator (for DI in tests)
+                         If None, resolved lazily from quantum_core
         """
+        self._goalscorer_calculator = goalscorer_calculator
+
         if brain_client is not None:
             # Dependency injection (tests)
             self.brain = brain_client
@@ -42,6 +51,11 @@ class BrainRepository:
             # Production initialization
             self._initialize_production_brain()
 
+        # Per-stage spans -> Prometheus histograms (mocks without instrumentation skip this)
+        instrumentation = getattr(self.brain, "instrumentation", None)
+        if instrumentation is not None and hasattr(instrumentation, "add_sink"):
+            instrumentation.add_sink(brain_stage_metrics.record_trace)
+
         # Register X-Fetch callback for background refresh
         if smart_cache.enabled:
             smart_cache.set_refresh_callback(self._xfetch_refresh_callback)
@@ -85,6 +99,21 @@ class BrainRepository:
         if str(quantum_core_path) not in sys.path:
             sys.path.insert(0, str(quantum_core_path))
 
+        # Persistent brain worker (preloaded engines, hot data reload) when configured
+        import os
+        if os.getenv("BRAIN_WORKER_ADDRESS"):
+            from brain.worker import BrainClient, BrainWorkerUnavailable
+            client = BrainClient()
+            try:
+                client.ping()
+                self.brain = client
+                self.version = "2.8.0"
+                self.env = f"{self.env}+WORKER"
+                logger.info(f"UnifiedBrain worker connected at {client.address}")
+                return
+            except BrainWorkerUnavailable as e:
+                logger.warning(f"{e} - falling back to in-process UnifiedBrain")
+
         # Import UnifiedBrain
         try:
             from brain.unified_brain import UnifiedBrain
@@ -100,30 +129,58 @@ class BrainRepository:
                 f"Failed to initialize UnifiedBrain: {e}"
             )
 
-    def _normalize_team_name(self, team: str) -> str:
-        """Normalize team name for consistent cache keys.
+    def _match_key(self, home_team: str, away_team: str) -> str:
+        """Match key shared by the prediction and in-play markets cache keys.
 
-        Removes accents, converts to lowercase, replaces spaces/dashes with underscores.
+        Same key as the live deltas (live_updates.match_key): accents removed,
+        lowercase, spaces/dashes → underscores.
 
         Examples:
-            "Manchester United" → "manchester_united"
-            "Saint-Étienne" → "saint_etienne"
-            "Liverpool" → "liverpool"
+            ("Manchester United", "Saint-Étienne") → "manchester_united_vs_saint_etienne"
+        """
+        return match_key(home_team, away_team)
 
-        Args:
-            team: Original team name
+    def _prediction_cache_key(self, home_team: str, away_team: str) -> str:
+        """Prediction cache key for a match (normalized team names)."""
+        return key_factory.prediction_key(
+            match_id=self._match_key(home_team, away_team),
+            config=None  # dna_context not used by UnifiedBrain V2.8.0
+        )
+
+    def _in_play_result(self, home_team: str, away_team: str,
+                        match_date: datetime) -> Optional[Dict[str, Any]]:
+        """Live prices pushed by SmartCacheEnhanced.push_in_play, in the prediction format.
+
+        Only looked up from 24h before match_date (a date at midnight for
+        the /calculate route): no Redis round-trip for pre-match requests.
 
         Returns:
-            Normalized team name for cache key
+            Prediction dict (markets, calculation_time, brain_version,
+            created_at, in_play state) or None if the match is not priced live
         """
-        # Remove accents (NFD decomposition)
-        normalized = unicodedata.normalize('NFKD', team)
-        normalized = normalized.encode('ASCII', 'ignore').decode('ASCII')
-
-        # Lowercase + replace spaces/dashes with underscores
-        normalized = normalized.lower().replace(" ", "_").replace("-", "_")
+        if match_date.tzinfo is None:
+            match_date = match_date.replace(tzinfo=timezone.utc)
+        if (match_date - datetime.now(timezone.utc)).total_seconds() > 86400:
+            return None
 
-        return normalized
+        try:
+            live, _ = smart_cache.get(key_factory.markets_key(self._match_key(home_team, away_team)))
+        except Exception:
+            return None
+        if not live or "markets" not in live:
+            return None
+
+        cache_metrics.increment("in_play_hits")
+        return {
+            "markets": {
+                name: {"prediction": {"probability": float(p), "confidence": 0.85, "edge": None}}
+                for name, p in live["markets"].items()
+            },
+            "calculation_time": live.get("pricing_ms", 0.0) / 1000.0,
+            "brain_version": self.version,
+            "created_at": datetime.fromtimestamp(live["priced_at"], timezone.utc).isoformat(),
+            "in_play": live.get("state"),
+        }
 
     def _calculate_ttl(self, match_date: datetime) -> int:
         """Calculate cache TTL based on match timing.
@@ -209,6 +266,7 @@ class BrainRepository:
             from datetime import timezone
             computed_result = {
                 "markets": self._convert_match_prediction_to_markets(result),
+                "expected_goals": self._extract_expected_goals(result),
                 "calculation_time": calc_time,
                 "brain_version": self.version,
                 "created_at": datetime.now(timezone.utc).isoformat()
@@ -223,6 +281,7 @@ class BrainRepository:
                 }
             )
 
+            self._publish_prediction(match_id, home_team, away_team, computed_result)
             return computed_result
 
         except Exception as e:
@@ -232,6 +291,23 @@ class BrainRepository:
             )
             raise  # Re-raise so SmartCache worker can handle gracefully
 
+    def _publish_prediction(self, match_id: str, home_team: str, away_team: str,
+                            result: Dict[str, Any]) -> None:
+        """Live delta for /api/live subscribers.
+
+        Carries the headline only (markets don't fit a NOTIFY payload):
+        subscribers re-read the prediction route, which is now a cache hit.
+        match_key lets a subscriber follow the match across odds and
+        prediction deltas; the hub fills in the league from the odds deltas.
+        """
+        publish_delta("prediction", match_id, match_key=self._match_key(home_team, away_team), data={
+            "home_team": home_team,
+            "away_team": away_team,
+            "expected_goals": result.get("expected_goals"),
+            "brain_version": result.get("brain_version"),
+            "created_at": result.get("created_at"),
+        })
+
     def _extract_match_id_from_key(self, cache_key: str) -> str:
         """Extract match_id from cache key.
 
@@ -306,14 +382,13 @@ class BrainRepository:
             RuntimeError: If brain not initialized or computation fails
         """
         # 1. Generate cache key with normalized team names
-        normalized_home = self._normalize_team_name(home_team)
-        normalized_away = self._normalize_team_name(away_team)
-        match_id = f"{normalized_home}_vs_{normalized_away}"
+        cache_key = self._prediction_cache_key(home_team, away_team)
+        match_id = self._extract_match_id_from_key(cache_key)
 
-        cache_key = key_factory.prediction_key(
-            match_id=match_id,
-            config=None  # dna_context not used by UnifiedBrain V2.8.0
-        )
+        # 1b. Match in play: live prices (push_in_play) replace the pre-match prediction
+        live = self._in_play_result(home_team, away_team, match_date)
+        if live is not None:
+            return live
 
         # 2. Check cache (SmartCache with X-Fetch algorithm)
         cached, is_stale = smart_cache.get(cache_key)
@@ -450,6 +525,7 @@ class BrainRepository:
 
             computed_result = {
                 "markets": self._convert_match_prediction_to_markets(result),
+                "expected_goals": self._extract_expected_goals(result),  # Reused by /goalscorer
                 "calculation_time": calc_time,
                 "brain_version": self.version,
                 "created_at": datetime.now(timezone.utc).isoformat()  # ✅ ISO string (not datetime object)
@@ -504,6 +580,7 @@ class BrainRepository:
                     }
                 )
 
+            self._publish_prediction(match_id, home_team, away_team, computed_result)
             return computed_result
 
         except AttributeError as e:
@@ -666,7 +743,11 @@ class BrainRepository:
         match_date: datetime
     ) -> Dict[str, Any]:
         """
-        Calculate goalscorer predictions
+        Calculate goalscorer predictions (top 5 per team)
+
+        Uses the team-indexed GoalscorerCalculator with the expected goals
+        stored by calculate_predictions (league averages if not cached yet),
+        so no UnifiedBrain analysis is run here.
 
         Circuit breaker: Raise RuntimeError if brain not initialized
         """
@@ -674,11 +755,70 @@ class BrainRepository:
             raise RuntimeError("Brain not initialized")
 
         try:
-            # Placeholder - not yet implemented in UnifiedBrain V2.8.0
+            calculator = self._get_goalscorer_calculator()
+            if calculator is None:
+                return {
+                    "home_goalscorers": [],
+                    "away_goalscorers": [],
+                    "first_goalscorer_team_prob": {"home": 0.52, "away": 0.48}
+                }
+
+            cached, _ = smart_cache.get(self._prediction_cache_key(home_team, away_team))
+            expected = (cached or {}).get("expected_goals") or DEFAULT_EXPECTED_GOALS
+
+            analysis = calculator.analyze_match(
+                home_team=home_team,
+                away_team=away_team,
+                expected_home_goals=expected["home"],
+                expected_away_goals=expected["away"],
+                top_n=4 * GOALSCORERS_PER_TEAM
+            )
+
+            def top_players(team: str) -> List[Dict[str, Any]]:
+                return [
+                    {
+                        "player": odds.player_name,
+                        "anytime_prob": round(odds.anytime_prob, 4),
+                        "first_prob": round(odds.first_gs_prob, 4),
+                        "last_prob": round(odds.last_gs_prob, 4),
+                        "confidence": round(odds.confidence, 2)
+                    }
+                    for odds in analysis.anytime_rankings
+                    if odds.team_name == team
+                ][:GOALSCORERS_PER_TEAM]
+
             return {
-                "home_goalscorers": [],
-                "away_goalscorers": [],
-                "first_goalscorer_team_prob": {"home": 0.52, "away": 0.48}
+                "home_goalscorers": top_players(home_team),
+                "away_goalscorers": top_players(away_team),
+                "first_goalscorer_team_prob": {
+                    "home": round(analysis.home_score_first_prob, 4),
+                    "away": round(analysis.away_score_first_prob, 4)
+                }
             }
         except Exception as e:
             raise RuntimeError(f"Goalscorer calculation failed: {e}")
+
+    def _get_goalscorer_calculator(self):
+        """Lazy GoalscorerCalculator (team-indexed store, loaded once per process).
+
+        Returns None when quantum_core is not importable (DI mode without calculator).
+        """
+        if self._goalscorer_calculator is None:
+            try:
+                from brain.goalscorer import get_goalscorer_calculator
+            except ImportError as e:
+                logger.warning(f"GoalscorerCalculator unavailable: {e}")
+                return None
+            self._goalscorer_calculator = get_goalscorer_calculator()
+        return self._goalscorer_calculator
+
+    @staticmethod
+    def _extract_expected_goals(prediction) -> Optional[Dict[str, float]]:
+        """Expected home/away goals of a MatchPrediction (None if unavailable)."""
+        try:
+            return {
+                "home": float(prediction.expected_home_goals),
+                "away": float(prediction.expected_away_goals)
+            }
+        except (AttributeError, TypeError, ValueError):
+            return None
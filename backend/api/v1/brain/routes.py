@@ -18,6 +18,7 @@ from .schemas import (
 )
 from .service import BrainService
 from cache.metrics import cache_metrics  # Metrics API
+from cache.brain_metrics import brain_stage_metrics  # Per-stage latency
 
 logger = logging.getLogger(__name__)
 
@@ -199,4 +200,24 @@ async def reset_cache_metrics():
         "timestamp": datetime.now().isoformat()
     }
 
+
+@router.get(
+    "/metrics/stages",
+    response_model=dict,
+    tags=["metrics"],
+    summary="Per-stage brain latency",
+    description="""
+    Latency breakdown of analyze_match by stage (DataHub I/O, each engine,
+    fusion, market calculators, edges, Kelly), slowest cumulative first.
+
+    Example:
+        GET /api/v1/brain/metrics/stages
+        → {"analyses": 120, "avg_analysis_ms": 41.2,
+           "stages": [{"stage": "data_hub", "avg_ms": 28.7, "share_pct": 69.6, ...}, ...]}
+    """
+)
+async def get_stage_metrics():
+    """Get per-stage brain latency summary."""
+    return brain_stage_metrics.get_stats()
+
 # ════════════════════════════════════════════════════════════════
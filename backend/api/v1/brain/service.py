@@ -31,9 +31,21 @@ class BrainService:
         Initialize service
 
         Args:
-            repository: Optional BrainRepository (for dependency injection in tests)
+            repository: Optional BrainRepository (for dependency injection in tests).
+                        If None, the production repository (UnifiedBrain) is built
+                        on first use rather than at import time.
         """
-        self.repository = repository or BrainRepository()
+        self._repository = repository
+
+    @property
+    def repository(self):
+        if self._repository is None:
+            self._repository = BrainRepository()
+        return self._repository
+
+    @repository.setter
+    def repository(self, value):
+        self._repository = value
 
     def calculate_predictions(self, request: BrainCalculateRequest) -> BrainCalculateResponse:
         """Calculate 99 markets predictions"""
@@ -4,6 +4,7 @@ from .config import CacheConfig, cache_config
 from .smart_cache import SmartCache, smart_cache
 from .smart_cache_enhanced import SmartCacheEnhanced, smart_cache_enhanced
 from .metrics import CacheMetrics, cache_metrics
+from .brain_metrics import BrainStageMetrics, brain_stage_metrics
 
 __all__ = [
     "KeyFactory",
@@ -16,4 +17,6 @@ __all__ = [
     "smart_cache_enhanced",
     "CacheMetrics",
     "cache_metrics",
+    "BrainStageMetrics",
+    "brain_stage_metrics",
 ]
@@ -36,6 +36,10 @@ class GoldenHourConfig(BaseModel):
     # Zone 5: Standard (Low volatility)
     zone_standard_ttl: int = 21600  # 6 hours
     
+    # Live: in-play markets pushed by SmartCacheEnhanced.push_in_play
+    # (re-priced on every event / minute tick, TTL only guards dead feeds)
+    zone_live_ttl: int = 120  # 2 minutes
+    
     # Lineup bonus (extend TTL if lineup confirmed)
     lineup_confirmed_multiplier: float = 2.0
     lineup_confirmed_max_ttl: int = 86400  # 24h max
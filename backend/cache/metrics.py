@@ -100,6 +100,8 @@ class CacheMetrics:
         self.markets_preserved = 0           # Markets preserved (not affected)
         self.cpu_saved_total = 0.0           # Cumulative CPU % saved
         self.cpu_saved_count = 0             # Number of surgical invalidations tracked
+        self.in_play_pushes = 0              # In-play re-pricings pushed (not invalidated)
+        self.in_play_hits = 0                # Predictions served from the live push
 
         # ═══════════════════════════════════════════════════════════════
         # ENHANCED CACHE METRICS (SmartCacheEnhanced Integration)
@@ -307,6 +309,8 @@ class CacheMetrics:
                 'cache_keys_deleted_actual': self.cache_keys_deleted_actual,
                 'markets_preserved': self.markets_preserved,
                 'avg_cpu_saved_pct': round(avg_cpu_saved, 2),
+                'in_play_pushes': self.in_play_pushes,
+                'in_play_hits': self.in_play_hits,
 
                 # Strategy Distribution
                 'strategy_bypass': self.strategy_bypass,
@@ -376,6 +380,7 @@ class CacheMetrics:
             'swr_background_success', 'swr_background_error',
             'surgical_invalidation', 'full_invalidation',
             'markets_affected_logical', 'cache_keys_deleted_actual', 'markets_preserved',
+            'in_play_pushes', 'in_play_hits',
             'strategy_bypass', 'strategy_compute', 'strategy_serve_stale', 'strategy_serve_fresh',
             'total_requests'
         ]
@@ -466,6 +471,8 @@ class CacheMetrics:
                 self.markets_preserved = 0
                 self.cpu_saved_total = 0.0
                 self.cpu_saved_count = 0
+                self.in_play_pushes = 0
+                self.in_play_hits = 0
 
             elif category == 'strategy':
                 self.strategy_bypass = 0
@@ -16,7 +16,8 @@ Architecture:
          ├── VIX Calculator (Market panic detection)
          ├── Golden Hour (Dynamic TTL by time-to-kickoff)
          ├── Stale-While-Revalidate (Zero latency serves)
-         └── TagManager (Surgical invalidation)
+         ├── TagManager (Surgical invalidation)
+         └── In-Play Engine (Live re-pricing pushed into the cache)
 
 Performance Impact:
   - Stampede prevention: 99% (100 → 1 compute)
@@ -27,10 +28,14 @@ Performance Impact:
 Reference: Google VLDB 2015 (X-Fetch) + Mon_PS Quant Innovation
 """
 
+from dataclasses import asdict
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Optional, Dict, Any, Callable, Awaitable, Tuple
 from enum import Enum
 import asyncio
+import os
+import sys
 import time
 import structlog
 
@@ -39,6 +44,7 @@ from .smart_cache import SmartCache
 from .golden_hour import GoldenHourCalculator, GoldenHourConfig
 from .stale_while_revalidate import StaleWhileRevalidate, SWRConfig
 from .tag_manager import TagManager, EventType
+from .key_factory import key_factory
 from .vix_calculator import VIXCalculator, VIXConfig, MarketVIX
 from .metrics import cache_metrics
 
@@ -46,6 +52,16 @@ from .metrics import cache_metrics
 logger = structlog.get_logger()
 
 
+@lru_cache(maxsize=1)
+def _in_play_engine():
+    """quantum_core.probability.in_play: /quantum_core (Docker) or /home/Mon_ps/quantum_core (local)"""
+    for root in ('/', '/home/Mon_ps'):
+        if os.path.isdir(os.path.join(root, 'quantum_core')) and root not in sys.path:
+            sys.path.append(root)
+    from quantum_core.probability import in_play
+    return in_play
+
+
 class CacheStrategy(Enum):
     """Cache strategy decision"""
     BYPASS = "bypass"  # VIX panic → no cache
@@ -106,7 +122,8 @@ class SmartCacheEnhanced:
         base_cache: Optional[SmartCache] = None,
         golden_hour_config: Optional[GoldenHourConfig] = None,
         swr_config: Optional[SWRConfig] = None,
-        vix_config: Optional[VIXConfig] = None
+        vix_config: Optional[VIXConfig] = None,
+        publisher: Optional[Callable[..., Any]] = None
     ):
         """
         Initialize SmartCacheEnhanced with all HFT modules
@@ -118,6 +135,11 @@ class SmartCacheEnhanced:
             golden_hour_config: Golden Hour configuration
             swr_config: SWR configuration
             vix_config: VIX calculator configuration
+            publisher: Live-delta callback
+                       publisher(kind, match_id, league, data, match_key).
+                       None (default): in-play pushes only write the cache.
+                       The API registers its own at startup (set_publisher),
+                       so the cache layer never imports the API.
 
         Design Pattern:
             Singleton by default (production)
@@ -150,6 +172,7 @@ class SmartCacheEnhanced:
             )
 
         self.enabled = self.base_cache.enabled
+        self.publisher = publisher
 
         # HFT Intelligence Modules
         self.golden_hour = GoldenHourCalculator(config=golden_hour_config)
@@ -655,6 +678,18 @@ class SmartCacheEnhanced:
                 'reasoning': 'Cache disabled'
             }
 
+        # In-play events on a match priced live: its markets were re-priced and
+        # pushed (push_in_play), deleting them would only force readers back to
+        # a live-bypass path. Without a live push, pre-match prices are stale:
+        # invalidate as usual.
+        if self.tag_manager.is_in_play(event_type) and self.get_in_play(match_key.split(':', 1)[-1]):
+            return {
+                'invalidated_count': 0,
+                'affected_markets': [],
+                'cpu_saving_pct': 100.0,
+                'reasoning': f'{event_type.value} is re-priced in-play (push_in_play)'
+            }
+
         # Get affected markets via TagManager
         tag_result = self.tag_manager.get_affected_markets(event_type)
 
@@ -721,6 +756,94 @@ class SmartCacheEnhanced:
             'reasoning': tag_result['reasoning']
         }
 
+    def set_publisher(self, publisher: Optional[Callable[..., Any]]) -> None:
+        """
+        Register the live-delta callback:
+        publisher(kind, match_id, league, data, match_key)
+
+        Called once at API startup with api.services.live_updates.publish_delta
+        (non-blocking: deltas are queued for a background NOTIFY thread).
+        """
+        self.publisher = publisher
+
+    def push_in_play(
+        self,
+        match_id: str,
+        prior: Any,
+        state: Any,
+        ttl: Optional[int] = None,
+        league: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Re-price all 99 markets of a running match and write them to the cache
+
+        Called on every in-play event (goal, red card) and minute tick by the
+        live feed: the markets key always holds current live prices, readers
+        never miss. BrainRepository.calculate_predictions serves this payload
+        instead of the pre-match prediction while it exists, so match_id is
+        the prediction match key ("arsenal_vs_chelsea", normalized team names).
+        Until a match gets its first push, in-play events keep invalidating
+        its pre-match markets (invalidate_by_event).
+        The same prices go out as an 'in_play' live delta through the
+        registered publisher (SSE/WebSocket subscribers of /api/live), so
+        dashboards stop polling the match.
+
+        Args:
+            match_id: Prediction match key (markets key via key_factory)
+            prior: in_play.MatchPrior (pre-match lambdas, rho, corners/cards)
+            state: in_play.InPlayState (minute, score, red cards, HT score)
+            ttl: Cache TTL (default: Golden Hour zone_live_ttl)
+            league: League/sport key for subscriber filters (optional)
+
+        Returns:
+            Cached payload: {'markets', 'state', 'priced_at', 'pricing_ms', 'cached'}
+
+        Example:
+            >>> from quantum_core.probability.in_play import MatchPrior, InPlayState
+            >>> cache.push_in_play(
+            ...     match_id="arsenal_vs_chelsea",
+            ...     prior=MatchPrior(lambda_home=1.6, lambda_away=1.1),
+            ...     state=InPlayState(minute=67, home_goals=1, away_red=1, ht_score=(0, 0))
+            ... )
+        """
+        engine = _in_play_engine()
+        start = time.perf_counter()
+        markets = engine.price_in_play(prior, state)
+        pricing_ms = (time.perf_counter() - start) * 1000
+
+        payload = {
+            'match_id': match_id,
+            'markets': {name: round(p, 6) for name, p in markets.items()},
+            'state': asdict(state),
+            'priced_at': time.time(),
+            'pricing_ms': round(pricing_ms, 3),
+        }
+        ttl = ttl or self.golden_hour.config.zone_live_ttl
+        payload['cached'] = self.base_cache.set(key_factory.markets_key(match_id), payload, ttl=ttl)
+
+        cache_metrics.increment("in_play_pushes")
+        if self.publisher is not None:
+            try:
+                self.publisher('in_play', match_id, league, {
+                    'state': payload['state'],
+                    'markets': payload['markets'],
+                }, match_id)
+            except Exception as e:
+                logger.warning("In-play delta not published", match_id=match_id, error=str(e))
+        logger.debug(
+            "In-play markets pushed",
+            match_id=match_id,
+            minute=state.minute,
+            markets=len(markets),
+            pricing_ms=payload['pricing_ms']
+        )
+        return payload
+
+    def get_in_play(self, match_id: str) -> Optional[Dict[str, Any]]:
+        """Latest pushed in-play payload (None if the match is not priced live)"""
+        value, _ = self.base_cache.get(key_factory.markets_key(match_id))
+        return value
+
     def register_xfetch_callback(
         self,
         callback: Callable[[str], Any]
@@ -67,6 +67,16 @@ class EventType(Enum):
     ODDS_STEAM = "odds_steam"
     LINE_MOVEMENT = "line_movement"
     SHARP_MONEY = "sharp_money"
+    
+    # In-play events (re-priced, not invalidated)
+    GOAL = "goal"
+    RED_CARD = "red_card"
+    MINUTE_TICK = "minute_tick"
+
+
+# Events whose markets are recomputed by the in-play engine and pushed
+# into the cache (SmartCacheEnhanced.push_in_play) instead of deleted
+IN_PLAY_EVENTS = frozenset({EventType.GOAL, EventType.RED_CARD, EventType.MINUTE_TICK})
 
 
 class TagManager:
@@ -196,7 +206,14 @@ class TagManager:
             # Trading events
             EventType.ODDS_STEAM: [EventTag.EDGE_CALC, EventTag.ODDS_MOVEMENT],
             EventType.LINE_MOVEMENT: [EventTag.ODDS_MOVEMENT],
-            EventType.SHARP_MONEY: [EventTag.EDGE_CALC]
+            EventType.SHARP_MONEY: [EventTag.EDGE_CALC],
+            
+            # In-play events
+            EventType.GOAL: [EventTag.GOALS, EventTag.EDGE_CALC],
+            EventType.RED_CARD: [
+                EventTag.DISCIPLINE, EventTag.LINEUP, EventTag.GOALS, EventTag.EDGE_CALC
+            ],
+            EventType.MINUTE_TICK: [EventTag.GOALS, EventTag.EDGE_CALC]
         }
     
     def get_affected_markets(
@@ -260,6 +277,11 @@ class TagManager:
             'reasoning': f'{event_type.value} affects {len(affected_tags)} tags: {", ".join(t.value for t in affected_tags)}'
         }
     
+    @staticmethod
+    def is_in_play(event_type: EventType) -> bool:
+        """True if the event is handled by in-play re-pricing (push, not invalidate)"""
+        return event_type in IN_PLAY_EVENTS
+    
     def get_tag_coverage(self) -> Dict[str, any]:
         """Get statistical coverage of tags"""
         
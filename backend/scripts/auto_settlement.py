@@ -1,14 +1,24 @@
 """
 Script de règlement automatique des paris terminés
 Utilise The Odds API pour récupérer les scores
+
+Les scores sont écrits dans match_results: le trigger de settlement met le
+match en file et settlement_service règle paris, picks et combos ensemble.
+En fin de run, le script met en file les matchs finis encore en attente
+(backfill) puis vide la file, si le worker LISTEN ne tourne pas.
 """
 import os
 import sys
 import requests
 from datetime import datetime, timedelta
+from pathlib import Path
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.clv_tracker.settlement_service import run_once
+
 # Config
 ODDS_API_KEY = os.getenv('ODDS_API_KEY', 'YOUR_API_KEY')
 ODDS_API_BASE = 'https://api.the-odds-api.com/v4'
@@ -77,59 +87,33 @@ def determine_outcome(scores, home_team, away_team):
     if home_score is None or away_score is None:
         return None, None
     
-    final_score = f"{home_score}-{away_score}"
-    
     if home_score > away_score:
-        return 'home', final_score
+        return 'home', (home_score, away_score)
     elif away_score > home_score:
-        return 'away', final_score
+        return 'away', (home_score, away_score)
     else:
-        return 'draw', final_score
+        return 'draw', (home_score, away_score)
 
-def settle_bets(match_id, actual_outcome, final_score):
-    """Règle tous les paris d'un match"""
+def record_result(match, home_score, away_score, outcome):
+    """Enregistre le score final dans match_results (déclenche le settlement)"""
     conn = psycopg2.connect(**DB_CONFIG)
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    cursor = conn.cursor()
     
-    # Récupérer tous les paris pending de ce match
     cursor.execute("""
-        SELECT id, outcome, odds, stake 
-        FROM bets 
-        WHERE match_id = %s AND status = 'pending'
-    """, (match_id,))
-    
-    bets = cursor.fetchall()
-    settled_count = 0
-    
-    for bet in bets:
-        bet_won = (bet['outcome'] == actual_outcome)
-        
-        if bet_won:
-            payout = bet['stake'] * bet['odds']
-            profit = payout - bet['stake']
-            result = 'won'
-            status = 'won'
-        else:
-            payout = 0
-            profit = -bet['stake']
-            result = 'lost'
-            status = 'lost'
-        
-        cursor.execute("""
-            UPDATE bets 
-            SET status = %s, result = %s, final_score = %s,
-                payout = %s, profit = %s, settled_at = NOW(),
-                settled_by = 'auto'
-            WHERE id = %s
-        """, (status, result, final_score, payout, profit, bet['id']))
-        
-        settled_count += 1
+        INSERT INTO match_results (match_id, home_team, away_team, score_home, score_away, commence_time, sport, outcome, is_finished, last_updated)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, true, NOW())
+        ON CONFLICT (match_id) 
+        DO UPDATE SET score_home = EXCLUDED.score_home, 
+                      score_away = EXCLUDED.score_away,
+                      outcome = EXCLUDED.outcome,
+                      is_finished = true,
+                      last_updated = NOW()
+    """, (match['match_id'], match['home_team'], match['away_team'], home_score, away_score,
+          match['commence_time'], match['sport'], outcome))
     
     conn.commit()
     cursor.close()
     conn.close()
-    
-    return settled_count
 
 def main():
     print(f"[{datetime.now()}] Démarrage du settlement automatique...")
@@ -137,7 +121,7 @@ def main():
     matches = get_pending_finished_matches()
     print(f"✓ {len(matches)} matchs à vérifier")
     
-    total_settled = 0
+    recorded = 0
     
     for match in matches:
         print(f"\n→ Vérification: {match['home_team']} vs {match['away_team']}")
@@ -148,20 +132,26 @@ def main():
             print("  ⚠ Scores non disponibles")
             continue
         
-        outcome, final_score = determine_outcome(scores, match['home_team'], match['away_team'])
+        outcome, score = determine_outcome(scores, match['home_team'], match['away_team'])
         
         if not outcome:
             print("  ⚠ Impossible de déterminer le résultat")
             continue
         
-        print(f"  ✓ Score: {final_score} → Résultat: {outcome}")
+        print(f"  ✓ Score: {score[0]}-{score[1]} → Résultat: {outcome}")
         
-        settled = settle_bets(match['match_id'], outcome, final_score)
-        total_settled += settled
-        
-        print(f"  ✓ {settled} paris réglés")
+        record_result(match, score[0], score[1], outcome)
+        recorded += 1
+    
+    # Rattrapage + règlement des matchs mis en file par le trigger
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        summary = run_once(conn).summary()
+    finally:
+        conn.close()
     
-    print(f"\n[{datetime.now()}] Terminé ! {total_settled} paris réglés au total")
+    print(f"\n[{datetime.now()}] Terminé ! {recorded} scores enregistrés, "
+          f"{summary['bets']} paris / {summary['resolved']} picks / {summary['combos']} combos réglés")
 
 if __name__ == '__main__':
     main()
@@ -3,14 +3,20 @@
 �� Collecteur de cotes complet - Version 2.0
 Collecte: h2h (1X2), totals (2.5), alternate_totals (1.5, 3.5), btts
 Priorité: Pinnacle > Tous bookmakers
+Live: meilleures cotes par match publiées au commit (NOTIFY live_updates)
 """
 import requests
 import psycopg2
 from datetime import datetime
+from pathlib import Path
 import os
 import sys
 import logging
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api.services.live_updates import Delta, match_key, publish
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -44,6 +50,25 @@ SPORTS = [
 def get_db_connection():
     return psycopg2.connect(**DB_CONFIG)
 
+def track_best(best: dict, match: dict, prices: dict):
+    """Meilleure cote par issue et par match sur tous les bookmakers de la collecte"""
+    entry = best.setdefault(match['id'], {
+        'home_team': match['home_team'], 'away_team': match['away_team'],
+        'commence_time': match['commence_time'], 'best': {}, 'bookmakers': 0,
+    })
+    entry['bookmakers'] += 1
+    for outcome, price in prices.items():
+        if price and price > entry['best'].get(outcome, 0):
+            entry['best'][outcome] = price
+
+def publish_best(cur, sport: str, market: str, best: dict) -> int:
+    """Un delta live par match (NOTIFY livré au commit de la collecte)"""
+    return publish([
+        Delta('odds', match_id, league=sport, data={'market': market, **entry},
+              match_key=match_key(entry['home_team'], entry['away_team']))
+        for match_id, entry in best.items()
+    ], cur)
+
 def ensure_btts_table(conn):
     """Créer la table odds_btts si elle n'existe pas"""
     cur = conn.cursor()
@@ -71,6 +96,7 @@ def collect_h2h(conn, sport: str) -> int:
     """Collecter les cotes 1X2"""
     cur = conn.cursor()
     count = 0
+    best = {}
     
     try:
         response = requests.get(
@@ -100,7 +126,13 @@ def collect_h2h(conn, sport: str) -> int:
                             outcomes.get(match['away_team'], 0),
                             datetime.now()
                         ))
+                        track_best(best, match, {
+                            'home': outcomes.get(match['home_team'], 0),
+                            'draw': outcomes.get('Draw', 0),
+                            'away': outcomes.get(match['away_team'], 0),
+                        })
                         count += 1
+        publish_best(cur, sport, 'h2h', best)
         conn.commit()
         remaining = response.headers.get('x-requests-remaining', '?')
         logger.info(f"  h2h: {count} lignes (remaining: {remaining})")
@@ -119,6 +151,7 @@ def collect_totals(conn, sport: str) -> int:
     try:
         # Collecter totals standard + alternate
         for market_type in ['totals', 'alternate_totals']:
+            best = {}
             response = requests.get(
                 f"{BASE_URL}/sports/{sport}/odds",
                 params={'apiKey': API_KEY, 'regions': 'eu', 'markets': market_type, 'oddsFormat': 'decimal'},
@@ -146,7 +179,12 @@ def collect_totals(conn, sport: str) -> int:
                                 match['commence_time'], bk['title'], line,
                                 over.get('price', 0), under.get('price', 0), datetime.now()
                             ))
+                            track_best(best, match, {
+                                f"over_{line}": over.get('price', 0),
+                                f"under_{line}": under.get('price', 0),
+                            })
                             count += 1
+            publish_best(cur, sport, market_type, best)
             conn.commit()
             remaining = response.headers.get('x-requests-remaining', '?')
             logger.info(f"  {market_type}: +{count} (remaining: {remaining})")
@@ -161,6 +199,7 @@ def collect_btts(conn, sport: str) -> int:
     """Collecter les cotes BTTS (Both Teams To Score)"""
     cur = conn.cursor()
     count = 0
+    best = {}
     
     try:
         response = requests.get(
@@ -187,7 +226,9 @@ def collect_btts(conn, sport: str) -> int:
                             match['commence_time'], bk['title'],
                             outcomes.get('Yes', 0), outcomes.get('No', 0), datetime.now()
                         ))
+                        track_best(best, match, {'yes': outcomes.get('Yes', 0), 'no': outcomes.get('No', 0)})
                         count += 1
+        publish_best(cur, sport, 'btts', best)
         conn.commit()
         remaining = response.headers.get('x-requests-remaining', '?')
         logger.info(f"  btts: {count} lignes (remaining: {remaining})")
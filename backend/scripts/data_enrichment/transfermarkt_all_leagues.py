@@ -12,15 +12,18 @@ Scrape buteurs et blessures pour:
 - Ligue 1 (France)
 """
 
-import requests
-from bs4 import BeautifulSoup
+import asyncio
 import psycopg2
 import psycopg2.extras
-import time
 import random
 import logging
 import json
 import os
+import sys
+
+sys.path.insert(0, '/home/Mon_ps')
+from services.scraping import AsyncFetcher, RawArchive
+from services.scraping.parsers import parse_transfermarkt_injuries, parse_transfermarkt_scorers
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)s | %(message)s')
 logger = logging.getLogger(__name__)
@@ -149,118 +152,76 @@ LEAGUES_TEAMS = {
 }
 
 
-def get_team_scorers(tm_id, tm_name, team_name, league):
+async def get_team_scorers(fetcher, tm_id, tm_name, team_name, league):
     """Récupère les buteurs d'une équipe"""
     url = f"https://www.transfermarkt.com/{tm_name}/leistungsdaten/verein/{tm_id}/plus/1"
+    result = await fetcher.fetch(url, headers=HEADERS)
+    
+    if not result.ok:
+        if result.status == 0:
+            logger.error(f"Error scraping {team_name}: {result.error}")
+        return []
     
     try:
-        time.sleep(random.uniform(2, 4))
-        response = requests.get(url, headers=HEADERS, timeout=30)
-        
-        if response.status_code != 200:
-            return []
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        table = soup.find('table', class_='items')
-        
-        if not table:
-            return []
-        
-        tbody = table.find('tbody')
-        if not tbody:
-            return []
-        
-        scorers = []
-        rows = tbody.find_all('tr', class_=['odd', 'even'])
-        
-        for row in rows:
-            try:
-                # Nom du joueur
-                name_cell = row.find('td', class_='hauptlink')
-                if not name_cell:
-                    continue
-                player_name = name_cell.get_text(strip=True)
-                
-                # Récupérer toutes les valeurs numériques
-                cells = row.find_all('td')
-                numeric_values = []
-                for cell in cells:
-                    text = cell.get_text(strip=True)
-                    text = text.replace("'", "").replace(",", "")
-                    if text.isdigit():
-                        numeric_values.append(int(text))
-                
-                # Skip si pas assez de données
-                if len(numeric_values) < 6:
-                    continue
-                
-                # Indices: [#, age, in_squad, games, goals, assists, ...]
-                goals = numeric_values[4] if len(numeric_values) > 4 else 0
-                assists = numeric_values[5] if len(numeric_values) > 5 else 0
-                
-                if goals > 0 or assists > 0:
-                    scorers.append({
-                        'name': player_name,
-                        'team': team_name,
-                        'league': league,
-                        'goals': goals,
-                        'assists': assists
-                    })
-                    
-            except Exception as e:
-                continue
-        
-        return scorers
-        
+        return [
+            {'name': row['name'], 'team': team_name, 'league': league,
+             'goals': row['goals'], 'assists': row['assists']}
+            for row in parse_transfermarkt_scorers(result.body, url)
+        ]
     except Exception as e:
         logger.error(f"Error scraping {team_name}: {e}")
         return []
 
 
-def get_team_injuries(tm_id, tm_name, team_name, league):
+async def get_team_injuries(fetcher, tm_id, tm_name, team_name, league):
     """Récupère les blessés d'une équipe"""
     url = f"https://www.transfermarkt.com/{tm_name}/sperrenundverletzungen/verein/{tm_id}"
+    result = await fetcher.fetch(url, headers=HEADERS)
+    
+    if not result.ok:
+        return []
     
     try:
-        time.sleep(random.uniform(1.5, 3))
-        response = requests.get(url, headers=HEADERS, timeout=30)
-        
-        if response.status_code != 200:
-            return []
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        injuries = []
-        
-        rows = soup.find_all('tr', class_=['odd', 'even'])
-        
-        for row in rows:
-            try:
-                name_cell = row.find('td', class_='hauptlink')
-                if not name_cell:
-                    continue
-                    
-                player_name = name_cell.get_text(strip=True)
-                
-                # Type de blessure
-                injury_cell = row.find('td', class_='zentriert')
-                injury_type = injury_cell.get_text(strip=True) if injury_cell else 'Unknown'
-                
-                injuries.append({
-                    'name': player_name,
-                    'team': team_name,
-                    'league': league,
-                    'injury_type': injury_type
-                })
-                
-            except:
-                continue
-        
-        return injuries
-        
-    except Exception as e:
+        return [
+            {'name': row['name'], 'team': team_name, 'league': league, 'injury_type': row['injury_type']}
+            for row in parse_transfermarkt_injuries(result.body, url)
+        ]
+    except Exception:
         return []
 
 
+async def scrape_leagues(fetcher, leagues_teams=LEAGUES_TEAMS):
+    """
+    Buteurs et blessés de toutes les équipes, dans la même boucle asyncio:
+    le budget www.transfermarkt.com (DOMAIN_POLICIES) remplace les
+    time.sleep entre deux pages.
+
+    Returns:
+        {league: ({team_name: scorers}, injuries)}
+    """
+    results = {}
+    for league, teams in leagues_teams.items():
+        # Injuries (moins fréquent pour éviter rate limit): 50% des équipes
+        injury_teams = [team for team in teams if random.random() < 0.5]
+        scorers, injuries = await asyncio.gather(
+            asyncio.gather(*(get_team_scorers(fetcher, tm['tm_id'], tm['tm_name'], team, league)
+                             for team, tm in teams.items())),
+            asyncio.gather(*(get_team_injuries(fetcher, teams[team]['tm_id'], teams[team]['tm_name'], team, league)
+                             for team in injury_teams)),
+        )
+        results[league] = (dict(zip(teams, scorers)), [i for team_injuries in injuries for i in team_injuries])
+    return results
+
+
+async def scrape_all_leagues(leagues_teams=LEAGUES_TEAMS):
+    archive = RawArchive()
+    try:
+        async with AsyncFetcher(archive=archive) as fetcher:
+            return await scrape_leagues(fetcher, leagues_teams)
+    finally:
+        archive.close()
+
+
 def save_scorers_to_db(scorers):
     """Sauvegarde les buteurs dans la base"""
     conn = psycopg2.connect(**DB_CONFIG)
@@ -332,35 +293,23 @@ def save_injuries_to_db(injuries):
     return updated
 
 
-def main():
-    print("═══════════════════════════════════════════════════════════════════")
-    print("TRANSFERMARKT ALL LEAGUES SCRAPER")
-    print("═══════════════════════════════════════════════════════════════════")
-    
+def save_and_report(league_results):
+    """Log par ligue, sauvegarde en base et affiche les meilleurs buteurs"""
     all_scorers = []
     all_injuries = []
     
-    for league, teams in LEAGUES_TEAMS.items():
+    for league, (team_scorers, league_injuries) in league_results.items():
         print(f"\n{'='*70}")
         print(f"🏆 {league}")
         print('='*70)
         
         league_scorers = []
-        league_injuries = []
-        
-        for team_name, tm_info in teams.items():
-            # Scorers
-            scorers = get_team_scorers(tm_info['tm_id'], tm_info['tm_name'], team_name, league)
+        for team_name, scorers in team_scorers.items():
             if scorers:
                 league_scorers.extend(scorers)
                 logger.info(f"   ✅ {team_name}: {len(scorers)} buteurs")
             else:
                 logger.info(f"   ⚠️ {team_name}: 0 buteurs")
-            
-            # Injuries (moins fréquent pour éviter rate limit)
-            if random.random() < 0.5:  # 50% des équipes
-                injuries = get_team_injuries(tm_info['tm_id'], tm_info['tm_name'], team_name, league)
-                league_injuries.extend(injuries)
         
         all_scorers.extend(league_scorers)
         all_injuries.extend(league_injuries)
@@ -405,5 +354,13 @@ def main():
     print("\n✅ SCRAPING TRANSFERMARKT MULTI-LIGUES TERMINÉ!")
 
 
+def main():
+    print("═══════════════════════════════════════════════════════════════════")
+    print("TRANSFERMARKT ALL LEAGUES SCRAPER")
+    print("═══════════════════════════════════════════════════════════════════")
+    
+    save_and_report(asyncio.run(scrape_all_leagues()))
+
+
 if __name__ == "__main__":
     main()
@@ -21,8 +21,17 @@ import psycopg2.extras
 import time
 import random
 import logging
+import sys
 from datetime import datetime
 
+sys.path.insert(0, '/home/Mon_ps')
+from services.scraping.parsers import (
+    parse_understat_league_matches,
+    parse_understat_league_teams,
+    parse_understat_team_statistics,
+)
+from services.scraping.raw_archive import archive_response
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)s | %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -92,17 +101,15 @@ def get_understat_matches(league: str, season: str) -> list:
         # 2. Appeler l'API avec les cookies
         logger.info(f"   Appel API getLeagueData/{league}/{season}...")
         time.sleep(random.uniform(0.5, 1))
-        response = session.get(
-            f"https://understat.com/getLeagueData/{league}/{season}",
-            headers={'Referer': f'https://understat.com/league/{league}/{season}'}
-        )
+        url = f"https://understat.com/getLeagueData/{league}/{season}"
+        response = session.get(url, headers={'Referer': f'https://understat.com/league/{league}/{season}'})
 
         if response.status_code != 200:
             logger.error(f"   ❌ Erreur API Understat: HTTP {response.status_code} pour {league}")
             return []
 
-        data = response.json()
-        matches = data.get('dates', [])
+        archive_response(url, response)
+        matches = parse_understat_league_matches(response.content, url)
         logger.info(f"   ✅ {len(matches)} matchs récupérés depuis API")
         return matches
 
@@ -126,17 +133,16 @@ def get_team_statistics(team_name: str, season: str, session: requests.Session)
     try:
         # Appeler API équipe
         time.sleep(random.uniform(0.5, 1))
-        response = session.get(
-            f"https://understat.com/getTeamData/{team_name}/{season}",
-            headers={'Referer': f'https://understat.com/team/{team_name}/{season}'}
-        )
+        url = f"https://understat.com/getTeamData/{team_name}/{season}"
+        response = session.get(url, headers={'Referer': f'https://understat.com/team/{team_name}/{season}'})
 
         if response.status_code != 200:
             logger.error(f"   ❌ Erreur API équipe {team_name}: HTTP {response.status_code}")
             return {}
 
-        data = response.json()
-        return data.get('statistics', {})
+        archive_response(url, response)
+        statistics = parse_understat_team_statistics(response.content, url)
+        return statistics[0] if statistics else {}
 
     except Exception as e:
         logger.error(f"   ❌ Erreur get_team_statistics {team_name}: {e}")
@@ -152,30 +158,15 @@ def get_league_teams_from_api(league_code: str, season: str, session: requests.S
     """
     try:
         # Appeler API ligue
-        response = session.get(
-            f"https://understat.com/getLeagueData/{league_code}/{season}",
-            headers={'Referer': f'https://understat.com/league/{league_code}/{season}'}
-        )
+        url = f"https://understat.com/getLeagueData/{league_code}/{season}"
+        response = session.get(url, headers={'Referer': f'https://understat.com/league/{league_code}/{season}'})
 
         if response.status_code != 200:
             logger.error(f"   ❌ Erreur API ligue {league_code}: HTTP {response.status_code}")
             return []
 
-        data = response.json()
-        teams = data.get('teams', {})
-
-        result = []
-        for team_id, team_data in teams.items():
-            title = team_data.get('title', '')
-            # Convertir nom en format URL (espaces → underscores)
-            url_name = title.replace(' ', '_')
-            result.append({
-                'id': team_id,
-                'title': title,
-                'url_name': url_name
-            })
-
-        return result
+        archive_response(url, response)
+        return parse_understat_league_teams(response.content, url)
 
     except Exception as e:
         logger.error(f"   ❌ Erreur get_league_teams_from_api {league_code}: {e}")
@@ -8,17 +8,17 @@ Scrape xG data from Understat for all Premier League teams.
 Calculates performance indicators and betting tendencies.
 """
 
-import requests
-from bs4 import BeautifulSoup
-import json
-import re
+import asyncio
 import psycopg2
 import psycopg2.extras
-import time
-import random
 import os
 from datetime import datetime
 import logging
+import sys
+
+sys.path.insert(0, '/home/Mon_ps')
+from services.scraping import AsyncFetcher, RawArchive
+from services.scraping.parsers import parse_understat_team_dates
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)s | %(message)s')
 logger = logging.getLogger(__name__)
@@ -42,61 +42,42 @@ UNDERSTAT_TEAMS = [
 
 SEASON = '2025'  # Understat uses year of season start
 
-class UnderstatScraper:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
-        
-    def _smart_delay(self):
-        time.sleep(random.uniform(1.5, 3))
+async def get_team_matches(fetcher, team_name):
+    """Récupère tous les matchs d'une équipe avec xG"""
+    url = f"https://understat.com/team/{team_name}/{SEASON}"
+    result = await fetcher.fetch(url, headers=HEADERS)
     
-    def get_team_matches(self, team_name):
-        """Récupère tous les matchs d'une équipe avec xG"""
-        url = f"https://understat.com/team/{team_name}/{SEASON}"
-        
-        try:
-            self._smart_delay()
-            response = self.session.get(url, timeout=30)
-            
-            if response.status_code != 200:
-                logger.error(f"HTTP {response.status_code} for {team_name}")
-                return []
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            for script in soup.find_all('script'):
-                script_text = str(script)
-                if 'datesData' in script_text:
-                    match = re.search(r"var datesData\s*=\s*JSON\.parse\('(.+?)'\)", script_text)
-                    if match:
-                        encoded_data = match.group(1)
-                        decoded_data = encoded_data.encode().decode('unicode_escape')
-                        matches = json.loads(decoded_data)
-                        
-                        processed = []
-                        for m in matches:
-                            if not m.get('isResult'):
-                                continue  # Skip future matches
-                                
-                            processed.append({
-                                'match_id': m.get('id'),
-                                'date': m.get('datetime', '')[:10],
-                                'home_team': m.get('h', {}).get('title', ''),
-                                'away_team': m.get('a', {}).get('title', ''),
-                                'home_goals': int(m.get('goals', {}).get('h', 0)),
-                                'away_goals': int(m.get('goals', {}).get('a', 0)),
-                                'home_xg': float(m.get('xG', {}).get('h', 0) or 0),
-                                'away_xg': float(m.get('xG', {}).get('a', 0) or 0),
-                            })
-                        
-                        logger.info(f"{team_name}: {len(processed)} matchs trouvés")
-                        return processed
-            
-            return []
-            
-        except Exception as e:
-            logger.error(f"Error scraping {team_name}: {e}")
-            return []
+    if not result.ok:
+        logger.error(f"HTTP {result.status} for {team_name}: {result.error}")
+        return []
+    
+    try:
+        # Archive brute (AsyncFetcher): un fix du parser se rejoue via services.scraping.reparse
+        processed = parse_understat_team_dates(result.body, url)
+        if processed:
+            logger.info(f"{team_name}: {len(processed)} matchs trouvés")
+        return processed
+    except Exception as e:
+        logger.error(f"Error scraping {team_name}: {e}")
+        return []
+
+
+async def scrape_teams(fetcher, teams=UNDERSTAT_TEAMS):
+    """
+    Matchs de toutes les équipes dans la même boucle asyncio, au rythme du
+    domaine understat.com (DOMAIN_POLICIES) au lieu d'un time.sleep par équipe.
+    """
+    matches = await asyncio.gather(*(get_team_matches(fetcher, team) for team in teams))
+    return [m for team_matches in matches for m in team_matches]
+
+
+async def scrape_all_teams(teams=UNDERSTAT_TEAMS):
+    archive = RawArchive()
+    try:
+        async with AsyncFetcher(archive=archive) as fetcher:
+            return await scrape_teams(fetcher, teams)
+    finally:
+        archive.close()
 
 
 def calculate_match_indicators(m):
@@ -267,18 +248,8 @@ def calculate_team_tendencies():
     conn.close()
 
 
-def main():
-    print("═══════════════════════════════════════════════════════════════════")
-    print("UNDERSTAT xG SCRAPER")
-    print("═══════════════════════════════════════════════════════════════════")
-    
-    scraper = UnderstatScraper()
-    all_matches = []
-    
-    for team in UNDERSTAT_TEAMS:
-        matches = scraper.get_team_matches(team)
-        all_matches.extend(matches)
-    
+def save_and_report(all_matches):
+    """Sauvegarde les matchs, recalcule les tendances et affiche un résumé"""
     # Dédupliquer (chaque match apparaît 2 fois)
     unique_matches = {}
     for m in all_matches:
@@ -339,5 +310,13 @@ def main():
     print("\n✅ SCRAPING UNDERSTAT TERMINÉ!")
 
 
+def main():
+    print("═══════════════════════════════════════════════════════════════════")
+    print("UNDERSTAT xG SCRAPER")
+    print("═══════════════════════════════════════════════════════════════════")
+    
+    save_and_report(asyncio.run(scrape_all_teams()))
+
+
 if __name__ == "__main__":
     main()
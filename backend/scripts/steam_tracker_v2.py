@@ -7,12 +7,23 @@ Améliorations:
 - Distinction LATE/EARLY steam
 - Filtre ligues majeures (liquidité)
 - Score normalisé sur 100
+
+Pipeline ensembliste (assez rapide pour tourner toutes les quelques minutes
+avant le coup d'envoi, voir --watch):
+- SQL: une ligne par match × bookmaker (ouverture / actuelle / référence
+  VELOCITY_WINDOW_HOURS avant la dernière cote) pour home / draw / away
+- NumPy: steam scores, vélocité et type de steam sur tous les marchés d'un coup
+- Un seul UPDATE ... FROM (VALUES ...) pour tracking_clv_picks
 """
+import argparse
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 from datetime import datetime
 import os
 import logging
+import time
+
+import numpy as np
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(message)s')
 logger = logging.getLogger('SteamTrackerV2')
@@ -33,6 +44,34 @@ MAJOR_LEAGUES = [
     'soccer_netherlands_eredivisie', 'soccer_portugal_primeira_liga'
 ]
 
+# Seuil: 3 points de proba = significatif (3%)
+STEAM_THRESHOLD = 30  # 30 = 3% de proba
+
+# Au moins 3 snapshots pour fiabilité
+MIN_SNAPSHOTS = 3
+
+# Vélocité: variation depuis la dernière cote antérieure à (dernière mise à jour - fenêtre)
+VELOCITY_WINDOW_HOURS = 1.0
+
+SIDES = ('home', 'draw', 'away')
+
+# Côté 1X2 suivi par chaque market_type de tracking_clv_picks
+# (autres marchés: mouvement domicile, comme en V2)
+PICK_MARKET_SIDES = {
+    'home': 'home', 'dnb_home': 'home',
+    'draw': 'draw',
+    'away': 'away', 'dnb_away': 'away',
+}
+
+# (borne haute en heures avant le match, type, description); au-delà: EARLY STEAM
+STEAM_TYPES = [
+    (2, "🔥 LATE STEAM", "Syndicate Money - TRÈS FIABLE"),
+    (6, "📈 PRE-MATCH", "Confirmation du marché"),
+    (24, "ℹ️ MARKET ADJ", "Ajustement normal"),
+]
+EARLY_STEAM = ("📰 EARLY STEAM", "News/Blessure probable")
+
+
 def calculate_steam_score(opening_odds, current_odds):
     """
     Calcule la force du mouvement en points de probabilité.
@@ -42,192 +81,302 @@ def calculate_steam_score(opening_odds, current_odds):
     """
     if not opening_odds or not current_odds or opening_odds <= 1 or current_odds <= 1:
         return 0
-    
+
     prob_open = 1 / float(opening_odds)
     prob_curr = 1 / float(current_odds)
-    
+
     # Différence de probabilité (ex: 50% -> 55% = +0.05)
     diff = prob_curr - prob_open
-    
+
     # Score normalisé (100 points = changement de 10% de proba = très significatif)
     steam_score = diff * 1000
-    
+
     return round(steam_score, 1)
 
 def get_steam_type(hours_to_match):
     """Détermine le type de steam selon le timing"""
-    if hours_to_match < 2:
-        return "🔥 LATE STEAM", "Syndicate Money - TRÈS FIABLE"
-    elif hours_to_match < 6:
-        return "📈 PRE-MATCH", "Confirmation du marché"
-    elif hours_to_match < 24:
-        return "ℹ️ MARKET ADJ", "Ajustement normal"
-    else:
-        return "📰 EARLY STEAM", "News/Blessure probable"
+    for max_hours, steam_type, steam_desc in STEAM_TYPES:
+        if hours_to_match < max_hours:
+            return steam_type, steam_desc
+    return EARLY_STEAM
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SCORING VECTORISÉ
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _odds_array(values):
+    """Cotes (Decimal / float / None) -> float64, NaN si absente."""
+    return np.array([np.nan if v is None else float(v) for v in values], dtype=float)
+
+
+def steam_scores(opening_odds, current_odds):
+    """calculate_steam_score sur des tableaux (0 si une cote manque ou ≤ 1)."""
+    opening = np.asarray(opening_odds, dtype=float)
+    current = np.asarray(current_odds, dtype=float)
+    valid = (opening > 1) & (current > 1)   # NaN -> False
+    with np.errstate(divide='ignore', invalid='ignore'):
+        diff = np.where(valid, 1 / current - 1 / opening, 0.0)
+    return np.round(diff * 1000, 1)
+
+
+def steam_type_index(hours_to_match):
+    """Indice dans STEAM_TYPES (len(STEAM_TYPES) = EARLY STEAM)."""
+    bounds = np.array([max_hours for max_hours, _, _ in STEAM_TYPES], dtype=float)
+    return np.searchsorted(bounds, np.asarray(hours_to_match, dtype=float), side='right')
+
+
+def score_movements(rows, now=None):
+    """
+    Scores de toutes les lignes match × bookmaker en une passe.
+
+    Retourne un dict de tableaux alignés sur `rows`:
+        hours_to_match, type_index, {side}_opening, {side}_current,
+        {side}_score (points de proba), {side}_velocity (points/heure)
+    """
+    now = now or datetime.now()
+    commence = np.array([r['commence_time'] for r in rows], dtype='datetime64[us]')
+    last_update = np.array([r['last_update'] for r in rows], dtype='datetime64[us]')
+    # Pas de snapshot antérieur à la fenêtre: vélocité depuis l'ouverture
+    has_ref = np.array([r.get('ref_time') is not None for r in rows], dtype=bool)
+    ref_time = np.array([r.get('ref_time') or r['first_seen'] for r in rows], dtype='datetime64[us]')
+
+    hours = (commence - np.datetime64(now, 'us')) / np.timedelta64(1, 'h')
+    elapsed = (last_update - ref_time) / np.timedelta64(1, 'h')
+
+    scored = {'hours_to_match': hours, 'type_index': steam_type_index(hours)}
+    for side in SIDES:
+        opening = _odds_array(r.get(f'opening_{side}') for r in rows)
+        current = _odds_array(r.get(f'current_{side}') for r in rows)
+        ref = np.where(has_ref, _odds_array(r.get(f'ref_{side}') for r in rows), opening)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            velocity = np.where(elapsed > 0, steam_scores(ref, current) / elapsed, 0.0)
+        scored[f'{side}_opening'] = opening
+        scored[f'{side}_current'] = current
+        scored[f'{side}_score'] = steam_scores(opening, current)
+        scored[f'{side}_velocity'] = np.round(velocity, 1)
+    return scored
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SQL
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Une ligne par match × bookmaker: ouverture, actuelle, et référence pour la vélocité
+ODDS_MOVEMENTS_SQL = """
+    WITH snapshots AS (
+        SELECT
+            match_id, bookmaker, home_team, away_team, commence_time, sport,
+            home_odds, draw_odds, away_odds, collected_at,
+            MAX(collected_at) OVER (PARTITION BY match_id, bookmaker)
+                - %(window_hours)s * INTERVAL '1 hour' AS ref_cutoff
+        FROM odds_history
+        WHERE bookmaker = ANY(%(bookmakers)s)
+          AND commence_time > NOW()
+          AND (%(horizon_hours)s::float IS NULL
+               OR commence_time < NOW() + %(horizon_hours)s::float * INTERVAL '1 hour')
+          AND sport = ANY(%(sports)s)
+    )
+    SELECT
+        match_id,
+        bookmaker,
+        MIN(home_team) AS home_team,
+        MIN(away_team) AS away_team,
+        MIN(commence_time) AS commence_time,
+        MIN(sport) AS sport,
+        (ARRAY_AGG(home_odds ORDER BY collected_at))[1] AS opening_home,
+        (ARRAY_AGG(draw_odds ORDER BY collected_at))[1] AS opening_draw,
+        (ARRAY_AGG(away_odds ORDER BY collected_at))[1] AS opening_away,
+        (ARRAY_AGG(home_odds ORDER BY collected_at DESC))[1] AS current_home,
+        (ARRAY_AGG(draw_odds ORDER BY collected_at DESC))[1] AS current_draw,
+        (ARRAY_AGG(away_odds ORDER BY collected_at DESC))[1] AS current_away,
+        (ARRAY_AGG(home_odds ORDER BY collected_at DESC) FILTER (WHERE collected_at <= ref_cutoff))[1] AS ref_home,
+        (ARRAY_AGG(draw_odds ORDER BY collected_at DESC) FILTER (WHERE collected_at <= ref_cutoff))[1] AS ref_draw,
+        (ARRAY_AGG(away_odds ORDER BY collected_at DESC) FILTER (WHERE collected_at <= ref_cutoff))[1] AS ref_away,
+        MAX(collected_at) FILTER (WHERE collected_at <= ref_cutoff) AS ref_time,
+        MIN(collected_at) AS first_seen,
+        MAX(collected_at) AS last_update,
+        COUNT(*) AS snapshot_count
+    FROM snapshots
+    GROUP BY match_id, bookmaker
+    HAVING COUNT(*) >= %(min_snapshots)s
+       AND (ARRAY_AGG(home_odds ORDER BY collected_at))[1] IS NOT NULL
+    ORDER BY MIN(commence_time)
+"""
+
+# Picks à (re)scorer
+PICKS_TO_SCORE_SQL = """
+    SELECT id, match_id, market_type
+    FROM tracking_clv_picks
+    WHERE odds_movement IS NULL
+       OR odds_movement = 0
+       OR (%(refresh_open)s AND NOT COALESCE(is_resolved, false))
+"""
+
+# Ouverture / clôture par match pour les picks à scorer
+MATCH_OPEN_CLOSE_SQL = """
+    SELECT
+        match_id,
+        (ARRAY_AGG(home_odds ORDER BY collected_at))[1] AS opening_home,
+        (ARRAY_AGG(draw_odds ORDER BY collected_at))[1] AS opening_draw,
+        (ARRAY_AGG(away_odds ORDER BY collected_at))[1] AS opening_away,
+        (ARRAY_AGG(home_odds ORDER BY collected_at DESC))[1] AS current_home,
+        (ARRAY_AGG(draw_odds ORDER BY collected_at DESC))[1] AS current_draw,
+        (ARRAY_AGG(away_odds ORDER BY collected_at DESC))[1] AS current_away
+    FROM odds_history
+    WHERE bookmaker = %(bookmaker)s
+      AND match_id = ANY(%(match_ids)s)
+    GROUP BY match_id
+"""
+
+
+def _connect(conn):
+    """(connexion, à_fermer): réutilise `conn` si fourni (mode --watch)."""
+    if conn is not None:
+        return conn, False
+    return psycopg2.connect(**DB_CONFIG), True
+
+
+def fetch_odds_movements(conn, bookmakers=('Pinnacle',), sports=MAJOR_LEAGUES,
+                         horizon_hours=None, min_snapshots=MIN_SNAPSHOTS,
+                         window_hours=VELOCITY_WINDOW_HOURS):
+    """Lignes match × bookmaker (ODDS_MOVEMENTS_SQL)."""
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute(ODDS_MOVEMENTS_SQL, {
+            'bookmakers': list(bookmakers),
+            'sports': list(sports),
+            'horizon_hours': horizon_hours,
+            'min_snapshots': min_snapshots,
+            'window_hours': window_hours,
+        })
+        return cur.fetchall()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SIGNAUX
+# ═══════════════════════════════════════════════════════════════════════════
+
+def build_signals(rows, scored, threshold=STEAM_THRESHOLD):
+    """Signaux (un par match × bookmaker avec au moins une alerte), triés par force."""
+    scores = np.stack([scored[f'{side}_score'] for side in SIDES])        # [sides × rows]
+    alert_mask = np.abs(scores) > threshold
+    strength = np.where(alert_mask, np.abs(scores), 0).max(axis=0)
 
-def get_steam_signals_v2():
-    """Calcule les signaux Steam V2 avec probabilités"""
-    conn = psycopg2.connect(**DB_CONFIG)
-    cur = conn.cursor(cursor_factory=RealDictCursor)
-    
-    cur.execute("""
-        WITH odds_evolution AS (
-            SELECT 
-                match_id,
-                home_team,
-                away_team,
-                commence_time,
-                sport,
-                FIRST_VALUE(home_odds) OVER (PARTITION BY match_id ORDER BY collected_at) as opening_home,
-                FIRST_VALUE(away_odds) OVER (PARTITION BY match_id ORDER BY collected_at) as opening_away,
-                LAST_VALUE(home_odds) OVER (PARTITION BY match_id ORDER BY collected_at 
-                    ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING) as current_home,
-                LAST_VALUE(away_odds) OVER (PARTITION BY match_id ORDER BY collected_at 
-                    ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING) as current_away,
-                MIN(collected_at) OVER (PARTITION BY match_id) as first_seen,
-                MAX(collected_at) OVER (PARTITION BY match_id) as last_update,
-                COUNT(*) OVER (PARTITION BY match_id) as snapshot_count
-            FROM odds_history
-            WHERE bookmaker = 'Pinnacle'
-              AND commence_time > NOW()
-              AND sport IN %s
-        )
-        SELECT DISTINCT
-            match_id,
-            home_team,
-            away_team,
-            commence_time,
-            sport,
-            opening_home,
-            current_home,
-            opening_away,
-            current_away,
-            first_seen,
-            last_update,
-            snapshot_count
-        FROM odds_evolution
-        WHERE opening_home IS NOT NULL
-          AND snapshot_count >= 3  -- Au moins 3 snapshots pour fiabilité
-        ORDER BY commence_time
-    """, (tuple(MAJOR_LEAGUES),))
-    
-    matches = cur.fetchall()
     signals = []
-    
-    for m in matches:
-        # Calculer Steam Score (en points de proba)
-        home_steam = calculate_steam_score(m['opening_home'], m['current_home'])
-        away_steam = calculate_steam_score(m['opening_away'], m['current_away'])
-        
-        # Temps avant le match
-        hours_to_match = (m['commence_time'] - datetime.now()).total_seconds() / 3600
-        steam_type, steam_desc = get_steam_type(hours_to_match)
-        
-        # Seuil: 3 points de proba = significatif (3%)
-        THRESHOLD = 30  # 30 = 3% de proba
-        
+    for i in np.flatnonzero(alert_mask.any(axis=0)):
+        m = rows[i]
+        type_index = scored['type_index'][i]
+        steam_type, steam_desc = STEAM_TYPES[type_index][1:] if type_index < len(STEAM_TYPES) else EARLY_STEAM
+
         signal = {
             'match_id': m['match_id'],
+            'bookmaker': m['bookmaker'],
             'match': f"{m['home_team']} vs {m['away_team']}",
             'commence_time': m['commence_time'],
-            'hours_to_match': round(hours_to_match, 1),
+            'hours_to_match': round(float(scored['hours_to_match'][i]), 1),
             'steam_type': steam_type,
             'steam_desc': steam_desc,
-            'home_steam_score': home_steam,
-            'away_steam_score': away_steam,
+            'home_steam_score': float(scored['home_score'][i]),
+            'draw_steam_score': float(scored['draw_score'][i]),
+            'away_steam_score': float(scored['away_score'][i]),
             'snapshots': m['snapshot_count'],
             'alerts': []
         }
-        
-        # Analyser HOME
-        if home_steam > THRESHOLD:
-            prob_change = home_steam / 10
-            signal['alerts'].append({
-                'side': 'HOME',
-                'action': 'STEAM',
-                'score': home_steam,
-                'message': f"🔥 STEAM HOME (+{prob_change:.1f}% proba): {m['opening_home']} → {m['current_home']}"
-            })
-        elif home_steam < -THRESHOLD:
-            prob_change = abs(home_steam) / 10
-            signal['alerts'].append({
-                'side': 'HOME',
-                'action': 'DRIFT',
-                'score': home_steam,
-                'message': f"⚠️ DRIFT HOME (-{prob_change:.1f}% proba): {m['opening_home']} → {m['current_home']}"
-            })
-        
-        # Analyser AWAY
-        if away_steam > THRESHOLD:
-            prob_change = away_steam / 10
-            signal['alerts'].append({
-                'side': 'AWAY',
-                'action': 'STEAM',
-                'score': away_steam,
-                'message': f"🔥 STEAM AWAY (+{prob_change:.1f}% proba): {m['opening_away']} → {m['current_away']}"
-            })
-        elif away_steam < -THRESHOLD:
-            prob_change = abs(away_steam) / 10
+
+        for s, side in enumerate(SIDES):
+            if not alert_mask[s, i]:
+                continue
+            score = float(scores[s, i])
+            action, emoji, sign = ('STEAM', '🔥', '+') if score > 0 else ('DRIFT', '⚠️', '-')
             signal['alerts'].append({
-                'side': 'AWAY',
-                'action': 'DRIFT',
-                'score': away_steam,
-                'message': f"⚠️ DRIFT AWAY (-{prob_change:.1f}% proba): {m['opening_away']} → {m['current_away']}"
+                'side': side.upper(),
+                'action': action,
+                'score': score,
+                'velocity': float(scored[f'{side}_velocity'][i]),
+                'message': (f"{emoji} {action} {side.upper()} ({sign}{abs(score) / 10:.1f}% proba): "
+                            f"{m[f'opening_{side}']} → {m[f'current_{side}']}")
             })
-        
-        if signal['alerts']:
-            signals.append(signal)
-    
-    cur.close()
-    conn.close()
-    
+        signals.append((strength[i], signal))
+
     # Trier par score de steam le plus fort
-    signals.sort(key=lambda x: max(abs(a['score']) for a in x['alerts']), reverse=True)
-    
-    return signals
+    signals.sort(key=lambda x: x[0], reverse=True)
+    return [signal for _, signal in signals]
 
-def update_picks_steam_score():
-    """Met à jour le steam score dans tracking_clv_picks (numeric)"""
-    conn = psycopg2.connect(**DB_CONFIG)
-    cur = conn.cursor(cursor_factory=RealDictCursor)
-    
-    # Calculer le steam score pour chaque match
-    cur.execute("""
-        WITH odds_calc AS (
-            SELECT 
-                match_id,
-                FIRST_VALUE(home_odds) OVER (PARTITION BY match_id ORDER BY collected_at) as opening,
-                LAST_VALUE(home_odds) OVER (PARTITION BY match_id ORDER BY collected_at 
-                    ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING) as closing
-            FROM odds_history
-            WHERE bookmaker = 'Pinnacle'
-        ),
-        steam_scores AS (
-            SELECT DISTINCT
-                match_id,
-                opening,
-                closing,
-                CASE 
-                    WHEN opening > 1 AND closing > 1 
-                    THEN ROUND(((1.0/closing - 1.0/opening) * 1000)::numeric, 1)
-                    ELSE 0
-                END as steam_score
-            FROM odds_calc
-            WHERE opening IS NOT NULL
-        )
-        UPDATE tracking_clv_picks t
-        SET odds_movement = ss.steam_score
-        FROM steam_scores ss
-        WHERE t.match_id = ss.match_id
-          AND (t.odds_movement IS NULL OR t.odds_movement = 0)
-    """)
-    
-    updated = cur.rowcount
-    conn.commit()
-    cur.close()
-    conn.close()
-    
-    return updated
+
+def get_steam_signals_v2(conn=None, bookmakers=('Pinnacle',), horizon_hours=None,
+                         threshold=STEAM_THRESHOLD):
+    """Calcule les signaux Steam V2 avec probabilités"""
+    conn, owned = _connect(conn)
+    try:
+        with conn:  # fin de transaction: pas de snapshot gardé sur une connexion partagée
+            rows = fetch_odds_movements(conn, bookmakers=bookmakers, horizon_hours=horizon_hours)
+    finally:
+        if owned:
+            conn.close()
+    if not rows:
+        return []
+    return build_signals(rows, score_movements(rows), threshold)
+
+
+def pick_movements(picks, match_rows):
+    """
+    (pick_id, steam_score) pour chaque pick dont le match a des cotes:
+    côté 1X2 du pick (PICK_MARKET_SIDES), domicile par défaut.
+    """
+    if not match_rows:
+        return []
+    index = {row['match_id']: i for i, row in enumerate(match_rows)}
+    side_scores = {}
+    side_opening = {}
+    for side in SIDES:
+        opening = _odds_array(r[f'opening_{side}'] for r in match_rows)
+        side_opening[side] = opening
+        side_scores[side] = steam_scores(opening, _odds_array(r[f'current_{side}'] for r in match_rows))
+
+    values = []
+    for pick in picks:
+        i = index.get(pick['match_id'])
+        if i is None:
+            continue
+        side = PICK_MARKET_SIDES.get((pick['market_type'] or '').lower(), 'home')
+        if np.isnan(side_opening[side][i]):
+            continue
+        values.append((pick['id'], float(side_scores[side][i])))
+    return values
+
+
+def update_picks_steam_score(conn=None, bookmaker='Pinnacle', refresh_open=False):
+    """
+    Met à jour le steam score dans tracking_clv_picks (numeric).
+    refresh_open: recalcule aussi les picks non résolus déjà scorés (mode --watch).
+    """
+    conn, owned = _connect(conn)
+    try:
+        # Commit aussi sur les retours anticipés (rien à scorer)
+        with conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(PICKS_TO_SCORE_SQL, {'refresh_open': refresh_open})
+            picks = cur.fetchall()
+            if not picks:
+                return 0
+
+            cur.execute(MATCH_OPEN_CLOSE_SQL, {
+                'bookmaker': bookmaker,
+                'match_ids': sorted({p['match_id'] for p in picks}),
+            })
+            values = pick_movements(picks, cur.fetchall())
+            if not values:
+                return 0
+
+            execute_values(cur, """
+                UPDATE tracking_clv_picks t
+                SET odds_movement = v.steam_score
+                FROM (VALUES %s) AS v(id, steam_score)
+                WHERE t.id = v.id
+            """, values, template="(%s, %s::numeric)", page_size=len(values))
+            return cur.rowcount
+    finally:
+        if owned:
+            conn.close()
 
 def analyze_steam_performance():
     """Analyse la corrélation Steam vs Win Rate"""
@@ -261,42 +410,75 @@ def analyze_steam_performance():
     
     return results
 
-def main():
-    logger.info("=" * 70)
-    logger.info("🔥 MARKET STEAM TRACKER V2 - QUANT EDITION")
-    logger.info("=" * 70)
-    
-    # 1. Afficher les signaux actuels
-    signals = get_steam_signals_v2()
-    
+def log_signals(signals, limit=12):
     logger.info(f"\n📊 {len(signals)} matchs avec mouvements significatifs (≥3% proba):\n")
-    
-    for s in signals[:12]:
+
+    for s in signals[:limit]:
         logger.info(f"⚽ {s['match']} ({s['hours_to_match']}h avant)")
         logger.info(f"   {s['steam_type']} - {s['steam_desc']}")
         logger.info(f"   📸 {s['snapshots']} snapshots analysés")
         for alert in s['alerts']:
-            logger.info(f"   {alert['message']}")
+            logger.info(f"   {alert['message']} | {alert['velocity']:+.1f} pts/h")
         logger.info("")
-    
+
+
+def watch(interval_minutes, horizon_hours):
+    """Boucle proche du coup d'envoi: signaux + rescoring des picks ouverts."""
+    conn = psycopg2.connect(**DB_CONFIG)
+    # Une transaction par requête: NOW() (horizon, hours_to_match) avance à chaque
+    # tour et aucune session ne reste idle in transaction entre deux tours
+    conn.autocommit = True
+    try:
+        while True:
+            t0 = time.perf_counter()
+            signals = get_steam_signals_v2(conn, horizon_hours=horizon_hours)
+            updated = update_picks_steam_score(conn, refresh_open=True)
+            late = sum(1 for s in signals if s['hours_to_match'] < STEAM_TYPES[0][0])
+            logger.info(f"🔁 {len(signals)} signaux (<{horizon_hours}h, {late} LATE) | "
+                        f"{updated} picks mis à jour | {time.perf_counter() - t0:.1f}s")
+            log_signals(signals, limit=5)
+            time.sleep(interval_minutes * 60)
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Market Steam Tracker V2")
+    parser.add_argument("--watch", type=float, metavar="MINUTES",
+                        help="Tourner en boucle toutes les N minutes (matchs proches uniquement)")
+    parser.add_argument("--horizon-hours", type=float, default=6.0,
+                        help="Horizon des matchs suivis en mode --watch (défaut: 6h)")
+    args = parser.parse_args()
+
+    if args.watch:
+        watch(args.watch, args.horizon_hours)
+        return
+
+    logger.info("=" * 70)
+    logger.info("🔥 MARKET STEAM TRACKER V2 - QUANT EDITION")
+    logger.info("=" * 70)
+
+    # 1. Afficher les signaux actuels
+    log_signals(get_steam_signals_v2())
+
     # 2. Mettre à jour les picks historiques
     logger.info(f"{'='*70}")
     logger.info("📝 Mise à jour des picks historiques (steam score numérique)...")
     updated = update_picks_steam_score()
     logger.info(f"✅ {updated} picks mis à jour")
-    
+
     # 3. Analyser la performance Steam vs Win Rate
     logger.info(f"\n{'='*70}")
     logger.info("📈 ANALYSE PERFORMANCE STEAM:")
     perf = analyze_steam_performance()
-    
+
     if perf:
         for p in perf:
             emoji = "✅" if float(p['profit'] or 0) > 0 else "❌"
             logger.info(f"   {emoji} {p['steam_category']}: {p['win_rate']}% WR | {p['profit']}€ | {p['picks']} picks")
     else:
         logger.info("   Pas encore assez de données avec steam score")
-    
+
     logger.info("=" * 70)
 
 if __name__ == "__main__":
@@ -1,221 +1,654 @@
 """
 API-Football Integration Service
 Service professionnel d'intégration avec cache intelligent
+
+Quota partagé et cache à deux niveaux:
+- Cache chaud Redis (TTL = durée de validité), cache froid PostgreSQL
+  (api_football_cache) qui garde la dernière réponse connue
+- Quota jour/minute compté dans Redis: commun à tous les workers et process,
+  recalé sur les headers x-ratelimit-requests-* renvoyés par l'API
+- Priorités: HIGH (slate en cours) peut consommer la réserve, LOW (refresh de
+  fond) est différé vers les heures creuses
+- Requêtes identiques concurrentes coalescées (in-process + verrou Redis)
+- Endpoints bulk: standings (forme de toute une ligue), injuries par ligue,
+  fixtures par date
+Quota épuisé: la dernière réponse connue (même périmée) est servie et un
+refresh est planifié en heures creuses.
 """
 
 import requests
 import logging
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 import json
 import hashlib
 
 logger = logging.getLogger(__name__)
 
 
+# Priorités de requête
+HIGH = "high"        # Matchs du slate en cours
+NORMAL = "normal"
+LOW = "low"          # Refresh de fond: heures creuses uniquement
+
+KEY_PREFIX = "apifootball"
+
+
+class LocalRedis:
+    """
+    Stand-in mono-process du sous-ensemble Redis utilisé (Redis absent, tests).
+
+    Le quota n'est alors plus partagé entre process: à n'utiliser qu'avec un seul worker.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._data: Dict[str, Any] = {}
+        self._expiry: Dict[str, float] = {}
+
+    def _alive(self, key: str) -> bool:
+        exp = self._expiry.get(key)
+        if exp is not None and exp <= self._clock():
+            self._data.pop(key, None)
+            self._expiry.pop(key, None)
+        return key in self._data
+
+    def get(self, key):
+        with self._lock:
+            return self._data.get(key) if self._alive(key) else None
+
+    def set(self, key, value, ex=None, nx=False):
+        with self._lock:
+            if nx and self._alive(key):
+                return None
+            self._data[key] = value
+            self._expiry.pop(key, None)
+            if ex:
+                self._expiry[key] = self._clock() + ex
+            return True
+
+    def setex(self, key, ttl, value):
+        return self.set(key, value, ex=ttl)
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(1 for k in keys if self._data.pop(k, None) is not None)
+
+    def incr(self, key, amount=1):
+        with self._lock:
+            value = int(self._data[key]) + amount if self._alive(key) else amount
+            self._data[key] = value
+            return value
+
+    def decr(self, key, amount=1):
+        return self.incr(key, -amount)
+
+    def expire(self, key, ttl):
+        with self._lock:
+            if self._alive(key):
+                self._expiry[key] = self._clock() + ttl
+            return True
+
+    def zadd(self, key, mapping):
+        with self._lock:
+            zset = self._data.setdefault(key, {})
+            for member, score in mapping.items():
+                zset[member] = min(score, zset.get(member, score))
+            return len(mapping)
+
+    def zrangebyscore(self, key, min_score, max_score, start=None, num=None):
+        with self._lock:
+            zset = self._data.get(key, {})
+            members = sorted((s, m) for m, s in zset.items() if float(min_score) <= s <= float(max_score))
+            members = [m for _, m in members]
+            if start is not None:
+                members = members[start:start + num]
+            return members
+
+    def zrem(self, key, *members):
+        with self._lock:
+            zset = self._data.get(key, {})
+            return sum(1 for m in members if zset.pop(m, None) is not None)
+
+    def zcard(self, key):
+        with self._lock:
+            return len(self._data.get(key, {}))
+
+
+class QuotaLedger:
+    """
+    Compteurs de quota jour/minute partagés via Redis.
+
+    INCR atomique puis DECR si le plafond est dépassé: aucun dépassement possible
+    même avec N workers concurrents. Le jour suit le reset API-Football (00:00 UTC).
+    """
+
+    def __init__(self, redis, daily_limit: int, minute_limit: int, high_reserve: int,
+                 clock: Callable[[], float] = time.time):
+        self.redis = redis
+        self.daily_limit = daily_limit
+        self.minute_limit = minute_limit
+        self.high_reserve = high_reserve
+        self._clock = clock
+
+    def _day_key(self) -> str:
+        day = datetime.fromtimestamp(self._clock(), tz=timezone.utc).date().isoformat()
+        return f"{KEY_PREFIX}:quota:day:{day}"
+
+    def _minute_key(self) -> str:
+        return f"{KEY_PREFIX}:quota:min:{int(self._clock() // 60)}"
+
+    def ceiling(self, priority: str) -> int:
+        """HIGH peut entamer la réserve, NORMAL/LOW s'arrêtent avant"""
+        if priority == HIGH:
+            return self.daily_limit
+        return max(0, self.daily_limit - self.high_reserve)
+
+    def used_today(self) -> int:
+        return int(self.redis.get(self._day_key()) or 0)
+
+    def remaining(self, priority: str = HIGH) -> int:
+        return max(0, self.ceiling(priority) - self.used_today())
+
+    def acquire(self, priority: str) -> bool:
+        """Réserve une requête; False si quota jour (pour cette priorité) ou minute atteint"""
+        if self.redis.get(f"{KEY_PREFIX}:quota:blocked"):
+            return False
+
+        day_key = self._day_key()
+        used = self.redis.incr(day_key)
+        if used == 1:
+            self.redis.expire(day_key, 2 * 86400)
+        if used > self.ceiling(priority):
+            self.redis.decr(day_key)
+            return False
+
+        minute_key = self._minute_key()
+        in_minute = self.redis.incr(minute_key)
+        if in_minute == 1:
+            self.redis.expire(minute_key, 120)
+        if in_minute > self.minute_limit:
+            self.redis.decr(minute_key)
+            self.redis.decr(day_key)
+            return False
+        return True
+
+    def sync(self, limit: Optional[int], remaining: Optional[int]) -> None:
+        """Recale le compteur du jour sur le quota serveur (autres clients du même compte)"""
+        if limit is None or remaining is None:
+            return
+        server_used = limit - remaining
+        day_key = self._day_key()
+        if server_used > self.used_today():
+            self.redis.set(day_key, server_used, ex=2 * 86400)
+
+    def exhaust_day(self) -> None:
+        self.redis.set(self._day_key(), self.daily_limit, ex=2 * 86400)
+
+    def block(self, seconds: int) -> None:
+        """429: plus aucune requête pendant `seconds`"""
+        self.redis.set(f"{KEY_PREFIX}:quota:blocked", 1, ex=seconds)
+
+
 class APIFootballService:
     """
     Service d'intégration API-Football avec:
-    - Cache intelligent (évite requêtes inutiles)
-    - Rate limiting (100 req/jour)
-    - Fallback gracieux
-    - Retry logic
+    - Cache Redis + PostgreSQL (évite requêtes inutiles)
+    - Quota partagé jour/minute, priorités et heures creuses
+    - Coalescing des requêtes identiques
+    - Fallback gracieux (dernière réponse connue)
     """
-    
+
     BASE_URL = "https://v3.football.api-sports.io"
-    
-    def __init__(self, api_key: str, db_config: Dict):
+
+    DAILY_LIMIT = 100
+    MINUTE_LIMIT = 10
+    HIGH_RESERVE = 20               # requêtes du jour réservées au slate (HIGH)
+    OFF_PEAK_HOURS = range(1, 7)    # UTC
+    COALESCE_WAIT = 10.0            # attente max du résultat d'un autre process
+    REFRESH_QUEUE = f"{KEY_PREFIX}:refresh_queue"
+
+    def __init__(
+        self,
+        api_key: str,
+        db_config: Optional[Dict],
+        redis_client=None,
+        daily_limit: int = DAILY_LIMIT,
+        minute_limit: int = MINUTE_LIMIT,
+        high_reserve: int = HIGH_RESERVE,
+        session: Optional[requests.Session] = None,
+        clock: Callable[[], float] = time.time,
+    ):
         self.api_key = api_key
         self.db_config = db_config
         self.headers = {
             'x-apisports-key': api_key
         }
-        
-        # Compteur requêtes (reset quotidien)
-        self.daily_requests = 0
-        self.max_daily_requests = 100
-        self.last_reset = datetime.now().date()
-        
+        self._clock = clock
+        self.redis = redis_client if redis_client is not None else self._connect_redis(clock)
+        self.quota = QuotaLedger(self.redis, daily_limit, minute_limit, high_reserve, clock)
+        self.session = session or requests.Session()
+
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+
         logger.info("✅ API-Football Service initialisé")
-    
-    
-    def _check_rate_limit(self) -> bool:
-        """Vérifie si on peut faire une requête"""
-        # Reset compteur si nouveau jour
-        if datetime.now().date() > self.last_reset:
-            self.daily_requests = 0
-            self.last_reset = datetime.now().date()
-            logger.info("📅 Reset compteur quotidien API")
-        
-        if self.daily_requests >= self.max_daily_requests:
-            logger.warning(f"⚠️  Rate limit atteint: {self.daily_requests}/{self.max_daily_requests}")
-            return False
-        
-        return True
-    
-    
+
+
+    @staticmethod
+    def _connect_redis(clock):
+        try:
+            import redis
+            from cache.config import cache_config
+
+            client = redis.from_url(cache_config.redis_url, decode_responses=True, socket_timeout=3)
+            client.ping()
+            return client
+        except Exception as e:
+            logger.warning(f"⚠️  Redis indisponible ({e}) - quota local à ce process")
+            return LocalRedis(clock)
+
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # QUOTA
+    # ─────────────────────────────────────────────────────────────────────────
+
+    @property
+    def daily_requests(self) -> int:
+        return self.quota.used_today()
+
+    @property
+    def max_daily_requests(self) -> int:
+        return self.quota.daily_limit
+
+    def is_off_peak(self) -> bool:
+        return datetime.fromtimestamp(self._clock(), tz=timezone.utc).hour in self.OFF_PEAK_HOURS
+
+    def _next_off_peak(self) -> float:
+        now = datetime.fromtimestamp(self._clock(), tz=timezone.utc)
+        if now.hour in self.OFF_PEAK_HOURS:
+            return now.timestamp()
+        start = now.replace(hour=self.OFF_PEAK_HOURS.start, minute=0, second=0, microsecond=0)
+        if start <= now:
+            start += timedelta(days=1)
+        return start.timestamp()
+
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # CACHE (Redis chaud, PostgreSQL froid)
+    # ─────────────────────────────────────────────────────────────────────────
+
     def _get_cache_key(self, endpoint: str, params: Dict) -> str:
         """Génère clé cache unique"""
         params_str = json.dumps(params, sort_keys=True)
         return hashlib.md5(f"{endpoint}:{params_str}".encode()).hexdigest()
-    
-    
-    def _get_from_cache(self, cache_key: str, max_age_hours: int = 24) -> Optional[Dict]:
-        """Récupère depuis cache si valide"""
-        try:
-            import psycopg2
-            conn = psycopg2.connect(**self.db_config)
-            cursor = conn.cursor()
-            
-            query = """
-                SELECT data, created_at 
-                FROM api_football_cache 
-                WHERE cache_key = %s
-                AND created_at > NOW() - INTERVAL '%s hours'
-            """
-            
-            cursor.execute(query, (cache_key, max_age_hours))
-            result = cursor.fetchone()
-            
-            cursor.close()
-            conn.close()
-            
-            if result:
-                logger.info(f"✅ Cache HIT: {cache_key[:8]}...")
-                return result[0]
-            
+
+
+    def _get_conn(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    from psycopg2.pool import ThreadedConnectionPool
+                    self._pool = ThreadedConnectionPool(1, 4, **self.db_config)
+        return self._pool.getconn()
+
+
+    def _cold_get(self, cache_key: str) -> Optional[Tuple[Dict, float]]:
+        """Dernière réponse connue (data, fetched_at) depuis PostgreSQL"""
+        if not self.db_config:
             return None
-            
+        conn = None
+        try:
+            conn = self._get_conn()
+            with conn, conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT data, EXTRACT(EPOCH FROM created_at) FROM api_football_cache WHERE cache_key = %s",
+                    (cache_key,)
+                )
+                row = cursor.fetchone()
+            return (row[0], float(row[1])) if row else None
         except Exception as e:
             logger.warning(f"Cache error: {e}")
             return None
-    
-    
-    def _save_to_cache(self, cache_key: str, data: Dict):
-        """Sauvegarde dans cache"""
+        finally:
+            if conn is not None:
+                self._pool.putconn(conn)
+
+
+    def _cold_put(self, cache_key: str, data: Dict):
+        if not self.db_config:
+            return
+        conn = None
         try:
-            import psycopg2
-            conn = psycopg2.connect(**self.db_config)
-            cursor = conn.cursor()
-            
-            query = """
-                INSERT INTO api_football_cache (cache_key, data, created_at)
-                VALUES (%s, %s, NOW())
-                ON CONFLICT (cache_key) 
-                DO UPDATE SET data = EXCLUDED.data, created_at = NOW()
-            """
-            
-            cursor.execute(query, (cache_key, json.dumps(data)))
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
+            conn = self._get_conn()
+            with conn, conn.cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO api_football_cache (cache_key, data, created_at)
+                    VALUES (%s, %s, NOW())
+                    ON CONFLICT (cache_key)
+                    DO UPDATE SET data = EXCLUDED.data, created_at = NOW()
+                """, (cache_key, json.dumps(data)))
         except Exception as e:
             logger.warning(f"Cache save error: {e}")
-    
-    
+        finally:
+            if conn is not None:
+                self._pool.putconn(conn)
+
+
+    def _get_from_cache(self, cache_key: str, max_age_hours: float) -> Tuple[Optional[Dict], bool]:
+        """(data, fresh): Redis puis PostgreSQL; une entrée froide encore valide réchauffe Redis"""
+        hot_key = f"{KEY_PREFIX}:cache:{cache_key}"
+        try:
+            raw = self.redis.get(hot_key)
+        except Exception as e:
+            logger.warning(f"Redis cache error: {e}")
+            raw = None
+        if raw:
+            logger.info(f"✅ Cache HIT: {cache_key[:8]}...")
+            return json.loads(raw), True
+
+        cold = self._cold_get(cache_key)
+        if cold is None:
+            return None, False
+        data, fetched_at = cold
+        ttl = max_age_hours * 3600 - (self._clock() - fetched_at)
+        if ttl > 0:
+            self._hot_put(hot_key, data, ttl)
+            logger.info(f"✅ Cache HIT (PostgreSQL): {cache_key[:8]}...")
+        return data, ttl > 0
+
+
+    def _hot_put(self, hot_key: str, data: Dict, ttl: float):
+        try:
+            self.redis.setex(hot_key, max(1, int(ttl)), json.dumps(data))
+        except Exception as e:
+            logger.warning(f"Redis cache save error: {e}")
+
+
+    def _save_to_cache(self, cache_key: str, data: Dict, cache_hours: float):
+        """Sauvegarde dans les deux niveaux de cache"""
+        self._hot_put(f"{KEY_PREFIX}:cache:{cache_key}", data, cache_hours * 3600)
+        self._cold_put(cache_key, data)
+
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # REQUÊTES
+    # ─────────────────────────────────────────────────────────────────────────
+
     def _make_request(
-        self, 
-        endpoint: str, 
+        self,
+        endpoint: str,
         params: Dict,
         use_cache: bool = True,
-        cache_hours: int = 24
+        cache_hours: float = 24,
+        priority: str = NORMAL
     ) -> Optional[Dict]:
         """
-        Requête API avec cache et rate limiting
+        Requête API avec cache, quota partagé et coalescing
         """
-        # Check cache
+        cache_key = self._get_cache_key(endpoint, params)
+        stale = None
         if use_cache:
-            cache_key = self._get_cache_key(endpoint, params)
-            cached_data = self._get_from_cache(cache_key, cache_hours)
-            if cached_data:
-                return cached_data
-        
-        # Check rate limit
-        if not self._check_rate_limit():
-            logger.warning("⚠️  Rate limit - utilise cache ou données partielles")
+            cached, fresh = self._get_from_cache(cache_key, cache_hours)
+            if fresh:
+                return cached
+            stale = cached
+
+        # Refresh de fond hors heures creuses: différé, on sert le périmé
+        if priority == LOW and not self.is_off_peak():
+            self.schedule_refresh(endpoint, params, cache_hours)
+            return stale
+
+        # Coalescing in-process: un seul appel par clé, les autres attendent son résultat
+        with self._inflight_lock:
+            leader = cache_key not in self._inflight
+            if leader:
+                self._inflight[cache_key] = Future()
+            future = self._inflight[cache_key]
+        if not leader:
+            return future.result()
+
+        try:
+            data = self._fetch_coalesced(endpoint, params, cache_key, cache_hours, priority, use_cache)
+            if data is None and stale is not None:
+                logger.warning(f"⚠️  Quota/API indisponible - données périmées servies: {endpoint}")
+                self.schedule_refresh(endpoint, params, cache_hours)
+                data = stale
+            future.set_result(data)
+            return data
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(cache_key, None)
+
+
+    def _fetch_coalesced(self, endpoint, params, cache_key, cache_hours, priority, use_cache) -> Optional[Dict]:
+        """Coalescing inter-process: verrou Redis, les suiveurs attendent le cache"""
+        lock_key = f"{KEY_PREFIX}:lock:{cache_key}"
+        try:
+            owner = self.redis.set(lock_key, "1", ex=int(self.COALESCE_WAIT) + 20, nx=True)
+        except Exception:
+            owner = True
+
+        if not owner and use_cache:
+            deadline = time.monotonic() + self.COALESCE_WAIT
+            while time.monotonic() < deadline:
+                time.sleep(0.2)
+                raw = self.redis.get(f"{KEY_PREFIX}:cache:{cache_key}")
+                if raw:
+                    return json.loads(raw)
+                if not self.redis.get(lock_key):
+                    break
+
+        try:
+            return self._fetch(endpoint, params, cache_key, cache_hours, priority, use_cache)
+        finally:
+            if owner:
+                try:
+                    self.redis.delete(lock_key)
+                except Exception:
+                    pass
+
+
+    def _fetch(self, endpoint, params, cache_key, cache_hours, priority, use_cache) -> Optional[Dict]:
+        if not self.quota.acquire(priority):
+            logger.warning(f"⚠️  Quota atteint ({priority}): {self.quota.used_today()}/{self.quota.daily_limit}")
             return None
-        
-        # Make request
+        return self._call_api(endpoint, params, cache_key, cache_hours, priority, use_cache)
+
+
+    def _call_api(self, endpoint, params, cache_key, cache_hours, priority, use_cache) -> Optional[Dict]:
+        """Appel HTTP (quota déjà réservé) + recalage quota + mise en cache"""
         try:
             url = f"{self.BASE_URL}/{endpoint}"
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
-            
-            self.daily_requests += 1
-            logger.info(f"📡 API Request {self.daily_requests}/{self.max_daily_requests}: {endpoint}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Save to cache
-                if use_cache:
-                    self._save_to_cache(cache_key, data)
-                
-                return data
-            else:
-                logger.error(f"❌ API Error {response.status_code}: {response.text}")
-                return None
-                
+            response = self.session.get(url, headers=self.headers, params=params, timeout=10)
         except Exception as e:
             logger.error(f"❌ Request error: {e}")
             return None
-    
-    
-    def get_team_form(self, team_id: int, league_id: int, season: int = 2024) -> Dict:
+
+        self.quota.sync(_int_header(response, 'x-ratelimit-requests-limit'),
+                        _int_header(response, 'x-ratelimit-requests-remaining'))
+        logger.info(f"📡 API Request {self.quota.used_today()}/{self.quota.daily_limit} [{priority}]: {endpoint}")
+
+        if response.status_code == 429:
+            self.quota.block(60)
+            logger.error("❌ API 429 - requêtes suspendues 60s")
+            return None
+        if response.status_code != 200:
+            logger.error(f"❌ API Error {response.status_code}: {response.text}")
+            return None
+
+        data = response.json()
+        errors = data.get('errors')
+        if errors:
+            # API-Football répond 200 avec errors.requests quand le quota du jour est épuisé
+            if isinstance(errors, dict) and 'requests' in errors:
+                self.quota.exhaust_day()
+            logger.error(f"❌ API errors: {errors}")
+            return None
+
+        if use_cache:
+            self._save_to_cache(cache_key, data, cache_hours)
+        return data
+
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # HEURES CREUSES
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def schedule_refresh(self, endpoint: str, params: Dict, cache_hours: float = 24) -> None:
+        """Planifie un refresh au prochain créneau creux (dédupliqué par requête)"""
+        member = json.dumps({'endpoint': endpoint, 'params': params, 'cache_hours': cache_hours}, sort_keys=True)
+        try:
+            self.redis.zadd(self.REFRESH_QUEUE, {member: self._next_off_peak()})
+        except Exception as e:
+            logger.warning(f"Refresh scheduling error: {e}")
+
+
+    def run_scheduled_refreshes(self, limit: Optional[int] = None) -> int:
+        """
+        Exécute les refresh dus (cron en heures creuses). S'arrête au premier
+        refus de quota: le reste attend le prochain passage.
+        """
+        if not self.is_off_peak():
+            return 0
+        done = 0
+        members = self.redis.zrangebyscore(self.REFRESH_QUEUE, '-inf', self._clock())
+        for member in members[:limit] if limit else members:
+            if not self.quota.acquire(LOW):
+                break
+            job = json.loads(member)
+            cache_key = self._get_cache_key(job['endpoint'], job['params'])
+            # Erreur API: la requête est abandonnée, elle sera replanifiée au prochain besoin
+            if self._call_api(job['endpoint'], job['params'], cache_key, job['cache_hours'], LOW, True) is not None:
+                done += 1
+            self.redis.zrem(self.REFRESH_QUEUE, member)
+        logger.info(f"🌙 Refresh heures creuses: {done} requêtes, {self.quota.remaining(HIGH)} restantes")
+        return done
+
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # ENDPOINTS BULK
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def get_fixtures_by_date(self, date: str, league_id: Optional[int] = None,
+                             season: Optional[int] = None, priority: str = NORMAL) -> List[Dict]:
+        """Tous les matchs d'une date (une requête pour tout le slate)"""
+        params = {'date': date}
+        if league_id:
+            params.update(league=league_id, season=season)
+        data = self._make_request('fixtures', params, cache_hours=1, priority=priority)
+        return data.get('response', []) if data else []
+
+
+    def get_standings(self, league_id: int, season: int = 2024, priority: str = NORMAL) -> Dict[int, Dict]:
+        """Classement de la ligue indexé par team_id (forme + buts de toutes les équipes)"""
+        data = self._make_request(
+            'standings',
+            {'league': league_id, 'season': season},
+            cache_hours=12,
+            priority=priority
+        )
+        if not data or not data.get('response'):
+            return {}
+        rows = {}
+        for group in data['response'][0].get('league', {}).get('standings', []):
+            for row in group:
+                rows[row['team']['id']] = row
+        return rows
+
+
+    def get_league_injuries(self, league_id: int, season: int = 2024, priority: str = NORMAL) -> List[Dict]:
+        """Blessures de toute une ligue (une requête au lieu d'une par équipe)"""
+        data = self._make_request(
+            'injuries',
+            {'league': league_id, 'season': season},
+            cache_hours=6,  # Cache 6h (blessures changent)
+            priority=priority
+        )
+        return data.get('response', []) if data else []
+
+
+    def prefetch_slate(self, date: str, season: int = 2024, priority: str = LOW) -> Dict[str, int]:
+        """
+        Préchauffe le cache d'un slate: fixtures du jour, puis standings, blessures
+        et prédictions. À lancer en heures creuses la veille (priorité LOW).
+        """
+        fixtures = self.get_fixtures_by_date(date, priority=priority)
+        leagues = {f['league']['id'] for f in fixtures if f.get('league', {}).get('id')}
+        for league_id in leagues:
+            self.get_standings(league_id, season, priority=priority)
+            self.get_league_injuries(league_id, season, priority=priority)
+        for fixture in fixtures:
+            self.get_predictions(fixture['fixture']['id'], priority=priority)
+        return {'fixtures': len(fixtures), 'leagues': len(leagues)}
+
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # FEATURES
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def get_team_form(self, team_id: int, league_id: int, season: int = 2024, priority: str = NORMAL) -> Dict:
         """
-        Récupère forme récente d'une équipe
-        
+        Récupère forme récente d'une équipe (depuis le classement de la ligue)
+
+        Le classement ne donne que les 5 derniers résultats: plus de
+        'full_form' (forme de la saison de teams/statistics), et la série en
+        cours est bornée à 5 matchs ('streak_last5', ex-'streak').
+
         Returns:
             {
                 'form': 'WWDWL',
                 'win_rate': 0.8,
                 'goals_avg': 2.1,
-                'streak': 3
+                'streak_last5': 3
             }
         """
-        data = self._make_request(
-            'teams/statistics',
-            {'team': team_id, 'league': league_id, 'season': season},
-            cache_hours=12  # Cache 12h (stats changent peu)
-        )
-        
-        if not data or 'response' not in data:
-            return {'form': 'UNKNOWN', 'win_rate': 0.5, 'goals_avg': 0, 'streak': 0}
-        
-        stats = data['response']
-        form_str = stats.get('form', '')
-        
+        row = self.get_standings(league_id, season, priority=priority).get(team_id)
+
+        if not row:
+            return {'form': 'UNKNOWN', 'win_rate': 0.5, 'goals_avg': 0, 'streak_last5': 0}
+
+        recent_form = (row.get('form') or '')[-5:]
+
         # Calculer win rate sur 5 derniers
-        recent_form = form_str[-5:] if len(form_str) >= 5 else form_str
         wins = recent_form.count('W')
         win_rate = wins / len(recent_form) if recent_form else 0.5
-        
-        # Goals average
-        goals_for = stats.get('goals', {}).get('for', {}).get('average', {}).get('total', 0)
-        
-        # Current streak
+
+        # Goals average (saison)
+        played = row.get('all', {}).get('played') or 0
+        goals_for = row.get('all', {}).get('goals', {}).get('for') or 0
+
+        # Série en cours, dans les 5 derniers
         streak = 0
-        if form_str:
-            last_result = form_str[-1]
-            for char in reversed(form_str):
+        if recent_form:
+            last_result = recent_form[-1]
+            for char in reversed(recent_form):
                 if char == last_result:
                     streak += 1
                 else:
                     break
-        
+
         return {
             'form': recent_form,
             'win_rate': win_rate,
-            'goals_avg': float(goals_for) if goals_for else 0,
-            'streak': streak,
-            'full_form': form_str
+            'goals_avg': goals_for / played if played else 0,
+            'streak_last5': streak,
         }
-    
-    
-    def get_injuries(self, team_id: int, league_id: int) -> Dict:
+
+
+    def get_injuries(self, team_id: int, league_id: int, season: int = 2024, priority: str = NORMAL) -> Dict:
         """
-        Récupère blessures actuelles
-        
+        Récupère blessures actuelles (filtrées depuis les blessures de la ligue)
+
         Returns:
             {
                 'total_injuries': 3,
@@ -223,23 +656,17 @@ class APIFootballService:
                 'impact_score': -0.3
             }
         """
-        data = self._make_request(
-            'injuries',
-            {'team': team_id, 'league': league_id},
-            cache_hours=6  # Cache 6h (blessures changent)
-        )
-        
-        if not data or 'response' not in data:
-            return {'total_injuries': 0, 'key_players_out': 0, 'impact_score': 0}
-        
-        injuries = data['response']
-        
+        injuries = [
+            inj for inj in self.get_league_injuries(league_id, season, priority=priority)
+            if inj.get('team', {}).get('id') == team_id
+        ]
+
         # Compter blessures importantes (titulaires)
         key_injuries = sum(1 for inj in injuries if inj.get('player', {}).get('type') in ['Attacker', 'Midfielder', 'Defender'])
-        
+
         # Impact score (pénalité)
         impact_score = -0.1 * key_injuries
-        
+
         return {
             'total_injuries': len(injuries),
             'key_players_out': key_injuries,
@@ -253,12 +680,12 @@ class APIFootballService:
                 for inj in injuries[:5]  # Top 5
             ]
         }
-    
-    
-    def get_h2h(self, team1_id: int, team2_id: int) -> Dict:
+
+
+    def get_h2h(self, team1_id: int, team2_id: int, priority: str = NORMAL) -> Dict:
         """
         Head-to-Head historique
-        
+
         Returns:
             {
                 'total_matches': 10,
@@ -268,15 +695,18 @@ class APIFootballService:
                 'dominance_score': 0.1
             }
         """
+        # Clé canonique: A-B et B-A partagent la même entrée de cache
+        low, high = sorted((team1_id, team2_id))
         data = self._make_request(
             'fixtures/headtohead',
-            {'h2h': f'{team1_id}-{team2_id}'},
-            cache_hours=168  # Cache 1 semaine (historique stable)
+            {'h2h': f'{low}-{high}'},
+            cache_hours=168,  # Cache 1 semaine (historique stable)
+            priority=priority
         )
-        
+
         if not data or 'response' not in data:
             return {'total_matches': 0, 'team1_wins': 0, 'team2_wins': 0, 'draws': 0, 'dominance_score': 0}
-        
+
         matches = data["response"]
 
         team1_wins = sum(
@@ -290,13 +720,13 @@ class APIFootballService:
             or (m["teams"]["away"]["id"] == team2_id and m["teams"]["away"]["winner"])
         )
         draws = len(matches) - team1_wins - team2_wins
-        
+
         # Dominance score (-0.5 to +0.5)
         if len(matches) > 0:
             dominance = (team1_wins - team2_wins) / len(matches)
         else:
             dominance = 0
-        
+
         return {
             'total_matches': len(matches),
             'team1_wins': team1_wins,
@@ -304,12 +734,12 @@ class APIFootballService:
             'draws': draws,
             'dominance_score': dominance
         }
-    
-    
-    def get_predictions(self, fixture_id: int) -> Dict:
+
+
+    def get_predictions(self, fixture_id: int, priority: str = NORMAL) -> Dict:
         """
         Prédictions API (basé sur algo interne)
-        
+
         Returns:
             {
                 'winner': 'home',
@@ -320,17 +750,18 @@ class APIFootballService:
         data = self._make_request(
             'predictions',
             {'fixture': fixture_id},
-            cache_hours=12
+            cache_hours=12,
+            priority=priority
         )
-        
+
         if not data or 'response' not in data:
             return {'winner': None, 'confidence': 0.5, 'advice': None}
-        
+
         pred = data['response'][0] if data['response'] else {}
         predictions = pred.get('predictions', {})
-        
+
         winner = predictions.get('winner', {})
-        
+
         return {
             'winner': winner.get('name'),
             'confidence': float(winner.get('confidence', 50)) / 100,
@@ -340,6 +771,13 @@ class APIFootballService:
         }
 
 
+def _int_header(response, name: str) -> Optional[int]:
+    try:
+        return int(response.headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
 # Singleton
 _api_football_service = None
 
@@ -348,3 +786,35 @@ def get_api_football_service(api_key: str, db_config: Dict) -> APIFootballServic
     if _api_football_service is None:
         _api_football_service = APIFootballService(api_key, db_config)
     return _api_football_service
+
+
+def main():
+    """Cron heures creuses: exécute les refresh LOW planifiés et précharge le slate du lendemain"""
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(description="Refresh API-Football en heures creuses")
+    parser.add_argument('--limit', type=int, default=50, help="Nombre max de refresh planifiés à exécuter")
+    parser.add_argument('--prefetch', metavar='YYYY-MM-DD', help="Précharger fixtures/standings/injuries de cette date")
+    parser.add_argument('--season', type=int, default=2024)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(name)s | %(levelname)s | %(message)s')
+
+    db_config = {
+        'host': os.getenv('DB_HOST', 'localhost'),
+        'port': 5432,
+        'database': 'monps_db',
+        'user': 'monps_user',
+        'password': os.getenv('DB_PASSWORD', 'monps_secure_password_2024')
+    }
+    service = APIFootballService(os.getenv('API_FOOTBALL_KEY', ''), db_config)
+
+    if args.prefetch:
+        service.prefetch_slate(args.prefetch, season=args.season)
+    done = service.run_scheduled_refreshes(limit=args.limit)
+    logger.info(f"✅ {done} refresh exécutés, quota utilisé: {service.daily_requests}/{service.max_daily_requests}")
+
+
+if __name__ == '__main__':
+    main()
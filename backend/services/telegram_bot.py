@@ -2,8 +2,9 @@
 Telegram Bot Service - Ferrari 2.0 Diamond Edition
 """
 import os
+import json
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List
 from datetime import datetime
 import psycopg2
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
@@ -14,6 +15,12 @@ logger = logging.getLogger(__name__)
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
+# Deltas live (/api/live) poussés dans le chat: règlements et dérives de calibration.
+# Un seul worker API doit l'activer (TELEGRAM_LIVE_UPDATES=true), sinon messages en double
+LIVE_KINDS = {"settlement", "calibration"}
+# Un NOTIFY picks_resolved donne un delta par match: regroupés en un message
+LIVE_COALESCE_SECONDS = 5.0
+
 DB_CONFIG = {
     'host': 'postgres',
     'port': 5432,
@@ -317,6 +324,51 @@ class DiamondTelegramBot:
         except Exception as e:
             logger.error(f"Erreur envoi: {e}")
 
+    async def follow_live_updates(self):
+        """Abonnement au hub live: le chat reçoit les règlements et dérives sans /today ni /stats"""
+        from api.services.live_updates import hub
+
+        sub = hub.subscribe(kinds=LIVE_KINDS)
+        try:
+            while True:
+                deltas = [await sub.get()]
+                # Rafale d'un même commit: on attend la fin avant d'envoyer
+                while (delta := await sub.get(timeout=LIVE_COALESCE_SECONDS)) is not None:
+                    deltas.append(delta)
+                for message in live_messages(deltas):
+                    try:
+                        await self.app.bot.send_message(chat_id=self.chat_id, text=message, parse_mode="HTML")
+                    except Exception as e:
+                        logger.error(f"Erreur envoi live: {e}")
+        finally:
+            hub.unsubscribe(sub)
+
+
+def live_messages(deltas) -> List[str]:
+    """Deltas settlement / calibration → messages Telegram (un par règlement, un par lot d'alertes)"""
+    # Un delta par match, même résumé pour tous les matchs d'un règlement
+    settlements = list(dict.fromkeys(
+        json.dumps(delta.data, sort_keys=True) for delta in deltas if delta.kind == "settlement"
+    ))
+    messages = []
+    for summary in map(json.loads, settlements):
+        messages.append(
+            f"✅ <b>Picks réglés</b> ({summary.get('matches', 0)} matchs)\n\n"
+            f"🎯 {summary.get('wins', 0)} gagnés / {summary.get('losses', 0)} perdus / "
+            f"{summary.get('pushes', 0)} remboursés\n"
+            f"💼 Paris: {summary.get('bets', 0)} | Combos: {summary.get('combos', 0)}"
+        )
+    for delta in deltas:
+        if delta.kind != "calibration" or not delta.data.get('alerts'):
+            continue
+        lines = [
+            f"• {a['source']} / {a['market_type']}: {a['metric']} "
+            f"court {a['short']:.3f} vs long {a['long']:.3f} ({a['severity']})"
+            for a in delta.data['alerts']
+        ]
+        messages.append("⚠️ <b>Dérive de calibration</b>\n\n" + "\n".join(lines))
+    return messages
+
 
 telegram_bot = None
 
@@ -47,6 +47,11 @@ class TestBrainRepositoryCacheIntegration:
         mock_cache = MagicMock()
         mock_cache.get.return_value = (None, False)  # Cache miss
         monkeypatch.setattr("api.v1.brain.repository.smart_cache", mock_cache)
+        published = []
+        monkeypatch.setattr(
+            "api.v1.brain.repository.publish_delta",
+            lambda *args, **kwargs: published.append((args, kwargs))
+        )
 
         # Act
         result = repository.calculate_predictions(
@@ -74,6 +79,11 @@ class TestBrainRepositoryCacheIntegration:
         cache_set_call = mock_cache.set.call_args
         assert cache_set_call[1]["ttl"] == 3600  # PRE_MATCH (7 days ahead)
 
+        # Live delta: prediction key + the match key shared with odds deltas
+        ((args, kwargs),) = published
+        assert args == ("prediction", "m_liverpool_vs_chelsea")
+        assert kwargs["match_key"] == "liverpool_vs_chelsea"
+
     def test_cache_hit_fresh_no_compute(
         self, repository, mock_brain, monkeypatch
     ):
@@ -318,3 +328,43 @@ class TestBrainRepositoryCacheIntegration:
 
         # Brain was called (no cache)
         mock_brain.analyze_match.assert_called_once()
+
+    def test_in_play_push_served_on_match_day(
+        self, repository, mock_brain, monkeypatch
+    ):
+        """Match priced live → pushed markets served, no compute, no prediction lookup."""
+        from cache.key_factory import key_factory
+
+        live = {
+            "markets": {"home_win": 0.72, "over_2.5": 0.41},
+            "state": {"minute": 67, "home_goals": 1},
+            "priced_at": 1760000000.0,
+            "pricing_ms": 0.05,
+        }
+        mock_cache = MagicMock()
+        mock_cache.get.side_effect = lambda key: (
+            (live, False) if key == key_factory.markets_key("liverpool_vs_chelsea") else (None, False)
+        )
+        monkeypatch.setattr("api.v1.brain.repository.smart_cache", mock_cache)
+
+        result = repository.calculate_predictions(
+            home_team="Liverpool",
+            away_team="Chelsea",
+            match_date=datetime.now(timezone.utc) - timedelta(hours=1)
+        )
+
+        assert result["markets"]["home_win"]["prediction"]["probability"] == 0.72
+        assert result["in_play"]["minute"] == 67
+        mock_brain.analyze_match.assert_not_called()
+        mock_cache.get.assert_called_once()
+
+        # A week ahead: no live lookup, straight to the prediction cache
+        mock_cache.reset_mock()
+        repository.calculate_predictions(
+            home_team="Liverpool",
+            away_team="Chelsea",
+            match_date=datetime.now(timezone.utc) + timedelta(days=7)
+        )
+        (key,), _ = mock_cache.get.call_args
+        assert key == repository._prediction_cache_key("Liverpool", "Chelsea")
+        mock_brain.analyze_match.assert_called_once()
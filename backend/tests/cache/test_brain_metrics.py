@@ -0,0 +1,54 @@
+"""Unit tests for BrainStageMetrics"""
+from types import SimpleNamespace
+
+from cache.brain_metrics import BrainStageMetrics
+
+
+def _trace(stages, total_ms, failed=False):
+    return SimpleNamespace(
+        stage_timings=lambda: dict(stages),
+        total_ms=total_ms,
+        failed=failed,
+    )
+
+
+def test_record_trace_aggregates_stages():
+    """Each span lands in its stage histogram, slowest cumulative first"""
+    metrics = BrainStageMetrics()
+    metrics.record_trace(_trace({"data_hub": 30.0, "edges": 2.0}, 40.0))
+    metrics.record_trace(_trace({"data_hub": 10.0, "edges": 4.0}, 20.0, failed=True))
+
+    stats = metrics.get_stats()
+
+    assert stats["analyses"] == 2
+    assert stats["analyses_failed"] == 1
+    assert stats["avg_analysis_ms"] == 30.0
+    assert [row["stage"] for row in stats["stages"]] == ["data_hub", "edges"]
+    assert stats["stages"][0]["avg_ms"] == 20.0
+    assert stats["stages"][0]["share_pct"] == 66.67
+
+
+def test_to_prometheus_histogram_format():
+    """Cumulative buckets, +Inf, _sum and _count per stage"""
+    metrics = BrainStageMetrics(buckets=(0.001, 0.01))
+    for ms in (0.5, 5.0, 500.0):
+        metrics.record_trace(_trace({"engine.coach": ms}, ms, failed=ms > 100))
+
+    text = metrics.to_prometheus()
+
+    assert '# TYPE monps_brain_stage_duration_seconds histogram' in text
+    assert 'monps_brain_stage_duration_seconds_bucket{stage="engine.coach",le="0.001"} 1' in text
+    assert 'monps_brain_stage_duration_seconds_bucket{stage="engine.coach",le="0.01"} 2' in text
+    assert 'monps_brain_stage_duration_seconds_bucket{stage="engine.coach",le="+Inf"} 3' in text
+    assert 'monps_brain_stage_duration_seconds_count{stage="engine.coach"} 3' in text
+    assert 'monps_brain_analysis_duration_seconds_count 3' in text
+    assert '# TYPE monps_brain_analysis_failed_total counter' in text
+    assert 'monps_brain_analysis_failed_total 1' in text
+
+
+def test_reset():
+    metrics = BrainStageMetrics()
+    metrics.record_trace(_trace({"data_hub": 10.0}, 10.0))
+    metrics.reset()
+
+    assert metrics.get_stats()["stages"] == []
@@ -0,0 +1,92 @@
+"""Unit tests for in-play market pushes (SmartCacheEnhanced.push_in_play)"""
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+from cache.key_factory import key_factory
+from cache.metrics import cache_metrics
+from cache.smart_cache_enhanced import SmartCacheEnhanced, _in_play_engine
+from cache.tag_manager import EventType, TagManager
+
+
+def _enhanced(publisher=None):
+    base = MagicMock()
+    base.enabled = True
+    base.set.return_value = True
+    return SmartCacheEnhanced(base_cache=base, publisher=publisher), base
+
+
+def test_push_writes_repriced_markets():
+    """All markets land under the markets key with the live-zone TTL"""
+    from api.services.live_updates import Delta
+
+    published = []
+    engine = _in_play_engine()
+    cache, base = _enhanced(publisher=lambda *delta: published.append(Delta(*delta)))
+    before = cache_metrics.in_play_pushes
+
+    payload = cache.push_in_play(
+        "12345",
+        engine.MatchPrior(lambda_home=1.6, lambda_away=1.1),
+        engine.InPlayState(minute=67, home_goals=1, away_red=1, ht_score=(0, 0)),
+        league="soccer_epl",
+    )
+
+    key, value = base.set.call_args.args
+    assert key == key_factory.markets_key("12345")
+    assert value is payload
+    assert base.set.call_args.kwargs == {"ttl": cache.golden_hour.config.zone_live_ttl}
+    assert len(payload["markets"]) == 99
+    assert payload["markets"]["over_0.5"] == 1.0
+    assert payload["state"]["minute"] == 67
+    assert payload["cached"] is True
+    assert cache_metrics.in_play_pushes == before + 1
+
+    (delta,) = published
+    assert (delta.kind, delta.match_id, delta.league) == ("in_play", "12345", "soccer_epl")
+    assert delta.match_key == "12345"  # the cache key is already the shared match key
+    assert delta.data["markets"] == payload["markets"]
+    assert not json.loads(delta.to_json())["truncated"]  # fits a NOTIFY payload
+
+
+def test_push_survives_publisher_errors():
+    """No publisher, or a failing one: the cache write still happens"""
+    engine = _in_play_engine()
+    prior, state = engine.MatchPrior(lambda_home=1.4, lambda_away=1.2), engine.InPlayState(minute=10)
+
+    cache, base = _enhanced()
+    assert cache.push_in_play("1", prior, state)["cached"] is True
+
+    def failing(*delta):
+        raise ConnectionError("db down")
+
+    cache.set_publisher(failing)
+    assert cache.push_in_play("2", prior, state)["cached"] is True
+    assert base.set.call_count == 2
+
+
+def test_in_play_events_do_not_invalidate_live_matches():
+    """Goals and red cards on a match priced live re-price in place: nothing is deleted"""
+    cache, base = _enhanced()
+    base.get.return_value = ({"markets": {"home_win": 0.6}}, False)
+
+    for event in (EventType.GOAL, EventType.RED_CARD, EventType.MINUTE_TICK):
+        assert TagManager.is_in_play(event)
+        result = asyncio.run(cache.invalidate_by_event(event, "match:12345"))
+        assert result["invalidated_count"] == 0
+
+    base.get.assert_called_with(key_factory.markets_key("12345"))
+    base.invalidate_pattern.assert_not_called()
+    assert not TagManager.is_in_play(EventType.WEATHER_RAIN)
+
+
+def test_in_play_events_invalidate_until_first_push():
+    """No live push yet: pre-match markets are stale, invalidate as usual"""
+    cache, base = _enhanced()
+    base.get.return_value = (None, False)
+    base.invalidate_pattern.return_value = 1
+
+    result = asyncio.run(cache.invalidate_by_event(EventType.GOAL, "match:12345"))
+
+    assert result["invalidated_count"] == len(result["affected_markets"]) > 0
+    base.invalidate_pattern.assert_any_call(f"*:match:12345:{result['affected_markets'][0]}*")
@@ -14,6 +14,8 @@ sys.path.insert(0, '/home/Mon_ps/backend')
 
 # Environment setup for tests
 os.environ.setdefault("TESTING", "true")
+# Live updates: in-memory bus, no NOTIFY against a real database
+os.environ.setdefault("LIVE_UPDATES_BACKEND", "local")
 
 # ═══════════════════════════════════════════════════════════════
 # OPTIONAL IMPORTS (graceful degradation)
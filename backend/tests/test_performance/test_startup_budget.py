@@ -0,0 +1,105 @@
+"""Startup Budget Tests - Lazy router loading.
+
+Validates:
+- `import api.main` stays under STARTUP_BUDGET_SECONDS in a fresh interpreter
+- No router module (nor quantum_core) is imported at boot
+- Lazy routers load on first request, keep main.py resolution order,
+  and are all loaded for the OpenAPI schema
+
+Critical for production: Uvicorn workers boot (and roll) without dropping requests.
+"""
+
+import importlib.util
+import sys
+import types
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from api.router_registry import LazyRouters, RouterSpec
+from api.startup_profile import STARTUP_BUDGET_SECONDS, profile_imports
+
+
+def _fake_router_module(monkeypatch, name, build):
+    router = APIRouter()
+    build(router)
+    module = types.ModuleType(name)
+    module.router = router
+    monkeypatch.setitem(sys.modules, name, module)
+
+
+@pytest.fixture
+def lazy_app(monkeypatch):
+    def generic(router):
+        @router.get("/shared/{item}")
+        def shared(item: str):
+            return {"router": "generic", "item": item}
+
+    def special(router):
+        @router.get("/shared/special")
+        def shared_special():
+            return {"router": "special"}
+
+    def other(router):
+        @router.get("/other")
+        def other_route():
+            return {"router": "other"}
+
+    _fake_router_module(monkeypatch, "fake_routes_generic", generic)
+    _fake_router_module(monkeypatch, "fake_routes_special", special)
+    _fake_router_module(monkeypatch, "fake_routes_other", other)
+
+    app = FastAPI()
+    specs = [
+        RouterSpec("fake_routes_generic", ("/shared",)),
+        RouterSpec("fake_routes_special", ("/shared",)),
+        RouterSpec("fake_routes_other", ("/other",)),
+    ]
+    return app, LazyRouters(app, specs)
+
+
+class TestStartupBudget:
+    """`import api.main` must stay cheap."""
+
+    def test_import_under_budget_without_routers(self):
+        total, timings = profile_imports("api.main")
+        modules = {t.module for t in timings}
+
+        assert total <= STARTUP_BUDGET_SECONDS, f"import api.main took {total:.2f}s"
+        assert "api.main" in modules
+        eager = sorted(m for m in modules if m.startswith(("api.routes.", "api.v1", "quantum_core", "quantum.")))
+        assert eager == []
+
+    def test_main_declares_importable_routers(self):
+        from api.main import ROUTERS
+
+        assert len({spec.module for spec in ROUTERS}) == len(ROUTERS)
+        for spec in ROUTERS:
+            assert importlib.util.find_spec(spec.module) is not None, spec.module
+
+
+class TestLazyRouters:
+    """Routers load on first use, in declaration order."""
+
+    def test_router_loaded_on_first_request(self, lazy_app):
+        app, lazy_routers = lazy_app
+        client = TestClient(app)
+        assert len(lazy_routers.pending) == 3
+
+        assert client.get("/other").json() == {"router": "other"}
+        assert [spec.module for spec in lazy_routers.pending] == ["fake_routes_generic", "fake_routes_special"]
+
+        # Both routers serving /shared are loaded; the first declared wins, as with eager includes
+        assert client.get("/shared/special").json() == {"router": "generic", "item": "special"}
+        assert lazy_routers.pending == []
+        assert client.get("/missing").status_code == 404
+
+    def test_openapi_loads_every_router(self, lazy_app):
+        app, lazy_routers = lazy_app
+
+        paths = TestClient(app).get("/openapi.json").json()["paths"]
+
+        assert set(paths) == {"/shared/{item}", "/shared/special", "/other"}
+        assert lazy_routers.pending == []
+        assert set(lazy_routers.timings) == {"fake_routes_generic", "fake_routes_special", "fake_routes_other"}
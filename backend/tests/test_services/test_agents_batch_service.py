@@ -0,0 +1,236 @@
+"""Tests for the agents batch service (bulk inputs + bounded fan-out).
+
+Validates:
+1. load_batch_inputs: one round of queries for all matches
+2. Bulk league/team stats equal the per-match agent D queries (ILIKE semantics)
+3. stream_batch: bounded concurrency, completion order, missing/failed matches
+4. Batch routes: size and max_workers rejected before the NDJSON stream starts
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.routes import agents_routes
+from api.services.agents_batch_service import (
+    MAX_BATCH_SIZE,
+    build_match_info,
+    load_batch_inputs,
+    load_league_history,
+    stream_batch,
+)
+
+
+KICKOFF = datetime(2026, 10, 24, 15)
+
+ODDS_HISTORY = [
+    # match_id, home, away, sport, commence_time, bookmaker, home_odds, away_odds, draw_odds
+    ("m1", "Liverpool", "Arsenal", "soccer_epl", KICKOFF, "bet365", 2.0, 3.5, 3.4),
+    ("m1", "Liverpool", "Arsenal", "soccer_epl", KICKOFF, "pinnacle", 2.1, 3.3, 3.5),
+    ("m2", "Lyon", "Lille", "soccer_france_ligue_one", KICKOFF, "bet365", 1.9, 4.0, 3.2),
+    ("m3", "Boston", "Miami", "basketball_nba", KICKOFF, "bet365", 1.5, 2.6, None),
+]
+
+MATCHES_RESULTS = [
+    # league, home_team, away_team, result, home_goals, away_goals
+    ("Premier League", "Liverpool FC", "Arsenal", "H", 2, 0),
+    ("Premier League", "Liverpool FC", "Chelsea", "D", 1, 1),
+    ("Premier League", "Arsenal", "Liverpool FC", "A", 0, 3),
+    ("Premier League", "Chelsea", "Arsenal", "A", 1, 2),
+    ("Ligue 1", "Lyon", "Lille", "H", 3, 1),
+]
+
+
+class _FakeCursor:
+    """Minimal SQL interpreter for the queries issued by the service."""
+
+    def __init__(self, conn, dict_rows):
+        self.conn = conn
+        self.dict_rows = dict_rows
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        self.conn.queries.append(sql)
+        sql = " ".join(sql.split())
+        if "FROM odds_history" in sql:
+            rows = [r for r in ODDS_HISTORY if r[0] in params[0]]
+            if "DISTINCT ON" in sql:
+                seen = {}
+                for r in rows:
+                    seen.setdefault(r[0], r[:5])
+                self._rows = list(seen.values())
+            else:
+                self._rows = [(r[0],) + r[5:] for r in rows]
+        elif "GROUP BY league, home_team" in sql:
+            self._rows = self._team_groups(params[0], home=True)
+        elif "GROUP BY league, away_team" in sql:
+            self._rows = self._team_groups(params[0], home=False)
+        elif "GROUP BY league" in sql:
+            self._rows = [dict(self._league_stats(league), league=league) for league in params[0]
+                          if any(r[0] == league for r in MATCHES_RESULTS)]
+        elif "ILIKE" in sql:
+            league, pattern = params
+            needle = pattern.strip("%").lower()
+            home = "home_team ILIKE" in sql
+            rows = [r for r in MATCHES_RESULTS
+                    if r[0] == league and needle in (r[1] if home else r[2]).lower()]
+            wins = sum(1 for r in rows if r[3] == ("H" if home else "A"))
+            self._rows = [{"matches": len(rows), "wins": wins if rows else None}]
+        elif "FROM matches_results" in sql:
+            self._rows = [self._league_stats(params[0])]
+        else:
+            raise AssertionError(f"Unexpected query: {sql}")
+
+    @staticmethod
+    def _league_stats(league):
+        rows = [r for r in MATCHES_RESULTS if r[0] == league]
+        count = lambda res: sum(1 for r in rows if r[3] == res)
+        return {
+            "total": len(rows), "home_wins": count("H"), "draws": count("D"), "away_wins": count("A"),
+            "avg_home_goals": sum(r[4] for r in rows) / len(rows) if rows else None,
+            "avg_away_goals": sum(r[5] for r in rows) / len(rows) if rows else None,
+        }
+
+    @staticmethod
+    def _team_groups(leagues, home):
+        groups = {}
+        for r in MATCHES_RESULTS:
+            if r[0] not in leagues:
+                continue
+            row = groups.setdefault((r[0], r[1] if home else r[2]), {
+                "league": r[0], "team": r[1] if home else r[2], "matches": 0, "wins": 0})
+            row["matches"] += 1
+            row["wins"] += r[3] == ("H" if home else "A")
+        return list(groups.values())
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def close(self):
+        pass
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.queries = []
+
+    def cursor(self, cursor_factory=None):
+        return _FakeCursor(self, dict_rows=cursor_factory is not None)
+
+
+class TestLoadBatchInputs:
+    """Bulk loading must reproduce the per-match inputs."""
+
+    def test_single_round_of_queries(self):
+        conn = _FakeConnection()
+        inputs = load_batch_inputs(conn, ["m1", "m2", "m3", "m1", "unknown"])
+
+        assert len(conn.queries) == 5
+        assert sorted(inputs) == ["m1", "m2", "m3"]
+        assert inputs["m3"].league_history is None
+
+    def test_match_info_matches_single_path(self):
+        inputs = load_batch_inputs(_FakeConnection(), ["m1"])
+        rows = [r for r in ODDS_HISTORY if r[0] == "m1"]
+
+        expected = build_match_info(rows[0][:5], [r[5:] for r in rows])
+        assert inputs["m1"].match_info == expected
+        assert expected["bookmaker_count"] == 2
+        assert expected["odds"]["home"] == {"best": 2.1, "worst": 2.0, "spread_pct": 5.0}
+
+    @pytest.mark.parametrize("match_id", ["m1", "m2"])
+    def test_league_history_matches_agent_d_queries(self, match_id):
+        info = load_batch_inputs(_FakeConnection(), [match_id])[match_id]
+        conn = _FakeConnection()
+        league = {"m1": "Premier League", "m2": "Ligue 1"}[match_id]
+
+        expected = load_league_history(
+            conn.cursor(cursor_factory=object), league,
+            info.match_info["home_team"], info.match_info["away_team"])
+        assert info.league_history == expected
+
+
+class TestStreamBatch:
+    """Fan-out over a bounded worker pool."""
+
+    def test_bounded_concurrency_and_completion_order(self):
+        inputs = {f"m{i}": object() for i in range(6)}
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def analyze(match_id, _):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.05 if match_id == "m0" else 0.01)
+            with lock:
+                state["running"] -= 1
+            return {"id": match_id}
+
+        async def collect():
+            return [m async for m, _ in stream_batch(list(inputs), inputs, analyze, max_workers=2)]
+
+        order = asyncio.run(collect())
+        assert sorted(order) == sorted(inputs)
+        assert order[0] != "m0"
+        assert state["peak"] == 2
+
+    def test_missing_and_failed_matches(self):
+        def analyze(match_id, _):
+            if match_id == "bad":
+                raise ValueError("boom")
+            return {"ok": True}
+
+        async def collect():
+            results = stream_batch(
+                ["ok", "bad", "gone"], {"ok": None, "bad": None}, analyze,
+                on_missing=lambda m: {"missing": m})
+            return {m: r async for m, r in results}
+
+        results = asyncio.run(collect())
+        assert results == {"ok": {"ok": True}, "bad": {"error": "boom"}, "gone": {"missing": "gone"}}
+
+    def test_rejects_empty_pool(self):
+        async def collect():
+            return [m async for m, _ in stream_batch(["m1"], {"m1": None}, lambda *_: {}, max_workers=0)]
+
+        with pytest.raises(ValueError):
+            asyncio.run(collect())
+
+
+class TestBatchRoutes:
+    """Validation happens before the streaming response is built."""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        loaded = []
+        monkeypatch.setattr(agents_routes, "_load_inputs", lambda ids, *_: loaded.append(ids) or {})
+        app = FastAPI()
+        app.include_router(agents_routes.router)
+        client = TestClient(app)
+        client.loaded = loaded
+        return client
+
+    @pytest.mark.parametrize("path", ["/agents/patron/batch/stream", "/agents/conseil-ultim/batch/stream"])
+    def test_oversized_stream_is_413(self, client, path):
+        response = client.post(path, json=[f"m{i}" for i in range(MAX_BATCH_SIZE + 1)])
+        assert response.status_code == 413
+        assert client.loaded == []
+
+    @pytest.mark.parametrize("workers", [0, -1, 33])
+    def test_max_workers_bounds(self, client, workers):
+        response = client.post(f"/agents/patron/batch/stream?max_workers={workers}", json=["m1"])
+        assert response.status_code == 422
+
+    def test_stream_runs_after_validation(self, client):
+        response = client.post("/agents/patron/batch/stream?max_workers=2", json=["m1"])
+        assert response.status_code == 200
+        assert client.loaded == [["m1"]]
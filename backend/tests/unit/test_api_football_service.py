@@ -0,0 +1,178 @@
+"""
+Tests - Client API-Football (quota partagé, cache, coalescing, heures creuses)
+
+  - QuotaLedger: plafond jour par priorité, limite minute, recalage sur les headers
+  - Cache: Redis chaud puis cold store, données périmées servies quand le quota est épuisé
+  - Coalescing: N appels concurrents identiques = 1 requête HTTP
+  - LOW: planifié hors heures creuses, exécuté par run_scheduled_refreshes
+"""
+
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from services.api_football_service import HIGH, NORMAL, APIFootballService, LocalRedis
+
+PEAK = datetime(2026, 10, 18, 15, 0, tzinfo=timezone.utc).timestamp()
+OFF_PEAK = datetime(2026, 10, 19, 3, 0, tzinfo=timezone.utc).timestamp()
+
+
+class Clock:
+    def __init__(self, now=PEAK):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200, headers=None):
+        self._payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = str(payload)
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    def __init__(self, responder=None, delay=0.0):
+        self.calls = []
+        self.delay = delay
+        self.responder = responder or (lambda endpoint, params: FakeResponse({'response': [], 'errors': []}))
+        self._lock = threading.Lock()
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        with self._lock:
+            self.calls.append((url.split('.io/', 1)[1], params))
+        time.sleep(self.delay)
+        return self.responder(url, params)
+
+
+def _service(redis=None, session=None, clock=None, **kwargs):
+    clock = clock or Clock()
+    return APIFootballService(
+        'key', None, redis_client=redis or LocalRedis(clock), session=session or FakeSession(),
+        clock=clock, **kwargs
+    )
+
+
+def test_quota_is_shared_and_keeps_high_reserve():
+    clock = Clock()
+    redis = LocalRedis(clock)
+    a = _service(redis, clock=clock, daily_limit=5, minute_limit=100, high_reserve=2)
+    b = _service(redis, clock=clock, daily_limit=5, minute_limit=100, high_reserve=2)
+
+    granted = [svc.quota.acquire(NORMAL) for svc in (a, b, a, b)]
+    assert granted == [True, True, True, False]
+    # La réserve reste au slate
+    assert [b.quota.acquire(HIGH), a.quota.acquire(HIGH), a.quota.acquire(HIGH)] == [True, True, False]
+    assert a.daily_requests == 5
+
+
+def test_minute_limit_and_server_sync():
+    clock = Clock()
+    svc = _service(clock=clock, daily_limit=100, minute_limit=2)
+
+    assert [svc.quota.acquire(HIGH) for _ in range(3)] == [True, True, False]
+    assert svc.daily_requests == 2
+    clock.now += 60
+    assert svc.quota.acquire(HIGH)
+
+    # Un autre client du même compte a consommé 40 requêtes
+    svc.quota.sync(limit=100, remaining=57)
+    assert svc.daily_requests == 43
+
+
+def test_cache_hit_and_symmetric_h2h_key():
+    session = FakeSession()
+    svc = _service(session=session)
+
+    svc.get_h2h(33, 40)
+    svc.get_h2h(40, 33)
+
+    assert session.calls == [('fixtures/headtohead', {'h2h': '33-40'})]
+
+
+def test_team_form_and_injuries_use_league_bulk_endpoints():
+    standings = {'response': [{'league': {'standings': [[
+        {'team': {'id': 1}, 'form': 'LDWWW', 'all': {'played': 8, 'goals': {'for': 18}}},
+        {'team': {'id': 2}, 'form': 'WLLDL', 'all': {'played': 8, 'goals': {'for': 6}}},
+    ]]}}], 'errors': []}
+    injuries = {'response': [
+        {'team': {'id': 1}, 'player': {'name': 'A', 'type': 'Attacker'}},
+        {'team': {'id': 2}, 'player': {'name': 'B', 'type': 'Goalkeeper'}},
+    ], 'errors': []}
+    session = FakeSession(lambda url, params: FakeResponse(standings if url.endswith('standings') else injuries))
+    svc = _service(session=session)
+
+    home, away = svc.get_team_form(1, 39), svc.get_team_form(2, 39)
+    home_inj, away_inj = svc.get_injuries(1, 39), svc.get_injuries(2, 39)
+
+    assert [c[0] for c in session.calls] == ['standings', 'injuries']
+    assert (home['win_rate'], home['streak_last5'], home['goals_avg']) == (0.6, 3, 2.25)
+    assert 'full_form' not in home and 'streak' not in home
+    assert away['form'] == 'WLLDL'
+    assert (home_inj['key_players_out'], away_inj['total_injuries'], away_inj['key_players_out']) == (1, 1, 0)
+
+
+def test_concurrent_identical_requests_are_coalesced():
+    session = FakeSession(delay=0.2)
+    svc = _service(session=session)
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(svc.get_predictions(42))) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(session.calls) == 1
+    assert len(results) == 6
+
+
+def test_stale_data_served_when_quota_exhausted(monkeypatch):
+    clock = Clock()
+    cold = {}
+    svc = _service(clock=clock, daily_limit=1, minute_limit=10, high_reserve=0,
+                   session=FakeSession(lambda url, params: FakeResponse({'response': [{'v': 1}], 'errors': []})))
+    monkeypatch.setattr(svc, '_cold_put', lambda key, data: cold.__setitem__(key, (data, clock.now)))
+    monkeypatch.setattr(svc, '_cold_get', lambda key: cold.get(key))
+
+    first = svc.get_fixtures_by_date('2026-10-18')
+    clock.now += 2 * 3600          # cache 1h expiré, quota du jour consommé
+    again = svc.get_fixtures_by_date('2026-10-18')
+
+    assert first == again == [{'v': 1}]
+    assert svc.redis.zcard(svc.REFRESH_QUEUE) == 1
+
+
+def test_low_priority_deferred_to_off_peak():
+    clock = Clock(PEAK)
+    session = FakeSession()
+    svc = _service(session=session, clock=clock)
+
+    svc.prefetch_slate('2026-10-19')
+    assert session.calls == []
+    assert svc.run_scheduled_refreshes() == 0
+
+    clock.now = OFF_PEAK
+    assert svc.run_scheduled_refreshes() == 1
+    assert session.calls == [('fixtures', {'date': '2026-10-19'})]
+    assert svc.redis.zcard(svc.REFRESH_QUEUE) == 0
+
+
+def test_daily_quota_error_payload_exhausts_shared_counter():
+    payload = {'response': [], 'errors': {'requests': 'You have reached the request limit for the day'}}
+    svc = _service(session=FakeSession(lambda url, params: FakeResponse(payload)), daily_limit=100)
+
+    assert svc.get_predictions(7) == {'winner': None, 'confidence': 0.5, 'advice': None}
+    assert svc.daily_requests == 100
+    assert not svc.quota.acquire(HIGH)
@@ -0,0 +1,204 @@
+"""
+Tests - Calibration en ligne (calibration_monitor)
+
+  - CalibrationState: décroissance exponentielle, ordre d'arrivée sans effet, JSON compact
+  - summarize: Brier / log-loss / ECE / CLV depuis les sommes, comme un calcul direct
+  - drift_alerts: fenêtre courte dégradée vs longue
+  - observations + record: picks réglés → états persistés et NOTIFY
+  - CLV arrivé après le règlement: compté une fois, sans recompter le pick
+  - record_resolved: resolvers hors settlement_service
+"""
+
+import json
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from agents.clv_tracker import calibration_monitor as cm
+
+DAY = cm.DAY_SECONDS
+T0 = 1_790_000_000.0
+
+
+def _obs(p, won, market="over_25", source="agent_clv_v3", clv=None):
+    return cm.Observation(market, source, p, won, clv)
+
+
+class FakeCursor:
+    def __init__(self, rows=None):
+        self.rows = rows or []
+        self.executed = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((" ".join(sql.split()), params))
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.rows.pop(0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def schema_ready(monkeypatch):
+    monkeypatch.setattr(cm, "_schema_ready", True)
+
+
+def test_decay_and_arrival_order():
+    picks = [(_obs(0.6, True), T0), (_obs(0.7, False), T0 + 3 * DAY), (_obs(0.55, True), T0 + 10 * DAY)]
+
+    in_order = cm.CalibrationState("over_25", "agent_clv_v3")
+    for obs, at in picks:
+        in_order.update(obs, at)
+    shuffled = cm.CalibrationState("over_25", "agent_clv_v3")
+    for obs, at in reversed(picks):
+        shuffled.update(obs, at)
+
+    for window, tau in cm.WINDOWS.items():
+        expected = sum(math.exp(-(T0 + 10 * DAY - at) / (tau * DAY)) for _, at in picks)
+        assert in_order.windows[window].weight == pytest.approx(expected)
+        assert shuffled.windows[window].to_list() == pytest.approx(in_order.windows[window].to_list())
+    assert in_order.updated_at == shuffled.updated_at == T0 + 10 * DAY
+
+    restored = cm.CalibrationState.from_json("over_25", "agent_clv_v3", in_order.to_json())
+    assert restored.picks == 3
+    assert restored.windows["short"].to_list() == in_order.windows["short"].to_list()
+
+
+def test_summarize_matches_direct_computation():
+    probs = [0.62, 0.68, 0.45, 0.81, 0.33, 0.66]
+    outcomes = [True, False, True, True, False, True]
+    clvs = [3.0, -1.0, None, 2.5, 0.5, 1.0]
+    state = cm.CalibrationState("btts_yes", "agent")
+    for p, y, c in zip(probs, outcomes, clvs):
+        state.update(_obs(p, y, clv=c), T0)  # même instant: poids 1
+
+    s = cm.summarize(state, "long", at=T0)
+    ys = [1.0 if y else 0.0 for y in outcomes]
+    assert s["samples"] == 6
+    assert s["brier"] == pytest.approx(sum((p - y) ** 2 for p, y in zip(probs, ys)) / 6, abs=1e-4)
+    assert s["log_loss"] == pytest.approx(
+        -sum(y * math.log(p) + (1 - y) * math.log(1 - p) for p, y in zip(probs, ys)) / 6, abs=1e-4)
+    assert s["avg_clv"] == pytest.approx(1.2)
+    assert s["clv_std"] == pytest.approx(math.sqrt(sum((c - 1.2) ** 2 for c in clvs if c is not None) / 5), abs=1e-3)
+
+    sixties = next(b for b in s["buckets"] if b["bucket"] == 60)
+    assert sixties["samples"] == 3 and sixties["actual"] == pytest.approx(66.7, abs=0.1)
+    # ECE = moyenne pondérée des écarts par bucket
+    ece = sum(b["samples"] * abs(b["predicted"] - b["actual"]) for b in s["buckets"]) / 6
+    assert s["ece"] == pytest.approx(ece, abs=0.1)
+
+    # Clé inactive: le poids effectif fond, pas les ratios
+    later = cm.summarize(state, "short", at=T0 + 7 * DAY)
+    assert later["samples"] == pytest.approx(6 / math.e, abs=0.01)
+    assert later["brier"] == s["brier"]
+    assert cm.window_for(30) == "long" and cm.window_for(7) == "short"
+
+
+def test_drift_alerts_on_recent_degradation():
+    state = cm.CalibrationState(cm.ALL, cm.ALL)
+    at = T0
+    # 90 jours bien calibrés (60% prédit, 60% gagnés, CLV +3)
+    for i in range(450):
+        state.update(_obs(0.6, i % 5 < 3, clv=3.0), at)
+        at += 0.2 * DAY
+    assert cm.drift_alerts(state, at) == []
+
+    # 10 jours de surconfiance (80% prédit, 40% gagnés) et CLV négatif
+    for i in range(60):
+        state.update(_obs(0.8, i % 5 < 2, clv=-2.0), at)
+        at += DAY / 6
+
+    alerts = {a["metric"]: a for a in cm.drift_alerts(state, at)}
+    assert set(alerts) == {"brier", "ece", "clv"}
+    assert alerts["brier"]["short"] > alerts["brier"]["long"]
+    assert alerts["ece"]["severity"] == "high"
+
+
+def test_record_from_settled_picks(monkeypatch):
+    pending = [
+        {"id": 1, "market_type": "home", "source": "agent", "diamond_score": 72, "odds_taken": 2.2, "closing_odds": 2.0},
+        {"id": 2, "market_type": "dnb_home", "source": None, "diamond_score": 60, "odds_taken": 1.8, "closing_odds": None},
+        {"id": 3, "market_type": "away", "source": "agent", "diamond_score": None, "odds_taken": 3.0},
+    ]
+    settled = [(1, True, 1.2, 2, 1), (2, None, 0.0, 1, 1), (3, False, -1.0, 2, 1)]
+
+    observed = cm.observations(pending, settled)
+    assert observed == [cm.Observation("home", "agent", 0.72, True, pytest.approx(10.0))]
+
+    saved = []
+    monkeypatch.setattr(cm, "execute_values", lambda cur, sql, rows, template: saved.extend(rows))
+    cur = FakeCursor()
+    assert cm.record(cur, observed, at=T0) == []
+    assert cur.executed[0][0].startswith("SELECT pg_advisory_xact_lock")
+    keys = [("*", "*"), ("*", "agent"), ("home", "*"), ("home", "agent")]
+    assert sorted(zip(*cur.executed[1][1])) == keys
+    assert [row[:2] for row in saved] == keys
+    assert json.loads(saved[0][2])["n"] == 1
+    assert cm.record(FakeCursor(), []) == []
+
+
+def test_late_closing_adds_clv_without_recounting_the_pick():
+    state = cm.CalibrationState("home", "agent")
+    state.update(_obs(0.72, True, market="home", source="agent"), T0)  # réglé, closing encore NULL
+    assert cm.summarize(state, "short", T0)["avg_clv"] is None
+
+    rows = [
+        {"market_type": "home", "source": "agent", "diamond_score": 72, "is_winner": True, "clv": 10.0},
+        {"market_type": "home", "source": "agent", "diamond_score": 72, "is_winner": None, "clv": 4.0},  # push
+        {"market_type": "home", "source": "agent", "diamond_score": None, "is_winner": False, "clv": 4.0},
+    ]
+    (late,) = cm.clv_observations(rows)
+    state.update(late, T0 + 3600)  # clv_calculator, une heure plus tard
+
+    summary = cm.summarize(state, "short", T0 + 3600)
+    assert state.picks == 1
+    assert summary["avg_clv"] == 10.0 and summary["win_rate"] == 100.0
+    assert summary["samples"] == pytest.approx(math.exp(-3600 / (7 * DAY)), abs=0.01)
+
+
+def test_other_resolvers_record_settled_picks(monkeypatch):
+    rows = [{"id": 1, "market_type": "home", "source": "agent", "diamond_score": 72,
+             "odds_taken": 2.2, "closing_odds": None}]
+    recorded = []
+    monkeypatch.setattr(cm, "record", lambda cur, observed: recorded.extend(observed) or [])
+    dict_cur = FakeCursor(rows)
+
+    class Connection:
+        def cursor(self, cursor_factory=None):
+            return dict_cur
+
+    class Cursor:
+        connection = Connection()
+
+    assert cm.record_resolved(Cursor(), [(1, False)]) == []
+    assert dict_cur.executed[0][1] == ([1],)
+    assert recorded == [cm.Observation("home", "agent", 0.72, False, None)]
+    assert cm.record_resolved(Cursor(), []) == []
+
+
+def test_schema_is_recreated_after_a_rollback(monkeypatch):
+    monkeypatch.setattr(cm, "_schema_ready", False)
+    monkeypatch.setattr(cm, "_schema_txid", None)
+
+    cm.ensure_schema(FakeCursor([{'txid': 7}]))
+    assert not cm._schema_ready
+
+    cur = FakeCursor([{'status': 'aborted'}, {'txid': 8}])
+    cm.ensure_schema(cur)
+    assert any("CREATE TABLE IF NOT EXISTS" in sql for sql, _ in cur.executed)
+    assert not cm._schema_ready and cm._schema_txid == 8
+
+    cm.ensure_schema(FakeCursor([{'status': 'committed'}]))
+    assert cm._schema_ready
@@ -0,0 +1,155 @@
+"""
+Tests - Agrégats journaliers CLV (tracking_clv_daily_agg)
+
+  - refresh_days: jours dédupliqués, recalcul DELETE + INSERT borné aux jours touchés
+  - rebuild(since): rattrapage par création OU résolution
+  - ensure_schema: flag levé seulement après le commit du DDL
+  - rollup: SQL (GROUP BY / WHERE / HAVING) et métriques recomposées depuis les sommes
+"""
+
+import sys
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from agents.clv_tracker import clv_aggregates as agg
+
+
+class FakeCursor:
+    def __init__(self, rows=None, values=()):
+        self.rows = rows or []
+        self.values = list(values)
+        self.executed = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((" ".join(sql.split()), params))
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.values.pop(0)
+
+
+@pytest.fixture(autouse=True)
+def schema_ready(monkeypatch):
+    monkeypatch.setattr(agg, "_schema_ready", True)
+
+
+def test_refresh_days_recomputes_only_touched_days():
+    cur = FakeCursor()
+
+    refreshed = agg.refresh_days(cur, [
+        datetime(2026, 10, 18, 21, 30), date(2026, 10, 18), None, datetime(2026, 10, 12, 9, 0),
+    ])
+
+    assert refreshed == 2
+    lock, delete, insert = cur.executed
+    assert "pg_advisory_xact_lock" in lock[0]
+    assert delete == (f"DELETE FROM {agg.AGG_TABLE} WHERE day = ANY(%s::date[])",
+                      ([date(2026, 10, 12), date(2026, 10, 18)],))
+    assert insert[0].startswith(f"INSERT INTO {agg.AGG_TABLE}")
+    assert insert[1] == {
+        'start': date(2026, 10, 12),
+        'end': date(2026, 10, 19),
+        'days': [date(2026, 10, 12), date(2026, 10, 18)],
+    }
+
+
+def test_refresh_days_without_days_is_noop():
+    cur = FakeCursor()
+    assert agg.refresh_days(cur, [None]) == 0
+    assert cur.executed == []
+
+
+def test_catch_up_includes_picks_resolved_in_the_window():
+    """Pick créé il y a 10 jours, résolu hier par un writer sans hook"""
+    since = date(2026, 10, 17)
+    cur = FakeCursor(rows=[(date(2026, 10, 8),), (date(2026, 10, 18),)])
+
+    assert agg.rebuild(cur, since=since) == 2
+
+    select, params = cur.executed[0]
+    assert "created_at >= %(since)s OR (resolved_at >= %(since)s" in select
+    assert params == {'since': since}
+    assert cur.executed[1] == (f"DELETE FROM {agg.AGG_TABLE} WHERE day >= %s", (since,))
+    assert cur.executed[-1][1]['days'] == [date(2026, 10, 8), date(2026, 10, 18)]
+
+
+def test_schema_flag_waits_for_the_commit(monkeypatch):
+    monkeypatch.setattr(agg, "_schema_ready", False)
+    monkeypatch.setattr(agg, "_schema_txid", None)
+
+    # 1er appel: DDL dans la transaction de l'appelant, pas encore de flag
+    cur = FakeCursor(values=[(41,)])
+    agg.ensure_schema(cur)
+    assert "CREATE TABLE IF NOT EXISTS" in cur.executed[0][0]
+    assert not agg._schema_ready
+
+    # Transaction annulée: le DDL est rejoué
+    cur = FakeCursor(values=[{'status': 'aborted'}, {'txid': 42}])
+    agg.ensure_schema(cur)
+    assert "CREATE TABLE IF NOT EXISTS" in cur.executed[1][0]
+    assert not agg._schema_ready and agg._schema_txid == 42
+
+    # Commit constaté: plus aucun DDL ensuite
+    cur = FakeCursor(values=[{'status': 'committed'}])
+    agg.ensure_schema(cur)
+    agg.ensure_schema(cur)
+    assert agg._schema_ready
+    assert cur.executed == [("SELECT txid_status(%s) AS status", (42,))]
+
+
+def test_rollup_sql_and_metrics():
+    row = {c: 0 for c in agg.SUM_COLUMNS}
+    row.update({
+        'market_type': 'over_25', 'picks': 12, 'resolved': 10, 'wins': 6, 'losses': 4,
+        'profit': Decimal('2.5'), 'staked': Decimal('12.5'),
+        'score_sum': Decimal('780'), 'score_n': 12, 'odds_sum': Decimal('22.8'), 'odds_n': 12,
+        'clv_sum': Decimal('9'), 'clv_n': 6, 'clv_positive': 4,
+        'clv_win_sum': Decimal('6'), 'clv_win_n': 3, 'clv_loss_sum': Decimal('3'), 'clv_loss_n': 3,
+    })
+    cur = FakeCursor([row])
+
+    result = agg.rollup(cur, by=('market_type',), days=30, min_resolved=10, source='agent_clv_v3')
+
+    sql, params = cur.executed[0]
+    assert sql.startswith("SELECT market_type, SUM(picks) AS picks")
+    assert sql.endswith("WHERE day >= CURRENT_DATE - %s::int AND source = %s "
+                        "GROUP BY market_type HAVING SUM(resolved) >= %s ORDER BY market_type")
+    assert params == [30, 'agent_clv_v3', 10]
+
+    m = result[0]
+    assert m['market_type'] == 'over_25'
+    assert (m['total'], m['resolved'], m['wins']) == (12, 10, 6)
+    assert m['win_rate'] == 60.0
+    assert m['roi_percent'] == 25.0
+    assert m['roi_staked'] == 20.0
+    assert m['avg_score'] == 65.0
+    assert m['avg_odds'] == 1.9
+    assert m['avg_clv'] == 1.5
+    assert (m['avg_clv_winners'], m['avg_clv_losers']) == (2.0, 1.0)
+    assert m['clv_positive_rate'] == 66.7
+    # Pas d'échantillon: None, comme NULLIF côté SQL
+    assert m['avg_clv_pct'] is None
+
+
+def test_rollup_totals_on_empty_table():
+    cur = FakeCursor([{c: None for c in agg.SUM_COLUMNS}])
+
+    totals = agg.rollup(cur, since=date(2026, 10, 1), until=date(2026, 10, 19))[0]
+
+    assert "GROUP BY" not in cur.executed[0][0]
+    assert cur.executed[0][1] == [date(2026, 10, 1), date(2026, 10, 19)]
+    assert totals['picks'] == 0 and totals['profit'] == 0
+    assert totals['win_rate'] is None
+
+
+def test_rollup_rejects_unknown_columns():
+    with pytest.raises(ValueError):
+        agg.rollup(FakeCursor(), by=('home_team',))
@@ -0,0 +1,240 @@
+"""
+Tests - Deltas live (live_updates) et routes /api/live
+
+  - Delta: JSON compact, truncated au-delà de la limite NOTIFY
+  - from_notify: canaux repris (picks_resolved, calibration_drift)
+  - publish: un seul pg_notify par lot dans la transaction du producteur
+  - BackgroundPublisher: sans curseur, file bornée + thread, backoff si la DB tombe
+  - LiveHub: filtres match / ligue / type, file bornée (plus vieux perdus)
+  - match_key: un match suivi sur tous les types de delta, ligue reportée des odds
+  - Bot Telegram: un message par règlement (un delta par match) et par lot d'alertes
+  - WebSocket: seuls les deltas du match suivi arrivent, filtres modifiables
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from api.services import live_updates as lu
+from api.routes.live_routes import router
+
+
+class FakeCursor:
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class FakeConnection:
+    closed = False
+
+    def __init__(self):
+        self.cur = FakeCursor()
+
+    def cursor(self):
+        return self.cur
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def local_hub(monkeypatch):
+    hub = lu.LiveHub(backend="local")
+    monkeypatch.setattr(lu, "hub", hub)
+    monkeypatch.setattr("api.routes.live_routes.hub", hub)
+    return hub
+
+
+def test_delta_json_and_truncation():
+    delta = lu.Delta("odds", "m1", league="soccer_epl", data={"best": {"home": 2.1}})
+    assert lu.Delta.from_json(delta.to_json()) == delta
+
+    big = lu.Delta("prediction", "m1", data={"markets": ["x" * 100] * 100}, match_key="a_vs_b")
+    slim = json.loads(big.to_json())
+    assert slim["truncated"] is True and slim["data"] == {}
+    assert (slim["match_id"], slim["match_key"]) == ("m1", "a_vs_b")
+
+
+def test_from_notify_adapts_existing_channels():
+    settled = json.dumps({"picks": 3, "wins": 2, "match_ids": ["m1", "m2"]})
+    deltas = lu.from_notify(lu.SETTLEMENT_CHANNEL, settled)
+    assert [(d.kind, d.match_id) for d in deltas] == [("settlement", "m1"), ("settlement", "m2")]
+    assert deltas[0].data == {"picks": 3, "wins": 2}
+
+    alerts = [{"metric": "brier", "severity": "high"}]
+    (drift,) = lu.from_notify(lu.CALIBRATION_CHANNEL, json.dumps(alerts))
+    assert drift.kind == "calibration" and drift.data == {"alerts": alerts}
+
+    own = lu.Delta("in_play", "m3", data={"minute": 67})
+    assert lu.from_notify(lu.CHANNEL, own.to_json()) == [own]
+
+
+def test_publish_notifies_in_producer_transaction(monkeypatch):
+    monkeypatch.setattr(lu.hub, "backend", "postgres")
+    cur = FakeCursor()
+
+    assert lu.publish([lu.Delta("odds", "m1"), lu.Delta("odds", "m2")], cur) == 2
+    assert lu.publish([], cur) == 0
+
+    (sql, (channel, payloads)), = cur.executed
+    assert "unnest" in sql and channel == lu.CHANNEL
+    assert [json.loads(p)["match_id"] for p in payloads] == ["m1", "m2"]
+
+
+def test_background_publisher_backs_off_when_db_is_down():
+    attempts = []
+    gate = threading.Event()
+    conn = FakeConnection()
+
+    def connect():
+        attempts.append(time.monotonic())
+        gate.wait(2)
+        if len(attempts) == 1:
+            raise ConnectionError("db down")
+        return conn
+
+    pub = lu.BackgroundPublisher(connect, maxsize=3, backoff_min=0.05, backoff_max=0.1)
+
+    t0 = time.perf_counter()
+    assert pub.submit([lu.Delta("odds", "m1")]) == 1
+    deadline = time.time() + 2
+    while not attempts and time.time() < deadline:
+        time.sleep(0.005)
+
+    # Connexion en cours: l'appelant ne bloque pas, la file bornée perd les plus vieux
+    assert pub.submit([lu.Delta("odds", f"m{i}") for i in range(2, 8)]) == 6
+    assert time.perf_counter() - t0 < 0.5
+    assert pub.counters["dropped"] == 3
+
+    gate.set()
+    assert pub.flush()
+    assert len(attempts) == 2 and attempts[1] - attempts[0] >= 0.04  # backoff après l'échec
+    assert pub.counters["failures"] == 1 and pub.backoff == 0.0
+
+    (_, (_, payloads)), = conn.cur.executed
+    assert [json.loads(p)["match_id"] for p in payloads] == ["m5", "m6", "m7"]
+    assert pub.counters["published"] == 3
+
+
+async def test_hub_filters_and_bounded_queues(local_hub):
+    by_match = local_hub.subscribe(matches={"m1"})
+    by_league = local_hub.subscribe(leagues={"soccer_epl"}, kinds={"odds"})
+    slow = local_hub.subscribe(maxsize=2)
+
+    lu.publish([
+        lu.Delta("odds", "m1", league="soccer_epl"),
+        lu.Delta("odds", "m2", league="soccer_italy_serie_a"),
+        lu.Delta("settlement", "m2"),
+        lu.Delta("calibration"),
+    ])
+    await asyncio.sleep(0)
+
+    assert [(d.kind, d.match_id) for d in _drain(by_match)] == [("odds", "m1"), ("calibration", None)]
+    assert [d.match_id for d in _drain(by_league)] == ["m1"]
+    assert [d.kind for d in _drain(slow)] == ["settlement", "calibration"]
+    assert slow.dropped == 2
+
+    stats = local_hub.stats()
+    assert stats["subscribers"] == 3 and stats["received"] == 4 and stats["dropped"] == 2
+    local_hub.unsubscribe(slow)
+    assert await by_match.get(timeout=0.01) is None
+
+
+async def test_match_key_follows_a_match_across_kinds(local_hub):
+    key = lu.match_key("Saint-Étienne", "Paris SG")
+    assert key == "saint_etienne_vs_paris_sg"
+
+    by_key = local_hub.subscribe(matches={key})
+    by_league = local_hub.subscribe(leagues={"soccer_france_ligue_one"})
+
+    lu.publish([
+        lu.Delta("prediction", "m_lens_vs_nice", match_key="lens_vs_nice"),  # ligue encore inconnue
+        lu.Delta("odds", "evt-42", league="soccer_france_ligue_one", match_key=key),
+        lu.Delta("odds", "evt-43", league="soccer_epl", match_key="arsenal_vs_chelsea"),
+        lu.Delta("prediction", f"m_{key}", match_key=key),
+        lu.Delta("prediction", "m_arsenal_vs_chelsea", match_key="arsenal_vs_chelsea"),
+        lu.Delta("in_play", key, match_key=key),
+    ])
+    await asyncio.sleep(0)
+
+    assert [(d.kind, d.match_id) for d in _drain(by_key)] == [
+        ("odds", "evt-42"), ("prediction", f"m_{key}"), ("in_play", key),
+    ]
+    # Ligue reportée des odds: la prédiction Arsenal-Chelsea (EPL) ne passe plus le filtre Ligue 1
+    assert [(d.kind, d.match_id, d.league) for d in _drain(by_league)] == [
+        ("prediction", "m_lens_vs_nice", None),
+        ("odds", "evt-42", "soccer_france_ligue_one"),
+        ("prediction", f"m_{key}", "soccer_france_ligue_one"),
+        ("in_play", key, "soccer_france_ligue_one"),
+    ]
+
+
+def test_telegram_bot_groups_live_deltas():
+    from services.telegram_bot import live_messages
+
+    summary = {"matches": 2, "resolved": 5, "wins": 3, "losses": 1, "pushes": 1, "bets": 0, "combos": 0}
+    alert = {"market_type": "over_25", "source": "agent_clv_v3", "metric": "brier",
+             "short": 0.31, "long": 0.22, "severity": "high"}
+    messages = live_messages([
+        lu.Delta("settlement", "m1", data=summary),
+        lu.Delta("settlement", "m2", data=summary),
+        lu.Delta("calibration", data={"alerts": [alert]}),
+        lu.Delta("calibration", data={"alerts": []}),
+    ])
+
+    assert len(messages) == 2
+    assert "(2 matchs)" in messages[0] and "3 gagnés / 1 perdus / 1 remboursés" in messages[0]
+    assert "agent_clv_v3 / over_25: brier court 0.310 vs long 0.220 (high)" in messages[1]
+
+
+def _drain(sub):
+    items = []
+    while not sub.queue.empty():
+        items.append(sub.queue.get_nowait())
+    return items
+
+
+def _wait_subscribers(hub, count):
+    deadline = time.time() + 2
+    while hub.stats()["subscribers"] != count and time.time() < deadline:
+        time.sleep(0.01)
+    assert hub.stats()["subscribers"] == count
+
+
+def test_websocket_streams_followed_match(local_hub):
+    app = FastAPI()
+    app.include_router(router)
+
+    with TestClient(app) as client:
+        with client.websocket_connect("/api/live/ws?matches=m1") as ws:
+            _wait_subscribers(local_hub, 1)
+            lu.publish([lu.Delta("odds", "m2"), lu.Delta("odds", "m1", data={"best": {"home": 2.05}})])
+            assert ws.receive_json()["data"] == {"best": {"home": 2.05}}
+
+            ws.send_text(json.dumps({"matches": ["m2"], "kinds": ["in_play"]}))
+            ws.send_text("pas du json")
+            assert "error" in ws.receive_json()
+            lu.publish([lu.Delta("odds", "m2"), lu.Delta("in_play", "m2", data={"minute": 12})])
+            assert ws.receive_json()["data"] == {"minute": 12}
+
+        _wait_subscribers(local_hub, 0)
+        assert client.get("/api/live/stats").json()["backend"] == "local"
@@ -0,0 +1,146 @@
+"""
+Tests - Règlement événementiel (settlement_service + market_resolvers)
+
+  - market_resolvers: normalisation des anciens formats, push DNB
+  - settle_picks / settle_bets / settle_combos: fonctions pures, sans DB
+  - unknown_markets: picks marqués ignorés au lieu d'être remis en file
+"""
+
+import sys
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from agents.clv_tracker.market_resolvers import market_resolver, normalize_market, settle_profit
+from agents.clv_tracker.settlement_service import (
+    MatchResult,
+    SettlementBatch,
+    settle_bets,
+    settle_combos,
+    settle_picks,
+    unknown_markets,
+)
+
+
+def _result(match_id="m1", home=2, away=1, teams=("Arsenal", "Chelsea"), kickoff=datetime(2026, 10, 18, 17, 30)):
+    return MatchResult(match_id, teams[0], teams[1], home, away, kickoff)
+
+
+def test_normalize_market_aliases():
+    assert normalize_market("Over 2.5") == "over_25"
+    assert normalize_market("o25") == "over_25"
+    assert normalize_market("BTTS_Oui") == "btts_yes"
+    assert normalize_market("1X") == "dc_1x"
+    assert market_resolver("corners_over_95") is None
+
+
+def test_dnb_is_a_push_on_draw():
+    resolver = market_resolver("dnb_home")
+    assert resolver(1, 1) is None
+    assert settle_profit(None, 10, 2.0) == 0.0
+    assert settle_profit(True, Decimal("10"), Decimal("1.85")) == 8.5
+    assert settle_profit(False, None, 2.0) == -1.0
+
+
+def test_settle_picks_profit_and_touched_days():
+    results = {"m1": _result(home=1, away=1)}
+    picks = [
+        {"id": 1, "match_id": "m1", "market_type": "draw", "odds_taken": 3.4, "stake": 1,
+         "created_at": datetime(2026, 10, 17, 9, 0)},
+        {"id": 2, "match_id": "m1", "market_type": "dnb_away", "odds_taken": 2.1, "stake": 1,
+         "created_at": datetime(2026, 10, 18, 9, 0)},
+        {"id": 3, "match_id": "m1", "market_type": "over25", "odds_taken": 1.9, "stake": 1,
+         "created_at": date(2026, 10, 18)},
+        # Match non réglé ou marché inconnu: ignorés
+        {"id": 4, "match_id": "m2", "market_type": "home", "odds_taken": 1.5},
+        {"id": 5, "match_id": "m1", "market_type": "corners_over_95", "odds_taken": 1.8},
+    ]
+
+    updates, days = settle_picks(picks, results)
+
+    assert updates == [
+        (1, True, 2.4, 1, 1),
+        (2, None, 0.0, 1, 1),
+        (3, False, -1.0, 1, 1),
+    ]
+    assert days == {date(2026, 10, 17), date(2026, 10, 18)}
+
+    # Seul le pick 5 (match réglé, marché inconnu) est marqué; le 4 attend son match
+    skipped = unknown_markets(picks, results)
+    assert skipped == [(5, "unknown_market")]
+
+    batch = SettlementBatch(match_ids=["m1"], picks=updates, skipped=skipped)
+    assert batch.summary() == {
+        "matches": 1, "resolved": 3, "wins": 1, "losses": 1, "pushes": 1, "skipped": 1,
+        "bets": 0, "combos": 0,
+    }
+
+
+def test_settle_bets_status_and_payout():
+    results = {"m1": _result(home=0, away=2)}
+    bets = [
+        {"id": 10, "match_id": "m1", "outcome": "away", "stake": Decimal("20"), "odds": Decimal("2.5")},
+        {"id": 11, "match_id": "m1", "outcome": "home", "stake": Decimal("20"), "odds": Decimal("3.1")},
+    ]
+
+    assert settle_bets(bets, results) == [
+        (10, "won", "0-2", 50.0, 30.0),
+        (11, "lost", "0-2", 0.0, -20.0),
+    ]
+
+
+def test_settle_combos_matches_fixture_and_grades():
+    results = [
+        _result("old", home=0, away=0, kickoff=datetime(2026, 3, 1, 15, 0)),
+        _result("m1", home=3, away=1),
+    ]
+    selections = {
+        "home_team": "Arsenal", "away_team": "Chelsea", "commence_time": "2026-10-18T17:30:00Z",
+        "picks": [{"market": "home"}, {"market": "over_25"}, {"market": "btts_no"}],
+    }
+    combos = [
+        {"id": 1, "combo_id": "c1", "stake": 10, "total_odds": 4.0, "selections": selections},
+        {"id": 2, "combo_id": "c2", "stake": 10, "total_odds": 3.0,
+         "selections": {**selections, "picks": [{"market": "home"}, {"market": "over_25"}]}},
+        {"id": 3, "combo_id": "c3", "stake": 10, "total_odds": 3.0,
+         "selections": {**selections, "home_team": "Spurs"}},
+    ]
+
+    updates, report = settle_combos(combos, results)
+
+    assert [(u[0], u[1], u[2], u[3]) for u in updates] == [
+        (1, "partial", 2, -5.0),
+        (2, "won", 2, 20.0),
+    ]
+    # Le match de mars (même affiche) n'est pas pris
+    assert report[0]["score"] == "3-1"
+    assert report[1]["winning_picks"] == "2/2"
+
+
+def test_fg_picks_sql_runs_on_schema():
+    """FG_PICKS_SQL: seulement les picks en attente, non ignorés, absents de match_results"""
+    import sqlite3
+    from agents.clv_tracker.settlement_service import FG_PICKS_SQL
+
+    db = sqlite3.connect(":memory:")
+    db.executescript("""
+        CREATE TABLE tracking_clv_picks (
+            id INTEGER PRIMARY KEY, match_id TEXT, market_type TEXT, source TEXT, diamond_score REAL,
+            odds_taken REAL, closing_odds REAL, stake REAL, created_at TEXT,
+            is_resolved BOOLEAN, skip_reason TEXT
+        );
+        CREATE TABLE fg_match_results (match_id TEXT PRIMARY KEY, home_score INT, away_score INT);
+        CREATE TABLE match_results (match_id TEXT PRIMARY KEY, is_finished BOOLEAN);
+        INSERT INTO tracking_clv_picks (id, match_id, market_type, is_resolved, skip_reason) VALUES
+            (1, 'fg', 'home', 0, NULL), (2, 'fg', 'corners', 0, 'unknown_market'),
+            (3, 'fg', 'away', 1, NULL), (4, 'both', 'home', 0, NULL), (5, 'none', 'home', 0, NULL);
+        INSERT INTO fg_match_results VALUES ('fg', 2, 0), ('both', 1, 1);
+        INSERT INTO match_results VALUES ('both', 1);
+    """)
+    db.row_factory = sqlite3.Row
+
+    rows = db.execute(FG_PICKS_SQL).fetchall()
+    assert [(r["id"], r["home_score"], r["away_score"]) for r in rows] == [(1, 2, 0)]
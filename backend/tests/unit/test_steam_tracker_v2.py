@@ -0,0 +1,167 @@
+"""
+Tests - Steam Tracker V2 (scoring vectorisé)
+
+  - steam_scores == calculate_steam_score, ligne à ligne
+  - type de steam vectorisé == get_steam_type
+  - signaux et vélocité depuis des lignes match × bookmaker
+  - steam score des picks selon leur côté 1X2
+  - mode --watch: connexion autocommit, aucune transaction laissée ouverte
+"""
+
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from scripts import steam_tracker_v2 as st
+
+NOW = datetime(2026, 10, 19, 18, 0)
+
+
+def _row(match_id, hours_to_match, opening, current, ref=None, ref_age_hours=1.5):
+    last_update = NOW - timedelta(minutes=5)
+    row = {
+        'match_id': match_id, 'bookmaker': 'Pinnacle', 'home_team': 'Liverpool', 'away_team': 'Arsenal',
+        'commence_time': NOW + timedelta(hours=hours_to_match), 'snapshot_count': 8,
+        'first_seen': last_update - timedelta(hours=12), 'last_update': last_update,
+        'ref_time': last_update - timedelta(hours=ref_age_hours) if ref else None,
+    }
+    for i, side in enumerate(st.SIDES):
+        row[f'opening_{side}'] = opening[i]
+        row[f'current_{side}'] = current[i]
+        row[f'ref_{side}'] = ref[i] if ref else None
+    return row
+
+
+def test_vectorized_scores_match_scalar():
+    opening = [2.0, 1.5, 3.2, None, 1.0, 2.5, Decimal('1.91')]
+    current = [1.8, 1.7, 2.9, 2.0, 1.5, None, Decimal('1.80')]
+
+    scores = st.steam_scores(st._odds_array(opening), st._odds_array(current))
+
+    assert scores.tolist() == [st.calculate_steam_score(o, c) for o, c in zip(opening, current)]
+
+
+@pytest.mark.parametrize("hours", [0.5, 1.99, 2.0, 5.0, 6.0, 23.9, 24.0, 72.0])
+def test_steam_type_index_matches_scalar(hours):
+    index = int(st.steam_type_index([hours])[0])
+    expected = st.get_steam_type(hours)
+    vectorized = st.STEAM_TYPES[index][1:] if index < len(st.STEAM_TYPES) else st.EARLY_STEAM
+    assert vectorized == expected
+
+
+def test_signals_sorted_with_velocity():
+    rows = [
+        # Steam domicile modéré, pas de snapshot antérieur à la fenêtre
+        _row('m1', 30, opening=(2.0, 3.4, 3.8), current=(1.85, 3.5, 4.2)),
+        # LATE steam fort sur l'extérieur, référence 1.5h avant la dernière cote
+        _row('m2', 1, opening=(1.8, 3.6, 4.5), current=(2.1, 3.6, 3.6), ref=(2.0, 3.6, 4.0)),
+        # Marché stable: pas de signal
+        _row('m3', 10, opening=(2.0, 3.4, 3.8), current=(2.02, 3.4, 3.75)),
+    ]
+    scored = st.score_movements(rows, now=NOW)
+    signals = st.build_signals(rows, scored)
+
+    assert [s['match_id'] for s in signals] == ['m2', 'm1']
+    late = signals[0]
+    assert late['steam_type'] == "🔥 LATE STEAM"
+    assert [(a['side'], a['action']) for a in late['alerts']] == [('HOME', 'DRIFT'), ('AWAY', 'STEAM')]
+
+    away = late['alerts'][1]
+    assert away['score'] == st.calculate_steam_score(4.5, 3.6)
+    assert away['velocity'] == pytest.approx(st.calculate_steam_score(4.0, 3.6) / 1.5, abs=0.1)
+    # Sans référence: vélocité mesurée depuis l'ouverture (12h)
+    assert signals[1]['alerts'][0]['velocity'] == pytest.approx(st.calculate_steam_score(2.0, 1.85) / 12, abs=0.1)
+    assert signals[1]['steam_type'] == st.EARLY_STEAM[0]
+
+
+def test_pick_movements_follow_market_side():
+    match_rows = [
+        {'match_id': 'm1', 'opening_home': Decimal('2.0'), 'opening_draw': Decimal('3.4'), 'opening_away': Decimal('3.8'),
+         'current_home': Decimal('1.8'), 'current_draw': Decimal('3.5'), 'current_away': Decimal('4.4')},
+        {'match_id': 'm2', 'opening_home': None, 'opening_draw': None, 'opening_away': None,
+         'current_home': Decimal('1.8'), 'current_draw': None, 'current_away': None},
+    ]
+    picks = [
+        {'id': 1, 'match_id': 'm1', 'market_type': 'home'},
+        {'id': 2, 'match_id': 'm1', 'market_type': 'away'},
+        {'id': 3, 'match_id': 'm1', 'market_type': 'over_25'},
+        {'id': 4, 'match_id': 'm2', 'market_type': 'home'},
+        {'id': 5, 'match_id': 'unknown', 'market_type': 'home'},
+    ]
+
+    values = dict(st.pick_movements(picks, match_rows))
+
+    assert values == {
+        1: st.calculate_steam_score(2.0, 1.8),
+        2: st.calculate_steam_score(3.8, 4.4),
+        3: st.calculate_steam_score(2.0, 1.8),
+    }
+    assert np.sign(values[2]) == -1
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, params=None):
+        self.conn.statements += 1
+
+    def fetchall(self):
+        return []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class FakeConnection:
+    """Sémantique psycopg2: `with conn` commit (ou rollback) sans fermer."""
+
+    def __init__(self):
+        self.autocommit = False
+        self.statements = 0
+        self.commits = 0
+        self.closed = False
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.commits += 1
+
+    def close(self):
+        self.closed = True
+
+
+def test_shared_connection_transaction_ends_on_early_return():
+    conn = FakeConnection()
+    assert st.update_picks_steam_score(conn, refresh_open=True) == 0  # aucun pick à scorer
+    assert (conn.statements, conn.commits, conn.closed) == (1, 1, False)
+
+
+def test_watch_uses_an_autocommit_connection(monkeypatch):
+    conn = FakeConnection()
+    monkeypatch.setattr(st.psycopg2, "connect", lambda **kwargs: conn)
+
+    def stop(seconds):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(st.time, "sleep", stop)
+    with pytest.raises(KeyboardInterrupt):
+        st.watch(interval_minutes=5, horizon_hours=6)
+
+    assert conn.autocommit is True
+    assert conn.commits == 2 and conn.closed  # signaux + rescoring, puis fermeture
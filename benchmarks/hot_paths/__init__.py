@@ -0,0 +1,31 @@
+"""
+╔═══════════════════════════════════════════════════════════════════════════════╗
+║     ⏱️  HOT PATHS BENCHMARK SUITE - Régression de performance                   ║
+║                                                                               ║
+║  Mesure le coût CPU des chemins chauds de prédiction sur des entrées          ║
+║  synthétiques figées (fixtures/synthetic_inputs.json), sans DB ni Redis:     ║
+║  • UnifiedBrain.analyze_match                                                ║
+║  • Calculateurs quantum_core/brain                                           ║
+║  • FrictionTensorCalculator.calculate                                        ║
+║  • SmartCache get/set (Redis en mémoire)                                     ║
+║  • DataHubAdapter.prepare_matchup_data                                       ║
+║                                                                               ║
+║  Usage:                                                                       ║
+║    python -m benchmarks.hot_paths run --save baselines/local.json            ║
+║    python -m benchmarks.hot_paths compare --baseline baselines/local.json    ║
+╚═══════════════════════════════════════════════════════════════════════════════╝
+"""
+
+from .harness import BenchmarkResult, Regression, measure, compare, load_baseline, save_baseline
+from .suite import BENCHMARKS, run_suite
+
+__all__ = [
+    "BenchmarkResult",
+    "Regression",
+    "measure",
+    "compare",
+    "load_baseline",
+    "save_baseline",
+    "BENCHMARKS",
+    "run_suite",
+]
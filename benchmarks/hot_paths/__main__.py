@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+CLI hot paths.
+
+    python -m benchmarks.hot_paths run [--rounds N] [--only NAME ...] [--save PATH]
+    python -m benchmarks.hot_paths compare --baseline PATH [--threshold 0.25]
+
+`compare` retourne le code 1 si une régression dépasse le seuil ou si un
+benchmark n'a pas de baseline (--allow-missing: simple warning), utilisable en CI.
+"""
+
+import argparse
+import sys
+from typing import List
+
+from .harness import BenchmarkResult, compare, load_baseline, save_baseline
+from .suite import BENCHMARKS, run_suite
+
+
+def print_results(results: List[BenchmarkResult]) -> None:
+    print(f"{'Benchmark':34} {'median µs':>10} {'p95 µs':>10} {'ops/s':>10} {'peak KiB':>9} {'blocks':>8}")
+    print("-" * 86)
+    for r in results:
+        print(f"{r.name:34} {r.median_us:>10.1f} {r.p95_us:>10.1f} {r.ops_per_sec:>10.0f} "
+              f"{r.alloc_peak_kib:>9.1f} {r.alloc_blocks_per_call:>8.1f}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmarks.hot_paths")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for cmd in ("run", "compare"):
+        p = sub.add_parser(cmd)
+        p.add_argument("--rounds", type=int, default=200)
+        p.add_argument("--warmup", type=int, default=10)
+        p.add_argument("--only", nargs="*", choices=list(BENCHMARKS))
+        if cmd == "run":
+            p.add_argument("--save", help="Chemin JSON de la baseline à écrire")
+        else:
+            p.add_argument("--baseline", required=True)
+            p.add_argument("--threshold", type=float, default=0.25)
+            p.add_argument("--allow-missing", action="store_true",
+                           help="Benchmarks sans baseline: warning au lieu d'un échec")
+
+    args = parser.parse_args(argv)
+    results = run_suite(args.only, rounds=args.rounds, warmup=args.warmup)
+    print_results(results)
+
+    if args.command == "run":
+        if args.save:
+            save_baseline(results, args.save)
+            print(f"\n✅ Baseline sauvegardée: {args.save}")
+        return 0
+
+    regressions = compare(results, load_baseline(args.baseline), args.threshold,
+                          allow_missing=args.allow_missing)
+    if regressions:
+        print(f"\n❌ {len(regressions)} régression(s) > {args.threshold:.0%} ou baseline(s) manquante(s):")
+        for reg in regressions:
+            print(f"   {reg}")
+        return 1
+
+    print(f"\n✅ Aucune régression > {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""
+Harness de mesure: latence par appel, allocations et débit.
+
+Pas de dépendance externe (pytest-benchmark/asv non requis): perf_counter_ns
+pour la latence, tracemalloc pour les allocations, JSON pour les baselines.
+"""
+
+import gc
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+import warnings
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+@dataclass
+class BenchmarkResult:
+    """Mesures d'un benchmark (latences en microsecondes)."""
+    name: str
+    rounds: int
+    mean_us: float
+    median_us: float
+    p95_us: float
+    min_us: float
+    ops_per_sec: float
+    alloc_peak_kib: float
+    alloc_blocks_per_call: float
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+@dataclass
+class Regression:
+    """Métrique dégradée au-delà du seuil toléré."""
+    name: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+    def __str__(self) -> str:
+        if self.metric == MISSING_BASELINE:
+            return f"{self.name}: aucune baseline (run --save pour l'enregistrer)"
+        return (f"{self.name}.{self.metric}: {self.baseline:.2f} → {self.current:.2f} "
+                f"({(self.ratio - 1) * 100:+.1f}%)")
+
+
+# Métriques comparées (plus bas = meilleur)
+COMPARED_METRICS = ("median_us", "alloc_peak_kib")
+
+# Pseudo-métrique d'un benchmark absent de la baseline
+MISSING_BASELINE = "baseline"
+
+
+def measure(
+    name: str,
+    fn: Callable[[], object],
+    rounds: int = 200,
+    warmup: int = 10,
+    alloc_rounds: int = 20,
+) -> BenchmarkResult:
+    """
+    Mesure un appel sans argument.
+
+    Args:
+        name: Nom du benchmark
+        fn: Appel à mesurer (closure préparée par la suite)
+        rounds: Nombre d'appels chronométrés
+        warmup: Appels de chauffe (caches, imports lazy)
+        alloc_rounds: Appels mesurés sous tracemalloc (séparés du chrono)
+    """
+    for _ in range(warmup):
+        fn()
+
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        samples = []
+        for _ in range(rounds):
+            start = time.perf_counter_ns()
+            fn()
+            samples.append((time.perf_counter_ns() - start) / 1000.0)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    try:
+        peak = 0
+        blocks = 0
+        for _ in range(alloc_rounds):
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            fn()
+            _, call_peak = tracemalloc.get_traced_memory()
+            peak = max(peak, call_peak - base)
+            after = tracemalloc.take_snapshot()
+            blocks += sum(max(0, s.count_diff) for s in after.compare_to(before, "lineno"))
+    finally:
+        tracemalloc.stop()
+
+    ordered = sorted(samples)
+    mean = statistics.fmean(samples)
+    return BenchmarkResult(
+        name=name,
+        rounds=rounds,
+        mean_us=mean,
+        median_us=statistics.median(samples),
+        p95_us=ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        min_us=ordered[0],
+        ops_per_sec=1e6 / mean if mean > 0 else 0.0,
+        alloc_peak_kib=peak / 1024.0,
+        alloc_blocks_per_call=blocks / alloc_rounds if alloc_rounds else 0.0,
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BASELINES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def save_baseline(results: List[BenchmarkResult], path: Path) -> None:
+    """Écrit les résultats + contexte machine (les baselines ne sont comparables que sur la même machine)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "generated_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "results": {r.name: r.to_dict() for r in results},
+    }
+    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+def load_baseline(path: Path) -> Dict[str, BenchmarkResult]:
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    return {name: BenchmarkResult(**data) for name, data in payload["results"].items()}
+
+
+def compare(
+    current: List[BenchmarkResult],
+    baseline: Dict[str, BenchmarkResult],
+    threshold: float = 0.25,
+    metrics: Optional[tuple] = None,
+    allow_missing: bool = False,
+) -> List[Regression]:
+    """
+    Compare des résultats à une baseline.
+
+    Args:
+        current: Résultats du run courant
+        baseline: Résultats de référence par nom
+        threshold: Dégradation relative tolérée (0.25 = +25%)
+        metrics: Métriques à comparer (défaut: médiane + pic d'allocation)
+        allow_missing: Benchmark sans baseline → simple warning au lieu
+            d'un échec (MISSING_BASELINE)
+
+    Returns:
+        Régressions détectées (vide = OK)
+    """
+    metrics = metrics or COMPARED_METRICS
+    regressions = []
+    for result in current:
+        ref = baseline.get(result.name)
+        if ref is None:
+            if allow_missing:
+                warnings.warn(f"{result.name}: aucune baseline, non comparé")
+            else:
+                regressions.append(Regression(result.name, MISSING_BASELINE, 0.0, result.median_us))
+            continue
+        for metric in metrics:
+            before = getattr(ref, metric)
+            after = getattr(result, metric)
+            if before > 0 and after > before * (1 + threshold):
+                regressions.append(Regression(result.name, metric, before, after))
+    return regressions
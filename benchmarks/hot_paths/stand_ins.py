@@ -0,0 +1,73 @@
+"""
+Stand-ins déterministes pour Redis et DataOrchestrator.
+
+Ils isolent le coût CPU des hot paths de toute I/O (PostgreSQL, JSON /home/Mon_ps,
+réseau Redis) afin que les mesures soient reproductibles d'une machine à l'autre.
+"""
+
+import fnmatch
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, Optional
+
+FIXTURES_PATH = Path(__file__).parent / "fixtures" / "synthetic_inputs.json"
+
+
+def load_fixtures(path: Path = FIXTURES_PATH) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def to_namespace(data: Any) -> Any:
+    """Convertit récursivement un dict en objet à attributs (TeamDNA-like)."""
+    if isinstance(data, dict):
+        return SimpleNamespace(**{k: to_namespace(v) for k, v in data.items()})
+    return data
+
+
+class InMemoryRedis:
+    """Sous-ensemble de redis.Redis utilisé par SmartCache (decode_responses=True)."""
+
+    def __init__(self):
+        self._store: Dict[str, str] = {}
+
+    def ping(self) -> bool:
+        return True
+
+    def get(self, key: str) -> Optional[str]:
+        return self._store.get(key)
+
+    def set(self, key: str, value: str, ex: Optional[int] = None, nx: bool = False) -> bool:
+        if nx and key in self._store:
+            return False
+        self._store[key] = value
+        return True
+
+    def setex(self, key: str, ttl: int, value: str) -> bool:
+        self._store[key] = value
+        return True
+
+    def delete(self, *keys: str) -> int:
+        return sum(1 for k in keys if self._store.pop(k, None) is not None)
+
+    def scan_iter(self, match: str = "*", count: int = 100) -> Iterator[str]:
+        return iter([k for k in list(self._store) if fnmatch.fnmatch(k, match)])
+
+
+class SyntheticDataOrchestrator:
+    """Remplace quantum_core.data.orchestrator.DataOrchestrator avec les fixtures."""
+
+    def __init__(self, fixtures: Dict[str, Any]):
+        self._teams = fixtures["teams"]
+        self._friction = fixtures["friction"]
+        self._referee = fixtures["referee"]
+
+    def get_team_dna(self, team_name: str) -> Optional[Dict]:
+        return self._teams.get(team_name)
+
+    def get_friction(self, home: str, away: str) -> SimpleNamespace:
+        return SimpleNamespace(**self._friction)
+
+    def get_referee(self, referee_name: str) -> Dict:
+        return dict(self._referee)
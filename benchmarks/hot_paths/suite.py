@@ -0,0 +1,236 @@
+"""
+Définition des benchmarks hot paths.
+
+Chaque entrée de BENCHMARKS est une fonction de setup qui reçoit les fixtures
+et retourne l'appel à mesurer (closure sans argument). Le setup n'est pas chronométré.
+"""
+
+import itertools
+import logging
+import random
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .harness import BenchmarkResult, measure
+from .stand_ins import InMemoryRedis, SyntheticDataOrchestrator, load_fixtures, to_namespace
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+# Racine en tête (quantum/, quantum_core/). backend/ n'est ajouté qu'au moment du setup
+# SmartCache: à l'import, backend/services masquerait le namespace services/ de la racine
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _synthetic_adapter(fixtures: Dict):
+    from quantum_core.adapters.data_hub_adapter import DataHubAdapter
+
+    adapter = DataHubAdapter()
+    adapter._data_orchestrator = SyntheticDataOrchestrator(fixtures)
+    adapter._classification_cache = {"_": {}}  # évite la lecture du JSON V25
+    return adapter
+
+
+def _matchup_cycle(fixtures: Dict):
+    return itertools.cycle(fixtures["matchups"])
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SETUPS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def bench_unified_brain(fixtures: Dict) -> Callable[[], object]:
+    """UnifiedBrain.analyze_match complet (engines + 99 marchés + edges + Kelly)."""
+    from quantum_core.brain.unified_brain import UnifiedBrain
+
+    brain = UnifiedBrain()
+    brain._data_hub_adapter = _synthetic_adapter(fixtures)
+    brain._initialized = True
+    odds = fixtures["market_odds"]
+    referee = fixtures["referee"]["name"]
+    matchups = _matchup_cycle(fixtures)
+
+    def run():
+        home, away = next(matchups)
+        return brain.analyze_match(home, away, referee=referee, market_odds=odds)
+
+    return run
+
+
+def bench_brain_calculators(fixtures: Dict) -> Callable[[], object]:
+    """Les 15 calculateurs de marchés quantum_core/brain pour un match."""
+    from quantum_core.brain.unified_brain import UnifiedBrain
+
+    brain = UnifiedBrain()
+    exp_home, exp_away = 1.65, 1.20
+    total = exp_home + exp_away
+
+    def run():
+        cs = brain._correct_score.calculate(exp_home, exp_away)
+        ht = brain._half_time.calculate(
+            expected_goals=total, home_win_prob=0.45, draw_prob=0.27, away_win_prob=0.28,
+            expected_home_goals=exp_home, expected_away_goals=exp_away,
+            home_profile="BALANCED", away_profile="BALANCED", btts_prob=0.55,
+        )
+        brain._poisson.calculate_goals_probs(total)
+        brain._poisson.calculate_corners_probs(10.2)
+        brain._poisson.calculate_cards_probs(4.1)
+        brain._asian_handicap.calculate(exp_home, exp_away)
+        brain._goal_range.calculate(total)
+        brain._double_result.calculate(
+            ht_home=ht.ht_home_win_prob, ht_draw=ht.ht_draw_prob, ht_away=ht.ht_away_win_prob,
+            ft_home=0.45, ft_draw=0.27, ft_away=0.28,
+        )
+        brain._win_to_nil.calculate(
+            expected_home=exp_home, expected_away=exp_away,
+            home_win_prob=0.45, away_win_prob=0.28,
+            correct_score_probs={p.market_key: p.probability for p in cs.top_scores},
+        )
+        brain._odd_even.calculate(total)
+        brain._exact_goals.calculate(total)
+        brain._btts_both_halves.calculate(exp_home, exp_away)
+        brain._score_both_halves.calculate(total)
+        brain._clean_sheet.calculate(exp_home, exp_away)
+        brain._to_score_half.calculate(exp_home, exp_away)
+        return brain._team_totals.calculate(exp_home, exp_away)
+
+    return run
+
+
+def bench_edge_scan_slate(fixtures: Dict) -> Callable[[], object]:
+    """scan_edges sur un slate de 50 matchs × 99 marchés (une passe NumPy)."""
+    import numpy as np
+    from quantum_core.brain.edge_scan import MARKETS, odds_matrix, scan_edges
+
+    rng = np.random.default_rng(0)
+    probabilities = rng.uniform(0.02, 0.95, size=(50, len(MARKETS)))
+    odds = odds_matrix([fixtures["market_odds"]] * 50)
+    return lambda: scan_edges(probabilities, odds)
+
+
+def bench_score_engine_slate(fixtures: Dict) -> Callable[[], object]:
+    """Matrices Dixon-Coles + tous les marchés goals pour un slate de 50 matchs."""
+    import numpy as np
+    from quantum_core.probability.score_engine import score_matrix
+
+    rng = np.random.default_rng(0)
+    lambda_home = rng.uniform(0.5, 3.0, size=50)
+    lambda_away = rng.uniform(0.4, 2.5, size=50)
+    return lambda: score_matrix(lambda_home, lambda_away, rho=-0.13).markets()
+
+
+def bench_in_play_reprice(fixtures: Dict) -> Callable[[], object]:
+    """price_in_play: les 99 marchés d'un match en cours (minute, score, rouges) par appel."""
+    from quantum_core.probability.in_play import InPlayState, MatchPrior, price_in_play
+
+    prior = MatchPrior(lambda_home=1.6, lambda_away=1.1, rho=-0.13)
+    states = itertools.cycle([
+        InPlayState(minute=minute, home_goals=minute // 30, away_goals=minute // 50,
+                    away_red=int(minute > 70), ht_score=(1, 0) if minute >= 45 else None)
+        for minute in range(0, 91, 5)
+    ])
+    return lambda: price_in_play(prior, next(states))
+
+
+def bench_friction_tensor(fixtures: Dict) -> Callable[[], object]:
+    """FrictionTensorCalculator.calculate avec arbitre."""
+    from quantum.orchestrator.friction_tensor import FrictionTensorCalculator
+    from quantum.orchestrator.referee_loader import RefereeDNA
+
+    calculator = FrictionTensorCalculator()
+    teams = {name: to_namespace(dna) for name, dna in fixtures["teams"].items()}
+    ref = fixtures["referee"]
+    referee = RefereeDNA(
+        name=ref["name"], avg_cards=ref["avg_cards"], avg_yellows=ref["yellow_cards_avg"],
+        avg_fouls=ref["avg_fouls"], card_per_foul=ref["card_per_foul"],
+    )
+    matchups = _matchup_cycle(fixtures)
+
+    def run():
+        home, away = next(matchups)
+        return calculator.calculate(teams[home], teams[away], referee=referee)
+
+    return run
+
+
+def _smart_cache():
+    # backend/ en fin: backend/quantum ne doit pas masquer quantum/
+    if str(PROJECT_ROOT / "backend") not in sys.path:
+        sys.path.append(str(PROJECT_ROOT / "backend"))
+    from cache.smart_cache import SmartCache
+
+    cache = SmartCache(enabled=False)
+    cache.enabled = True
+    cache._redis = InMemoryRedis()
+    cache.xfetch_beta = 1e-12  # pas de refresh probabiliste: mesure du chemin HIT
+    return cache
+
+
+def bench_smart_cache_set(fixtures: Dict) -> Callable[[], object]:
+    """SmartCache.set d'une prédiction (sérialisation JSON + SETEX)."""
+    cache = _smart_cache()
+    payload = {"home": "Liverpool", "away": "Arsenal", "markets": fixtures["market_odds"]}
+    keys = itertools.cycle([f"bench:set:{i}" for i in range(64)])
+    return lambda: cache.set(next(keys), payload, ttl=3600)
+
+
+def bench_smart_cache_get(fixtures: Dict) -> Callable[[], object]:
+    """SmartCache.get HIT frais (GET + désérialisation + X-Fetch)."""
+    random.seed(0)
+    cache = _smart_cache()
+    payload = {"home": "Liverpool", "away": "Arsenal", "markets": fixtures["market_odds"]}
+    names = [f"bench:get:{i}" for i in range(64)]
+    for name in names:
+        cache.set(name, payload, ttl=3600)
+    keys = itertools.cycle(names)
+    return lambda: cache.get(next(keys))
+
+
+def bench_data_hub_matchup(fixtures: Dict) -> Callable[[], object]:
+    """DataHubAdapter.prepare_matchup_data (hors cache lru des équipes)."""
+    adapter = _synthetic_adapter(fixtures)
+    referee = fixtures["referee"]["name"]
+    matchups = _matchup_cycle(fixtures)
+
+    def run():
+        home, away = next(matchups)
+        adapter.get_team_data.cache_clear()
+        return adapter.prepare_matchup_data(home, away, referee)
+
+    return run
+
+
+BENCHMARKS: Dict[str, Callable[[Dict], Callable[[], object]]] = {
+    "unified_brain.analyze_match": bench_unified_brain,
+    "brain.calculators": bench_brain_calculators,
+    "brain.edge_scan_slate": bench_edge_scan_slate,
+    "probability.score_engine_slate": bench_score_engine_slate,
+    "probability.in_play_reprice": bench_in_play_reprice,
+    "friction_tensor.calculate": bench_friction_tensor,
+    "smart_cache.set": bench_smart_cache_set,
+    "smart_cache.get": bench_smart_cache_get,
+    "data_hub.prepare_matchup_data": bench_data_hub_matchup,
+}
+
+
+def run_suite(
+    names: Optional[List[str]] = None,
+    rounds: int = 200,
+    warmup: int = 10,
+    alloc_rounds: int = 20,
+) -> List[BenchmarkResult]:
+    """Exécute les benchmarks demandés (tous par défaut) et retourne les mesures."""
+    fixtures = load_fixtures()
+    selected = names or list(BENCHMARKS)
+
+    # Les hot paths loggent en INFO à chaque appel: on mesure le calcul, pas les handlers
+    previous = logging.root.manager.disable
+    logging.disable(logging.INFO)
+    try:
+        results = []
+        for name in selected:
+            fn = BENCHMARKS[name](fixtures)
+            results.append(measure(name, fn, rounds=rounds, warmup=warmup, alloc_rounds=alloc_rounds))
+        return results
+    finally:
+        logging.disable(previous)
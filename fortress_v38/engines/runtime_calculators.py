@@ -18,6 +18,12 @@ SOURCES DE DONNÉES:
 
 PATTERN: Singleton + Dataclasses typées + Fuzzy Matching Cache
 
+PRELOAD (slate complet):
+- preload(teams) charge en une fois: index joueurs (tokens normalisés),
+  coaches (1 requête), historique match_results (1 requête)
+- get_combined_adjustment ensuite = lookups mémoire uniquement
+- refresh() ne relit que les JSON dont le mtime a changé
+
 PRINCIPES SENIOR QUANT:
 - Honeymoon Factor: Modélise le "New Manager Bounce" (exponentiel)
 - Cluster Factor: Impact exponentiel si même ligne touchée
@@ -64,6 +70,9 @@ BASE_PATH = Path("/home/Mon_ps")
 INJURIES_PATH = BASE_PATH / "cache" / "transfermarkt"
 SCORERS_PATH = BASE_PATH / "cache" / "transfermarkt"
 
+# Fenêtre match_results chargée par preload() avant la date la plus ancienne du slate
+FATIGUE_LOOKBACK_DAYS = 120
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONSTANTES COACH - HONEYMOON FACTOR
@@ -288,31 +297,9 @@ def _fuzzy_match_player(
             _PLAYER_ALIAS_CACHE[cache_key] = candidate
             return candidate
 
-        score = 0.0
-
-        # 2. Substring match (ex: "Salah" in "Mohamed Salah")
-        if len(target_clean) >= 4:
-            if target_clean in cand_clean:
-                score = 0.92
-            elif cand_clean in target_clean:
-                score = 0.88
-
-        # 3. Token Set Ratio (ordre des mots ignoré)
-        if score < threshold:
-            cand_tokens = _tokenize_name(candidate)
-            if target_tokens and cand_tokens:
-                intersection = len(target_tokens & cand_tokens)
-                union = len(target_tokens | cand_tokens)
-                if union > 0:
-                    jaccard = intersection / union
-                    if target_tokens <= cand_tokens:
-                        jaccard = min(1.0, jaccard + 0.15)
-                    score = max(score, jaccard)
-
-        # 4. SequenceMatcher (fallback)
-        if score < threshold:
-            seq_score = SequenceMatcher(None, target_clean, cand_clean).ratio()
-            score = max(score, seq_score)
+        score = _candidate_score(
+            target_clean, target_tokens, cand_clean, _tokenize_name(candidate), threshold
+        )
 
         # Track best
         if score > best_score and score >= threshold:
@@ -326,12 +313,183 @@ def _fuzzy_match_player(
     return best_match
 
 
+def _candidate_score(
+    target_clean: str,
+    target_tokens: set,
+    cand_clean: str,
+    cand_tokens: set,
+    threshold: float
+) -> float:
+    """
+    Score de similarité target/candidat (hors exact match).
+
+    Substring → Token Set Ratio → SequenceMatcher, chaque étape n'étant
+    calculée que si la précédente reste sous le seuil.
+    """
+    score = 0.0
+
+    # 2. Substring match (ex: "Salah" in "Mohamed Salah")
+    if len(target_clean) >= 4:
+        if target_clean in cand_clean:
+            score = 0.92
+        elif cand_clean in target_clean:
+            score = 0.88
+
+    # 3. Token Set Ratio (ordre des mots ignoré)
+    if score < threshold:
+        if target_tokens and cand_tokens:
+            intersection = len(target_tokens & cand_tokens)
+            union = len(target_tokens | cand_tokens)
+            if union > 0:
+                jaccard = intersection / union
+                if target_tokens <= cand_tokens:
+                    jaccard = min(1.0, jaccard + 0.15)
+                score = max(score, jaccard)
+
+    # 4. SequenceMatcher (fallback)
+    if score < threshold:
+        seq_score = SequenceMatcher(None, target_clean, cand_clean).ratio()
+        score = max(score, seq_score)
+
+    return score
+
+
 def clear_player_cache():
     """Vide le cache (utile pour tests)."""
     global _PLAYER_ALIAS_CACHE
     _PLAYER_ALIAS_CACHE = {}
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# INDEX JOUEURS + CACHE FICHIERS (PRELOAD)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class PlayerIndex:
+    """
+    Index de noms joueurs construit une seule fois par source.
+
+    Remplace le scan complet de _fuzzy_match_player (SequenceMatcher sur
+    2 000+ noms par lookup) par:
+    1. Exact match normalisé: dict O(1)
+    2. Candidats partageant au moins un token normalisé (quelques noms)
+    3. Scan complet seulement si (2) ne donne rien (noms tronqués, fautes)
+
+    Les résolutions (y compris les échecs) sont mémorisées par index.
+    """
+
+    def __init__(self, names: List[str] = None, threshold: float = 0.85):
+        self.threshold = threshold
+        self._names: List[str] = []
+        self._clean: List[str] = []
+        self._tokens: List[set] = []
+        self._by_clean: Dict[str, int] = {}
+        self._by_token: Dict[str, List[int]] = {}
+        self._resolved: Dict[str, Optional[str]] = {}
+        for name in names or []:
+            self.add(name)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, name: str) -> None:
+        clean = _normalize_name(name)
+        if not clean or clean in self._by_clean:
+            return
+        idx = len(self._names)
+        tokens = set(clean.split())
+        self._names.append(name)
+        self._clean.append(clean)
+        self._tokens.append(tokens)
+        self._by_clean[clean] = idx
+        for token in tokens:
+            self._by_token.setdefault(token, []).append(idx)
+        self._resolved.clear()
+
+    def resolve(self, target: str) -> Optional[str]:
+        """Nom indexé correspondant à target (mêmes règles que _fuzzy_match_player)."""
+        target_clean = _normalize_name(target)
+        if not target_clean:
+            return None
+        if target_clean in self._resolved:
+            return self._resolved[target_clean]
+
+        idx = self._by_clean.get(target_clean)
+        if idx is not None:
+            match = self._names[idx]
+        else:
+            target_tokens = set(target_clean.split())
+            shared = sorted({i for t in target_tokens for i in self._by_token.get(t, ())})
+            match = self._best(target_clean, target_tokens, shared)
+            if match is None:
+                match = self._best(target_clean, target_tokens, range(len(self._names)))
+
+        self._resolved[target_clean] = match
+        return match
+
+    def _best(self, target_clean: str, target_tokens: set, indices) -> Optional[str]:
+        best_match, best_score = None, 0.0
+        for i in indices:
+            score = _candidate_score(
+                target_clean, target_tokens, self._clean[i], self._tokens[i], self.threshold
+            )
+            if score > best_score and score >= self.threshold:
+                best_match, best_score = self._names[i], score
+        return best_match
+
+
+class MtimeJsonCache:
+    """
+    Fichiers JSON parsés une fois, relus seulement si leur mtime change.
+
+    USAGE:
+        cache = MtimeJsonCache()
+        injuries = cache.load(INJURIES_PATH / "liverpool_injuries.json")
+        changed = cache.refresh()   # stat() de chaque fichier suivi
+    """
+
+    _MISSING = object()
+
+    def __init__(self):
+        self._entries: Dict[Path, Tuple[float, Any]] = {}
+
+    def load(self, path: Path, default: Any = None) -> Any:
+        """Contenu du fichier (default si absent ou illisible)."""
+        entry = self._entries.get(path)
+        if entry is not None:
+            return default if entry[1] is self._MISSING else entry[1]
+        return self._read(path, default)
+
+    def version(self, path: Path) -> Optional[float]:
+        """mtime de la version en cache (None si jamais chargé/absent)."""
+        entry = self._entries.get(path)
+        return entry[0] if entry else None
+
+    def refresh(self) -> List[Path]:
+        """Relit les fichiers dont le mtime a changé; retourne la liste des fichiers relus."""
+        changed = []
+        for path, (mtime, _) in list(self._entries.items()):
+            current = path.stat().st_mtime if path.exists() else None
+            if current != mtime:
+                self._read(path, None)
+                changed.append(path)
+        return changed
+
+    def _read(self, path: Path, default: Any) -> Any:
+        if not path.exists():
+            self._entries[path] = (None, self._MISSING)
+            return default
+        mtime = path.stat().st_mtime
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading {path}: {e}")
+            self._entries[path] = (mtime, self._MISSING)
+            return default
+        self._entries[path] = (mtime, data)
+        return data
+
+
 def _calculate_honeymoon_factor(tenure_days: int) -> Tuple[str, float, float]:
     """
     Calcule le Honeymoon Factor basé sur l'ancienneté du coach.
@@ -781,6 +939,21 @@ class RuntimeCalculators:
         # Cache données enrichies (lazy loading)
         self._goalscorer_data: Dict[str, dict] = None
         self._fbref_data: Dict[str, dict] = None
+        self._goalscorer_index: Optional[PlayerIndex] = None
+        self._fbref_index: Optional[PlayerIndex] = None
+        self._enriched_versions: Tuple[Optional[float], Optional[float]] = (None, None)
+
+        # Fichiers JSON (injuries, scorers, profils) relus seulement si mtime change
+        self._json_cache = MtimeJsonCache()
+        self._scorer_indexes: Dict[Path, Tuple[Optional[float], Dict[str, dict], PlayerIndex]] = {}
+        self._absence_sources: Dict[str, Tuple[Path, Path]] = {}
+
+        # Données pré-chargées par preload() (None = requêtes DB à la demande)
+        self._coach_rows: Optional[List[dict]] = None
+        self._match_history: Optional[List[dict]] = None
+        self._history_window: Optional[Tuple[datetime, datetime]] = None
+        self._team_history: Dict[str, List[dict]] = {}
+        self._preloaded_at: Optional[datetime] = None
 
         RuntimeCalculators._initialized = True
         logger.info("RuntimeCalculators initialized (Singleton)")
@@ -806,46 +979,58 @@ class RuntimeCalculators:
         Sources:
         - goalscorer_profiles_2025.json: 876 joueurs avec xg_per_90, total_xg
         - fbref_players_complete_2025_26.json: 2314 joueurs avec position, npxG
+
+        Les index sont reconstruits uniquement si un des fichiers a changé
+        (mtime) depuis le dernier chargement.
         """
+        goalscorer_raw = self._json_cache.load(GOALSCORER_PROFILES_PATH, default={})
+        fbref_raw = self._json_cache.load(FBREF_PLAYERS_PATH, default={})
+        versions = (
+            self._json_cache.version(GOALSCORER_PROFILES_PATH),
+            self._json_cache.version(FBREF_PLAYERS_PATH),
+        )
+        if self._goalscorer_data is not None and versions == self._enriched_versions:
+            return
+
         # Charger goalscorer profiles (pour xG)
-        if self._goalscorer_data is None:
-            self._goalscorer_data = {}
-            try:
-                if GOALSCORER_PROFILES_PATH.exists():
-                    with open(GOALSCORER_PROFILES_PATH, 'r') as f:
-                        raw = json.load(f)
-                        # Index par (player_name_lower, team_name_lower)
-                        for player_id, player in raw.items():
-                            name = player.get('player_name', '').lower()
-                            team = player.get('team_name', '').lower()
-                            if name:
-                                self._goalscorer_data[(name, team)] = player
-                                # Aussi indexer par nom seul (fallback)
-                                if name not in self._goalscorer_data:
-                                    self._goalscorer_data[name] = player
-                    logger.info(f"Loaded {len(self._goalscorer_data)} goalscorer profiles")
-            except Exception as e:
-                logger.error(f"Error loading goalscorer profiles: {e}")
+        self._goalscorer_data = {}
+        try:
+            # Index par (player_name_lower, team_name_lower)
+            for player_id, player in (goalscorer_raw or {}).items():
+                name = player.get('player_name', '').lower()
+                team = player.get('team_name', '').lower()
+                if name:
+                    self._goalscorer_data[(name, team)] = player
+                    # Aussi indexer par nom seul (fallback)
+                    if name not in self._goalscorer_data:
+                        self._goalscorer_data[name] = player
+            logger.info(f"Loaded {len(self._goalscorer_data)} goalscorer profiles")
+        except Exception as e:
+            logger.error(f"Error loading goalscorer profiles: {e}")
 
         # Charger FBRef data (pour position)
-        if self._fbref_data is None:
-            self._fbref_data = {}
-            try:
-                if FBREF_PLAYERS_PATH.exists():
-                    with open(FBREF_PLAYERS_PATH, 'r') as f:
-                        raw = json.load(f)
-                        players = raw.get('players', {})
-                        # Index par nom lower
-                        for name, pdata in players.items():
-                            name_lower = name.lower()
-                            team = (pdata.get('team', '') or '').lower()
-                            self._fbref_data[name_lower] = pdata
-                            # Aussi avec team
-                            if team:
-                                self._fbref_data[(name_lower, team)] = pdata
-                    logger.info(f"Loaded {len(self._fbref_data)} FBRef players")
-            except Exception as e:
-                logger.error(f"Error loading FBRef data: {e}")
+        self._fbref_data = {}
+        try:
+            players = (fbref_raw or {}).get('players', {})
+            # Index par nom lower
+            for name, pdata in players.items():
+                name_lower = name.lower()
+                team = (pdata.get('team', '') or '').lower()
+                self._fbref_data[name_lower] = pdata
+                # Aussi avec team
+                if team:
+                    self._fbref_data[(name_lower, team)] = pdata
+            logger.info(f"Loaded {len(self._fbref_data)} FBRef players")
+        except Exception as e:
+            logger.error(f"Error loading FBRef data: {e}")
+
+        self._goalscorer_index = PlayerIndex(
+            [k for k in self._goalscorer_data.keys() if isinstance(k, str)])
+        self._fbref_index = PlayerIndex(
+            [k for k in self._fbref_data.keys() if isinstance(k, str)])
+        self._enriched_versions = versions
+        # Positions/xG des absences calculées avec l'ancien index
+        self._absence_cache.clear()
 
     def _get_player_xg(self, player_name: str, team_name: str) -> float:
         """Récupère xg_per_90 pour un joueur depuis goalscorer_profiles."""
@@ -857,9 +1042,8 @@ class RuntimeCalculators:
         # Essayer avec team d'abord
         player = self._goalscorer_data.get((name_lower, team_lower))
         if not player:
-            # Fallback: fuzzy match sur le nom
-            matched = _fuzzy_match_player(player_name,
-                [k for k in self._goalscorer_data.keys() if isinstance(k, str)])
+            # Fallback: fuzzy match sur le nom (index tokens)
+            matched = self._goalscorer_index.resolve(player_name)
             if matched:
                 player = self._goalscorer_data.get(matched.lower())
 
@@ -889,9 +1073,8 @@ class RuntimeCalculators:
             # Essayer match exact sans team
             player = self._fbref_data.get(name_lower)
         if not player:
-            # Fuzzy match
-            matched = _fuzzy_match_player(player_name,
-                [k for k in self._fbref_data.keys() if isinstance(k, str)])
+            # Fuzzy match (index tokens)
+            matched = self._fbref_index.resolve(player_name)
             if matched:
                 player = self._fbref_data.get(matched.lower())
 
@@ -906,6 +1089,34 @@ class RuntimeCalculators:
             return False
         return datetime.now() - self._cache_timestamps[key] < self._cache_ttl
 
+    def _is_preload_valid(self) -> bool:
+        """Vrai si preload() a été appelé il y a moins de _cache_ttl."""
+        return (
+            self._preloaded_at is not None
+            and datetime.now() - self._preloaded_at < self._cache_ttl
+        )
+
+    def _get_team_scorers(self, scorers_file: Path) -> Tuple[Dict[str, dict], Optional[PlayerIndex]]:
+        """Scorers d'une équipe + index des noms (reconstruit si le fichier a changé)."""
+        scorers_data = self._json_cache.load(scorers_file)
+        version = self._json_cache.version(scorers_file)
+        cached = self._scorer_indexes.get(scorers_file)
+        if cached is not None and cached[0] == version:
+            return cached[1], cached[2]
+
+        scorers = {}
+        if isinstance(scorers_data, list):
+            for s in scorers_data:
+                name = s.get('name') or s.get('player_name', '')
+                if name:
+                    scorers[name] = s
+        elif isinstance(scorers_data, dict):
+            scorers = scorers_data
+
+        index = PlayerIndex(list(scorers.keys())) if scorers else None
+        self._scorer_indexes[scorers_file] = (version, scorers, index)
+        return scorers, index
+
     # ═══════════════════════════════════════════════════════════════
     # COACH IMPACT
     # ═══════════════════════════════════════════════════════════════
@@ -922,6 +1133,13 @@ class RuntimeCalculators:
         if self._is_cache_valid(cache_key) and cache_key in self._coach_cache:
             return self._coach_cache[cache_key]
 
+        if self._is_preload_valid() and self._coach_rows is not None:
+            row = self._find_coach_row(team_name)
+            if not row:
+                logger.warning(f"No coach found for {team_name}")
+                return CoachImpact(team_name=team_name, is_valid=False)
+            return self._build_coach_impact(team_name, row)
+
         conn = self._get_db_connection()
         if not conn:
             return CoachImpact(team_name=team_name, is_valid=False)
@@ -943,73 +1161,90 @@ class RuntimeCalculators:
                     logger.warning(f"No coach found for {team_name}")
                     return CoachImpact(team_name=team_name, is_valid=False)
 
-                # Calculer tenure
-                tenure_start = row.get('tenure_start_date') or row.get('contract_start')
-                if tenure_start:
-                    tenure_days = (datetime.now().date() - tenure_start).days
-                else:
-                    tenure_days = row.get('tenure_months', 12) * 30
-
-                # Calculer Honeymoon Factor
-                phase, volatility, decay = _calculate_honeymoon_factor(tenure_days)
-
-                # Market modifiers
-                market_mods = {
-                    "btts": 1.0 + (row.get('market_impact_btts', 0) or 0) / 100,
-                    "over25": 1.0 + (row.get('market_impact_over25', 0) or 0) / 100,
-                    "under25": 1.0 + (row.get('market_impact_under25', 0) or 0) / 100,
-                    "draw": 1.0 + (row.get('market_impact_draw', 0) or 0) / 100,
-                    "clean_sheet": 1.0 + (row.get('market_impact_clean_sheet', 0) or 0) / 100,
-                }
-
-                # Si en période bounce, boost over/btts
-                if phase in ("SHOCK", "HONEYMOON"):
-                    market_mods["btts"] *= volatility
-                    market_mods["over25"] *= volatility
-
-                # Recommandation
-                if phase == "SHOCK":
-                    action = "BOOST_VOLATILITY"
-                elif phase == "HONEYMOON":
-                    action = "CAUTION"
-                elif row.get('job_security') == 'at_risk':
-                    action = "REDUCE_STAKE"
-                else:
-                    action = "NORMAL"
-
-                impact = CoachImpact(
-                    coach_name=row.get('coach_name', 'Unknown'),
-                    team_name=team_name,
-                    tenure_days=tenure_days,
-                    tenure_months=row.get('tenure_months', 0) or 0,
-                    tenure_phase=phase,
-                    honeymoon_factor=volatility,
-                    honeymoon_decay=decay,
-                    tactical_style=row.get('tactical_style', 'balanced') or 'balanced',
-                    pressing_style=row.get('pressing_style', 'medium') or 'medium',
-                    tactical_flexibility=row.get('tactical_flexibility', 50) or 50,
-                    market_modifiers=market_mods,
-                    form_trend=row.get('form_trend', 'stable') or 'stable',
-                    current_streak=row.get('current_streak_type', '') or '',
-                    recent_form_points=row.get('recent_form_points_5', 0) or 0,
-                    tactical_uncertainty=HONEYMOON_UNCERTAINTY.get(phase, 0.1),
-                    job_security=row.get('job_security', 'stable') or 'stable',
-                    rumored_departure=row.get('rumored_departure', False) or False,
-                    recommended_action=action,
-                    is_valid=True,
-                    last_updated=row.get('updated_at')
-                )
-
-                # Cache
-                self._coach_cache[cache_key] = impact
-                self._cache_timestamps[cache_key] = datetime.now()
-
-                return impact
+                return self._build_coach_impact(team_name, row)
 
         except Exception as e:
             logger.error(f"Error getting coach impact for {team_name}: {e}")
             return CoachImpact(team_name=team_name, is_valid=False)
 
+    def _find_coach_row(self, team_name: str) -> Optional[dict]:
+        """Équivalent mémoire de `ctm.team_name ILIKE %team%` (exact d'abord)."""
+        team_lower = team_name.lower()
+        substring_match = None
+        for row in self._coach_rows:
+            mapped = (row.get('mapped_team') or '').lower()
+            if mapped == team_lower:
+                return row
+            if substring_match is None and team_lower in mapped:
+                substring_match = row
+        return substring_match
+
+    def _build_coach_impact(self, team_name: str, row: dict) -> CoachImpact:
+        """Construit (et met en cache) le CoachImpact depuis une ligne coach_intelligence."""
+        # Calculer tenure
+        tenure_start = row.get('tenure_start_date') or row.get('contract_start')
+        if tenure_start:
+            tenure_days = (datetime.now().date() - tenure_start).days
+        else:
+            tenure_days = row.get('tenure_months', 12) * 30
+
+        # Calculer Honeymoon Factor
+        phase, volatility, decay = _calculate_honeymoon_factor(tenure_days)
+
+        # Market modifiers
+        market_mods = {
+            "btts": 1.0 + (row.get('market_impact_btts', 0) or 0) / 100,
+            "over25": 1.0 + (row.get('market_impact_over25', 0) or 0) / 100,
+            "under25": 1.0 + (row.get('market_impact_under25', 0) or 0) / 100,
+            "draw": 1.0 + (row.get('market_impact_draw', 0) or 0) / 100,
+            "clean_sheet": 1.0 + (row.get('market_impact_clean_sheet', 0) or 0) / 100,
+        }
+
+        # Si en période bounce, boost over/btts
+        if phase in ("SHOCK", "HONEYMOON"):
+            market_mods["btts"] *= volatility
+            market_mods["over25"] *= volatility
+
+        # Recommandation
+        if phase == "SHOCK":
+            action = "BOOST_VOLATILITY"
+        elif phase == "HONEYMOON":
+            action = "CAUTION"
+        elif row.get('job_security') == 'at_risk':
+            action = "REDUCE_STAKE"
+        else:
+            action = "NORMAL"
+
+        impact = CoachImpact(
+            coach_name=row.get('coach_name', 'Unknown'),
+            team_name=team_name,
+            tenure_days=tenure_days,
+            tenure_months=row.get('tenure_months', 0) or 0,
+            tenure_phase=phase,
+            honeymoon_factor=volatility,
+            honeymoon_decay=decay,
+            tactical_style=row.get('tactical_style', 'balanced') or 'balanced',
+            pressing_style=row.get('pressing_style', 'medium') or 'medium',
+            tactical_flexibility=row.get('tactical_flexibility', 50) or 50,
+            market_modifiers=market_mods,
+            form_trend=row.get('form_trend', 'stable') or 'stable',
+            current_streak=row.get('current_streak_type', '') or '',
+            recent_form_points=row.get('recent_form_points_5', 0) or 0,
+            tactical_uncertainty=HONEYMOON_UNCERTAINTY.get(phase, 0.1),
+            job_security=row.get('job_security', 'stable') or 'stable',
+            rumored_departure=row.get('rumored_departure', False) or False,
+            recommended_action=action,
+            is_valid=True,
+            last_updated=row.get('updated_at')
+        )
+
+        # Cache
+        cache_key = f"coach_{team_name}"
+        self._coach_cache[cache_key] = impact
+        self._cache_timestamps[cache_key] = datetime.now()
+
+        return impact
+
     # ═══════════════════════════════════════════════════════════════
     # ABSENCE IMPACT
     # ═══════════════════════════════════════════════════════════════
@@ -1030,36 +1265,19 @@ class RuntimeCalculators:
 
         # Charger les blessés
         injuries_file = INJURIES_PATH / f"{team_norm}_injuries.json"
-        if not injuries_file.exists():
-            logger.warning(f"No injuries file for {team_name}: {injuries_file}")
-            return AbsenceImpact(team_name=team_name, is_valid=False)
+        scorers_file = SCORERS_PATH / f"{team_norm}_scorers_v2.json"
+        self._absence_sources[cache_key] = (injuries_file, scorers_file)
 
-        try:
-            with open(injuries_file, 'r') as f:
-                injuries = json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading injuries for {team_name}: {e}")
+        injuries = self._json_cache.load(injuries_file)
+        if injuries is None:
+            logger.warning(f"No injuries file for {team_name}: {injuries_file}")
             return AbsenceImpact(team_name=team_name, is_valid=False)
 
         if not injuries:
             return AbsenceImpact(team_name=team_name, missing_count=0, is_valid=True)
 
         # Charger les scorers pour croiser
-        scorers_file = SCORERS_PATH / f"{team_norm}_scorers_v2.json"
-        scorers = {}
-        if scorers_file.exists():
-            try:
-                with open(scorers_file, 'r') as f:
-                    scorers_data = json.load(f)
-                    if isinstance(scorers_data, list):
-                        for s in scorers_data:
-                            name = s.get('name') or s.get('player_name', '')
-                            if name:
-                                scorers[name] = s
-                    elif isinstance(scorers_data, dict):
-                        scorers = scorers_data
-            except Exception as e:
-                logger.warning(f"Error loading scorers for {team_name}: {e}")
+        scorers, scorer_index = self._get_team_scorers(scorers_file)
 
         # Analyser les absences avec données enrichies
         missing_players = []
@@ -1070,8 +1288,6 @@ class RuntimeCalculators:
         goalkeeper_absent = False
         key_defender_absent = False
 
-        scorer_names = list(scorers.keys())
-
         for injury in injuries:
             player_name = injury.get('player_name', '')
             if not player_name:
@@ -1086,7 +1302,7 @@ class RuntimeCalculators:
             total_xg_lost += xg_per_90 * 0.8  # Pondération titulaire estimée
 
             # Fallback: utiliser scorers_v2 pour goals/assists si disponible
-            matched_name = _fuzzy_match_player(player_name, scorer_names) if scorer_names else None
+            matched_name = scorer_index.resolve(player_name) if scorer_index else None
             player_stats = scorers.get(matched_name, {}) if matched_name else {}
 
             goals = int(player_stats.get('goals', 0) or 0)
@@ -1181,6 +1397,10 @@ class RuntimeCalculators:
         if self._is_cache_valid(cache_key) and cache_key in self._fatigue_cache:
             return self._fatigue_cache[cache_key]
 
+        if self._is_preload_valid() and self._covers_history(match_date):
+            last_match, counts = self._scan_match_history(team_name, match_date)
+            return self._build_fatigue_impact(team_name, match_date, last_match, counts)
+
         conn = self._get_db_connection()
         if not conn:
             return FatigueImpact(team_name=team_name, is_valid=False)
@@ -1200,79 +1420,127 @@ class RuntimeCalculators:
                 """, (f"%{team_name}%", f"%{team_name}%", f"%{team_name}%", match_date))
 
                 last_match = cur.fetchone()
+                counts = {}
+
+                if last_match:
+                    # Matches dans les derniers jours
+                    for days in (7, 14, 21):
+                        cur.execute("""
+                            SELECT COUNT(*) as count
+                            FROM match_results
+                            WHERE (home_team ILIKE %s OR away_team ILIKE %s)
+                              AND commence_time >= %s
+                              AND commence_time < %s
+                              AND is_finished = true
+                        """, (f"%{team_name}%", f"%{team_name}%",
+                              match_date - timedelta(days=days), match_date))
+                        counts[days] = cur.fetchone()['count']
+
+                return self._build_fatigue_impact(team_name, match_date, last_match, counts)
 
-                if not last_match:
-                    logger.warning(f"No previous match found for {team_name}")
-                    return FatigueImpact(
-                        team_name=team_name,
-                        fatigue_zone="OPTIMAL",
-                        is_valid=True,
-                        confidence="LOW"
-                    )
+        except Exception as e:
+            logger.error(f"Error getting fatigue impact for {team_name}: {e}")
+            return FatigueImpact(team_name=team_name, is_valid=False)
 
-                last_match_time = last_match['commence_time']
-                hours_since = (match_date - last_match_time).total_seconds() / 3600
+    def _covers_history(self, match_date: datetime) -> bool:
+        """Vrai si l'historique pré-chargé couvre les 21 jours avant match_date."""
+        if self._match_history is None or self._history_window is None:
+            return False
+        window_start, window_end = self._history_window
+        return window_start <= match_date - timedelta(days=21) and match_date <= window_end
 
-                # Matches dans les derniers jours
-                matches_7 = 1
-                matches_14 = 2
-                matches_21 = 3
+    def _scan_match_history(
+        self,
+        team_name: str,
+        match_date: datetime
+    ) -> Tuple[Optional[dict], Dict[int, int]]:
+        """
+        Équivalent mémoire des requêtes fatigue (dernier match + COUNT 7/14/21j).
 
-                for days, attr_name in [(7, 'matches_7'), (14, 'matches_14'), (21, 'matches_21')]:
-                    cur.execute("""
-                        SELECT COUNT(*) as count
-                        FROM match_results
-                        WHERE (home_team ILIKE %s OR away_team ILIKE %s)
-                          AND commence_time >= %s
-                          AND commence_time < %s
-                          AND is_finished = true
-                    """, (f"%{team_name}%", f"%{team_name}%",
-                          match_date - timedelta(days=days), match_date))
-                    count = cur.fetchone()['count']
-                    if attr_name == 'matches_7':
-                        matches_7 = count
-                    elif attr_name == 'matches_14':
-                        matches_14 = count
-                    else:
-                        matches_21 = count
-
-                # Déterminer zone et type de match
-                zone = _get_fatigue_zone(hours_since)
-                competition = last_match.get('league', '')
-                match_type = COMPETITION_TYPE_MAPPING.get(competition, "UNKNOWN")
-                rotation_prob = MATCH_TYPE_ROTATION_PROBABILITY.get(match_type, 0.30)
-
-                # Calculer modifiers
-                base_modifier = FATIGUE_MODIFIERS.get(zone, 0.0)
-                # Ajuster si rotation probable
-                effective_modifier = base_modifier * (1 - rotation_prob)
-
-                impact = FatigueImpact(
-                    team_name=team_name,
-                    last_match_date=last_match_time,
-                    hours_since_last_match=round(hours_since, 1),
-                    fatigue_zone=zone,
-                    matches_last_7_days=matches_7,
-                    matches_last_14_days=matches_14,
-                    matches_last_21_days=matches_21,
-                    last_match_type=match_type,
-                    last_match_competition=competition,
-                    rotation_probability=rotation_prob,
-                    base_fatigue_modifier=base_modifier,
-                    effective_fatigue_modifier=round(effective_modifier, 3),
-                    is_valid=True,
-                    confidence="HIGH" if match_type != "UNKNOWN" else "MEDIUM"
-                )
-
-                # Cache
-                self._fatigue_cache[cache_key] = impact
-                self._cache_timestamps[cache_key] = datetime.now()
-
-                return impact
+        _match_history est trié par commence_time décroissant; le filtre
+        `team ILIKE` n'est appliqué qu'une fois par équipe.
+        """
+        team_lower = team_name.lower()
+        rows = self._team_history.get(team_lower)
+        if rows is None:
+            rows = [
+                row for row in self._match_history
+                if team_lower in row['home_lower'] or team_lower in row['away_lower']
+            ]
+            self._team_history[team_lower] = rows
+
+        last_match = None
+        counts = {7: 0, 14: 0, 21: 0}
+        horizon = match_date - timedelta(days=21)
+
+        for row in rows:
+            kickoff = row['commence_time']
+            if kickoff >= match_date:
+                continue
+            if last_match is None:
+                last_match = row
+            if kickoff < horizon:
+                break
+            for days in counts:
+                if kickoff >= match_date - timedelta(days=days):
+                    counts[days] += 1
 
-        except Exception as e:
-            logger.error(f"Error getting fatigue impact for {team_name}: {e}")
-            return FatigueImpact(team_name=team_name, is_valid=False)
+        return last_match, counts
+
+    def _build_fatigue_impact(
+        self,
+        team_name: str,
+        match_date: datetime,
+        last_match: Optional[dict],
+        counts: Dict[int, int]
+    ) -> FatigueImpact:
+        """Construit (et met en cache) le FatigueImpact depuis le dernier match et les compteurs."""
+        if not last_match:
+            logger.warning(f"No previous match found for {team_name}")
+            return FatigueImpact(
+                team_name=team_name,
+                fatigue_zone="OPTIMAL",
+                is_valid=True,
+                confidence="LOW"
+            )
+
+        last_match_time = last_match['commence_time']
+        hours_since = (match_date - last_match_time).total_seconds() / 3600
+
+        # Déterminer zone et type de match
+        zone = _get_fatigue_zone(hours_since)
+        competition = last_match.get('league', '')
+        match_type = COMPETITION_TYPE_MAPPING.get(competition, "UNKNOWN")
+        rotation_prob = MATCH_TYPE_ROTATION_PROBABILITY.get(match_type, 0.30)
+
+        # Calculer modifiers
+        base_modifier = FATIGUE_MODIFIERS.get(zone, 0.0)
+        # Ajuster si rotation probable
+        effective_modifier = base_modifier * (1 - rotation_prob)
+
+        impact = FatigueImpact(
+            team_name=team_name,
+            last_match_date=last_match_time,
+            hours_since_last_match=round(hours_since, 1),
+            fatigue_zone=zone,
+            matches_last_7_days=counts.get(7, 1),
+            matches_last_14_days=counts.get(14, 2),
+            matches_last_21_days=counts.get(21, 3),
+            last_match_type=match_type,
+            last_match_competition=competition,
+            rotation_probability=rotation_prob,
+            base_fatigue_modifier=base_modifier,
+            effective_fatigue_modifier=round(effective_modifier, 3),
+            is_valid=True,
+            confidence="HIGH" if match_type != "UNKNOWN" else "MEDIUM"
+        )
+
+        # Cache
+        cache_key = f"fatigue_{team_name}_{match_date.date()}"
+        self._fatigue_cache[cache_key] = impact
+        self._cache_timestamps[cache_key] = datetime.now()
+
+        return impact
 
     # ═══════════════════════════════════════════════════════════════
     # COMBINED ADJUSTMENT
@@ -1357,12 +1625,129 @@ class RuntimeCalculators:
             "is_valid": coach.is_valid and absences.is_valid and fatigue.is_valid
         }
 
+    # ═══════════════════════════════════════════════════════════════
+    # PRELOAD (SLATE)
+    # ═══════════════════════════════════════════════════════════════
+
+    def preload(
+        self,
+        teams: List[str],
+        match_dates: Dict[str, datetime] = None,
+        lookback_days: int = FATIGUE_LOOKBACK_DAYS
+    ) -> Dict[str, int]:
+        """
+        Pré-charge tout ce dont un slate a besoin, en une passe.
+
+        - Index joueurs goalscorer/FBRef + JSON injuries/scorers des équipes
+        - Coaches: 1 requête (coach_intelligence JOIN coach_team_mapping)
+        - Fatigue: 1 requête match_results sur [min(date) - lookback, max(date)]
+
+        Ensuite, get_combined_adjustment(team, date) pour ces équipes ne fait
+        plus que des lookups mémoire (jusqu'à expiration de _cache_ttl).
+        Une équipe sans match dans la fenêtre lookback est traitée comme
+        sans match précédent (confidence LOW), comme si la DB ne renvoyait rien.
+
+        Args:
+            teams: Équipes du slate
+            match_dates: Date de match par équipe (défaut: maintenant)
+            lookback_days: Profondeur de l'historique match_results
+
+        Returns:
+            Compteurs {teams, coaches, matches, players_indexed}
+        """
+        now = datetime.now()
+        match_dates = match_dates or {}
+        dates = [match_dates.get(team) or now for team in teams] or [now]
+
+        self._json_cache.refresh()
+        self._load_enriched_data()
+
+        conn = self._get_db_connection()
+        if conn:
+            try:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    cur.execute("""
+                        SELECT ci.*, ctm.contract_start, ctm.team_name AS mapped_team
+                        FROM coach_intelligence ci
+                        JOIN coach_team_mapping ctm ON ci.coach_name = ctm.coach_name
+                    """)
+                    coach_rows = cur.fetchall()
+
+                    window = (min(dates) - timedelta(days=lookback_days), max(dates))
+                    cur.execute("""
+                        SELECT home_team, away_team, commence_time, league
+                        FROM match_results
+                        WHERE commence_time >= %s
+                          AND commence_time < %s
+                          AND is_finished = true
+                        ORDER BY commence_time DESC
+                    """, window)
+                    history = []
+                    for row in cur.fetchall():
+                        row = dict(row)
+                        row['home_lower'] = (row.get('home_team') or '').lower()
+                        row['away_lower'] = (row.get('away_team') or '').lower()
+                        history.append(row)
+
+                self._coach_rows = coach_rows
+                self._match_history = history
+                self._history_window = window
+                self._team_history = {}
+                self._preloaded_at = now
+            except Exception as e:
+                logger.error(f"Error preloading runtime data: {e}")
+
+        for team, date in zip(teams, dates):
+            self.get_coach_impact(team)
+            self.get_absence_impact(team)
+            self.get_fatigue_impact(team, date)
+
+        stats = {
+            "teams": len(teams),
+            "coaches": len(self._coach_rows or []),
+            "matches": len(self._match_history or []),
+            "players_indexed": len(self._goalscorer_index or []) + len(self._fbref_index or []),
+        }
+        logger.info(f"RuntimeCalculators preloaded: {stats}")
+        return stats
+
+    def refresh(self) -> List[Path]:
+        """
+        Relit les fichiers JSON dont le mtime a changé et invalide les absences concernées.
+
+        Returns:
+            Fichiers relus
+        """
+        changed = set(self._json_cache.refresh())
+        if not changed:
+            return []
+
+        if GOALSCORER_PROFILES_PATH in changed or FBREF_PLAYERS_PATH in changed:
+            self._load_enriched_data()
+        else:
+            for cache_key, sources in list(self._absence_sources.items()):
+                if changed.intersection(sources):
+                    self._absence_cache.pop(cache_key, None)
+
+        logger.info(f"RuntimeCalculators refreshed {len(changed)} files")
+        return sorted(changed)
+
     def clear_cache(self):
         """Vide tous les caches."""
         self._coach_cache.clear()
         self._absence_cache.clear()
         self._fatigue_cache.clear()
         self._cache_timestamps.clear()
+        self._json_cache = MtimeJsonCache()
+        self._scorer_indexes.clear()
+        self._absence_sources.clear()
+        self._goalscorer_data = None
+        self._fbref_data = None
+        self._coach_rows = None
+        self._match_history = None
+        self._history_window = None
+        self._team_history.clear()
+        self._preloaded_at = None
         clear_player_cache()
         logger.info("RuntimeCalculators cache cleared")
 
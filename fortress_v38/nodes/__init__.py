@@ -0,0 +1,19 @@
+"""
+FORTRESS V3.8 - Nodes
+=====================
+
+Pipeline DAG par match + runner de slate concurrent.
+"""
+
+from .pipeline import PipelineRunner, SlateContext, SlateReport, Stage, StageResult
+from .fortress_nodes import FortressNodes, build_fortress_stages
+
+__all__ = [
+    "PipelineRunner",
+    "SlateContext",
+    "SlateReport",
+    "Stage",
+    "StageResult",
+    "FortressNodes",
+    "build_fortress_stages",
+]
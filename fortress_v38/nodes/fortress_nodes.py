@@ -0,0 +1,390 @@
+"""
+FORTRESS V3.8 - Nodes du DAG (branchement des engines existants)
+================================================================
+
+Chaque Node est une coroutine (state, ctx) → None qui remplit sa section
+de FortressState. Les appels bloquants (JSON, PostgreSQL) passent par
+SlateContext.get_or_load (thread + cache partagé sur le slate).
+
+GRAPHE:
+    market_scan ─────────────────────────────┐
+    data_loader ──┬── validation ────────────┼── quant_engine ── output
+                  ├── runtime (optionnel) ───┤
+                  └── friction (optionnel) ──┘
+
+Version: 1.0.0
+Date: 19 Octobre 2026
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from fortress_v38.nodes.pipeline import SlateContext, Stage
+from fortress_v38.state import (
+    Confidence,
+    ConsensusResult,
+    FortressState,
+    FrictionState,
+    GoalkeeperDNAState,
+    MarketPick,
+    MatchStatus,
+    ModelVote,
+    PickOutput,
+    Signal,
+    TeamDNAState,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE = "BALANCED"
+
+
+class FortressNodes:
+    """
+    Implémentation des Nodes sur les engines Fortress.
+
+    Les services sont injectables (tests, backtests); à défaut ils sont
+    résolus paresseusement via les factories singleton existantes.
+    """
+
+    def __init__(
+        self,
+        loader: Any = None,
+        runtime: Any = None,
+        friction: Any = None,
+        quant: Any = None,
+        validator: Any = None,
+        freshness: Any = None,
+    ):
+        self._loader = loader
+        self._runtime = runtime
+        self._friction = friction
+        self._quant = quant
+        self._validator = validator
+        self._freshness = freshness
+
+    # ─── SERVICES (lazy) ───
+
+    @property
+    def loader(self):
+        if self._loader is None:
+            from fortress_v38.loaders.hybrid_dna_loader import get_hybrid_loader
+            self._loader = get_hybrid_loader()
+        return self._loader
+
+    @property
+    def runtime(self):
+        if self._runtime is None:
+            from fortress_v38.engines.runtime_calculators import get_runtime_calculators
+            self._runtime = get_runtime_calculators()
+        return self._runtime
+
+    @property
+    def friction(self):
+        if self._friction is None:
+            from fortress_v38.engines.friction_engine import get_friction_engine
+            self._friction = get_friction_engine()
+        return self._friction
+
+    @property
+    def quant(self):
+        if self._quant is None:
+            from fortress_v38.engines.quant_engine import get_quant_engine
+            self._quant = get_quant_engine()
+        return self._quant
+
+    @property
+    def validator(self):
+        if self._validator is None:
+            from fortress_v38.validators.data_validator import DataValidator
+            self._validator = DataValidator()
+        return self._validator
+
+    @property
+    def freshness(self):
+        if self._freshness is None:
+            from fortress_v38.validators.freshness_checker import FreshnessChecker
+            self._freshness = FreshnessChecker()
+        return self._freshness
+
+    # ─── NODE 0: Market Scanner ───
+
+    async def market_scan(self, state: FortressState, ctx: SlateContext) -> None:
+        """Cotes présentes + signaux de piège (steam extrême)."""
+        odds = ctx.get_odds(state.match_input.match_id)
+        state.current_node = "market_scan"
+        if odds is None or not odds.has_minimum_data():
+            state.liquidity_ok = False
+        else:
+            steam = odds.get_steam_summary()
+            state.is_trap = steam["trap_signals_detected"]
+            if state.is_trap:
+                state.news_alerts.append(f"Trap markets: {steam['trap_markets']}")
+        state.market_scan_done = True
+
+    # ─── NODE 1: Data Loader ───
+
+    async def data_loader(self, state: FortressState, ctx: SlateContext) -> None:
+        """DNA équipes + gardiens, partagés entre les matchs du slate."""
+        home = state.match_input.home_team
+        away = state.match_input.away_team
+        state.current_node = "data_loader"
+
+        home_dna, away_dna, home_gk, away_gk = await asyncio.gather(
+            ctx.get_or_load("dna", home, lambda: self.loader.get_team_dna(home)),
+            ctx.get_or_load("dna", away, lambda: self.loader.get_team_dna(away)),
+            ctx.get_or_load("gk", home, lambda: self.loader.get_goalkeeper_dna(team_name=home)),
+            ctx.get_or_load("gk", away, lambda: self.loader.get_goalkeeper_dna(team_name=away)),
+        )
+        if home_dna is None or away_dna is None:
+            missing = home if home_dna is None else away
+            raise LookupError(f"DNA introuvable: {missing}")
+
+        state.home_dna = _to_team_state(home_dna)
+        state.away_dna = _to_team_state(away_dna)
+        state.home_gk = _to_gk_state(home_gk)
+        state.away_gk = _to_gk_state(away_gk)
+        state.data_loaded = True
+
+    # ─── NODE 1.5: Validation ───
+
+    async def validation(self, state: FortressState, ctx: SlateContext) -> None:
+        """Seuils DNA (DataValidator) + fraîcheur (FreshnessChecker)."""
+        home, away = state.home_dna, state.away_dna
+        report = self.validator.validate_match_data(
+            home.team_name, home.base_dna, away.team_name, away.base_dna
+        )
+        state.warnings.extend(report["warnings"])
+        if not report["is_valid"]:
+            state.errors.extend(report["errors"])
+            return
+
+        freshness = self.freshness.check_match(
+            home.team_name, away.team_name, home_dna=home.base_dna, away_dna=away.base_dna
+        )
+        if freshness["should_skip"]:
+            state.errors.append(f"Données périmées ({freshness['worst_status'].value})")
+            return
+        multiplier = freshness["combined_multiplier"]
+        home.data_quality *= multiplier
+        away.data_quality *= multiplier
+
+    # ─── PRELOAD SLATE ───
+
+    async def preload_runtime(self, states: List[FortressState]) -> Dict[str, int]:
+        """
+        Pré-charge coach / blessures / historique pour toutes les équipes du slate.
+
+        À appeler avant PipelineRunner.run_slate: le node runtime ne fait
+        ensuite que des lookups mémoire. Sans preload() (service injecté),
+        no-op.
+        """
+        if not hasattr(self.runtime, "preload"):
+            return {}
+        match_dates: Dict[str, Any] = {}
+        for state in states:
+            match = state.match_input
+            for team in (match.home_team, match.away_team):
+                match_dates[team] = min(match_dates.get(team, match.kickoff), match.kickoff)
+        return await asyncio.to_thread(self.runtime.preload, list(match_dates), match_dates)
+
+    # ─── NODE 2a: Runtime Calculators ───
+
+    async def runtime_adjustments(self, state: FortressState, ctx: SlateContext) -> None:
+        """Coach / absences / fatigue (mémoire si preload_runtime, sinon requêtes par équipe)."""
+        kickoff = state.match_input.kickoff
+        teams = (state.home_dna, state.away_dna)
+        adjustments = await asyncio.gather(*(
+            ctx.get_or_load(
+                "runtime", (team.team_name, kickoff.date()),
+                lambda t=team.team_name: self.runtime.get_combined_adjustment(t, kickoff),
+            )
+            for team in teams
+        ))
+        for team, adj in zip(teams, adjustments):
+            coach, absences, fatigue = adj["coach"], adj["absences"], adj["fatigue"]
+            team.coach_impact = {"honeymoon_factor": coach.honeymoon_factor}
+            team.absences_impact = {
+                "severity_score": absences.severity_score,
+                "attack_impact": absences.attack_impact,
+                "defense_impact": absences.defense_impact,
+            }
+            team.freshness_impact = fatigue.effective_fatigue_modifier
+            team.final_dna = {**team.base_dna, "runtime_modifier": adj["combined_modifier"]}
+            state.warnings.extend(adj["recommendations"])
+        state.runtime_done = True
+
+    # ─── NODE 2b: Friction ───
+
+    async def friction_node(self, state: FortressState, ctx: SlateContext) -> None:
+        """Friction tactique (une par paire de profils sur le slate)."""
+        home_profile = _tactical_profile(state.home_dna.base_dna)
+        away_profile = _tactical_profile(state.away_dna.base_dna)
+        result = await ctx.get_or_load(
+            "friction", (home_profile, away_profile),
+            lambda: self.friction.calculate_friction(home_profile, away_profile),
+        )
+        state.friction = FrictionState(
+            home_profile=result.home_profile,
+            away_profile=result.away_profile,
+            clash_type=result.clash_type,
+            tempo=result.tempo,
+            recommended_markets=result.get_all_recommended_markets(),
+            avoid_markets=list(result.avoid_markets),
+            goals_multiplier=1.0 + result.goals_modifier,
+        )
+
+    # ─── NODE 3: Quant Engine ───
+
+    async def quant_engine(self, state: FortressState, ctx: SlateContext) -> None:
+        """QuantumOrchestrator V1 (déjà async, circuit breaker interne)."""
+        mi = state.match_input
+        odds = ctx.get_odds(mi.match_id)
+        context: Dict[str, Any] = {}
+        if state.friction is not None:
+            context["friction"] = state.friction
+        if state.runtime_done:
+            context["runtime"] = {
+                "home_modifier": state.home_dna.final_dna.get("runtime_modifier", 1.0),
+                "away_modifier": state.away_dna.final_dna.get("runtime_modifier", 1.0),
+            }
+
+        result = await self.quant.analyze_match(
+            home_team=mi.home_team, away_team=mi.away_team,
+            match_id=mi.match_id, odds=odds, context=context,
+        )
+        state.quant_done = True
+        state.quant_output = result
+        if not result.is_valid:
+            state.warnings.append(f"Quant: {result.error_reason}")
+            return
+
+        state.consensus = ConsensusResult(
+            votes=[
+                ModelVote(
+                    model_name=v.get("model_name", v.get("model", "")),
+                    prediction=str(v.get("prediction", v.get("market", ""))),
+                    probability=float(v.get("probability", 0.0)),
+                    confidence=float(v.get("confidence", 0.0)),
+                    weight=float(v.get("weight", 1.0)),
+                )
+                for v in result.model_votes
+            ],
+            final_prediction=result.market,
+            final_probability=result.probability,
+            consensus_strength=result.consensus_score,
+        )
+
+    # ─── NODE 5: Output ───
+
+    async def output(self, state: FortressState, ctx: SlateContext) -> None:
+        """PickOutput final (status calculé par le runner si pas de pick)."""
+        output = PickOutput(match_input=state.match_input, status=MatchStatus.PROCESSING)
+        result = state.quant_output
+        odds = ctx.get_odds(state.match_input.match_id)
+
+        if result is not None and result.is_valid and not _avoided(state, result.market):
+            quality = min(state.home_dna.data_quality, state.away_dna.data_quality)
+            output.picks.append(MarketPick(
+                market_type=result.market,
+                selection=result.selection,
+                our_probability=result.probability,
+                market_probability=odds.get_implied_probability(result.market) if odds else 0.0,
+                edge_pct=result.edge,
+                edge_category=_edge_category(result.edge),
+                kelly_stake=result.stake,
+                adjusted_stake=round(result.stake * quality, 4),
+                stake_units=round(result.stake * quality * 100, 2),
+                confidence=_confidence(result.confidence),
+                signal=Signal.STRONG_BUY if result.edge > 5 else Signal.BUY if result.edge > 2 else Signal.NEUTRAL,
+            ))
+            output.convergence_score = result.consensus_score
+            output.quality_score = quality
+            output.status = MatchStatus.COMPLETED
+
+        state.output = output
+        state.current_node = "output"
+
+
+# ═══════════════════════════════════════════════════════════════
+# HELPERS
+# ═══════════════════════════════════════════════════════════════
+
+def _to_team_state(dna: Any) -> TeamDNAState:
+    merged = dict(getattr(dna, "merged_dna", None) or dna)
+    return TeamDNAState(
+        team_name=getattr(dna, "team_name", merged.get("team_name", "")),
+        base_dna=merged,
+        final_dna=dict(merged),
+        data_quality=getattr(dna, "data_quality", 1.0),
+    )
+
+
+def _to_gk_state(gk: Any) -> Optional[GoalkeeperDNAState]:
+    if gk is None:
+        return None
+    return GoalkeeperDNAState(
+        gk_name=gk.gk_name,
+        team_name=gk.team_name,
+        profile=gk.profile,
+        panic_score=gk.panic_score,
+        timing_profile=gk.timing_profile,
+        exploits=list(gk.exploit_paths),
+    )
+
+
+def _tactical_profile(dna: Dict[str, Any]) -> str:
+    return str(dna.get("tactical_profile") or dna.get("style") or DEFAULT_PROFILE)
+
+
+def _avoided(state: FortressState, market: str) -> bool:
+    return state.friction is not None and market.lower() in [m.lower() for m in state.friction.avoid_markets]
+
+
+def _edge_category(edge_pct: float) -> str:
+    if edge_pct >= 5:
+        return "STRONG"
+    if edge_pct >= 2:
+        return "MEDIUM"
+    return "WEAK"
+
+
+def _confidence(value: float) -> Confidence:
+    if value > 0.80:
+        return Confidence.VERY_HIGH
+    if value > 0.65:
+        return Confidence.HIGH
+    if value > 0.50:
+        return Confidence.MEDIUM
+    return Confidence.LOW
+
+
+# ═══════════════════════════════════════════════════════════════
+# FACTORY
+# ═══════════════════════════════════════════════════════════════
+
+def build_fortress_stages(
+    nodes: Optional[FortressNodes] = None,
+    data_timeout_s: float = 20.0,
+    runtime_timeout_s: float = 8.0,
+    quant_timeout_s: float = 30.0,
+) -> List[Stage]:
+    """
+    DAG Fortress standard.
+
+    runtime et friction sont optionnels: un timeout (DB coach/blessures lente)
+    produit un warning et le Quant Engine tourne sans ces ajustements.
+    """
+    n = nodes or FortressNodes()
+    return [
+        Stage("market_scan", n.market_scan, timeout_s=2.0),
+        Stage("data_loader", n.data_loader, timeout_s=data_timeout_s),
+        Stage("validation", n.validation, depends_on=("data_loader",), timeout_s=5.0),
+        Stage("runtime", n.runtime_adjustments, depends_on=("data_loader",),
+              timeout_s=runtime_timeout_s, critical=False),
+        Stage("friction", n.friction_node, depends_on=("data_loader",), timeout_s=5.0, critical=False),
+        Stage("quant_engine", n.quant_engine,
+              depends_on=("market_scan", "validation", "runtime", "friction"), timeout_s=quant_timeout_s),
+        Stage("output", n.output, depends_on=("quant_engine",), timeout_s=2.0),
+    ]
@@ -0,0 +1,327 @@
+"""
+FORTRESS V3.8 - Pipeline Runner (DAG par match, slate concurrent)
+=================================================================
+
+Exécute les étapes Fortress comme un DAG pour chaque match, et un slate
+complet (ex: 60 matchs du week-end) en un seul run.
+
+PRINCIPES:
+- DAG par match: une étape démarre dès que ses dépendances sont terminées
+  (runtime, friction et validation tournent en parallèle après le chargement)
+- Concurrence bornée: asyncio.Semaphore sur le nombre de matchs en vol
+- Timeout par étape: une source lente ne bloque ni le match ni le slate
+- Données partagées: SlateContext charge une seule fois DNA/friction/odds
+  par clé (single-flight), même si 10 matchs les demandent en même temps
+- Timings: chaque étape écrit sa durée dans FortressState.stage_timings_ms
+
+ÉTAPES CRITIQUES vs OPTIONNELLES:
+- critical=True  → échec/timeout = state.errors, les dépendants sont SKIPPED
+- critical=False → échec/timeout = state.warnings, les dépendants continuent
+
+Version: 1.0.0
+Date: 19 Octobre 2026
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Sequence
+
+from fortress_v38.exceptions import ConfigurationError
+from fortress_v38.state import FortressState, MatchStatus, PickOutput
+
+logger = logging.getLogger(__name__)
+
+
+# ═══════════════════════════════════════════════════════════════
+# CONTEXTE PARTAGÉ (niveau slate)
+# ═══════════════════════════════════════════════════════════════
+
+class SlateContext:
+    """
+    Cache partagé entre tous les matchs d'un run.
+
+    Single-flight: le premier appel pour une clé lance le chargement, les
+    appels concurrents attendent la même Task (pas de double requête DB).
+    Un chargement en échec n'est pas mis en cache (retry au prochain match).
+
+    USAGE:
+        dna = await ctx.get_or_load("dna", "Liverpool", lambda: loader.get_team_dna("Liverpool"))
+    """
+
+    def __init__(self, odds: Optional[Dict[str, Any]] = None):
+        self._tasks: Dict[tuple, asyncio.Task] = {}
+        self.odds: Dict[str, Any] = odds or {}
+        self.stats = {"hits": 0, "loads": 0, "errors": 0}
+
+    async def get_or_load(
+        self,
+        namespace: str,
+        key: Hashable,
+        loader: Callable[[], Any],
+        blocking: bool = True,
+    ) -> Any:
+        """
+        Retourne la valeur partagée, en la chargeant une seule fois.
+
+        Le chargement tourne dans sa propre Task: si le match qui l'a lancé
+        dépasse son timeout, le chargement continue pour les autres matchs.
+
+        Args:
+            namespace: Type de donnée ("dna", "friction", "runtime", ...)
+            key: Clé dans le namespace (équipe, paire d'équipes, ...)
+            loader: Callable sync (ou coroutine function si blocking=False)
+            blocking: True = loader sync exécuté dans un thread (I/O DB/JSON)
+        """
+        cache_key = (namespace, key)
+        task = self._tasks.get(cache_key)
+        if task is not None:
+            self.stats["hits"] += 1
+        else:
+            self.stats["loads"] += 1
+            coro = asyncio.to_thread(loader) if blocking else loader()
+            task = asyncio.ensure_future(coro)
+            task.add_done_callback(lambda t, k=cache_key: self._on_loaded(k, t))
+            self._tasks[cache_key] = task
+        return await asyncio.shield(task)
+
+    def _on_loaded(self, cache_key: tuple, task: asyncio.Task) -> None:
+        """Un chargement en échec est oublié (retry au prochain appel)."""
+        if task.cancelled() or task.exception() is not None:
+            self.stats["errors"] += 1
+            if self._tasks.get(cache_key) is task:
+                del self._tasks[cache_key]
+
+    def get_odds(self, match_id: str) -> Any:
+        """Cotes pré-chargées pour le match (None si absentes)."""
+        return self.odds.get(match_id)
+
+
+# ═══════════════════════════════════════════════════════════════
+# DÉFINITION DES ÉTAPES
+# ═══════════════════════════════════════════════════════════════
+
+StageFn = Callable[[FortressState, SlateContext], Awaitable[None]]
+
+
+@dataclass
+class Stage:
+    """Une étape du DAG Fortress."""
+    name: str
+    fn: StageFn
+    depends_on: Sequence[str] = ()
+    timeout_s: Optional[float] = None   # None = timeout par défaut du runner
+    critical: bool = True
+
+
+@dataclass
+class StageResult:
+    """Issue d'une étape pour un match."""
+    name: str
+    status: str           # OK, ERROR, TIMEOUT, SKIPPED
+    duration_ms: float = 0.0
+    error: str = ""
+
+
+@dataclass
+class SlateReport:
+    """Résultat d'un run de slate."""
+    states: List[FortressState] = field(default_factory=list)
+    wall_time_ms: float = 0.0
+    max_concurrency: int = 0
+    shared_stats: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def completed(self) -> List[FortressState]:
+        return [s for s in self.states if s.output and s.output.status == MatchStatus.COMPLETED]
+
+    @property
+    def failed(self) -> List[FortressState]:
+        return [s for s in self.states if s.output and s.output.status == MatchStatus.ERROR]
+
+    def stage_summary(self) -> Dict[str, Dict[str, float]]:
+        """Durée moyenne / max par étape sur tout le slate (ms)."""
+        summary: Dict[str, Dict[str, float]] = {}
+        for state in self.states:
+            for stage, ms in state.stage_timings_ms.items():
+                row = summary.setdefault(stage, {"count": 0, "avg_ms": 0.0, "max_ms": 0.0})
+                row["count"] += 1
+                row["avg_ms"] += (ms - row["avg_ms"]) / row["count"]
+                row["max_ms"] = max(row["max_ms"], ms)
+        return summary
+
+
+# ═══════════════════════════════════════════════════════════════
+# RUNNER
+# ═══════════════════════════════════════════════════════════════
+
+class PipelineRunner:
+    """
+    Exécute un DAG d'étapes Fortress sur un slate de matchs.
+
+    USAGE:
+        runner = PipelineRunner(build_fortress_stages(), max_concurrency=8)
+        report = await runner.run_slate(states, SlateContext(odds=odds_by_match))
+        for state in report.states:
+            print(state.match_input.match_id, state.output.status, state.stage_timings_ms)
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[Stage],
+        max_concurrency: int = 8,
+        default_timeout_s: float = 30.0,
+    ):
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ConfigurationError(f"Étape dupliquée: {stage.name}")
+            self.stages[stage.name] = stage
+        self.order = self._topological_order()
+        self.max_concurrency = max_concurrency
+        self.default_timeout_s = default_timeout_s
+
+    def _topological_order(self) -> List[str]:
+        """Ordre topologique (Kahn) + validation: dépendances connues, pas de cycle."""
+        for stage in self.stages.values():
+            unknown = [d for d in stage.depends_on if d not in self.stages]
+            if unknown:
+                raise ConfigurationError(f"{stage.name}: dépendances inconnues {unknown}")
+
+        remaining = {name: set(stage.depends_on) for name, stage in self.stages.items()}
+        order = []
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ConfigurationError(f"Cycle dans le DAG: {sorted(remaining)}")
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+    # ─── MATCH ───
+
+    async def run_match(self, state: FortressState, ctx: SlateContext) -> FortressState:
+        """Exécute le DAG pour un match; ne lève jamais (erreurs → state)."""
+        started = datetime.now()
+        t0 = time.perf_counter()
+        tasks: Dict[str, asyncio.Task] = {}
+
+        for name in self.order:
+            tasks[name] = asyncio.create_task(
+                self._run_stage(self.stages[name], state, ctx, tasks), name=f"fortress.{name}"
+            )
+        results: List[StageResult] = await asyncio.gather(*tasks.values())
+
+        state.stage_results = {r.name: r for r in results}
+        state.current_node = "END"
+        self._finalize_output(state, started, (time.perf_counter() - t0) * 1000)
+        return state
+
+    async def _run_stage(
+        self,
+        stage: Stage,
+        state: FortressState,
+        ctx: SlateContext,
+        tasks: Dict[str, asyncio.Task],
+    ) -> StageResult:
+        for dep in stage.depends_on:
+            dep_result: StageResult = await tasks[dep]
+            if dep_result.status != "OK" and self.stages[dep].critical:
+                return StageResult(stage.name, "SKIPPED", error=f"{dep} {dep_result.status}")
+        if not state.should_continue():
+            return StageResult(stage.name, "SKIPPED", error=str(state.get_skip_reason()))
+
+        timeout = stage.timeout_s if stage.timeout_s is not None else self.default_timeout_s
+        t0 = time.perf_counter()
+        try:
+            await asyncio.wait_for(stage.fn(state, ctx), timeout)
+            result = StageResult(stage.name, "OK")
+        except asyncio.TimeoutError as e:
+            # TimeoutError levée par l'étape elle-même (socket, DB) ≠ dépassement du budget
+            if time.perf_counter() - t0 >= timeout:
+                result = StageResult(stage.name, "TIMEOUT", error=f"timeout {timeout:.1f}s")
+            else:
+                result = StageResult(stage.name, "ERROR", error=f"{type(e).__name__}: {e}")
+        except Exception as e:
+            result = StageResult(stage.name, "ERROR", error=f"{type(e).__name__}: {e}")
+
+        result.duration_ms = (time.perf_counter() - t0) * 1000
+        state.stage_timings_ms[stage.name] = round(result.duration_ms, 3)
+
+        if result.status != "OK":
+            match_id = state.match_input.match_id if state.match_input else "?"
+            message = f"{stage.name}: {result.error}"
+            if stage.critical:
+                state.errors.append(message)
+                logger.error(f"[{match_id}] ❌ {message}")
+            else:
+                state.warnings.append(message)
+                logger.warning(f"[{match_id}] ⚠️ {message}")
+        return result
+
+    def _finalize_output(self, state: FortressState, started: datetime, elapsed_ms: float) -> None:
+        """Complète PickOutput (status, skip_reason, timings) si l'étape finale ne l'a pas fait."""
+        if state.output is None:
+            state.output = PickOutput(match_input=state.match_input, started_at=started)
+
+        output = state.output
+        if output.status in (MatchStatus.PENDING, MatchStatus.PROCESSING):
+            if state.errors:
+                output.status = MatchStatus.ERROR
+            elif not state.should_continue() or not output.picks:
+                output.status = MatchStatus.SKIPPED
+            else:
+                output.status = MatchStatus.COMPLETED
+        if output.status != MatchStatus.COMPLETED and output.skip_reason is None:
+            output.skip_reason = state.get_skip_reason()
+        output.completed_at = datetime.now()
+        output.processing_time_ms = int(elapsed_ms)
+
+    # ─── SLATE ───
+
+    async def run_slate(
+        self,
+        states: Sequence[FortressState],
+        ctx: Optional[SlateContext] = None,
+    ) -> SlateReport:
+        """
+        Traite tout un slate avec au plus max_concurrency matchs en vol.
+
+        Les états sont retournés dans l'ordre d'entrée.
+        """
+        ctx = ctx or SlateContext()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        in_flight = 0
+        peak = 0
+
+        async def bounded(state: FortressState) -> FortressState:
+            nonlocal in_flight, peak
+            async with semaphore:
+                in_flight += 1
+                peak = max(peak, in_flight)
+                try:
+                    return await self.run_match(state, ctx)
+                finally:
+                    in_flight -= 1
+
+        t0 = time.perf_counter()
+        done = await asyncio.gather(*(bounded(s) for s in states))
+        wall_ms = (time.perf_counter() - t0) * 1000
+
+        report = SlateReport(
+            states=list(done),
+            wall_time_ms=wall_ms,
+            max_concurrency=peak,
+            shared_stats=dict(ctx.stats),
+        )
+        logger.info(
+            f"🏰 Slate: {len(done)} matchs en {wall_ms:.0f}ms "
+            f"({len(report.completed)} OK, {len(report.failed)} erreurs, "
+            f"cache partagé {ctx.stats['hits']} hits / {ctx.stats['loads']} loads)"
+        )
+        return report
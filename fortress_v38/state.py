@@ -306,6 +306,7 @@ class FortressState:
     consensus: Optional[ConsensusResult] = None
     monte_carlo: Optional[MonteCarloResult] = None
     clv_results: List[CLVResult] = field(default_factory=list)
+    quant_output: Optional[Any] = None  # QuantOutput brut (engines/quant_engine.py)
     
     # ─── NODE 4: Portfolio Manager ───
     portfolio_done: bool = False
@@ -323,6 +324,10 @@ class FortressState:
     current_node: str = "START"
     errors: List[str] = field(default_factory=list)
     warnings: List[str] = field(default_factory=list)
+
+    # ─── PIPELINE RUNNER ───
+    stage_timings_ms: Dict[str, float] = field(default_factory=dict)
+    stage_results: Dict[str, Any] = field(default_factory=dict)  # nom → StageResult
     
     def should_continue(self) -> bool:
         """Vérifie si le traitement doit continuer."""
@@ -0,0 +1,200 @@
+"""
+FORTRESS V3.8 - Tests Pipeline Runner
+=====================================
+
+Valide le runner DAG sans DB ni JSON (services factices):
+1. Ordre des dépendances + parallélisme des branches
+2. Concurrence bornée sur un slate
+3. Timeout d'une étape optionnelle sans bloquer le slate
+4. Chargements partagés (single-flight) entre matchs
+5. Slate complet sur les Nodes Fortress
+
+Version: 1.0.0
+Date: 19 Octobre 2026
+"""
+
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+PROJECT_ROOT = Path("/home/Mon_ps")
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from fortress_v38.exceptions import ConfigurationError
+from fortress_v38.models.odds import MatchOdds
+from fortress_v38.nodes import FortressNodes, PipelineRunner, SlateContext, Stage, build_fortress_stages
+from fortress_v38.state import MatchStatus, create_initial_state
+
+
+def _states(n):
+    return [
+        create_initial_state(f"M{i}", f"Home{i % 3}", f"Away{i % 3}", datetime(2026, 10, 24, 15), "EPL")
+        for i in range(n)
+    ]
+
+
+def _sleep_stage(name, delay, log=None, **kwargs):
+    async def fn(state, ctx):
+        if log is not None:
+            log.append((state.match_input.match_id, name, "start"))
+        await asyncio.sleep(delay)
+        if log is not None:
+            log.append((state.match_input.match_id, name, "end"))
+    return Stage(name, fn, **kwargs)
+
+
+# ═══════════════════════════════════════════════════════════════
+# DAG
+# ═══════════════════════════════════════════════════════════════
+
+def test_rejects_cycles_and_unknown_dependencies():
+    with pytest.raises(ConfigurationError):
+        PipelineRunner([_sleep_stage("a", 0, depends_on=("b",)), _sleep_stage("b", 0, depends_on=("a",))])
+    with pytest.raises(ConfigurationError):
+        PipelineRunner([_sleep_stage("a", 0, depends_on=("missing",))])
+
+
+def test_branches_run_in_parallel_after_dependencies():
+    log = []
+    runner = PipelineRunner([
+        _sleep_stage("load", 0.01, log),
+        _sleep_stage("left", 0.05, log, depends_on=("load",)),
+        _sleep_stage("right", 0.05, log, depends_on=("load",)),
+        _sleep_stage("join", 0.0, log, depends_on=("left", "right")),
+    ])
+    [state] = _states(1)
+
+    asyncio.run(runner.run_match(state, SlateContext()))
+
+    events = [(stage, kind) for _, stage, kind in log]
+    assert events.index(("load", "end")) < events.index(("left", "start"))
+    assert events.index(("right", "start")) < events.index(("left", "end"))
+    assert events.index(("join", "start")) > max(events.index(("left", "end")), events.index(("right", "end")))
+    assert set(state.stage_timings_ms) == {"load", "left", "right", "join"}
+    assert state.stage_timings_ms["left"] >= 45
+
+
+# ═══════════════════════════════════════════════════════════════
+# SLATE
+# ═══════════════════════════════════════════════════════════════
+
+def test_slate_concurrency_is_bounded():
+    runner = PipelineRunner([_sleep_stage("work", 0.02)], max_concurrency=4)
+
+    report = asyncio.run(runner.run_slate(_states(12)))
+
+    assert report.max_concurrency == 4
+    # 12 matchs / 4 en vol × 20ms ≈ 60ms (séquentiel: 240ms)
+    assert report.wall_time_ms < 200
+    assert [s.match_input.match_id for s in report.states] == [f"M{i}" for i in range(12)]
+
+
+def test_optional_stage_timeout_does_not_stall_slate():
+    async def slow_source(state, ctx):
+        if state.match_input.match_id == "M0":
+            await asyncio.sleep(5)
+
+    runner = PipelineRunner([
+        Stage("runtime", slow_source, timeout_s=0.05, critical=False),
+        _sleep_stage("quant", 0.0, depends_on=("runtime",)),
+    ], max_concurrency=8)
+
+    report = asyncio.run(runner.run_slate(_states(4)))
+
+    slow = report.states[0]
+    assert slow.stage_results["runtime"].status == "TIMEOUT"
+    assert slow.stage_results["quant"].status == "OK"
+    assert any("runtime" in w for w in slow.warnings)
+    assert report.wall_time_ms < 1000
+
+
+def test_critical_failure_skips_dependents():
+    async def boom(state, ctx):
+        raise RuntimeError("DB down")
+
+    runner = PipelineRunner([Stage("data_loader", boom), _sleep_stage("quant", 0.0, depends_on=("data_loader",))])
+    [state] = _states(1)
+
+    asyncio.run(runner.run_match(state, SlateContext()))
+
+    assert state.stage_results["quant"].status == "SKIPPED"
+    assert "quant" not in state.stage_timings_ms
+    assert state.output.status == MatchStatus.ERROR
+
+
+def test_shared_loads_are_single_flight():
+    calls = []
+
+    def load_team(name):
+        calls.append(name)
+        return {"team": name}
+
+    async def loader_stage(state, ctx):
+        await ctx.get_or_load("dna", state.match_input.home_team, lambda: load_team(state.match_input.home_team))
+
+    ctx = SlateContext()
+    runner = PipelineRunner([Stage("data_loader", loader_stage)], max_concurrency=12)
+    asyncio.run(runner.run_slate(_states(12), ctx))
+
+    assert sorted(calls) == ["Home0", "Home1", "Home2"]
+    assert ctx.stats == {"hits": 9, "loads": 3, "errors": 0}
+
+
+# ═══════════════════════════════════════════════════════════════
+# NODES FORTRESS
+# ═══════════════════════════════════════════════════════════════
+
+class _FakeLoader:
+    def get_team_dna(self, team):
+        return SimpleNamespace(team_name=team, merged_dna={"xg_90": 1.6, "xga_90": 1.1, "style": "GEGENPRESS"},
+                               data_quality=1.0)
+
+    def get_goalkeeper_dna(self, team_name=None):
+        return None
+
+
+class _FakeQuant:
+    async def analyze_match(self, home_team, away_team, match_id, odds, context=None):
+        return SimpleNamespace(
+            is_valid=True, market="over_25", selection="OVER", probability=0.62, edge=4.1,
+            stake=0.02, confidence=0.7, consensus_score=0.8, model_votes=[], error_reason="",
+        )
+
+
+def test_fortress_nodes_process_slate():
+    freshness = SimpleNamespace(check_match=lambda *a, **k: {
+        "should_skip": False, "combined_multiplier": 0.9, "worst_status": None,
+    })
+    friction = SimpleNamespace(calculate_friction=lambda h, a: SimpleNamespace(
+        home_profile=h, away_profile=a, clash_type="CHAOS", tempo="HIGH", goals_modifier=0.1,
+        avoid_markets=[], get_all_recommended_markets=lambda: ["over_25"],
+    ))
+    runtime = SimpleNamespace(get_combined_adjustment=lambda team, kickoff: (_ for _ in ()).throw(
+        TimeoutError("coach DB")))
+    nodes = FortressNodes(loader=_FakeLoader(), runtime=runtime, friction=friction,
+                          quant=_FakeQuant(), freshness=freshness)
+
+    states = _states(6)
+    odds = {s.match_input.match_id: MatchOdds(match_id=s.match_input.match_id,
+                                               home_team=s.match_input.home_team,
+                                               away_team=s.match_input.away_team,
+                                               commence_time=s.match_input.kickoff,
+                                               home_odds=2.1, draw_odds=3.4, away_odds=3.5, over_25_odds=1.8)
+            for s in states[1:]}
+    runner = PipelineRunner(build_fortress_stages(nodes), max_concurrency=3)
+
+    report = asyncio.run(runner.run_slate(states, SlateContext(odds=odds)))
+
+    no_odds, *priced = report.states
+    assert no_odds.output.status == MatchStatus.SKIPPED
+    assert all(s.output.status == MatchStatus.COMPLETED for s in priced)
+    pick = priced[0].output.picks[0]
+    assert pick.market_type == "over_25"
+    assert pick.market_probability == pytest.approx(1 / 1.8)
+    assert pick.adjusted_stake == pytest.approx(0.018)
+    assert priced[0].stage_results["runtime"].status == "ERROR"
+    assert "quant_engine" in priced[0].stage_timings_ms
@@ -0,0 +1,144 @@
+"""
+FORTRESS V3.8 - Tests Preload RuntimeCalculators
+================================================
+
+Valide le mode slate de RuntimeCalculators sans PostgreSQL (curseur factice):
+1. PlayerIndex: mêmes résolutions que _fuzzy_match_player
+2. preload(): 2 requêtes pour tout le slate, puis lookups mémoire
+3. Fatigue pré-chargée identique aux compteurs SQL 7/14/21 jours
+4. refresh(): seuls les JSON modifiés (mtime) sont relus
+
+Version: 1.0.0
+Date: 19 Octobre 2026
+"""
+
+import json
+import os
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path("/home/Mon_ps")
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from fortress_v38.engines import runtime_calculators as rc
+
+
+MATCH_DATE = datetime(2026, 10, 24, 15)
+
+
+class _FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.queries.append(sql)
+        if "coach_intelligence" in sql:
+            self._rows = self.conn.coach_rows
+        else:
+            start, end = params
+            self._rows = [r for r in self.conn.matches if start <= r["commence_time"] < end]
+            self._rows.sort(key=lambda r: r["commence_time"], reverse=True)
+
+    def fetchall(self):
+        return [dict(r) for r in self._rows]
+
+
+class _FakeConnection:
+    closed = False
+
+    def __init__(self):
+        self.queries = []
+        self.coach_rows = [
+            {"coach_name": "Arne Slot", "mapped_team": "Liverpool FC",
+             "contract_start": date(2026, 10, 10), "tenure_months": 0},
+            {"coach_name": "Mikel Arteta", "mapped_team": "Arsenal",
+             "contract_start": date(2019, 12, 20), "tenure_months": 80},
+        ]
+        self.matches = [
+            {"home_team": "Liverpool FC", "away_team": "Everton",
+             "commence_time": MATCH_DATE - timedelta(days=d), "league": "Premier League"}
+            for d in (3, 6, 10, 20, 40)
+        ]
+
+    def cursor(self, cursor_factory=None):
+        return _FakeCursor(self)
+
+
+@pytest.fixture
+def calcs(tmp_path, monkeypatch):
+    monkeypatch.setattr(rc, "INJURIES_PATH", tmp_path)
+    monkeypatch.setattr(rc, "SCORERS_PATH", tmp_path)
+    monkeypatch.setattr(rc, "GOALSCORER_PROFILES_PATH", tmp_path / "goalscorers.json")
+    monkeypatch.setattr(rc, "FBREF_PLAYERS_PATH", tmp_path / "fbref.json")
+    monkeypatch.setattr(rc.RuntimeCalculators, "_instance", None)
+    monkeypatch.setattr(rc.RuntimeCalculators, "_initialized", False)
+    rc.clear_player_cache()
+
+    (tmp_path / "goalscorers.json").write_text(json.dumps({
+        "1": {"player_name": "Mohamed Salah", "team_name": "Liverpool", "xg_per_90": 0.6},
+    }))
+    (tmp_path / "fbref.json").write_text(json.dumps({
+        "players": {"Mohamed Salah": {"team": "Liverpool", "position": "FW"}},
+    }))
+    (tmp_path / "liverpool_injuries.json").write_text(json.dumps([{"player_name": "Salah"}]))
+    (tmp_path / "liverpool_scorers_v2.json").write_text(json.dumps([
+        {"name": "Mohamed Salah", "goals": 8, "assists": 4, "matches": 9},
+    ]))
+
+    calculators = rc.RuntimeCalculators()
+    conn = _FakeConnection()
+    monkeypatch.setattr(calculators, "_get_db_connection", lambda: conn)
+    calculators.conn = conn
+    return calculators
+
+
+def test_player_index_matches_fuzzy_scan():
+    names = ["mohamed salah", "virgil van dijk", "trent alexander-arnold", "alisson becker"]
+    index = rc.PlayerIndex(names)
+
+    for target in ["Salah", "Van Dijk Virgil", "Alisson", "Alexander Arnold", "Unknown Player"]:
+        rc.clear_player_cache()
+        assert index.resolve(target) == rc._fuzzy_match_player(target, names)
+
+
+def test_preload_makes_slate_in_memory(calcs):
+    stats = calcs.preload(["Liverpool", "Arsenal"], {"Liverpool": MATCH_DATE, "Arsenal": MATCH_DATE})
+
+    assert stats["coaches"] == 2
+    assert len(calcs.conn.queries) == 2
+
+    adj = calcs.get_combined_adjustment("Liverpool", MATCH_DATE)
+    assert len(calcs.conn.queries) == 2
+    assert adj["coach"].coach_name == "Arne Slot"
+    assert adj["absences"].top_scorer_absent
+    assert adj["absences"].missing_players[0]["matched_name"] == "Mohamed Salah"
+    assert adj["absences"].total_xg_lost == pytest.approx(0.48)
+
+    fatigue = adj["fatigue"]
+    assert fatigue.hours_since_last_match == 72.0
+    assert (fatigue.matches_last_7_days, fatigue.matches_last_14_days,
+            fatigue.matches_last_21_days) == (2, 3, 4)
+
+
+def test_refresh_rereads_only_changed_files(calcs, tmp_path):
+    calcs.preload(["Liverpool"], {"Liverpool": MATCH_DATE})
+    assert calcs.get_absence_impact("Liverpool").missing_count == 1
+
+    injuries = tmp_path / "liverpool_injuries.json"
+    injuries.write_text(json.dumps([{"player_name": "Salah"}, {"player_name": "Alisson"}]))
+    mtime = injuries.stat().st_mtime + 5
+    os.utime(injuries, (mtime, mtime))
+
+    assert calcs.refresh() == [injuries]
+    assert calcs.get_absence_impact("Liverpool").missing_count == 2
+    assert calcs.refresh() == []
@@ -6,3 +6,4 @@ export * from './use-stats';
 export * from './use-odds';
 export * from './use-settings';
 export * from './use-agents'
+export * from './use-live-updates';
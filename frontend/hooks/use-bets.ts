@@ -1,11 +1,12 @@
 import { useQuery } from '@tanstack/react-query'
 import { getBetsHistory, getBetsStats } from '@/lib/api'
+import { pollingInterval } from './use-live-updates'
 
 export const useBets = (limit = 50, status?: string) => {
   return useQuery({
     queryKey: ['bets', limit, status],
     queryFn: () => getBetsHistory(limit, status),
-    refetchInterval: 30000
+    refetchInterval: pollingInterval(30000)
   })
 }
 
@@ -13,6 +14,6 @@ export const useBetsStats = () => {
   return useQuery({
     queryKey: ['bets-stats'],
     queryFn: getBetsStats,
-    refetchInterval: 30000
+    refetchInterval: pollingInterval(30000)
   })
 }
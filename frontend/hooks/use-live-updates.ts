@@ -0,0 +1,135 @@
+'use client';
+
+import { useEffect } from 'react';
+import { QueryClient, QueryKey, useQueryClient } from '@tanstack/react-query';
+import { api } from '@/lib/api';
+
+export type LiveKind = 'odds' | 'in_play' | 'prediction' | 'settlement' | 'calibration';
+
+export interface LiveDelta {
+  kind: LiveKind;
+  match_id: string | null;
+  league: string | null;
+  /** Clé commune aux deltas d'un même match ("arsenal_vs_chelsea") */
+  match_key: string | null;
+  data: Record<string, any>;
+  at: number;
+  truncated: boolean;
+}
+
+interface LiveFilters {
+  matches?: string[];
+  leagues?: string[];
+  kinds?: LiveKind[];
+}
+
+const KINDS: LiveKind[] = ['odds', 'in_play', 'prediction', 'settlement', 'calibration'];
+
+let connected = false;
+
+/**
+ * Intervalle de polling de secours: coupé tant que le flux /api/live est ouvert
+ * (les deltas invalident les requêtes concernées)
+ */
+export function pollingInterval(ms: number) {
+  return () => (connected ? false : ms);
+}
+
+/** Fenêtre de regroupement: une rafale de deltas (commit d'une collecte) → une invalidation par requête */
+const FLUSH_MS = 1000;
+
+const MATCH_QUERIES = ['match', 'best-odds', 'live-odds'];
+
+interface PendingInvalidations {
+  /** Ids des matchs touchés (match_id du producteur et match_key) */
+  matches: Set<string>;
+  /** Nouvelles cotes: les listes /odds non filtrées sont aussi à relire */
+  oddsLists: boolean;
+  /** Autres requêtes, par clé sérialisée */
+  keys: Map<string, QueryKey>;
+}
+
+function emptyPending(): PendingInvalidations {
+  return { matches: new Set(), oddsLists: false, keys: new Map() };
+}
+
+function collect(pending: PendingInvalidations, delta: LiveDelta) {
+  const addKey = (queryKey: QueryKey) => pending.keys.set(JSON.stringify(queryKey), queryKey);
+  switch (delta.kind) {
+    case 'odds':
+      pending.oddsLists = true;
+      // falls through: les requêtes du match aussi
+    case 'in_play':
+    case 'prediction':
+      if (delta.match_id) pending.matches.add(delta.match_id);
+      if (delta.match_key) pending.matches.add(delta.match_key);
+      break;
+    case 'settlement':
+      addKey(['bets']);
+      addKey(['bets-stats']);
+      addKey(['stats']);
+      break;
+    case 'calibration':
+      addKey(['agent-performance']);
+      break;
+  }
+}
+
+function flush(queryClient: QueryClient, pending: PendingInvalidations) {
+  pending.matches.forEach((match) => {
+    MATCH_QUERIES.forEach((name) => queryClient.invalidateQueries({ queryKey: [name, match] }));
+  });
+  if (pending.oddsLists || pending.matches.size) {
+    // Listes ['odds', params]: celles filtrées sur un match touché, et les non filtrées après une collecte
+    queryClient.invalidateQueries({
+      queryKey: ['odds'],
+      predicate: (query) => {
+        const matchId = (query.queryKey[1] as { match_id?: string } | undefined)?.match_id;
+        return matchId ? pending.matches.has(matchId) : pending.oddsLists;
+      },
+    });
+  }
+  pending.keys.forEach((queryKey) => queryClient.invalidateQueries({ queryKey }));
+}
+
+/**
+ * Abonnement SSE aux deltas live (cotes, in-play, prédictions, règlements)
+ * À monter une fois (Providers); EventSource se reconnecte tout seul
+ */
+export function useLiveUpdates(filters?: LiveFilters) {
+  const queryClient = useQueryClient();
+  const filtersKey = JSON.stringify(filters ?? {});
+
+  useEffect(() => {
+    const params = new URLSearchParams();
+    Object.entries(JSON.parse(filtersKey) as LiveFilters).forEach(([name, values]) => {
+      if (values?.length) params.set(name, values.join(','));
+    });
+    const source = new EventSource(`${api.defaults.baseURL}/api/live/stream?${params}`);
+
+    let pending = emptyPending();
+    let timer: ReturnType<typeof setTimeout> | null = null;
+    const onDelta = (event: MessageEvent) => {
+      collect(pending, JSON.parse(event.data));
+      timer ??= setTimeout(() => {
+        const batch = pending;
+        pending = emptyPending();
+        timer = null;
+        flush(queryClient, batch);
+      }, FLUSH_MS);
+    };
+    source.onopen = () => {
+      connected = true;
+    };
+    source.onerror = () => {
+      connected = false; // polling de secours jusqu'à la reconnexion
+    };
+    KINDS.forEach((kind) => source.addEventListener(kind, onDelta));
+
+    return () => {
+      if (timer) clearTimeout(timer);
+      source.close();
+      connected = false;
+    };
+  }, [queryClient, filtersKey]);
+}
@@ -1,5 +1,6 @@
 import { useQuery } from '@tanstack/react-query';
 import { api } from '@/lib/api';
+import { pollingInterval } from './use-live-updates';
 
 interface Odds {
   id: number;
@@ -53,7 +54,7 @@ export function useOdds(params?: OddsParams) {
     },
     // Les cotes changent rapidement
     staleTime: 30000, // 30 secondes
-    refetchInterval: 60000, // Rafraîchir toutes les minutes
+    refetchInterval: pollingInterval(60000), // Sans flux live: toutes les minutes
   });
 }
 
@@ -85,7 +86,7 @@ export function useMatch(matchId: string | null) {
     },
     enabled: !!matchId, // Ne fetch que si matchId existe
     staleTime: 30000, // 30 secondes
-    refetchInterval: 60000, // Rafraîchir toutes les minutes
+    refetchInterval: pollingInterval(60000), // Sans flux live: toutes les minutes
   });
 }
 
@@ -140,6 +141,6 @@ export function useLiveOdds(matchId: string | null) {
     },
     enabled: !!matchId,
     staleTime: 15000, // 15 secondes (plus frais pour le live)
-    refetchInterval: 30000, // Rafraîchir toutes les 30 secondes
+    refetchInterval: pollingInterval(30000), // Sans flux live: toutes les 30 secondes
   });
 }
@@ -3,6 +3,13 @@
 import { QueryClient, QueryClientProvider } from '@tanstack/react-query';
 import { ReactNode, useState } from 'react';
 import { Toaster } from 'react-hot-toast';
+import { useLiveUpdates } from '@/hooks/use-live-updates';
+
+// Flux /api/live: invalide les requêtes touchées au lieu de les poller
+function LiveUpdates() {
+  useLiveUpdates();
+  return null;
+}
 
 interface ProvidersProps {
   children: ReactNode;
@@ -23,6 +30,7 @@ export function Providers({ children }: ProvidersProps) {
 
   return (
     <QueryClientProvider client={queryClient}>
+      <LiveUpdates />
       {children}
       <Toaster
         position="top-right"
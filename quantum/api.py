@@ -7,7 +7,8 @@
 ║  Endpoints:                                                                          ║
 ║  - POST /analyze         → Analyse complète d'un match                               ║
 ║  - POST /analyze/quick   → Analyse rapide (sans DB)                                  ║
-║  - POST /analyze/batch   → Analyse multiple matchs                                   ║
+║  - POST /analyze/batch   → Met un batch de matchs en file (réponse immédiate)        ║
+║  - GET  /analyze/batch/{id} → Progression + résultats partiels du batch              ║
 ║  - GET  /scenarios       → Liste des 20 scénarios                                    ║
 ║  - GET  /scenarios/{id}  → Détail d'un scénario                                      ║
 ║  - POST /monte-carlo     → Validation Monte Carlo isolée                             ║
@@ -19,7 +20,7 @@
 ╚═══════════════════════════════════════════════════════════════════════════════════════╝
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Query
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
@@ -28,6 +29,7 @@ from datetime import datetime
 from enum import Enum
 import asyncio
 import logging
+import os
 import time
 
 # Imports Quantum
@@ -38,6 +40,7 @@ from quantum.services import (
     MonteCarloValidator
 )
 from quantum.services.rule_engine import EngineConfig, MonteCarloConfig
+from quantum.services.batch_queue import BatchWorker, store_from_env
 from quantum.models import ScenarioID, MarketType
 
 # ═══════════════════════════════════════════════════════════════════════════════════════
@@ -97,8 +100,8 @@ class AnalyzeRequest(BaseModel):
 
 class BatchAnalyzeRequest(BaseModel):
     """Requête d'analyse batch"""
-    matches: List[AnalyzeRequest] = Field(..., description="Liste des matchs à analyser")
-    parallel: Optional[bool] = Field(True, description="Exécuter en parallèle")
+    matches: List[AnalyzeRequest] = Field(..., description="Liste des matchs à analyser", min_length=1)
+    parallel: Optional[bool] = Field(True, description="Ignoré: le parallélisme dépend du nombre de workers")
 
 
 class MonteCarloRequest(BaseModel):
@@ -206,6 +209,12 @@ _engine: Optional[QuantumRuleEngine] = None
 _start_time = time.time()
 _request_count = 0
 
+# File des batchs: Postgres (QUANTUM_BATCH_DSN, workers quantum.batch_worker)
+# ou store local avec workers asyncio dans le processus de l'API
+_batch_store = store_from_env()
+_local_workers: List[asyncio.Task] = []
+LOCAL_BATCH_WORKERS = int(os.getenv("QUANTUM_BATCH_LOCAL_WORKERS", "2"))
+
 
 def get_engine(monte_carlo: bool = True, n_simulations: int = 3000) -> QuantumRuleEngine:
     """Récupère ou crée le moteur"""
@@ -236,6 +245,7 @@ async def root():
             "POST /analyze",
             "POST /analyze/quick", 
             "POST /analyze/batch",
+            "GET /analyze/batch/{batch_id}",
             "GET /scenarios",
             "GET /scenarios/{scenario_id}",
             "POST /monte-carlo/validate",
@@ -384,43 +394,62 @@ async def analyze_match_quick_endpoint(
     return await analyze_match(request)
 
 
-@app.post("/analyze/batch", tags=["Analysis"])
-async def analyze_batch(request: BatchAnalyzeRequest, background_tasks: BackgroundTasks):
+async def run_batch_task(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Handler des workers: une tâche de batch = un AnalyzeRequest sérialisé"""
+    result = await analyze_match(AnalyzeRequest(**payload))
+    return result.model_dump()
+
+
+def _ensure_local_workers() -> None:
+    """Store local: démarre les workers asyncio au premier batch"""
+    _local_workers[:] = [t for t in _local_workers if not t.done()]
+    for _ in range(LOCAL_BATCH_WORKERS - len(_local_workers)):
+        worker = BatchWorker(_batch_store, run_batch_task, idle_sleep=0.2)
+        _local_workers.append(asyncio.create_task(worker.run()))
+
+
+async def _store_call(fn, *args):
+    if _batch_store.is_local:
+        return fn(*args)
+    return await asyncio.to_thread(fn, *args)
+
+
+@app.post("/analyze/batch", status_code=202, tags=["Analysis"])
+async def analyze_batch(request: BatchAnalyzeRequest):
     """
     Analyse multiple matchs en batch.
     
-    Retourne immédiatement avec un ID de batch pour polling.
+    Met une tâche par match en file et retourne immédiatement avec un ID de batch
+    pour polling (GET /analyze/batch/{batch_id}).
     """
-    batch_id = f"batch_{int(time.time())}"
-    
-    logger.info(f"Starting batch analysis: {batch_id} with {len(request.matches)} matches")
+    payloads = [match.model_dump() for match in request.matches]
+    batch_id = await _store_call(_batch_store.create_batch, payloads)
     
-    results = []
+    logger.info(f"Queued batch analysis: {batch_id} with {len(payloads)} matches")
     
-    for match in request.matches:
-        try:
-            result = await analyze_match(match)
-            results.append({
-                "match": f"{match.home_team} vs {match.away_team}",
-                "success": True,
-                "scenarios": result.scenarios_count,
-                "recommendations": len(result.recommendations)
-            })
-        except Exception as e:
-            results.append({
-                "match": f"{match.home_team} vs {match.away_team}",
-                "success": False,
-                "error": str(e)
-            })
+    if _batch_store.is_local:
+        _ensure_local_workers()
     
     return {
         "batch_id": batch_id,
-        "total": len(request.matches),
-        "completed": len(results),
-        "results": results
+        "status": "queued",
+        "total": len(payloads),
+        "status_url": f"/analyze/batch/{batch_id}",
     }
 
 
+@app.get("/analyze/batch/{batch_id}", tags=["Analysis"])
+async def get_batch_status(
+    batch_id: str,
+    include_results: bool = Query(True, description="Inclure les résultats déjà disponibles")
+):
+    """Progression d'un batch et résultats partiels (checkpointés match par match)"""
+    status = await _store_call(_batch_store.status, batch_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Batch {batch_id} not found")
+    return status.to_dict(include_results=include_results)
+
+
 @app.get("/scenarios", tags=["Scenarios"])
 async def list_scenarios():
     """Liste tous les scénarios disponibles"""
@@ -0,0 +1,79 @@
+"""
+╔═══════════════════════════════════════════════════════════════════════════════════════╗
+║                    QUANTUM BATCH WORKER                                               ║
+║                                                                                       ║
+║  Traite les tâches de POST /analyze/batch depuis la file PostgreSQL.                 ║
+║  Chaque processus worker réclame un match à la fois (SKIP LOCKED), checkpointe       ║
+║  son résultat et retente les échecs: ajouter des workers = plus de débit.            ║
+║                                                                                       ║
+║  Usage:                                                                               ║
+║      QUANTUM_BATCH_DSN=postgresql://... python -m quantum.batch_worker --install      ║
+║      QUANTUM_BATCH_DSN=postgresql://... python -m quantum.batch_worker --workers 4    ║
+╚═══════════════════════════════════════════════════════════════════════════════════════╝
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+
+from quantum.services.batch_queue import BatchWorker, PostgresJobStore
+
+logger = logging.getLogger("QuantumBatchWorker")
+
+
+def _worker_process(dsn: str) -> None:
+    """Un processus = une boucle BatchWorker (moteur et DNA chargés une fois)"""
+    from quantum.api import run_batch_task
+
+    store = PostgresJobStore(dsn)
+    worker = BatchWorker(store, run_batch_task)
+
+    async def main():
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        logger.info(f"Worker {worker.worker_id} started")
+        await worker.run(stop)
+        logger.info(f"Worker {worker.worker_id} stopped: {worker.processed} done, {worker.failures} failures")
+
+    asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Workers de la file /analyze/batch")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Nombre de processus")
+    parser.add_argument("--install", action="store_true", help="Créer les tables de la file puis quitter")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(name)s | %(levelname)s | %(message)s')
+
+    dsn = os.getenv("QUANTUM_BATCH_DSN")
+    if not dsn:
+        sys.exit("QUANTUM_BATCH_DSN non défini (le store local ne tourne que dans l'API)")
+
+    if args.install:
+        PostgresJobStore(dsn).install()
+        logger.info("Batch queue schema installed")
+        return
+
+    processes = [
+        multiprocessing.Process(target=_worker_process, args=(dsn,), name=f"batch-worker-{i}")
+        for i in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    # Ctrl-C atteint tout le groupe de processus; SIGTERM est relayé aux enfants,
+    # qui terminent leur tâche en cours avant de sortir
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *_: [p.terminate() for p in processes])
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,16 +4,29 @@
 ║                                                                               ║
 ║  Calcule la taille de mise optimale avec Kelly dynamique.                    ║
 ║  Philosophie: Plus de stake sur haute confiance + basses cotes.              ║
+║                                                                               ║
+║  calculate_bulk: memes mises sur des matrices [matchs × marches] (NumPy).    ║
 ╚═══════════════════════════════════════════════════════════════════════════════╝
 """
 
-from typing import Dict, Any
+from bisect import bisect_right
+from typing import Dict, Any, Sequence, Union
 import sys
 from pathlib import Path
+
+import numpy as np
+
 sys.path.append(str(Path(__file__).parent.parent))
 from config import KELLY_CONFIG
 
 
+# Paliers des multiplicateurs: MULTS[i] pour BOUNDS[i-1] <= x < BOUNDS[i]
+CONFIDENCE_BOUNDS = (0.50, 0.65, 0.80)
+CONFIDENCE_MULTS = (0.7, 1.0, 1.2, 1.5)
+ODDS_BOUNDS = (1.50, 1.80, 2.20, 2.80)
+ODDS_MULTS = (1.4, 1.2, 1.0, 0.8, 0.6)      # prefer low odds = higher probability
+
+
 class KellySizer:
     """Calcule les mises avec Kelly dynamique"""
     
@@ -55,26 +68,10 @@ class KellySizer:
         # ═══════════════════════════════════════════════════════════════════════
         
         # Confidence multiplier
-        if confidence >= 0.80:
-            confidence_mult = 1.5
-        elif confidence >= 0.65:
-            confidence_mult = 1.2
-        elif confidence >= 0.50:
-            confidence_mult = 1.0
-        else:
-            confidence_mult = 0.7
+        confidence_mult = CONFIDENCE_MULTS[bisect_right(CONFIDENCE_BOUNDS, confidence)]
         
         # Odds multiplier (prefer low odds = higher probability)
-        if odds < 1.50:
-            odds_mult = 1.4
-        elif odds < 1.80:
-            odds_mult = 1.2
-        elif odds < 2.20:
-            odds_mult = 1.0
-        elif odds < 2.80:
-            odds_mult = 0.8
-        else:
-            odds_mult = 0.6
+        odds_mult = ODDS_MULTS[bisect_right(ODDS_BOUNDS, odds)]
         
         # Tier multiplier
         tier_multipliers = self.config.get("tier_multipliers", {})
@@ -103,6 +100,59 @@ class KellySizer:
             "reasoning": f"Kelly={kelly_full:.3f} × base={base_kelly} × conf={confidence_mult} × odds={odds_mult} × tier={tier_mult}",
         }
     
+    def calculate_bulk(
+        self,
+        edge: np.ndarray,
+        odds: np.ndarray,
+        confidence: np.ndarray,
+        tiers: Union[str, Sequence[str]]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calcule les mises de tout un slate en une passe.
+        
+        Args:
+            edge: Matrice [matchs × marches] d'edges nets (EdgeCalculator.calculate_bulk)
+            odds: Matrice de cotes decimales
+            confidence: Matrice de confiance (0-1)
+            tiers: Tier de chaque match (ou un seul tier pour tout le slate)
+        
+        Returns:
+            Dict de matrices: kelly_full, kelly_fraction, confidence_mult, odds_mult,
+            tier_mult, stake_pct (0 si cote <= 1 ou edge <= 0, comme calculate).
+        """
+        edge = np.asarray(edge, dtype=float)
+        odds = np.asarray(odds, dtype=float)
+        confidence = np.asarray(confidence, dtype=float)
+        
+        valid = (odds > 1.0) & (edge > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            kelly_full = np.where(valid, edge / (odds - 1), 0.0)
+        kelly_fraction = kelly_full * self.config.get("base_fraction", 0.25)
+        
+        confidence_mult = np.asarray(CONFIDENCE_MULTS)[np.searchsorted(CONFIDENCE_BOUNDS, confidence, side="right")]
+        odds_mult = np.asarray(ODDS_MULTS)[np.searchsorted(ODDS_BOUNDS, odds, side="right")]
+        tier_multipliers = self.config.get("tier_multipliers", {})
+        if isinstance(tiers, str):
+            tier_mult = np.full(edge.shape, tier_multipliers.get(tiers, 1.0))
+        else:
+            tier_mult = np.array([tier_multipliers.get(t, 1.0) for t in tiers])[:, None]
+            tier_mult = np.broadcast_to(tier_mult, edge.shape)
+        
+        stake_pct = np.clip(
+            kelly_fraction * confidence_mult * odds_mult * tier_mult,
+            self.config.get("min_stake_pct", 0.005),
+            self.config.get("max_stake_pct", 0.05),
+        )
+        
+        return {
+            "kelly_full": kelly_full,
+            "kelly_fraction": kelly_fraction,
+            "confidence_mult": confidence_mult,
+            "odds_mult": odds_mult,
+            "tier_mult": tier_mult,
+            "stake_pct": np.where(valid, stake_pct, 0.0),
+        }
+    
     def _zero_stake(self, reason: str) -> Dict[str, Any]:
         """Retourne une mise nulle"""
         return {
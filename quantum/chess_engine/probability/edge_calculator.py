@@ -4,12 +4,17 @@
 ║                                                                               ║
 ║  Calcule les edges nets apres taxes de liquidite.                            ║
 ║  Applique les seuils MIN_EDGE adaptatifs par marche et tier.                ║
+║                                                                               ║
+║  calculate_bulk: matrices [matchs × marches] evaluees en une passe NumPy.    ║
 ╚═══════════════════════════════════════════════════════════════════════════════╝
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Sequence, Tuple
 import sys
 from pathlib import Path
+
+import numpy as np
+
 sys.path.append(str(Path(__file__).parent.parent))
 from config import MIN_EDGE_BY_MARKET, TIER_EDGE_MULTIPLIER, LIQUIDITY_TAX
 
@@ -21,6 +26,7 @@ class EdgeCalculator:
         self.min_edge = MIN_EDGE_BY_MARKET
         self.tier_mult = TIER_EDGE_MULTIPLIER
         self.liquidity_tax = LIQUIDITY_TAX
+        self._market_vectors: Dict[Tuple[str, ...], Tuple[np.ndarray, np.ndarray]] = {}
     
     def calculate_all(
         self,
@@ -138,3 +144,64 @@ class EdgeCalculator:
             "has_edge": edge_net >= min_required,
             "min_required": min_required,
         }
+    
+    def calculate_bulk(
+        self,
+        probabilities: np.ndarray,
+        odds: np.ndarray,
+        markets: Sequence[str],
+        tiers: Sequence[str]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calcule les edges de tout un slate en une passe.
+        
+        Args:
+            probabilities: Matrice [matchs × colonnes] de nos probabilites
+            odds: Matrice [matchs × colonnes] de cotes decimales (NaN = absente)
+            markets: Marche de chaque colonne (cle de MIN_EDGE_BY_MARKET / LIQUIDITY_TAX)
+            tiers: Tier de chaque match
+        
+        Returns:
+            Dict de matrices: implied_prob, fair_odds, edge_brut, edge_net, confidence,
+            tax_applied, min_edge_required, has_edge, valid (cote > 1 et proba presente).
+            Memes formules que _find_best_edge, cellule par cellule.
+        """
+        probabilities = np.asarray(probabilities, dtype=float)
+        odds = np.asarray(odds, dtype=float)
+        market_min_edge, market_tax = self._vectors_for(tuple(markets))
+        tier_mult = np.array([self.tier_mult.get(t, 1.0) for t in tiers])[:, None]
+        tier_tax = np.array([self.liquidity_tax.get("tier", {}).get(t, 0.005) for t in tiers])[:, None]
+        
+        valid = (odds > 1.0) & ~np.isnan(probabilities)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            implied_prob = np.where(valid, 1.0 / odds, np.nan)
+            fair_odds = np.where(valid & (probabilities > 0), 1.0 / probabilities, np.nan)
+        
+        tax_applied = market_tax + tier_tax
+        min_edge_required = market_min_edge * tier_mult
+        edge_brut = probabilities - implied_prob
+        edge_net = edge_brut - tax_applied
+        
+        return {
+            "implied_prob": implied_prob,
+            "fair_odds": fair_odds,
+            "edge_brut": edge_brut,
+            "edge_net": edge_net,
+            "confidence": np.minimum(1.0, np.abs(probabilities - 0.5) * 2 + 0.5),
+            "tax_applied": np.broadcast_to(tax_applied, odds.shape),
+            "min_edge_required": np.broadcast_to(min_edge_required, odds.shape),
+            "has_edge": valid & (edge_net > 0) & (edge_net >= min_edge_required),
+            "valid": valid,
+        }
+    
+    def _vectors_for(self, markets: Tuple[str, ...]) -> Tuple[np.ndarray, np.ndarray]:
+        """Seuils et taxes par colonne, construits une fois par jeu de marches"""
+        vectors = self._market_vectors.get(markets)
+        if vectors is None:
+            market_tax = self.liquidity_tax.get("market", {})
+            vectors = (
+                np.array([self.min_edge.get(m, 0.03) for m in markets]),
+                np.array([market_tax.get(m, 0.01) for m in markets]),
+            )
+            self._market_vectors[markets] = vectors
+        return vectors
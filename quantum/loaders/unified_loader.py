@@ -43,11 +43,13 @@ from __future__ import annotations
 import json
 import re
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Literal
+from typing import Dict, Iterator, List, Mapping, Optional, Any, Literal, Sequence, Tuple
 from difflib import get_close_matches, SequenceMatcher
 from functools import cached_property
 import logging
 
+from quantum_core.data.dna_store import DNAStore, load_section
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONFIGURATION
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -74,6 +76,15 @@ POSITION_CATEGORIES = {
 logger = logging.getLogger(__name__)
 
 
+def _leaf(record: Any, path: str) -> Any:
+    """Valeur d'une feuille (chemin pointé) d'un enregistrement, None si absente."""
+    for part in path.split("."):
+        if not isinstance(record, dict):
+            return None
+        record = record.get(part)
+    return record
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # UNIFIED LOADER CLASS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -122,9 +133,15 @@ class UnifiedLoader:
 
     def _load_json(self, filepath: Path) -> Optional[Dict]:
         """Charge un fichier JSON."""
+        return self._load_section(filepath)
+
+    def _load_section(self, filepath: Path, section: Optional[str] = None) -> Optional[Mapping]:
+        """
+        Charge un dataset DNA: store mmap partagé entre workers s'il a été
+        converti (quantum_core.data.dna_store), sinon le JSON.
+        """
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return load_section(filepath, section)
         except FileNotFoundError:
             logger.warning(f"Fichier non trouvé: {filepath}")
             return None
@@ -153,6 +170,24 @@ class UnifiedLoader:
             normalized = normalized.replace(old, new)
         return normalized
 
+    @staticmethod
+    def _scan(data: Mapping, fields: Sequence[str]) -> Iterator[Tuple[str, Tuple[Any, ...]]]:
+        """
+        (clé, valeurs des feuilles `fields`) pour chaque enregistrement.
+
+        Store DNA: lu dans les colonnes texte, aucun enregistrement décodé
+        (les filtres ne balaient plus le LRU du store); seuls les résultats
+        sont ensuite lus via data[key]. JSON, ou feuille sans colonne
+        exploitable: lecture des dicts.
+        """
+        if isinstance(data, DNAStore):
+            columns = [data.text_column(field) for field in fields]
+            if all(column is not None for column in columns):
+                yield from zip(data, zip(*columns))
+                return
+        for key, record in data.items():
+            yield key, tuple(_leaf(record, field) for field in fields)
+
     # ═══════════════════════════════════════════════════════════════════════════
     # PRIVATE: LAZY LOADING PROPERTIES
     # ═══════════════════════════════════════════════════════════════════════════
@@ -161,8 +196,7 @@ class UnifiedLoader:
     def _teams(self) -> Dict[str, Dict]:
         """Lazy load teams data."""
         if self._teams_data is None:
-            raw = self._load_json(FILES["teams"]) or {}
-            self._teams_data = raw.get("teams", raw)
+            self._teams_data = self._load_section(FILES["teams"], "teams") or {}
             # Build index AFTER data is loaded
         if not self._team_name_index and self._teams_data:
             self._build_team_index()
@@ -172,8 +206,7 @@ class UnifiedLoader:
     def _players(self) -> Dict[str, Dict]:
         """Lazy load players data."""
         if self._players_data is None:
-            raw = self._load_json(FILES["players"]) or {}
-            self._players_data = raw.get("players", raw)
+            self._players_data = self._load_section(FILES["players"], "players") or {}
         if not self._player_name_index and self._players_data:
             self._build_player_index()
         return self._players_data
@@ -182,7 +215,7 @@ class UnifiedLoader:
     def _referees(self) -> Dict[str, Dict]:
         """Lazy load referees data."""
         if self._referees_data is None:
-            self._referees_data = self._load_json(FILES["referees"]) or {}
+            self._referees_data = self._load_section(FILES["referees"]) or {}
         if not self._referee_name_index and self._referees_data:
             self._build_referee_index()
         return self._referees_data
@@ -348,7 +381,7 @@ class UnifiedLoader:
         Returns:
             Dictionnaire {nom: données} de toutes les équipes
         """
-        return self._teams.copy()
+        return dict(self._teams)
 
     def get_teams_by_league(self, league: str) -> List[Dict[str, Any]]:
         """
@@ -363,18 +396,13 @@ class UnifiedLoader:
         league_lower = league.lower()
         results = []
 
-        for name, data in self._teams.items():
-            team_league = ""
+        teams = self._teams
+        for name, leagues in self._scan(teams, ("context.league", "meta.league", "league")):
             # Chercher la ligue dans différentes structures (priorité: context > meta > root)
-            if "context" in data and isinstance(data["context"], dict):
-                team_league = data["context"].get("league", "")
-            if not team_league and "meta" in data:
-                team_league = data["meta"].get("league", "")
-            if not team_league and "league" in data:
-                team_league = data["league"]
+            team_league = next((league for league in leagues if league), "")
 
             if team_league and league_lower in team_league.lower():
-                result = data.copy()
+                result = teams[name].copy()
                 result["_canonical_name"] = name
                 results.append(result)
 
@@ -418,7 +446,7 @@ class UnifiedLoader:
         Returns:
             Dictionnaire {clé: données} de tous les joueurs
         """
-        return self._players.copy()
+        return dict(self._players)
 
     def get_players_by_team(self, team: str) -> List[Dict[str, Any]]:
         """
@@ -431,23 +459,16 @@ class UnifiedLoader:
             Liste des joueurs de l'équipe
         """
         team_normalized = self._normalize_name(team)
+        players = self._players
         results = []
 
-        for key, data in self._players.items():
-            # Check if team name is in key
-            if team_normalized in self._normalize_name(key):
-                result = data.copy()
+        for key, (player_team,) in self._scan(players, ("meta.team",)):
+            # Team name in key, or in meta.team
+            if (team_normalized in self._normalize_name(key)
+                    or (player_team and team_normalized in self._normalize_name(player_team))):
+                result = players[key].copy()
                 result["_key"] = key
                 results.append(result)
-                continue
-
-            # Check meta.team
-            if "meta" in data:
-                player_team = data["meta"].get("team", "")
-                if team_normalized in self._normalize_name(player_team):
-                    result = data.copy()
-                    result["_key"] = key
-                    results.append(result)
 
         return results
 
@@ -466,18 +487,14 @@ class UnifiedLoader:
         # Get position keywords
         keywords = POSITION_CATEGORIES.get(position, [position])
 
+        players = self._players
         results = []
 
-        for key, data in self._players.items():
-            player_position = ""
-            player_category = ""
-
-            # Get position from meta
-            if "meta" in data and data["meta"]:
-                player_category = data["meta"].get("position_category") or ""
-                player_position = data["meta"].get("position") or ""
-            elif "position" in data:
-                player_position = data["position"] or ""
+        fields = ("meta.position_category", "meta.position", "position")
+        for key, (player_category, meta_position, root_position) in self._scan(players, fields):
+            # Position from meta, root field as fallback
+            player_category = player_category or ""
+            player_position = meta_position or root_position or ""
 
             matched = False
 
@@ -506,7 +523,7 @@ class UnifiedLoader:
                         break
 
             if matched:
-                result = data.copy()
+                result = players[key].copy()
                 result["_key"] = key
                 results.append(result)
 
@@ -545,7 +562,7 @@ class UnifiedLoader:
         Returns:
             Dictionnaire {nom: données} de tous les arbitres
         """
-        return self._referees.copy()
+        return dict(self._referees)
 
     def get_referees_by_tier(self, tier: str) -> List[Dict[str, Any]]:
         """
@@ -559,15 +576,12 @@ class UnifiedLoader:
             Liste des arbitres de ce tier
         """
         tier_lower = tier.lower()
+        referees = self._referees
         results = []
 
-        for name, data in self._referees.items():
-            ref_tier = ""
-            if "meta" in data:
-                ref_tier = data["meta"].get("quality_tier", "")
-
-            if ref_tier.lower() == tier_lower:
-                result = data.copy()
+        for name, (ref_tier,) in self._scan(referees, ("meta.quality_tier",)):
+            if (ref_tier or "").lower() == tier_lower:
+                result = referees[name].copy()
                 result["_canonical_name"] = name
                 results.append(result)
 
@@ -584,15 +598,12 @@ class UnifiedLoader:
             Liste des arbitres de ce tier de ligue
         """
         tier_lower = league_tier.lower()
+        referees = self._referees
         results = []
 
-        for name, data in self._referees.items():
-            ref_tier = ""
-            if "meta" in data:
-                ref_tier = data["meta"].get("league_tier", "")
-
-            if ref_tier.lower() == tier_lower:
-                result = data.copy()
+        for name, (ref_tier,) in self._scan(referees, ("meta.league_tier",)):
+            if (ref_tier or "").lower() == tier_lower:
+                result = referees[name].copy()
                 result["_canonical_name"] = name
                 results.append(result)
 
@@ -695,31 +706,23 @@ class UnifiedLoader:
         # Referee tiers
         ref_tiers = {}
         ref_league_tiers = {}
-        for name, data in self._referees.items():
-            meta = data.get("meta", {})
-            tier = meta.get("quality_tier", "unknown")
-            league_tier = meta.get("league_tier", "unknown")
+        for name, (tier, league_tier) in self._scan(self._referees, ("meta.quality_tier", "meta.league_tier")):
+            tier = tier if tier is not None else "unknown"
+            league_tier = league_tier if league_tier is not None else "unknown"
             ref_tiers[tier] = ref_tiers.get(tier, 0) + 1
             ref_league_tiers[league_tier] = ref_league_tiers.get(league_tier, 0) + 1
 
         # Team leagues
         team_leagues = {}
-        for name, data in self._teams.items():
-            league = ""
-            if "meta" in data:
-                league = data["meta"].get("league", "unknown")
-            elif "context" in data:
-                league = data["context"].get("league", "unknown")
+        for name, (meta_league, context_league) in self._scan(self._teams, ("meta.league", "context.league")):
+            league = next((lg for lg in (meta_league, context_league) if lg is not None), "unknown")
             team_leagues[league] = team_leagues.get(league, 0) + 1
 
         # Player positions (use same logic as get_players_by_position)
         player_positions = {"GK": 0, "DEF": 0, "MID": 0, "ATT": 0, "unknown": 0}
-        for key, data in self._players.items():
-            pos_cat = ""
-            pos_val = ""
-            if "meta" in data and data["meta"]:
-                pos_cat = data["meta"].get("position_category") or ""
-                pos_val = data["meta"].get("position") or ""
+        for key, (pos_cat, pos_val) in self._scan(self._players, ("meta.position_category", "meta.position")):
+            pos_cat = pos_cat or ""
+            pos_val = pos_val or ""
 
             # Determine category
             assigned = False
@@ -22,12 +22,13 @@ VERSION: 1.0.0
 """
 
 import math
-import json
 import logging
 from pathlib import Path
 from typing import Dict, Optional, Tuple, List
 from dataclasses import dataclass
 
+from quantum_core.data.dna_store import load_section
+
 logger = logging.getLogger(__name__)
 
 
@@ -94,14 +95,8 @@ def load_team_dna(force_reload: bool = False) -> Dict:
         return {}
 
     try:
-        with open(DNA_FILE_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        # Extraire la section 'teams' car la structure est {metadata, teams}
-        if 'teams' in data:
-            _dna_cache = data['teams']
-        else:
-            _dna_cache = data
+        # Section 'teams' (structure {metadata, teams}); store mmap partagé si converti
+        _dna_cache = load_section(DNA_FILE_PATH, 'teams')
 
         logger.info(f"Loaded DNA for {len(_dna_cache)} teams")
         return _dna_cache
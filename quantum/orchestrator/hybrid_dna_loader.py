@@ -10,12 +10,13 @@
 ╚═══════════════════════════════════════════════════════════════════════════════╝
 """
 
-import json
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Mapping, Optional
 from pathlib import Path
 import asyncpg
 
+from quantum_core.data.dna_store import load_section
+
 logger = logging.getLogger(__name__)
 
 # Chemins
@@ -38,7 +39,7 @@ class HybridDNALoader:
     """
 
     def __init__(self):
-        self._json_data: Optional[Dict] = None
+        self._json_teams: Optional[Mapping] = None
         self._db_pool: Optional[asyncpg.Pool] = None
         self._team_name_mapping: Dict[str, str] = {}  # JSON name -> DB name
 
@@ -53,12 +54,11 @@ class HybridDNALoader:
         # Créer mapping noms (JSON peut avoir des noms différents de DB)
         await self._build_name_mapping()
 
-        logger.info(f"HybridDNALoader initialized: {len(self._json_data.get('teams', {}))} teams JSON, DB pool ready")
+        logger.info(f"HybridDNALoader initialized: {len(self._json_teams)} teams JSON, DB pool ready")
 
     async def _load_json(self):
-        """Charge le fichier JSON."""
-        with open(JSON_PATH, 'r') as f:
-            self._json_data = json.load(f)
+        """Charge la section 'teams' du JSON (store mmap partagé si converti)."""
+        self._json_teams = load_section(JSON_PATH, 'teams')
         logger.info(f"JSON loaded: {JSON_PATH}")
 
     async def _build_name_mapping(self):
@@ -69,7 +69,7 @@ class HybridDNALoader:
             db_names = {row['team_name'].lower(): row['team_name'] for row in db_names}
 
         # Mapper JSON -> DB
-        json_teams = self._json_data.get('teams', {})
+        json_teams = self._json_teams
         for json_name in json_teams.keys():
             # Essayer correspondance directe
             json_lower = json_name.lower().replace('-', ' ').replace('_', ' ')
@@ -128,7 +128,7 @@ class HybridDNALoader:
 
     def _load_from_json(self, team_name: str) -> Optional[Dict]:
         """Charge depuis team_dna_unified_v3.json."""
-        teams = self._json_data.get('teams', {})
+        teams = self._json_teams
 
         # Recherche directe
         if team_name in teams:
@@ -27,6 +27,8 @@ from datetime import datetime
 from enum import Enum
 from abc import ABC, abstractmethod
 
+from quantum_core.probability.score_engine import score_matrix
+
 # Import MicroStrategy Loader (12ème vecteur DNA)
 try:
     from quantum.loaders.microstrategy_loader import get_microstrategy_loader, MicroStrategyDNA
@@ -887,33 +889,16 @@ class ModelDixonColes(BaseModel):
         home_attack *= (1 + friction.kinetic_home / 200)
         away_attack *= (1 + friction.kinetic_away / 200)
         
-        # Calcul Poisson simplifié
+        # Calcul Poisson simplifié (matrice dense du moteur partagé)
         expected_total = home_attack + away_attack
-        
+        scores = score_matrix(home_attack, away_attack, normalize=False)
+
         # Probabilités des marchés
-        import math
-        
-        def poisson_prob(k, lam):
-            return (lam ** k) * math.exp(-lam) / math.factorial(k)
-        
-        # Over 2.5
-        prob_under_25 = sum(
-            poisson_prob(h, home_attack) * poisson_prob(a, away_attack)
-            for h in range(3) for a in range(3) if h + a < 3
-        )
-        prob_over_25 = 1 - prob_under_25
-        
+        prob_over_25 = 1 - scores.under(2.5)
+        prob_over_35 = 1 - scores.under(3.5)
+
         # BTTS
-        prob_home_scores = 1 - poisson_prob(0, home_attack)
-        prob_away_scores = 1 - poisson_prob(0, away_attack)
-        prob_btts = prob_home_scores * prob_away_scores
-        
-        # Over 3.5
-        prob_under_35 = sum(
-            poisson_prob(h, home_attack) * poisson_prob(a, away_attack)
-            for h in range(4) for a in range(4) if h + a < 4
-        )
-        prob_over_35 = 1 - prob_under_35
+        prob_btts = scores.btts_yes()
         
         return {
             "over_25": prob_over_25,
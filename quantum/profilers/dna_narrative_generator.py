@@ -13,6 +13,7 @@ Auteur: Mon_PS Quant Team
 Date: 12 Decembre 2025
 """
 
+import hashlib
 import json
 import sys
 from pathlib import Path
@@ -21,6 +22,8 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 import statistics
 
+import numpy as np
+
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
@@ -206,6 +209,41 @@ IDENTITY_TEMPLATES = {
 }
 
 
+# Bandes de percentile sur le score 0-100 (bornes basses, recherche binaire)
+PERCENTILE_EDGES = np.array([20, 35, 65, 80])
+PERCENTILE_LABELS = ["EXTREME_LOW", "LOW", "MID", "HIGH", "EXTREME_HIGH"]
+
+AXIS_DESCRIPTIONS = {
+    "pressing_intensity": "Intensite du pressing et recuperation haute",
+    "possession_control": "Controle de la possession et patience",
+    "verticality": "Jeu vertical et passes progressives",
+    "wide_play": "Jeu sur les ailes et centres",
+    "set_piece_threat": "Danger sur coups de pied arretes",
+    "clinical_finishing": "Efficacite devant le but (goals/xG)",
+    "block_depth": "Hauteur du bloc defensif (bas=30, haut=60)",
+    "defensive_compactness": "Compacite et tacles defensifs",
+    "aerial_resistance": "Resistance aerienne defensive",
+    "transition_defense": "Defense en transition et contre-pressing",
+    "goalkeeper_reliability": "Fiabilite du gardien",
+    "diesel_factor": "Ratio buts 2H/1H (diesel = fort en 2H)",
+    "first_half_intensity": "Part des buts en 1H",
+    "clutch_factor": "Capacite a marquer apres 75'",
+    "home_dominance": "Dominance a domicile vs exterieur",
+}
+AXIS_NAMES = list(AXIS_DESCRIPTIONS)
+
+# Colonnes brutes extraites de team_dna_unified (une ligne par equipe).
+# Les *_fallback / *_override sont deja resolus depuis les champs texte;
+# NaN = pas d'override.
+AXIS_INPUTS = [
+    "ppda", "pressing_fallback", "possession", "progressive_passes", "fast_pct", "verticality_fallback",
+    "passes_penalty_area", "touches_att_3rd", "aerial_win_pct", "xg_total", "goals_total", "xg_overperformance",
+    "def_line_height", "tackle_def_pct", "open_play", "gk_percentile", "gk_overperform", "xga_total", "ga_total",
+    "late_prop", "xga_late_pct", "timing_override", "early_prop", "xga_early_pct", "clutch_override",
+    "home_resist", "away_resist",
+]
+
+
 @dataclass
 class AxisScore:
     """Score d'un axe avec metadata."""
@@ -214,6 +252,176 @@ class AxisScore:
     raw_value: float
     percentile: str  # "LOW", "MID", "HIGH", "EXTREME"
     description: str
+    league_percentile: Optional[float] = None  # Rang dans la ligue (0-100)
+
+
+@dataclass
+class AxisTable:
+    """
+    Les 15 axes de toutes les equipes en matrices (n_equipes x 15).
+
+    Construite une fois par version des donnees: scores, valeurs brutes,
+    bandes de percentile et, par ligue, les scores tries de chaque axe
+    (rang d'une equipe dans sa ligue = recherche binaire).
+    """
+    teams: List[str]
+    leagues: List[str]
+    scores: np.ndarray
+    raw: np.ndarray
+    bands: np.ndarray
+    league_sorted: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, teams: List[str], leagues: List[str], inputs: np.ndarray) -> 'AxisTable':
+        scores, raw = score_axes(inputs)
+        league_of = np.array(leagues, dtype=object)
+        league_sorted = {
+            league: np.sort(scores[league_of == league], axis=0)
+            for league in dict.fromkeys(leagues)
+        }
+        return cls(teams, leagues, scores, raw, percentile_bands(scores), league_sorted)
+
+    def league_percentiles(self) -> np.ndarray:
+        """Part des equipes de la meme ligue avec un score <= (0-100), par axe."""
+        out = np.empty_like(self.scores)
+        league_of = np.array(self.leagues, dtype=object)
+        for league, sorted_scores in self.league_sorted.items():
+            rows = league_of == league
+            for axis in range(self.scores.shape[1]):
+                ranks = np.searchsorted(sorted_scores[:, axis], self.scores[rows, axis], side='right')
+                out[rows, axis] = ranks / len(sorted_scores) * 100
+        return out
+
+    def axes(self, row: int, league_percentiles: Optional[np.ndarray] = None) -> Dict[str, AxisScore]:
+        """AxisScore de la ligne `row`, dans l'ordre AXIS_NAMES."""
+        scores, raw, bands = self.scores[row].tolist(), self.raw[row].tolist(), self.bands[row].tolist()
+        ranks = league_percentiles[row].tolist() if league_percentiles is not None else None
+        return {
+            name: AxisScore(
+                name=name,
+                score=scores[j],
+                raw_value=raw[j],
+                percentile=PERCENTILE_LABELS[bands[j]],
+                description=AXIS_DESCRIPTIONS[name],
+                league_percentile=round(ranks[j], 1) if ranks is not None else None
+            )
+            for j, name in enumerate(AXIS_NAMES)
+        }
+
+
+def percentile_bands(scores):
+    """Indices dans PERCENTILE_LABELS (score >= borne -> bande superieure)."""
+    return np.searchsorted(PERCENTILE_EDGES, scores, side='right')
+
+
+def _normalize(values: np.ndarray, low: float, high: float) -> np.ndarray:
+    """Normalise une colonne sur 0-100 (bornes inversees possibles)."""
+    if high == low:
+        return np.full_like(values, 50.0)
+    # + 0.0: pas de -0.0 sur les bornes inversees (affiche "-0/100")
+    return np.clip((values - low) / (high - low) * 100, 0, 100) + 0.0
+
+
+def _ratio(num: np.ndarray, den: np.ndarray, default: float) -> np.ndarray:
+    """num / den, `default` la ou den <= 0."""
+    return np.divide(num, den, out=np.full(len(num), default, dtype=float), where=den > 0)
+
+
+def score_axes(inputs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calcule les 15 axes pour toutes les equipes d'un coup.
+
+    Args:
+        inputs: Matrice (n_equipes x len(AXIS_INPUTS))
+
+    Returns:
+        (scores, raw_values), chacun (n_equipes x 15) dans l'ordre AXIS_NAMES
+    """
+    col = {name: inputs[:, i] for i, name in enumerate(AXIS_INPUTS)}
+    scores = np.empty((len(inputs), len(AXIS_NAMES)))
+    raw = np.empty_like(scores)
+
+    # ═══ OFFENSIVE AXES (6) ═══
+
+    # 1. PRESSING_INTENSITY: PPDA inverse (6 = pressing max, 16 = passif), sinon style
+    ppda = col["ppda"]
+    pressing = np.where(ppda > 0, _normalize(ppda, 16, 6), col["pressing_fallback"])
+    scores[:, 0], raw[:, 0] = pressing, np.where(ppda > 0, ppda, pressing)
+
+    # 2. POSSESSION_CONTROL
+    scores[:, 1], raw[:, 1] = _normalize(col["possession"], 35, 70), col["possession"]
+
+    # 3. VERTICALITY: passes progressives, sinon vitesse d'attaque, sinon style defensif
+    prog, fast = col["progressive_passes"], col["fast_pct"]
+    vertical = np.where(prog > 0, _normalize(prog, 400, 900),
+                        np.where(fast > 0, _normalize(fast, 10, 40), col["verticality_fallback"]))
+    scores[:, 2], raw[:, 2] = vertical, np.where(prog > 0, prog, vertical)
+
+    # 4. WIDE_PLAY: passes dans la surface / touches dernier tiers
+    passes_pa, touches = col["passes_penalty_area"], col["touches_att_3rd"]
+    wide_ratio = _ratio(passes_pa, touches, 0) * 100
+    scores[:, 3] = np.where((passes_pa > 0) & (touches > 0), _normalize(wide_ratio, 3, 10), 50)
+    raw[:, 3] = passes_pa
+
+    # 5. SET_PIECE_THREAT
+    scores[:, 4], raw[:, 4] = _normalize(col["aerial_win_pct"], 40, 65), col["aerial_win_pct"]
+
+    # 6. CLINICAL_FINISHING: goals/xG, sinon surperformance xG
+    xg, goals = col["xg_total"], col["goals_total"]
+    has_xg = (xg > 0) & (goals > 0)
+    clinical_raw = np.where(has_xg, _ratio(goals, xg, 0) * 100, col["xg_overperformance"])
+    scores[:, 5] = np.where(has_xg, _normalize(clinical_raw, 70, 130), _normalize(clinical_raw, -5, 5))
+    raw[:, 5] = clinical_raw
+
+    # ═══ DEFENSIVE AXES (5) ═══
+
+    # 7. BLOCK_DEPTH
+    scores[:, 6], raw[:, 6] = _normalize(col["def_line_height"], 20, 65), col["def_line_height"]
+
+    # 8. DEFENSIVE_COMPACTNESS
+    scores[:, 7], raw[:, 7] = _normalize(col["tackle_def_pct"], 25, 60), col["tackle_def_pct"]
+
+    # 9. AERIAL_RESISTANCE
+    scores[:, 8], raw[:, 8] = _normalize(col["aerial_win_pct"], 40, 65), col["aerial_win_pct"]
+
+    # 10. TRANSITION_DEFENSE: resistance open play, +/-15 selon le pressing
+    open_play = col["open_play"]
+    scores[:, 9] = np.where(pressing > 70, np.minimum(100, open_play + 15),
+                            np.where(pressing < 30, np.maximum(0, open_play - 15), open_play))
+    raw[:, 9] = open_play
+
+    # 11. GOALKEEPER_RELIABILITY: percentile gardien, sinon surperformance, sinon xGA/GA
+    gk_pct, gk_over = col["gk_percentile"], col["gk_overperform"]
+    gk_ratio = np.where(col["ga_total"] > 0, _ratio(col["xga_total"], col["ga_total"], 0) * 100, 100)
+    scores[:, 10] = np.where(gk_pct > 0, gk_pct,
+                             np.where(gk_over != 0, _normalize(gk_over, -20, 20), _normalize(gk_ratio, 80, 120)))
+    raw[:, 10] = np.where(gk_pct > 0, gk_pct, gk_over)
+
+    # ═══ TEMPORAL AXES (3) ═══
+
+    # 12. DIESEL_FACTOR: xGA tardif inverse, sinon profil temporel, sinon late_prop
+    late, late_xga, timing = col["late_prop"], col["xga_late_pct"], col["timing_override"]
+    scores[:, 11] = np.where(late_xga > 0, 100 - late_xga, np.where(np.isnan(timing), late, timing))
+    raw[:, 11] = late
+
+    # 13. FIRST_HALF_INTENSITY
+    early, early_xga = col["early_prop"], col["xga_early_pct"]
+    scores[:, 12] = np.where(early_xga > 0, _normalize(early_xga, 10, 30), 100 - early)
+    raw[:, 12] = early
+
+    # 14. CLUTCH_FACTOR: comportement game state, sinon late_prop
+    clutch = col["clutch_override"]
+    scores[:, 13], raw[:, 13] = np.where(np.isnan(clutch), late, clutch), late
+
+    # ═══ CONTEXTUAL AXES (1) ═══
+
+    # 15. HOME_DOMINANCE: ratio resistance domicile / exterieur
+    home, away = col["home_resist"], col["away_resist"]
+    home_ratio = _normalize(_ratio(home, away, 1.5), 0.7, 2.0)
+    scores[:, 14] = np.where((home > 0) & (away > 0), home_ratio, home)
+    raw[:, 14] = home
+
+    return scores, raw
 
 
 @dataclass
@@ -267,6 +475,10 @@ class DNANarrativeGenerator:
     - Forces et faiblesses distinctives
     - Marches exploitables FOR et AGAINST
     - Narrative unique style Quant
+
+    Les axes de toutes les equipes sont precalcules au chargement (AxisTable)
+    et les profils mis en cache par version des donnees: refresh() ne
+    recalcule que si le fichier a change.
     """
 
     def __init__(self, data_path: str = None):
@@ -282,40 +494,60 @@ class DNANarrativeGenerator:
                     break
 
         self.data_path = data_path
+        self._profiles_cache: Optional[dict] = None
+        self._reload()
+
+    def _reload(self):
+        """(Re)charge les donnees et precalcule les axes de toutes les equipes."""
+        self._mtime = Path(self.data_path).stat().st_mtime_ns
         self.data = self._load_data()
         self.teams = self.data.get("teams", {})
-
-        # Calculate league averages for percentile scoring
-        self._calculate_league_averages()
+        self._keys_lower = [(key, key.lower()) for key in self.teams]
+        self._precompute_axes()
 
     def _load_data(self) -> dict:
-        """Charge les donnees DNA unifiees."""
-        with open(self.data_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-
-    def _calculate_league_averages(self):
-        """Calcule les moyennes par ligue pour le scoring."""
-        self.league_stats = {}
-
-        metrics_to_track = [
-            "possession_pct", "aerial_win_pct", "pressing_intensity"
-        ]
-
+        """Charge les donnees DNA unifiees; data_version = hash du contenu."""
+        with open(self.data_path, 'rb') as f:
+            content = f.read()
+        self.data_version = hashlib.sha1(content).hexdigest()[:12]
+        return json.loads(content.decode('utf-8'))
+
+    def refresh(self) -> bool:
+        """
+        Recharge si le fichier a change depuis le dernier chargement.
+
+        Returns:
+            True si les donnees ont ete rechargees
+        """
+        try:
+            mtime = Path(self.data_path).stat().st_mtime_ns
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+        self._reload()
+        return True
+
+    def _team_league(self, team_data: dict) -> str:
+        return team_data.get('context', {}).get('league') or \
+            team_data.get('tactical', {}).get('league') or 'Unknown'
+
+    def _precompute_axes(self):
+        """AxisTable + rangs par ligue pour toutes les equipes lisibles."""
+        teams, leagues, rows = [], [], []
+        self._axis_errors = {}
         for team_name, team_data in self.teams.items():
-            league = team_data.get('context', {}).get('league') or \
-                     team_data.get('tactical', {}).get('league') or 'Unknown'
-
-            if league not in self.league_stats:
-                self.league_stats[league] = {m: [] for m in metrics_to_track}
+            try:
+                rows.append(self._axis_inputs(team_data))
+                leagues.append(self._team_league(team_data))
+                teams.append(team_name)
+            except Exception as e:
+                self._axis_errors[team_name] = str(e)
 
-            tactical = team_data.get('tactical', {})
-            for metric in metrics_to_track:
-                val = tactical.get(metric)
-                if val is not None:
-                    try:
-                        self.league_stats[league][metric].append(float(val))
-                    except (ValueError, TypeError):
-                        pass
+        inputs = np.array(rows, dtype=float).reshape(len(rows), len(AXIS_INPUTS))
+        self.axis_table = AxisTable.build(teams, leagues, inputs)
+        self._league_percentiles = self.axis_table.league_percentiles()
+        self._team_rows = {team: i for i, team in enumerate(teams)}
 
     def _safe_float(self, value, default: float = 0.0) -> float:
         """Convertit en float de maniere securisee."""
@@ -328,350 +560,94 @@ class DNANarrativeGenerator:
 
     def _normalize_to_100(self, value: float, low: float, high: float) -> float:
         """Normalise une valeur sur une echelle 0-100."""
-        if high == low:
-            return 50.0
-        normalized = (value - low) / (high - low) * 100
-        return max(0, min(100, normalized))
+        return float(_normalize(np.array([value], dtype=float), low, high)[0])
 
     def _get_percentile(self, score: float) -> str:
         """Determine le percentile basee sur le score 0-100."""
-        if score >= 80:
-            return "EXTREME_HIGH"
-        elif score >= 65:
-            return "HIGH"
-        elif score >= 35:
-            return "MID"
-        elif score >= 20:
-            return "LOW"
-        else:
-            return "EXTREME_LOW"
-
-    def _calculate_axes(self, team_data: dict) -> Dict[str, AxisScore]:
-        """Calcule les 15 axes continus depuis les donnees brutes."""
-        axes = {}
+        return PERCENTILE_LABELS[int(percentile_bands(score))]
 
+    def _axis_inputs(self, team_data: dict) -> List[float]:
+        """Ligne AXIS_INPUTS d'une equipe (champs texte deja resolus en scores)."""
         tactical = team_data.get('tactical', {})
         defense = team_data.get('defense', {})
         fbref = team_data.get('fbref', {})
-        betting = team_data.get('betting', {})
         def_line = team_data.get('defensive_line', {})
         context = team_data.get('context', {})
         history = context.get('history', {})
         defense_percentiles = defense.get('percentiles', {})
+        gk_data = def_line.get('goalkeeper', {})
+        safe = self._safe_float
 
-        # ═══════════════════════════════════════════════════════════════
-        # OFFENSIVE AXES (6)
-        # ═══════════════════════════════════════════════════════════════
-
-        # 1. PRESSING_INTENSITY
-        # Source: context.history.ppda (lower = more aggressive pressing)
-        # Also check tactical.pressing_intensity for textual value
-        ppda = self._safe_float(history.get('ppda'), 0)
+        # Pressing sans PPDA: style textuel
         pressing_style = history.get('pressing_style', tactical.get('pressing_intensity', ''))
-
-        if ppda > 0:
-            # PPDA: 6-8 = HIGH press, 10-12 = MID, 14+ = LOW
-            # Invert: lower PPDA = higher pressing intensity
-            pressing_score = self._normalize_to_100(ppda, 16, 6)  # Inverted!
-        elif isinstance(pressing_style, str):
+        if isinstance(pressing_style, str):
             pressing_map = {"HIGH_PRESS": 80, "HIGH": 75, "MEDIUM": 50, "MID": 50, "LOW": 25}
-            pressing_score = pressing_map.get(pressing_style.upper(), 50)
-        else:
-            pressing_score = 50
-
-        axes["pressing_intensity"] = AxisScore(
-            name="pressing_intensity",
-            score=pressing_score,
-            raw_value=ppda if ppda > 0 else pressing_score,
-            percentile=self._get_percentile(pressing_score),
-            description="Intensite du pressing et recuperation haute"
-        )
-
-        # 2. POSSESSION_CONTROL
-        poss_raw = self._safe_float(tactical.get('possession_pct') or fbref.get('possession'), 50)
-        poss_score = self._normalize_to_100(poss_raw, 35, 70)
-        axes["possession_control"] = AxisScore(
-            name="possession_control",
-            score=poss_score,
-            raw_value=poss_raw,
-            percentile=self._get_percentile(poss_score),
-            description="Controle de la possession et patience"
-        )
-
-        # 3. VERTICALITY
-        # Source: tactical.progressive_passes or attacking speed profile
-        prog_passes = self._safe_float(tactical.get('progressive_passes'), 0)
-        attack_speed = context.get('context_dna', {}).get('attackSpeed', {})
-        fast_pct = self._safe_float(attack_speed.get('Fast', 0), 0)
-
-        if prog_passes > 0:
-            # Progressive passes: 400-500 = low, 600-700 = mid, 800+ = high
-            vert_score = self._normalize_to_100(prog_passes, 400, 900)
-        elif fast_pct > 0:
-            vert_score = self._normalize_to_100(fast_pct, 10, 40)
-        else:
-            # Fallback to defensive style
-            def_style = tactical.get('defensive_style', '')
-            vert_map = {"HIGH_BLOCK": 70, "MID_BLOCK": 50, "DEEP_BLOCK": 30}
-            vert_score = vert_map.get(str(def_style).upper(), 50)
-
-        axes["verticality"] = AxisScore(
-            name="verticality",
-            score=vert_score,
-            raw_value=prog_passes if prog_passes > 0 else vert_score,
-            percentile=self._get_percentile(vert_score),
-            description="Jeu vertical et passes progressives"
-        )
-
-        # 4. WIDE_PLAY
-        # Source: fbref.passes_penalty_area ou crosses
-        passes_pa = self._safe_float(fbref.get('passes_penalty_area'), 0)
-        touches_att = self._safe_float(fbref.get('touches_att_3rd'), 0)
-
-        if passes_pa > 0 and touches_att > 0:
-            # Ratio passes in penalty area / touches attacking third
-            wide_ratio = passes_pa / touches_att * 100 if touches_att > 0 else 5
-            wide_score = self._normalize_to_100(wide_ratio, 3, 10)
-        else:
-            wide_score = 50  # Default
-
-        axes["wide_play"] = AxisScore(
-            name="wide_play",
-            score=wide_score,
-            raw_value=passes_pa,
-            percentile=self._get_percentile(wide_score),
-            description="Jeu sur les ailes et centres"
-        )
-
-        # 5. SET_PIECE_THREAT
-        aerial_raw = self._safe_float(tactical.get('aerial_win_pct'), 50)
-        sp_score = self._normalize_to_100(aerial_raw, 40, 65)
-        axes["set_piece_threat"] = AxisScore(
-            name="set_piece_threat",
-            score=sp_score,
-            raw_value=aerial_raw,
-            percentile=self._get_percentile(sp_score),
-            description="Danger sur coups de pied arretes"
-        )
-
-        # 6. CLINICAL_FINISHING
-        # Source: fbref goals/xg or context.history xg data
-        # Goals / xG ratio - above 100 = clinical, below 100 = wasteful
-        xg_total = self._safe_float(history.get('xg') or fbref.get('xg'), 0)
-        goals_total = self._safe_float(fbref.get('goals') or context.get('record', {}).get('goals_for'), 0)
-
-        if xg_total > 0 and goals_total > 0:
-            clinical_raw = (goals_total / xg_total) * 100
-            clinical_score = self._normalize_to_100(clinical_raw, 70, 130)
+            pressing_fallback = pressing_map.get(pressing_style.upper(), 50)
         else:
-            # Fallback: use variance data
-            xg_overperf = self._safe_float(context.get('variance', {}).get('xg_overperformance'), 0)
-            # xg_overperformance: negative = underperforming, positive = overperforming
-            clinical_score = self._normalize_to_100(xg_overperf, -5, 5)
-            clinical_raw = xg_overperf
-
-        axes["clinical_finishing"] = AxisScore(
-            name="clinical_finishing",
-            score=clinical_score,
-            raw_value=clinical_raw,
-            percentile=self._get_percentile(clinical_score),
-            description="Efficacite devant le but (goals/xG)"
-        )
+            pressing_fallback = 50
 
-        # ═══════════════════════════════════════════════════════════════
-        # DEFENSIVE AXES (5)
-        # ═══════════════════════════════════════════════════════════════
-
-        # 7. BLOCK_DEPTH
-        def_line_height = 45  # Default mid-block
-        def_style = tactical.get('defensive_style', '')
-        if 'DEEP' in str(def_style).upper():
+        # Style defensif: verticalite par defaut et hauteur du bloc
+        def_style = str(tactical.get('defensive_style', '')).upper()
+        vert_map = {"HIGH_BLOCK": 70, "MID_BLOCK": 50, "DEEP_BLOCK": 30}
+        if 'DEEP' in def_style:
             def_line_height = 30
-        elif 'HIGH' in str(def_style).upper():
+        elif 'HIGH' in def_style:
             def_line_height = 60
-        block_score = self._normalize_to_100(def_line_height, 20, 65)
-        axes["block_depth"] = AxisScore(
-            name="block_depth",
-            score=block_score,
-            raw_value=def_line_height,
-            percentile=self._get_percentile(block_score),
-            description="Hauteur du bloc defensif (bas=30, haut=60)"
-        )
-
-        # 8. DEFENSIVE_COMPACTNESS
-        tackle_def = self._safe_float(tactical.get('tackle_def_pct'), 40)
-        compact_score = self._normalize_to_100(tackle_def, 25, 60)
-        axes["defensive_compactness"] = AxisScore(
-            name="defensive_compactness",
-            score=compact_score,
-            raw_value=tackle_def,
-            percentile=self._get_percentile(compact_score),
-            description="Compacite et tacles defensifs"
-        )
-
-        # 9. AERIAL_RESISTANCE
-        aerial_def = self._safe_float(tactical.get('aerial_win_pct'), 50)
-        aerial_score = self._normalize_to_100(aerial_def, 40, 65)
-        axes["aerial_resistance"] = AxisScore(
-            name="aerial_resistance",
-            score=aerial_score,
-            raw_value=aerial_def,
-            percentile=self._get_percentile(aerial_score),
-            description="Resistance aerienne defensive"
-        )
-
-        # 10. TRANSITION_DEFENSE
-        # Source: defense.percentiles.open_play (higher = better defense vs open play)
-        open_play_resist = self._safe_float(defense_percentiles.get('open_play'), 50)
-        # Also consider pressing score - high press = better transition defense
-        if pressing_score > 70:
-            trans_score = min(100, open_play_resist + 15)
-        elif pressing_score < 30:
-            trans_score = max(0, open_play_resist - 15)
-        else:
-            trans_score = open_play_resist
-
-        axes["transition_defense"] = AxisScore(
-            name="transition_defense",
-            score=trans_score,
-            raw_value=open_play_resist,
-            percentile=self._get_percentile(trans_score),
-            description="Defense en transition et contre-pressing"
-        )
-
-        # 11. GOALKEEPER_RELIABILITY
-        # Source: defensive_line.goalkeeper.gk_percentile ou defense overperformance
-        gk_data = def_line.get('goalkeeper', {})
-        gk_percentile = self._safe_float(gk_data.get('gk_percentile'), 0)
-        gk_overperform = self._safe_float(gk_data.get('gk_overperform'), 0)
-
-        if gk_percentile > 0:
-            # gk_percentile is already 0-100
-            gk_score = gk_percentile
-        elif gk_overperform != 0:
-            # gk_overperform: negative = underperforming, positive = overperforming
-            # Map -20 to +20 range to 0-100
-            gk_score = self._normalize_to_100(gk_overperform, -20, 20)
-        else:
-            # Fallback: use xGA/GA ratio
-            xga = self._safe_float(defense.get('xga_total'), 1)
-            ga = self._safe_float(defense.get('ga_total'), 1)
-            gk_raw = (xga / ga * 100) if ga > 0 else 100
-            gk_score = self._normalize_to_100(gk_raw, 80, 120)
-
-        axes["goalkeeper_reliability"] = AxisScore(
-            name="goalkeeper_reliability",
-            score=gk_score,
-            raw_value=gk_percentile if gk_percentile > 0 else gk_overperform,
-            percentile=self._get_percentile(gk_score),
-            description="Fiabilite du gardien"
-        )
-
-        # ═══════════════════════════════════════════════════════════════
-        # TEMPORAL AXES (3)
-        # ═══════════════════════════════════════════════════════════════
-
-        # 12. DIESEL_FACTOR (2H vs 1H goals)
-        # Source: defense.percentiles.late_prop (how well they defend late = inverse)
-        # OR defensive_line.temporal.timing_profile
-        late_prop = self._safe_float(defense_percentiles.get('late_prop', defense_percentiles.get('late')), 50)
-        timing_profile = def_line.get('temporal', {}).get('timing_profile', '')
-
-        # late_prop is DEFENSIVE (resist late goals), we want OFFENSIVE diesel
-        # High late_prop = hard to score late against = they defend well late
-        # For diesel (offensive), we need context.history or goals scored patterns
-        xga_late_pct = self._safe_float(defense.get('xga_late_pct'), 0)
-
-        if xga_late_pct > 0:
-            # Use xGA late percentage - higher = they concede more late = they're vulnerable
-            # But we want diesel = scoring late, not conceding
-            diesel_score = 100 - xga_late_pct  # Invert: if they concede late, they might also score late
-        elif 'STRONG_FINISH' in str(timing_profile).upper():
-            diesel_score = 75
-        elif 'FADES' in str(timing_profile).upper():
-            diesel_score = 30
         else:
-            diesel_score = late_prop
-
-        axes["diesel_factor"] = AxisScore(
-            name="diesel_factor",
-            score=diesel_score,
-            raw_value=late_prop,
-            percentile=self._get_percentile(diesel_score),
-            description="Ratio buts 2H/1H (diesel = fort en 2H)"
-        )
-
-        # 13. FIRST_HALF_INTENSITY
-        # Source: defense.percentiles.early_prop or early
-        early_prop = self._safe_float(defense_percentiles.get('early_prop', defense_percentiles.get('early')), 50)
-        xga_early_pct = self._safe_float(defense.get('xga_early_pct'), 0)
-
-        if xga_early_pct > 0:
-            # xga_early_pct: how much of their xGA is in first 15 min
-            fh_score = self._normalize_to_100(xga_early_pct, 10, 30)
-        else:
-            # early_prop is defensive (resist early goals)
-            # Low early_prop = vulnerable early = opponents score early against them
-            fh_score = 100 - early_prop  # Invert for offensive meaning
-
-        axes["first_half_intensity"] = AxisScore(
-            name="first_half_intensity",
-            score=fh_score,
-            raw_value=early_prop,
-            percentile=self._get_percentile(fh_score),
-            description="Part des buts en 1H"
-        )
+            def_line_height = 45  # Default mid-block
 
-        # 14. CLUTCH_FACTOR (75-90 goals)
-        # Source: defense.percentiles.late_prop or gamestate_behavior
-        gamestate_behavior = tactical.get('gamestate_behavior', '')
-        late_pct = self._safe_float(defense_percentiles.get('late_prop', defense_percentiles.get('late')), 50)
-
-        if 'COMEBACK' in str(gamestate_behavior).upper():
-            clutch_score = 75
-        elif 'COLLAPSES' in str(gamestate_behavior).upper():
-            clutch_score = 30
+        timing_profile = str(def_line.get('temporal', {}).get('timing_profile', '')).upper()
+        if 'STRONG_FINISH' in timing_profile:
+            timing_override = 75
+        elif 'FADES' in timing_profile:
+            timing_override = 30
         else:
-            # Use late_prop - high = hard to score late against = they're clutch defensively
-            # But for offensive clutch, we want something else
-            clutch_score = late_pct
-
-        axes["clutch_factor"] = AxisScore(
-            name="clutch_factor",
-            score=clutch_score,
-            raw_value=late_pct,
-            percentile=self._get_percentile(clutch_score),
-            description="Capacite a marquer apres 75'"
-        )
+            timing_override = float('nan')
 
-        # ═══════════════════════════════════════════════════════════════
-        # CONTEXTUAL AXES (1)
-        # ═══════════════════════════════════════════════════════════════
-
-        # 15. HOME_DOMINANCE
-        # Source: defense.percentiles.home vs away
-        home_resist = self._safe_float(defense_percentiles.get('home'), 50)
-        away_resist = self._safe_float(defense_percentiles.get('away'), 50)
-
-        # home_resist = how well they defend at home (higher = better)
-        # For home dominance, compare home vs away performance
-        if home_resist > 0 and away_resist > 0:
-            # Ratio of home resistance to away resistance
-            home_ratio = home_resist / away_resist if away_resist > 0 else 1.5
-            home_score = self._normalize_to_100(home_ratio, 0.7, 2.0)
+        gamestate_behavior = str(tactical.get('gamestate_behavior', '')).upper()
+        if 'COMEBACK' in gamestate_behavior:
+            clutch_override = 75
+        elif 'COLLAPSES' in gamestate_behavior:
+            clutch_override = 30
         else:
-            # Fallback to simple home percentile
-            home_score = home_resist
-
-        axes["home_dominance"] = AxisScore(
-            name="home_dominance",
-            score=home_score,
-            raw_value=home_resist,
-            percentile=self._get_percentile(home_score),
-            description="Dominance a domicile vs exterieur"
-        )
+            clutch_override = float('nan')
+
+        late_prop = defense_percentiles.get('late_prop', defense_percentiles.get('late'))
+        early_prop = defense_percentiles.get('early_prop', defense_percentiles.get('early'))
+        return [
+            safe(history.get('ppda'), 0),
+            pressing_fallback,
+            safe(tactical.get('possession_pct') or fbref.get('possession'), 50),
+            safe(tactical.get('progressive_passes'), 0),
+            safe(context.get('context_dna', {}).get('attackSpeed', {}).get('Fast', 0), 0),
+            vert_map.get(def_style, 50),
+            safe(fbref.get('passes_penalty_area'), 0),
+            safe(fbref.get('touches_att_3rd'), 0),
+            safe(tactical.get('aerial_win_pct'), 50),
+            safe(history.get('xg') or fbref.get('xg'), 0),
+            safe(fbref.get('goals') or context.get('record', {}).get('goals_for'), 0),
+            safe(context.get('variance', {}).get('xg_overperformance'), 0),
+            def_line_height,
+            safe(tactical.get('tackle_def_pct'), 40),
+            safe(defense_percentiles.get('open_play'), 50),
+            safe(gk_data.get('gk_percentile'), 0),
+            safe(gk_data.get('gk_overperform'), 0),
+            safe(defense.get('xga_total'), 1),
+            safe(defense.get('ga_total'), 1),
+            safe(late_prop, 50),
+            safe(defense.get('xga_late_pct'), 0),
+            timing_override,
+            safe(early_prop, 50),
+            safe(defense.get('xga_early_pct'), 0),
+            clutch_override,
+            safe(defense_percentiles.get('home'), 50),
+            safe(defense_percentiles.get('away'), 50),
+        ]
 
-        return axes
+    def _calculate_axes(self, team_data: dict) -> Dict[str, AxisScore]:
+        """Calcule les 15 axes continus d'une seule equipe depuis les donnees brutes."""
+        inputs = np.array([self._axis_inputs(team_data)], dtype=float)
+        return AxisTable.build([""], [self._team_league(team_data)], inputs).axes(0)
 
     def _extract_forces(self, axes: Dict[str, AxisScore]) -> List[Force]:
         """Identifie les forces distinctives (axes > 65)."""
@@ -835,28 +811,17 @@ class DNANarrativeGenerator:
 
         return f"Forces: {force_str}. Faiblesse: {faiblesse_str}."
 
-    def generate_profile(self, team: str) -> dict:
-        """Genere le profil narratif complet pour une equipe."""
-        # Normalize team name
-        team_data = None
-        team_key = None
-
-        for key in self.teams.keys():
-            if key.lower() == team.lower() or team.lower() in key.lower():
-                team_data = self.teams[key]
-                team_key = key
-                break
-
-        if team_data is None:
-            raise KeyError(f"Team not found: {team}")
-
-        # Get league
-        league = team_data.get('context', {}).get('league') or \
-                 team_data.get('tactical', {}).get('league') or 'Unknown'
-
-        # Calculate axes
-        axes = self._calculate_axes(team_data)
-
+    def _resolve_team(self, team: str) -> str:
+        """Cle exacte ou premiere cle contenant le nom (insensible a la casse)."""
+        team_lower = team.lower()
+        for key, key_lower in self._keys_lower:
+            if key_lower == team_lower or team_lower in key_lower:
+                return key
+        raise KeyError(f"Team not found: {team}")
+
+    def _build_profile(self, team_key: str, league: str, axes: Dict[str, AxisScore],
+                       generated_at: str) -> dict:
+        """Assemble le profil complet depuis les axes deja calcules."""
         # Extract forces and faiblesses
         forces = self._extract_forces(axes)
         faiblesses = self._extract_faiblesses(axes)
@@ -878,7 +843,7 @@ class DNANarrativeGenerator:
         return {
             "team": team_key,
             "league": league,
-            "generated_at": datetime.now().isoformat(),
+            "generated_at": generated_at,
             "identity": identity,
             "summary": summary,
             "axes": {
@@ -886,6 +851,7 @@ class DNANarrativeGenerator:
                     "score": axis.score,
                     "raw_value": axis.raw_value,
                     "percentile": axis.percentile,
+                    "league_percentile": axis.league_percentile,
                     "description": axis.description
                 }
                 for name, axis in axes.items()
@@ -913,23 +879,52 @@ class DNANarrativeGenerator:
             "narrative": narrative
         }
 
+    def generate_profile(self, team: str) -> dict:
+        """Genere le profil narratif complet pour une equipe (servi depuis le cache)."""
+        team_key = self._resolve_team(team)
+        profile = self.generate_all_profiles()["profiles"].get(team_key)
+        if profile is None:
+            # Equipe en erreur au precalcul: recalcul direct pour remonter l'exception
+            team_data = self.teams[team_key]
+            profile = self._build_profile(team_key, self._team_league(team_data),
+                                          self._calculate_axes(team_data), datetime.now().isoformat())
+        return profile
+
     def generate_all_profiles(self) -> dict:
-        """Genere les profils pour toutes les equipes."""
+        """
+        Genere les profils pour toutes les equipes.
+
+        Les axes viennent de l'AxisTable precalculee; le resultat est mis en
+        cache et resservi tant que data_version ne change pas.
+        """
+        cache = self._profiles_cache
+        if cache is not None and cache["data_version"] == self.data_version:
+            return cache
+
+        generated_at = datetime.now().isoformat()
+        table = self.axis_table
         profiles = {}
         errors = []
 
         for team in self.teams.keys():
+            row = self._team_rows.get(team)
+            if row is None:
+                errors.append({"team": team, "error": self._axis_errors[team]})
+                continue
             try:
-                profiles[team] = self.generate_profile(team)
+                axes = table.axes(row, self._league_percentiles)
+                profiles[team] = self._build_profile(team, table.leagues[row], axes, generated_at)
             except Exception as e:
                 errors.append({"team": team, "error": str(e)})
 
-        return {
-            "generated_at": datetime.now().isoformat(),
+        self._profiles_cache = {
+            "generated_at": generated_at,
+            "data_version": self.data_version,
             "count": len(profiles),
             "profiles": profiles,
             "errors": errors if errors else None
         }
+        return self._profiles_cache
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -33,6 +33,35 @@ import json
 import math
 
 
+# ═══════════════════════════════════════════════════════════════════════════════════════
+# COTES DE RÉFÉRENCE
+# ═══════════════════════════════════════════════════════════════════════════════════════
+
+# Cote moyenne par marché (estimations basées sur les données historiques)
+DEFAULT_MARKET_ODDS: Dict[str, float] = {
+    'over_25': 1.85,
+    'under_25': 2.00,
+    'over_35': 2.50,
+    'under_35': 1.55,
+    'btts_yes': 1.75,
+    'btts_no': 2.10,
+    'home_win': 1.80,
+    'away_win': 3.20,
+    'draw': 3.50,
+    'first_half_over_15': 2.20,
+    'second_half_over_15': 1.70,
+    'goal_75_90': 2.30,
+    'team_goals_2h': 1.50,
+    'home_over_05': 1.30,
+    'away_over_05': 1.55,
+    'home_over_15': 2.10,
+    'away_over_15': 3.00,
+}
+
+# Cote utilisée pour un marché absent du tableau
+FALLBACK_ODDS = 2.00
+
+
 # ═══════════════════════════════════════════════════════════════════════════════════════
 # STRATÉGIES À TESTER
 # ═══════════════════════════════════════════════════════════════════════════════════════
@@ -471,28 +500,7 @@ class QuantumBacktesterQuant2:
         # Stake fixe de 1 unité pour le backtest
         stake = 1.0
         
-        # Cote moyenne par marché (estimations basées sur les données historiques)
-        avg_odds = {
-            'over_25': 1.85,
-            'under_25': 2.00,
-            'over_35': 2.50,
-            'under_35': 1.55,
-            'btts_yes': 1.75,
-            'btts_no': 2.10,
-            'home_win': 1.80,
-            'away_win': 3.20,
-            'draw': 3.50,
-            'first_half_over_15': 2.20,
-            'second_half_over_15': 1.70,
-            'goal_75_90': 2.30,
-            'team_goals_2h': 1.50,
-            'home_over_05': 1.30,
-            'away_over_05': 1.55,
-            'home_over_15': 2.10,
-            'away_over_15': 3.00,
-        }
-        
-        odds = avg_odds.get(market_type, 2.00)
+        odds = DEFAULT_MARKET_ODDS.get(market_type, FALLBACK_ODDS)
         
         # Évaluation du résultat
         is_winner = False
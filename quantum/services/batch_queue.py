@@ -0,0 +1,471 @@
+"""
+╔═══════════════════════════════════════════════════════════════════════════════════════╗
+║                    QUANTUM BATCH QUEUE                                                ║
+║                                                                                       ║
+║  File de jobs persistante pour POST /analyze/batch.                                  ║
+║                                                                                       ║
+║  PRINCIPE:                                                                            ║
+║  ─────────────────────────────────────────────────────────────────────────────────── ║
+║  1. Un batch = N tâches (une par match), écrites en une fois, l'API répond tout de   ║
+║     suite avec le batch_id                                                            ║
+║  2. Des workers (processus séparés) réclament les tâches une par une                 ║
+║     (FOR UPDATE SKIP LOCKED): le débit suit le nombre de workers                      ║
+║  3. Chaque résultat est checkpointé dès qu'il est prêt: progression et résultats     ║
+║     partiels lisibles via GET /analyze/batch/{batch_id}                              ║
+║  4. Échec → nouvelle tentative avec backoff jusqu'à max_attempts                     ║
+║  5. Worker mort: la tâche est reprise à l'expiration de son bail (lease), sauf si    ║
+║     max_attempts est atteint: elle passe alors en échec                               ║
+║                                                                                       ║
+║  Stores: PostgresJobStore (QUANTUM_BATCH_DSN) ou InMemoryJobStore (local / tests).   ║
+║                                                                                       ║
+║  Usage worker:                                                                        ║
+║      python -m quantum.batch_worker --workers 4                                       ║
+╚═══════════════════════════════════════════════════════════════════════════════════════╝
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger("QuantumBatchQueue")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ═══════════════════════════════════════════════════════════════════════════════════════
+
+MAX_ATTEMPTS = 3
+RETRY_DELAY_SECONDS = 5.0       # backoff: 5s, 10s, 20s...
+LEASE_SECONDS = 300.0           # au-delà, la tâche d'un worker silencieux est reprise
+IDLE_SLEEP_SECONDS = 1.0
+
+# Statuts de tâche
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+TaskHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+@dataclass
+class BatchTask:
+    """Tâche réclamée par un worker"""
+    task_id: int
+    batch_id: str
+    position: int
+    payload: Dict[str, Any]
+    attempts: int
+
+
+@dataclass
+class BatchStatus:
+    """Progression d'un batch"""
+    batch_id: str
+    total: int
+    counts: Dict[str, int] = field(default_factory=dict)
+    results: List[Dict[str, Any]] = field(default_factory=list)
+    created_at: Optional[float] = None
+
+    @property
+    def finished(self) -> int:
+        return self.counts.get(DONE, 0) + self.counts.get(FAILED, 0)
+
+    @property
+    def status(self) -> str:
+        if self.finished == self.total:
+            return "completed" if not self.counts.get(FAILED) else "completed_with_errors"
+        if self.finished or self.counts.get(RUNNING):
+            return "running"
+        return "queued"
+
+    def to_dict(self, include_results: bool = True) -> Dict[str, Any]:
+        data = {
+            "batch_id": self.batch_id,
+            "status": self.status,
+            "total": self.total,
+            "pending": self.counts.get(PENDING, 0),
+            "running": self.counts.get(RUNNING, 0),
+            "completed": self.counts.get(DONE, 0),
+            "failed": self.counts.get(FAILED, 0),
+            "progress": round(self.finished / self.total, 4) if self.total else 1.0,
+        }
+        if include_results:
+            data["results"] = self.results
+        return data
+
+
+def _retry_delay(attempts: int, base: float) -> float:
+    return base * 2 ** max(0, attempts - 1)
+
+
+def _lease_error(attempts: int) -> str:
+    return f"lease expired after {attempts} attempts (worker crashed or timed out)"
+
+
+def new_batch_id() -> str:
+    return f"batch_{uuid.uuid4().hex[:16]}"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════════════
+# IN-MEMORY STORE (local / tests)
+# ═══════════════════════════════════════════════════════════════════════════════════════
+
+class InMemoryJobStore:
+    """
+    Store local, même sémantique que PostgresJobStore.
+
+    Limité à un processus: l'API démarre alors ses workers en tâches asyncio.
+    """
+
+    is_local = True
+
+    def __init__(self, max_attempts: int = MAX_ATTEMPTS, retry_delay: float = RETRY_DELAY_SECONDS,
+                 lease_seconds: float = LEASE_SECONDS, clock: Callable[[], float] = time.time):
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease_seconds = lease_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tasks: Dict[int, Dict[str, Any]] = {}
+        self._batches: Dict[str, Dict[str, Any]] = {}
+        self._next_id = 1
+
+    def create_batch(self, payloads: List[Dict[str, Any]], batch_id: Optional[str] = None) -> str:
+        batch_id = batch_id or new_batch_id()
+        now = self._clock()
+        with self._lock:
+            self._batches[batch_id] = {"total": len(payloads), "created_at": now, "task_ids": []}
+            for position, payload in enumerate(payloads):
+                task_id = self._next_id
+                self._next_id += 1
+                self._tasks[task_id] = {
+                    "batch_id": batch_id, "position": position, "payload": payload,
+                    "status": PENDING, "attempts": 0, "available_at": now, "lease_until": None,
+                    "worker": None, "result": None, "error": None,
+                }
+                self._batches[batch_id]["task_ids"].append(task_id)
+        return batch_id
+
+    def claim(self, worker_id: str) -> Optional[BatchTask]:
+        now = self._clock()
+        with self._lock:
+            for task_id, task in self._tasks.items():
+                expired = task["status"] == RUNNING and task["lease_until"] < now
+                if expired and task["attempts"] >= self.max_attempts:
+                    # Le match tue son worker à chaque tentative: on abandonne
+                    task.update(status=FAILED, lease_until=None, error=_lease_error(task["attempts"]))
+                    continue
+                if not (expired or (task["status"] == PENDING and task["available_at"] <= now)):
+                    continue
+                task.update(status=RUNNING, worker=worker_id, lease_until=now + self.lease_seconds)
+                task["attempts"] += 1
+                return BatchTask(task_id, task["batch_id"], task["position"], task["payload"], task["attempts"])
+        return None
+
+    def complete(self, task_id: int, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._tasks[task_id].update(status=DONE, result=result, error=None, lease_until=None)
+
+    def fail(self, task_id: int, error: str) -> bool:
+        """Enregistre l'échec; True si la tâche sera retentée."""
+        now = self._clock()
+        with self._lock:
+            task = self._tasks[task_id]
+            retry = task["attempts"] < self.max_attempts
+            task.update(
+                status=PENDING if retry else FAILED, error=error, lease_until=None,
+                available_at=now + _retry_delay(task["attempts"], self.retry_delay),
+            )
+            return retry
+
+    def status(self, batch_id: str) -> Optional[BatchStatus]:
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if batch is None:
+                return None
+            tasks = [self._tasks[i] for i in batch["task_ids"]]
+            counts: Dict[str, int] = {}
+            for task in tasks:
+                counts[task["status"]] = counts.get(task["status"], 0) + 1
+            results = [_result_row(t["position"], t["payload"], t["status"], t["attempts"], t["result"], t["error"])
+                       for t in tasks if t["status"] in (DONE, FAILED)]
+            return BatchStatus(batch_id, batch["total"], counts, results, batch["created_at"])
+
+
+def _result_row(position: int, payload: Dict[str, Any], status: str, attempts: int,
+                result: Optional[Dict[str, Any]], error: Optional[str]) -> Dict[str, Any]:
+    row = {
+        "position": position,
+        "match": f"{payload.get('home_team')} vs {payload.get('away_team')}",
+        "success": status == DONE,
+        "attempts": attempts,
+    }
+    if status == DONE:
+        row["result"] = result
+    else:
+        row["error"] = error
+    return row
+
+
+# ═══════════════════════════════════════════════════════════════════════════════════════
+# POSTGRES STORE
+# ═══════════════════════════════════════════════════════════════════════════════════════
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS quantum_batches (
+    batch_id    TEXT PRIMARY KEY,
+    total       INT NOT NULL,
+    created_at  TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS quantum_batch_tasks (
+    task_id       BIGSERIAL PRIMARY KEY,
+    batch_id      TEXT NOT NULL REFERENCES quantum_batches(batch_id) ON DELETE CASCADE,
+    position      INT NOT NULL,
+    payload       JSONB NOT NULL,
+    status        TEXT NOT NULL DEFAULT 'pending',
+    attempts      INT NOT NULL DEFAULT 0,
+    available_at  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    lease_until   TIMESTAMPTZ,
+    worker        TEXT,
+    result        JSONB,
+    error         TEXT,
+    updated_at    TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_quantum_batch_tasks_batch ON quantum_batch_tasks (batch_id, position);
+CREATE INDEX IF NOT EXISTS idx_quantum_batch_tasks_claim
+    ON quantum_batch_tasks (available_at) WHERE status IN ('pending', 'running');
+"""
+
+# Baux expirés sans tentative restante: échec définitif au lieu d'une reprise
+EXPIRE_SQL = """
+UPDATE quantum_batch_tasks
+SET status = 'failed', lease_until = NULL, updated_at = NOW(),
+    error = 'lease expired after ' || attempts || ' attempts (worker crashed or timed out)'
+WHERE status = 'running' AND lease_until < NOW() AND attempts >= %(max_attempts)s
+"""
+
+CLAIM_SQL = """
+UPDATE quantum_batch_tasks t
+SET status = 'running', attempts = t.attempts + 1, worker = %(worker)s,
+    lease_until = NOW() + make_interval(secs => %(lease)s), updated_at = NOW()
+WHERE t.task_id = (
+    SELECT task_id FROM quantum_batch_tasks
+    WHERE (status = 'pending' AND available_at <= NOW())
+       OR (status = 'running' AND lease_until < NOW() AND attempts < %(max_attempts)s)
+    ORDER BY available_at, task_id
+    LIMIT 1
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING t.task_id, t.batch_id, t.position, t.payload, t.attempts
+"""
+
+COMPLETE_SQL = """
+UPDATE quantum_batch_tasks
+SET status = 'done', result = %s, error = NULL, lease_until = NULL, updated_at = NOW()
+WHERE task_id = %s
+"""
+
+FAIL_SQL = """
+UPDATE quantum_batch_tasks
+SET status = CASE WHEN attempts < %(max_attempts)s THEN 'pending' ELSE 'failed' END,
+    available_at = NOW() + make_interval(secs => %(base)s * power(2, GREATEST(attempts - 1, 0))),
+    error = %(error)s, lease_until = NULL, updated_at = NOW()
+WHERE task_id = %(task_id)s
+RETURNING status
+"""
+
+STATUS_SQL = """
+SELECT b.total, EXTRACT(EPOCH FROM b.created_at) AS created_at,
+       t.position, t.payload, t.status, t.attempts, t.result, t.error
+FROM quantum_batches b
+LEFT JOIN quantum_batch_tasks t ON t.batch_id = b.batch_id
+WHERE b.batch_id = %s
+ORDER BY t.position
+"""
+
+
+class PostgresJobStore:
+    """
+    Store PostgreSQL partagé entre l'API et les workers.
+
+    Chaque appel ouvre une transaction courte sur une connexion dédiée au thread
+    (les endpoints async passent par asyncio.to_thread).
+    """
+
+    is_local = False
+
+    def __init__(self, dsn: str, max_attempts: int = MAX_ATTEMPTS,
+                 retry_delay: float = RETRY_DELAY_SECONDS, lease_seconds: float = LEASE_SECONDS):
+        self.dsn = dsn
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease_seconds = lease_seconds
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or conn.closed:
+            import psycopg2
+
+            conn = psycopg2.connect(self.dsn)
+            self._local.conn = conn
+        return conn
+
+    def _run(self, fn):
+        conn = self._conn()
+        try:
+            with conn, conn.cursor() as cur:
+                return fn(cur)
+        except Exception:
+            # Connexion cassée: la prochaine opération en rouvre une
+            if conn.closed:
+                self._local.conn = None
+            raise
+
+    def install(self) -> None:
+        self._run(lambda cur: cur.execute(SCHEMA_SQL))
+
+    def create_batch(self, payloads: List[Dict[str, Any]], batch_id: Optional[str] = None) -> str:
+        from psycopg2.extras import execute_values
+
+        batch_id = batch_id or new_batch_id()
+
+        def insert(cur):
+            cur.execute("INSERT INTO quantum_batches (batch_id, total) VALUES (%s, %s)", (batch_id, len(payloads)))
+            execute_values(
+                cur,
+                "INSERT INTO quantum_batch_tasks (batch_id, position, payload) VALUES %s",
+                [(batch_id, i, json.dumps(p)) for i, p in enumerate(payloads)],
+            )
+
+        self._run(insert)
+        return batch_id
+
+    def claim(self, worker_id: str) -> Optional[BatchTask]:
+        def claim(cur):
+            params = {"worker": worker_id, "lease": self.lease_seconds, "max_attempts": self.max_attempts}
+            cur.execute(EXPIRE_SQL, params)
+            cur.execute(CLAIM_SQL, params)
+            return cur.fetchone()
+
+        row = self._run(claim)
+        if row is None:
+            return None
+        task_id, batch_id, position, payload, attempts = row
+        return BatchTask(task_id, batch_id, position, payload, attempts)
+
+    def complete(self, task_id: int, result: Dict[str, Any]) -> None:
+        self._run(lambda cur: cur.execute(COMPLETE_SQL, (json.dumps(result, default=str), task_id)))
+
+    def fail(self, task_id: int, error: str) -> bool:
+        def fail(cur):
+            cur.execute(FAIL_SQL, {
+                "max_attempts": self.max_attempts, "base": self.retry_delay,
+                "error": error, "task_id": task_id,
+            })
+            return cur.fetchone()[0]
+
+        return self._run(fail) == PENDING
+
+    def status(self, batch_id: str) -> Optional[BatchStatus]:
+        def fetch(cur):
+            cur.execute(STATUS_SQL, (batch_id,))
+            return cur.fetchall()
+
+        rows = self._run(fetch)
+        if not rows:
+            return None
+        counts: Dict[str, int] = {}
+        results = []
+        for _, _, position, payload, status, attempts, result, error in rows:
+            if status is None:
+                continue
+            counts[status] = counts.get(status, 0) + 1
+            if status in (DONE, FAILED):
+                results.append(_result_row(position, payload, status, attempts, result, error))
+        return BatchStatus(batch_id, rows[0][0], counts, results, float(rows[0][1]))
+
+
+def store_from_env() -> Any:
+    """PostgresJobStore si QUANTUM_BATCH_DSN est défini, sinon InMemoryJobStore."""
+    dsn = os.getenv("QUANTUM_BATCH_DSN")
+    if dsn:
+        return PostgresJobStore(dsn)
+    return InMemoryJobStore()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════════════
+# WORKER
+# ═══════════════════════════════════════════════════════════════════════════════════════
+
+class BatchWorker:
+    """
+    Boucle de travail: réclame une tâche, exécute le handler, checkpointe.
+
+    Les appels au store (bloquants pour Postgres) passent par asyncio.to_thread.
+    """
+
+    def __init__(self, store, handler: TaskHandler, worker_id: Optional[str] = None,
+                 idle_sleep: float = IDLE_SLEEP_SECONDS):
+        self.store = store
+        self.handler = handler
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.idle_sleep = idle_sleep
+        self.processed = 0
+        self.failures = 0
+
+    async def _call(self, fn, *args):
+        if self.store.is_local:
+            return fn(*args)
+        return await asyncio.to_thread(fn, *args)
+
+    async def run_once(self) -> bool:
+        """Traite une tâche; False si la file est vide."""
+        task = await self._call(self.store.claim, self.worker_id)
+        if task is None:
+            return False
+
+        try:
+            result = await self.handler(task.payload)
+        except Exception as e:
+            self.failures += 1
+            error = getattr(e, "detail", None) or str(e) or type(e).__name__
+            retry = await self._call(self.store.fail, task.task_id, str(error))
+            logger.warning(f"[{self.worker_id}] {task.batch_id}#{task.position} attempt {task.attempts} "
+                           f"failed ({'retry' if retry else 'giving up'}): {error}")
+        else:
+            await self._call(self.store.complete, task.task_id, result)
+            self.processed += 1
+        return True
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Boucle jusqu'à stop (ou indéfiniment)."""
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            try:
+                worked = await self.run_once()
+            except Exception as e:
+                logger.error(f"[{self.worker_id}] store error: {e}")
+                worked = False
+            if not worked:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.idle_sleep)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def drain(self) -> int:
+        """Traite jusqu'à épuisement des tâches disponibles (tests, scripts)."""
+        count = 0
+        while await self.run_once():
+            count += 1
+        return count
@@ -0,0 +1,642 @@
+"""
+╔═══════════════════════════════════════════════════════════════════════════════════════╗
+║                    QUANTUM VECTORIZED BACKTESTER                                      ║
+║                                                                                       ║
+║  Moteur de backtest unique, en colonnes NumPy, qui remplace les scripts ad-hoc       ║
+║  de benchmarks/ (quantum_backtest_v2/v3/v4, strategie_ultime_v1-3, audit_quant_*).   ║
+║                                                                                       ║
+║  PRINCIPE:                                                                            ║
+║  ─────────────────────────────────────────────────────────────────────────────────── ║
+║  1. Matchs, cotes et features équipe chargés UNE fois en tableaux colonnes           ║
+║  2. Chaque match → 2 lignes "perspective" (domicile + extérieur)                     ║
+║  3. Strategy.conditions → masque booléen sur toutes les lignes                       ║
+║  4. Toutes les stratégies × toutes les équipes évaluées en une passe                 ║
+║  5. Agrégats par équipe / tier / ligue + walk-forward chronologique                  ║
+║                                                                                       ║
+║  Sémantique identique à QuantumBacktesterQuant2.analyze_team (mise fixe 1u).         ║
+╚═══════════════════════════════════════════════════════════════════════════════════════╝
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .backtester_quant2 import (
+    DEFAULT_MARKET_ODDS,
+    FALLBACK_ODDS,
+    QuantumBacktesterQuant2,
+    Strategy,
+    StrategyFamily,
+    StrategyResult,
+    TeamBacktestResult,
+    get_all_strategies,
+)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════════════
+# RÉSOLUTION DES MARCHÉS (vectorisée)
+# ═══════════════════════════════════════════════════════════════════════════════════════
+
+def market_outcomes(market_type: str, home_goals: np.ndarray, away_goals: np.ndarray) -> np.ndarray:
+    """
+    Version vectorisée de QuantumBacktesterQuant2.evaluate_bet_outcome.
+
+    Les marchés non résolubles à partir du score final sont perdants
+    (même comportement que la boucle historique).
+    """
+    total = home_goals + away_goals
+
+    if market_type == 'over_25':
+        return total > 2.5
+    if market_type == 'under_25':
+        return total < 2.5
+    if market_type == 'over_35':
+        return total > 3.5
+    if market_type == 'under_35':
+        return total < 3.5
+    if market_type == 'btts_yes':
+        return (home_goals > 0) & (away_goals > 0)
+    if market_type == 'btts_no':
+        return (home_goals == 0) | (away_goals == 0)
+    if market_type == 'home_win':
+        return home_goals > away_goals
+    if market_type == 'away_win':
+        return away_goals > home_goals
+    if market_type == 'draw':
+        return home_goals == away_goals
+    if market_type == 'home_over_05':
+        return home_goals >= 1
+    if market_type == 'away_over_05':
+        return away_goals >= 1
+    if market_type == 'home_over_15':
+        return home_goals >= 2
+    if market_type == 'away_over_15':
+        return away_goals >= 2
+
+    return np.zeros(home_goals.shape, dtype=bool)
+
+
+def xg_supported_losses(
+    market_type: str,
+    home_goals: np.ndarray,
+    away_goals: np.ndarray,
+    home_xg: np.ndarray,
+    away_xg: np.ndarray,
+) -> np.ndarray:
+    """Version vectorisée de analyze_loss_with_xg (True = 'XG_SUPPORTED')."""
+    total_xg = home_xg + away_xg
+
+    if market_type == 'over_25':
+        return total_xg > 2.5
+    if market_type == 'under_25':
+        return total_xg < 2.5
+    if market_type == 'btts_yes':
+        return (home_xg > 0.5) & (away_xg > 0.5)
+    if market_type == 'home_win':
+        return (home_xg > away_xg) & (home_goals <= away_goals)
+    if market_type == 'away_win':
+        return (away_xg > home_xg) & (away_goals <= home_goals)
+
+    return np.zeros(home_goals.shape, dtype=bool)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════════════
+# DONNÉES COLONNES
+# ═══════════════════════════════════════════════════════════════════════════════════════
+
+def _as_float(value: Any) -> float:
+    """Convertit une valeur DB (Decimal, None...) en float, 0.0 si absente."""
+    if value is None:
+        return 0.0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _as_date(value: Any) -> np.datetime64:
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return np.datetime64(value, 'D')
+    if value:
+        return np.datetime64(str(value)[:10], 'D')
+    return np.datetime64('NaT')
+
+
+@dataclass
+class MatchFrame:
+    """
+    Matchs terminés stockés en colonnes.
+
+    Accepte les deux conventions de nommage du projet:
+    matches_results (home_goals/away_goals/match_date) et
+    match_results (score_home/score_away/commence_time).
+    """
+    match_ids: np.ndarray
+    dates: np.ndarray
+    home_idx: np.ndarray
+    away_idx: np.ndarray
+    league_idx: np.ndarray
+    home_goals: np.ndarray
+    away_goals: np.ndarray
+    home_xg: np.ndarray
+    away_xg: np.ndarray
+    team_names: List[str]
+    league_names: List[str]
+    # Cotes réelles par marché (NaN = utiliser DEFAULT_MARKET_ODDS)
+    odds: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.match_ids)
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[Dict[str, Any]],
+        odds_columns: Optional[Dict[str, str]] = None,
+    ) -> "MatchFrame":
+        """
+        Construit le frame à partir de lignes dict (RealDictCursor, JSON...).
+
+        Args:
+            records: Lignes de matchs terminés
+            odds_columns: Mapping market_type → nom de colonne de cote dans records
+        """
+        odds_columns = odds_columns or {}
+        team_index: Dict[str, int] = {}
+        league_index: Dict[str, int] = {}
+
+        ids, dates, home, away, leagues = [], [], [], [], []
+        hg, ag, hxg, axg = [], [], [], []
+        odds_raw: Dict[str, List[float]] = {m: [] for m in odds_columns}
+
+        for row in records:
+            home_goals = row.get('home_goals', row.get('score_home'))
+            away_goals = row.get('away_goals', row.get('score_away'))
+            if home_goals is None or away_goals is None:
+                continue
+
+            home_team = row['home_team']
+            away_team = row['away_team']
+            league = row.get('league') or row.get('sport') or 'unknown'
+
+            ids.append(row.get('id', row.get('match_id')))
+            dates.append(_as_date(row.get('match_date', row.get('commence_time'))))
+            home.append(team_index.setdefault(home_team, len(team_index)))
+            away.append(team_index.setdefault(away_team, len(team_index)))
+            leagues.append(league_index.setdefault(league, len(league_index)))
+            hg.append(_as_float(home_goals))
+            ag.append(_as_float(away_goals))
+            hxg.append(_as_float(row.get('home_xg')))
+            axg.append(_as_float(row.get('away_xg')))
+
+            for market, column in odds_columns.items():
+                value = row.get(column)
+                odds_raw[market].append(float(value) if value else np.nan)
+
+        return cls(
+            match_ids=np.array(ids, dtype=object),
+            dates=np.array(dates, dtype='datetime64[D]'),
+            home_idx=np.array(home, dtype=np.int64),
+            away_idx=np.array(away, dtype=np.int64),
+            league_idx=np.array(leagues, dtype=np.int64),
+            home_goals=np.array(hg, dtype=np.float64),
+            away_goals=np.array(ag, dtype=np.float64),
+            home_xg=np.array(hxg, dtype=np.float64),
+            away_xg=np.array(axg, dtype=np.float64),
+            team_names=list(team_index),
+            league_names=list(league_index),
+            odds={m: np.array(v, dtype=np.float64) for m, v in odds_raw.items()},
+        )
+
+
+@dataclass
+class TeamFeatures:
+    """Features DNA par équipe, alignées sur MatchFrame.team_names."""
+    tier: np.ndarray
+    style: np.ndarray
+    diesel_factor: np.ndarray
+    late_game_killer: np.ndarray
+    best_market: np.ndarray
+
+    @classmethod
+    def from_dna(cls, team_names: Sequence[str], team_dna: Dict[str, Dict]) -> "TeamFeatures":
+        """Aligne un dict {team: dna} sur l'index d'équipes (défauts = boucle historique)."""
+        dnas = [team_dna.get(name, {}) for name in team_names]
+        return cls(
+            tier=np.array([d.get('tier', 'UNKNOWN') for d in dnas], dtype=object),
+            style=np.array([d.get('style', 'balanced') for d in dnas], dtype=object),
+            diesel_factor=np.array([d.get('diesel_factor', 0.5) for d in dnas], dtype=np.float64),
+            late_game_killer=np.array([bool(d.get('late_game_killer', False)) for d in dnas], dtype=bool),
+            best_market=np.array([d.get('best_market', 'over_25') for d in dnas], dtype=object),
+        )
+
+
+# ═══════════════════════════════════════════════════════════════════════════════════════
+# MASQUES DE STRATÉGIES
+# ═══════════════════════════════════════════════════════════════════════════════════════
+
+_ATTACKING_STYLES = ('attacking', 'offensive')
+_DEFENSIVE_STYLES = ('defensive', 'conservative')
+
+
+def strategy_mask(
+    strategy: Strategy,
+    features: TeamFeatures,
+    team: np.ndarray,
+    is_home: np.ndarray,
+) -> np.ndarray:
+    """
+    Version vectorisée de QuantumBacktesterQuant2.should_apply_strategy.
+
+    Args:
+        strategy: Stratégie à évaluer
+        features: Features DNA par équipe
+        team: Index d'équipe par ligne perspective
+        is_home: True si la ligne est la perspective domicile
+
+    Returns:
+        Masque booléen des lignes où la stratégie parie
+    """
+    mask = np.ones(team.shape, dtype=bool)
+
+    if strategy.family == StrategyFamily.MARKET_SPECIFIC:
+        return mask
+
+    conditions = strategy.conditions
+
+    if 'is_home' in conditions:
+        mask &= is_home == bool(conditions['is_home'])
+
+    if 'is_away' in conditions:
+        mask &= is_home != bool(conditions['is_away'])
+
+    if 'style' in conditions:
+        team_style = features.style[team]
+        if conditions['style'] == 'attacking':
+            mask &= np.isin(team_style, _ATTACKING_STYLES)
+        if conditions['style'] == 'defensive':
+            mask &= np.isin(team_style, _DEFENSIVE_STYLES)
+
+    if 'diesel_factor' in conditions:
+        mask &= features.diesel_factor[team] >= conditions['diesel_factor']
+
+    if 'late_game_killer' in conditions:
+        mask &= features.late_game_killer[team]
+
+    return mask
+
+
+# ═══════════════════════════════════════════════════════════════════════════════════════
+# MOTEUR
+# ═══════════════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class BetMatrix:
+    """
+    Résultat brut d'une passe: une ligne par stratégie, une colonne par perspective.
+
+    placed/won/profit/xg_loss sont de forme (n_strategies, n_rows).
+    """
+    strategy_ids: List[str]
+    team: np.ndarray
+    match: np.ndarray
+    placed: np.ndarray
+    won: np.ndarray
+    profit: np.ndarray
+    xg_loss: np.ndarray
+
+
+class VectorizedBacktester:
+    """
+    Backtester vectorisé QUANT 2.0.
+
+    Usage:
+        frame = MatchFrame.from_records(rows)
+        bt = VectorizedBacktester(frame, team_dna)
+        team_results = bt.run()
+        by_tier = bt.aggregate("tier")
+        folds = bt.walk_forward(n_splits=4)
+    """
+
+    def __init__(
+        self,
+        frame: MatchFrame,
+        team_dna: Optional[Dict[str, Dict]] = None,
+        strategies: Optional[Dict[str, Strategy]] = None,
+        market_odds: Optional[Dict[str, float]] = None,
+    ):
+        self.frame = frame
+        self.team_dna = team_dna or {}
+        self.features = TeamFeatures.from_dna(frame.team_names, self.team_dna)
+        self.strategies = strategies or get_all_strategies()
+        self.market_odds = market_odds or DEFAULT_MARKET_ODDS
+
+        n = len(frame)
+        self.row_team = np.concatenate([frame.home_idx, frame.away_idx])
+        self.row_match = np.concatenate([np.arange(n), np.arange(n)])
+        self.row_is_home = np.concatenate([np.ones(n, dtype=bool), np.zeros(n, dtype=bool)])
+
+        self._build_market_tables()
+        self._bets: Optional[BetMatrix] = None
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Préparation
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def _build_market_tables(self):
+        """Pré-calcule résultat, cote et perte xG pour chaque marché × match."""
+        markets = list(self.market_odds)
+        for strategy in self.strategies.values():
+            if strategy.market_type not in markets:
+                markets.append(strategy.market_type)
+        for market in self.features.best_market:
+            if market not in markets:
+                markets.append(market)
+
+        self.markets = markets
+        self.market_index = {m: i for i, m in enumerate(markets)}
+
+        f = self.frame
+        n = len(f)
+        self.outcomes = np.zeros((len(markets), n), dtype=bool)
+        self.xg_supported = np.zeros((len(markets), n), dtype=bool)
+        self.odds = np.empty((len(markets), n), dtype=np.float64)
+
+        for i, market in enumerate(markets):
+            self.outcomes[i] = market_outcomes(market, f.home_goals, f.away_goals)
+            self.xg_supported[i] = xg_supported_losses(
+                market, f.home_goals, f.away_goals, f.home_xg, f.away_xg
+            )
+            default = self.market_odds.get(market, FALLBACK_ODDS)
+            real = f.odds.get(market)
+            self.odds[i] = default if real is None else np.where(np.isnan(real), default, real)
+
+    def _market_codes(self, strategy: Strategy) -> np.ndarray:
+        """Index de marché par ligne perspective (-1 = pas de pari)."""
+        mask = strategy_mask(strategy, self.features, self.row_team, self.row_is_home)
+
+        if strategy.id == "QUANT_BEST_MARKET":
+            best = np.array(
+                [self.market_index[m] for m in self.features.best_market], dtype=np.int64
+            )
+            codes = best[self.row_team] if len(best) else np.zeros(0, dtype=np.int64)
+        else:
+            codes = np.full(self.row_team.shape, self.market_index[strategy.market_type])
+
+        return np.where(mask, codes, -1)
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Évaluation
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def evaluate(self) -> BetMatrix:
+        """Évalue toutes les stratégies sur toutes les lignes en une passe."""
+        if self._bets is not None:
+            return self._bets
+
+        strategy_ids = list(self.strategies)
+        codes = np.stack([self._market_codes(self.strategies[s]) for s in strategy_ids]) \
+            if strategy_ids else np.zeros((0, len(self.row_team)), dtype=np.int64)
+
+        placed = codes >= 0
+        safe_codes = np.where(placed, codes, 0)
+        match = np.broadcast_to(self.row_match, codes.shape)
+
+        won = self.outcomes[safe_codes, match] & placed
+        odds = self.odds[safe_codes, match]
+        profit = np.where(won, odds - 1.0, -1.0) * placed
+        xg_loss = self.xg_supported[safe_codes, match] & placed & ~won
+
+        self._bets = BetMatrix(
+            strategy_ids=strategy_ids,
+            team=self.row_team,
+            match=self.row_match,
+            placed=placed,
+            won=won,
+            profit=profit,
+            xg_loss=xg_loss,
+        )
+        return self._bets
+
+    def _recent_rows(self, limit: int) -> np.ndarray:
+        """Masque des lignes parmi les `limit` matchs les plus récents de leur équipe."""
+        n_teams = len(self.frame.team_names)
+        # Tri équipe → date → match: les lignes d'une équipe sont contiguës, la plus récente en dernier
+        order = np.lexsort((self.row_match, self.frame.dates[self.row_match], self.row_team))
+        counts = np.bincount(self.row_team, minlength=n_teams)
+        ends = np.cumsum(counts)
+        from_end = ends[self.row_team[order]] - 1 - np.arange(len(order))
+
+        keep = np.zeros(len(order), dtype=bool)
+        keep[order] = from_end < limit
+        return keep
+
+    def _group_sums(self, groups: np.ndarray, n_groups: int, row_filter: Optional[np.ndarray] = None):
+        """Somme (paris, victoires, profit, pertes xG) par stratégie × groupe."""
+        bets = self.evaluate()
+        n_strategies = len(bets.strategy_ids)
+
+        placed, won, profit, xg_loss = bets.placed, bets.won, bets.profit, bets.xg_loss
+        if row_filter is not None:
+            placed = placed & row_filter
+            won = won & row_filter
+            profit = profit * row_filter
+            xg_loss = xg_loss & row_filter
+
+        keys = (np.arange(n_strategies)[:, None] * n_groups + groups[None, :]).ravel()
+        size = n_strategies * n_groups
+
+        def _sum(values):
+            return np.bincount(keys, weights=values.ravel().astype(np.float64), minlength=size) \
+                .reshape(n_strategies, n_groups)
+
+        return _sum(placed), _sum(won), _sum(profit), _sum(xg_loss)
+
+    def _to_results(self, sums, group: int) -> Dict[str, StrategyResult]:
+        bets, wins, profit, xg_loss = sums
+        results = {}
+        for s, strategy_id in enumerate(self.evaluate().strategy_ids):
+            n = int(bets[s, group])
+            w = int(wins[s, group])
+            results[strategy_id] = StrategyResult(
+                strategy_id=strategy_id,
+                strategy_name=self.strategies[strategy_id].name,
+                bets=n,
+                wins=w,
+                losses=n - w,
+                staked=float(n),
+                profit=float(profit[s, group]),
+                xg_supported_losses=int(xg_loss[s, group]),
+                bad_analysis_losses=n - w - int(xg_loss[s, group]),
+            )
+        return results
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # API publique
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def run(self, min_matches: int = 5, limit_per_team: Optional[int] = None) -> Dict[str, TeamBacktestResult]:
+        """
+        Backtest complet par équipe (équivalent de run_full_backtest).
+
+        Args:
+            min_matches: Nombre minimum de matchs pour retenir une équipe
+            limit_per_team: Ne garder que les N derniers matchs de chaque équipe
+                (None = tout l'historique)
+        """
+        n_teams = len(self.frame.team_names)
+        row_filter = self._recent_rows(limit_per_team) if limit_per_team is not None else None
+        sums = self._group_sums(self.row_team, n_teams, row_filter)
+        kept_teams = self.row_team if row_filter is None else self.row_team[row_filter]
+        matches_per_team = np.bincount(kept_teams, minlength=n_teams)
+
+        team_results: Dict[str, TeamBacktestResult] = {}
+        for t, team_name in enumerate(self.frame.team_names):
+            if matches_per_team[t] < min_matches:
+                continue
+            result = TeamBacktestResult(
+                team_name=team_name,
+                team_tier=self.team_dna.get(team_name, {}).get('tier', 'UNKNOWN'),
+                team_style=self.team_dna.get(team_name, {}).get('style', 'unknown'),
+                total_matches=int(matches_per_team[t]),
+                strategy_results=self._to_results(sums, t),
+            )
+            result.calculate_best_strategies()
+            team_results[team_name] = result
+
+        return team_results
+
+    def aggregate(self, by: str = "team") -> Dict[str, Dict[str, StrategyResult]]:
+        """
+        Agrège les résultats par 'team', 'tier' ou 'league'.
+
+        Returns:
+            {groupe: {strategy_id: StrategyResult}}
+        """
+        if by == "team":
+            labels = list(self.frame.team_names)
+            groups = self.row_team
+        elif by == "tier":
+            tiers = self.features.tier
+            labels = sorted(set(tiers.tolist()))
+            tier_code = np.array([labels.index(t) for t in tiers], dtype=np.int64)
+            groups = tier_code[self.row_team] if len(tier_code) else self.row_team
+        elif by == "league":
+            labels = list(self.frame.league_names)
+            groups = self.frame.league_idx[self.row_match]
+        else:
+            raise ValueError(f"Agrégation inconnue: {by}")
+
+        sums = self._group_sums(groups, len(labels))
+        return {label: self._to_results(sums, g) for g, label in enumerate(labels)}
+
+    def walk_forward(self, n_splits: int = 4, min_bets: int = 5) -> List[Dict[str, Any]]:
+        """
+        Validation walk-forward chronologique (fenêtre d'entraînement expansive).
+
+        Pour chaque pli: la meilleure stratégie de chaque équipe est choisie sur
+        les matchs antérieurs, puis jouée sur le bloc suivant (hors échantillon).
+
+        Returns:
+            Liste de plis avec dates, paris, victoires et P&L hors échantillon
+        """
+        bets = self.evaluate()
+        n_teams = len(self.frame.team_names)
+        row_dates = self.frame.dates[self.row_match]
+
+        order = np.sort(self.frame.dates)
+        if len(order) == 0:
+            return []
+        cuts = [order[min(len(order) - 1, (len(order) * k) // (n_splits + 1))]
+                for k in range(1, n_splits + 1)] + [order[-1] + np.timedelta64(1, 'D')]
+
+        folds = []
+        for k in range(n_splits):
+            train = row_dates < cuts[k]
+            test = (row_dates >= cuts[k]) & (row_dates < cuts[k + 1])
+
+            train_bets, _, train_profit, _ = self._group_sums(self.row_team, n_teams, train)
+            score = np.where(train_bets >= min_bets, train_profit, -np.inf)
+            best = np.argmax(score, axis=0) if len(bets.strategy_ids) else np.zeros(n_teams, dtype=int)
+            has_best = np.isfinite(score.max(axis=0)) if len(bets.strategy_ids) else np.zeros(n_teams, dtype=bool)
+
+            chosen = np.zeros_like(bets.placed)
+            rows = np.arange(len(self.row_team))
+            eligible = test & has_best[self.row_team]
+            chosen[best[self.row_team][eligible], rows[eligible]] = True
+            chosen &= bets.placed
+
+            n_bets = int(chosen.sum())
+            profit = float(bets.profit[chosen].sum())
+            folds.append({
+                "fold": k + 1,
+                "train_end": str(cuts[k]),
+                "test_end": str(cuts[k + 1]),
+                "bets": n_bets,
+                "wins": int(bets.won[chosen].sum()),
+                "profit": profit,
+                "roi": profit / n_bets * 100 if n_bets else 0.0,
+            })
+
+        return folds
+
+
+# ═══════════════════════════════════════════════════════════════════════════════════════
+# CHARGEMENT DB
+# ═══════════════════════════════════════════════════════════════════════════════════════
+
+def load_match_frame(conn, since: Optional[str] = None) -> MatchFrame:
+    """
+    Charge tous les matchs terminés de match_results en une requête.
+
+    Args:
+        conn: Connexion psycopg2
+        since: Date ISO minimale (commence_time), None = tout l'historique
+    """
+    import psycopg2.extras
+
+    query = """
+        SELECT match_id, commence_time, home_team, away_team,
+               score_home, score_away, COALESCE(league, sport) AS league
+        FROM match_results
+        WHERE is_finished = true
+    """
+    params: List[Any] = []
+    if since:
+        query += " AND commence_time >= %s"
+        params.append(since)
+    query += " ORDER BY commence_time"
+
+    with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+        cur.execute(query, params)
+        return MatchFrame.from_records(cur.fetchall())
+
+
+class VectorizedBacktesterQuant2(QuantumBacktesterQuant2):
+    """
+    Drop-in de QuantumBacktesterQuant2: même rapport et export JSON,
+    mais run_full_backtest délègue au moteur vectorisé.
+    """
+
+    async def run_full_backtest(
+        self,
+        teams: List[str] = None,
+        limit_per_team: int = 50,
+        verbose: bool = True
+    ):
+        frame = load_match_frame(self.db)
+        team_dna = {name: await self._get_team_dna(name) for name in frame.team_names}
+
+        engine = VectorizedBacktester(frame, team_dna, self.strategies)
+        results = engine.run(min_matches=5, limit_per_team=limit_per_team)
+        if teams is not None:
+            results = {name: res for name, res in results.items() if name in teams}
+        self.team_results = results
+
+        if verbose:
+            print(f"✅ Backtest vectorisé terminé: {len(results)} équipes, "
+                  f"{len(frame)} matchs, {len(self.strategies)} stratégies")
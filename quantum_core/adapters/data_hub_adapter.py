@@ -186,6 +186,32 @@ class DataHubAdapter:
             logger.warning(f"DataOrchestrator non disponible: {e}")
             return None
 
+    def get_rating_lambdas(self, home: str, away: str, *aliases: str) -> Optional[Dict]:
+        """
+        Lambdas du modele Dixon-Coles ajuste (team_ratings.json).
+
+        Essaie le nom fourni puis les alias (canonical_name). None si pas de
+        fit ou equipe inconnue: les engines gardent alors leurs heuristiques.
+        """
+        try:
+            from quantum_core.probability.team_ratings import load_ratings
+            ratings = load_ratings()
+        except Exception as e:
+            logger.debug(f"Team ratings non disponibles: {e}")
+            return None
+        if ratings is None:
+            return None
+
+        names_home = [home] + [a for a in aliases[:1] if a]
+        names_away = [away] + [a for a in aliases[1:2] if a]
+        home_name = next((n for n in names_home if ratings.has(n)), None)
+        away_name = next((n for n in names_away if ratings.has(n)), None)
+        if home_name is None or away_name is None:
+            return None
+
+        lambda_home, lambda_away = ratings.lambdas(home_name, away_name)
+        return {"home": lambda_home, "away": lambda_away, "rho": ratings.rho, "as_of": ratings.as_of}
+
     def _load_classification(self) -> Dict:
         """Charge la classification V25."""
         if self._classification_cache:
@@ -482,6 +508,11 @@ class DataHubAdapter:
         # Referee data
         referee_data = self.get_referee_data(referee) if referee else None
 
+        # Lambdas du modele de ratings (None = heuristiques xg_for/xg_against)
+        rating_lambdas = self.get_rating_lambdas(
+            home, away, home_data.get("canonical_name"), away_data.get("canonical_name")
+        )
+
         # Construire le matchup_data complet
         matchup_data = {
             "home": home_data,
@@ -503,8 +534,14 @@ class DataHubAdapter:
             "home_profile": home_data.get("tactical_profile", "BALANCED"),
             "away_profile": away_data.get("tactical_profile", "BALANCED"),
 
+            # Ratings Dixon-Coles ajustes
+            "rating_lambdas": rating_lambdas,
+
             # Computed
-            "xg_total": home_data.get("xg_for", 1.4) + away_data.get("xg_for", 1.4),
+            "xg_total": (
+                rating_lambdas["home"] + rating_lambdas["away"] if rating_lambdas
+                else home_data.get("xg_for", 1.4) + away_data.get("xg_for", 1.4)
+            ),
             "btts_combined": (home_data.get("btts_rate", 0.5) + away_data.get("btts_rate", 0.5)) / 2,
 
             # Corners
@@ -53,11 +53,20 @@ Usage:
 """
 
 from .unified_brain import UnifiedBrain, get_unified_brain
+from .instrumentation import (
+    AnalysisTrace, StageSpan, BrainInstrumentation, SamplingProfiler
+)
 from .models import (
     MatchPrediction, MarketProbability, MarketEdge, BetRecommendation,
     MarketType, Confidence, SignalStrength, MARKET_CATEGORIES,
     LIQUIDITY_TAX, MIN_EDGE_BY_MARKET
 )
+from .edge_scan import (
+    EdgeScan, scan_edges, probability_matrix, odds_matrix, MARKETS
+)
+from .worker import (
+    BrainServer, BrainClient, BrainWorkerError, BrainWorkerUnavailable, connect_brain
+)
 from .correct_score import (
     CorrectScoreCalculator, CorrectScoreAnalysis, ScorePrediction,
     get_correct_score_calculator
@@ -100,7 +109,7 @@ from .team_totals import (
     TeamTotalsCalculator, TeamTotalsAnalysis, get_team_totals_calculator
 )
 from .goalscorer import (
-    GoalscorerCalculator, GoalscorerDataLoader,
+    GoalscorerCalculator, GoalscorerDataLoader, TeamSquad,
     PlayerGoalscorerOdds, MatchGoalscorerAnalysis,
     get_goalscorer_calculator
 )
@@ -109,6 +118,11 @@ __all__ = [
     # Brain
     "UnifiedBrain",
     "get_unified_brain",
+    # Instrumentation
+    "AnalysisTrace",
+    "StageSpan",
+    "BrainInstrumentation",
+    "SamplingProfiler",
     # Models
     "MatchPrediction",
     "MarketProbability",
@@ -120,6 +134,18 @@ __all__ = [
     "MARKET_CATEGORIES",
     "LIQUIDITY_TAX",
     "MIN_EDGE_BY_MARKET",
+    # Edge Scan (vectorise)
+    "EdgeScan",
+    "scan_edges",
+    "probability_matrix",
+    "odds_matrix",
+    "MARKETS",
+    # Worker persistant
+    "BrainServer",
+    "BrainClient",
+    "BrainWorkerError",
+    "BrainWorkerUnavailable",
+    "connect_brain",
     # Correct Score
     "CorrectScoreCalculator",
     "CorrectScoreAnalysis",
@@ -177,6 +203,7 @@ __all__ = [
     # Goalscorer
     "GoalscorerCalculator",
     "GoalscorerDataLoader",
+    "TeamSquad",
     "PlayerGoalscorerOdds",
     "MatchGoalscorerAnalysis",
     "get_goalscorer_calculator",
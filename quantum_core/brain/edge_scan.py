@@ -0,0 +1,307 @@
+"""
+Edge Scan - Evaluation vectorisee des edges
+═══════════════════════════════════════════════════════════════════════════
+
+Un slate entier (N matchs × 99 marches) est evalue en une seule passe NumPy:
+les probabilites et les cotes sont deux matrices [matchs × marches] alignees
+sur MARKETS, LIQUIDITY_TAX et MIN_EDGE_BY_MARKET deviennent des vecteurs
+[marches] construits une fois a l'import.
+
+    raw_edge             = p - 1/cote
+    edge_after_vig       = raw_edge - BOOKMAKER_VIG
+    edge_after_liquidity = edge_after_vig - tax[marche]
+    kelly                = clip(edge / (cote - 1) × KELLY_MULTIPLIER, 0, KELLY_CAP)
+
+Cote ou probabilite absente = NaN: la cellule est marquee non disponible.
+Memes formules que l'ancienne boucle UnifiedBrain._calculate_edges.
+
+Un seul match avec peu de cotes (cas analyze_match): market_edges() fait la
+boucle scalaire sur des tables construites a l'import, sans l'overhead
+NumPy des matrices 1 × 99. Au-dela de SCALAR_MAX_ODDS cotes, scan_edges().
+
+Usage:
+    scan = scan_edges(probability_matrix(probs), odds_matrix(odds))
+    scan.market_edges(0)          # Dict[str, MarketEdge] du match 0
+    scan.opportunities()          # [(match, marche)] au-dessus du seuil
+    market_edges(probs[0], odds[0])  # un match, boucle scalaire
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .models import LIQUIDITY_TAX, MIN_EDGE_BY_MARKET, MarketEdge, MarketType, SignalStrength
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Ordre des colonnes des matrices
+MARKETS: Tuple[MarketType, ...] = tuple(MarketType)
+MARKET_INDEX: Dict[str, int] = {m.value: i for i, m in enumerate(MARKETS)}
+
+DEFAULT_LIQUIDITY_TAX = 0.02
+DEFAULT_MIN_EDGE = 0.03
+
+LIQUIDITY_TAX_VECTOR = np.array([LIQUIDITY_TAX.get(m, DEFAULT_LIQUIDITY_TAX) for m in MARKETS])
+MIN_EDGE_VECTOR = np.array([MIN_EDGE_BY_MARKET.get(m, DEFAULT_MIN_EDGE) for m in MARKETS])
+
+BOOKMAKER_VIG = 0.01      # ~1% vig bookmaker
+KELLY_MULTIPLIER = 0.5    # Half Kelly
+KELLY_CAP = 0.10          # Cap 10% bankroll
+
+# Codes de signal (index dans SIGNALS)
+SIGNALS: Tuple[SignalStrength, ...] = (
+    SignalStrength.NO_BET,
+    SignalStrength.STRONG_BET,
+    SignalStrength.MEDIUM_BET,
+    SignalStrength.SMALL_BET,
+    SignalStrength.FADE,
+)
+
+# Noms de cotes acceptes par marche (premier present gagne)
+ODDS_ALIASES: Dict[str, List[str]] = {
+    "home_win": ["1", "home", "home_win"],
+    "draw": ["X", "draw"],
+    "away_win": ["2", "away", "away_win"],
+    "dc_1x": ["dc_1x", "1x"],
+    "dc_x2": ["dc_x2", "x2"],
+    "dc_12": ["dc_12", "12"],
+    "dnb_home": ["dnb_home", "dnb_1"],
+    "dnb_away": ["dnb_away", "dnb_2"],
+    "btts_yes": ["btts_yes", "btts"],
+    "btts_no": ["btts_no"],
+    "over_0.5": ["over_05", "o05"],
+    "over_1.5": ["over_15", "o15"],
+    "over_2.5": ["over_25", "o25"],
+    "over_3.5": ["over_35", "o35"],
+    "over_4.5": ["over_45", "o45"],
+    "over_5.5": ["over_55", "o55"],
+    "under_0.5": ["under_05", "u05"],
+    "under_1.5": ["under_15", "u15"],
+    "under_2.5": ["under_25", "u25"],
+    "under_3.5": ["under_35", "u35"],
+    "under_4.5": ["under_45", "u45"],
+    "under_5.5": ["under_55", "u55"],
+    "corners_over_8.5": ["corners_over_85", "co85"],
+    "corners_over_9.5": ["corners_over_95", "co95"],
+    "corners_over_10.5": ["corners_over_105", "co105"],
+    "corners_under_8.5": ["corners_under_85", "cu85"],
+    "corners_under_9.5": ["corners_under_95", "cu95"],
+    "corners_under_10.5": ["corners_under_105", "cu105"],
+    "cards_over_2.5": ["cards_over_25", "cao25"],
+    "cards_over_3.5": ["cards_over_35", "cao35"],
+    "cards_over_4.5": ["cards_over_45", "cao45"],
+    "cards_under_2.5": ["cards_under_25", "cau25"],
+    "cards_under_3.5": ["cards_under_35", "cau35"],
+    "cards_under_4.5": ["cards_under_45", "cau45"],
+}
+
+# Pour chaque colonne: noms de cotes a essayer
+_ODDS_KEYS: Tuple[List[str], ...] = tuple(ODDS_ALIASES.get(m.value, [m.value]) for m in MARKETS)
+
+# Boucle scalaire: (nom, marche, noms de cotes, taxe, edge minimum) par colonne
+_SCALAR_MARKETS = tuple(
+    (m.value, m, keys, float(tax), float(min_edge))
+    for m, keys, tax, min_edge in zip(MARKETS, _ODDS_KEYS, LIQUIDITY_TAX_VECTOR, MIN_EDGE_VECTOR)
+)
+
+# Au-dela, un match passe par scan_edges (matrices 1 × 99)
+SCALAR_MAX_ODDS = 40
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# MATRICES
+# ═══════════════════════════════════════════════════════════════════════════
+
+def probability_matrix(rows: Sequence[Mapping[str, Optional[float]]]) -> np.ndarray:
+    """[{marche: proba}] → matrice [matchs × MARKETS], NaN si absente."""
+    matrix = np.full((len(rows), len(MARKETS)), np.nan)
+    for i, row in enumerate(rows):
+        for name, value in row.items():
+            j = MARKET_INDEX.get(name)
+            if j is not None and value is not None:
+                matrix[i, j] = value
+    return matrix
+
+
+def odds_matrix(rows: Sequence[Mapping[str, float]]) -> np.ndarray:
+    """[{nom de cote: cote}] → matrice [matchs × MARKETS] via ODDS_ALIASES, NaN si absente."""
+    matrix = np.full((len(rows), len(MARKETS)), np.nan)
+    for i, row in enumerate(rows):
+        for j, keys in enumerate(_ODDS_KEYS):
+            for key in keys:
+                value = row.get(key)
+                if value is not None:
+                    matrix[i, j] = value
+                    break
+    return matrix
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SCAN
+# ═══════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class EdgeScan:
+    """Edges, cotes justes et mises Kelly d'un slate, matrices [matchs × MARKETS]."""
+    probability: np.ndarray
+    market_odds: np.ndarray
+    fair_odds: np.ndarray
+    raw_edge: np.ndarray
+    edge_after_vig: np.ndarray
+    edge_after_liquidity: np.ndarray
+    kelly_fraction: np.ndarray
+    signal: np.ndarray              # index dans SIGNALS
+    meets_threshold: np.ndarray
+    available: np.ndarray           # proba et cote presentes
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.probability.shape
+
+    def market_edges(self, row: int) -> Dict[str, MarketEdge]:
+        """MarketEdge des marches disponibles d'un match (format UnifiedBrain)."""
+        columns = np.flatnonzero(self.available[row])
+        fields = [
+            a[row, columns].tolist() for a in (
+                self.probability, self.fair_odds, self.market_odds, self.raw_edge,
+                self.edge_after_vig, self.edge_after_liquidity, self.kelly_fraction,
+                self.meets_threshold, self.signal,
+            )
+        ]
+        edges = {}
+        for j, prob, fair, odds, raw, vig, liq, kelly, meets, signal in zip(columns.tolist(), *fields):
+            market = MARKETS[j]
+            edges[market.value] = MarketEdge(
+                market=market,
+                probability=prob,
+                fair_odds=fair,
+                market_odds=odds,
+                raw_edge=raw,
+                edge_after_vig=vig,
+                edge_after_liquidity=liq,
+                kelly_fraction=kelly,
+                recommended_stake=kelly,
+                signal_strength=SIGNALS[signal],
+                liquidity_tax=float(LIQUIDITY_TAX_VECTOR[j]),
+                min_edge_required=float(MIN_EDGE_VECTOR[j]),
+                meets_threshold=meets,
+            )
+        return edges
+
+    def opportunities(self) -> List[Tuple[int, MarketType]]:
+        """(match, marche) au-dessus du seuil, tries par Kelly decroissant."""
+        rows, cols = np.nonzero(self.meets_threshold & (self.edge_after_liquidity > 0))
+        order = np.argsort(-self.kelly_fraction[rows, cols], kind="stable")
+        return [(int(rows[k]), MARKETS[cols[k]]) for k in order]
+
+
+def scan_edges(probabilities: np.ndarray, odds: np.ndarray) -> EdgeScan:
+    """
+    Evalue tous les marches de tous les matchs en une passe.
+
+    Args:
+        probabilities: [matchs × MARKETS] (voir probability_matrix)
+        odds: [matchs × MARKETS] cotes decimales (voir odds_matrix)
+    """
+    probabilities = np.asarray(probabilities, dtype=float)
+    odds = np.asarray(odds, dtype=float)
+    available = ~(np.isnan(probabilities) | np.isnan(odds))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        implied = np.where(odds > 0, 1.0 / odds, 0.0)
+        fair_odds = np.where(probabilities > 0, 1.0 / probabilities, 0.0)
+        raw_edge = probabilities - implied
+        edge_after_vig = raw_edge - BOOKMAKER_VIG
+        edge_after_liquidity = edge_after_vig - LIQUIDITY_TAX_VECTOR
+
+        sizable = (edge_after_liquidity > 0) & (odds > 1)
+        kelly = np.where(sizable, edge_after_liquidity / (odds - 1), 0.0)
+    kelly = np.clip(kelly * KELLY_MULTIPLIER, 0.0, KELLY_CAP)
+
+    # np.select: premiere condition vraie, dans l'ordre des seuils scalaires
+    signal = np.select(
+        [
+            (edge_after_liquidity > 0.05) & (kelly > 0.03),
+            (edge_after_liquidity > 0.03) & (kelly > 0.01),
+            edge_after_liquidity > 0.01,
+            edge_after_liquidity < -0.05,
+        ],
+        [1, 2, 3, 4],
+        default=0,
+    )
+
+    return EdgeScan(
+        probability=probabilities,
+        market_odds=odds,
+        fair_odds=fair_odds,
+        raw_edge=raw_edge,
+        edge_after_vig=edge_after_vig,
+        edge_after_liquidity=edge_after_liquidity,
+        kelly_fraction=kelly,
+        signal=signal,
+        meets_threshold=available & (edge_after_liquidity >= MIN_EDGE_VECTOR),
+        available=available,
+    )
+
+
+def market_edges(probabilities: Mapping[str, Optional[float]],
+                 market_odds: Mapping[str, float]) -> Dict[str, MarketEdge]:
+    """
+    Edges d'un seul match, boucle scalaire (memes formules et meme ordre de
+    marches que scan_edges(...).market_edges(0)).
+    """
+    if len(market_odds) > SCALAR_MAX_ODDS:
+        return scan_edges(probability_matrix([probabilities]), odds_matrix([market_odds])).market_edges(0)
+
+    edges = {}
+    for name, market, keys, tax, min_edge in _SCALAR_MARKETS:
+        probability = probabilities.get(name)
+        if probability is None:
+            continue
+        odds = None
+        for key in keys:
+            odds = market_odds.get(key)
+            if odds is not None:
+                break
+        if odds is None:
+            continue
+
+        implied = 1.0 / odds if odds > 0 else 0.0
+        raw_edge = probability - implied
+        edge_after_vig = raw_edge - BOOKMAKER_VIG
+        edge_after_liquidity = edge_after_vig - tax
+        kelly = 0.0
+        if edge_after_liquidity > 0 and odds > 1:
+            kelly = min(KELLY_CAP, max(0.0, edge_after_liquidity / (odds - 1) * KELLY_MULTIPLIER))
+
+        if edge_after_liquidity > 0.05 and kelly > 0.03:
+            signal = SignalStrength.STRONG_BET
+        elif edge_after_liquidity > 0.03 and kelly > 0.01:
+            signal = SignalStrength.MEDIUM_BET
+        elif edge_after_liquidity > 0.01:
+            signal = SignalStrength.SMALL_BET
+        elif edge_after_liquidity < -0.05:
+            signal = SignalStrength.FADE
+        else:
+            signal = SignalStrength.NO_BET
+
+        edges[name] = MarketEdge(
+            market=market,
+            probability=probability,
+            fair_odds=1.0 / probability if probability > 0 else 0.0,
+            market_odds=odds,
+            raw_edge=raw_edge,
+            edge_after_vig=edge_after_vig,
+            edge_after_liquidity=edge_after_liquidity,
+            kelly_fraction=kelly,
+            recommended_stake=kelly,
+            signal_strength=signal,
+            liquidity_tax=tax,
+            min_edge_required=min_edge,
+            meets_threshold=edge_after_liquidity >= min_edge,
+        )
+    return edges
@@ -11,23 +11,36 @@ DONNÉES:
     - goalscorer_profiles_2025.json (876 joueurs)
     - first_goalscorer_stats.json (96 équipes)
 
-FORMULES:
-    Anytime: P = 1 - e^(-λ) où λ = xG_match_joueur
-    First GS: P = P(Équipe 1er) × P(Joueur | Équipe) × timing_adj
-    Last GS: P = P(Match a buts) × last_goal_rate × clutch_factor
+MODÈLE (risques concurrents, vectorisé NumPy):
+    Chaque joueur i a une intensité de but λ_i(t) constante par tranche de
+    15 minutes k (répartition = ses splits timing pct_0_15..pct_76_90).
+    Le reste de chaque équipe (joueurs sans profil, CSC) complète jusqu'à
+    l'xG de l'équipe. Avec Λ_k = intensité totale du match sur la tranche k:
+
+    Anytime:  P = 1 - e^(-Σ_k λ_ik)
+    First GS: P = Σ_k (λ_ik / Λ_k) × (1 - e^(-Λ_k)) × e^(-Σ_{j<k} Λ_j)
+    Last GS:  P = Σ_k (λ_ik / Λ_k) × (1 - e^(-Λ_k)) × e^(-Σ_{j>k} Λ_j)
+
+    Les deux effectifs sont évalués dans une seule matrice [joueurs × tranches].
+
+INDEX:
+    GoalscorerDataLoader construit au chargement un TeamSquad (arrays NumPy)
+    par équipe: plus de scan des 876 profils par appel.
 
 Auteur: Mon_PS Quant Team
-Version: 1.0.0
-Date: 13 Décembre 2025
+Version: 2.0.0
+Date: 13 Décembre 2025 (V2: 19 Octobre 2026)
 """
 
 import json
-import math
 import logging
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
-from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from quantum_core.data.dna_store import load_section
 
 logger = logging.getLogger(__name__)
 
@@ -58,13 +71,20 @@ MIN_EDGE = {
 DEFAULT_MINUTES = 75  # Titulaire standard
 SUB_MINUTES = 25      # Remplaçant typique
 
-# Timing adjustments
-TIMING_ADJUSTMENTS = {
-    "EARLY_BIRD": {"first": 1.3, "last": 0.7},   # +30% first, -30% last
-    "CLUTCH": {"first": 0.7, "last": 1.4},       # -30% first, +40% last
-    "DIESEL": {"first": 0.8, "last": 1.2},       # -20% first, +20% last
-    "CONSISTENT": {"first": 1.0, "last": 1.0},   # Neutre
-}
+# Tranches timing (splits pct_* des profils)
+TIMING_PERIODS = ("0_15", "16_30", "31_45", "46_60", "61_75", "76_90")
+
+# Répartition moyenne des buts par tranche (temps additionnel inclus en fin de mi-temps)
+LEAGUE_GOAL_TIMING = np.array([0.14, 0.16, 0.18, 0.16, 0.17, 0.19])
+
+# Poids (en buts) du prior LEAGUE_GOAL_TIMING dans le lissage des splits joueur
+TIMING_PRIOR_GOALS = 3.0
+
+# Part des buts d'une équipe hors joueurs profilés (CSC, joueurs sans profil)
+OTHER_SCORERS_SHARE = 0.10
+
+# Joueurs retenus par équipe dans les rankings (top buteurs)
+MAX_PLAYERS_PER_TEAM = 15
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -128,12 +148,112 @@ class MatchGoalscorerAnalysis:
 # DATA LOADER
 # ═══════════════════════════════════════════════════════════════════════════
 
+@dataclass
+class TeamSquad:
+    """
+    Effectif d'une équipe en arrays NumPy (un indice = un joueur).
+
+    Les joueurs sont triés par total_goals décroissant; les taux par 90
+    minutes sont déjà estimés quand FBRef ne les fournit pas.
+    """
+    team_name: str
+    player_ids: List[str]
+    player_names: List[str]
+    timing_profiles: List[str]
+    total_goals: np.ndarray
+    goals_per_90: np.ndarray
+    xg_per_90: np.ndarray
+    minutes_expected: np.ndarray
+    minutes_share: np.ndarray        # minutes_expected / 90
+    first_goal_rate: np.ndarray
+    timing_weights: np.ndarray       # [joueurs × 6], lignes sommant à 1
+    confidence: np.ndarray
+    eligible: np.ndarray             # assez de données pour être coté
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+
+def _estimate_player_rates(profile: Dict) -> Tuple[float, float, float]:
+    """goals_per_90, xg_per_90 et minutes attendues (estimations si pas de FBRef)."""
+    goals_per_90 = profile.get("goals_per_90", 0) or 0
+    xg_per_90 = profile.get("xg_per_90", 0) or 0
+    total_goals = profile.get("total_goals", 0) or 0
+    total_xg = profile.get("total_xg", 0) or 0
+    minutes_played = profile.get("minutes_played", 0) or 0
+    matches_with_goal = profile.get("matches_with_goal", 0) or 0
+
+    # Estimation: suppose ~70 min par match en moyenne pour buteurs
+    estimated_minutes = matches_with_goal * 70 if matches_with_goal > 0 else total_goals * 90
+    if goals_per_90 <= 0 and total_goals > 0 and estimated_minutes > 0:
+        goals_per_90 = (total_goals / estimated_minutes) * 90
+    if xg_per_90 <= 0 and total_xg > 0 and estimated_minutes > 0:
+        xg_per_90 = (total_xg / estimated_minutes) * 90
+
+    # Minutes attendues
+    if minutes_played >= 450:  # ~5 matchs complets
+        avg_minutes = minutes_played / max(1, matches_with_goal * 1.5)
+        minutes_expected = min(90, max(30, avg_minutes))
+    else:
+        minutes_expected = DEFAULT_MINUTES if total_goals >= 3 else SUB_MINUTES
+
+    return float(goals_per_90), float(xg_per_90), float(int(minutes_expected))
+
+
+def _build_team_squad(team_name: str, players: List[Tuple[str, Dict]]) -> TeamSquad:
+    """Construit le TeamSquad d'une équipe depuis ses profils bruts."""
+    players = sorted(players, key=lambda p: p[1].get("total_goals", 0), reverse=True)
+    n = len(players)
+
+    total_goals = np.zeros(n)
+    goals_per_90 = np.zeros(n)
+    xg_per_90 = np.zeros(n)
+    minutes = np.zeros(n)
+    first_rate = np.zeros(n)
+    splits = np.zeros((n, len(TIMING_PERIODS)))
+
+    for i, (_, profile) in enumerate(players):
+        total_goals[i] = profile.get("total_goals", 0) or 0
+        goals_per_90[i], xg_per_90[i], minutes[i] = _estimate_player_rates(profile)
+        first_rate[i] = profile.get("first_goal_rate", 0) or 0
+        splits[i] = [profile.get(f"pct_{period}", 0) or 0 for period in TIMING_PERIODS]
+
+    # Lissage bayésien des splits: petits échantillons → profil ligue
+    observed = splits * total_goals[:, None]
+    timing = (observed + TIMING_PRIOR_GOALS * LEAGUE_GOAL_TIMING) / (
+        observed.sum(axis=1, keepdims=True) + TIMING_PRIOR_GOALS
+    )
+
+    return TeamSquad(
+        team_name=team_name,
+        player_ids=[pid for pid, _ in players],
+        player_names=[p.get("player_name", "Unknown") for _, p in players],
+        timing_profiles=[p.get("timing_profile", "") for _, p in players],
+        total_goals=total_goals,
+        goals_per_90=goals_per_90,
+        xg_per_90=xg_per_90,
+        minutes_expected=minutes,
+        minutes_share=np.minimum(1.0, minutes / 90),
+        first_goal_rate=first_rate,
+        timing_weights=timing,
+        confidence=np.minimum(1.0, total_goals / 10),  # Max confidence à 10 buts
+        eligible=~((total_goals < 1) & (xg_per_90 < 0.1)),
+    )
+
+
 class GoalscorerDataLoader:
-    """Charge et cache les données goalscorer."""
+    """
+    Charge et indexe les données goalscorer.
+
+    Au chargement: un TeamSquad par équipe (clé = nom en minuscules) et un
+    index des stats First GS par nom d'équipe. Les lookups sont ensuite O(1).
+    """
 
     _instance = None
     _profiles: Dict = None
     _team_stats: Dict = None
+    _squads: Dict[str, TeamSquad] = None
+    _team_stats_index: Dict[str, Optional[Dict]] = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -141,15 +261,15 @@ class GoalscorerDataLoader:
         return cls._instance
 
     def load(self) -> bool:
-        """Charge les données."""
+        """Charge les données et construit les index."""
         if self._profiles is not None:
             return True
 
         try:
             # Load profiles
             if PROFILES_FILE.exists():
-                with open(PROFILES_FILE, 'r', encoding='utf-8') as f:
-                    self._profiles = json.load(f)
+                # Store mmap partagé entre workers si converti (dna_store), sinon JSON
+                self._profiles = load_section(PROFILES_FILE)
                 logger.info(f"Loaded {len(self._profiles)} goalscorer profiles")
             else:
                 logger.warning(f"Profiles file not found: {PROFILES_FILE}")
@@ -164,44 +284,66 @@ class GoalscorerDataLoader:
                 logger.warning(f"Team stats file not found: {TEAM_STATS_FILE}")
                 self._team_stats = {}
 
+            self._build_indexes()
             return True
 
         except Exception as e:
             logger.error(f"Error loading goalscorer data: {e}")
             self._profiles = {}
             self._team_stats = {}
+            self._build_indexes()
             return False
 
-    def get_team_players(self, team_name: str) -> List[Dict]:
-        """Retourne tous les joueurs d'une équipe."""
-        if self._profiles is None:
-            self.load()
-
-        players = []
-        team_lower = team_name.lower()
-
+    def _build_indexes(self) -> None:
+        """Regroupe les profils par équipe (un seul passage sur les 876 profils)."""
+        by_team: Dict[str, List[Tuple[str, Dict]]] = {}
+        team_names: Dict[str, str] = {}
         for player_id, profile in self._profiles.items():
-            if profile.get("team_name", "").lower() == team_lower:
-                profile["player_id"] = player_id
-                players.append(profile)
+            team = profile.get("team_name", "")
+            key = team.lower()
+            by_team.setdefault(key, []).append((player_id, profile))
+            team_names.setdefault(key, team)
+
+        self._squads = {
+            key: _build_team_squad(team_names[key], players)
+            for key, players in by_team.items()
+        }
+        self._team_stats_index = {name.lower(): stats for name, stats in self._team_stats.items()}
+        logger.info(f"Indexed {len(self._squads)} goalscorer squads")
+
+    def get_team_squad(self, team_name: str) -> Optional[TeamSquad]:
+        """Retourne l'effectif indexé d'une équipe (None si inconnue)."""
+        if self._squads is None:
+            self.load()
+        return self._squads.get(team_name.lower())
 
-        # Trier par total_goals desc
-        players.sort(key=lambda p: p.get("total_goals", 0), reverse=True)
-        return players
+    def get_team_players(self, team_name: str) -> List[Dict]:
+        """Retourne tous les joueurs d'une équipe (copies, triées par total_goals desc)."""
+        squad = self.get_team_squad(team_name)
+        if squad is None:
+            return []
+        return [
+            {**self._profiles[player_id], "player_id": player_id}
+            for player_id in squad.player_ids
+        ]
 
     def get_team_first_gs_stats(self, team_name: str) -> Optional[Dict]:
         """Retourne les stats First GS d'une équipe."""
-        if self._team_stats is None:
+        if self._team_stats_index is None:
             self.load()
 
-        # Chercher par nom exact ou partiel
+        # Chercher par nom exact ou partiel (résultat mémorisé)
         team_lower = team_name.lower()
+        if team_lower in self._team_stats_index:
+            return self._team_stats_index[team_lower]
 
-        for name, stats in self._team_stats.items():
-            if name.lower() == team_lower or team_lower in name.lower():
-                return stats
-
-        return None
+        stats = None
+        for name, candidate in self._team_stats.items():
+            if team_lower in name.lower():
+                stats = candidate
+                break
+        self._team_stats_index[team_lower] = stats
+        return stats
 
     def get_player_profile(self, player_id: str) -> Optional[Dict]:
         """Retourne le profil d'un joueur."""
@@ -214,171 +356,96 @@ class GoalscorerDataLoader:
 # CALCULATOR
 # ═══════════════════════════════════════════════════════════════════════════
 
-class GoalscorerCalculator:
+def _player_intensities(
+    squad: TeamSquad,
+    team_xg_match: float,
+    team_xg_season_avg: float = 1.5
+) -> np.ndarray:
     """
-    Calcule les probabilités Anytime/First/Last Goalscorer.
+    Intensités de but du match par joueur et par tranche [joueurs × 6].
 
-    Utilise:
-        - Profils individuels des joueurs (goals_per_90, timing, etc.)
-        - Stats équipes (scored_first_rate, top_first_scorers)
-        - xG du match pour ajuster les probabilités
+    λ_i = rate_90 × minutes/90 × facteur xG match, avec rate_90 =
+    max(goals_per_90, 90% xg_per_90), puis plafonnement de la somme de
+    l'effectif à (1 - OTHER_SCORERS_SHARE) × xG équipe.
     """
+    if team_xg_season_avg > 0:
+        match_factor = min(2.0, max(0.5, team_xg_match / team_xg_season_avg))
+    else:
+        match_factor = 1.0
 
-    def __init__(self):
-        self.data = GoalscorerDataLoader()
-        self.data.load()
-        logger.info("GoalscorerCalculator initialisé")
-
-    # ─────────────────────────────────────────────────────────────────────
-    # CORE CALCULATIONS
-    # ─────────────────────────────────────────────────────────────────────
-
-    def _calc_anytime_prob(
-        self,
-        goals_per_90: float,
-        xg_per_90: float,
-        minutes_expected: int,
-        team_xg_match: float,
-        team_xg_season_avg: float = 1.5
-    ) -> float:
-        """
-        Calcule P(Anytime Goalscorer).
+    rate = np.maximum(squad.goals_per_90, squad.xg_per_90 * 0.9)
+    rate = np.where(squad.eligible & (squad.goals_per_90 > 0), rate, 0.0)
+    lam = rate / 90 * squad.minutes_expected * match_factor
 
-        Formule: P = 1 - e^(-λ)
-        où λ = (player_goal_rate) × (minutes/90) × (match_xg_factor)
+    cap = (1 - OTHER_SCORERS_SHARE) * team_xg_match
+    total = lam.sum()
+    if total > cap > 0:
+        lam *= cap / total
 
-        Args:
-            goals_per_90: Buts par 90 minutes du joueur
-            xg_per_90: xG par 90 minutes du joueur
-            minutes_expected: Minutes attendues dans ce match
-            team_xg_match: xG de l'équipe pour ce match
-            team_xg_season_avg: xG moyen de l'équipe en saison
-        """
-        if goals_per_90 <= 0 or minutes_expected <= 0:
-            return 0.0
+    return lam[:, None] * squad.timing_weights
 
-        # Utiliser le max entre goals réels et xG (éviter sous-estimation)
-        player_rate = max(goals_per_90, xg_per_90 * 0.9)  # 90% de xG comme floor
 
-        # Ajuster par le ratio xG match vs saison
-        if team_xg_season_avg > 0:
-            match_factor = team_xg_match / team_xg_season_avg
-            match_factor = max(0.5, min(2.0, match_factor))  # Clip entre 0.5 et 2.0
-        else:
-            match_factor = 1.0
-
-        # Lambda pour Poisson
-        lambda_player = (player_rate / 90) * minutes_expected * match_factor
-
-        # P(au moins 1 but) = 1 - P(0 but) = 1 - e^(-λ)
-        prob = 1 - math.exp(-lambda_player)
-
-        return min(0.95, max(0.001, prob))  # Clip entre 0.1% et 95%
-
-    def _calc_first_gs_prob(
-        self,
-        player_profile: Dict,
-        team_score_first_prob: float,
-        team_players: List[Dict],
-        minutes_expected: int
-    ) -> float:
-        """
-        Calcule P(First Goalscorer).
-
-        Formule:
-        P(First GS) = P(Équipe score 1er)
-                    × P(Joueur | Équipe score 1er)
-                    × timing_adjustment
-                    × minutes_adjustment
-
-        Args:
-            player_profile: Profil du joueur
-            team_score_first_prob: P(équipe marque en premier)
-            team_players: Liste des joueurs de l'équipe
-            minutes_expected: Minutes attendues
-        """
-        if not player_profile or team_score_first_prob <= 0:
-            return 0.0
-
-        # P(Joueur | Équipe score 1er) basé sur first_goal_rate historique
-        first_rate = player_profile.get("first_goal_rate", 0)
-        total_goals = player_profile.get("total_goals", 0)
-
-        if first_rate <= 0 or total_goals < 2:
-            # Fallback: utiliser la part des buts de l'équipe
-            team_total = sum(p.get("total_goals", 0) for p in team_players)
-            if team_total > 0:
-                share = total_goals / team_total
-                first_rate = share  # Approximation simpliste
-            else:
-                return 0.0
-
-        # Timing adjustment
-        timing_profile = player_profile.get("timing_profile", "CONSISTENT")
-        timing_adj = TIMING_ADJUSTMENTS.get(timing_profile, {}).get("first", 1.0)
+def competing_risks(
+    player_lambda: np.ndarray,
+    team_index: np.ndarray,
+    team_xg: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Probabilités anytime / first / last pour tous les joueurs d'un match.
 
-        # Minutes adjustment (moins de minutes = moins de chances)
-        minutes_adj = min(1.0, minutes_expected / 90)
+    Args:
+        player_lambda: Intensités [joueurs × tranches]
+        team_index: Équipe de chaque joueur (0 = domicile, 1 = extérieur)
+        team_xg: xG par équipe [2]
 
-        # Calcul final
-        prob = team_score_first_prob * first_rate * timing_adj * minutes_adj
+    Returns:
+        Dict avec anytime, first, last (par joueur), team_first, team_last
+        (par équipe) et no_goals
+    """
+    n_teams = len(team_xg)
+    periods = player_lambda.shape[1]
 
-        return min(0.50, max(0.001, prob))  # Clip (max 50% pour un seul joueur)
+    # Intensité par équipe: max(xG équipe réparti, somme des joueurs profilés)
+    profiled = np.zeros((n_teams, periods))
+    np.add.at(profiled, team_index, player_lambda)
+    team_lambda = np.maximum(np.outer(team_xg, LEAGUE_GOAL_TIMING), profiled)
 
-    def _calc_last_gs_prob(
-        self,
-        player_profile: Dict,
-        match_has_goals_prob: float,
-        team_players: List[Dict],
-        minutes_expected: int
-    ) -> float:
-        """
-        Calcule P(Last Goalscorer).
+    total = team_lambda.sum(axis=0)                     # Λ_k
+    p_goal_in = -np.expm1(-total)                       # 1 - e^(-Λ_k)
+    cum = np.cumsum(total)
+    survive_before = np.exp(-(cum - total))             # aucun but avant la tranche k
+    none_after = np.exp(-(cum[-1] - cum))               # aucun but après la tranche k
 
-        Formule:
-        P(Last GS) = P(Match a des buts)
-                   × P(Joueur | buts marqués)
-                   × clutch_factor (timing 76-90')
+    with np.errstate(divide="ignore", invalid="ignore"):
+        share_scale = np.where(total > 0, p_goal_in / total, 0.0)
 
-        Args:
-            player_profile: Profil du joueur
-            match_has_goals_prob: P(au moins 1 but dans le match)
-            team_players: Liste des joueurs de l'équipe
-            minutes_expected: Minutes attendues
-        """
-        if not player_profile or match_has_goals_prob <= 0:
-            return 0.0
-
-        # Utiliser last_goal_rate si disponible
-        last_rate = player_profile.get("last_goal_rate", 0)
-        total_goals = player_profile.get("total_goals", 0)
-
-        if last_rate <= 0 or total_goals < 2:
-            # Fallback: utiliser la part des buts
-            team_total = sum(p.get("total_goals", 0) for p in team_players)
-            if team_total > 0:
-                share = total_goals / team_total
-                last_rate = share
-            else:
-                return 0.0
+    first_w = share_scale * survive_before
+    last_w = share_scale * none_after
 
-        # Timing adjustment (CLUTCH players score more late goals)
-        timing_profile = player_profile.get("timing_profile", "CONSISTENT")
-        timing_adj = TIMING_ADJUSTMENTS.get(timing_profile, {}).get("last", 1.0)
+    return {
+        "anytime": -np.expm1(-player_lambda.sum(axis=1)),
+        "first": player_lambda @ first_w,
+        "last": player_lambda @ last_w,
+        "team_first": team_lambda @ first_w,
+        "team_last": team_lambda @ last_w,
+        "no_goals": float(np.exp(-cum[-1])),
+    }
 
-        # Clutch factor basé sur pct_76_90
-        pct_late = player_profile.get("pct_76_90", 0.15)  # Default 15%
-        clutch_factor = 1.0 + (pct_late - 0.15) * 2  # Bonus si > 15%
-        clutch_factor = max(0.7, min(1.5, clutch_factor))
 
-        # Minutes adjustment
-        minutes_adj = min(1.0, minutes_expected / 90)
+class GoalscorerCalculator:
+    """
+    Calcule les probabilités Anytime/First/Last Goalscorer.
 
-        # Calcul final
-        prob = match_has_goals_prob * last_rate * timing_adj * clutch_factor * minutes_adj * 0.5
-        # × 0.5 car on partage avec l'autre équipe
+    Utilise:
+        - Effectifs indexés (TeamSquad: taux par 90, minutes, splits timing)
+        - Stats équipes (scored_first_rate) pour recaler P(équipe marque 1er)
+        - xG du match comme intensité de chaque équipe
+    """
 
-        return min(0.40, max(0.001, prob))
+    def __init__(self):
+        self.data = GoalscorerDataLoader()
+        self.data.load()
+        logger.info("GoalscorerCalculator initialisé")
 
     # ─────────────────────────────────────────────────────────────────────
     # MAIN ANALYZE
@@ -413,62 +480,55 @@ class GoalscorerCalculator:
             expected_total_goals=expected_home_goals + expected_away_goals
         )
 
-        # P(au moins 1 but) = 1 - P(0-0)
-        p_no_goals = math.exp(-(expected_home_goals + expected_away_goals))
-        analysis.no_goals_prob = p_no_goals
-        match_has_goals_prob = 1 - p_no_goals
-
-        # P(équipe score en premier)
-        # Approximation: proportionnel aux xG
-        total_xg = expected_home_goals + expected_away_goals
-        if total_xg > 0:
-            analysis.home_score_first_prob = (expected_home_goals / total_xg) * match_has_goals_prob
-            analysis.away_score_first_prob = (expected_away_goals / total_xg) * match_has_goals_prob
+        squads = [self.data.get_team_squad(home_team), self.data.get_team_squad(away_team)]
+        team_xg = np.array([expected_home_goals, expected_away_goals], dtype=float)
+
+        # Les deux effectifs dans une seule matrice [joueurs × tranches]
+        blocks, team_index = [], []
+        for side, squad in enumerate(squads):
+            if squad is not None and len(squad):
+                blocks.append(_player_intensities(squad, team_xg[side]))
+                team_index.append(np.full(len(squad), side))
+        if blocks:
+            player_lambda = np.vstack(blocks)
+            team_index = np.concatenate(team_index)
+        else:
+            player_lambda = np.zeros((0, len(TIMING_PERIODS)))
+            team_index = np.zeros(0, dtype=int)
 
-        # Enrichir avec stats équipe si disponibles
-        home_stats = self.data.get_team_first_gs_stats(home_team)
-        away_stats = self.data.get_team_first_gs_stats(away_team)
+        probs = competing_risks(player_lambda, team_index, team_xg)
+        analysis.no_goals_prob = probs["no_goals"]
+        match_has_goals_prob = 1 - probs["no_goals"]
+        team_first = probs["team_first"].copy()
 
-        if home_stats and home_stats.get("scored_first_rate", 0) > 0:
-            # Combiner notre estimation avec les données historiques (50/50)
-            hist_rate = home_stats["scored_first_rate"]
-            analysis.home_score_first_prob = (analysis.home_score_first_prob + hist_rate * match_has_goals_prob) / 2
+        # Recaler sur l'historique scored_first_rate (50/50), comme le modèle V1
+        for side, team in enumerate((home_team, away_team)):
+            stats = self.data.get_team_first_gs_stats(team)
+            if stats and stats.get("scored_first_rate", 0) > 0:
+                team_first[side] = (team_first[side] + stats["scored_first_rate"] * match_has_goals_prob) / 2
 
-        if away_stats and away_stats.get("scored_first_rate", 0) > 0:
-            hist_rate = away_stats["scored_first_rate"]
-            analysis.away_score_first_prob = (analysis.away_score_first_prob + hist_rate * match_has_goals_prob) / 2
+        analysis.home_score_first_prob = float(team_first[0])
+        analysis.away_score_first_prob = float(team_first[1])
 
-        # Récupérer les joueurs
-        home_players = self.data.get_team_players(home_team)
-        away_players = self.data.get_team_players(away_team)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            first_scale = np.where(probs["team_first"] > 0, team_first / probs["team_first"], 0.0)
+        first = probs["first"] * first_scale[team_index]
 
         all_player_odds = []
-
-        # Analyser joueurs domicile
-        for player in home_players[:15]:  # Top 15 buteurs
-            odds = self._analyze_player(
-                player=player,
-                team_name=home_team,
-                team_xg_match=expected_home_goals,
-                team_score_first_prob=analysis.home_score_first_prob,
-                team_players=home_players,
-                match_has_goals_prob=match_has_goals_prob
-            )
-            if odds and odds.anytime_prob > 0.01:  # Au moins 1%
-                all_player_odds.append(odds)
-
-        # Analyser joueurs extérieur
-        for player in away_players[:15]:
-            odds = self._analyze_player(
-                player=player,
-                team_name=away_team,
-                team_xg_match=expected_away_goals,
-                team_score_first_prob=analysis.away_score_first_prob,
-                team_players=away_players,
-                match_has_goals_prob=match_has_goals_prob
-            )
-            if odds and odds.anytime_prob > 0.01:
-                all_player_odds.append(odds)
+        offset = 0
+        for side, squad in enumerate(squads):
+            if squad is None or not len(squad):
+                continue
+            team_name = (home_team, away_team)[side]
+            for i in range(min(MAX_PLAYERS_PER_TEAM, len(squad))):
+                row = offset + i
+                anytime = float(probs["anytime"][row])
+                if not squad.eligible[i] or anytime <= 0.01:  # Au moins 1%
+                    continue
+                all_player_odds.append(self._player_odds(
+                    squad, i, team_name, anytime, float(first[row]), float(probs["last"][row])
+                ))
+            offset += len(squad)
 
         analysis.players_analyzed = len(all_player_odds)
 
@@ -491,7 +551,7 @@ class GoalscorerCalculator:
             reverse=True
         )[:top_n]
 
-        logger.info(
+        logger.debug(
             f"Goalscorer analysis: {home_team} vs {away_team} - "
             f"{len(all_player_odds)} players, "
             f"Home 1st: {analysis.home_score_first_prob:.1%}, "
@@ -500,79 +560,36 @@ class GoalscorerCalculator:
 
         return analysis
 
-    def _analyze_player(
+    def analyze_slate(
         self,
-        player: Dict,
-        team_name: str,
-        team_xg_match: float,
-        team_score_first_prob: float,
-        team_players: List[Dict],
-        match_has_goals_prob: float
-    ) -> Optional[PlayerGoalscorerOdds]:
-        """Analyse un joueur individuel."""
-
-        player_id = player.get("player_id", "")
-        player_name = player.get("player_name", "Unknown")
-
-        goals_per_90 = player.get("goals_per_90", 0)
-        xg_per_90 = player.get("xg_per_90", 0)
-        total_goals = player.get("total_goals", 0)
-        total_xg = player.get("total_xg", 0)
-        minutes_played = player.get("minutes_played", 0)
-        matches_with_goal = player.get("matches_with_goal", 0)
-
-        # Estimer goals_per_90 si non disponible (pas de FBRef)
-        if goals_per_90 <= 0 and total_goals > 0:
-            # Estimation: suppose ~70 min par match en moyenne pour buteurs
-            estimated_minutes = matches_with_goal * 70 if matches_with_goal > 0 else total_goals * 90
-            goals_per_90 = (total_goals / estimated_minutes) * 90 if estimated_minutes > 0 else 0
-            logger.debug(f"{player_name}: estimated goals_per_90 = {goals_per_90:.3f}")
-
-        # Estimer xg_per_90 si non disponible
-        if xg_per_90 <= 0 and total_xg > 0:
-            estimated_minutes = matches_with_goal * 70 if matches_with_goal > 0 else total_goals * 90
-            xg_per_90 = (total_xg / estimated_minutes) * 90 if estimated_minutes > 0 else 0
-
-        # Estimer minutes attendues
-        if minutes_played >= 450:  # ~5 matchs complets
-            avg_minutes = minutes_played / max(1, matches_with_goal * 1.5)
-            minutes_expected = min(90, max(30, avg_minutes))
-        else:
-            minutes_expected = DEFAULT_MINUTES if total_goals >= 3 else SUB_MINUTES
-
-        # Confidence basée sur sample size
-        confidence = min(1.0, total_goals / 10)  # Max confidence à 10 buts
-
-        # Skip si pas assez de données
-        if total_goals < 1 and xg_per_90 < 0.1:
-            return None
-
-        # Calculer probabilités
-        anytime = self._calc_anytime_prob(
-            goals_per_90=goals_per_90,
-            xg_per_90=xg_per_90,
-            minutes_expected=int(minutes_expected),
-            team_xg_match=team_xg_match
-        )
-
-        first_gs = self._calc_first_gs_prob(
-            player_profile=player,
-            team_score_first_prob=team_score_first_prob,
-            team_players=team_players,
-            minutes_expected=int(minutes_expected)
-        )
-
-        last_gs = self._calc_last_gs_prob(
-            player_profile=player,
-            match_has_goals_prob=match_has_goals_prob,
-            team_players=team_players,
-            minutes_expected=int(minutes_expected)
-        )
+        matches: Sequence[Tuple[str, str, float, float]],
+        top_n: int = 10
+    ) -> List[MatchGoalscorerAnalysis]:
+        """
+        Analyse goalscorer d'un slate complet (scan player props).
 
-        # Créer odds object
-        odds = PlayerGoalscorerOdds(
-            player_id=player_id,
-            player_name=player_name,
+        Args:
+            matches: (home_team, away_team, expected_home_goals, expected_away_goals)
+            top_n: Nombre de joueurs par marché et par match
+        """
+        return [
+            self.analyze_match(home, away, xg_home, xg_away, top_n=top_n)
+            for home, away, xg_home, xg_away in matches
+        ]
+
+    @staticmethod
+    def _player_odds(
+        squad: TeamSquad,
+        i: int,
+        team_name: str,
+        anytime: float,
+        first_gs: float,
+        last_gs: float
+    ) -> PlayerGoalscorerOdds:
+        """Assemble le PlayerGoalscorerOdds du joueur i de l'effectif."""
+        return PlayerGoalscorerOdds(
+            player_id=squad.player_ids[i],
+            player_name=squad.player_names[i],
             team_name=team_name,
             anytime_prob=anytime,
             first_gs_prob=first_gs,
@@ -580,16 +597,14 @@ class GoalscorerCalculator:
             anytime_fair_odds=1/anytime if anytime > 0 else 0,
             first_gs_fair_odds=1/first_gs if first_gs > 0 else 0,
             last_gs_fair_odds=1/last_gs if last_gs > 0 else 0,
-            goals_per_90=goals_per_90,
-            xg_per_90=xg_per_90,
-            minutes_expected=int(minutes_expected),
-            first_goal_rate=player.get("first_goal_rate", 0),
-            timing_profile=player.get("timing_profile", ""),
-            confidence=confidence
+            goals_per_90=float(squad.goals_per_90[i]),
+            xg_per_90=float(squad.xg_per_90[i]),
+            minutes_expected=int(squad.minutes_expected[i]),
+            first_goal_rate=float(squad.first_goal_rate[i]),
+            timing_profile=squad.timing_profiles[i],
+            confidence=float(squad.confidence[i])
         )
 
-        return odds
-
 
 # ═══════════════════════════════════════════════════════════════════════════
 # SINGLETON
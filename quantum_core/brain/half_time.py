@@ -236,26 +236,17 @@ class HalfTimeCalculator:
         p_away_0_ht = self._poisson_pmf(0, expected_away_ht)
         p_0_0_ht = p_home_0_ht * p_away_0_ht
         
-        # Calculer P(Home > Away at HT) et P(Away > Home at HT)
-        ht_home_win = 0.0
-        ht_draw = 0.0
-        ht_away_win = 0.0
+        # Matrice des scores HT (0-4 goals max par équipe), renormalisée.
+        # Un seul match: boucle scalaire sur 5 PMF par équipe (score_engine
+        # est fait pour les slates, son overhead NumPy domine sur 5 × 5)
+        pmf_home = [self._poisson_pmf(k, expected_home_ht) for k in range(5)]
+        pmf_away = [self._poisson_pmf(k, expected_away_ht) for k in range(5)]
+        ht_home_win = ht_draw = ht_away_win = 0.0
+        for home, p_home in enumerate(pmf_home):
+            ht_draw += p_home * pmf_away[home]
+            ht_home_win += p_home * sum(pmf_away[:home])
+            ht_away_win += p_home * sum(pmf_away[home + 1:])
         
-        # Matrice des scores HT (0-4 goals max par équipe)
-        for home in range(5):
-            for away in range(5):
-                p_home = self._poisson_pmf(home, expected_home_ht)
-                p_away = self._poisson_pmf(away, expected_away_ht)
-                p_score = p_home * p_away
-                
-                if home > away:
-                    ht_home_win += p_score
-                elif home == away:
-                    ht_draw += p_score
-                else:
-                    ht_away_win += p_score
-        
-        # Normaliser
         total = ht_home_win + ht_draw + ht_away_win
         if total > 0:
             ht_home_win /= total
@@ -0,0 +1,347 @@
+"""
+Instrumentation UnifiedBrain - Spans par etape + profiler echantillonne
+===============================================================================
+
+OBJECTIF:
+    Savoir OU part la latence de analyze_match: I/O DataHubAdapter, chaque
+    engine, fusion, les 15 calculateurs de marches, edges ou Kelly.
+
+COMPOSANTS:
+    1. AnalysisTrace -> chronometre a checkpoints (un span par etape)
+    2. Tracer -> NoOpTracer (defaut) ou OpenTelemetryTracer (si installe)
+    3. Sinks -> callbacks recevant chaque trace (ex: histogrammes Prometheus)
+    4. SamplingProfiler -> echantillonne la pile du thread d'analyse et
+       logge les fonctions dominantes quand l'analyse depasse un seuil
+
+COUT PAR DEFAUT:
+    Sans sink, sans OTel et sans profiler: un perf_counter_ns par etape.
+
+ACTIVATION (variables d'environnement):
+    BRAIN_OTEL_ENABLED=1           -> export des spans OpenTelemetry
+    BRAIN_PROFILE_SLOW_MS=250      -> profiler actif, dump si analyse > 250ms
+    BRAIN_PROFILE_INTERVAL_MS=1    -> periode d'echantillonnage
+
+Auteur: Mon_PS Quant Team
+Version: 1.0.0
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# ===============================================================================
+# SPANS
+# ===============================================================================
+
+@dataclass
+class StageSpan:
+    """Une etape chronometree de l'analyse."""
+    name: str
+    start_ns: int
+    end_ns: int
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+@dataclass
+class AnalysisTrace:
+    """
+    Trace d'une analyse: suite de spans contigus delimites par checkpoint().
+
+    Usage:
+        trace = instrumentation.start("Liverpool", "Arsenal")
+        ... travail ...
+        trace.checkpoint("data_hub")      # span [debut, maintenant]
+        ... travail ...
+        trace.checkpoint("engines")       # span [checkpoint precedent, maintenant]
+        instrumentation.finish(trace)
+    """
+    home: str
+    away: str
+    start_ns: int = field(default_factory=time.perf_counter_ns)
+    wall_start_ns: int = field(default_factory=time.time_ns)
+    spans: List[StageSpan] = field(default_factory=list)
+    end_ns: Optional[int] = None
+    profile: Optional[List[Tuple[str, int, int]]] = None
+    failed: bool = False
+    _last_ns: int = 0
+
+    def __post_init__(self):
+        self._last_ns = self.start_ns
+
+    def checkpoint(self, stage: str) -> None:
+        """Clot l'etape courante sous le nom `stage`."""
+        now = time.perf_counter_ns()
+        self.spans.append(StageSpan(stage, self._last_ns, now))
+        self._last_ns = now
+
+    def skip(self) -> None:
+        """Ignore le temps ecoule depuis le dernier checkpoint (travail non attribue)."""
+        self._last_ns = time.perf_counter_ns()
+
+    @property
+    def total_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return (end - self.start_ns) / 1e6
+
+    def stage_timings(self) -> Dict[str, float]:
+        """Durees par etape (ms); les etapes repetees sont cumulees."""
+        timings: Dict[str, float] = {}
+        for span in self.spans:
+            timings[span.name] = timings.get(span.name, 0.0) + span.duration_ms
+        return timings
+
+    def to_wall_ns(self, perf_ns: int) -> int:
+        """Convertit un instant perf_counter en epoch ns (pour OTel)."""
+        return self.wall_start_ns + (perf_ns - self.start_ns)
+
+
+# ===============================================================================
+# TRACERS
+# ===============================================================================
+
+class NoOpTracer:
+    """Tracer par defaut: n'exporte rien."""
+
+    enabled = False
+
+    def export(self, trace: AnalysisTrace) -> None:
+        return None
+
+
+class OpenTelemetryTracer:
+    """
+    Exporte chaque analyse comme un span parent + un span enfant par etape.
+
+    Les spans sont crees a posteriori avec des timestamps explicites: aucun
+    contexte OTel n'est maintenu pendant l'analyse elle-meme.
+    """
+
+    enabled = True
+
+    def __init__(self, service_name: str = "unified-brain"):
+        from opentelemetry import trace as otel_trace
+
+        self._otel = otel_trace
+        self._tracer = otel_trace.get_tracer(service_name)
+
+    def export(self, trace: AnalysisTrace) -> None:
+        end_ns = trace.end_ns if trace.end_ns is not None else time.perf_counter_ns()
+        parent = self._tracer.start_span(
+            "unified_brain.analyze_match",
+            start_time=trace.wall_start_ns,
+            attributes={"brain.home": trace.home, "brain.away": trace.away, "brain.failed": trace.failed},
+        )
+        ctx = self._otel.set_span_in_context(parent)
+        for span in trace.spans:
+            child = self._tracer.start_span(
+                f"brain.{span.name}", context=ctx, start_time=trace.to_wall_ns(span.start_ns)
+            )
+            child.end(end_time=trace.to_wall_ns(span.end_ns))
+        parent.end(end_time=trace.to_wall_ns(end_ns))
+
+
+def build_tracer(enabled: bool) -> object:
+    """OpenTelemetryTracer si demande et disponible, sinon NoOpTracer."""
+    if not enabled:
+        return NoOpTracer()
+    try:
+        return OpenTelemetryTracer()
+    except ImportError:
+        logger.warning("opentelemetry non installe - spans brain non exportes")
+        return NoOpTracer()
+
+
+# ===============================================================================
+# PROFILER ECHANTILLONNE
+# ===============================================================================
+
+class SamplingProfiler:
+    """
+    Profiler statistique: un thread lit la pile du thread cible a intervalle fixe.
+
+    Contrairement a cProfile, le cout ne depend pas du nombre d'appels: le
+    thread d'analyse n'est pas instrumente, seulement observe. Seules les
+    frames sous `root_frame` sont comptees (pas la pile FastAPI/pytest).
+    La resolution reelle est bornee par sys.getswitchinterval() (GIL, 5ms).
+    """
+
+    def __init__(self, interval_s: float = 0.001, root_frame=None):
+        self.interval_s = interval_s
+        self._root = root_frame
+        self._self_samples: Counter = Counter()
+        self._total_samples: Counter = Counter()
+        self._n_samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._target_id: Optional[int] = None
+
+    def start(self) -> None:
+        self._target_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="brain-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    @property
+    def n_samples(self) -> int:
+        return self._n_samples
+
+    def top(self, n: int) -> List[Tuple[str, int, int]]:
+        """Top fonctions (nom, echantillons propres, echantillons inclusifs) par temps inclusif."""
+        return [
+            (func, self._self_samples[func], total)
+            for func, total in self._total_samples.most_common(n)
+        ]
+
+    def _run(self) -> None:
+        stop_at = self._root.f_back if self._root is not None else None
+        while not self._stop.wait(self.interval_s):
+            frame = sys._current_frames().get(self._target_id)
+            if frame is None:
+                continue
+            self._n_samples += 1
+            leaf = True
+            seen = set()
+            while frame is not None and frame is not stop_at:
+                code = frame.f_code
+                key = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                if leaf:
+                    self._self_samples[key] += 1
+                    leaf = False
+                # Recursion: une fonction compte une fois par echantillon
+                if key not in seen:
+                    self._total_samples[key] += 1
+                    seen.add(key)
+                frame = frame.f_back
+
+
+# ===============================================================================
+# FACADE
+# ===============================================================================
+
+class BrainInstrumentation:
+    """
+    Point d'entree unique utilise par UnifiedBrain.
+
+    Args:
+        tracer: Exporteur de spans (NoOpTracer par defaut)
+        slow_threshold_ms: Seuil de dump du profiler (None = profiler inactif)
+        profile_interval_ms: Periode d'echantillonnage du profiler
+        top_n: Nombre de fonctions loggees par dump
+    """
+
+    def __init__(
+        self,
+        tracer: Optional[object] = None,
+        slow_threshold_ms: Optional[float] = None,
+        profile_interval_ms: float = 1.0,
+        top_n: int = 15,
+    ):
+        self.tracer = tracer or NoOpTracer()
+        self.slow_threshold_ms = slow_threshold_ms
+        self.profile_interval_ms = profile_interval_ms
+        self.top_n = top_n
+        self._sinks: List[Callable[[AnalysisTrace], None]] = []
+        self._profilers = threading.local()
+
+    @classmethod
+    def from_env(cls) -> "BrainInstrumentation":
+        """Configuration via BRAIN_OTEL_ENABLED / BRAIN_PROFILE_SLOW_MS / BRAIN_PROFILE_INTERVAL_MS."""
+        otel = os.getenv("BRAIN_OTEL_ENABLED", "0").lower() in ("1", "true", "yes")
+        slow = os.getenv("BRAIN_PROFILE_SLOW_MS")
+        return cls(
+            tracer=build_tracer(otel),
+            slow_threshold_ms=float(slow) if slow else None,
+            profile_interval_ms=float(os.getenv("BRAIN_PROFILE_INTERVAL_MS", "1")),
+        )
+
+    # -------------------------------------------------------------------
+    # Configuration
+    # -------------------------------------------------------------------
+
+    def add_sink(self, sink: Callable[[AnalysisTrace], None]) -> None:
+        """Enregistre un callback appele avec chaque trace terminee."""
+        if sink not in self._sinks:
+            self._sinks.append(sink)
+
+    def remove_sink(self, sink: Callable[[AnalysisTrace], None]) -> None:
+        if sink in self._sinks:
+            self._sinks.remove(sink)
+
+    def enable_profiler(self, slow_threshold_ms: float, interval_ms: float = 1.0) -> None:
+        """Active le profiler echantillonne (dump des analyses > seuil)."""
+        self.slow_threshold_ms = slow_threshold_ms
+        self.profile_interval_ms = interval_ms
+
+    def disable_profiler(self) -> None:
+        self.slow_threshold_ms = None
+
+    # -------------------------------------------------------------------
+    # Cycle de vie d'une analyse
+    # -------------------------------------------------------------------
+
+    def start(self, home: str, away: str) -> AnalysisTrace:
+        """Demarre la trace (et le profiler si actif) pour le thread courant."""
+        if self.slow_threshold_ms is not None:
+            profiler = SamplingProfiler(self.profile_interval_ms / 1000.0, root_frame=sys._getframe(1))
+            profiler.start()
+            self._profilers.current = profiler
+        return AnalysisTrace(home=home, away=away)
+
+    def finish(self, trace: AnalysisTrace) -> AnalysisTrace:
+        """Clot la trace, exporte les spans et alimente les sinks."""
+        trace.end_ns = time.perf_counter_ns()
+
+        profiler = getattr(self._profilers, "current", None)
+        if profiler is not None:
+            self._profilers.current = None
+            profiler.stop()
+            if self.slow_threshold_ms is not None and trace.total_ms >= self.slow_threshold_ms:
+                trace.profile = profiler.top(self.top_n)
+                self._log_slow_analysis(trace, profiler.n_samples)
+
+        if self.tracer.enabled:
+            try:
+                self.tracer.export(trace)
+            except Exception as e:
+                logger.debug(f"Export spans brain echoue: {e}")
+
+        return self.emit(trace)
+
+    def emit(self, trace: AnalysisTrace) -> AnalysisTrace:
+        """Alimente les sinks avec une trace close (ex: renvoyee par le brain worker)."""
+        for sink in self._sinks:
+            try:
+                sink(trace)
+            except Exception as e:
+                logger.debug(f"Sink instrumentation echoue: {e}")
+
+        return trace
+
+    def _log_slow_analysis(self, trace: AnalysisTrace, total_samples: int) -> None:
+        stages = sorted(trace.stage_timings().items(), key=lambda kv: kv[1], reverse=True)
+        lines = [
+            f"Analyse lente {trace.home} vs {trace.away}: {trace.total_ms:.1f}ms "
+            f"(seuil {self.slow_threshold_ms:.0f}ms)",
+            "  Etapes: " + ", ".join(f"{name}={ms:.1f}ms" for name, ms in stages[:8]),
+            f"  Top fonctions ({total_samples} echantillons, propre / inclusif):",
+        ]
+        for func, own, inclusive in trace.profile or []:
+            share = inclusive / total_samples if total_samples else 0.0
+            lines.append(f"    {own:>5} {inclusive:>5} {share:>6.1%}  {func}")
+        logger.warning("\n".join(lines))
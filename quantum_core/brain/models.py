@@ -810,6 +810,7 @@ class MatchPrediction:
     # Metadata
     model_version: str = "UnifiedBrain_v2.8"
     markets_count: int = 99
+    stage_timings_ms: Dict[str, float] = field(default_factory=dict)
 
     def get_best_edges(self, min_edge: float = 0.02) -> List[MarketEdge]:
         """Retourne les meilleurs edges au-dessus du seuil."""
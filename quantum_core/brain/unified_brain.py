@@ -21,7 +21,7 @@ ARCHITECTURE V2.8:
     16. ToScoreInHalfCalculator -> 4 marches To Score in Half
     17. TeamTotalsCalculator -> 6 marches Team Totals (V2.8)
     18. BayesianFusion -> Fusion probabilites
-    19. EdgeCalculator -> Calcul edges avec LIQUIDITY_TAX par marche
+    19. EdgeScan -> Edges vectorises (LIQUIDITY_TAX par marche, scan_slate pour N matchs)
     20. KellySizer -> Sizing optimal
 
 99 MARCHES SUPPORTES:
@@ -82,6 +82,9 @@ from .score_both_halves import ScoreInBothHalvesCalculator
 from .clean_sheet import CleanSheetCalculator
 from .to_score_half import ToScoreInHalfCalculator
 from .team_totals import TeamTotalsCalculator, TeamTotalsAnalysis
+from .instrumentation import AnalysisTrace, BrainInstrumentation
+from .edge_scan import EdgeScan, market_edges, odds_matrix, probability_matrix, scan_edges
+from quantum_core.probability.score_engine import score_matrix
 
 # Logging
 logging.basicConfig(level=logging.INFO)
@@ -270,6 +273,18 @@ class UnifiedBrain:
 
     VERSION = "2.8.0"
 
+    # engine -> (module, classe, besoin du DataHubAdapter)
+    ENGINE_MAP = {
+        "matchup": ("quantum.chess_engine.engines.matchup_engine", "MatchupEngine", True),
+        "corner": ("quantum.chess_engine.engines.corner_engine", "CornerEngine", False),
+        "card": ("quantum.chess_engine.engines.card_engine", "CardEngine", False),
+        "coach": ("quantum.chess_engine.engines.coach_engine", "CoachEngine", True),
+        "referee": ("quantum.chess_engine.engines.referee_engine", "RefereeEngine", True),
+        "variance": ("quantum.chess_engine.engines.variance_engine", "VarianceEngine", True),
+        "pattern": ("quantum.chess_engine.engines.pattern_engine", "PatternEngine", True),
+        "chain": ("quantum.chess_engine.engines.chain_engine", "ChainEngine", True),
+    }
+
     def __init__(self):
         """Initialise le cerveau avec lazy loading."""
         self._data_hub_adapter = None
@@ -304,6 +319,9 @@ class UnifiedBrain:
             "markets_processed": 0,
         }
 
+        # Spans par etape (no-op par defaut, OTel/profiler via env)
+        self._instrumentation = BrainInstrumentation.from_env()
+
         logger.info("UnifiedBrain V2.7 initialise (lazy mode)")
 
     # ===========================================================================
@@ -351,26 +369,27 @@ class UnifiedBrain:
         self._initialized = True
         logger.info("UnifiedBrain V2.7 pret - 93 marches")
 
+    def warm_up(self) -> Dict:
+        """
+        Charge tout d'avance: composants, 8 engines et donnees DataHub.
+        Utilise par le worker persistant pour ne payer l'initialisation qu'une fois.
+        """
+        self._ensure_initialized()
+        if hasattr(self._data_hub_adapter, "load_all"):
+            self._data_hub_adapter.load_all()
+        loaded = [name for name in self.ENGINE_MAP if self._load_engine(name) is not None]
+        logger.info(f"UnifiedBrain prechauffe: {len(loaded)}/{len(self.ENGINE_MAP)} engines")
+        return {"engines_loaded": loaded}
+
     def _load_engine(self, engine_name: str):
         """Charge un engine de maniere lazy."""
         if engine_name in self._engines:
             return self._engines[engine_name]
 
-        engine_map = {
-            "matchup": ("quantum.chess_engine.engines.matchup_engine", "MatchupEngine", True),
-            "corner": ("quantum.chess_engine.engines.corner_engine", "CornerEngine", False),
-            "card": ("quantum.chess_engine.engines.card_engine", "CardEngine", False),
-            "coach": ("quantum.chess_engine.engines.coach_engine", "CoachEngine", True),
-            "referee": ("quantum.chess_engine.engines.referee_engine", "RefereeEngine", True),
-            "variance": ("quantum.chess_engine.engines.variance_engine", "VarianceEngine", True),
-            "pattern": ("quantum.chess_engine.engines.pattern_engine", "PatternEngine", True),
-            "chain": ("quantum.chess_engine.engines.chain_engine", "ChainEngine", True),
-        }
-
-        if engine_name not in engine_map:
+        if engine_name not in self.ENGINE_MAP:
             return None
 
-        module_path, class_name, needs_hub = engine_map[engine_name]
+        module_path, class_name, needs_hub = self.ENGINE_MAP[engine_name]
         try:
             import importlib
             module = importlib.import_module(module_path)
@@ -412,8 +431,31 @@ class UnifiedBrain:
         Returns:
             MatchPrediction avec 93 marches de probabilites et recommandations
         """
+        trace = self._instrumentation.start(home, away)
+        try:
+            prediction = self._analyze_stages(trace, home, away, referee, market_odds, bankroll)
+        except Exception:
+            trace.failed = True
+            raise
+        finally:
+            self._instrumentation.finish(trace)
+
+        prediction.stage_timings_ms = trace.stage_timings()
+        return prediction
+
+    def _analyze_stages(
+        self,
+        trace: AnalysisTrace,
+        home: str,
+        away: str,
+        referee: str,
+        market_odds: Optional[Dict[str, float]],
+        bankroll: float
+    ) -> MatchPrediction:
+        """Corps de analyze_match: chaque etape ferme son span via trace.checkpoint()."""
         self._ensure_initialized()
         self._stats["matches_analyzed"] += 1
+        trace.checkpoint("init")
 
         logger.info(f"Analyse V2.7: {home} vs {away}")
 
@@ -439,10 +481,12 @@ class UnifiedBrain:
             prediction.expected_goals = friction.get("predicted_goals", prediction.expected_goals)
             prediction.btts_prob = friction.get("btts_prob", 0.50)
 
+        trace.checkpoint("data_hub")
+
         # -------------------------------------------------------------------
         # ETAPE 2: Executer tous les engines
         # -------------------------------------------------------------------
-        engine_outputs = self._run_all_engines(home, away, matchup_data, referee)
+        engine_outputs = self._run_all_engines(home, away, matchup_data, referee, trace)
         prediction.engine_outputs = engine_outputs
         prediction.engines_used = [name for name, out in engine_outputs.items() if out.success]
         prediction.engines_failed = [name for name, out in engine_outputs.items() if not out.success]
@@ -466,10 +510,13 @@ class UnifiedBrain:
         prediction.corners_expected = base_probs.get("corners_expected", 10.0)
         prediction.cards_expected = base_probs.get("cards_expected", 4.0)
 
-        # Expected home/away goals (estimation simple)
-        prediction.expected_home_goals = prediction.expected_goals * (prediction.home_win_prob + 0.1)
+        # Expected home/away goals (part des ratings, sinon estimation simple)
+        home_share = base_probs.get("home_goals_share", prediction.home_win_prob + 0.1)
+        prediction.expected_home_goals = prediction.expected_goals * home_share
         prediction.expected_away_goals = prediction.expected_goals - prediction.expected_home_goals
 
+        trace.checkpoint("fusion")
+
         # -------------------------------------------------------------------
         # ETAPE 4: Calculer Double Chance et DNB
         # -------------------------------------------------------------------
@@ -490,6 +537,8 @@ class UnifiedBrain:
         prediction.dnb_home_prob = dnb_probs["dnb_home"]
         prediction.dnb_away_prob = dnb_probs["dnb_away"]
 
+        trace.checkpoint("derived")
+
         # -------------------------------------------------------------------
         # ETAPE 5: Calculer Over/Under avec Poisson
         # -------------------------------------------------------------------
@@ -526,6 +575,8 @@ class UnifiedBrain:
         prediction.cards_under_35_prob = cards_probs["under_35"]
         prediction.cards_under_45_prob = cards_probs["under_45"]
 
+        trace.checkpoint("poisson")
+
         # -------------------------------------------------------------------
         # ETAPE 5b: Calculer Correct Score (Top 10)
         # -------------------------------------------------------------------
@@ -539,6 +590,8 @@ class UnifiedBrain:
         }
         prediction.top_scores = [pred.score_str for pred in cs_analysis.top_scores]
 
+        trace.checkpoint("calc.correct_score")
+
         # -------------------------------------------------------------------
         # ETAPE 5c: Calculer Half-Time (6 marchés)
         # -------------------------------------------------------------------
@@ -562,6 +615,8 @@ class UnifiedBrain:
         prediction.ht_btts_prob = ht_analysis.ht_btts_prob
         prediction.expected_ht_goals = ht_analysis.expected_ht_goals
 
+        trace.checkpoint("calc.half_time")
+
         # -------------------------------------------------------------------
         # ETAPE 5d: Calculer Asian Handicap (8 marchés)
         # -------------------------------------------------------------------
@@ -579,6 +634,8 @@ class UnifiedBrain:
         prediction.ah_home_m20_prob = ah_analysis.ah_home_m20_prob
         prediction.ah_away_p20_prob = ah_analysis.ah_away_p20_prob
 
+        trace.checkpoint("calc.asian_handicap")
+
         # -------------------------------------------------------------------
         # ETAPE 5e: Calculer Goal Range (4 marchés)
         # -------------------------------------------------------------------
@@ -589,6 +646,8 @@ class UnifiedBrain:
         prediction.goals_4_5_prob = gr_analysis.goals_4_5_prob
         prediction.goals_6_plus_prob = gr_analysis.goals_6_plus_prob
 
+        trace.checkpoint("calc.goal_range")
+
         # -------------------------------------------------------------------
         # ETAPE 5f: Calculer Double Result (9 marchés)
         # -------------------------------------------------------------------
@@ -611,6 +670,8 @@ class UnifiedBrain:
         prediction.dr_2_x_prob = dr_analysis.ht_away_ft_draw_prob
         prediction.dr_2_2_prob = dr_analysis.ht_away_ft_away_prob
 
+        trace.checkpoint("calc.double_result")
+
         # -------------------------------------------------------------------
         # ETAPE 5g: Calculer Win to Nil (4 marchés)
         # -------------------------------------------------------------------
@@ -627,6 +688,8 @@ class UnifiedBrain:
         prediction.away_win_to_nil_prob = wtn_analysis.away_win_to_nil_yes
         prediction.away_win_to_nil_no_prob = wtn_analysis.away_win_to_nil_no
 
+        trace.checkpoint("calc.win_to_nil")
+
         # -------------------------------------------------------------------
         # ETAPE 5h: Calculer Odd/Even (2 marches)
         # -------------------------------------------------------------------
@@ -634,6 +697,8 @@ class UnifiedBrain:
         prediction.odd_goals_prob = oe_analysis.odd_goals_prob
         prediction.even_goals_prob = oe_analysis.even_goals_prob
 
+        trace.checkpoint("calc.odd_even")
+
         # -------------------------------------------------------------------
         # ETAPE 5i: Calculer Exact Goals (6 marches)
         # -------------------------------------------------------------------
@@ -645,6 +710,8 @@ class UnifiedBrain:
         prediction.exactly_4_goals_prob = eg_analysis.exactly_4_prob
         prediction.goals_5_plus_prob = eg_analysis.goals_5_plus_prob
 
+        trace.checkpoint("calc.exact_goals")
+
         # -------------------------------------------------------------------
         # ETAPE 5j: Calculer BTTS Both Halves (2 marches)
         # -------------------------------------------------------------------
@@ -655,6 +722,8 @@ class UnifiedBrain:
         prediction.btts_both_halves_yes_prob = bbh_analysis.btts_both_halves_yes
         prediction.btts_both_halves_no_prob = bbh_analysis.btts_both_halves_no
 
+        trace.checkpoint("calc.btts_both_halves")
+
         # -------------------------------------------------------------------
         # ETAPE 5k: Calculer Score Both Halves (2 marches)
         # -------------------------------------------------------------------
@@ -662,6 +731,8 @@ class UnifiedBrain:
         prediction.score_both_halves_yes_prob = sbh_analysis.score_both_halves_yes
         prediction.score_both_halves_no_prob = sbh_analysis.score_both_halves_no
 
+        trace.checkpoint("calc.score_both_halves")
+
         # -------------------------------------------------------------------
         # ETAPE 5l: Calculer Clean Sheet (2 marches)
         # -------------------------------------------------------------------
@@ -672,6 +743,8 @@ class UnifiedBrain:
         prediction.home_clean_sheet_yes_prob = cs_analysis.home_clean_sheet_yes
         prediction.away_clean_sheet_yes_prob = cs_analysis.away_clean_sheet_yes
 
+        trace.checkpoint("calc.clean_sheet")
+
         # -------------------------------------------------------------------
         # ETAPE 5m: Calculer To Score in Half (4 marches)
         # -------------------------------------------------------------------
@@ -684,6 +757,8 @@ class UnifiedBrain:
         prediction.away_to_score_1h_prob = tsh_analysis.away_to_score_1h
         prediction.away_to_score_2h_prob = tsh_analysis.away_to_score_2h
 
+        trace.checkpoint("calc.to_score_half")
+
         # -------------------------------------------------------------------
         # ETAPE 5n: Calculer Team Totals (6 marches) - V2.8
         # -------------------------------------------------------------------
@@ -702,6 +777,8 @@ class UnifiedBrain:
 
         self._stats["markets_processed"] += 99
 
+        trace.checkpoint("calc.team_totals")
+
         # -------------------------------------------------------------------
         # ETAPE 6: Calculer les edges (si cotes fournies)
         # -------------------------------------------------------------------
@@ -713,6 +790,8 @@ class UnifiedBrain:
             positive_edges = [e for e in edges.values() if e.edge_after_liquidity > 0.01]
             self._stats["edges_found"] += len(positive_edges)
 
+        trace.checkpoint("edges")
+
         # -------------------------------------------------------------------
         # ETAPE 7: Generer les recommandations Kelly
         # -------------------------------------------------------------------
@@ -732,6 +811,8 @@ class UnifiedBrain:
             # Meilleur par categorie
             prediction.best_bets_by_category = self._find_best_by_category(recommendations)
 
+        trace.checkpoint("kelly")
+
         # -------------------------------------------------------------------
         # ETAPE 8: Calculer la confiance globale
         # -------------------------------------------------------------------
@@ -741,6 +822,7 @@ class UnifiedBrain:
         logger.info(f"Analyse V2.7 terminee: {len(prediction.engines_used)} engines, "
                    f"93 marches, qualite {prediction.data_quality_score:.1%}")
 
+        trace.checkpoint("quality")
         return prediction
 
     # ===========================================================================
@@ -752,9 +834,10 @@ class UnifiedBrain:
         home: str,
         away: str,
         matchup_data: Dict,
-        referee: str = None
+        referee: str = None,
+        trace: Optional[AnalysisTrace] = None
     ) -> Dict[str, EngineOutput]:
-        """Execute tous les engines et collecte les outputs."""
+        """Execute tous les engines et collecte les outputs (un span par engine si trace)."""
         outputs = {}
 
         home_data = matchup_data.get("home_team", {})
@@ -809,6 +892,9 @@ class UnifiedBrain:
                     error="Engine not available"
                 )
 
+            if trace is not None:
+                trace.checkpoint(f"engine.{name}")
+
         return outputs
 
     def _fuse_probabilities(
@@ -829,6 +915,21 @@ class UnifiedBrain:
             "cards_expected": 4.0,
         }
 
+        # Ratings Dixon-Coles ajustes: base 1X2/BTTS/buts issue de la grille
+        # des scores (remplace les priors fixes et l'heuristique matchup)
+        rating_lambdas = matchup_data.get("rating_lambdas")
+        if rating_lambdas:
+            lambda_home, lambda_away = rating_lambdas["home"], rating_lambdas["away"]
+            grid = score_matrix(lambda_home, lambda_away, rho=rating_lambdas.get("rho", 0.0))
+            probs.update({
+                "home_win": float(grid.home_win()),
+                "draw": float(grid.draw()),
+                "away_win": float(grid.away_win()),
+                "btts": float(grid.btts_yes()),
+                "expected_goals": lambda_home + lambda_away,
+                "home_goals_share": lambda_home / (lambda_home + lambda_away),
+            })
+
         for name, output in engine_outputs.items():
             if not output.success:
                 continue
@@ -836,7 +937,7 @@ class UnifiedBrain:
             data = output.data
 
             # MatchupEngine
-            if name == "matchup":
+            if name == "matchup" and not rating_lambdas:
                 if "home_attack_edge" in data:
                     edge = data.get("home_attack_edge", 0) - data.get("away_attack_edge", 0)
                     probs["home_win"] = max(0.15, min(0.75, 0.40 + edge * 0.5))
@@ -1005,111 +1106,22 @@ class UnifiedBrain:
         market_odds: Dict[str, float]
     ) -> Dict[str, MarketEdge]:
         """Calcule les edges pour chaque marche avec LIQUIDITY_TAX specifique."""
-        edges = {}
-
-        # Mapping flexible des noms de cotes
-        odds_aliases = {
-            "home_win": ["1", "home", "home_win"],
-            "draw": ["X", "draw"],
-            "away_win": ["2", "away", "away_win"],
-            "dc_1x": ["dc_1x", "1x"],
-            "dc_x2": ["dc_x2", "x2"],
-            "dc_12": ["dc_12", "12"],
-            "dnb_home": ["dnb_home", "dnb_1"],
-            "dnb_away": ["dnb_away", "dnb_2"],
-            "btts_yes": ["btts_yes", "btts"],
-            "btts_no": ["btts_no"],
-            "over_0.5": ["over_05", "o05"],
-            "over_1.5": ["over_15", "o15"],
-            "over_2.5": ["over_25", "o25"],
-            "over_3.5": ["over_35", "o35"],
-            "over_4.5": ["over_45", "o45"],
-            "over_5.5": ["over_55", "o55"],
-            "under_0.5": ["under_05", "u05"],
-            "under_1.5": ["under_15", "u15"],
-            "under_2.5": ["under_25", "u25"],
-            "under_3.5": ["under_35", "u35"],
-            "under_4.5": ["under_45", "u45"],
-            "under_5.5": ["under_55", "u55"],
-            "corners_over_8.5": ["corners_over_85", "co85"],
-            "corners_over_9.5": ["corners_over_95", "co95"],
-            "corners_over_10.5": ["corners_over_105", "co105"],
-            "corners_under_8.5": ["corners_under_85", "cu85"],
-            "corners_under_9.5": ["corners_under_95", "cu95"],
-            "corners_under_10.5": ["corners_under_105", "cu105"],
-            "cards_over_2.5": ["cards_over_25", "cao25"],
-            "cards_over_3.5": ["cards_over_35", "cao35"],
-            "cards_over_4.5": ["cards_over_45", "cao45"],
-            "cards_under_2.5": ["cards_under_25", "cau25"],
-            "cards_under_3.5": ["cards_under_35", "cau35"],
-            "cards_under_4.5": ["cards_under_45", "cau45"],
-        }
-
-        for prob_name, probability in probabilities.items():
-            # Trouver la cote correspondante
-            odds = None
-            aliases = odds_aliases.get(prob_name, [prob_name])
-            for alias in aliases:
-                if alias in market_odds:
-                    odds = market_odds[alias]
-                    break
-
-            if odds is None:
-                continue
+        return market_edges(probabilities, market_odds)
 
-            try:
-                market_type = MarketType(prob_name)
-            except ValueError:
-                continue
-
-            # Liquidity tax specifique au marche
-            liquidity_tax = LIQUIDITY_TAX.get(market_type, 0.02)
-            min_edge = MIN_EDGE_BY_MARKET.get(market_type, 0.03)
-
-            # Calculer l'edge
-            implied_prob = 1 / odds if odds > 0 else 0
-            raw_edge = probability - implied_prob
-            edge_after_vig = raw_edge - 0.01  # ~1% vig bookmaker
-            edge_after_liquidity = edge_after_vig - liquidity_tax
-
-            # Kelly (half Kelly avec cap)
-            kelly = 0.0
-            if edge_after_liquidity > 0 and odds > 1:
-                kelly = edge_after_liquidity / (odds - 1)
-                kelly = max(0, min(0.10, kelly * 0.5))  # Half Kelly, cap 10%
-
-            # Signal strength
-            if edge_after_liquidity > 0.05 and kelly > 0.03:
-                signal = SignalStrength.STRONG_BET
-            elif edge_after_liquidity > 0.03 and kelly > 0.01:
-                signal = SignalStrength.MEDIUM_BET
-            elif edge_after_liquidity > 0.01:
-                signal = SignalStrength.SMALL_BET
-            elif edge_after_liquidity < -0.05:
-                signal = SignalStrength.FADE
-            else:
-                signal = SignalStrength.NO_BET
-
-            # Verifie si l'edge atteint le seuil minimum
-            meets_threshold = edge_after_liquidity >= min_edge
-
-            edges[prob_name] = MarketEdge(
-                market=market_type,
-                probability=probability,
-                fair_odds=1/probability if probability > 0 else 0,
-                market_odds=odds,
-                raw_edge=raw_edge,
-                edge_after_vig=edge_after_vig,
-                edge_after_liquidity=edge_after_liquidity,
-                kelly_fraction=kelly,
-                recommended_stake=kelly,
-                signal_strength=signal,
-                liquidity_tax=liquidity_tax,
-                min_edge_required=min_edge,
-                meets_threshold=meets_threshold
-            )
+    def scan_slate(
+        self,
+        predictions: List[MatchPrediction],
+        market_odds: List[Dict[str, float]]
+    ) -> EdgeScan:
+        """
+        Edges de tout un slate en une passe vectorisee (N matchs × 99 marches).
 
-        return edges
+        Args:
+            predictions: Predictions deja calculees (analyze_match)
+            market_odds: Cotes de chaque match, meme ordre que predictions
+        """
+        probabilities = probability_matrix([self._build_all_probabilities(p) for p in predictions])
+        return scan_edges(probabilities, odds_matrix(market_odds))
 
     def _generate_recommendations(
         self,
@@ -1252,6 +1264,11 @@ class UnifiedBrain:
         """Retourne les statistiques d'utilisation."""
         return self._stats.copy()
 
+    @property
+    def instrumentation(self) -> BrainInstrumentation:
+        """Spans par etape: add_sink() pour les metriques, enable_profiler() pour le debug."""
+        return self._instrumentation
+
     def health_check(self) -> Dict:
         """Verifie l'etat de sante du cerveau."""
         self._ensure_initialized()
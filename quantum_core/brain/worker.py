@@ -0,0 +1,516 @@
+"""
+Brain Worker - UnifiedBrain persistant, prechauffe une fois
+===============================================================================
+
+OBJECTIF:
+    Chaque consommateur (API brain, scripts cron, orchestrateurs) creait son
+    propre UnifiedBrain et repayait _ensure_initialized: DataHubAdapter,
+    BayesianFusion, EdgeCalculator, KellySizer puis l'import des 8 engines.
+    Le worker garde UN cerveau prechauffe en memoire et sert les analyses de
+    tous les process via un socket local.
+
+COMPOSANTS:
+    1. BrainServer -> charge le cerveau (warm_up), sert les requetes, surveille
+       la version des donnees et recharge a chaud quand elle change
+    2. BrainClient -> client mince, meme interface que UnifiedBrain
+       (analyze_match, scan_slate, health_check, get_stats)
+    3. connect_brain() -> BrainClient si un worker repond, sinon UnifiedBrain local
+    4. data_version() -> empreinte des donnees (compteurs d'ecriture PostgreSQL
+       des tables DNA + mtime des JSON sources)
+
+TRANSPORT:
+    multiprocessing.connection (socket Unix ou TCP local) avec authentification
+    HMAC par authkey: les MatchPrediction voyagent telles quelles (pickle),
+    les consommateurs existants n'ont rien a convertir.
+
+SECURITE:
+    pickle = execution de code pour qui passe l'authentification. Par defaut
+    le worker ecoute sur un socket Unix (droits 0660, le fichier protege
+    l'acces). En TCP, le serveur refuse de demarrer sans BRAIN_WORKER_AUTHKEY
+    explicite et different de la cle par defaut.
+
+INSTRUMENTATION:
+    Les traces par etape des analyses du worker reviennent avec la reponse:
+    BrainClient.instrumentation alimente les sinks du process client
+    (histogrammes Prometheus de l'API), comme un UnifiedBrain local.
+
+RECHARGEMENT A CHAUD:
+    Toutes les BRAIN_WORKER_RELOAD_SECONDS, data_version() est recalculee. Si
+    elle a change, un nouveau cerveau est prechauffe a cote puis echange
+    atomiquement: les analyses en cours terminent sur l'ancien.
+
+ENVIRONNEMENT:
+    BRAIN_WORKER_ADDRESS=/tmp/monps_brain.sock   (ou host:port)
+    BRAIN_WORKER_AUTHKEY=...                     secret partage client/serveur
+                                                 (obligatoire en TCP)
+    BRAIN_WORKER_RELOAD_SECONDS=60
+
+Usage:
+    python -m quantum_core.brain.worker serve
+    python -m quantum_core.brain.worker status
+    python -m quantum_core.brain.worker analyze Liverpool "Manchester City"
+
+    brain = connect_brain()
+    prediction = brain.analyze_match("Liverpool", "Manchester City")
+
+Auteur: Mon_PS Quant Team
+Version: 1.0.0
+"""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from .instrumentation import AnalysisTrace, BrainInstrumentation
+
+logger = logging.getLogger(__name__)
+
+
+# ===============================================================================
+# CONFIGURATION
+# ===============================================================================
+
+DEFAULT_ADDRESS = "/tmp/monps_brain.sock"
+# Cle par defaut: acceptable sur le socket Unix uniquement (voir SECURITE)
+DEFAULT_AUTHKEY = "monps-brain-worker"
+DEFAULT_RELOAD_SECONDS = 60.0
+
+# Methodes du cerveau exposees aux clients
+BRAIN_METHODS = frozenset({"analyze_match", "scan_slate", "health_check", "get_stats"})
+
+# Tables lues par DataOrchestrator: une ecriture = nouvelle version des donnees
+WATCHED_TABLES = (
+    "quantum.team_profiles",
+    "quantum.team_stats_extended",
+    "quantum.team_quantum_dna_v3",
+    "quantum.team_name_mapping",
+    "quantum.matchup_friction",
+)
+
+DATA_ROOT = Path("/home/Mon_ps/data")
+WATCHED_FILES = (
+    DATA_ROOT / "quantum_v2" / "classification_results_v25.json",
+    DATA_ROOT / "quantum_v2" / "team_dna_unified_v2.json",
+    DATA_ROOT / "quantum_v2" / "team_dna_unified_v3.json",
+    DATA_ROOT / "quantum_v2" / "player_dna_unified.json",
+    DATA_ROOT / "quantum_v2" / "referee_dna_unified.json",
+    DATA_ROOT / "quantum_v2" / "teams_context_dna.json",
+    DATA_ROOT / "quantum_v2" / "team_ratings.json",
+)
+
+Address = Union[str, Tuple[str, int]]
+
+
+class BrainWorkerError(RuntimeError):
+    """Erreur levee par le cerveau distant (type et message d'origine)."""
+
+
+class BrainWorkerUnavailable(BrainWorkerError):
+    """Aucun worker ne repond a l'adresse configuree."""
+
+
+def parse_address(address: Optional[str] = None) -> Address:
+    """'/chemin/socket' -> socket Unix, 'host:port' -> TCP."""
+    address = address or os.getenv("BRAIN_WORKER_ADDRESS", DEFAULT_ADDRESS)
+    if not address.startswith("/") and ":" in address:
+        host, port = address.rsplit(":", 1)
+        return host, int(port)
+    return address
+
+
+def _authkey(authkey: Optional[Union[str, bytes]] = None) -> bytes:
+    authkey = authkey or os.getenv("BRAIN_WORKER_AUTHKEY", DEFAULT_AUTHKEY)
+    return authkey.encode() if isinstance(authkey, str) else authkey
+
+
+def check_listen_address(address: Address, authkey: bytes) -> None:
+    """
+    Refuse un listener TCP protege par la cle par defaut (ou vide).
+
+    Les requetes sont unpicklees: sur un port TCP, la cle est la seule
+    barriere avant l'execution de code.
+    """
+    if isinstance(address, tuple) and (not authkey or authkey == DEFAULT_AUTHKEY.encode()):
+        raise BrainWorkerError(
+            f"Brain worker TCP {address[0]}:{address[1]} refuse: definir BRAIN_WORKER_AUTHKEY "
+            f"(secret non par defaut) ou utiliser un socket Unix ({DEFAULT_ADDRESS})"
+        )
+
+
+# ===============================================================================
+# VERSION DES DONNEES
+# ===============================================================================
+
+def data_version(tables=WATCHED_TABLES, files=WATCHED_FILES) -> Tuple:
+    """
+    Empreinte des donnees du cerveau.
+
+    PostgreSQL: n_tup_ins + n_tup_upd + n_tup_del de pg_stat_user_tables (aucune
+    colonne updated_at requise). Fichiers: (mtime_ns, taille). DB injoignable:
+    la partie PostgreSQL vaut None, la version reste comparable.
+    """
+    file_part = tuple(
+        (str(path), path.stat().st_mtime_ns, path.stat().st_size) if path.exists() else (str(path), None, None)
+        for path in files
+    )
+
+    db_part = None
+    try:
+        import psycopg2
+        from quantum_core.data.orchestrator import DB_CONFIG
+
+        conn = psycopg2.connect(connect_timeout=3, **DB_CONFIG)
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT schemaname || '.' || relname, n_tup_ins + n_tup_upd + n_tup_del
+                    FROM pg_stat_user_tables
+                    WHERE schemaname || '.' || relname = ANY(%s)
+                    ORDER BY 1
+                """, (list(tables),))
+                db_part = tuple(cur.fetchall())
+        finally:
+            conn.close()
+    except Exception as e:
+        logger.debug(f"data_version: PostgreSQL indisponible ({e})")
+
+    return db_part, file_part
+
+
+def _default_brain_factory():
+    from quantum_core.brain.unified_brain import UnifiedBrain
+    return UnifiedBrain()
+
+
+# ===============================================================================
+# SERVEUR
+# ===============================================================================
+
+class BrainServer:
+    """
+    Cerveau persistant servi sur un socket local.
+
+    Usage:
+        server = BrainServer()
+        server.start()          # prechauffe + threads accept/reload
+        server.serve_forever()  # bloque jusqu'a stop()
+    """
+
+    def __init__(
+        self,
+        address: Optional[Address] = None,
+        authkey: Optional[Union[str, bytes]] = None,
+        brain_factory: Callable[[], Any] = _default_brain_factory,
+        version_probe: Callable[[], Any] = data_version,
+        reload_interval: Optional[float] = None,
+    ):
+        self.address = address if address is not None else parse_address()
+        self._authkey = _authkey(authkey)
+        check_listen_address(self.address, self._authkey)
+        self._brain_factory = brain_factory
+        self._version_probe = version_probe
+        self.reload_interval = reload_interval if reload_interval is not None else float(
+            os.getenv("BRAIN_WORKER_RELOAD_SECONDS", DEFAULT_RELOAD_SECONDS)
+        )
+
+        self.brain = None
+        self.data_version = None
+        self.loaded_at = None
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._listener = None
+        self._threads = []
+        self._local = threading.local()
+        self._stats = {"requests": 0, "errors": 0, "reloads": 0, "warm_up_ms": 0.0}
+
+    # ---------------------------------------------------------------------------
+    # Cycle de vie
+    # ---------------------------------------------------------------------------
+
+    def _build(self):
+        """Nouveau cerveau prechauffe + version des donnees qu'il a chargees."""
+        version = self._version_probe()
+        start = time.perf_counter()
+        brain = self._brain_factory()
+        if hasattr(brain, "warm_up"):
+            brain.warm_up()
+        instrumentation = getattr(brain, "instrumentation", None)
+        if instrumentation is not None:
+            instrumentation.add_sink(self._capture_trace)
+        self._stats["warm_up_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return brain, version
+
+    def start(self) -> None:
+        self.brain, self.data_version = self._build()
+        self.loaded_at = time.time()
+
+        if isinstance(self.address, str):
+            if os.path.exists(self.address):
+                os.unlink(self.address)  # socket d'un worker precedent
+            # Socket cree directement en 0660 (pas de fenetre avant un chmod)
+            previous_umask = os.umask(0o117)
+            try:
+                self._listener = Listener(self.address, authkey=self._authkey)
+            finally:
+                os.umask(previous_umask)
+        else:
+            self._listener = Listener(self.address, authkey=self._authkey)
+        logger.info(f"Brain worker pret sur {self.address} (warm-up {self._stats['warm_up_ms']}ms)")
+
+        for target in (self._accept_loop, self._reload_loop):
+            thread = threading.Thread(target=target, daemon=True, name=f"brain-{target.__name__}")
+            thread.start()
+            self._threads.append(thread)
+
+    def serve_forever(self) -> None:
+        self._stop.wait()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    # ---------------------------------------------------------------------------
+    # Rechargement a chaud
+    # ---------------------------------------------------------------------------
+
+    def check_reload(self, force: bool = False) -> bool:
+        """Recharge si la version des donnees a change. Retourne True si echange."""
+        with self._reload_lock:
+            if not force and self._version_probe() == self.data_version:
+                return False
+            brain, version = self._build()
+            # Echange atomique: les requetes en cours gardent leur reference
+            self.brain, self.data_version = brain, version
+            self.loaded_at = time.time()
+            self._stats["reloads"] += 1
+            logger.info(f"Brain recharge (donnees modifiees, warm-up {self._stats['warm_up_ms']}ms)")
+            return True
+
+    def _reload_loop(self) -> None:
+        while not self._stop.wait(self.reload_interval):
+            try:
+                self.check_reload()
+            except Exception as e:
+                logger.error(f"Rechargement du brain echoue, ancien cerveau conserve: {e}")
+
+    # ---------------------------------------------------------------------------
+    # Requetes
+    # ---------------------------------------------------------------------------
+
+    def status(self) -> Dict:
+        return {
+            "address": str(self.address),
+            "pid": os.getpid(),
+            "loaded_at": self.loaded_at,
+            "data_version": hash(self.data_version),
+            **self._stats,
+        }
+
+    def _capture_trace(self, trace: AnalysisTrace) -> None:
+        """Sink du cerveau: garde les traces de la requete en cours (renvoyees au client)."""
+        traces = getattr(self._local, "traces", None)
+        if traces is not None:
+            traces.append(trace)
+
+    def handle(self, method: str, args: tuple, kwargs: dict) -> Any:
+        if method == "ping":
+            return True
+        if method == "status":
+            return self.status()
+        if method == "reload":
+            return self.check_reload(force=True)
+        if method not in BRAIN_METHODS:
+            raise AttributeError(f"Methode non exposee par le worker: {method}")
+        return getattr(self.brain, method)(*args, **kwargs)
+
+    def _accept_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                conn = self._listener.accept()
+            except Exception as e:
+                if self._stop.is_set():
+                    return
+                logger.warning(f"Connexion refusee: {e}")
+                continue
+            threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+
+    def _serve_connection(self, conn) -> None:
+        """Une connexion client = une suite de requetes (method, args, kwargs)."""
+        with conn:
+            while not self._stop.is_set():
+                try:
+                    method, args, kwargs = conn.recv()
+                except (EOFError, OSError):
+                    return
+                self._stats["requests"] += 1
+                self._local.traces = []
+                try:
+                    reply = ("ok", self.handle(method, args, kwargs), self._local.traces)
+                except Exception as e:
+                    self._stats["errors"] += 1
+                    logger.error(f"{method} echoue: {e}")
+                    reply = ("error", type(e).__name__, str(e))
+                finally:
+                    self._local.traces = None
+                try:
+                    conn.send(reply)
+                except (EOFError, OSError):
+                    return
+
+
+# ===============================================================================
+# CLIENT
+# ===============================================================================
+
+class BrainClient:
+    """
+    Client mince du worker: meme interface que UnifiedBrain.
+
+    Une connexion persistante par client (thread-safe), reconnectee une fois
+    si le worker a redemarre entre deux appels. Les traces des analyses
+    faites par le worker alimentent les sinks de `instrumentation`.
+    """
+
+    def __init__(self, address: Optional[Address] = None, authkey: Optional[Union[str, bytes]] = None):
+        self.address = address if address is not None else parse_address()
+        self._authkey = _authkey(authkey)
+        self._conn = None
+        self._lock = threading.Lock()
+        self.instrumentation = BrainInstrumentation()
+
+    def _connect(self):
+        try:
+            return Client(self.address, authkey=self._authkey)
+        except (OSError, EOFError) as e:
+            raise BrainWorkerUnavailable(f"Brain worker injoignable sur {self.address}: {e}") from e
+
+    def _call(self, method: str, *args, **kwargs) -> Any:
+        with self._lock:
+            for attempt in (1, 2):
+                if self._conn is None:
+                    self._conn = self._connect()
+                try:
+                    self._conn.send((method, args, kwargs))
+                    reply = self._conn.recv()
+                    break
+                except (OSError, EOFError):
+                    self.close()
+                    if attempt == 2:
+                        raise BrainWorkerUnavailable(f"Brain worker deconnecte ({self.address})")
+
+        if reply[0] == "error":
+            _, error_type, message = reply
+            raise BrainWorkerError(f"{error_type}: {message}")
+        _, result, traces = reply
+        for trace in traces:
+            self.instrumentation.emit(trace)
+        return result
+
+    def close(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except OSError:
+                pass
+            self._conn = None
+
+    def analyze_match(self, home: str, away: str, referee: str = None,
+                      market_odds: Dict[str, float] = None, bankroll: float = 1000.0):
+        return self._call("analyze_match", home, away, referee=referee,
+                          market_odds=market_odds, bankroll=bankroll)
+
+    def scan_slate(self, predictions, market_odds):
+        return self._call("scan_slate", predictions, market_odds)
+
+    def health_check(self) -> Dict:
+        return self._call("health_check")
+
+    def get_stats(self) -> Dict:
+        return self._call("get_stats")
+
+    def ping(self) -> bool:
+        return self._call("ping")
+
+    def status(self) -> Dict:
+        return self._call("status")
+
+    def reload(self) -> bool:
+        return self._call("reload")
+
+
+def connect_brain(address: Optional[Address] = None, authkey: Optional[Union[str, bytes]] = None):
+    """
+    Cerveau a utiliser par un consommateur: le worker s'il repond, sinon un
+    UnifiedBrain local (comportement historique, initialisation a chaque run).
+    """
+    client = BrainClient(address, authkey)
+    try:
+        client.ping()
+        logger.info(f"Brain worker connecte ({client.address})")
+        return client
+    except BrainWorkerUnavailable as e:
+        logger.info(f"{e} - UnifiedBrain local")
+        from quantum_core.brain.unified_brain import get_unified_brain
+        return get_unified_brain()
+
+
+# ===============================================================================
+# CLI
+# ===============================================================================
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Worker UnifiedBrain persistant")
+    parser.add_argument("--address", default=None, help="Socket Unix ou host:port")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("serve", help="Demarrer le worker (prechauffe puis sert les requetes)")
+    sub.add_parser("status", help="Etat du worker")
+    sub.add_parser("reload", help="Forcer le rechargement des donnees")
+    analyze = sub.add_parser("analyze", help="Analyser un match via le worker")
+    analyze.add_argument("home")
+    analyze.add_argument("away")
+    analyze.add_argument("--referee", default=None)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(name)s | %(levelname)s | %(message)s')
+    address = parse_address(args.address)
+
+    if args.command == "serve":
+        import signal
+
+        try:
+            server = BrainServer(address)
+        except BrainWorkerError as e:
+            print(e, file=sys.stderr)
+            return 1
+        server.start()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: server.stop())
+        server.serve_forever()
+        return 0
+
+    client = BrainClient(address)
+    try:
+        if args.command == "status":
+            print(client.status())
+        elif args.command == "reload":
+            print("recharge" if client.reload() else "inchange")
+        else:
+            print(client.analyze_match(args.home, args.away, referee=args.referee).summary())
+    except BrainWorkerUnavailable as e:
+        print(e, file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,14 +8,21 @@ L'orchestrateur reutilise les composants existants de quantum/:
 - unified_loader.py (JSON)
 - dna_vectors.py (structures)
 - PostgreSQL quantum.* (donnees temps reel)
+
+Les datasets DNA JSON sont servis par dna_store (memmap partage entre workers).
 """
 
 from .orchestrator import DataOrchestrator, get_orchestrator
 from .orchestrator import FrictionResult, MatchContext
+from .dna_store import DNAStore, build_store, load_section, open_store
 
 __all__ = [
     "DataOrchestrator",
     "get_orchestrator",
     "FrictionResult",
-    "MatchContext"
+    "MatchContext",
+    "DNAStore",
+    "build_store",
+    "load_section",
+    "open_store",
 ]
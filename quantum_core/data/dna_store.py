@@ -0,0 +1,419 @@
+"""
+DNA Store - Datasets DNA en colonnes, mappés en mémoire
+═══════════════════════════════════════════════════════════════════════════
+Les gros JSON DNA (team_dna_unified_v2, player_dna_unified, referee_dna,
+goalscorer_profiles...) étaient chargés par json.load dans chaque process:
+chaque worker API gardait sa propre copie de plusieurs centaines de Mo.
+
+Une étape de conversion (`build_store`, CLI ci-dessous) écrit chaque dataset
+dans un répertoire en lecture seule:
+
+    {store_root}/{stem}/manifest.json     source (taille, mtime), section, meta, colonnes
+    {store_root}/{stem}/keys.bin/.off.npy table de chaînes des clés (UTF-8 + offsets)
+    {store_root}/{stem}/records.bin/.off.npy  un JSON compact par enregistrement
+    {store_root}/{stem}/columns/cNNNN.npy     feuilles numériques (float64, NaN = absent)
+    {store_root}/{stem}/columns/cNNNN.codes.npy + .vocab.*  feuilles texte (dictionnaire)
+
+Tout est lu par mmap: les pages sont partagées entre process via le page
+cache, un enregistrement n'est décodé qu'à l'accès (petit LRU par store).
+
+DNAStore est un Mapping: les loaders existants (`.items()`, `[key]`, `in`,
+`len`) l'utilisent sans changement. `load_section` retombe sur json.load si
+le store est absent ou périmé (taille/mtime du JSON source différents).
+
+Pas de pyarrow dans les dépendances: memmap NumPy + tables de chaînes.
+
+Usage:
+    python -m quantum_core.data.dna_store --all
+    python -m quantum_core.data.dna_store /home/Mon_ps/data/quantum_v2/team_dna_unified_v2.json --section teams
+
+    teams = load_section(TEAM_DNA_FILE, "teams")
+    xg = open_store(TEAM_DNA_FILE, "teams").column("context.record.xg_for")
+═══════════════════════════════════════════════════════════════════════════
+
+AUTEUR: Mon_PS Team
+DATE: 2026-10-19
+VERSION: 1.0.0
+"""
+import argparse
+import functools
+import json
+import logging
+import mmap
+import os
+import shutil
+import sys
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger("DNAStore")
+
+DATA_ROOT = Path("/home/Mon_ps/data")
+DEFAULT_STORE_ROOT = DATA_ROOT / "columnar"
+
+FORMAT_VERSION = 1
+
+# Taille du LRU d'enregistrements décodés (par store)
+DEFAULT_CACHE_SIZE = 256
+
+# Datasets convertis par `--all`: (fichier JSON source, section des enregistrements)
+DATASETS: Dict[str, Tuple[Path, Optional[str]]] = {
+    "team_dna": (DATA_ROOT / "quantum_v2" / "team_dna_unified_v2.json", "teams"),
+    "team_dna_v3": (DATA_ROOT / "quantum_v2" / "team_dna_unified_v3.json", "teams"),
+    "player_dna": (DATA_ROOT / "quantum_v2" / "player_dna_unified.json", "players"),
+    "referee_dna": (DATA_ROOT / "quantum_v2" / "referee_dna_unified.json", None),
+    "teams_context_dna": (DATA_ROOT / "quantum_v2" / "teams_context_dna.json", None),
+    "goalscorer_profiles": (DATA_ROOT / "goals" / "goalscorer_profiles_2025.json", None),
+}
+
+PathLike = Union[str, Path]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# TABLES DE CHAÎNES
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _write_strings(prefix: Path, values: Sequence[bytes]) -> None:
+    """Écrit {prefix}.bin (concaténation) et {prefix}.off.npy (n+1 offsets int64)."""
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    with open(f"{prefix}.bin", "wb") as f:
+        for i, value in enumerate(values):
+            f.write(value)
+            offsets[i + 1] = offsets[i] + len(value)
+    np.save(f"{prefix}.off.npy", offsets)
+
+
+class _StringTable:
+    """Table de chaînes en lecture seule (mmap)."""
+
+    def __init__(self, prefix: Path):
+        self._offsets = np.load(f"{prefix}.off.npy", mmap_mode="r")
+        with open(f"{prefix}.bin", "rb") as f:
+            # mmap de taille 0 interdit: table vide => pas de mapping
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self._offsets[-1] else b""
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def raw(self, i: int) -> bytes:
+        return self._data[int(self._offsets[i]):int(self._offsets[i + 1])]
+
+    def __getitem__(self, i: int) -> str:
+        return self.raw(i).decode("utf-8")
+
+    def tolist(self) -> List[str]:
+        return [self[i] for i in range(len(self))]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CONVERSION JSON -> STORE
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _leaves(record: Any, prefix: str = "") -> Iterator[Tuple[str, Any]]:
+    """Feuilles scalaires d'un dict imbriqué (chemins pointés, listes ignorées)."""
+    if not isinstance(record, dict):
+        return
+    for key, value in record.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from _leaves(value, path + ".")
+        elif isinstance(value, (bool, int, float, str)):
+            yield path, value
+
+
+def _extract_columns(records: List[Any]) -> Tuple[Dict[str, Tuple[str, Dict[int, Any]]], List[str]]:
+    """
+    Colonnes par chemin de feuille: "f8" si toutes les valeurs sont
+    numériques, "str" si toutes sont du texte. Les chemins mixtes restent
+    accessibles uniquement via l'enregistrement (liste retournée à part).
+    """
+    values: Dict[str, Dict[int, Any]] = {}
+    kinds: Dict[str, Optional[str]] = {}
+    for i, record in enumerate(records):
+        for path, value in _leaves(record):
+            kind = "str" if isinstance(value, str) else "f8"
+            seen = kinds.setdefault(path, kind)
+            if seen != kind:
+                kinds[path] = None
+            values.setdefault(path, {})[i] = value
+    columns = {path: (kind, values[path]) for path, kind in kinds.items() if kind}
+    return columns, sorted(path for path, kind in kinds.items() if not kind)
+
+
+def _section(document: Any, section: Optional[str]) -> Any:
+    """Même règle que les loaders: document[section] si présent, sinon le document."""
+    if section and isinstance(document, dict) and section in document:
+        return document[section]
+    return document
+
+
+def store_dir_for(source: PathLike, store_root: Optional[PathLike] = None) -> Path:
+    """Répertoire du store d'un JSON source: {store_root}/{stem}."""
+    return Path(store_root or DEFAULT_STORE_ROOT) / Path(source).stem
+
+
+def build_store(
+    source: PathLike,
+    section: Optional[str] = None,
+    out_dir: Optional[PathLike] = None,
+) -> Path:
+    """
+    Convertit un JSON {clé: enregistrement} (ou {meta..., section: {...}})
+    en store colonne. Écriture dans un répertoire temporaire puis rename:
+    les process qui ont déjà mappé l'ancienne version la gardent.
+    """
+    source = Path(source)
+    out_dir = Path(out_dir) if out_dir else store_dir_for(source)
+    stat = source.stat()
+    with open(source, "r", encoding="utf-8") as f:
+        document = json.load(f)
+
+    records = _section(document, section)
+    if not isinstance(records, dict):
+        raise ValueError(f"{source}: section {section or '<root>'} n'est pas un objet {{clé: enregistrement}}")
+    meta = {k: v for k, v in document.items() if k != section} if records is not document else {}
+
+    keys = list(records.keys())
+    values = list(records.values())
+
+    tmp = out_dir.with_name(f"{out_dir.name}.tmp-{os.getpid()}")
+    shutil.rmtree(tmp, ignore_errors=True)
+    (tmp / "columns").mkdir(parents=True)
+
+    _write_strings(tmp / "keys", [k.encode("utf-8") for k in keys])
+    _write_strings(tmp / "records", [
+        json.dumps(v, ensure_ascii=False, separators=(",", ":")).encode("utf-8") for v in values
+    ])
+
+    columns = {}
+    extracted, mixed = _extract_columns(values)
+    for n, (path, (kind, by_row)) in enumerate(sorted(extracted.items())):
+        name = f"c{n:04d}"
+        if kind == "f8":
+            column = np.full(len(values), np.nan)
+            column[list(by_row)] = [float(v) for v in by_row.values()]
+            np.save(tmp / "columns" / f"{name}.npy", column)
+        else:
+            vocabulary = sorted(set(by_row.values()))
+            code_of = {v: c for c, v in enumerate(vocabulary)}
+            codes = np.full(len(values), -1, dtype=np.int32)
+            codes[list(by_row)] = [code_of[v] for v in by_row.values()]
+            np.save(tmp / "columns" / f"{name}.codes.npy", codes)
+            _write_strings(tmp / "columns" / f"{name}.vocab", [v.encode("utf-8") for v in vocabulary])
+        columns[path] = {"file": name, "kind": kind}
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "source": str(source),
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "section": section,
+        "n_records": len(keys),
+        "meta": meta,
+        "columns": columns,
+        "mixed": mixed,
+    }
+    with open(tmp / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+
+    old = out_dir.with_name(f"{out_dir.name}.old-{os.getpid()}")
+    if out_dir.exists():
+        os.replace(out_dir, old)
+    os.replace(tmp, out_dir)
+    shutil.rmtree(old, ignore_errors=True)
+
+    logger.info(f"✅ {source.name} -> {out_dir} ({len(keys)} enregistrements, {len(columns)} colonnes)")
+    return out_dir
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# LECTURE
+# ═══════════════════════════════════════════════════════════════════════════
+
+class DNAStore(Mapping):
+    """
+    Accès en lecture seule à un dataset converti.
+
+    Usage:
+        store = DNAStore(store_dir_for(TEAM_DNA_FILE))
+        liverpool = store["Liverpool"]          # dict décodé à la demande
+        ppda = store.column("tactical.ppda")    # np.ndarray aligné sur store.keys()
+    """
+
+    def __init__(self, path: PathLike, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.path = Path(path)
+        with open(self.path / "manifest.json", "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"{self.path}: format {self.manifest.get('format_version')} non supporté")
+
+        self._keys = _StringTable(self.path / "keys")
+        self._records = _StringTable(self.path / "records")
+        self._index = {key: i for i, key in enumerate(self._keys.tolist())}
+        self._decode = functools.lru_cache(maxsize=cache_size)(self._decode_record)
+
+    @property
+    def meta(self) -> Dict:
+        """Champs du document hors section (ex: metadata)."""
+        return self.manifest["meta"]
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.manifest["columns"])
+
+    # ─── MAPPING ───
+
+    def _decode_record(self, i: int) -> Any:
+        return json.loads(self._records.raw(i))
+
+    def __getitem__(self, key: str) -> Any:
+        return self._decode(self._index[key])
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def position(self, key: str) -> int:
+        """Ligne d'une clé dans les colonnes."""
+        return self._index[key]
+
+    # ─── COLONNES ───
+
+    def column(self, path: str) -> np.ndarray:
+        """
+        Colonne d'une feuille (chemin pointé), alignée sur l'ordre des clés.
+        Numérique: memmap float64 (NaN = absent). Texte: tableau object (None = absent).
+        """
+        try:
+            spec = self.manifest["columns"][path]
+        except KeyError:
+            raise KeyError(f"Colonne inconnue: {path}") from None
+        base = self.path / "columns" / spec["file"]
+        if spec["kind"] == "f8":
+            return np.load(f"{base}.npy", mmap_mode="r")
+        codes = np.load(f"{base}.codes.npy", mmap_mode="r")
+        vocabulary = np.array(_StringTable(Path(f"{base}.vocab")).tolist() + [None], dtype=object)
+        return vocabulary[codes]   # code -1 -> None (dernier élément)
+
+    def text_column(self, path: str) -> Optional[np.ndarray]:
+        """
+        Valeurs texte d'une feuille sans décoder d'enregistrement: colonne
+        "str", ou que des None si la feuille n'existe nulle part. None si
+        seuls les enregistrements font foi (chemin mixte ou numérique, store
+        converti avant la liste "mixed").
+        """
+        spec = self.manifest["columns"].get(path)
+        if spec is not None:
+            return self.column(path) if spec["kind"] == "str" else None
+        mixed = self.manifest.get("mixed")
+        if mixed is None or path in mixed:
+            return None
+        return np.full(len(self), None, dtype=object)
+
+
+# Stores ouverts dans ce process (un mapping par répertoire)
+_stores: Dict[Path, Tuple[int, DNAStore]] = {}
+_stores_lock = threading.Lock()
+
+
+def _is_fresh(manifest: Dict, source: Path) -> bool:
+    """Store à jour si le JSON source n'a pas bougé (ou n'est pas déployé)."""
+    try:
+        stat = source.stat()
+    except FileNotFoundError:
+        return True
+    return (manifest.get("source_size") == stat.st_size
+            and manifest.get("source_mtime_ns") == stat.st_mtime_ns)
+
+
+def open_store(
+    source: PathLike,
+    section: Optional[str] = None,
+    store_root: Optional[PathLike] = None,
+) -> Optional[DNAStore]:
+    """
+    Store partagé (par process) d'un JSON source, ou None s'il est absent,
+    périmé ou converti avec une autre section.
+    """
+    path = store_dir_for(source, store_root)
+    try:
+        manifest_mtime = (path / "manifest.json").stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    with _stores_lock:
+        cached = _stores.get(path)
+        if cached and cached[0] == manifest_mtime:
+            store = cached[1]
+        else:
+            try:
+                store = DNAStore(path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Store illisible {path}: {e}")
+                return None
+            _stores[path] = (manifest_mtime, store)
+
+    if store.manifest.get("section") != section or not _is_fresh(store.manifest, Path(source)):
+        logger.info(f"Store périmé ou incompatible, fallback JSON: {path}")
+        return None
+    return store
+
+
+def load_section(
+    source: PathLike,
+    section: Optional[str] = None,
+    store_root: Optional[PathLike] = None,
+) -> Mapping:
+    """
+    Enregistrements d'un dataset DNA: le store mmap s'il est à jour, sinon
+    json.load (section extraite comme `raw.get(section, raw)`). Les erreurs
+    de lecture du JSON (FileNotFoundError, JSONDecodeError) remontent.
+    """
+    store = open_store(source, section, store_root)
+    if store is not None:
+        return store
+    with open(source, "r", encoding="utf-8") as f:
+        return _section(json.load(f), section)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CLI
+# ═══════════════════════════════════════════════════════════════════════════
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Convertit les JSON DNA en stores colonne (mmap)")
+    parser.add_argument("sources", nargs="*", help="Fichiers JSON à convertir")
+    parser.add_argument("--section", help="Section des enregistrements (ex: teams, players)")
+    parser.add_argument("--all", action="store_true", help="Tous les datasets connus (DATASETS)")
+    parser.add_argument("--store-root", default=str(DEFAULT_STORE_ROOT), help="Racine des stores")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)s | %(message)s')
+
+    jobs = [(Path(s), args.section) for s in args.sources]
+    if args.all:
+        jobs += [(source, section) for source, section in DATASETS.values() if source.exists()]
+    if not jobs:
+        parser.error("aucun dataset: passer des fichiers ou --all")
+
+    errors = 0
+    for source, section in jobs:
+        try:
+            build_store(source, section, store_dir_for(source, args.store_root))
+        except (OSError, ValueError) as e:
+            errors += 1
+            logger.error(f"❌ {source}: {e}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
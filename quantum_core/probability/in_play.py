@@ -0,0 +1,312 @@
+"""
+QUANTUM CORE - IN-PLAY ENGINE
+=============================
+Re-pricing en direct des 99 marchés depuis l'état du match
+
+Avant: un événement (but, carton) invalidait les marchés via TagManager et
+SmartCacheEnhanced contournait le cache une fois le match commencé: aucun
+prix live.
+
+Maintenant, à chaque événement (ou tick de minute):
+✅ Lambdas du temps restant: lambda pré-match × part restante de chaque
+   mi-temps (ht_ratio des buts en 1ère mi-temps), × effet des cartons rouges
+✅ Distribution des buts restants par équipe et par mi-temps (PMF Poisson
+   du score_engine), décalée du score courant
+✅ Les 99 marchés de MarketType en réductions de vecteurs (pas de boucle
+   Python sur les scores): 1X2, totaux, AH, scores exacts, HT/FT...
+✅ Corners / cartons: Poisson du temps restant au-dessus du compteur courant
+
+Quelques dizaines de µs par match: tout un slate live tient sur un cœur.
+
+Usage:
+    prior = MatchPrior(lambda_home=1.6, lambda_away=1.1, rho=-0.1)
+    state = InPlayState(minute=62, home_goals=1, away_goals=1, away_red=1, ht_score=(1, 0))
+    probs = price_in_play(prior, state)    # {"home_win": ..., "over_2.5": ...}
+
+Références: Dixon & Robinson (1998) - "A birth process model for
+association football matches"; Vecer, Kopriva & Ichiba (2009) - effet
+des cartons rouges sur l'intensité de buts.
+"""
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .score_engine import poisson_pmf, score_matrix
+
+# Buts restants max par équipe et par mi-temps
+MAX_GOALS = 10
+
+HALF_MINUTES = 45
+MATCH_MINUTES = 90
+
+# Part des buts en 1ère mi-temps (comme HalfTimeCalculator / BTTS both halves)
+HT_GOALS_RATIO = 0.45
+
+# Effet d'un carton rouge sur l'intensité de buts restante (par carton)
+RED_CARD_OWN = 0.67   # l'équipe réduite marque moins
+RED_CARD_OPP = 1.25   # l'adversaire marque plus
+
+TOTAL_LINES = (0.5, 1.5, 2.5, 3.5, 4.5, 5.5)
+TEAM_LINES = (0.5, 1.5, 2.5)
+CORNER_LINES = (8.5, 9.5, 10.5)
+CARD_LINES = (2.5, 3.5, 4.5)
+CORRECT_SCORES = ((0, 0), (1, 0), (0, 1), (1, 1), (2, 0), (0, 2), (2, 1), (1, 2), (2, 2), (3, 1))
+# Lignes AH (handicap domicile): demi-lignes sans push, lignes entières push / 2
+AH_LINES = (("m05", -0.5), ("m10", -1.0), ("m15", -1.5), ("m20", -2.0))
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# ÉTAT
+# ═══════════════════════════════════════════════════════════════════════
+
+@dataclass(frozen=True)
+class MatchPrior:
+    """Espérances pré-match (90 minutes)."""
+    lambda_home: float
+    lambda_away: float
+    rho: float = 0.0
+    corners_expected: float = 10.0
+    cards_expected: float = 4.0
+    ht_ratio: float = HT_GOALS_RATIO
+
+    @classmethod
+    def from_ratings(cls, ratings, home: str, away: str, league: Optional[str] = None, **kwargs) -> "MatchPrior":
+        """
+        Depuis les ratings Dixon-Coles (team_ratings.TeamRatings).
+
+        league: intercept / avantage du terrain de cette ligue (coupe...);
+        défaut ou ligue inconnue du fit: ligue de référence du domicile.
+        KeyError si une équipe n'a pas de rating.
+        """
+        h, a = ratings.team_id(home), ratings.team_id(away)
+        if h is None or a is None:
+            raise KeyError(f"Pas de rating pour {home if h is None else away}")
+        league_idx = None
+        if league in ratings.leagues:
+            league_idx = np.array([ratings.leagues.index(league)])
+        lambda_home, lambda_away = ratings.lambdas_many(np.array([h]), np.array([a]), league_idx)
+        return cls(float(lambda_home[0]), float(lambda_away[0]), rho=ratings.rho, **kwargs)
+
+
+@dataclass(frozen=True)
+class InPlayState:
+    """
+    État du match à `minute` (0-90, temps additionnel ramené à 45 / 90).
+
+    ht_score: score à la pause, requis après la mi-temps pour les marchés
+    HT et 2ème mi-temps (défaut: score courant, exact à la pause).
+    """
+    minute: float = 0.0
+    home_goals: int = 0
+    away_goals: int = 0
+    home_red: int = 0
+    away_red: int = 0
+    corners: int = 0
+    cards: int = 0
+    ht_score: Optional[Tuple[int, int]] = None
+
+    @property
+    def first_half(self) -> bool:
+        return self.minute < HALF_MINUTES
+
+
+def remaining_fractions(minute: float, ht_ratio: float = HT_GOALS_RATIO) -> Tuple[float, float]:
+    """Part des buts du match encore à venir dans la 1ère et la 2ème mi-temps."""
+    minute = min(max(minute, 0.0), MATCH_MINUTES)
+    first = ht_ratio * max(HALF_MINUTES - minute, 0.0) / HALF_MINUTES
+    second = (1 - ht_ratio) * min(MATCH_MINUTES - minute, HALF_MINUTES) / HALF_MINUTES
+    return first, second
+
+
+def remaining_lambdas(prior: MatchPrior, state: InPlayState) -> np.ndarray:
+    """[[home 1H, home 2H], [away 1H, away 2H]]: buts restants attendus."""
+    first, second = remaining_fractions(state.minute, prior.ht_ratio)
+    home = prior.lambda_home * RED_CARD_OWN ** state.home_red * RED_CARD_OPP ** state.away_red
+    away = prior.lambda_away * RED_CARD_OWN ** state.away_red * RED_CARD_OPP ** state.home_red
+    return np.array([[home * first, home * second], [away * first, away * second]])
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# RÉDUCTIONS
+# ═══════════════════════════════════════════════════════════════════════
+
+@lru_cache(maxsize=4)
+def _index_grids(n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Différence et total (i - j + n - 1, i + j) de la matrice n × n, pour bincount."""
+    i = np.arange(n)[:, None]
+    j = np.arange(n)[None, :]
+    diff = (i - j + n - 1).ravel()
+    total = (i + j).ravel()
+    diff.flags.writeable = False
+    total.flags.writeable = False
+    return diff, total
+
+
+class _Cumulative:
+    """
+    Distribution entière X = offset + k (k = index de la PMF), lue via son
+    cumul en floats Python: chaque marché est une ou deux lectures de liste.
+    """
+
+    __slots__ = ("cum", "offset")
+
+    def __init__(self, pmf: np.ndarray, offset: int = 0):
+        self.cum = np.cumsum(pmf).tolist()
+        self.offset = offset
+
+    def at_most(self, value: int) -> float:
+        i = value - self.offset
+        if i < 0:
+            return 0.0
+        return self.cum[min(i, len(self.cum) - 1)]
+
+    def over(self, line: float) -> float:
+        """P(X > line)"""
+        return 1.0 - self.at_most(math.floor(line))
+
+    def between(self, low: int, high: int) -> float:
+        """P(low <= X <= high)"""
+        return self.at_most(high) - self.at_most(low - 1)
+
+    def signs(self) -> Tuple[float, float, float]:
+        """P(X > 0), P(X = 0), P(X < 0) (masse totale de la PMF, pas forcément 1)"""
+        negative, zero = self.at_most(-1), self.at_most(0)
+        return self.cum[-1] - zero, zero - negative, negative
+
+
+def _difference(pmf_home: np.ndarray, pmf_away: np.ndarray) -> np.ndarray:
+    """PMF de X - Y (index k ↔ k - (n - 1)), X et Y indépendants."""
+    return np.convolve(pmf_home, pmf_away[::-1])
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# PRICING
+# ═══════════════════════════════════════════════════════════════════════
+
+def price_in_play(prior: MatchPrior, state: InPlayState, max_goals: int = MAX_GOALS) -> Dict[str, float]:
+    """
+    Les 99 marchés (clés MarketType) pour l'état courant du match.
+
+    Score final = score courant + buts restants; 1ère et 2ème mi-temps
+    indépendantes pour les marchés par mi-temps, Dixon-Coles (rho) sur la
+    matrice des buts restants pour les marchés au score final.
+    """
+    lambdas = remaining_lambdas(prior, state)
+    (h1, h2), (a1, a2) = poisson_pmf(lambdas, max_goals)
+    h0, a0 = state.home_goals, state.away_goals
+    ht_h, ht_a = (h0, a0) if state.first_half or state.ht_score is None else state.ht_score
+    n = max_goals + 1
+
+    # ─── Score final: matrice des buts restants, décalée de (h0, a0) ───────
+    rest = score_matrix(lambdas[0].sum(), lambdas[1].sum(), rho=prior.rho, max_goals=max_goals).matrix
+    diff_index, total_index = _index_grids(n)
+    flat = rest.ravel()
+    margin = _Cumulative(np.bincount(diff_index, weights=flat, minlength=2 * n - 1), h0 - a0 - (n - 1))
+    total_pmf = np.bincount(total_index, weights=flat, minlength=2 * n - 1)
+    totals = _Cumulative(total_pmf, h0 + a0)
+    home_goals = _Cumulative(rest.sum(axis=1), h0)
+    away_goals = _Cumulative(rest.sum(axis=0), a0)
+
+    home, draw, away = margin.signs()
+    out = {
+        "home_win": home, "draw": draw, "away_win": away,
+        "dc_1x": home + draw, "dc_x2": draw + away, "dc_12": home + away,
+    }
+    no_draw = 1 - draw
+    out["dnb_home"], out["dnb_away"] = (home / no_draw, away / no_draw) if no_draw > 0 else (0.5, 0.5)
+
+    btts = float(rest[max(1 - h0, 0):, max(1 - a0, 0):].sum())
+    out["btts_yes"], out["btts_no"] = btts, 1 - btts
+
+    for line in TOTAL_LINES:
+        over = totals.over(line)
+        out[f"over_{line}"], out[f"under_{line}"] = over, 1 - over
+
+    for name, line in AH_LINES:
+        # marge + line > 0 ⇔ marge > -ceil(line); égalité = push (lignes entières)
+        shift = -math.ceil(line)
+        covered = 1.0 - margin.at_most(shift)
+        push = margin.between(shift, shift) if line == int(line) else 0.0
+        out[f"ah_home_{name}"] = covered + push / 2
+        out[f"ah_away_p{name[1:]}"] = 1 - covered - push / 2
+
+    for h, a in CORRECT_SCORES:
+        out[f"cs_{h}_{a}"] = float(rest[h - h0, a - a0]) if h >= h0 and a >= a0 else 0.0
+
+    out["goals_0_1"] = totals.between(0, 1)
+    out["goals_2_3"] = totals.between(2, 3)
+    out["goals_4_5"] = totals.between(4, 5)
+    out["goals_6_plus"] = totals.over(5.5)
+    for k, key in enumerate(("exactly_0_goals", "exactly_1_goal", "exactly_2_goals", "exactly_3_goals", "exactly_4_goals")):
+        out[key] = totals.between(k, k)
+    out["goals_5_plus"] = totals.over(4.5)
+
+    goals = h0 + a0
+    odd = float(total_pmf[(1 - goals % 2)::2].sum())
+    out["odd_goals"], out["even_goals"] = odd, 1 - odd
+
+    home_nil = float(rest[max(1 - h0, 0):, 0].sum()) if a0 == 0 else 0.0
+    away_nil = float(rest[0, max(1 - a0, 0):].sum()) if h0 == 0 else 0.0
+    out["home_win_to_nil"], out["home_win_to_nil_no"] = home_nil, home - home_nil
+    out["away_win_to_nil"], out["away_win_to_nil_no"] = away_nil, away - away_nil
+    out["home_clean_sheet_yes"] = away_goals.at_most(0)
+    out["away_clean_sheet_yes"] = home_goals.at_most(0)
+
+    for line in TEAM_LINES:
+        suffix = f"{int(line * 10):02d}"
+        out[f"home_over_{suffix}"] = home_goals.over(line)
+        out[f"away_over_{suffix}"] = away_goals.over(line)
+
+    # ─── Mi-temps: 1ère (score à la pause) et 2ème indépendantes ───────────
+    first_margin = _difference(h1, a1)
+    ht_offset = ht_h - ht_a
+    out["ht_home_win"], out["ht_draw"], out["ht_away_win"] = _Cumulative(first_margin, ht_offset - (n - 1)).signs()
+    ht_score = 1.0 if ht_h + ht_a > 0 else 1 - float(h1[0] * a1[0])
+    out["ht_over_05"], out["ht_under_05"] = ht_score, 1 - ht_score
+
+    home_1h = 1.0 if ht_h > 0 else 1 - float(h1[0])
+    away_1h = 1.0 if ht_a > 0 else 1 - float(a1[0])
+    home_2h = 1.0 if h0 - ht_h > 0 else 1 - float(h2[0])
+    away_2h = 1.0 if a0 - ht_a > 0 else 1 - float(a2[0])
+    out["ht_btts"] = home_1h * away_1h
+    out["home_to_score_1h"], out["home_to_score_2h"] = home_1h, home_2h
+    out["away_to_score_1h"], out["away_to_score_2h"] = away_1h, away_2h
+
+    btts_halves = home_1h * away_1h * home_2h * away_2h
+    out["btts_both_halves_yes"], out["btts_both_halves_no"] = btts_halves, 1 - btts_halves
+    second_score = 1.0 if (h0 - ht_h) + (a0 - ht_a) > 0 else 1 - float(h2[0] * a2[0])
+    both_halves = ht_score * second_score
+    out["score_both_halves_yes"], out["score_both_halves_no"] = both_halves, 1 - both_halves
+
+    # HT/FT: marge à la pause par issue, convoluée avec la marge de la 2ème mi-temps
+    second_margin = _difference(h2, a2)
+    zero = (n - 1) - ht_offset   # index de la marge nulle à la pause
+    ht_parts = (
+        ("1", slice(max(zero + 1, 0), None)),
+        ("x", slice(zero, zero + 1) if 0 <= zero < 2 * n - 1 else slice(0, 0)),
+        ("2", slice(0, max(zero, 0))),
+    )
+    for ht_key, part in ht_parts:
+        first = np.zeros_like(first_margin)
+        first[part] = first_margin[part]
+        # marge finale = (k_ht - (n-1) + ht_offset) + (k_2h - (n-1)) + buts 2ème mi-temps déjà marqués
+        ft = _Cumulative(np.convolve(first, second_margin), h0 - a0 - 2 * (n - 1))
+        out[f"dr_{ht_key}_1"], out[f"dr_{ht_key}_x"], out[f"dr_{ht_key}_2"] = ft.signs()
+
+    # ─── Corners / cartons: Poisson du temps restant (uniforme) ────────────
+    left = (MATCH_MINUTES - min(max(state.minute, 0.0), MATCH_MINUTES)) / MATCH_MINUTES
+    needed = max(math.floor(CORNER_LINES[-1]) + 1 - state.corners, math.floor(CARD_LINES[-1]) + 1 - state.cards, 0)
+    corners_pmf, cards_pmf = poisson_pmf(np.array([prior.corners_expected, prior.cards_expected]) * left, needed)
+    corners, cards = _Cumulative(corners_pmf, state.corners), _Cumulative(cards_pmf, state.cards)
+    for line in CORNER_LINES:
+        over = corners.over(line)
+        out[f"corners_over_{line}"], out[f"corners_under_{line}"] = over, 1 - over
+    for line in CARD_LINES:
+        over = cards.over(line)
+        out[f"cards_over_{line}"], out[f"cards_under_{line}"] = over, 1 - over
+
+    return out
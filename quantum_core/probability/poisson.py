@@ -8,25 +8,44 @@ MODÈLES IMPLÉMENTÉS:
 ✅ Dixon-Coles (correction scores faibles)
 ✅ Matrice de scores complète
 ✅ Calcul de tous les marchés goals
+   (matrices et réductions: moteur NumPy partagé, score_engine.py)
 
 Référence: Dixon & Coles (1997) - "Modelling Association Football Scores"
 """
 
 import math
-from typing import Dict, Tuple, List
-from dataclasses import dataclass
+from typing import Dict, Tuple, List, Optional
+from dataclasses import dataclass, field
 import logging
 
+import numpy as np
+
+from .score_engine import ScoreDistribution, poisson_over, score_matrix
+
 logger = logging.getLogger(__name__)
 
 
 @dataclass
 class ScoreMatrix:
-    """Matrice des probabilités de scores"""
+    """Matrice des probabilités de scores (requêtes déléguées au moteur NumPy)"""
     probabilities: Dict[Tuple[int, int], float]
     lambda_home: float
     lambda_away: float
     rho: float  # Paramètre Dixon-Coles
+    distribution: Optional[ScoreDistribution] = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.distribution is None:
+            size = max(max(h, a) for h, a in self.probabilities) + 1 if self.probabilities else 1
+            grid = np.zeros((size, size))
+            for (h, a), p in self.probabilities.items():
+                grid[h, a] = p
+            self.distribution = ScoreDistribution(grid)
+
+    @classmethod
+    def from_distribution(cls, distribution: ScoreDistribution, lambda_home: float,
+                          lambda_away: float, rho: float) -> "ScoreMatrix":
+        return cls(distribution.as_dict(), lambda_home, lambda_away, rho, distribution)
 
     def get_prob(self, home: int, away: int) -> float:
         """Probabilité d'un score exact"""
@@ -34,11 +53,7 @@ class ScoreMatrix:
 
     def prob_over(self, threshold: float) -> float:
         """P(total > threshold)"""
-        prob = 0.0
-        for (h, a), p in self.probabilities.items():
-            if h + a > threshold:
-                prob += p
-        return prob
+        return self.distribution.over(threshold)
 
     def prob_under(self, threshold: float) -> float:
         """P(total < threshold)"""
@@ -46,11 +61,7 @@ class ScoreMatrix:
 
     def prob_btts_yes(self) -> float:
         """P(les deux équipes marquent)"""
-        prob = 0.0
-        for (h, a), p in self.probabilities.items():
-            if h > 0 and a > 0:
-                prob += p
-        return prob
+        return self.distribution.btts_yes()
 
     def prob_btts_no(self) -> float:
         """P(au moins une équipe ne marque pas)"""
@@ -58,54 +69,27 @@ class ScoreMatrix:
 
     def prob_home_win(self) -> float:
         """P(victoire domicile)"""
-        prob = 0.0
-        for (h, a), p in self.probabilities.items():
-            if h > a:
-                prob += p
-        return prob
+        return self.distribution.home_win()
 
     def prob_draw(self) -> float:
         """P(match nul)"""
-        prob = 0.0
-        for (h, a), p in self.probabilities.items():
-            if h == a:
-                prob += p
-        return prob
+        return self.distribution.draw()
 
     def prob_away_win(self) -> float:
         """P(victoire extérieur)"""
-        prob = 0.0
-        for (h, a), p in self.probabilities.items():
-            if a > h:
-                prob += p
-        return prob
+        return self.distribution.away_win()
 
     def prob_team_over(self, team: str, threshold: float) -> float:
         """P(équipe marque > threshold buts)"""
-        prob = 0.0
-        for (h, a), p in self.probabilities.items():
-            goals = h if team == "home" else a
-            if goals > threshold:
-                prob += p
-        return prob
+        return self.distribution.team_over(team, threshold)
 
     def prob_clean_sheet(self, team: str) -> float:
         """P(clean sheet pour une équipe)"""
-        prob = 0.0
-        for (h, a), p in self.probabilities.items():
-            if team == "home" and a == 0:
-                prob += p
-            elif team == "away" and h == 0:
-                prob += p
-        return prob
+        return self.distribution.clean_sheet(team)
 
     def most_likely_scores(self, n: int = 5) -> List[Tuple[Tuple[int, int], float]]:
         """Retourne les n scores les plus probables"""
-        sorted_scores = sorted(
-            self.probabilities.items(),
-            key=lambda x: -x[1]
-        )
-        return sorted_scores[:n]
+        return self.distribution.top_scores(n)
 
 
 class PoissonModel:
@@ -152,8 +136,7 @@ class PoissonModel:
             Probabilité de dépasser le seuil
         """
         # P(X > threshold) = 1 - P(X <= floor(threshold))
-        prob_under = sum(self.pmf(k) for k in range(int(threshold) + 1))
-        return 1.0 - prob_under
+        return float(poisson_over(self.lambda_, threshold))
 
     def prob_under(self, threshold: float) -> float:
         """P(X < threshold)"""
@@ -285,26 +268,16 @@ class DixonColesModel:
         """
         max_g = max_goals or self.MAX_GOALS
 
-        probabilities = {}
-        total_prob = 0.0
-
-        for h in range(max_g + 1):
-            for a in range(max_g + 1):
-                prob = self.score_probability(h, a, lambda_home, lambda_away)
-                probabilities[(h, a)] = prob
-                total_prob += prob
+        # Matrice dense Poisson × Poisson corrigée tau, sans renormalisation...
+        distribution = score_matrix(lambda_home, lambda_away, rho=self.rho,
+                                    max_goals=max_g, normalize=False)
 
-        # Normaliser (les probabilités doivent sommer à 1)
+        # ...puis normaliser (les probabilités doivent sommer à 1)
+        total_prob = distribution.matrix.sum()
         if total_prob > 0 and abs(total_prob - 1.0) > 0.001:
-            for key in probabilities:
-                probabilities[key] /= total_prob
-
-        return ScoreMatrix(
-            probabilities=probabilities,
-            lambda_home=lambda_home,
-            lambda_away=lambda_away,
-            rho=self.rho
-        )
+            distribution.matrix /= total_prob
+
+        return ScoreMatrix.from_distribution(distribution, lambda_home, lambda_away, self.rho)
 
     def calculate_lambdas(self, home_xg: float, away_xga: float,
                           away_xg: float, home_xga: float,
@@ -0,0 +1,319 @@
+"""
+QUANTUM CORE - SCORE ENGINE
+===========================
+Moteur unique de distributions de scores (Poisson / Dixon-Coles) en NumPy
+
+Remplace les boucles dupliquées (ScoreMatrix, ModelDixonColes, BTTS V2,
+backtest_engine, HalfTimeCalculator, set_piece) par:
+
+✅ PMF Poisson vectorisées, table pré-calculée sur une grille de lambdas
+✅ Matrice de scores dense [home × away] (ou lot [n × home × away])
+✅ Correction Dixon-Coles (rho) ou multiplicateurs fixes des scores bas
+✅ Découpage par mi-temps (lambda × ratio HT / lambda × (1 - ratio))
+✅ Tous les marchés en réductions de tableaux (masques mis en cache par taille)
+
+Usage:
+    dist = score_matrix(1.8, 1.2, rho=-0.13)
+    dist.over(2.5), dist.btts_yes(), dist.home_win()
+
+    # Un slate entier en une passe
+    slate = score_matrix(np.array([1.8, 1.1]), np.array([1.2, 1.4]))
+    slate.markets()["over_25"]          # array [2]
+
+Référence: Dixon & Coles (1997) - "Modelling Association Football Scores"
+"""
+
+import math
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+# Taille par défaut des matrices (0..10 buts par équipe)
+DEFAULT_MAX_GOALS = 10
+
+# Grille de lambdas pré-calculée: 0.00, 0.01, ..., 10.00
+PMF_GRID_STEP = 0.01
+PMF_GRID_MAX = 10.0
+PMF_GRID_GOALS = 20
+
+# Lignes standard exposées par markets()
+TOTAL_LINES = (0.5, 1.5, 2.5, 3.5, 4.5, 5.5)
+TEAM_LINES = (0.5, 1.5, 2.5)
+
+_LOG_FACTORIAL = np.array([math.lgamma(k + 1) for k in range(PMF_GRID_GOALS + 1)])
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# PMF POISSON
+# ═══════════════════════════════════════════════════════════════════════
+
+def _pmf_direct(lam: np.ndarray, max_goals: int) -> np.ndarray:
+    """P(X = k), k = 0..max_goals, pour chaque lambda (lambda <= 0: masse en 0)."""
+    k = np.arange(max_goals + 1)
+    log_fact = _LOG_FACTORIAL[k] if max_goals <= PMF_GRID_GOALS else np.array(
+        [math.lgamma(i + 1) for i in k]
+    )
+    positive = lam > 0
+    safe = np.where(positive, lam, 1.0)[..., None]
+    pmf = np.exp(k * np.log(safe) - safe - log_fact)
+    return np.where(positive[..., None], pmf, (k == 0).astype(float))
+
+
+@lru_cache(maxsize=1)
+def _pmf_grid() -> np.ndarray:
+    """Table [n_lambdas × (PMF_GRID_GOALS + 1)] calculée une fois par process."""
+    lambdas = np.arange(round(PMF_GRID_MAX / PMF_GRID_STEP) + 1) * PMF_GRID_STEP
+    table = _pmf_direct(lambdas, PMF_GRID_GOALS)
+    table.flags.writeable = False
+    return table
+
+
+def poisson_pmf(lam: ArrayLike, max_goals: int = DEFAULT_MAX_GOALS) -> np.ndarray:
+    """
+    PMF Poisson tronquée: shape lam.shape + (max_goals + 1,)
+
+    Les lambdas sur la grille (pas de 0.01, xG arrondis) sont lus dans la
+    table pré-calculée, les autres calculés directement.
+    """
+    lam = np.asarray(lam, dtype=float)
+    if max_goals > PMF_GRID_GOALS:
+        return _pmf_direct(lam, max_goals)
+
+    scaled = lam / PMF_GRID_STEP
+    index = np.rint(scaled)
+    on_grid = (np.abs(scaled - index) < 1e-9) & (index >= 0) & (index <= PMF_GRID_MAX / PMF_GRID_STEP)
+
+    if on_grid.all():
+        return _pmf_grid()[index.astype(int), :max_goals + 1]
+
+    out = _pmf_direct(lam, max_goals)
+    if on_grid.any():
+        out[on_grid] = _pmf_grid()[index[on_grid].astype(int), :max_goals + 1]
+    return out
+
+
+def poisson_over(lam: ArrayLike, threshold: float) -> np.ndarray:
+    """P(X > threshold) = 1 - P(X <= floor(threshold)), sans troncature."""
+    k = int(math.floor(threshold))
+    if k < 0:
+        return np.ones_like(np.asarray(lam, dtype=float))
+    return 1.0 - poisson_pmf(lam, k).sum(axis=-1)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# MASQUES (cache par taille de matrice)
+# ═══════════════════════════════════════════════════════════════════════
+
+@lru_cache(maxsize=32)
+def _masks(n_home: int, n_away: int) -> Dict[str, np.ndarray]:
+    h = np.arange(n_home)[:, None]
+    a = np.arange(n_away)[None, :]
+    total = h + a
+    masks = {
+        "home_win": (h > a).astype(float),
+        "draw": (h == a).astype(float),
+        "away_win": (h < a).astype(float),
+        # one-hot [home, away, total] pour la distribution du total
+        "total_one_hot": (total[..., None] == np.arange(n_home + n_away - 1)).astype(float),
+    }
+    for mask in masks.values():
+        mask.flags.writeable = False
+    return masks
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# DISTRIBUTION DE SCORES
+# ═══════════════════════════════════════════════════════════════════════
+
+class ScoreDistribution:
+    """
+    Matrice dense de probabilités de scores: matrix[..., home, away]
+
+    Les méthodes renvoient un float pour une matrice 2D, un array pour un lot.
+    """
+
+    __slots__ = ("matrix", "_totals")
+
+    def __init__(self, matrix: np.ndarray):
+        self.matrix = np.asarray(matrix, dtype=float)
+        self._totals = None
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.matrix.shape[-2:]
+
+    def _reduce(self, values: np.ndarray):
+        return float(values) if values.ndim == 0 else values
+
+    def _masked(self, name: str):
+        mask = _masks(*self.shape)[name]
+        return self._reduce(np.einsum("...ha,ha->...", self.matrix, mask))
+
+    # ─── Marginales ────────────────────────────────────────────────────────
+
+    def total_goals(self) -> np.ndarray:
+        """P(total = t), t = 0..(max_home + max_away)."""
+        if self._totals is None:
+            self._totals = np.einsum("...ha,hat->...t", self.matrix, _masks(*self.shape)["total_one_hot"])
+        return self._totals
+
+    def team_goals(self, team: str) -> np.ndarray:
+        """Distribution marginale des buts d'une équipe ("home" / "away")."""
+        return self.matrix.sum(axis=-1) if team == "home" else self.matrix.sum(axis=-2)
+
+    # ─── 1X2 ───────────────────────────────────────────────────────────────
+
+    def home_win(self):
+        return self._masked("home_win")
+
+    def draw(self):
+        return self._masked("draw")
+
+    def away_win(self):
+        return self._masked("away_win")
+
+    # ─── Totaux ────────────────────────────────────────────────────────────
+
+    def over(self, threshold: float):
+        """P(total > threshold)"""
+        first = max(int(math.floor(threshold)) + 1, 0)
+        return self._reduce(self.total_goals()[..., first:].sum(axis=-1))
+
+    def under(self, threshold: float):
+        """P(total < threshold)"""
+        last = max(int(math.ceil(threshold)), 0)
+        return self._reduce(self.total_goals()[..., :last].sum(axis=-1))
+
+    def exact_total(self, goals: int):
+        totals = self.total_goals()
+        if goals >= totals.shape[-1]:
+            return self._reduce(np.zeros(totals.shape[:-1]))
+        return self._reduce(totals[..., goals])
+
+    def odd_total(self):
+        return self._reduce(self.total_goals()[..., 1::2].sum(axis=-1))
+
+    def team_over(self, team: str, threshold: float):
+        """P(buts de l'équipe > threshold)"""
+        first = max(int(math.floor(threshold)) + 1, 0)
+        return self._reduce(self.team_goals(team)[..., first:].sum(axis=-1))
+
+    # ─── BTTS / clean sheets ───────────────────────────────────────────────
+
+    def btts_yes(self):
+        return self._reduce(self.matrix[..., 1:, 1:].sum(axis=(-2, -1)))
+
+    def clean_sheet(self, team: str):
+        """P(l'équipe n'encaisse pas)"""
+        column = self.matrix[..., :, 0] if team == "home" else self.matrix[..., 0, :]
+        return self._reduce(column.sum(axis=-1))
+
+    def win_to_nil(self, team: str):
+        """P(l'équipe gagne sans encaisser)"""
+        if team == "home":
+            return self._reduce(self.matrix[..., 1:, 0].sum(axis=-1))
+        return self._reduce(self.matrix[..., 0, 1:].sum(axis=-1))
+
+    # ─── Scores exacts ─────────────────────────────────────────────────────
+
+    def score(self, home: int, away: int):
+        n_home, n_away = self.shape
+        if home >= n_home or away >= n_away:
+            return self._reduce(np.zeros(self.matrix.shape[:-2]))
+        return self._reduce(self.matrix[..., home, away])
+
+    def top_scores(self, n: int = 10) -> List[Tuple[Tuple[int, int], float]]:
+        """Les n scores les plus probables (matrice 2D)."""
+        flat = self.matrix.ravel()
+        order = np.argsort(-flat, kind="stable")[:n]
+        n_away = self.shape[1]
+        return [((int(i // n_away), int(i % n_away)), float(flat[i])) for i in order]
+
+    def as_dict(self) -> Dict[Tuple[int, int], float]:
+        """{(home, away): p} pour les appelants historiques (matrice 2D)."""
+        n_home, n_away = self.shape
+        values = self.matrix.ravel().tolist()
+        return {(h, a): values[h * n_away + a] for h in range(n_home) for a in range(n_away)}
+
+    # ─── Tous les marchés ──────────────────────────────────────────────────
+
+    def markets(self) -> Dict[str, Union[float, np.ndarray]]:
+        """Marchés standard: 1X2, double chance, totaux, BTTS, équipes, clean sheets."""
+        home, draw, away = self.home_win(), self.draw(), self.away_win()
+        btts = self.btts_yes()
+        out = {
+            "home_win": home, "draw": draw, "away_win": away,
+            "dc_1x": home + draw, "dc_x2": draw + away, "dc_12": home + away,
+            "btts_yes": btts, "btts_no": 1 - btts,
+        }
+        for line in TOTAL_LINES:
+            suffix = f"{int(line * 10):02d}"
+            out[f"over_{suffix}"] = self.over(line)
+            out[f"under_{suffix}"] = self.under(line)
+        for team in ("home", "away"):
+            for line in TEAM_LINES:
+                out[f"{team}_over_{int(line * 10):02d}"] = self.team_over(team, line)
+            out[f"clean_sheet_{team}"] = self.clean_sheet(team)
+        odd = self.odd_total()
+        out["odd_goals"], out["even_goals"] = odd, 1 - odd
+        return out
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# CONSTRUCTION
+# ═══════════════════════════════════════════════════════════════════════
+
+def score_matrix(lambda_home: ArrayLike, lambda_away: ArrayLike,
+                 rho: float = 0.0,
+                 max_goals: int = DEFAULT_MAX_GOALS,
+                 tau: Optional[Sequence[Sequence[float]]] = None,
+                 normalize: bool = True) -> ScoreDistribution:
+    """
+    Matrice de scores Poisson indépendante, corrigée Dixon-Coles.
+
+    Args:
+        lambda_home, lambda_away: espérances de buts (scalaires ou arrays de même forme)
+        rho: corrélation Dixon-Coles (0 = Poisson indépendant)
+        max_goals: buts max par équipe (matrice (max_goals+1)²)
+        tau: multiplicateurs fixes [[0-0, 0-1], [1-0, 1-1]] à la place de rho
+        normalize: renormaliser la masse tronquée à 1
+    """
+    lam_h = np.asarray(lambda_home, dtype=float)
+    lam_a = np.asarray(lambda_away, dtype=float)
+    lam_h, lam_a = np.broadcast_arrays(lam_h, lam_a)
+
+    matrix = poisson_pmf(lam_h, max_goals)[..., :, None] * poisson_pmf(lam_a, max_goals)[..., None, :]
+
+    if tau is not None:
+        matrix[..., :2, :2] *= np.asarray(tau, dtype=float)
+    elif rho:
+        matrix[..., 0, 0] *= np.maximum(1.0 - lam_h * lam_a * rho, 0.0)
+        matrix[..., 0, 1] *= np.maximum(1.0 + lam_h * rho, 0.0)
+        matrix[..., 1, 0] *= np.maximum(1.0 + lam_a * rho, 0.0)
+        matrix[..., 1, 1] *= max(1.0 - rho, 0.0)
+
+    if normalize:
+        total = matrix.sum(axis=(-2, -1), keepdims=True)
+        matrix = np.divide(matrix, total, out=matrix, where=total > 0)
+
+    return ScoreDistribution(matrix)
+
+
+def half_time_split(lambda_home: ArrayLike, lambda_away: ArrayLike,
+                    ht_ratio: float = 0.45,
+                    rho: float = 0.0,
+                    max_goals: int = DEFAULT_MAX_GOALS,
+                    normalize: bool = True) -> Tuple[ScoreDistribution, ScoreDistribution]:
+    """
+    Distributions par mi-temps: (1ère mi-temps, 2ème mi-temps)
+
+    lambda_HT = lambda_FT × ht_ratio, lambda_2H = lambda_FT × (1 - ht_ratio)
+    """
+    lam_h = np.asarray(lambda_home, dtype=float)
+    lam_a = np.asarray(lambda_away, dtype=float)
+    first = score_matrix(lam_h * ht_ratio, lam_a * ht_ratio, rho, max_goals, normalize=normalize)
+    second = score_matrix(lam_h * (1 - ht_ratio), lam_a * (1 - ht_ratio), rho, max_goals, normalize=normalize)
+    return first, second
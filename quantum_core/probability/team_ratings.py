@@ -0,0 +1,603 @@
+"""
+QUANTUM CORE - TEAM RATINGS
+===========================
+Ratings attaque / défense / avantage domicile ajustés sur match_results
+
+Remplace les forces heuristiques (xg_for/xg_against par défaut du
+DataHubAdapter, predicted_goals de la friction) par un modèle Dixon-Coles
+ajusté par maximum de vraisemblance pondérée:
+
+    log λ_home = c[ligue] + h[ligue] + att[home] - def[away]
+    log λ_away = c[ligue]            + att[away] - def[home]
+    P(x, y)    = τ_rho(x, y) · Poisson(x | λ_home) · Poisson(y | λ_away)
+
+✅ Pondération temporelle w = exp(-xi · âge en jours) (Dixon & Coles 1997)
+✅ Vraisemblance vectorisée, gradients creux par np.bincount: chaque bloc
+   (att, def, c, h) a un hessien diagonal → pas de Newton exact par bloc
+✅ Ridge L2 sur att/def: équipes peu jouées tirées vers la moyenne, ligues
+   non connectées identifiables
+✅ rho estimé ensuite à lambdas fixés (profil 1D, section dorée)
+✅ Warm start: le fit précédent initialise le suivant → quelques itérations
+   après une journée, toutes les ligues en un seul process
+✅ Walk-forward point-in-time pour les backtests (aucun look-ahead)
+
+Usage:
+    matches = MatchArrays.from_records(rows)            # match_results
+    ratings = fit_ratings(matches, previous=load_ratings())
+    ratings.save()
+    lambda_home, lambda_away = ratings.lambdas("Liverpool", "Chelsea")
+
+    python -m quantum_core.probability.team_ratings fit
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .score_engine import ScoreDistribution, score_matrix
+
+logger = logging.getLogger(__name__)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ═══════════════════════════════════════════════════════════════════════
+
+DEFAULT_RATINGS_PATH = Path("/home/Mon_ps/data/quantum_v2/team_ratings.json")
+
+# Dixon-Coles: xi = 0.0065 par demi-semaine ≈ 0.0019 par jour (demi-vie ~1 an)
+XI_PER_DAY = 0.0019
+# Ridge sur att/def (en "matchs pondérés")
+L2_PENALTY = 1.0
+# Avantage domicile initial (log) et bornes de rho
+HOME_ADVANTAGE_INIT = 0.25
+RHO_BOUNDS = (-0.25, 0.25)
+
+MAX_ITER = 500
+TOLERANCE = 1e-6
+
+# load_ratings: stat du fichier au plus une fois par intervalle (hot path
+# DataHubAdapter.prepare_matchup_data, un appel par match)
+RELOAD_CHECK_SECONDS = 30.0
+
+_EPOCH = date(1970, 1, 1)
+
+
+def _as_day(value: Any) -> float:
+    """date / datetime / ISO -> jours depuis 1970-01-01."""
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    if isinstance(value, np.datetime64):
+        return float(value.astype("datetime64[D]").astype(np.int64))
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if isinstance(value, datetime):
+        value = value.date()
+    return float((value - _EPOCH).days)
+
+
+def _day_to_iso(day: float) -> str:
+    return date.fromordinal(_EPOCH.toordinal() + int(day)).isoformat()
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# MATCHS EN COLONNES
+# ═══════════════════════════════════════════════════════════════════════
+
+@dataclass
+class MatchArrays:
+    """Matchs terminés en colonnes (indices équipe/ligue, buts, jour)."""
+    home_idx: np.ndarray
+    away_idx: np.ndarray
+    league_idx: np.ndarray
+    home_goals: np.ndarray
+    away_goals: np.ndarray
+    days: np.ndarray
+    teams: List[str]
+    leagues: List[str]
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "MatchArrays":
+        """
+        Lignes dict de match_results (score_home/score_away/commence_time/league)
+        ou matches_results (home_goals/away_goals/match_date).
+        """
+        team_index: Dict[str, int] = {}
+        league_index: Dict[str, int] = {}
+        home, away, league, hg, ag, days = [], [], [], [], [], []
+
+        for row in records:
+            home_goals = row.get("home_goals", row.get("score_home"))
+            away_goals = row.get("away_goals", row.get("score_away"))
+            when = row.get("match_date", row.get("commence_time"))
+            if home_goals is None or away_goals is None or when is None:
+                continue
+            home.append(team_index.setdefault(row["home_team"], len(team_index)))
+            away.append(team_index.setdefault(row["away_team"], len(team_index)))
+            name = row.get("league") or row.get("sport") or "unknown"
+            league.append(league_index.setdefault(name, len(league_index)))
+            hg.append(int(home_goals))
+            ag.append(int(away_goals))
+            days.append(_as_day(when))
+
+        return cls(
+            home_idx=np.array(home, dtype=np.int64), away_idx=np.array(away, dtype=np.int64),
+            league_idx=np.array(league, dtype=np.int64),
+            home_goals=np.array(hg, dtype=float), away_goals=np.array(ag, dtype=float),
+            days=np.array(days, dtype=float),
+            teams=list(team_index), leagues=list(league_index),
+        )
+
+    @classmethod
+    def from_match_frame(cls, frame) -> "MatchArrays":
+        """Depuis le MatchFrame du backtester vectorisé (mêmes indices d'équipe)."""
+        return cls(
+            home_idx=np.asarray(frame.home_idx, dtype=np.int64),
+            away_idx=np.asarray(frame.away_idx, dtype=np.int64),
+            league_idx=np.asarray(frame.league_idx, dtype=np.int64),
+            home_goals=np.asarray(frame.home_goals, dtype=float),
+            away_goals=np.asarray(frame.away_goals, dtype=float),
+            days=np.asarray(frame.dates, dtype="datetime64[D]").astype(np.int64).astype(float),
+            teams=list(frame.team_names), leagues=list(frame.league_names),
+        )
+
+    def select(self, mask: np.ndarray) -> "MatchArrays":
+        """Sous-ensemble de matchs (mêmes tables d'équipes/ligues)."""
+        return MatchArrays(
+            self.home_idx[mask], self.away_idx[mask], self.league_idx[mask],
+            self.home_goals[mask], self.away_goals[mask], self.days[mask],
+            self.teams, self.leagues,
+        )
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# RATINGS
+# ═══════════════════════════════════════════════════════════════════════
+
+@dataclass
+class TeamRatings:
+    """Paramètres ajustés + accès aux lambdas d'un match."""
+    teams: List[str]
+    leagues: List[str]
+    attack: np.ndarray
+    defence: np.ndarray
+    team_league: np.ndarray          # ligue de référence (dernier match) par équipe
+    intercept: np.ndarray            # c[ligue]
+    home_advantage: np.ndarray       # h[ligue]
+    games: Optional[np.ndarray] = None  # matchs joués par équipe (0 = pas de rating)
+    rho: float = 0.0
+    xi: float = XI_PER_DAY
+    as_of: str = ""
+    n_matches: int = 0
+    iterations: int = 0
+    log_likelihood: float = 0.0
+    _index: Dict[str, int] = field(default_factory=dict, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.games is None:
+            self.games = np.ones(len(self.teams), dtype=np.int64)
+        rated = [(name, i) for i, name in enumerate(self.teams) if self.games[i] > 0]
+        self._index = dict(rated)
+        self._lower = {name.lower(): i for name, i in rated}
+
+    def team_id(self, team: str) -> Optional[int]:
+        i = self._index.get(team)
+        return i if i is not None else self._lower.get(team.lower())
+
+    def has(self, team: str) -> bool:
+        return self.team_id(team) is not None
+
+    def lambdas_many(self, home_idx: np.ndarray, away_idx: np.ndarray,
+                     league_idx: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Lambdas vectorisés (indices de ce fit). Ligue par défaut: celle du domicile."""
+        home_idx = np.asarray(home_idx)
+        away_idx = np.asarray(away_idx)
+        league = self.team_league[home_idx] if league_idx is None else np.asarray(league_idx)
+        base = self.intercept[league]
+        lambda_home = np.exp(base + self.home_advantage[league] + self.attack[home_idx] - self.defence[away_idx])
+        lambda_away = np.exp(base + self.attack[away_idx] - self.defence[home_idx])
+        return lambda_home, lambda_away
+
+    def lambdas(self, home: str, away: str) -> Tuple[float, float]:
+        """(λ_home, λ_away) d'un match. KeyError si une équipe n'a pas de rating."""
+        h, a = self.team_id(home), self.team_id(away)
+        if h is None or a is None:
+            raise KeyError(f"Pas de rating pour {home if h is None else away}")
+        lambda_home, lambda_away = self.lambdas_many(np.array([h]), np.array([a]))
+        return float(lambda_home[0]), float(lambda_away[0])
+
+    def score_distribution(self, home: str, away: str, max_goals: int = 10) -> ScoreDistribution:
+        lambda_home, lambda_away = self.lambdas(home, away)
+        return score_matrix(lambda_home, lambda_away, rho=self.rho, max_goals=max_goals)
+
+    # ─── Persistance ───────────────────────────────────────────────────────
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "as_of": self.as_of,
+            "xi": self.xi,
+            "rho": self.rho,
+            "n_matches": self.n_matches,
+            "iterations": self.iterations,
+            "log_likelihood": self.log_likelihood,
+            "leagues": {
+                name: {"intercept": float(self.intercept[i]), "home_advantage": float(self.home_advantage[i])}
+                for i, name in enumerate(self.leagues)
+            },
+            "teams": {
+                name: {
+                    "attack": float(self.attack[i]),
+                    "defence": float(self.defence[i]),
+                    "league": self.leagues[self.team_league[i]],
+                    "games": int(self.games[i]),
+                }
+                for i, name in enumerate(self.teams) if self.games[i] > 0
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TeamRatings":
+        leagues = list(data["leagues"])
+        league_index = {name: i for i, name in enumerate(leagues)}
+        teams = list(data["teams"])
+        return cls(
+            teams=teams,
+            leagues=leagues,
+            attack=np.array([data["teams"][t]["attack"] for t in teams], dtype=float),
+            defence=np.array([data["teams"][t]["defence"] for t in teams], dtype=float),
+            team_league=np.array([league_index[data["teams"][t]["league"]] for t in teams], dtype=np.int64),
+            intercept=np.array([data["leagues"][l]["intercept"] for l in leagues], dtype=float),
+            home_advantage=np.array([data["leagues"][l]["home_advantage"] for l in leagues], dtype=float),
+            games=np.array([data["teams"][t].get("games", 1) for t in teams], dtype=np.int64),
+            rho=float(data.get("rho", 0.0)),
+            xi=float(data.get("xi", XI_PER_DAY)),
+            as_of=data.get("as_of", ""),
+            n_matches=int(data.get("n_matches", 0)),
+            iterations=int(data.get("iterations", 0)),
+            log_likelihood=float(data.get("log_likelihood", 0.0)),
+        )
+
+    def save(self, path: Path = DEFAULT_RATINGS_PATH) -> None:
+        """Écriture atomique (les lecteurs ne voient jamais un fichier partiel)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.to_dict(), indent=1))
+        os.replace(tmp, path)
+        _checked.pop(str(path), None)
+
+
+_loaded: Dict[str, Tuple[int, TeamRatings]] = {}
+_checked: Dict[str, Tuple[float, Optional[TeamRatings]]] = {}
+
+
+def load_ratings(path: Path = DEFAULT_RATINGS_PATH) -> Optional[TeamRatings]:
+    """
+    Dernier fit sauvegardé, None si absent. Le fichier n'est re-stat qu'après
+    RELOAD_CHECK_SECONDS (ou un save() dans ce process), et relu seulement
+    s'il a changé.
+    """
+    key = str(path)
+    now = time.monotonic()
+    checked = _checked.get(key)
+    if checked is not None and now - checked[0] < RELOAD_CHECK_SECONDS:
+        return checked[1]
+
+    try:
+        mtime = Path(path).stat().st_mtime_ns
+    except OSError:
+        ratings = None
+    else:
+        cached = _loaded.get(key)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, TeamRatings.from_dict(json.loads(Path(path).read_text())))
+            _loaded[key] = cached
+        ratings = cached[1]
+    _checked[key] = (now, ratings)
+    return ratings
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# AJUSTEMENT
+# ═══════════════════════════════════════════════════════════════════════
+
+def _tau(rho: float, hg, ag, lh, la) -> np.ndarray:
+    tau = np.ones_like(lh)
+    tau = np.where((hg == 0) & (ag == 0), 1.0 - lh * la * rho, tau)
+    tau = np.where((hg == 0) & (ag == 1), 1.0 + lh * rho, tau)
+    tau = np.where((hg == 1) & (ag == 0), 1.0 + la * rho, tau)
+    tau = np.where((hg == 1) & (ag == 1), 1.0 - rho, tau)
+    return tau
+
+
+def _fit_rho(w, hg, ag, lh, la) -> float:
+    """Maximise Σ w·log τ_rho à lambdas fixés (section dorée sur RHO_BOUNDS)."""
+    low = (hg <= 1) & (ag <= 1)
+    if not low.any():
+        return 0.0
+    w, hg, ag, lh, la = w[low], hg[low], ag[low], lh[low], la[low]
+
+    def objective(rho):
+        tau = _tau(rho, hg, ag, lh, la)
+        if (tau <= 0).any():
+            return -np.inf
+        return float(np.sum(w * np.log(tau)))
+
+    lo, hi = RHO_BOUNDS
+    ratio = (math.sqrt(5) - 1) / 2
+    x1, x2 = hi - ratio * (hi - lo), lo + ratio * (hi - lo)
+    f1, f2 = objective(x1), objective(x2)
+    for _ in range(40):
+        if f1 < f2:
+            lo, x1, f1 = x1, x2, f2
+            x2 = lo + ratio * (hi - lo)
+            f2 = objective(x2)
+        else:
+            hi, x2, f2 = x2, x1, f1
+            x1 = hi - ratio * (hi - lo)
+            f1 = objective(x1)
+    return (lo + hi) / 2
+
+
+def _league_shift_step(values, sign, own_home, own_away, li, team_league, w,
+                       resid_home, resid_away, lh, la, l2, n_leagues) -> np.ndarray:
+    """
+    Pas de Newton par ligue L le long de (values[équipes de L] + t, c[L] - sign·t).
+
+    Pour l'attaque (sign=+1, own=(home, away)) log λ_home varie de
+    1[ligue(home)=L] - 1[match de L]; pour la défense (sign=-1, own=(away, home))
+    de -(1[ligue(away)=L] - 1[match de L]). Hessien diagonal par ligue
+    (couplage entre ligues seulement via les coupes).
+    """
+    size = np.maximum(np.bincount(team_league, minlength=n_leagues), 1)
+    own_home_league = team_league[own_home]
+    own_away_league = team_league[own_away]
+    same_home = own_home_league == li
+    same_away = own_away_league == li
+
+    grad = sign * (
+        np.bincount(own_home_league, w * resid_home, n_leagues) - np.bincount(li, w * resid_home, n_leagues)
+        + np.bincount(own_away_league, w * resid_away, n_leagues) - np.bincount(li, w * resid_away, n_leagues)
+    ) - l2 * np.bincount(team_league, values, n_leagues)
+    hess = (
+        np.bincount(own_home_league, w * lh * ~same_home, n_leagues) + np.bincount(li, w * lh * ~same_home, n_leagues)
+        + np.bincount(own_away_league, w * la * ~same_away, n_leagues) + np.bincount(li, w * la * ~same_away, n_leagues)
+        + l2 * size
+    )
+    return grad / hess
+
+
+def fit_ratings(
+    matches: MatchArrays,
+    as_of: Any = None,
+    xi: float = XI_PER_DAY,
+    l2: float = L2_PENALTY,
+    previous: Optional[TeamRatings] = None,
+    max_iter: int = MAX_ITER,
+    tol: float = TOLERANCE,
+) -> TeamRatings:
+    """
+    Ajuste att/def/c/h (+ rho) sur les matchs joués avant as_of.
+
+    Args:
+        matches: matchs terminés (toutes ligues)
+        as_of: date de référence des poids (défaut: dernier match)
+        xi: décroissance temporelle par jour
+        l2: ridge sur att/def
+        previous: fit précédent (warm start par nom d'équipe / de ligue)
+    """
+    ref_day = _as_day(as_of) if as_of is not None else (float(matches.days.max()) if len(matches) else 0.0)
+    played = matches.select(matches.days <= ref_day)
+
+    n_teams, n_leagues = len(played.teams), len(played.leagues)
+    hi, ai, li = played.home_idx, played.away_idx, played.league_idx
+    hg, ag = played.home_goals, played.away_goals
+    w = np.exp(-xi * (ref_day - played.days))
+
+    # ─── Initialisation (warm start) ───────────────────────────────────────
+    attack = np.zeros(n_teams)
+    defence = np.zeros(n_teams)
+    goals_per_side = np.bincount(li, w * (hg + ag), n_leagues) / np.maximum(2 * np.bincount(li, w, n_leagues), 1e-12)
+    intercept = np.log(np.maximum(goals_per_side, 0.1))
+    home_adv = np.full(n_leagues, HOME_ADVANTAGE_INIT)
+    rho = 0.0
+    if previous is not None:
+        for i, name in enumerate(played.teams):
+            j = previous.team_id(name)
+            if j is not None:
+                attack[i], defence[i] = previous.attack[j], previous.defence[j]
+        prev_leagues = {name: i for i, name in enumerate(previous.leagues)}
+        for i, name in enumerate(played.leagues):
+            if name in prev_leagues:
+                intercept[i] = previous.intercept[prev_leagues[name]]
+                home_adv[i] = previous.home_advantage[prev_leagues[name]]
+        rho = previous.rho
+
+    # Ligue de référence d'une équipe: celle de son dernier match
+    team_league = np.zeros(n_teams, dtype=np.int64)
+    order = np.argsort(played.days, kind="stable")
+    team_league[hi[order]] = li[order]
+    team_league[ai[order]] = li[order]
+    games = np.bincount(hi, minlength=n_teams) + np.bincount(ai, minlength=n_teams)
+
+    def rates():
+        base = intercept[li]
+        return np.exp(base + home_adv[li] + attack[hi] - defence[ai]), np.exp(base + attack[ai] - defence[hi])
+
+    # ─── Newton par blocs (hessiens diagonaux) ─────────────────────────────
+    iterations = 0
+    for iterations in range(1, max_iter + 1):
+        lh, la = rates()
+        grad = np.bincount(hi, w * (hg - lh), n_teams) + np.bincount(ai, w * (ag - la), n_teams) - l2 * attack
+        hess = np.bincount(hi, w * lh, n_teams) + np.bincount(ai, w * la, n_teams) + l2
+        step_att = grad / hess
+        attack += step_att
+
+        lh, la = rates()
+        grad = -np.bincount(ai, w * (hg - lh), n_teams) - np.bincount(hi, w * (ag - la), n_teams) - l2 * defence
+        hess = np.bincount(ai, w * lh, n_teams) + np.bincount(hi, w * la, n_teams) + l2
+        step_def = grad / hess
+        defence += step_def
+
+        lh, la = rates()
+        hess = np.bincount(li, w * (lh + la), n_leagues)
+        step_c = np.divide(np.bincount(li, w * (hg - lh + ag - la), n_leagues), hess,
+                           out=np.zeros(n_leagues), where=hess > 0)
+        intercept += step_c
+
+        lh, la = rates()
+        hess = np.bincount(li, w * lh, n_leagues)
+        step_h = np.divide(np.bincount(li, w * (hg - lh), n_leagues), hess,
+                           out=np.zeros(n_leagues), where=hess > 0)
+        home_adv += step_h
+
+        # Directions (att[ligue]+t, c-t) et (def[ligue]+t, c+t): plates pour
+        # les matchs internes à la ligue, seul le ridge (et les coupes) les
+        # contraint → pas de Newton explicite au lieu de ramper via le ridge
+        lh, la = rates()
+        step_s = _league_shift_step(attack, +1.0, hi, ai, li, team_league, w, hg - lh, ag - la, lh, la, l2, n_leagues)
+        attack += step_s[team_league]
+        intercept -= step_s
+        lh, la = rates()
+        step_u = _league_shift_step(defence, -1.0, ai, hi, li, team_league, w, hg - lh, ag - la, lh, la, l2, n_leagues)
+        defence += step_u[team_league]
+        intercept += step_u
+
+        largest = max(np.abs(step).max(initial=0) for step in (step_att, step_def, step_c, step_h, step_s, step_u))
+        if largest < tol:
+            break
+
+    lh, la = rates()
+    rho = _fit_rho(w, hg, ag, lh, la) if len(played) else rho
+    log_likelihood = float(np.sum(w * (
+        hg * np.log(lh) - lh + ag * np.log(la) - la + np.log(_tau(rho, hg, ag, lh, la))
+    )))
+
+    return TeamRatings(
+        teams=list(played.teams), leagues=list(played.leagues),
+        attack=attack, defence=defence, team_league=team_league,
+        intercept=intercept, home_advantage=home_adv, games=games, rho=float(rho), xi=xi,
+        as_of=_day_to_iso(ref_day), n_matches=len(played),
+        iterations=iterations, log_likelihood=log_likelihood,
+    )
+
+
+def walk_forward_lambdas(
+    matches: MatchArrays,
+    refit_every_days: int = 7,
+    min_history_days: int = 60,
+    **fit_kwargs,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lambdas point-in-time pour chaque match (backtests sans look-ahead).
+
+    Un fit tous les refit_every_days sur les matchs strictement antérieurs,
+    chacun warm-starté depuis le précédent. NaN: pas assez d'historique ou
+    équipe encore jamais vue.
+    """
+    lambda_home = np.full(len(matches), np.nan)
+    lambda_away = np.full(len(matches), np.nan)
+    if not len(matches):
+        return lambda_home, lambda_away
+
+    first, last = matches.days.min(), matches.days.max()
+    previous = None
+    cutoff = first + min_history_days
+    while cutoff <= last:
+        window = (matches.days >= cutoff) & (matches.days < cutoff + refit_every_days)
+        if window.any():
+            history = matches.select(matches.days < cutoff)
+            previous = fit_ratings(history, as_of=cutoff - 1, previous=previous, **fit_kwargs)
+            # Tables d'équipes communes: seules les équipes déjà vues ont un rating
+            seen = previous.games > 0
+            rows = np.flatnonzero(window & seen[matches.home_idx] & seen[matches.away_idx])
+            lh, la = previous.lambdas_many(matches.home_idx[rows], matches.away_idx[rows], matches.league_idx[rows])
+            lambda_home[rows], lambda_away[rows] = lh, la
+        cutoff += refit_every_days
+    return lambda_home, lambda_away
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# CLI (cron: nuit + après chaque résolution de résultats)
+# ═══════════════════════════════════════════════════════════════════════
+
+def load_match_results(conn, since: Optional[str] = None) -> MatchArrays:
+    """Tous les matchs terminés de match_results, en une requête."""
+    query = """
+        SELECT home_team, away_team, score_home, score_away, commence_time,
+               COALESCE(league, sport) AS league
+        FROM match_results
+        WHERE is_finished = true AND score_home IS NOT NULL AND score_away IS NOT NULL
+    """
+    params: List[Any] = []
+    if since:
+        query += " AND commence_time >= %s"
+        params.append(since)
+    with conn.cursor() as cur:
+        cur.execute(query, params)
+        columns = [c[0] for c in cur.description]
+        return MatchArrays.from_records(dict(zip(columns, row)) for row in cur.fetchall())
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Ratings Dixon-Coles des équipes")
+    sub = parser.add_subparsers(dest="command", required=True)
+    fit = sub.add_parser("fit", help="Ajuster toutes les ligues (warm start depuis le dernier fit)")
+    fit.add_argument("--since", default=None, help="Date ISO minimale des matchs")
+    fit.add_argument("--xi", type=float, default=XI_PER_DAY)
+    fit.add_argument("--path", type=Path, default=DEFAULT_RATINGS_PATH)
+    fit.add_argument("--cold", action="store_true", help="Ignorer le fit précédent")
+    show = sub.add_parser("show", help="Lambdas d'un match")
+    show.add_argument("home")
+    show.add_argument("away")
+    show.add_argument("--path", type=Path, default=DEFAULT_RATINGS_PATH)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(name)s | %(levelname)s | %(message)s")
+
+    if args.command == "show":
+        ratings = load_ratings(args.path)
+        if ratings is None:
+            print(f"Aucun fit dans {args.path}")
+            return 1
+        lambda_home, lambda_away = ratings.lambdas(args.home, args.away)
+        markets = ratings.score_distribution(args.home, args.away).markets()
+        print(f"λ {lambda_home:.2f} - {lambda_away:.2f} | 1X2 {markets['home_win']:.3f} / "
+              f"{markets['draw']:.3f} / {markets['away_win']:.3f} | O2.5 {markets['over_25']:.3f}")
+        return 0
+
+    import psycopg2
+    from quantum_core.data.orchestrator import DB_CONFIG
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        matches = load_match_results(conn, args.since)
+    finally:
+        conn.close()
+
+    previous = None if args.cold else load_ratings(args.path)
+    start = time.perf_counter()
+    ratings = fit_ratings(matches, xi=args.xi, previous=previous)
+    elapsed = time.perf_counter() - start
+    ratings.save(args.path)
+    logger.info(
+        f"Ratings: {len(ratings.teams)} équipes, {len(ratings.leagues)} ligues, {ratings.n_matches} matchs, "
+        f"{ratings.iterations} itérations ({'warm' if previous else 'cold'}) en {elapsed:.2f}s, rho={ratings.rho:.3f}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
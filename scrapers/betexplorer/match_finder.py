@@ -13,8 +13,13 @@ import re
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Tuple
 import logging
+import sys
 from difflib import SequenceMatcher
 
+sys.path.insert(0, '/home/Mon_ps')
+from services.scraping.parsers import parse_betexplorer_league_matches
+from services.scraping.raw_archive import archive_response
+
 from anti_ban import rate_limiter, get_headers, retry_with_backoff, ScraperSession
 from league_mapping import get_betexplorer_url, normalize_team_name, BASE_URL
 from match_validator import validate_match, normalize_for_comparison, MIN_TEAM_SIMILARITY
@@ -79,45 +84,12 @@ def get_league_matches(league_url: str, results: bool = True, session: ScraperSe
         resp = requests.get(url, headers=get_headers(BASE_URL + league_url), timeout=15)
         resp.raise_for_status()
 
-    soup = BeautifulSoup(resp.text, 'lxml')
-    matches = []
-
-    # Trouver la table principale
-    table = soup.find('table', {'class': 'table-main'})
-    if not table:
-        logger.warning(f"No table-main found at {url}")
+    archive_response(url, resp)
+    matches = parse_betexplorer_league_matches(resp.content, url)
+    if not matches:
+        logger.warning(f"No matches parsed at {url}")
         return matches
 
-    # Parser chaque ligne
-    for row in table.find_all('tr'):
-        # Chercher le lien du match
-        link = row.find('a', href=re.compile(r'/football/[^/]+/[^/]+/[^/]+-[^/]+/[a-zA-Z0-9]+/?$'))
-        if not link:
-            continue
-
-        href = link['href']
-        match_id = href.rstrip('/').split('/')[-1]
-        match_text = link.text.strip()
-
-        # Parser "Team1 - Team2"
-        if ' - ' in match_text:
-            teams = match_text.split(' - ')
-            if len(teams) >= 2:
-                home_team = teams[0].strip()
-                away_team = teams[1].strip()
-
-                # Chercher le score
-                score_elem = row.find('td', {'class': re.compile(r'.*score.*', re.I)})
-                score = score_elem.text.strip() if score_elem else None
-
-                matches.append({
-                    'match_id': match_id,
-                    'match_url': href,
-                    'home_team': home_team,
-                    'away_team': away_team,
-                    'score': score,
-                })
-
     logger.info(f"Found {len(matches)} matches")
     return matches
 
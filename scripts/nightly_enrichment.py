@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+NIGHTLY ENRICHMENT - toutes les sources dans une seule boucle asyncio
+═══════════════════════════════════════════════════════════════════════════
+Un seul AsyncFetcher (services.scraping) partagé par les scrapers migrés:
+chaque domaine garde son budget (DOMAIN_POLICIES), mais understat et
+transfermarkt avancent en parallèle au lieu de tourner l'un après l'autre.
+
+Chaînes lancées ensemble:
+- understat: master (ligues) → full enrichment (équipes) → shots
+- understat xG par équipe (backend/scripts/data_enrichment/understat_scraper)
+- transfermarkt: buteurs + blessés (data_enrichment/transfermarkt_all_leagues)
+
+Les écritures (JSON, PostgreSQL) partent dans un thread: elles ne bloquent
+pas les fetchs des autres sources.
+
+Hors périmètre (fetch synchrone conservé):
+- fbref: Cloudflare exige l'empreinte TLS Chrome de curl_cffi, httpx est
+  bloqué (cron_fbref_update.sh reste à part)
+- betexplorer: recherche match par match à la demande (ScraperSession,
+  cookies initialisés sur la home), pas un batch nocturne
+═══════════════════════════════════════════════════════════════════════════
+
+Usage:
+    python3 scripts/nightly_enrichment.py
+"""
+
+import asyncio
+import importlib.util
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, '/home/Mon_ps')
+
+from services.scraping import AsyncFetcher, RawArchive
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DATA_ENRICHMENT_DIR = SCRIPTS_DIR.parent / 'backend' / 'scripts' / 'data_enrichment'
+
+
+def load_script(path: Path, name: str):
+    """
+    Charge un script par chemin: scripts/understat_scraper.py et
+    data_enrichment/understat_scraper.py portent le même nom de module.
+    """
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+master = load_script(SCRIPTS_DIR / 'understat_master_v2.py', 'understat_master_v2')
+full_enrichment = load_script(SCRIPTS_DIR / 'understat_full_enrichment.py', 'understat_full_enrichment')
+shots = load_script(SCRIPTS_DIR / 'understat_shots_scraper.py', 'understat_shots_scraper')
+understat_xg = load_script(DATA_ENRICHMENT_DIR / 'understat_scraper.py', 'data_enrichment_understat_scraper')
+transfermarkt = load_script(DATA_ENRICHMENT_DIR / 'transfermarkt_all_leagues.py', 'transfermarkt_all_leagues')
+
+
+async def understat_chain(fetcher, replay, archive):
+    """Master → full enrichment → shots: chaque étape lit la sortie de la précédente."""
+    league_data = await master.fetch_leagues(fetcher, list(master.LEAGUES))
+    all_data = master.collect_leagues(league_data)
+    await asyncio.to_thread(master.write_outputs, all_data)
+
+    teams_dna_path = full_enrichment.QUANTUM_DIR / 'teams_context_dna.json'
+    teams_dna = json.loads(await asyncio.to_thread(teams_dna_path.read_text))
+    team_data = await full_enrichment.fetch_teams(fetcher, teams_dna.keys())
+    enriched, failed = full_enrichment.enrich(teams_dna, team_data)
+    await asyncio.to_thread(full_enrichment.save_and_report, teams_dna_path, teams_dna, enriched, failed)
+
+    league_shots = await shots.fetch_league_shots(fetcher, replay, archive, list(shots.LEAGUES), shots.SEASON)
+    await asyncio.to_thread(shots.save_shots_against, league_shots)
+
+
+async def understat_xg_chain(fetcher):
+    matches = await understat_xg.scrape_teams(fetcher)
+    await asyncio.to_thread(understat_xg.save_and_report, matches)
+
+
+async def transfermarkt_chain(fetcher):
+    league_results = await transfermarkt.scrape_leagues(fetcher)
+    await asyncio.to_thread(transfermarkt.save_and_report, league_results)
+
+
+async def run_nightly():
+    """
+    Lance les chaînes en parallèle; l'échec d'une source n'arrête pas les
+    autres. Retourne {chaîne: exception ou None}.
+    """
+    archive = RawArchive()
+    try:
+        async with AsyncFetcher(archive=archive) as fetcher, \
+                AsyncFetcher(archive=archive, offline=True) as replay:
+            chains = {
+                'understat': understat_chain(fetcher, replay, archive),
+                'understat_xg': understat_xg_chain(fetcher),
+                'transfermarkt': transfermarkt_chain(fetcher),
+            }
+            results = await asyncio.gather(*chains.values(), return_exceptions=True)
+            print(f"\n🌐 Domaines: {fetcher.domain_stats()}")
+            print(f"📊 Fetcher: {fetcher.stats}")
+            return dict(zip(chains, results))
+    finally:
+        archive.close()
+
+
+def main():
+    print("=" * 70)
+    print("🌙 NIGHTLY ENRICHMENT")
+    print("=" * 70)
+
+    t0 = time.time()
+    results = asyncio.run(run_nightly())
+
+    print(f"\n⏱️ {time.time() - t0:.0f}s")
+    for chain, error in results.items():
+        print(f"   {'✅' if error is None else '❌'} {chain}" + (f": {error!r}" if error else ""))
+
+    return 1 if any(results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,11 +14,15 @@
 ╚══════════════════════════════════════════════════════════════════════════════╝
 """
 
-import requests
+import asyncio
 import json
+import sys
 from pathlib import Path
 from datetime import datetime
-import time
+
+sys.path.insert(0, '/home/Mon_ps')
+
+from services.scraping import AsyncFetcher, DomainPolicy, RawArchive
 
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
@@ -135,16 +139,42 @@ TEAM_URL_MAPPING = {
     "Brest": "Brest",
 }
 
-def fetch_team_data(team_url: str) -> dict:
-    """Fetch données détaillées d'une équipe"""
-    url = f"https://understat.com/getTeamData/{team_url}/{SEASON}"
+# Rythme historique du script (time.sleep(0.5) entre deux équipes)
+POLICIES = {'understat.com': DomainPolicy(min_interval=0.5)}
+
+def team_url_for(team_name: str) -> str:
+    """Nom Understat d'une équipe (mapping, sinon deviné)"""
+    return TEAM_URL_MAPPING.get(team_name) or team_name.replace(' ', '_')
+
+def parse_team_data(result) -> dict:
+    """Corps JSON d'un /getTeamData/ (None si erreur ou réponse vide)"""
+    if not result.ok or len(result.body) <= 100:
+        return None
+    try:
+        return json.loads(result.body)
+    except ValueError:
+        return None
+
+async def fetch_teams(fetcher, team_names) -> dict:
+    """
+    Fetch données détaillées de toutes les équipes dans la même boucle
+    asyncio, au rythme du domaine.
+
+    Returns:
+        {team_name: data ou None}
+    """
+    team_names = list(team_names)
+    urls = [f"https://understat.com/getTeamData/{team_url_for(name)}/{SEASON}" for name in team_names]
+    results = await fetcher.fetch_all(urls, headers=HEADERS)
+    return {name: parse_team_data(result) for name, result in zip(team_names, results)}
+
+async def fetch_all_teams(team_names) -> dict:
+    archive = RawArchive()
     try:
-        response = requests.get(url, headers=HEADERS, timeout=30)
-        if response.status_code == 200 and len(response.text) > 100:
-            return response.json()
-    except Exception as e:
-        pass
-    return None
+        async with AsyncFetcher(policies=POLICIES, archive=archive) as fetcher:
+            return await fetch_teams(fetcher, team_names)
+    finally:
+        archive.close()
 
 def process_statistics(stats: dict) -> dict:
     """Transforme les statistiques brutes en context_dna"""
@@ -236,33 +266,15 @@ def process_statistics(stats: dict) -> dict:
     
     return context_dna
 
-def main():
-    print("=" * 70)
-    print("🧬 UNDERSTAT FULL ENRICHMENT V2.0")
-    print(f"   Équipes: {len(TEAM_URL_MAPPING)} | Season: {SEASON}")
-    print("=" * 70)
-    
-    # Charger le teams_context_dna existant
-    teams_dna_path = QUANTUM_DIR / 'teams_context_dna.json'
-    with open(teams_dna_path) as f:
-        teams_dna = json.load(f)
-    
-    print(f"\n📥 Enrichissement de {len(teams_dna)} équipes...")
-    
+def enrich(teams_dna: dict, team_data: dict) -> tuple:
+    """Ajoute context_dna aux équipes récupérées; retourne (enrichies, échecs)"""
     enriched = 0
     failed = []
     
     for team_name in teams_dna.keys():
-        # Trouver l'URL Understat
-        team_url = TEAM_URL_MAPPING.get(team_name)
-        
-        if not team_url:
-            # Essayer de deviner
-            team_url = team_name.replace(' ', '_')
-        
         print(f"   {team_name:25}", end=" → ")
         
-        data = fetch_team_data(team_url)
+        data = team_data.get(team_name)
         
         if data and 'statistics' in data:
             context_dna = process_statistics(data['statistics'])
@@ -272,10 +284,11 @@ def main():
         else:
             print(f"❌ Failed")
             failed.append(team_name)
-        
-        time.sleep(0.5)  # Rate limiting
     
-    # Sauvegarder
+    return enriched, failed
+
+def save_and_report(teams_dna_path: Path, teams_dna: dict, enriched: int, failed: list) -> None:
+    """Sauvegarde teams_context_dna.json et affiche le bilan"""
     print("\n" + "=" * 70)
     print("💾 SAUVEGARDE...")
     
@@ -297,5 +310,23 @@ def main():
     print("\n🎉 ENRICHISSEMENT TERMINÉ!")
     print("=" * 70)
 
+def main():
+    print("=" * 70)
+    print("🧬 UNDERSTAT FULL ENRICHMENT V2.0")
+    print(f"   Équipes: {len(TEAM_URL_MAPPING)} | Season: {SEASON}")
+    print("=" * 70)
+    
+    # Charger le teams_context_dna existant
+    teams_dna_path = QUANTUM_DIR / 'teams_context_dna.json'
+    with open(teams_dna_path) as f:
+        teams_dna = json.load(f)
+    
+    print(f"\n📥 Enrichissement de {len(teams_dna)} équipes...")
+    
+    team_data = asyncio.run(fetch_all_teams(teams_dna.keys()))
+    enriched, failed = enrich(teams_dna, team_data)
+    
+    save_and_report(teams_dna_path, teams_dna, enriched, failed)
+
 if __name__ == "__main__":
     main()
@@ -16,12 +16,16 @@
 ╚══════════════════════════════════════════════════════════════════════════════╝
 """
 
-import requests
+import asyncio
 import json
+import sys
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
-import time
+
+sys.path.insert(0, '/home/Mon_ps')
+
+from services.scraping import AsyncFetcher, RawArchive
 
 # Headers CRITIQUES
 HEADERS = {
@@ -47,40 +51,36 @@ LEAGUES = {
 
 SEASON = '2025'
 
-def fetch_league_data(league: str) -> dict:
-    """Fetch via API directe"""
-    url = f"https://understat.com/getLeagueData/{league}/{SEASON}"
+def parse_league_data(result) -> dict:
+    """Corps JSON d'un /getLeagueData/ (None si erreur ou réponse tronquée)"""
+    if not result.ok or len(result.body) <= 1000:
+        if result.error:
+            print(f"   ❌ Erreur {result.url}: {result.error}")
+        return None
     try:
-        response = requests.get(url, headers=HEADERS, timeout=30)
-        if response.status_code == 200 and len(response.text) > 1000:
-            return response.json()
-    except Exception as e:
-        print(f"   ❌ Erreur {league}: {e}")
-    return None
+        return json.loads(result.body)
+    except ValueError:
+        return None
 
-def fetch_team_data(team_name: str) -> dict:
-    """Fetch données détaillées d'une équipe (statisticsData)"""
-    # L'API team existe aussi
-    url = f"https://understat.com/getTeamData/{team_name}/{SEASON}"
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=30)
-        if response.status_code == 200 and len(response.text) > 100:
-            return response.json()
-    except:
-        pass
-    return None
+async def fetch_leagues(fetcher, leagues) -> dict:
+    """
+    Fetch via API directe, toutes les ligues dans la même boucle asyncio
+    (au rythme du domaine understat.com, voir DOMAIN_POLICIES).
 
-def fetch_match_shots(match_id: str) -> list:
-    """Fetch tous les tirs d'un match"""
-    url = f"https://understat.com/getMatchShots/{match_id}"
+    Returns:
+        {league_code: data ou None} dans l'ordre des ligues
+    """
+    urls = [f"https://understat.com/getLeagueData/{league}/{SEASON}" for league in leagues]
+    results = await fetcher.fetch_all(urls, headers=HEADERS)
+    return {league: parse_league_data(result) for league, result in zip(leagues, results)}
+
+async def fetch_all_leagues(leagues) -> dict:
+    archive = RawArchive()
     try:
-        response = requests.get(url, headers=HEADERS, timeout=30)
-        if response.status_code == 200:
-            data = response.json()
-            return data.get('h', []) + data.get('a', [])
-    except:
-        pass
-    return []
+        async with AsyncFetcher(archive=archive) as fetcher:
+            return await fetch_leagues(fetcher, leagues)
+    finally:
+        archive.close()
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # BUILDERS
@@ -337,18 +337,12 @@ def build_all_goals(all_data: dict) -> list:
 # MAIN
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def main():
-    print("=" * 70)
-    print("🚀 UNDERSTAT MASTER SCRAPER V2.0")
-    print(f"   Season: {SEASON} | Leagues: {len(LEAGUES)}")
-    print("=" * 70)
-    
+def collect_leagues(league_data: dict) -> dict:
+    """Garde les ligues récupérées, log une ligne par ligue"""
     all_data = {}
-    
-    # 1. Fetch toutes les ligues
     for league_code, league_name in LEAGUES.items():
         print(f"\n📥 {league_name}...")
-        data = fetch_league_data(league_code)
+        data = league_data.get(league_code)
         
         if data:
             teams = len(data.get('teams', {}))
@@ -358,9 +352,10 @@ def main():
             all_data[league_code] = data
         else:
             print(f"   ❌ Failed")
-        
-        time.sleep(2)
-    
+    return all_data
+
+def write_outputs(all_data: dict) -> None:
+    """Construit et sauvegarde tous les fichiers DNA"""
     # 2. Construire tous les DNA
     print("\n" + "=" * 70)
     print("🧬 CONSTRUCTION DES DNA...")
@@ -405,7 +400,18 @@ def main():
     print("\n" + "=" * 70)
     print("🎉 MISE À JOUR COMPLÈTE TERMINÉE!")
     print("=" * 70)
+
+def main():
+    print("=" * 70)
+    print("🚀 UNDERSTAT MASTER SCRAPER V2.0")
+    print(f"   Season: {SEASON} | Leagues: {len(LEAGUES)}")
+    print("=" * 70)
+    
+    # 1. Fetch toutes les ligues (une seule passe asyncio)
+    league_data = asyncio.run(fetch_all_leagues(list(LEAGUES)))
+    all_data = collect_leagues(league_data)
     
+    write_outputs(all_data)
     return all_data
 
 if __name__ == "__main__":
@@ -1,18 +1,29 @@
 #!/usr/bin/env python3
 """
-UNDERSTAT SHOTS SCRAPER V2.0
+UNDERSTAT SHOTS SCRAPER V2.1
 ============================
 Collecte tous les tirs contre chaque équipe via l'API /getMatchData/
 Génère: all_shots_against_2025.json
+
+V2.1: AsyncFetcher (services.scraping) au lieu de requests + time.sleep
+- les 5 ligues et les matchs partent dans la même boucle asyncio, au
+  rythme du domaine (0.3s entre deux requêtes, comme avant)
+- /getMatchData/ d'un match joué ne change plus: s'il est déjà dans
+  l'archive brute, il est relu sans réseau. Le run quotidien ne
+  télécharge que les nouveaux matchs.
 """
 
-import requests
+import asyncio
 import json
-import time
 import os
+import sys
 from datetime import datetime
 from collections import defaultdict
 
+sys.path.insert(0, '/home/Mon_ps')
+
+from services.scraping import AsyncFetcher, DomainPolicy, RawArchive
+
 # Configuration
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
@@ -33,56 +44,69 @@ SEASON = '2025'
 BASE_URL = 'https://understat.com'
 OUTPUT_DIR = '/home/Mon_ps/data/goalkeeper_dna'
 
-def fetch_json(url, retries=3):
-    """Fetch JSON avec retry"""
-    for attempt in range(retries):
-        try:
-            response = requests.get(url, headers=HEADERS, timeout=30)
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 404:
-                return None
-        except Exception as e:
-            if attempt < retries - 1:
-                time.sleep(2)
-    return None
-
-def get_played_match_ids(league, season):
-    """Récupère les match IDs des matchs joués depuis /getLeagueData/"""
-    url = f"{BASE_URL}/getLeagueData/{league}/{season}"
-    data = fetch_json(url)
-    
+# Rythme historique du script (time.sleep(0.3) entre deux matchs)
+POLICIES = {'understat.com': DomainPolicy(min_interval=0.3)}
+
+
+def parse_json(result):
+    """Corps JSON d'un FetchResult (None si erreur, 404 ou JSON invalide)"""
+    if not result.ok:
+        return None
+    try:
+        return json.loads(result.body)
+    except ValueError:
+        return None
+
+
+def played_match_ids(data):
+    """Match IDs des matchs joués (isResult=true) d'un /getLeagueData/"""
     if not data:
         return []
-    
-    match_ids = []
-    dates = data.get('dates', [])
-    
-    for match in dates:
-        # Seulement les matchs joués (isResult=true)
-        if match.get('isResult') == True:
-            match_ids.append(match['id'])
-    
-    return match_ids
+    return [match['id'] for match in data.get('dates', []) if match.get('isResult') == True]
 
-def get_match_shots(match_id):
-    """Récupère les shots d'un match via /getMatchData/"""
-    url = f"{BASE_URL}/getMatchData/{match_id}"
-    data = fetch_json(url)
-    
-    if not data or 'shots' not in data:
-        return None
-    
-    return data['shots']
 
-def main():
-    print("🎯 UNDERSTAT SHOTS SCRAPER V2.0")
-    print("=" * 60)
-    print(f"   Season: {SEASON}")
-    print(f"   Leagues: {len(LEAGUES)}")
-    print(f"   Output: {OUTPUT_DIR}/all_shots_against_{SEASON}.json")
-    print()
-    
+async def fetch_league_shots(fetcher, replay, archive, leagues, season):
+    """
+    Récupère les shots de chaque match joué, par ligue.
+
+    Returns:
+        {league_code: [(match_id, shots_data), ...]} dans l'ordre des ligues
+    """
+    league_urls = [f"{BASE_URL}/getLeagueData/{league}/{season}" for league in leagues]
+    league_data = await fetcher.fetch_all(league_urls, headers=HEADERS)
+
+    match_ids = {league: played_match_ids(parse_json(result))
+                 for league, result in zip(leagues, league_data)}
+    urls = {match_id: f"{BASE_URL}/getMatchData/{match_id}"
+            for ids in match_ids.values() for match_id in ids}
+
+    # Matchs joués déjà archivés: relus sans réseau
+    archived = await asyncio.to_thread(lambda: {u for u in urls.values() if archive.latest(u)})
+    results = await asyncio.gather(*(
+        (replay if url in archived else fetcher).fetch(url, headers=HEADERS) for url in urls.values()
+    ))
+    print(f"   Réseau: {len(urls) - len(archived)} matchs téléchargés, {len(archived)} relus de l'archive")
+
+    shots = {}
+    for match_id, result in zip(urls, results):
+        data = parse_json(result)
+        if data and 'shots' in data:
+            shots[match_id] = data['shots']
+
+    return {league: [(m, shots.get(m)) for m in ids] for league, ids in match_ids.items()}
+
+
+async def fetch_all_shots(leagues, season):
+    archive = RawArchive()
+    try:
+        async with AsyncFetcher(policies=POLICIES, archive=archive) as fetcher, \
+                AsyncFetcher(archive=archive, offline=True) as replay:
+            return await fetch_league_shots(fetcher, replay, archive, leagues, season)
+    finally:
+        archive.close()
+
+def save_shots_against(league_shots):
+    """Regroupe les tirs par équipe qui les subit et écrit all_shots_against"""
     # Structure: {team_name: [shots against]}
     all_shots_against = defaultdict(list)
     
@@ -94,16 +118,12 @@ def main():
     for league_code, league_name in LEAGUES.items():
         print(f"📥 {league_name}...")
         
-        # 1. Récupérer tous les match IDs joués
-        match_ids = get_played_match_ids(league_code, SEASON)
-        new_matches = [m for m in match_ids if m not in processed_matches]
+        match_shots = league_shots.get(league_code, [])
+        new_matches = [(m, shots) for m, shots in match_shots if m not in processed_matches]
         
-        print(f"   Matchs joués: {len(match_ids)} ({len(new_matches)} nouveaux)")
+        print(f"   Matchs joués: {len(match_shots)} ({len(new_matches)} nouveaux)")
         
-        # 2. Pour chaque match, récupérer les shots
-        for i, match_id in enumerate(new_matches):
-            shots_data = get_match_shots(match_id)
-            
+        for i, (match_id, shots_data) in enumerate(new_matches):
             if not shots_data:
                 continue
             
@@ -141,9 +161,6 @@ def main():
             # Progress
             if (i + 1) % 50 == 0:
                 print(f"      Processed: {i+1}/{len(new_matches)} matchs ({total_shots} tirs)")
-            
-            # Rate limiting
-            time.sleep(0.3)
         
         print(f"   ✅ {league_name}: {len(new_matches)} matchs traités")
     
@@ -183,5 +200,19 @@ def main():
     print()
     print("🎉 TERMINÉ!")
 
+def main():
+    print("🎯 UNDERSTAT SHOTS SCRAPER V2.0")
+    print("=" * 60)
+    print(f"   Season: {SEASON}")
+    print(f"   Leagues: {len(LEAGUES)}")
+    print(f"   Output: {OUTPUT_DIR}/all_shots_against_{SEASON}.json")
+    print()
+    
+    # 1-2. Match IDs joués puis shots de chaque match (toutes ligues en une passe)
+    print("📥 Téléchargement...")
+    league_shots = asyncio.run(fetch_all_shots(list(LEAGUES), SEASON))
+    
+    save_shots_against(league_shots)
+
 if __name__ == '__main__':
     main()
@@ -37,354 +37,919 @@
 ║                                                                              ║
 ║  PAS DE CLUSTERING - ADN 100% UNIQUE PAR DÉFENSEUR                           ║
 ╚══════════════════════════════════════════════════════════════════════════════╝
+
+Pipeline batch (aucun effet de bord à l'import):
+    1. load_sources()          → JSON équipes (context, defense DNA, zones, actions)
+    2. DefenderFrame           → matrice défenseurs × features (une passe sur les dicts)
+    3. compute_dimensions()    → 20 dimensions en colonnes NumPy; alpha, leader et
+                                 features équipe par group-by équipe (np.bincount)
+    4. enrich_defenders()      → quant_v9 par défenseur, ligues en parallèle (workers)
+
+Usage:
+    from defender_dna_quant_v9 import enrich_defenders, load_defenders, load_sources
+    defenders = load_defenders()
+    enrich_defenders(defenders, load_sources(), workers=4)
+
+    python3 defender_dna_quant_v9.py [--workers 4] [--no-report]
 """
 
+import argparse
 import json
-import numpy as np
-from pathlib import Path
-from collections import defaultdict
-from scipy.stats import percentileofscore, norm, pearsonr
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
-import math
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
 
 DATA_DIR = Path('/home/Mon_ps/data')
 DEFENDER_DIR = DATA_DIR / 'defender_dna'
 QUANTUM_DIR = DATA_DIR / 'quantum_v2'
-GOAL_DIR = DATA_DIR / 'goal_analysis'
 
-print("═" * 80)
-print("🧬 DEFENDER DNA QUANT V9.0 - HEDGE FUND GRADE 3.0")
-print(f"   {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-print("═" * 80)
+# Temps de jeu minimum pour être analysé
+MIN_MINUTES = 400
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
-# PHASE 1: CHARGEMENT DES DONNÉES
+# TABLES DE PROFILS (ordre = ordre de sortie)
 # ═══════════════════════════════════════════════════════════════════════════════
 
-print(f"\n{'═'*80}")
-print("📂 PHASE 1: CHARGEMENT DES DONNÉES")
-print(f"{'═'*80}")
-
-# Défenseurs V8
-with open(DEFENDER_DIR / 'defender_dna_quant_v8.json', 'r') as f:
-    defenders = json.load(f)
-print(f"   ✅ {len(defenders)} défenseurs (V8)")
-
-# Teams Context DNA
-with open(QUANTUM_DIR / 'teams_context_dna.json', 'r') as f:
-    teams_context = json.load(f)
-print(f"   ✅ {len(teams_context)} équipes context")
-
-# Zone & Action Analysis
-with open(QUANTUM_DIR / 'zone_analysis.json', 'r') as f:
-    zone_analysis = json.load(f)
-with open(QUANTUM_DIR / 'action_analysis.json', 'r') as f:
-    action_analysis = json.load(f)
-print(f"   ✅ Zone & Action analysis")
-
-# Team Exploit Profiles
-with open(QUANTUM_DIR / 'team_exploit_profiles.json', 'r') as f:
-    team_exploits = json.load(f)
-print(f"   ✅ Team exploits")
-
-# Goals Analysis
-with open(GOAL_DIR / 'all_goals_2025.json', 'r') as f:
-    all_goals = json.load(f)
-print(f"   ✅ {len(all_goals)} buts analysés")
-
-# Defense DNA
-defense_dna_path = DATA_DIR / 'defense_dna' / 'team_defense_dna_v5_1_corrected.json'
-with open(defense_dna_path, 'r') as f:
-    defense_raw = json.load(f)
-if isinstance(defense_raw, list):
-    team_defense_dna = {item.get('team_name', item.get('team', '')): item for item in defense_raw if isinstance(item, dict)}
-else:
-    team_defense_dna = defense_raw
-print(f"   ✅ {len(team_defense_dna)} équipes defense DNA")
+# 8. Hidden Markov: état -> (catégorie, description, edge_modifier)
+HMM_STATES = OrderedDict([
+    ('ELITE_FORM', ('PEAK', 'Performance d\'élite - Dominateur', -3.0)),
+    ('CLUTCH_MODE', ('PEAK', 'Mode clutch activé - Décisif sous pression', -2.5)),
+    ('CONSISTENT_ROCK', ('STABLE_POSITIVE', 'Roc constant - Fiable sans exception', -2.0)),
+    ('IMPROVING', ('TRANSITION_UP', 'En progression - Tendance positive', -1.0)),
+    ('STABLE_AVERAGE', ('NEUTRAL', 'Standard stable - Ni bon ni mauvais', 0)),
+    ('INCONSISTENT_NEUTRAL', ('NEUTRAL', 'Alternance de bons et mauvais matchs', 0.5)),
+    ('DECLINING', ('TRANSITION_DOWN', 'En déclin - Tendance négative', 1.5)),
+    ('PRESSURE_CRACKER', ('VULNERABILITY', 'Craque sous pression spécifiquement', 2.0)),
+    ('SLUMP', ('CRISIS_MILD', 'Mauvaise passe - Série de contre-performances', 2.5)),
+    ('CONFIDENCE_CRISIS', ('CRISIS_MODERATE', 'Crise de confiance - Erreurs en série', 3.5)),
+    ('TOTAL_COLLAPSE', ('CRISIS_SEVERE', 'Effondrement total - Performance catastrophique', 5.0)),
+    ('LIABILITY_CONFIRMED', ('CHRONIC', 'Maillon faible chronique - Pas de récupération prévue', 4.0)),
+])
+HMM_STATE_NAMES = list(HMM_STATES)
+
+# 10. PPDA: bornes basses des profils (le dernier couvre [18, 25))
+PPDA_EDGES = np.array([6, 8, 10, 12, 14, 16, 18])
+PPDA_PROFILES = OrderedDict([
+    ('PRESSING_MONSTER', {
+        'description': 'Pressing ultra-agressif - Récupère très haut',
+        'strengths': ['Récupération haute', 'Disruption adversaire', 'Transitions rapides'],
+        'weaknesses': ['Espaces dans le dos', 'Fatigue', 'Cartons'],
+        'ideal_opponent': 'Équipes qui construisent lentement',
+        'nightmare_opponent': 'Équipes avec attaquants rapides en profondeur'
+    }),
+    ('HIGH_PRESS_SPECIALIST', {
+        'description': 'Spécialiste pressing haut - Agressif mais contrôlé',
+        'strengths': ['Pressing organisé', 'Récupération mi-terrain'],
+        'weaknesses': ['Contre-attaques', 'Matchs intenses'],
+        'ideal_opponent': 'Équipes techniques mais lentes',
+        'nightmare_opponent': 'Équipes de contre'
+    }),
+    ('INTELLIGENT_PRESSER', {
+        'description': 'Presseur intelligent - Sélectif dans ses interventions',
+        'strengths': ['Timing', 'Économie d\'énergie', 'Duels gagnés'],
+        'weaknesses': ['Peut être contourné'],
+        'ideal_opponent': 'La plupart des équipes',
+        'nightmare_opponent': 'Équipes très techniques'
+    }),
+    ('BALANCED_DEFENDER', {
+        'description': 'Défenseur équilibré - Adapte son pressing',
+        'strengths': ['Polyvalence', 'Fiabilité'],
+        'weaknesses': ['Pas de spécialité'],
+        'ideal_opponent': 'Variable',
+        'nightmare_opponent': 'Équipes de possession'
+    }),
+    ('POSITIONAL_DEFENDER', {
+        'description': 'Défenseur positionnel - Préfère le bloc bas',
+        'strengths': ['Positionnement', 'Lecture du jeu', 'Interceptions'],
+        'weaknesses': ['Pressing haut impossible', 'Subir le jeu'],
+        'ideal_opponent': 'Équipes directes',
+        'nightmare_opponent': 'Équipes de possession qui étouffent'
+    }),
+    ('DEEP_BLOCK_SPECIALIST', {
+        'description': 'Spécialiste bloc bas - Défend la surface',
+        'strengths': ['Défense de la surface', 'Duels aériens'],
+        'weaknesses': ['Subir la pression', 'Sorties de balle'],
+        'ideal_opponent': 'Équipes qui centrent beaucoup',
+        'nightmare_opponent': 'Équipes techniques qui combinent'
+    }),
+    ('PASSIVE_DEFENDER', {
+        'description': 'Défenseur passif - Réactif plutôt que proactif',
+        'strengths': ['Concentration', 'Last-ditch tackles'],
+        'weaknesses': ['Laisse l\'initiative', 'Pression constante'],
+        'ideal_opponent': 'Équipes faibles techniquement',
+        'nightmare_opponent': 'Toute équipe de possession'
+    }),
+    ('SPECTATOR', {
+        'description': 'Spectateur - Défense ultra-passive, problématique',
+        'strengths': ['Aucune notable'],
+        'weaknesses': ['Tout', 'Subir constamment', 'Pas d\'impact'],
+        'ideal_opponent': 'Aucune',
+        'nightmare_opponent': 'Toutes les équipes'
+    }),
+])
+PPDA_PROFILE_NAMES = list(PPDA_PROFILES)
+
+# 11. Transition defense
+TRANSITION_PROFILES = OrderedDict([
+    ('ELITE_TRANSITION', {
+        'description': 'Élite en transition - Récupère instantanément',
+        'characteristics': [
+            'Counter-press immédiat',
+            'Recovery speed exceptionnelle',
+            'Bloque les contres dans l\'œuf',
+            'Leadership défensif en transition'
+        ],
+        'vs_fast_teams': 'DOMINANT',
+        'edge_modifier': -2.0
+    }),
+    ('TRANSITION_SPECIALIST', {
+        'description': 'Spécialiste transition - Gère bien les phases de transition',
+        'characteristics': [
+            'Bonne lecture du jeu',
+            'Anticipation des contres',
+            'Replacement rapide'
+        ],
+        'vs_fast_teams': 'SOLID',
+        'edge_modifier': -1.0
+    }),
+    ('ADEQUATE_TRANSITION', {
+        'description': 'Transition adéquate - Gérable mais pas dominant',
+        'characteristics': [
+            'Performance acceptable',
+            'Quelques erreurs occasionnelles',
+            'Dépend du soutien collectif'
+        ],
+        'vs_fast_teams': 'NEUTRAL',
+        'edge_modifier': 0
+    }),
+    ('TRANSITION_VULNERABLE', {
+        'description': 'Vulnérable en transition - Problèmes sur les contres',
+        'characteristics': [
+            'Replacement lent',
+            'Difficultés à lire les contres',
+            'Laisse des espaces'
+        ],
+        'vs_fast_teams': 'WEAK',
+        'edge_modifier': 2.0
+    }),
+    ('TRANSITION_LIABILITY', {
+        'description': 'Passif en transition - Gros problème',
+        'characteristics': [
+            'Recovery très lent',
+            'Souvent pris à contre-pied',
+            'Crée des situations de 1v1 dangereuses'
+        ],
+        'vs_fast_teams': 'EXPLOITABLE',
+        'edge_modifier': 3.5
+    }),
+    ('TRANSITION_DISASTER', {
+        'description': 'Catastrophe en transition - Boulevard ouvert',
+        'characteristics': [
+            'Aucune capacité de recovery',
+            'Chaque perte = danger',
+            'Équipe doit compenser constamment'
+        ],
+        'vs_fast_teams': 'CATASTROPHIC',
+        'edge_modifier': 5.0
+    }),
+])
+TRANSITION_PROFILE_NAMES = list(TRANSITION_PROFILES)
+
+# 17. Région estimée depuis le nom (priorité: ASIAN > AFRICAN > SOUTH_AMERICAN)
+REGION_PATTERNS = [
+    ('SOUTH_AMERICAN', ['Silva', 'Santos', 'Rodriguez', 'Martinez', 'Gonzalez', 'Fernandez', 'Alves']),
+    ('AFRICAN', ['Sane', 'Diallo', 'Camara', 'Faye', 'Toure', 'Kone', 'Bamba']),
+    ('ASIAN', ['Kim', 'Park', 'Tomiyasu', 'Endo', 'Son']),
+]
+REGIONAL_IMPACTS = {
+    'SOUTH_AMERICAN': {
+        'travel_impact': 'SEVERE',
+        'avg_travel_km': 10000,
+        'time_zone_diff': 5,
+        'performance_drop': -12,
+        'recovery_matches': 2,
+        'jet_lag_risk': 'HIGH',
+        'altitude_factor': True
+    },
+    'AFRICAN': {
+        'travel_impact': 'HIGH',
+        'avg_travel_km': 6000,
+        'time_zone_diff': 2,
+        'performance_drop': -8,
+        'recovery_matches': 1.5,
+        'jet_lag_risk': 'MEDIUM',
+        'altitude_factor': False
+    },
+    'ASIAN': {
+        'travel_impact': 'SEVERE',
+        'avg_travel_km': 9000,
+        'time_zone_diff': 8,
+        'performance_drop': -10,
+        'recovery_matches': 2,
+        'jet_lag_risk': 'VERY_HIGH',
+        'altitude_factor': False
+    },
+    'EUROPEAN': {
+        'travel_impact': 'LOW',
+        'avg_travel_km': 2000,
+        'time_zone_diff': 1,
+        'performance_drop': -5,
+        'recovery_matches': 1,
+        'jet_lag_risk': 'LOW',
+        'altitude_factor': False
+    }
+}
 
-# ═══════════════════════════════════════════════════════════════════════════════
-# PHASE 2: PRÉPARATION DES BENCHMARKS
-# ═══════════════════════════════════════════════════════════════════════════════
+# 18. Profils d'arbitres types par ligue (données agrégées)
+LEAGUE_REFEREE_PROFILES = {
+    'EPL': {
+        'avg_cards_per_game': 3.8,
+        'avg_penalties': 0.28,
+        'strictness': 'MODERATE',
+        'home_bias': 0.52,
+        'card_timing': 'LATE_HEAVY',  # Plus de cartons en 2ème MT
+        'controversial_decisions': 0.15
+    },
+    'La_Liga': {
+        'avg_cards_per_game': 4.5,
+        'avg_penalties': 0.32,
+        'strictness': 'STRICT',
+        'home_bias': 0.54,
+        'card_timing': 'DISTRIBUTED',
+        'controversial_decisions': 0.18
+    },
+    'Bundesliga': {
+        'avg_cards_per_game': 3.2,
+        'avg_penalties': 0.25,
+        'strictness': 'LENIENT',
+        'home_bias': 0.50,
+        'card_timing': 'EARLY_WARNING',
+        'controversial_decisions': 0.10
+    },
+    'Serie_A': {
+        'avg_cards_per_game': 4.2,
+        'avg_penalties': 0.35,
+        'strictness': 'STRICT',
+        'home_bias': 0.55,
+        'card_timing': 'STRICT_ALL_GAME',
+        'controversial_decisions': 0.20
+    },
+    'Ligue_1': {
+        'avg_cards_per_game': 3.6,
+        'avg_penalties': 0.30,
+        'strictness': 'MODERATE',
+        'home_bias': 0.53,
+        'card_timing': 'LATE_HEAVY',
+        'controversial_decisions': 0.14
+    }
+}
 
-print(f"\n{'═'*80}")
-print("📊 PHASE 2: PRÉPARATION DES BENCHMARKS V9")
-print(f"{'═'*80}")
-
-# Grouper défenseurs par équipe
-defenders_by_team = defaultdict(list)
-qualified = []
-for d in defenders:
-    if d.get('time', 0) >= 400:
-        defenders_by_team[d.get('team', '')].append(d)
-        qualified.append(d)
-
-print(f"   {len(qualified)} défenseurs qualifiés")
-print(f"   {len(defenders_by_team)} équipes avec défenseurs")
-
-# Collecter métriques pour percentiles et corrélations
-metrics_data = {
-    'impact': [],
-    'cs_rate': [],
-    'xgchain_90': [],
-    'xgbuildup_90': [],
-    'xa_90': [],
-    'cards_90': [],
-    'goals_conceded_per_match': [],
-    'win_impact': [],
-    'time': [],
-    'games': []
+# 20. Météo (générique - à enrichir avec API météo)
+WEATHER_SCENARIOS = {
+    'RAIN': {
+        'impact': 'More errors, slippery conditions',
+        'edge_modifier': 1.5,
+        'affected_metrics': ['aerial', 'passing', 'positioning']
+    },
+    'WIND': {
+        'impact': 'Long balls unpredictable',
+        'edge_modifier': 1.0,
+        'affected_metrics': ['aerial', 'set_pieces']
+    },
+    'HEAT': {
+        'impact': 'Faster fatigue',
+        'edge_modifier': 2.0,
+        'affected_metrics': ['late_game', 'pressing']
+    },
+    'COLD': {
+        'impact': 'Muscles tighter',
+        'edge_modifier': 0.5,
+        'affected_metrics': ['injuries']
+    },
+    'NORMAL': {
+        'impact': 'Standard conditions',
+        'edge_modifier': 0,
+        'affected_metrics': []
+    }
 }
 
-for d in qualified:
-    metrics_data['impact'].append(d.get('impact_goals_conceded', 0) or 0)
-    metrics_data['cs_rate'].append(d.get('clean_sheet_rate_with', 0) or 0)
-    metrics_data['xgchain_90'].append(d.get('xGChain_90', 0) or 0)
-    metrics_data['xgbuildup_90'].append(d.get('xGBuildup_90', 0) or 0)
-    metrics_data['xa_90'].append(d.get('xA_90', 0) or 0)
-    metrics_data['cards_90'].append(d.get('cards_90', 0) or 0)
-    metrics_data['goals_conceded_per_match'].append(d.get('goals_conceded_per_match_with', 0) or 0)
-    metrics_data['win_impact'].append(d.get('impact_wins', 0) or 0)
-    metrics_data['time'].append(d.get('time', 0) or 0)
-    metrics_data['games'].append(d.get('games', 0) or 0)
 
 # ═══════════════════════════════════════════════════════════════════════════════
-# FONCTIONS D'ANALYSE V9.0 - 20 DIMENSIONS
+# PHASE 1: CHARGEMENT DES DONNÉES
 # ═══════════════════════════════════════════════════════════════════════════════
 
+@dataclass
+class DefenderSources:
+    """Données équipe utilisées par les 20 dimensions (indexées par nom d'équipe)."""
+    teams_context: Dict[str, dict] = field(default_factory=dict)
+    team_defense_dna: Dict[str, dict] = field(default_factory=dict)
+    zone_analysis: Dict[str, dict] = field(default_factory=dict)
+    action_analysis: Dict[str, dict] = field(default_factory=dict)
+
+    def subset(self, teams) -> 'DefenderSources':
+        """Restreint aux équipes données (payload d'un worker de ligue)."""
+        teams = set(teams)
+        return DefenderSources(*(
+            {k: v for k, v in table.items() if k in teams}
+            for table in (self.teams_context, self.team_defense_dna, self.zone_analysis, self.action_analysis)
+        ))
+
+
+def load_defenders(path: Path = DEFENDER_DIR / 'defender_dna_quant_v8.json') -> List[dict]:
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def load_sources(data_dir: Path = DATA_DIR) -> DefenderSources:
+    quantum_dir = data_dir / 'quantum_v2'
+    with open(quantum_dir / 'teams_context_dna.json', 'r') as f:
+        teams_context = json.load(f)
+    with open(quantum_dir / 'zone_analysis.json', 'r') as f:
+        zone_analysis = json.load(f)
+    with open(quantum_dir / 'action_analysis.json', 'r') as f:
+        action_analysis = json.load(f)
+    with open(data_dir / 'defense_dna' / 'team_defense_dna_v5_1_corrected.json', 'r') as f:
+        defense_raw = json.load(f)
+    if isinstance(defense_raw, list):
+        team_defense_dna = {item.get('team_name', item.get('team', '')): item for item in defense_raw if isinstance(item, dict)}
+    else:
+        team_defense_dna = defense_raw
+    return DefenderSources(teams_context, team_defense_dna, zone_analysis, action_analysis)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
-# 1. ALPHA/BETA DECOMPOSITION
+# PHASE 2: MATRICE DÉFENSEURS × FEATURES
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def calculate_alpha_beta(defender: dict, team_defense: dict, team_defenders: list) -> dict:
-    """
-    Décomposition CAPM adaptée au football
-    Sépare la contribution INDIVIDUELLE (alpha) de la sensibilité ÉQUIPE (beta)
-    """
-    
-    # Données joueur
-    player_impact = defender.get('impact_goals_conceded', 0) or 0
-    player_cs_rate = defender.get('clean_sheet_rate_with', 0) or 0
-    player_goals_conceded = defender.get('goals_conceded_per_match_with', 0) or 0
-    player_time = defender.get('time', 0) or 0
-    
-    # Données équipe (benchmark)
-    team_ga = team_defense.get('ga_total', 0) or 0
-    team_matches = team_defense.get('matches_played', 1) or 1
-    team_avg_ga = team_ga / team_matches
-    team_xga = team_defense.get('xga_total', 0) or 0
-    team_avg_xga = team_xga / team_matches
-    
-    # Moyenne des autres défenseurs (hors ce joueur)
-    other_impacts = [d.get('impact_goals_conceded', 0) or 0 for d in team_defenders if d.get('name') != defender.get('name')]
-    team_avg_impact = np.mean(other_impacts) if other_impacts else 0
-    
-    # ALPHA = Performance individuelle ajustée
-    # Alpha positif = ajoute de la valeur au-delà de l'équipe
-    # Alpha négatif = détruit de la valeur
-    alpha = player_impact - team_avg_impact
-    
-    # BETA = Sensibilité aux problèmes équipe
-    # Beta > 1 = amplifie les problèmes
-    # Beta < 1 = atténue les problèmes
-    # Beta = 1 = neutre
-    if team_avg_ga > 0 and player_goals_conceded > 0:
-        beta = player_goals_conceded / team_avg_ga
+def _zone_weight(zone: str) -> float:
+    zone = zone.lower()
+    if 'six' in zone or 'yard' in zone:
+        return 3.0
+    if 'penalty' in zone or 'box' in zone:
+        return 2.0
+    if 'edge' in zone:
+        return 1.5
+    return 1.0
+
+
+def _team_threat(team_zones: dict, team_actions: dict) -> dict:
+    """9. Expected Threat allowed: ne dépend que de l'équipe (calculé une fois)."""
+    xt_by_zone = {}
+    total_xt_allowed = 0
+    for zone, data in team_zones.items():
+        if isinstance(data, dict):
+            conversion = data.get('conversion_rate', 0)
+            if isinstance(conversion, (int, float)):
+                goals = data.get('goals_conceded', data.get('goals', 0))
+                zone_weight = _zone_weight(zone)
+                xt = conversion * zone_weight
+                xt_by_zone[zone] = {
+                    'xt': round(xt, 4),
+                    'conversion': round(conversion * 100, 1) if conversion < 1 else round(conversion, 1),
+                    'goals': goals,
+                    'zone_weight': zone_weight
+                }
+                total_xt_allowed += xt
+
+    xt_by_action = {}
+    for action, data in team_actions.items():
+        if isinstance(data, dict):
+            conversion = data.get('conversion_rate', 0)
+            if isinstance(conversion, (int, float)):
+                xt_by_action[action] = {
+                    'xt': round(conversion, 4),
+                    'goals': data.get('goals_conceded', data.get('goals', 0))
+                }
+
+    if total_xt_allowed > 0.5:
+        xt_profile, description, edge_impact = 'POROUS', f"Très perméable (xT total: {total_xt_allowed:.3f})", 3.0
+    elif total_xt_allowed > 0.3:
+        xt_profile, description, edge_impact = 'VULNERABLE', f"Vulnérable (xT: {total_xt_allowed:.3f})", 1.5
+    elif total_xt_allowed > 0.15:
+        xt_profile, description, edge_impact = 'AVERAGE', f"xT moyen ({total_xt_allowed:.3f})", 0
     else:
-        beta = 1.0
-    
-    # EPSILON = Variance non expliquée (chance/malchance)
-    # Basé sur différence xGA vs réels
-    if player_goals_conceded > 0:
-        epsilon = (player_goals_conceded - team_avg_xga) / player_goals_conceded
+        xt_profile, description, edge_impact = 'SOLID', f"Défense solide (xT: {total_xt_allowed:.3f})", -1.5
+
+    sorted_zones = sorted(xt_by_zone.items(), key=lambda x: x[1]['xt'], reverse=True)
+    return {
+        'total_xt_allowed': round(total_xt_allowed, 4),
+        'xt_profile': xt_profile,
+        'description': description,
+        'edge_impact': edge_impact,
+        'danger_zones': [{'zone': z[0], **z[1]} for z in sorted_zones[:3]],
+        'xt_by_zone': xt_by_zone,
+        'xt_by_action': xt_by_action
+    }
+
+
+def _team_progression(team_zones: dict) -> dict:
+    """12. Ball progression allowed (niveau équipe)."""
+    metrics = {'deep_zone_entries': 0, 'box_entries': 0, 'six_yard_entries': 0, 'total_shots_allowed': 0}
+    for zone, data in team_zones.items():
+        if isinstance(data, dict):
+            shots = data.get('shots_against', data.get('shots', 0)) or 0
+            metrics['total_shots_allowed'] += shots
+            weight = _zone_weight(zone)
+            if weight == 3.0:
+                metrics['six_yard_entries'] += shots
+            elif weight == 2.0:
+                metrics['box_entries'] += shots
+            elif weight == 1.5:
+                metrics['deep_zone_entries'] += shots
+
+    total = metrics['total_shots_allowed']
+    if total > 0:
+        box_penetration_rate = (metrics['box_entries'] + metrics['six_yard_entries']) / total
+        danger_zone_rate = metrics['six_yard_entries'] / total
     else:
-        epsilon = 0
-    
-    # Classification
-    if alpha > 0.3 and beta < 1.0:
-        profile = 'VALUE_CREATOR'
-        description = f"Crée de la valeur (α={alpha:+.2f}) et stabilise (β={beta:.2f})"
-    elif alpha > 0.3 and beta >= 1.0:
-        profile = 'HIGH_IMPACT_VOLATILE'
-        description = f"Bon impact (α={alpha:+.2f}) mais amplifie variance (β={beta:.2f})"
-    elif alpha < -0.3 and beta > 1.2:
-        profile = 'PROBLEM_AMPLIFIER'
-        description = f"Détruit valeur (α={alpha:+.2f}) ET amplifie problèmes (β={beta:.2f})"
-    elif alpha < -0.3 and beta <= 1.0:
-        profile = 'VALUE_DESTROYER'
-        description = f"Détruit valeur (α={alpha:+.2f}) malgré stabilité (β={beta:.2f})"
-    elif beta > 1.3:
-        profile = 'VOLATILITY_AMPLIFIER'
-        description = f"Neutre en valeur mais amplifie fortement (β={beta:.2f})"
-    elif beta < 0.7:
-        profile = 'STABILIZER'
-        description = f"Stabilisateur d'équipe (β={beta:.2f})"
+        box_penetration_rate = 0.5
+        danger_zone_rate = 0.1
+
+    if danger_zone_rate > 0.25:
+        profile, description, edge_impact = 'WIDE_OPEN', "Laisse l'adversaire pénétrer facilement jusqu'au but", 3.0
+    elif box_penetration_rate > 0.6:
+        profile, description, edge_impact = 'POROUS', "Beaucoup de pénétrations dans la surface", 2.0
+    elif box_penetration_rate > 0.4:
+        profile, description, edge_impact = 'AVERAGE', "Progression adverse dans la moyenne", 0.5
     else:
-        profile = 'NEUTRAL'
-        description = f"Impact neutre (α={alpha:+.2f}, β={beta:.2f})"
-    
-    # Edge betting
-    edge_adjustment = 0
-    if profile == 'PROBLEM_AMPLIFIER':
-        edge_adjustment = 4.0
-    elif profile == 'VALUE_DESTROYER':
-        edge_adjustment = 2.5
-    elif profile == 'VOLATILITY_AMPLIFIER':
-        edge_adjustment = 2.0
-    elif profile == 'VALUE_CREATOR':
-        edge_adjustment = -2.0
-    elif profile == 'STABILIZER':
-        edge_adjustment = -1.5
-    
+        profile, description, edge_impact = 'COMPACT', "Empêche la progression - Défense compacte", -1.0
+
     return {
-        'alpha': round(alpha, 3),
-        'beta': round(beta, 3),
-        'epsilon': round(epsilon, 3),
+        'metrics': metrics,
+        'box_penetration_rate': round(box_penetration_rate * 100, 1),
+        'danger_zone_rate': round(danger_zone_rate * 100, 1),
         'profile': profile,
         'description': description,
-        'edge_adjustment': edge_adjustment,
-        'interpretation': {
-            'alpha_meaning': 'Contribution individuelle pure' if alpha > 0 else 'Destruction de valeur',
-            'beta_meaning': 'Amplifie les problèmes' if beta > 1.2 else 'Stabilise' if beta < 0.8 else 'Neutre',
-            'epsilon_meaning': 'Malchanceux' if epsilon > 0.2 else 'Chanceux' if epsilon < -0.2 else 'En ligne avec xGA'
-        }
+        'edge_impact': edge_impact
     }
 
 
-# ═══════════════════════════════════════════════════════════════════════════════
-# 2. SHARPE RATIO ADAPTÉ
-# ═══════════════════════════════════════════════════════════════════════════════
+def _team_stadium(team_defense: dict) -> dict:
+    """19. Stadium/home effect (niveau équipe)."""
+    matches_home = team_defense.get('matches_home', 1) or 1
+    matches_away = team_defense.get('matches_away', 1) or 1
+    avg_ga_home = (team_defense.get('ga_home', 0) or 0) / matches_home
+    avg_ga_away = (team_defense.get('ga_away', 0) or 0) / matches_away
+    avg_xga_home = (team_defense.get('xga_home', 0) or 0) / matches_home
+    avg_xga_away = (team_defense.get('xga_away', 0) or 0) / matches_away
 
-def calculate_sharpe_ratio(defender: dict, v8_data: dict) -> dict:
-    """
-    Sharpe Ratio adapté: mesure la QUALITÉ de l'edge, pas juste sa taille
-    """
-    
-    # Edge moyen (depuis V8)
-    edge_mean = v8_data.get('edge_synthesis', {}).get('v8_total_edge', 0)
-    
-    # Volatilité de l'edge (depuis V8 volatility)
-    volatility = v8_data.get('volatility', {}).get('combined_volatility', 1.0)
-    
-    # Risk-free rate (baseline edge = 0%)
-    risk_free = 0
-    
-    # Sharpe Ratio = (Edge - Risk_free) / Volatility
-    if volatility > 0:
-        sharpe = (edge_mean - risk_free) / (volatility * 20)  # Normalisé
-    else:
-        sharpe = 0
-    
-    # Classification
-    if sharpe > 2.5:
-        quality = 'EXCEPTIONAL'
-        sizing_recommendation = 'AGGRESSIVE'
-        sizing_multiplier = 1.5
-    elif sharpe > 1.5:
-        quality = 'EXCELLENT'
-        sizing_recommendation = 'ABOVE_NORMAL'
-        sizing_multiplier = 1.2
-    elif sharpe > 1.0:
-        quality = 'GOOD'
-        sizing_recommendation = 'NORMAL'
-        sizing_multiplier = 1.0
-    elif sharpe > 0.5:
-        quality = 'MODERATE'
-        sizing_recommendation = 'REDUCED'
-        sizing_multiplier = 0.75
-    elif sharpe > 0:
-        quality = 'POOR'
-        sizing_recommendation = 'MINIMAL'
-        sizing_multiplier = 0.5
+    home_advantage = avg_ga_away - avg_ga_home
+    if home_advantage > 0.8:
+        profile, description = 'FORTRESS', f"Forteresse à domicile - {home_advantage:.2f} buts de différence"
+        home_edge, away_edge = -2.0, 2.5
+    elif home_advantage > 0.4:
+        profile, description = 'HOME_STRONG', f"Fort à domicile - {home_advantage:.2f} buts de différence"
+        home_edge, away_edge = -1.0, 1.5
+    elif home_advantage > -0.2:
+        profile, description = 'BALANCED', "Performance similaire home/away"
+        home_edge, away_edge = 0, 0
+    elif home_advantage > -0.5:
+        profile, description = 'ROAD_WARRIOR', "Paradoxalement meilleur à l'extérieur"
+        home_edge, away_edge = 1.0, -1.0
     else:
-        quality = 'NEGATIVE'
-        sizing_recommendation = 'AVOID'
-        sizing_multiplier = 0
-    
+        profile, description = 'AWAY_SPECIALIST', "Beaucoup mieux à l'extérieur (rare)"
+        home_edge, away_edge = 1.5, -1.5
+
     return {
-        'sharpe_ratio': round(sharpe, 2),
-        'edge_mean': round(edge_mean, 1),
-        'volatility': round(volatility, 2),
-        'quality': quality,
-        'sizing_recommendation': sizing_recommendation,
-        'sizing_multiplier': sizing_multiplier,
-        'interpretation': f"Edge {edge_mean:.1f}% avec volatilité {volatility:.2f} → Sharpe {sharpe:.2f}"
+        'home_performance': {
+            'avg_goals_conceded': round(avg_ga_home, 2),
+            'avg_xGA': round(avg_xga_home, 2),
+            'matches': matches_home
+        },
+        'away_performance': {
+            'avg_goals_conceded': round(avg_ga_away, 2),
+            'avg_xGA': round(avg_xga_away, 2),
+            'matches': matches_away
+        },
+        'home_advantage': round(home_advantage, 2),
+        'profile': profile,
+        'description': description,
+        'edge_impact': {'home': home_edge, 'away': away_edge}
     }
 
 
-# ═══════════════════════════════════════════════════════════════════════════════
-# 3. KELLY CRITERION OPTIMAL SIZING
-# ═══════════════════════════════════════════════════════════════════════════════
+def _num(value, default=0.0) -> float:
+    """Valeur JSON -> float (None/absent -> default)."""
+    return default if value is None else float(value)
 
-def calculate_kelly_criterion(defender: dict, v8_data: dict, sharpe: dict) -> dict:
+
+@dataclass
+class DefenderFrame:
     """
-    Calcul du stake optimal basé sur edge et variance
+    Défenseurs qualifiés en colonnes + features équipe indexées par team_idx.
+
+    Les colonnes *_or sont les valeurs "falsy -> défaut" des anciennes
+    fonctions (`d.get(k, 0.2) or 0.2`): 0 et None y prennent le défaut.
     """
-    
-    edge = v8_data.get('edge_synthesis', {}).get('v8_total_edge', 0) / 100  # Convertir en décimal
-    
-    # Probabilité implicite (basée sur edge)
-    # Si edge = 10%, on estime p = 0.55 (légèrement favorisé)
-    base_prob = 0.5
-    adjusted_prob = min(0.85, max(0.15, base_prob + edge * 0.5))
-    
-    # Odds moyens pour Goals Over (environ 1.85)
-    avg_odds = 1.85
-    b = avg_odds - 1  # Gain net si on gagne
-    
-    q = 1 - adjusted_prob
-    
-    # Kelly formula: f* = (p*b - q) / b
-    if b > 0:
-        kelly_full = (adjusted_prob * b - q) / b
-    else:
-        kelly_full = 0
-    
-    kelly_full = max(0, kelly_full)  # Pas de stake négatif
-    
-    # Kelly fractional (plus conservateur)
-    kelly_quarter = kelly_full * 0.25  # Quarter Kelly
-    kelly_half = kelly_full * 0.5      # Half Kelly
-    
-    # Ajuster avec le sizing multiplier du Sharpe
-    sizing_mult = sharpe.get('sizing_multiplier', 1.0)
-    kelly_adjusted = kelly_half * sizing_mult
-    
-    # Limiter à 5% max du bankroll
-    kelly_final = min(0.05, kelly_adjusted)
-    
-    return {
-        'kelly_full': round(kelly_full * 100, 2),
-        'kelly_half': round(kelly_half * 100, 2),
-        'kelly_quarter': round(kelly_quarter * 100, 2),
-        'kelly_adjusted': round(kelly_adjusted * 100, 2),
-        'kelly_final': round(kelly_final * 100, 2),
-        'implied_probability': round(adjusted_prob * 100, 1),
-        'recommendation': f"Stake {kelly_final*100:.2f}% du bankroll",
-        'confidence': sharpe.get('quality', 'MODERATE')
-    }
+    names: np.ndarray
+    leagues: List[str]
+    team_idx: np.ndarray
+    team_names: List[str]
+
+    # Défenseur
+    impact: np.ndarray
+    impact_rank: np.ndarray          # clé de tri du leader (absent = -99)
+    cs_rate: np.ndarray
+    cs_rate_raw: np.ndarray          # clean_sheet_rate_with sans `or` (défaut 25)
+    goals_conceded: np.ndarray
+    minutes: np.ndarray
+    cards: np.ndarray
+    xgbuildup: np.ndarray
+    red_cards: np.ndarray
+
+    # V8
+    v8_edge: np.ndarray
+    volatility: np.ndarray
+    volatility_profile: np.ndarray
+    var_std: np.ndarray
+    var_90: np.ndarray
+    var_95: np.ndarray
+    var_99: np.ndarray
+    prior_card: np.ndarray
+    prior_3plus: np.ndarray
+    clutch_rating: np.ndarray
+    aerial_friction: np.ndarray
+    ground_friction: np.ndarray
+    fatigue_risk: np.ndarray
+    minutes_per_week: np.ndarray
+
+    # Équipe (une ligne par team_names)
+    team_form: List[str]
+    team_losses: np.ndarray
+    team_wins: np.ndarray
+    team_trending: np.ndarray
+    team_cs_last_5: np.ndarray
+    team_avg_goals_against: np.ndarray
+    team_avg_ga: np.ndarray
+    team_avg_xga: np.ndarray
+    team_fast_conversion: np.ndarray
+    team_fast_goals: List[Any]
+    team_threat: List[dict]
+    team_progression: List[dict]
+    team_stadium: List[dict]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_defenders(cls, defenders: Sequence[dict], sources: DefenderSources) -> 'DefenderFrame':
+        team_index: Dict[str, int] = {}
+        rows = []
+        for d in defenders:
+            team = d.get('team', '')
+            rows.append((d, d.get('quant_v8', {}), team_index.setdefault(team, len(team_index))))
+
+        def col(getter, dtype=float):
+            return np.array([getter(d, v8) for d, v8, _ in rows], dtype=dtype)
+
+        frame = {
+            'names': col(lambda d, v8: d.get('name', ''), object),
+            'leagues': [d.get('league', '') for d, _, _ in rows],
+            'team_idx': np.array([t for _, _, t in rows], dtype=np.int64),
+            'team_names': list(team_index),
+            'impact': col(lambda d, v8: d.get('impact_goals_conceded', 0) or 0),
+            'impact_rank': col(lambda d, v8: _num(d.get('impact_goals_conceded'), -99)),
+            'cs_rate': col(lambda d, v8: d.get('clean_sheet_rate_with', 0) or 0),
+            'cs_rate_raw': col(lambda d, v8: _num(d.get('clean_sheet_rate_with'), 25)),
+            'goals_conceded': col(lambda d, v8: d.get('goals_conceded_per_match_with', 0) or 0),
+            'minutes': col(lambda d, v8: d.get('time', 0) or 0),
+            'cards': col(lambda d, v8: d.get('cards_90', 0) or 0),
+            'xgbuildup': col(lambda d, v8: d.get('xGBuildup_90', 0) or 0),
+            'red_cards': col(lambda d, v8: d.get('red_cards', 0) or 0),
+            'v8_edge': col(lambda d, v8: _num(v8.get('edge_synthesis', {}).get('v8_total_edge'), 0)),
+            'volatility': col(lambda d, v8: _num(v8.get('volatility', {}).get('combined_volatility'), 1.0)),
+            'volatility_profile': col(lambda d, v8: v8.get('volatility', {}).get('profile', 'INCONSISTENT'), object),
+            'var_std': col(lambda d, v8: _num(v8.get('var', {}).get('std_goals_conceded'), 0.8)),
+            'var_90': col(lambda d, v8: _num(v8.get('var', {}).get('VaR_90'), 2.5)),
+            'var_95': col(lambda d, v8: _num(v8.get('var', {}).get('VaR_95'), 3.0)),
+            'var_99': col(lambda d, v8: _num(v8.get('var', {}).get('VaR_99'), 4.0)),
+            'prior_card': col(lambda d, v8: _num(v8.get('xCards', {}).get('probability_card_next_match'), 30) / 100),
+            'prior_3plus': col(lambda d, v8: _num(
+                v8.get('var', {}).get('extreme_scenarios', {}).get('P(3_goals)'), 15) / 100),
+            'clutch_rating': col(lambda d, v8: v8.get('clutch', {}).get('clutch_rating', 'NEUTRAL'), object),
+            'aerial_friction': col(lambda d, v8: _num(
+                v8.get('matchup_friction', {}).get('profiles', {}).get('AERIAL_THREAT', {}).get('friction_score'), 1.0)),
+            'ground_friction': col(lambda d, v8: _num(
+                v8.get('matchup_friction', {}).get('profiles', {}).get('TECHNICAL_WIZARD', {}).get('friction_score'), 1.0)),
+            'fatigue_risk': col(lambda d, v8: v8.get('fatigue', {}).get('fatigue_risk', 'LOW'), object),
+            'minutes_per_week': col(lambda d, v8: _num(v8.get('fatigue', {}).get('estimated_minutes_per_week'), 45)),
+        }
+
+        # Features équipe: une passe par équipe, pas par défenseur
+        forms, losses, wins, trending, cs_last_5, avg_against = [], [], [], [], [], []
+        avg_ga, avg_xga, fast_conversion, fast_goals = [], [], [], []
+        threats, progressions, stadiums = [], [], []
+        for team in team_index:
+            context = sources.teams_context.get(team, {})
+            momentum = context.get('momentum_dna', {})
+            form = momentum.get('form_last_5', 'XXXXX')
+            forms.append(form)
+            losses.append(form.count('L'))
+            wins.append(form.count('W'))
+            trending.append(momentum.get('trending', 'STABLE'))
+            cs_last_5.append(momentum.get('clean_sheets_last_5', 0))
+            avg_against.append(momentum.get('avg_goals_against', 1.5))
+
+            defense = sources.team_defense_dna.get(team, {})
+            matches = defense.get('matches_played', 1) or 1
+            avg_ga.append((defense.get('ga_total', 0) or 0) / matches)
+            avg_xga.append((defense.get('xga_total', 0) or 0) / matches)
+
+            fast = context.get('context_dna', {}).get('attackSpeed', {}).get('Fast', {})
+            fast_conversion.append(fast.get('conversion_against', 10))
+            fast_goals.append(fast.get('goals_against', 0))
+
+            zones = sources.zone_analysis.get(team, {})
+            threats.append(_team_threat(zones, sources.action_analysis.get(team, {})))
+            progressions.append(_team_progression(zones))
+            stadiums.append(_team_stadium(defense))
+
+        frame.update({
+            'team_form': forms,
+            'team_losses': np.array(losses, dtype=np.int64),
+            'team_wins': np.array(wins, dtype=np.int64),
+            'team_trending': np.array(trending, dtype=object),
+            'team_cs_last_5': np.array(cs_last_5, dtype=float),
+            'team_avg_goals_against': np.array(avg_against, dtype=float),
+            'team_avg_ga': np.array(avg_ga, dtype=float),
+            'team_avg_xga': np.array(avg_xga, dtype=float),
+            'team_fast_conversion': np.array(fast_conversion, dtype=float),
+            'team_fast_goals': fast_goals,
+            'team_threat': threats,
+            'team_progression': progressions,
+            'team_stadium': stadiums,
+        })
+        return cls(**frame)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
-# 4. CORRELATION MATRIX
+# PHASE 3: 20 DIMENSIONS EN COLONNES
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def calculate_correlation_insights(defender: dict) -> dict:
+def _leave_one_out_mean(values: np.ndarray, group: np.ndarray, names: np.ndarray) -> np.ndarray:
     """
-    Corrélations entre dimensions pour ce défenseur
+    Moyenne de `values` sur le groupe, hors lignes de même nom (0 si personne d'autre),
+    et masque des lignes ayant au moins un autre membre.
+
+    np.mean par tranche d'équipe (quelques défenseurs) plutôt que somme - sous-somme:
+    même ordre de sommation que l'ancien calcul, donc mêmes arrondis.
     """
-    
-    # Extraire les métriques
-    cards = defender.get('cards_90', 0) or 0
-    impact = defender.get('impact_goals_conceded', 0) or 0
-    cs_rate = defender.get('clean_sheet_rate_with', 0) or 0
-    xgbuildup = defender.get('xGBuildup_90', 0) or 0
-    time = defender.get('time', 0) or 0
-    
-    # Calculer les corrélations potentielles
+    out = np.zeros(len(values))
+    has_others = np.zeros(len(values), dtype=bool)
+    order = np.argsort(group, kind='stable')
+    bounds = np.flatnonzero(np.diff(group[order])) + 1
+    for rows in np.split(order, bounds):
+        team_values, team_names = values[rows], names[rows]
+        for name in set(team_names):
+            others = team_names != name
+            if others.any():
+                out[rows[~others]] = np.mean(team_values[others])
+                has_others[rows[~others]] = True
+    return out, has_others
+
+
+def _team_leaders(frame: DefenderFrame) -> np.ndarray:
+    """Index du leader par équipe: meilleur impact, premier rencontré en cas d'égalité."""
+    order = np.lexsort((np.arange(len(frame)), -frame.impact_rank, frame.team_idx))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = frame.team_idx[order][1:] != frame.team_idx[order][:-1]
+    leaders = np.zeros(len(frame.team_names), dtype=np.int64)
+    leaders[frame.team_idx[order][first]] = order[first]
+    return leaders
+
+
+def compute_dimensions(frame: DefenderFrame) -> Dict[str, np.ndarray]:
+    """Toutes les grandeurs numériques et codes de profil des 20 dimensions."""
+    t = frame.team_idx
+    impact, cs_rate, cards = frame.impact, frame.cs_rate, frame.cards
+    # `x or 0.2`: 0 devient le défaut
+    cards_or = np.where(cards == 0, 0.2, cards)
+    xgb_or = np.where(frame.xgbuildup == 0, 0.2, frame.xgbuildup)
+    losses, wins = frame.team_losses[t], frame.team_wins[t]
+    trending = frame.team_trending[t]
+    avg_goals_against = frame.team_avg_goals_against[t]
+    clutch, vol_profile = frame.clutch_rating, frame.volatility_profile
+    out: Dict[str, np.ndarray] = {}
+
+    # 1. Alpha/Beta (group-by équipe, leave-one-out par nom)
+    teammates_mean, has_teammates = _leave_one_out_mean(impact, t, frame.names)
+    alpha = impact - teammates_mean
+    team_avg_ga, team_avg_xga, gc = frame.team_avg_ga[t], frame.team_avg_xga[t], frame.goals_conceded
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = np.where((team_avg_ga > 0) & (gc > 0), gc / team_avg_ga, 1.0)
+        epsilon = np.where(gc > 0, (gc - team_avg_xga) / gc, 0.0)
+    out['alpha'], out['beta'], out['epsilon'] = alpha, beta, epsilon
+    out['has_teammates'] = has_teammates
+    out['alpha_profile'] = np.select(
+        [(alpha > 0.3) & (beta < 1.0), (alpha > 0.3) & (beta >= 1.0), (alpha < -0.3) & (beta > 1.2),
+         (alpha < -0.3) & (beta <= 1.0), beta > 1.3, beta < 0.7],
+        [0, 1, 2, 3, 4, 5], 6)
+
+    # 2. Sharpe
+    edge, vol = frame.v8_edge, frame.volatility
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(vol > 0, edge / (vol * 20), 0.0)
+    out['sharpe'] = sharpe
+    out['sharpe_quality'] = np.select([sharpe > 2.5, sharpe > 1.5, sharpe > 1.0, sharpe > 0.5, sharpe > 0],
+                                      [0, 1, 2, 3, 4], 5)
+    sizing = np.array([1.5, 1.2, 1.0, 0.75, 0.5, 0])[out['sharpe_quality']]
+
+    # 3. Kelly
+    prob = np.minimum(0.85, np.maximum(0.15, 0.5 + edge / 100 * 0.5))
+    b = 1.85 - 1
+    kelly_full = np.maximum(0, (prob * b - (1 - prob)) / b)
+    kelly_half = kelly_full * 0.5
+    kelly_adjusted = kelly_half * sizing
+    out.update(kelly_prob=prob, kelly_full=kelly_full, kelly_half=kelly_half, kelly_quarter=kelly_full * 0.25,
+               kelly_adjusted=kelly_adjusted, kelly_final=np.minimum(0.05, kelly_adjusted))
+
+    # 5. CVaR
+    out['cvar_90'] = frame.var_90 + 0.35 * frame.var_std
+    out['cvar_95'] = frame.var_95 + 0.4 * frame.var_std
+    out['cvar_99'] = frame.var_99 + 0.5 * frame.var_std
+
+    # 6. Drawdown (P(X matchs sans CS) = (1 - cs)^X < 5%)
+    cs_raw = frame.cs_rate_raw
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected = np.ceil(np.log(0.05) / np.log(1 - cs_raw / 100))
+    out['expected_max_no_cs'] = np.where(cs_raw <= 0, 15, np.where(cs_raw >= 100, 1, expected)).astype(np.int64)
+    cs_last_5 = frame.team_cs_last_5[t]
+    out['drawdown'] = np.select(
+        [(cs_last_5 == 0) & (avg_goals_against > 1.5), (cs_last_5 <= 1) & (avg_goals_against > 1.2), cs_last_5 >= 3],
+        [0, 1, 2], 3)
+
+    # 7. Bayesian (form puis trend, dans cet ordre)
+    form_code = np.select([losses >= 4, losses >= 3, losses == 0], [0, 1, 2], -1)
+    trend_code = np.select([trending == 'DOWN', trending == 'UP'], [0, 1], -1)
+    form_lr = np.array([1.6, 1.3, 0.7, 1.0])[form_code]
+    trend_lr = np.array([1.25, 0.85, 1.0])[trend_code]
+
+    def update(p, lr, applies):
+        return np.where(applies, p * lr / (p * lr + (1 - p)), p)
+
+    posterior_card = update(frame.prior_card, form_lr, form_code == 0)
+    posterior_3plus = update(update(frame.prior_3plus, form_lr, form_code >= 0), trend_lr, trend_code >= 0)
+    out.update(form_code=form_code, trend_code=trend_code,
+               posterior_card=np.minimum(0.9, np.maximum(0.05, posterior_card)),
+               posterior_3plus=np.minimum(0.7, np.maximum(0.05, posterior_3plus)))
+
+    # 8. Hidden Markov (ordre de priorité des états)
+    state_rules = [
+        ('TOTAL_COLLAPSE', 0.85, (losses >= 5) & (avg_goals_against > 2.0)),
+        ('CONFIDENCE_CRISIS', 0.75, (losses >= 4) & (cards > 0.25)),
+        ('SLUMP', 0.70, (losses >= 3) & (impact < 0)),
+        ('LIABILITY_CONFIRMED', 0.80, (impact < -0.5) & (cs_rate < 15)),
+        ('PRESSURE_CRACKER', 0.65, clutch == 'CHOKE_ARTIST'),
+        ('DECLINING', 0.60, (trending == 'DOWN') & (impact < 0)),
+        ('INCONSISTENT_NEUTRAL', 0.55, vol_profile == 'WILDCARD'),
+        ('IMPROVING', 0.60, (trending == 'UP') & (impact > 0)),
+        ('CONSISTENT_ROCK', 0.70, (vol_profile == 'ROCK') & (impact > 0)),
+        ('CLUTCH_MODE', 0.65, (clutch == 'CLUTCH_PERFORMER') & (trending == 'UP')),
+        ('ELITE_FORM', 0.75, (impact > 0.5) & (cs_rate > 50) & (wins >= 4)),
+    ]
+    conditions = [rule[2] for rule in state_rules]
+    out['hmm_state'] = np.select(conditions, [HMM_STATE_NAMES.index(rule[0]) for rule in state_rules],
+                                 HMM_STATE_NAMES.index('STABLE_AVERAGE'))
+    out['hmm_probability'] = np.select(conditions, [rule[1] for rule in state_rules], 0.50)
+
+    # 10. PPDA
+    ppda = np.maximum(5, np.minimum(20, 15 - (xgb_or * 20) - (cards_or * 10)))
+    out['ppda'] = ppda
+    out['ppda_profile'] = np.searchsorted(PPDA_EDGES, ppda, side='right')
+
+    # 11. Transition
+    fast_conversion = frame.team_fast_conversion[t]
+    counter_press = np.maximum(0, 70 - fast_conversion * 2)
+    recovery = np.maximum(20, np.minimum(100, 100 - (xgb_or * 150)))
+    out.update(counter_press=counter_press, recovery=recovery, fast_conversion=fast_conversion)
+    out['transition_profile'] = np.select(
+        [(fast_conversion < 10) & (counter_press > 70), (fast_conversion < 15) & (recovery > 70),
+         fast_conversion < 20, fast_conversion < 30, fast_conversion < 40],
+        [0, 1, 2, 3, 4], 5)
+
+    # 13. Duels
+    aerial = np.maximum(30, np.minimum(80, 60 - (frame.aerial_friction * 10)))
+    ground = np.maximum(30, np.minimum(75, 55 - (frame.ground_friction * 8)))
+    tackle = np.maximum(40, np.minimum(80, 70 - (cards_or * 40)))
+    duel_avg = (aerial + ground + tackle) / 3
+    out.update(aerial=aerial, ground=ground, tackle=tackle, duel_avg=duel_avg,
+               dribbled_past=np.maximum(10, np.minimum(40, 30 - (ground - 50))),
+               duel_profile=np.select([duel_avg > 65, duel_avg > 55, duel_avg > 45], [0, 1, 2], 3))
+
+    # 14. Tilt
+    tilt = (cards_or * 20) + np.where(impact < 0, np.abs(impact) * 10, 0) + (frame.red_cards * 15)
+    tilt = np.where(clutch == 'CHOKE_ARTIST', tilt * 1.3, np.where(clutch == 'CLUTCH_PERFORMER', tilt * 0.7, tilt))
+    tilt = np.where(vol_profile == 'WILDCARD', tilt * 1.2, np.where(vol_profile == 'ROCK', tilt * 0.6, tilt))
+    out['tilt'] = tilt
+    out['tilt_profile'] = np.select([tilt > 15, tilt > 10, tilt > 5, tilt > 2], [0, 1, 2, 3], 4)
+
+    # 15. Leadership (group-by équipe)
+    leaders = _team_leaders(frame)
+    leader = leaders[t]
+    leader_impact = impact[leader]
+    is_leader = frame.names == frame.names[leader]
+    # Moyenne des coéquipiers hors leader = moyenne leave-one-out du leader
+    without_leader = teammates_mean[leader]
+    dependency = np.where(is_leader, leader_impact - without_leader, leader_impact - impact)
+    out.update(leader=leader, is_leader=is_leader, leader_impact=leader_impact, dependency=dependency,
+               without_leader=np.where(is_leader, without_leader, impact - dependency * 0.5),
+               edge_if_leader_absent=np.select([dependency > 0.5, dependency > 0.2], [3.0, 1.5], 0))
+
+    # 16. Age curve
+    age = np.maximum(20, np.minimum(38, 26 + (xgb_or - 0.2) * 20))
+    out['age'] = age
+    out['age_phase'] = np.select([age < 23, age < 27, age < 31, age < 33, age < 35], [0, 1, 2, 3, 4], 5)
+
+    # 17. Région (motifs de noms, les derniers l'emportent)
+    lowered = np.char.lower(frame.names.astype(str))
+    region = np.full(len(frame), 'EUROPEAN', dtype=object)
+    for name, patterns in REGION_PATTERNS:
+        hit = np.zeros(len(frame), dtype=bool)
+        for pattern in patterns:
+            hit |= np.char.find(lowered, pattern.lower()) >= 0
+        region[hit] = name
+    out['region'] = region
+
+    # 18. Arbitres
+    league_cards = np.array([
+        LEAGUE_REFEREE_PROFILES.get(league, LEAGUE_REFEREE_PROFILES['EPL'])['avg_cards_per_game']
+        for league in frame.leagues
+    ])
+    susceptibility = cards_or / np.maximum(league_cards / 22, 0.1)
+    out['card_susceptibility'] = susceptibility
+    out['referee_profile'] = np.select(
+        [susceptibility > 2.0, susceptibility > 1.5, susceptibility > 1.0, susceptibility > 0.5], [0, 1, 2, 3], 4)
+
+    # 20. Congestion
+    minutes_per_week = frame.minutes_per_week
+    out['congestion'] = np.select([minutes_per_week > 135, minutes_per_week > 100, minutes_per_week > 70],
+                                  [0, 1, 2], 3)
+    return out
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ASSEMBLAGE DU quant_v9 D'UN DÉFENSEUR
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_ALPHA_PROFILES = ['VALUE_CREATOR', 'HIGH_IMPACT_VOLATILE', 'PROBLEM_AMPLIFIER', 'VALUE_DESTROYER',
+                   'VOLATILITY_AMPLIFIER', 'STABILIZER', 'NEUTRAL']
+_ALPHA_EDGE = {'PROBLEM_AMPLIFIER': 4.0, 'VALUE_DESTROYER': 2.5, 'VOLATILITY_AMPLIFIER': 2.0,
+               'VALUE_CREATOR': -2.0, 'STABILIZER': -1.5}
+_SHARPE_QUALITY = [('EXCEPTIONAL', 'AGGRESSIVE', 1.5), ('EXCELLENT', 'ABOVE_NORMAL', 1.2), ('GOOD', 'NORMAL', 1.0),
+                   ('MODERATE', 'REDUCED', 0.75), ('POOR', 'MINIMAL', 0.5), ('NEGATIVE', 'AVOID', 0)]
+_DRAWDOWN = [('IN_CRISIS', 'SEVERE', 'DIFFICULT', 1.4), ('IN_DRAWDOWN', 'MODERATE', 'UNCERTAIN', 1.2),
+             ('PEAK_PERFORMANCE', 'NONE', 'N/A', 0.8), ('NORMAL', 'MINOR', 'EXPECTED', 1.0)]
+_FORM_EVIDENCE = [
+    {'type': 'CATASTROPHIC_FORM', 'likelihood_ratio': 1.6, 'affects': ['goals_over', 'btts', 'cards']},
+    {'type': 'POOR_FORM', 'likelihood_ratio': 1.3, 'affects': ['goals_over', 'btts']},
+    {'type': 'EXCELLENT_FORM', 'likelihood_ratio': 0.7, 'affects': ['goals_over', 'btts']},
+]
+_TREND_EVIDENCE = [
+    {'type': 'DECLINING', 'likelihood_ratio': 1.25, 'affects': ['goals_over', 'late_goals']},
+    {'type': 'IMPROVING', 'likelihood_ratio': 0.85, 'affects': ['goals_over']},
+]
+_DUEL_PROFILES = [('DUEL_DOMINANT', "Domine les duels - Rarement battu", -1.0),
+                  ('DUEL_WINNER', "Gagne plus qu'il ne perd", 0),
+                  ('DUEL_AVERAGE', "Performance moyenne en duels", 0.5),
+                  ('DUEL_LOSER', "Perd souvent ses duels - Vulnérable", 2.0)]
+_TILT_PROFILES = [('MAJOR_TILTER', "Tilt sévère après erreur - Cascade probable", 0.45, 3.5),
+                  ('TILTER', "Tilt significatif - Peut enchaîner les erreurs", 0.30, 2.0),
+                  ('OCCASIONAL_TILT', "Tilt occasionnel - Généralement récupère", 0.18, 0.8),
+                  ('COMPOSED', "Composé - Gère bien les erreurs", 0.10, -0.5),
+                  ('RESILIENT', "Ultra-résilient - Rebondit immédiatement", 0.05, -1.5)]
+_AGE_PHASES = [('DEVELOPMENT', 0.90, "En développement - Potentiel non atteint", 'UPWARD', 0, 1.0),
+               ('PRIME_ENTRY', 1.0, "Entrée dans le prime - Performance croissante", 'UPWARD', 0, 1.0),
+               ('PEAK', 1.05, "Peak performance - Meilleure période", 'STABLE', -0.5, 0.9),
+               ('EARLY_DECLINE', 0.98, "Début de déclin - Légère baisse physique", 'SLIGHT_DECLINE', 0.5, 1.1),
+               ('DECLINE', 0.92, "Déclin - Compensation par expérience", 'DECLINING', 1.5, 1.3),
+               ('LATE_CAREER', 0.85, "Fin de carrière - Déclin significatif", 'STEEP_DECLINE', 1.5, 1.3)]
+_REFEREE_PROFILES = ['HIGH_RISK', 'ELEVATED_RISK', 'AVERAGE_RISK', 'LOW_RISK', 'MINIMAL_RISK']
+_REFEREE_EDGE = [3.0, 1.5, 0.5, -0.5, -1.5]
+_CONGESTION = [('CRITICAL', 4.0, "Enchaînement critique - Fatigue majeure"),
+               ('HIGH', 2.5, "Charge élevée - Risque de fatigue"),
+               ('MODERATE', 1.0, "Charge modérée - Gérable"),
+               ('LOW', 0, "Charge légère - Bien reposé")]
+
+
+def _transitions(category: str) -> dict:
+    if category.startswith('CRISIS'):
+        return {'stay_in_crisis': 0.65, 'recovery_to_normal': 0.25, 'worsen': 0.10}
+    if category == 'TRANSITION_DOWN':
+        return {'continue_decline': 0.45, 'stabilize': 0.35, 'crisis': 0.20}
+    if category == 'PEAK':
+        return {'maintain_peak': 0.40, 'regression_to_mean': 0.50, 'sudden_drop': 0.10}
+    return {'stay_stable': 0.60, 'improve': 0.20, 'decline': 0.20}
+
+
+def _correlations(cards: float, impact: float, cs_rate: float, xgbuildup: float, minutes: float) -> dict:
     correlations = {}
-    
-    # Correlation 1: Cards → Impact (Frustration Factor)
-    # Plus de cartons souvent corrélé avec impact négatif
     if cards > 0.25 and impact < 0:
         correlations['cards_impact'] = {
             'name': 'FRUSTRATION_FACTOR',
@@ -396,11 +961,9 @@ def calculate_correlation_insights(defender: dict) -> dict:
         correlations['cards_impact'] = {
             'name': 'FRUSTRATION_FACTOR',
             'strength': 'MEDIUM',
-            'description': f"Corrélation cartons/impact modérée",
+            'description': "Corrélation cartons/impact modérée",
             'edge_impact': 1.0
         }
-    
-    # Correlation 2: Low buildup → Pressing vulnerability
     if xgbuildup < 0.15:
         correlations['buildup_pressing'] = {
             'name': 'PRESSING_VULNERABILITY',
@@ -408,17 +971,13 @@ def calculate_correlation_insights(defender: dict) -> dict:
             'description': f"xGBuildup faible ({xgbuildup:.3f}) → Vulnérable au pressing",
             'edge_impact': 1.5 if xgbuildup < 0.10 else 0.8
         }
-    
-    # Correlation 3: High time + Low CS rate → Consistent liability
-    if time > 800 and cs_rate < 20:
+    if minutes > 800 and cs_rate < 20:
         correlations['time_cs'] = {
             'name': 'CONSISTENT_LIABILITY',
             'strength': 'HIGH',
-            'description': f"Beaucoup joué ({time}min) mais CS faible ({cs_rate:.0f}%) → Liability confirmée",
+            'description': f"Beaucoup joué ({minutes:g}min) mais CS faible ({cs_rate:.0f}%) → Liability confirmée",
             'edge_impact': 2.5
         }
-    
-    # Correlation 4: Cards + Impact → Late game risk
     if cards > 0.2 and impact < 0:
         correlations['late_game_risk'] = {
             'name': 'LATE_GAME_COMPOUND_RISK',
@@ -426,52 +985,90 @@ def calculate_correlation_insights(defender: dict) -> dict:
             'description': "Risque carton + erreur en fin de match amplifié",
             'edge_impact': 1.8
         }
-    
-    # Total edge from correlations
-    total_correlation_edge = sum(c.get('edge_impact', 0) for c in correlations.values())
-    
+    total = sum(c.get('edge_impact', 0) for c in correlations.values())
     return {
         'correlations': correlations,
         'correlation_count': len(correlations),
-        'total_correlation_edge': round(total_correlation_edge, 1),
+        'total_correlation_edge': round(total, 1),
         'has_compound_risk': len(correlations) >= 2,
         'compound_description': 'RISQUES MULTIPLES CORRÉLÉS' if len(correlations) >= 2 else 'Risques isolés'
     }
 
 
-# ═══════════════════════════════════════════════════════════════════════════════
-# 5. CVaR (CONDITIONAL VALUE AT RISK / EXPECTED SHORTFALL)
-# ═══════════════════════════════════════════════════════════════════════════════
+def _assemble(frame: DefenderFrame, cols: Dict[str, list], i: int) -> dict:
+    """quant_v9 d'un défenseur à partir des colonnes calculées (formatage seulement)."""
+    c = {k: v[i] for k, v in cols.items()}
+    team = frame.team_idx[i]
+    name, league = frame.names[i], frame.leagues[i]
+    v9 = {}
+
+    # 1. Alpha/Beta
+    alpha, beta, epsilon = c['alpha'], c['beta'], c['epsilon']
+    if c['has_teammates']:
+        # Moyenne NumPy dans la v9 d'origine: round() garde l'arrondi np.float64
+        alpha = np.float64(alpha)
+    profile = _ALPHA_PROFILES[c['alpha_profile']]
+    description = {
+        'VALUE_CREATOR': f"Crée de la valeur (α={alpha:+.2f}) et stabilise (β={beta:.2f})",
+        'HIGH_IMPACT_VOLATILE': f"Bon impact (α={alpha:+.2f}) mais amplifie variance (β={beta:.2f})",
+        'PROBLEM_AMPLIFIER': f"Détruit valeur (α={alpha:+.2f}) ET amplifie problèmes (β={beta:.2f})",
+        'VALUE_DESTROYER': f"Détruit valeur (α={alpha:+.2f}) malgré stabilité (β={beta:.2f})",
+        'VOLATILITY_AMPLIFIER': f"Neutre en valeur mais amplifie fortement (β={beta:.2f})",
+        'STABILIZER': f"Stabilisateur d'équipe (β={beta:.2f})",
+        'NEUTRAL': f"Impact neutre (α={alpha:+.2f}, β={beta:.2f})",
+    }[profile]
+    v9['alpha_beta'] = {
+        'alpha': round(alpha, 3),
+        'beta': round(beta, 3),
+        'epsilon': round(epsilon, 3),
+        'profile': profile,
+        'description': description,
+        'edge_adjustment': _ALPHA_EDGE.get(profile, 0),
+        'interpretation': {
+            'alpha_meaning': 'Contribution individuelle pure' if alpha > 0 else 'Destruction de valeur',
+            'beta_meaning': 'Amplifie les problèmes' if beta > 1.2 else 'Stabilise' if beta < 0.8 else 'Neutre',
+            'epsilon_meaning': 'Malchanceux' if epsilon > 0.2 else 'Chanceux' if epsilon < -0.2 else 'En ligne avec xGA'
+        }
+    }
 
-def calculate_cvar(defender: dict, v8_data: dict) -> dict:
-    """
-    CVaR: perte MOYENNE dans les pires scénarios
-    Plus robuste que VaR simple
-    """
-    
-    var_data = v8_data.get('var', {})
-    mean_conceded = var_data.get('mean_goals_conceded', 1.5)
-    std_conceded = var_data.get('std_goals_conceded', 0.8)
-    var_95 = var_data.get('VaR_95', 3.0)
-    var_99 = var_data.get('VaR_99', 4.0)
-    
-    # CVaR = E[Loss | Loss > VaR]
-    # Pour distribution normale: CVaR_α = μ + σ × φ(Φ^(-1)(α)) / (1-α)
-    # Approximation: CVaR ≈ VaR + 0.4 × σ
-    
-    cvar_90 = var_data.get('VaR_90', 2.5) + 0.35 * std_conceded
-    cvar_95 = var_95 + 0.4 * std_conceded
-    cvar_99 = var_99 + 0.5 * std_conceded
-    
-    # Interpréter
+    # 2. Sharpe
+    sharpe, edge_mean, volatility = c['sharpe'], c['v8_edge'], c['volatility']
+    quality, sizing_recommendation, sizing_multiplier = _SHARPE_QUALITY[c['sharpe_quality']]
+    v9['sharpe'] = {
+        'sharpe_ratio': round(sharpe, 2),
+        'edge_mean': round(edge_mean, 1),
+        'volatility': round(volatility, 2),
+        'quality': quality,
+        'sizing_recommendation': sizing_recommendation,
+        'sizing_multiplier': sizing_multiplier,
+        'interpretation': f"Edge {edge_mean:.1f}% avec volatilité {volatility:.2f} → Sharpe {sharpe:.2f}"
+    }
+
+    # 3. Kelly
+    v9['kelly'] = {
+        'kelly_full': round(c['kelly_full'] * 100, 2),
+        'kelly_half': round(c['kelly_half'] * 100, 2),
+        'kelly_quarter': round(c['kelly_quarter'] * 100, 2),
+        'kelly_adjusted': round(c['kelly_adjusted'] * 100, 2),
+        'kelly_final': round(c['kelly_final'] * 100, 2),
+        'implied_probability': round(c['kelly_prob'] * 100, 1),
+        'recommendation': f"Stake {c['kelly_final']*100:.2f}% du bankroll",
+        'confidence': quality
+    }
+
+    # 4. Corrélations
+    v9['correlations'] = _correlations(c['cards'], c['impact'], c['cs_rate'], c['xgbuildup'], c['minutes'])
+
+    # 5. CVaR
+    cvar_95 = c['cvar_95']
     if cvar_95 > 5.0:
         risk_category = 'CATASTROPHIC'
         description = f"Dans les 5% pires matchs, concède EN MOYENNE {cvar_95:.1f} buts"
-        extreme_betting = f"Considérer 'Team To Concede 5+' si cote > 10.0"
+        extreme_betting = "Considérer 'Team To Concede 5+' si cote > 10.0"
     elif cvar_95 > 4.0:
         risk_category = 'SEVERE'
         description = f"Dans les 5% pires matchs, concède en moyenne {cvar_95:.1f} buts"
-        extreme_betting = f"Considérer 'Team To Concede 4+' si cote > 6.0"
+        extreme_betting = "Considérer 'Team To Concede 4+' si cote > 6.0"
     elif cvar_95 > 3.0:
         risk_category = 'HIGH'
         description = f"Risque élevé: moyenne {cvar_95:.1f} buts dans les pires matchs"
@@ -480,171 +1077,43 @@ def calculate_cvar(defender: dict, v8_data: dict) -> dict:
         risk_category = 'MODERATE'
         description = f"Risque contrôlé: CVaR95 = {cvar_95:.1f}"
         extreme_betting = "Pas d'opportunité extrême"
-    
-    return {
-        'CVaR_90': round(cvar_90, 2),
+    v9['cvar'] = {
+        'CVaR_90': round(c['cvar_90'], 2),
         'CVaR_95': round(cvar_95, 2),
-        'CVaR_99': round(cvar_99, 2),
+        'CVaR_99': round(c['cvar_99'], 2),
         'risk_category': risk_category,
         'description': description,
         'extreme_betting': extreme_betting,
-        'tail_risk_premium': round(cvar_95 - var_95, 2)
+        'tail_risk_premium': round(cvar_95 - c['var_95'], 2)
     }
 
-
-# ═══════════════════════════════════════════════════════════════════════════════
-# 6. DRAWDOWN ANALYSIS
-# ═══════════════════════════════════════════════════════════════════════════════
-
-def calculate_drawdown(defender: dict, team_context: dict) -> dict:
-    """
-    Analyse des séries noires défensives
-    """
-    
-    momentum = team_context.get('momentum_dna', {})
-    form = momentum.get('form_last_5', 'XXXXX')
-    cs_last_5 = momentum.get('clean_sheets_last_5', 0)
-    avg_goals_against = momentum.get('avg_goals_against', 1.5)
-    
-    # Calculer le drawdown actuel (matchs sans CS consécutifs)
-    current_no_cs_streak = 0
-    for char in form:
-        if char != 'W' or avg_goals_against > 0.5:  # Approximation
-            current_no_cs_streak += 1
-        else:
-            break
-    
-    # Estimation du max drawdown basée sur CS rate
-    cs_rate = defender.get('clean_sheet_rate_with', 25)
-    if cs_rate > 0:
-        # Probabilité de X matchs sans CS = (1 - cs_rate/100)^X
-        expected_max_no_cs = math.ceil(math.log(0.05) / math.log(1 - cs_rate/100))
-    else:
-        expected_max_no_cs = 15
-    
-    # Profil de drawdown
-    if cs_last_5 == 0 and avg_goals_against > 1.5:
-        drawdown_status = 'IN_CRISIS'
-        drawdown_depth = 'SEVERE'
-        recovery_outlook = 'DIFFICULT'
-        edge_multiplier = 1.4
-    elif cs_last_5 <= 1 and avg_goals_against > 1.2:
-        drawdown_status = 'IN_DRAWDOWN'
-        drawdown_depth = 'MODERATE'
-        recovery_outlook = 'UNCERTAIN'
-        edge_multiplier = 1.2
-    elif cs_last_5 >= 3:
-        drawdown_status = 'PEAK_PERFORMANCE'
-        drawdown_depth = 'NONE'
-        recovery_outlook = 'N/A'
-        edge_multiplier = 0.8
-    else:
-        drawdown_status = 'NORMAL'
-        drawdown_depth = 'MINOR'
-        recovery_outlook = 'EXPECTED'
-        edge_multiplier = 1.0
-    
-    return {
-        'current_no_cs_streak': 5 - cs_last_5,  # Approximation
-        'expected_max_no_cs': expected_max_no_cs,
-        'drawdown_status': drawdown_status,
-        'drawdown_depth': drawdown_depth,
-        'recovery_outlook': recovery_outlook,
-        'edge_multiplier': edge_multiplier,
-        'form_context': form,
-        'avg_goals_against_l5': avg_goals_against,
-        'recommendation': f"{'BTTS YES +6%' if drawdown_status == 'IN_CRISIS' else 'Monitor' if drawdown_status == 'IN_DRAWDOWN' else 'Avoid Goals Over'}"
+    # 6. Drawdown
+    status, depth, outlook, multiplier = _DRAWDOWN[c['drawdown']]
+    cs_last_5 = frame.team_cs_last_5[team].item()
+    v9['drawdown'] = {
+        'current_no_cs_streak': 5 - (int(cs_last_5) if cs_last_5.is_integer() else cs_last_5),
+        'expected_max_no_cs': c['expected_max_no_cs'],
+        'drawdown_status': status,
+        'drawdown_depth': depth,
+        'recovery_outlook': outlook,
+        'edge_multiplier': multiplier,
+        'form_context': frame.team_form[team],
+        'avg_goals_against_l5': frame.team_avg_goals_against[team].item(),
+        'recommendation': 'BTTS YES +6%' if status == 'IN_CRISIS' else 'Monitor' if status == 'IN_DRAWDOWN' else 'Avoid Goals Over'
     }
 
-
-# ═══════════════════════════════════════════════════════════════════════════════
-# 7. BAYESIAN UPDATING
-# ═══════════════════════════════════════════════════════════════════════════════
-
-def calculate_bayesian_update(defender: dict, v8_data: dict, team_context: dict) -> dict:
-    """
-    Mise à jour bayésienne des probabilités
-    Prior → Posterior avec evidence contextuelle
-    """
-    
-    # PRIOR: probabilités de base (depuis V8)
-    xcards = v8_data.get('xCards', {})
-    prior_card = xcards.get('probability_card_next_match', 30) / 100
-    
-    var_data = v8_data.get('var', {})
-    prior_3plus = var_data.get('extreme_scenarios', {}).get('P(3_goals)', 15) / 100
-    
-    # EVIDENCE: facteurs contextuels actuels
-    momentum = team_context.get('momentum_dna', {})
-    form = momentum.get('form_last_5', 'XXXXX')
-    trending = momentum.get('trending', 'STABLE')
-    
-    # Likelihood ratios basés sur l'evidence
-    evidence_factors = {}
-    
-    # Evidence 1: Forme récente
-    losses = form.count('L')
-    if losses >= 4:
-        evidence_factors['form'] = {
-            'type': 'CATASTROPHIC_FORM',
-            'likelihood_ratio': 1.6,
-            'affects': ['goals_over', 'btts', 'cards']
-        }
-    elif losses >= 3:
-        evidence_factors['form'] = {
-            'type': 'POOR_FORM',
-            'likelihood_ratio': 1.3,
-            'affects': ['goals_over', 'btts']
-        }
-    elif losses == 0:
-        evidence_factors['form'] = {
-            'type': 'EXCELLENT_FORM',
-            'likelihood_ratio': 0.7,
-            'affects': ['goals_over', 'btts']
-        }
-    
-    # Evidence 2: Tendance
-    if trending == 'DOWN':
-        evidence_factors['trend'] = {
-            'type': 'DECLINING',
-            'likelihood_ratio': 1.25,
-            'affects': ['goals_over', 'late_goals']
-        }
-    elif trending == 'UP':
-        evidence_factors['trend'] = {
-            'type': 'IMPROVING',
-            'likelihood_ratio': 0.85,
-            'affects': ['goals_over']
-        }
-    
-    # POSTERIOR: mise à jour avec Bayes
-    # P(H|E) ∝ P(E|H) × P(H)
-    
-    # Calculer les posteriors
-    posterior_card = prior_card
-    posterior_3plus = prior_3plus
-    
-    for factor, data in evidence_factors.items():
-        lr = data['likelihood_ratio']
-        if 'cards' in data['affects']:
-            posterior_card = posterior_card * lr / (posterior_card * lr + (1 - posterior_card))
-        if 'goals_over' in data['affects']:
-            posterior_3plus = posterior_3plus * lr / (posterior_3plus * lr + (1 - posterior_3plus))
-    
-    # Normaliser
-    posterior_card = min(0.9, max(0.05, posterior_card))
-    posterior_3plus = min(0.7, max(0.05, posterior_3plus))
-    
-    return {
-        'prior': {
-            'P_card': round(prior_card * 100, 1),
-            'P_3plus_goals': round(prior_3plus * 100, 1)
-        },
-        'evidence': evidence_factors,
-        'posterior': {
-            'P_card': round(posterior_card * 100, 1),
-            'P_3plus_goals': round(posterior_3plus * 100, 1)
-        },
+    # 7. Bayesian
+    prior_card, prior_3plus = c['prior_card'], c['prior_3plus']
+    posterior_card, posterior_3plus = c['posterior_card'], c['posterior_3plus']
+    evidence = {}
+    if c['form_code'] >= 0:
+        evidence['form'] = dict(_FORM_EVIDENCE[c['form_code']], affects=list(_FORM_EVIDENCE[c['form_code']]['affects']))
+    if c['trend_code'] >= 0:
+        evidence['trend'] = dict(_TREND_EVIDENCE[c['trend_code']], affects=list(_TREND_EVIDENCE[c['trend_code']]['affects']))
+    v9['bayesian'] = {
+        'prior': {'P_card': round(prior_card * 100, 1), 'P_3plus_goals': round(prior_3plus * 100, 1)},
+        'evidence': evidence,
+        'posterior': {'P_card': round(posterior_card * 100, 1), 'P_3plus_goals': round(posterior_3plus * 100, 1)},
         'bayesian_shift': {
             'card_shift': round((posterior_card - prior_card) * 100, 1),
             'goals_shift': round((posterior_3plus - prior_3plus) * 100, 1)
@@ -652,1016 +1121,161 @@ def calculate_bayesian_update(defender: dict, v8_data: dict, team_context: dict)
         'interpretation': f"Evidence ajuste P(carton) de {prior_card*100:.0f}% → {posterior_card*100:.0f}%"
     }
 
-
-# ═══════════════════════════════════════════════════════════════════════════════
-# 8. HIDDEN MARKOV MODEL (12 ÉTATS NUANCÉS)
-# ═══════════════════════════════════════════════════════════════════════════════
-
-def calculate_hidden_markov(defender: dict, v8_data: dict, team_context: dict) -> dict:
-    """
-    12 états de performance nuancés (pas générique!)
-    """
-    
-    # Données pour déterminer l'état
-    impact = defender.get('impact_goals_conceded', 0) or 0
-    cs_rate = defender.get('clean_sheet_rate_with', 0) or 0
-    cards_90 = defender.get('cards_90', 0) or 0
-    
-    momentum = team_context.get('momentum_dna', {})
-    form = momentum.get('form_last_5', 'XXXXX')
-    trending = momentum.get('trending', 'STABLE')
-    avg_goals_against = momentum.get('avg_goals_against', 1.5)
-    
-    clutch = v8_data.get('clutch', {})
-    clutch_rating = clutch.get('clutch_rating', 'NEUTRAL')
-    
-    vol = v8_data.get('volatility', {})
-    volatility_profile = vol.get('profile', 'INCONSISTENT')
-    
-    # 12 ÉTATS NUANCÉS
-    states = {
-        # États POSITIFS
-        'ELITE_FORM': {
-            'category': 'PEAK',
-            'description': 'Performance d\'élite - Dominateur',
-            'conditions': 'impact > 0.5 AND cs_rate > 50 AND form.count("W") >= 4',
-            'probability': 0,
-            'edge_modifier': -3.0
-        },
-        'CLUTCH_MODE': {
-            'category': 'PEAK',
-            'description': 'Mode clutch activé - Décisif sous pression',
-            'conditions': 'clutch_rating == CLUTCH_PERFORMER AND trending == UP',
-            'probability': 0,
-            'edge_modifier': -2.5
-        },
-        'CONSISTENT_ROCK': {
-            'category': 'STABLE_POSITIVE',
-            'description': 'Roc constant - Fiable sans exception',
-            'conditions': 'volatility_profile == ROCK AND impact > 0',
-            'probability': 0,
-            'edge_modifier': -2.0
-        },
-        'IMPROVING': {
-            'category': 'TRANSITION_UP',
-            'description': 'En progression - Tendance positive',
-            'conditions': 'trending == UP AND recent_improvement',
-            'probability': 0,
-            'edge_modifier': -1.0
-        },
-        
-        # États NEUTRES
-        'STABLE_AVERAGE': {
-            'category': 'NEUTRAL',
-            'description': 'Standard stable - Ni bon ni mauvais',
-            'conditions': 'default',
-            'probability': 0,
-            'edge_modifier': 0
-        },
-        'INCONSISTENT_NEUTRAL': {
-            'category': 'NEUTRAL',
-            'description': 'Alternance de bons et mauvais matchs',
-            'conditions': 'volatility_profile == INCONSISTENT AND impact near 0',
-            'probability': 0,
-            'edge_modifier': 0.5
-        },
-        
-        # États NÉGATIFS MODÉRÉS
-        'DECLINING': {
-            'category': 'TRANSITION_DOWN',
-            'description': 'En déclin - Tendance négative',
-            'conditions': 'trending == DOWN AND impact decreasing',
-            'probability': 0,
-            'edge_modifier': 1.5
-        },
-        'PRESSURE_CRACKER': {
-            'category': 'VULNERABILITY',
-            'description': 'Craque sous pression spécifiquement',
-            'conditions': 'clutch_rating == CHOKE_ARTIST',
-            'probability': 0,
-            'edge_modifier': 2.0
-        },
-        
-        # États CRITIQUES
-        'SLUMP': {
-            'category': 'CRISIS_MILD',
-            'description': 'Mauvaise passe - Série de contre-performances',
-            'conditions': 'form.count("L") >= 3 AND impact < 0',
-            'probability': 0,
-            'edge_modifier': 2.5
-        },
-        'CONFIDENCE_CRISIS': {
-            'category': 'CRISIS_MODERATE',
-            'description': 'Crise de confiance - Erreurs en série',
-            'conditions': 'form.count("L") >= 4 AND cards increasing',
-            'probability': 0,
-            'edge_modifier': 3.5
-        },
-        'TOTAL_COLLAPSE': {
-            'category': 'CRISIS_SEVERE',
-            'description': 'Effondrement total - Performance catastrophique',
-            'conditions': 'form == "LLLLL" AND avg_goals_against > 2.0',
-            'probability': 0,
-            'edge_modifier': 5.0
-        },
-        'LIABILITY_CONFIRMED': {
-            'category': 'CHRONIC',
-            'description': 'Maillon faible chronique - Pas de récupération prévue',
-            'conditions': 'impact < -0.5 AND consistent liability over time',
-            'probability': 0,
-            'edge_modifier': 4.0
-        }
-    }
-    
-    # Déterminer l'état actuel avec probabilités
-    losses = form.count('L')
-    wins = form.count('W')
-    
-    current_state = 'STABLE_AVERAGE'
-    
-    # Logique de détermination
-    if losses >= 5 and avg_goals_against > 2.0:
-        current_state = 'TOTAL_COLLAPSE'
-        states[current_state]['probability'] = 0.85
-    elif losses >= 4 and cards_90 > 0.25:
-        current_state = 'CONFIDENCE_CRISIS'
-        states[current_state]['probability'] = 0.75
-    elif losses >= 3 and impact < 0:
-        current_state = 'SLUMP'
-        states[current_state]['probability'] = 0.70
-    elif impact < -0.5 and cs_rate < 15:
-        current_state = 'LIABILITY_CONFIRMED'
-        states[current_state]['probability'] = 0.80
-    elif clutch_rating == 'CHOKE_ARTIST':
-        current_state = 'PRESSURE_CRACKER'
-        states[current_state]['probability'] = 0.65
-    elif trending == 'DOWN' and impact < 0:
-        current_state = 'DECLINING'
-        states[current_state]['probability'] = 0.60
-    elif volatility_profile == 'WILDCARD':
-        current_state = 'INCONSISTENT_NEUTRAL'
-        states[current_state]['probability'] = 0.55
-    elif trending == 'UP' and impact > 0:
-        current_state = 'IMPROVING'
-        states[current_state]['probability'] = 0.60
-    elif volatility_profile == 'ROCK' and impact > 0:
-        current_state = 'CONSISTENT_ROCK'
-        states[current_state]['probability'] = 0.70
-    elif clutch_rating == 'CLUTCH_PERFORMER' and trending == 'UP':
-        current_state = 'CLUTCH_MODE'
-        states[current_state]['probability'] = 0.65
-    elif impact > 0.5 and cs_rate > 50 and wins >= 4:
-        current_state = 'ELITE_FORM'
-        states[current_state]['probability'] = 0.75
-    else:
-        current_state = 'STABLE_AVERAGE'
-        states[current_state]['probability'] = 0.50
-    
-    # Probabilités de transition
-    transitions = {}
-    state_info = states[current_state]
-    
-    if state_info['category'].startswith('CRISIS'):
-        transitions['stay_in_crisis'] = 0.65
-        transitions['recovery_to_normal'] = 0.25
-        transitions['worsen'] = 0.10
-    elif state_info['category'] == 'TRANSITION_DOWN':
-        transitions['continue_decline'] = 0.45
-        transitions['stabilize'] = 0.35
-        transitions['crisis'] = 0.20
-    elif state_info['category'] == 'PEAK':
-        transitions['maintain_peak'] = 0.40
-        transitions['regression_to_mean'] = 0.50
-        transitions['sudden_drop'] = 0.10
-    else:
-        transitions['stay_stable'] = 0.60
-        transitions['improve'] = 0.20
-        transitions['decline'] = 0.20
-    
-    return {
-        'current_state': current_state,
-        'state_category': states[current_state]['category'],
-        'state_description': states[current_state]['description'],
-        'state_probability': states[current_state]['probability'],
-        'edge_modifier': states[current_state]['edge_modifier'],
+    # 8. Hidden Markov
+    state = HMM_STATE_NAMES[c['hmm_state']]
+    category, state_description, edge_modifier = HMM_STATES[state]
+    transitions = _transitions(category)
+    v9['hidden_markov'] = {
+        'current_state': state,
+        'state_category': category,
+        'state_description': state_description,
+        'state_probability': c['hmm_probability'],
+        'edge_modifier': edge_modifier,
         'transitions': transitions,
         'next_state_prediction': max(transitions, key=transitions.get),
-        'all_states': list(states.keys())
+        'all_states': list(HMM_STATE_NAMES)
     }
 
-
-# ═══════════════════════════════════════════════════════════════════════════════
-# 9. EXPECTED THREAT ALLOWED (xT)
-# ═══════════════════════════════════════════════════════════════════════════════
-
-def calculate_xt_allowed(defender: dict, team_zones: dict, team_actions: dict) -> dict:
-    """
-    Expected Threat: menace permise par zone et action
-    """
-    
-    # Calculer xT allowed depuis zone analysis
-    xt_by_zone = {}
-    total_xt_allowed = 0
-    
-    for zone, data in team_zones.items():
-        if isinstance(data, dict):
-            conversion = data.get('conversion_rate', 0)
-            if isinstance(conversion, (int, float)):
-                shots = data.get('shots_against', data.get('shots', 0))
-                goals = data.get('goals_conceded', data.get('goals', 0))
-                
-                # xT = zone_weight × conversion_rate
-                # Zones proches du but = plus de poids
-                zone_weight = 1.0
-                if 'six' in zone.lower() or 'yard' in zone.lower():
-                    zone_weight = 3.0
-                elif 'penalty' in zone.lower() or 'box' in zone.lower():
-                    zone_weight = 2.0
-                elif 'edge' in zone.lower():
-                    zone_weight = 1.5
-                
-                xt = conversion * zone_weight
-                xt_by_zone[zone] = {
-                    'xt': round(xt, 4),
-                    'conversion': round(conversion * 100, 1) if conversion < 1 else round(conversion, 1),
-                    'goals': goals,
-                    'zone_weight': zone_weight
-                }
-                total_xt_allowed += xt
-    
-    # xT par action
-    xt_by_action = {}
-    for action, data in team_actions.items():
-        if isinstance(data, dict):
-            conversion = data.get('conversion_rate', 0)
-            if isinstance(conversion, (int, float)):
-                goals = data.get('goals_conceded', data.get('goals', 0))
-                xt_by_action[action] = {
-                    'xt': round(conversion, 4),
-                    'goals': goals
-                }
-    
-    # Profil xT
-    if total_xt_allowed > 0.5:
-        xt_profile = 'POROUS'
-        description = f"Très perméable (xT total: {total_xt_allowed:.3f})"
-        edge_impact = 3.0
-    elif total_xt_allowed > 0.3:
-        xt_profile = 'VULNERABLE'
-        description = f"Vulnérable (xT: {total_xt_allowed:.3f})"
-        edge_impact = 1.5
-    elif total_xt_allowed > 0.15:
-        xt_profile = 'AVERAGE'
-        description = f"xT moyen ({total_xt_allowed:.3f})"
-        edge_impact = 0
+    # 9. xT (équipe)
+    v9['xt_allowed'] = frame.team_threat[team]
+
+    # 10. PPDA
+    ppda = c['ppda']
+    ppda_profile = PPDA_PROFILE_NAMES[c['ppda_profile']]
+    info = PPDA_PROFILES[ppda_profile]
+    if ppda_profile in ['PASSIVE_DEFENDER', 'SPECTATOR']:
+        edge_impact, matchup_warning = 2.5, "Vulnérable contre équipes de possession → Goals Over"
+    elif ppda_profile == 'PRESSING_MONSTER':
+        edge_impact, matchup_warning = 1.0, "Risque cartons élevé contre dribbleurs"
+    elif ppda_profile == 'HIGH_PRESS_SPECIALIST':
+        edge_impact, matchup_warning = 0.5, "Surveiller fatigue fin de match"
     else:
-        xt_profile = 'SOLID'
-        description = f"Défense solide (xT: {total_xt_allowed:.3f})"
-        edge_impact = -1.5
-    
-    # Top zones dangereuses
-    sorted_zones = sorted(xt_by_zone.items(), key=lambda x: x[1]['xt'], reverse=True)
-    danger_zones = [{'zone': z[0], **z[1]} for z in sorted_zones[:3]]
-    
-    return {
-        'total_xt_allowed': round(total_xt_allowed, 4),
-        'xt_profile': xt_profile,
-        'description': description,
-        'edge_impact': edge_impact,
-        'danger_zones': danger_zones,
-        'xt_by_zone': xt_by_zone,
-        'xt_by_action': xt_by_action
-    }
-
-
-# ═══════════════════════════════════════════════════════════════════════════════
-# 10. PPDA INDIVIDUEL (8 PROFILS NUANCÉS)
-# ═══════════════════════════════════════════════════════════════════════════════
-
-def calculate_ppda_individual(defender: dict, team_context: dict) -> dict:
-    """
-    PPDA individuel avec 8 profils nuancés
-    """
-    
-    # Estimer PPDA depuis les données disponibles
-    xgbuildup = defender.get('xGBuildup_90', 0.2) or 0.2
-    xgchain = defender.get('xGChain_90', 0.25) or 0.25
-    cards_90 = defender.get('cards_90', 0.2) or 0.2
-    impact = defender.get('impact_goals_conceded', 0) or 0
-    
-    # PPDA estimé (inverse de l'activité défensive)
-    # Plus xGBuildup haut = plus impliqué dans le jeu = PPDA bas
-    # Plus de cartons = plus agressif = PPDA bas
-    estimated_ppda = 15 - (xgbuildup * 20) - (cards_90 * 10)
-    estimated_ppda = max(5, min(20, estimated_ppda))
-    
-    # 8 PROFILS NUANCÉS
-    profiles = {
-        'PRESSING_MONSTER': {
-            'ppda_range': (0, 6),
-            'description': 'Pressing ultra-agressif - Récupère très haut',
-            'strengths': ['Récupération haute', 'Disruption adversaire', 'Transitions rapides'],
-            'weaknesses': ['Espaces dans le dos', 'Fatigue', 'Cartons'],
-            'ideal_opponent': 'Équipes qui construisent lentement',
-            'nightmare_opponent': 'Équipes avec attaquants rapides en profondeur'
-        },
-        'HIGH_PRESS_SPECIALIST': {
-            'ppda_range': (6, 8),
-            'description': 'Spécialiste pressing haut - Agressif mais contrôlé',
-            'strengths': ['Pressing organisé', 'Récupération mi-terrain'],
-            'weaknesses': ['Contre-attaques', 'Matchs intenses'],
-            'ideal_opponent': 'Équipes techniques mais lentes',
-            'nightmare_opponent': 'Équipes de contre'
-        },
-        'INTELLIGENT_PRESSER': {
-            'ppda_range': (8, 10),
-            'description': 'Presseur intelligent - Sélectif dans ses interventions',
-            'strengths': ['Timing', 'Économie d\'énergie', 'Duels gagnés'],
-            'weaknesses': ['Peut être contourné'],
-            'ideal_opponent': 'La plupart des équipes',
-            'nightmare_opponent': 'Équipes très techniques'
-        },
-        'BALANCED_DEFENDER': {
-            'ppda_range': (10, 12),
-            'description': 'Défenseur équilibré - Adapte son pressing',
-            'strengths': ['Polyvalence', 'Fiabilité'],
-            'weaknesses': ['Pas de spécialité'],
-            'ideal_opponent': 'Variable',
-            'nightmare_opponent': 'Équipes de possession'
-        },
-        'POSITIONAL_DEFENDER': {
-            'ppda_range': (12, 14),
-            'description': 'Défenseur positionnel - Préfère le bloc bas',
-            'strengths': ['Positionnement', 'Lecture du jeu', 'Interceptions'],
-            'weaknesses': ['Pressing haut impossible', 'Subir le jeu'],
-            'ideal_opponent': 'Équipes directes',
-            'nightmare_opponent': 'Équipes de possession qui étouffent'
-        },
-        'DEEP_BLOCK_SPECIALIST': {
-            'ppda_range': (14, 16),
-            'description': 'Spécialiste bloc bas - Défend la surface',
-            'strengths': ['Défense de la surface', 'Duels aériens'],
-            'weaknesses': ['Subir la pression', 'Sorties de balle'],
-            'ideal_opponent': 'Équipes qui centrent beaucoup',
-            'nightmare_opponent': 'Équipes techniques qui combinent'
-        },
-        'PASSIVE_DEFENDER': {
-            'ppda_range': (16, 18),
-            'description': 'Défenseur passif - Réactif plutôt que proactif',
-            'strengths': ['Concentration', 'Last-ditch tackles'],
-            'weaknesses': ['Laisse l\'initiative', 'Pression constante'],
-            'ideal_opponent': 'Équipes faibles techniquement',
-            'nightmare_opponent': 'Toute équipe de possession'
-        },
-        'SPECTATOR': {
-            'ppda_range': (18, 25),
-            'description': 'Spectateur - Défense ultra-passive, problématique',
-            'strengths': ['Aucune notable'],
-            'weaknesses': ['Tout', 'Subir constamment', 'Pas d\'impact'],
-            'ideal_opponent': 'Aucune',
-            'nightmare_opponent': 'Toutes les équipes'
-        }
-    }
-    
-    # Déterminer le profil
-    current_profile = 'BALANCED_DEFENDER'
-    for profile_name, profile_data in profiles.items():
-        min_ppda, max_ppda = profile_data['ppda_range']
-        if min_ppda <= estimated_ppda < max_ppda:
-            current_profile = profile_name
-            break
-    
-    profile_info = profiles[current_profile]
-    
-    # Calculer l'edge basé sur le profil
-    if current_profile in ['PASSIVE_DEFENDER', 'SPECTATOR']:
-        edge_impact = 2.5
-        matchup_warning = "Vulnérable contre équipes de possession → Goals Over"
-    elif current_profile == 'PRESSING_MONSTER':
-        edge_impact = 1.0  # Risque cartons
-        matchup_warning = "Risque cartons élevé contre dribbleurs"
-    elif current_profile in ['HIGH_PRESS_SPECIALIST']:
-        edge_impact = 0.5
-        matchup_warning = "Surveiller fatigue fin de match"
-    else:
-        edge_impact = 0
-        matchup_warning = "Profil équilibré"
-    
-    return {
-        'estimated_ppda': round(estimated_ppda, 1),
-        'profile': current_profile,
-        'profile_description': profile_info['description'],
-        'strengths': profile_info['strengths'],
-        'weaknesses': profile_info['weaknesses'],
-        'ideal_opponent': profile_info['ideal_opponent'],
-        'nightmare_opponent': profile_info['nightmare_opponent'],
+        edge_impact, matchup_warning = 0, "Profil équilibré"
+    v9['ppda'] = {
+        'estimated_ppda': round(ppda, 1),
+        'profile': ppda_profile,
+        'profile_description': info['description'],
+        'strengths': info['strengths'],
+        'weaknesses': info['weaknesses'],
+        'ideal_opponent': info['ideal_opponent'],
+        'nightmare_opponent': info['nightmare_opponent'],
         'edge_impact': edge_impact,
         'matchup_warning': matchup_warning,
-        'pressing_intensity': 'VERY_HIGH' if estimated_ppda < 8 else 
-                            'HIGH' if estimated_ppda < 10 else
-                            'MEDIUM' if estimated_ppda < 14 else
-                            'LOW' if estimated_ppda < 18 else 'VERY_LOW'
+        'pressing_intensity': 'VERY_HIGH' if ppda < 8 else 'HIGH' if ppda < 10 else
+                              'MEDIUM' if ppda < 14 else 'LOW' if ppda < 18 else 'VERY_LOW'
     }
 
-
-# ═══════════════════════════════════════════════════════════════════════════════
-# 11. TRANSITION DEFENSE RATING (6 PROFILS)
-# ═══════════════════════════════════════════════════════════════════════════════
-
-def calculate_transition_defense(defender: dict, team_context: dict) -> dict:
-    """
-    Performance en transition avec 6 profils détaillés
-    """
-    
-    # Données disponibles
-    attack_speed = team_context.get('context_dna', {}).get('attackSpeed', {})
-    fast_data = attack_speed.get('Fast', {})
-    fast_conversion = fast_data.get('conversion_against', 10)
-    fast_goals = fast_data.get('goals_against', 0)
-    
-    # Données joueur pour estimer la transition defense
-    xgbuildup = defender.get('xGBuildup_90', 0.2) or 0.2
-    impact = defender.get('impact_goals_conceded', 0) or 0
-    cards_90 = defender.get('cards_90', 0.2) or 0.2
-    
-    # Métriques de transition
-    # Counter press success estimé (inverse de la vulnérabilité aux contres)
-    counter_press_success = max(0, 70 - fast_conversion * 2)
-    
-    # Recovery speed estimé (basé sur xGBuildup - plus haut = plus lent à revenir)
-    recovery_speed_score = 100 - (xgbuildup * 150)
-    recovery_speed_score = max(20, min(100, recovery_speed_score))
-    
-    # Transition goals vulnerability
-    transition_vulnerability = fast_conversion * 1.5
-    
-    # 6 PROFILS DÉTAILLÉS
-    profiles = {
-        'ELITE_TRANSITION': {
-            'conditions': 'fast_conversion < 10 AND counter_press > 70',
-            'description': 'Élite en transition - Récupère instantanément',
-            'characteristics': [
-                'Counter-press immédiat',
-                'Recovery speed exceptionnelle',
-                'Bloque les contres dans l\'œuf',
-                'Leadership défensif en transition'
-            ],
-            'vs_fast_teams': 'DOMINANT',
-            'edge_modifier': -2.0
-        },
-        'TRANSITION_SPECIALIST': {
-            'conditions': 'fast_conversion < 15 AND recovery > 70',
-            'description': 'Spécialiste transition - Gère bien les phases de transition',
-            'characteristics': [
-                'Bonne lecture du jeu',
-                'Anticipation des contres',
-                'Replacement rapide'
-            ],
-            'vs_fast_teams': 'SOLID',
-            'edge_modifier': -1.0
-        },
-        'ADEQUATE_TRANSITION': {
-            'conditions': 'fast_conversion < 20',
-            'description': 'Transition adéquate - Gérable mais pas dominant',
-            'characteristics': [
-                'Performance acceptable',
-                'Quelques erreurs occasionnelles',
-                'Dépend du soutien collectif'
-            ],
-            'vs_fast_teams': 'NEUTRAL',
-            'edge_modifier': 0
-        },
-        'TRANSITION_VULNERABLE': {
-            'conditions': 'fast_conversion >= 20 AND < 30',
-            'description': 'Vulnérable en transition - Problèmes sur les contres',
-            'characteristics': [
-                'Replacement lent',
-                'Difficultés à lire les contres',
-                'Laisse des espaces'
-            ],
-            'vs_fast_teams': 'WEAK',
-            'edge_modifier': 2.0
-        },
-        'TRANSITION_LIABILITY': {
-            'conditions': 'fast_conversion >= 30 AND < 40',
-            'description': 'Passif en transition - Gros problème',
-            'characteristics': [
-                'Recovery très lent',
-                'Souvent pris à contre-pied',
-                'Crée des situations de 1v1 dangereuses'
-            ],
-            'vs_fast_teams': 'EXPLOITABLE',
-            'edge_modifier': 3.5
-        },
-        'TRANSITION_DISASTER': {
-            'conditions': 'fast_conversion >= 40',
-            'description': 'Catastrophe en transition - Boulevard ouvert',
-            'characteristics': [
-                'Aucune capacité de recovery',
-                'Chaque perte = danger',
-                'Équipe doit compenser constamment'
-            ],
-            'vs_fast_teams': 'CATASTROPHIC',
-            'edge_modifier': 5.0
-        }
-    }
-    
-    # Déterminer le profil
-    if fast_conversion < 10 and counter_press_success > 70:
-        current_profile = 'ELITE_TRANSITION'
-    elif fast_conversion < 15 and recovery_speed_score > 70:
-        current_profile = 'TRANSITION_SPECIALIST'
-    elif fast_conversion < 20:
-        current_profile = 'ADEQUATE_TRANSITION'
-    elif fast_conversion < 30:
-        current_profile = 'TRANSITION_VULNERABLE'
-    elif fast_conversion < 40:
-        current_profile = 'TRANSITION_LIABILITY'
-    else:
-        current_profile = 'TRANSITION_DISASTER'
-    
-    profile_info = profiles[current_profile]
-    
-    return {
-        'fast_conversion_rate': round(fast_conversion, 1),
-        'fast_goals_conceded': fast_goals,
-        'counter_press_success': round(counter_press_success, 1),
-        'recovery_speed_score': round(recovery_speed_score, 1),
-        'transition_vulnerability_index': round(transition_vulnerability, 1),
-        'profile': current_profile,
-        'profile_description': profile_info['description'],
-        'characteristics': profile_info['characteristics'],
-        'vs_fast_teams': profile_info['vs_fast_teams'],
-        'edge_modifier': profile_info['edge_modifier'],
-        'recommendation': f"{'Cibler Goals Over vs équipes rapides' if current_profile in ['TRANSITION_LIABILITY', 'TRANSITION_DISASTER'] else 'Prudent sur Goals Over vs équipes rapides' if current_profile == 'ELITE_TRANSITION' else 'Analyser le style adverse'}"
-    }
-
-
-# ═══════════════════════════════════════════════════════════════════════════════
-# 12. BALL PROGRESSION ALLOWED
-# ═══════════════════════════════════════════════════════════════════════════════
-
-def calculate_ball_progression(defender: dict, team_zones: dict) -> dict:
-    """
-    Progression du ballon adverse permise
-    """
-    
-    # Analyser les zones pour déterminer où le ballon progresse
-    progression_metrics = {
-        'deep_zone_entries': 0,
-        'box_entries': 0,
-        'six_yard_entries': 0,
-        'total_shots_allowed': 0
-    }
-    
-    for zone, data in team_zones.items():
-        if isinstance(data, dict):
-            shots = data.get('shots_against', data.get('shots', 0)) or 0
-            goals = data.get('goals_conceded', data.get('goals', 0)) or 0
-            
-            progression_metrics['total_shots_allowed'] += shots
-            
-            if 'six' in zone.lower() or 'yard' in zone.lower():
-                progression_metrics['six_yard_entries'] += shots
-            elif 'penalty' in zone.lower() or 'box' in zone.lower():
-                progression_metrics['box_entries'] += shots
-            elif 'edge' in zone.lower():
-                progression_metrics['deep_zone_entries'] += shots
-    
-    # Calculer le ratio de pénétration
-    total = progression_metrics['total_shots_allowed']
-    if total > 0:
-        box_penetration_rate = (progression_metrics['box_entries'] + progression_metrics['six_yard_entries']) / total
-        danger_zone_rate = progression_metrics['six_yard_entries'] / total
-    else:
-        box_penetration_rate = 0.5
-        danger_zone_rate = 0.1
-    
-    # Profil de progression
-    if danger_zone_rate > 0.25:
-        profile = 'WIDE_OPEN'
-        description = "Laisse l'adversaire pénétrer facilement jusqu'au but"
-        edge_impact = 3.0
-    elif box_penetration_rate > 0.6:
-        profile = 'POROUS'
-        description = "Beaucoup de pénétrations dans la surface"
-        edge_impact = 2.0
-    elif box_penetration_rate > 0.4:
-        profile = 'AVERAGE'
-        description = "Progression adverse dans la moyenne"
-        edge_impact = 0.5
-    else:
-        profile = 'COMPACT'
-        description = "Empêche la progression - Défense compacte"
-        edge_impact = -1.0
-    
-    return {
-        'metrics': progression_metrics,
-        'box_penetration_rate': round(box_penetration_rate * 100, 1),
-        'danger_zone_rate': round(danger_zone_rate * 100, 1),
-        'profile': profile,
-        'description': description,
-        'edge_impact': edge_impact
+    # 11. Transition
+    transition_profile = TRANSITION_PROFILE_NAMES[c['transition_profile']]
+    info = TRANSITION_PROFILES[transition_profile]
+    v9['transition'] = {
+        'fast_conversion_rate': round(c['fast_conversion'], 1),
+        'fast_goals_conceded': frame.team_fast_goals[team],
+        'counter_press_success': round(c['counter_press'], 1),
+        'recovery_speed_score': round(c['recovery'], 1),
+        'transition_vulnerability_index': round(c['fast_conversion'] * 1.5, 1),
+        'profile': transition_profile,
+        'profile_description': info['description'],
+        'characteristics': info['characteristics'],
+        'vs_fast_teams': info['vs_fast_teams'],
+        'edge_modifier': info['edge_modifier'],
+        'recommendation': 'Cibler Goals Over vs équipes rapides'
+        if transition_profile in ['TRANSITION_LIABILITY', 'TRANSITION_DISASTER']
+        else 'Prudent sur Goals Over vs équipes rapides' if transition_profile == 'ELITE_TRANSITION'
+        else 'Analyser le style adverse'
     }
 
-
-# ═══════════════════════════════════════════════════════════════════════════════
-# 13. DUEL SUCCESS RATE
-# ═══════════════════════════════════════════════════════════════════════════════
-
-def calculate_duel_success(defender: dict, v8_data: dict) -> dict:
-    """
-    Estimation du taux de réussite des duels
-    """
-    
-    impact = defender.get('impact_goals_conceded', 0) or 0
-    cards_90 = defender.get('cards_90', 0.2) or 0.2
-    xgbuildup = defender.get('xGBuildup_90', 0.2) or 0.2
-    
-    # Matchup friction pour estimer les duels
-    friction = v8_data.get('matchup_friction', {}).get('profiles', {})
-    
-    # Estimation des taux de duel
-    # Impact positif = gagne plus de duels
-    base_duel_success = 50 + (impact * 15)
-    
-    # Duels aériens (basé sur zone analysis - headers)
-    aerial_friction = friction.get('AERIAL_THREAT', {}).get('friction_score', 1.0)
-    aerial_success = max(30, min(80, 60 - (aerial_friction * 10)))
-    
-    # Duels au sol (basé sur friction vs dribbleurs)
-    ground_friction = friction.get('TECHNICAL_WIZARD', {}).get('friction_score', 1.0)
-    ground_success = max(30, min(75, 55 - (ground_friction * 8)))
-    
-    # Tacles (basé sur cartons - plus de cartons = plus de tacles ratés)
-    tackle_success = max(40, min(80, 70 - (cards_90 * 40)))
-    
-    # Dribbled past (inverse du ground success)
-    dribbled_past = max(10, min(40, 30 - (ground_success - 50)))
-    
-    # Profil global
-    avg_success = (aerial_success + ground_success + tackle_success) / 3
-    
-    if avg_success > 65:
-        profile = 'DUEL_DOMINANT'
-        description = "Domine les duels - Rarement battu"
-    elif avg_success > 55:
-        profile = 'DUEL_WINNER'
-        description = "Gagne plus qu'il ne perd"
-    elif avg_success > 45:
-        profile = 'DUEL_AVERAGE'
-        description = "Performance moyenne en duels"
-    else:
-        profile = 'DUEL_LOSER'
-        description = "Perd souvent ses duels - Vulnérable"
-    
-    # Matchup insights
-    matchup_insights = []
-    if aerial_success < 50:
-        matchup_insights.append(f"Vulnérable aux attaquants aériens (success {aerial_success:.0f}%)")
-    if ground_success < 50:
-        matchup_insights.append(f"Vulnérable aux dribbleurs (success {ground_success:.0f}%)")
-    if tackle_success < 55:
-        matchup_insights.append(f"Tacles imprécis - risque cartons (success {tackle_success:.0f}%)")
-    
-    return {
-        'aerial_duel_success': round(aerial_success, 1),
-        'ground_duel_success': round(ground_success, 1),
-        'tackle_success': round(tackle_success, 1),
-        'dribbled_past_rate': round(dribbled_past, 1),
-        'overall_duel_rating': round(avg_success, 1),
-        'profile': profile,
+    # 12. Ball progression (équipe)
+    v9['ball_progression'] = frame.team_progression[team]
+
+    # 13. Duels
+    aerial, ground, tackle = c['aerial'], c['ground'], c['tackle']
+    duel_profile, description, duel_edge = _DUEL_PROFILES[c['duel_profile']]
+    insights = []
+    if aerial < 50:
+        insights.append(f"Vulnérable aux attaquants aériens (success {aerial:.0f}%)")
+    if ground < 50:
+        insights.append(f"Vulnérable aux dribbleurs (success {ground:.0f}%)")
+    if tackle < 55:
+        insights.append(f"Tacles imprécis - risque cartons (success {tackle:.0f}%)")
+    v9['duel_success'] = {
+        'aerial_duel_success': round(aerial, 1),
+        'ground_duel_success': round(ground, 1),
+        'tackle_success': round(tackle, 1),
+        'dribbled_past_rate': round(c['dribbled_past'], 1),
+        'overall_duel_rating': round(c['duel_avg'], 1),
+        'profile': duel_profile,
         'description': description,
-        'matchup_insights': matchup_insights,
-        'edge_impact': 2.0 if profile == 'DUEL_LOSER' else 0.5 if profile == 'DUEL_AVERAGE' else -1.0 if profile == 'DUEL_DOMINANT' else 0
+        'matchup_insights': insights,
+        'edge_impact': duel_edge
     }
 
-
-# ═══════════════════════════════════════════════════════════════════════════════
-# 14. TILT FACTOR
-# ═══════════════════════════════════════════════════════════════════════════════
-
-def calculate_tilt_factor(defender: dict, v8_data: dict) -> dict:
-    """
-    Comment le défenseur réagit après une erreur
-    """
-    
-    cards_90 = defender.get('cards_90', 0.2) or 0.2
-    red_cards = defender.get('red_cards', 0) or 0
-    impact = defender.get('impact_goals_conceded', 0) or 0
-    
-    clutch = v8_data.get('clutch', {})
-    clutch_rating = clutch.get('clutch_rating', 'NEUTRAL')
-    
-    volatility = v8_data.get('volatility', {})
-    vol_profile = volatility.get('profile', 'INCONSISTENT')
-    
-    # Calculer le tilt factor
-    # Plus de cartons + impact négatif = plus de tilt
-    tilt_score = (cards_90 * 20) + (abs(impact) * 10 if impact < 0 else 0) + (red_cards * 15)
-    
-    # Ajuster selon le clutch rating
-    if clutch_rating == 'CHOKE_ARTIST':
-        tilt_score *= 1.3
-    elif clutch_rating == 'CLUTCH_PERFORMER':
-        tilt_score *= 0.7
-    
-    # Ajuster selon la volatilité
-    if vol_profile == 'WILDCARD':
-        tilt_score *= 1.2
-    elif vol_profile == 'ROCK':
-        tilt_score *= 0.6
-    
-    # Profil de tilt
-    if tilt_score > 15:
-        profile = 'MAJOR_TILTER'
-        description = "Tilt sévère après erreur - Cascade probable"
-        compound_error_risk = 0.45
-        edge_impact = 3.5
-    elif tilt_score > 10:
-        profile = 'TILTER'
-        description = "Tilt significatif - Peut enchaîner les erreurs"
-        compound_error_risk = 0.30
-        edge_impact = 2.0
-    elif tilt_score > 5:
-        profile = 'OCCASIONAL_TILT'
-        description = "Tilt occasionnel - Généralement récupère"
-        compound_error_risk = 0.18
-        edge_impact = 0.8
-    elif tilt_score > 2:
-        profile = 'COMPOSED'
-        description = "Composé - Gère bien les erreurs"
-        compound_error_risk = 0.10
-        edge_impact = -0.5
-    else:
-        profile = 'RESILIENT'
-        description = "Ultra-résilient - Rebondit immédiatement"
-        compound_error_risk = 0.05
-        edge_impact = -1.5
-    
-    return {
-        'tilt_score': round(tilt_score, 2),
-        'profile': profile,
+    # 14. Tilt
+    tilt = c['tilt']
+    tilt_profile, description, compound_error_risk, tilt_edge = _TILT_PROFILES[c['tilt_profile']]
+    cards_or = c['cards'] or 0.2
+    v9['tilt'] = {
+        'tilt_score': round(tilt, 2),
+        'profile': tilt_profile,
         'description': description,
         'compound_error_risk': round(compound_error_risk * 100, 1),
-        'edge_impact': edge_impact,
+        'edge_impact': tilt_edge,
         'triggers': [
-            "Early goal conceded" if tilt_score > 8 else None,
-            "Referee decision against" if cards_90 > 0.25 else None,
-            "Dribbled past" if clutch_rating == 'CHOKE_ARTIST' else None
+            "Early goal conceded" if tilt > 8 else None,
+            "Referee decision against" if cards_or > 0.25 else None,
+            "Dribbled past" if c['clutch_rating'] == 'CHOKE_ARTIST' else None
         ],
-        'recommendation': f"{'Après 1ère erreur → Bet Next Goal' if profile in ['MAJOR_TILTER', 'TILTER'] else 'Pas de tilt betting'}"
+        'recommendation': 'Après 1ère erreur → Bet Next Goal' if tilt_profile in ['MAJOR_TILTER', 'TILTER'] else 'Pas de tilt betting'
     }
 
-
-# ═══════════════════════════════════════════════════════════════════════════════
-# 15. CAPTAIN/LEADERSHIP EFFECT
-# ═══════════════════════════════════════════════════════════════════════════════
-
-def calculate_leadership_effect(defender: dict, team_defenders: list) -> dict:
-    """
-    Impact de la présence/absence d'un leader
-    """
-    
-    # Identifier le meilleur défenseur de l'équipe (le "leader")
-    sorted_defenders = sorted(team_defenders, key=lambda x: x.get('impact_goals_conceded', -99), reverse=True)
-    
-    if not sorted_defenders:
-        return {'no_data': True}
-    
-    leader = sorted_defenders[0]
-    current_player = defender
-    
-    is_leader = current_player.get('name') == leader.get('name')
-    leader_impact = leader.get('impact_goals_conceded', 0) or 0
-    player_impact = current_player.get('impact_goals_conceded', 0) or 0
-    
-    # Calculer la dépendance au leader
-    if is_leader:
-        # Ce joueur EST le leader
-        other_impacts = [d.get('impact_goals_conceded', 0) or 0 for d in team_defenders if d.get('name') != leader.get('name')]
-        avg_without_leader = np.mean(other_impacts) if other_impacts else 0
-        dependency = leader_impact - avg_without_leader
-        
-        role = 'DEFENSIVE_LEADER'
-        description = f"Leader défensif de l'équipe (impact {leader_impact:+.2f})"
-        without_leader_impact = avg_without_leader
-    else:
-        # Ce joueur n'est pas le leader
-        dependency = leader_impact - player_impact
-        
-        if dependency > 0.5:
-            role = 'LEADER_DEPENDENT'
-            description = f"Très dépendant du leader ({leader.get('name', 'N/A')})"
-        elif dependency > 0.2:
-            role = 'SUPPORTED_BY_LEADER'
-            description = f"Bénéficie de la présence du leader"
-        elif dependency < -0.2:
-            role = 'INDEPENDENT_PERFORMER'
-            description = "Performe indépendamment du leader"
-        else:
-            role = 'NEUTRAL_RELATIONSHIP'
-            description = "Relation neutre avec le leader"
-        
-        without_leader_impact = player_impact - dependency * 0.5
-    
-    # Edge si leader absent
-    if dependency > 0.5:
-        edge_if_leader_absent = 3.0
+    # 15. Leadership
+    leader_impact, dependency = c['leader_impact'], c['dependency']
+    without_leader = c['without_leader']
+    if c['is_leader'] and cols['has_teammates'][c['leader']]:
+        dependency, without_leader = np.float64(dependency), np.float64(without_leader)
+    edge_if_absent = c['edge_if_leader_absent']
+    if c['is_leader']:
+        role, description = 'DEFENSIVE_LEADER', f"Leader défensif de l'équipe (impact {leader_impact:+.2f})"
+    elif dependency > 0.5:
+        role, description = 'LEADER_DEPENDENT', f"Très dépendant du leader ({frame.names[c['leader']] or 'N/A'})"
     elif dependency > 0.2:
-        edge_if_leader_absent = 1.5
+        role, description = 'SUPPORTED_BY_LEADER', "Bénéficie de la présence du leader"
+    elif dependency < -0.2:
+        role, description = 'INDEPENDENT_PERFORMER', "Performe indépendamment du leader"
     else:
-        edge_if_leader_absent = 0
-    
-    return {
-        'leader_name': leader.get('name', 'N/A'),
+        role, description = 'NEUTRAL_RELATIONSHIP', "Relation neutre avec le leader"
+    v9['leadership'] = {
+        'leader_name': frame.names[c['leader']] or 'N/A',
         'leader_impact': round(leader_impact, 2),
-        'is_leader': is_leader,
+        'is_leader': c['is_leader'],
         'role': role,
         'description': description,
         'dependency_score': round(dependency, 2),
-        'estimated_impact_without_leader': round(without_leader_impact, 2),
-        'edge_if_leader_absent': edge_if_leader_absent,
-        'recommendation': f"{'Si leader absent → Goals Over +{:.1f}%'.format(edge_if_leader_absent) if edge_if_leader_absent > 0 else 'Pas d\'impact significatif si leader absent'}"
+        'estimated_impact_without_leader': round(without_leader, 2),
+        'edge_if_leader_absent': edge_if_absent,
+        'recommendation': f"Si leader absent → Goals Over +{edge_if_absent:.1f}%" if edge_if_absent > 0
+        else "Pas d'impact significatif si leader absent"
     }
 
-
-# ═══════════════════════════════════════════════════════════════════════════════
-# 16. AGE CURVE MODELING
-# ═══════════════════════════════════════════════════════════════════════════════
-
-def calculate_age_curve(defender: dict) -> dict:
-    """
-    Modélisation du déclin/pic selon l'âge
-    Note: Âge estimé depuis les données disponibles (à enrichir avec données réelles)
-    """
-    
-    # Estimation de l'âge basée sur le temps de jeu et le style
-    # (Dans une vraie implémentation, on aurait l'âge réel)
-    time_played = defender.get('time', 0) or 0
-    games = defender.get('games', 0) or 0
-    xgbuildup = defender.get('xGBuildup_90', 0.2) or 0.2
-    
-    # Estimation grossière de l'âge (à remplacer par données réelles)
-    # Plus de buildup = souvent joueur expérimenté
-    estimated_age = 26 + (xgbuildup - 0.2) * 20
-    estimated_age = max(20, min(38, estimated_age))
-    
-    # Courbe de performance par âge pour défenseurs
-    # Peak: 27-30 ans
-    # Decline: >32 ans
-    
-    if estimated_age < 23:
-        phase = 'DEVELOPMENT'
-        performance_factor = 0.90
-        description = "En développement - Potentiel non atteint"
-        trajectory = 'UPWARD'
-    elif estimated_age < 27:
-        phase = 'PRIME_ENTRY'
-        performance_factor = 1.0
-        description = "Entrée dans le prime - Performance croissante"
-        trajectory = 'UPWARD'
-    elif estimated_age < 31:
-        phase = 'PEAK'
-        performance_factor = 1.05
-        description = "Peak performance - Meilleure période"
-        trajectory = 'STABLE'
-    elif estimated_age < 33:
-        phase = 'EARLY_DECLINE'
-        performance_factor = 0.98
-        description = "Début de déclin - Légère baisse physique"
-        trajectory = 'SLIGHT_DECLINE'
-    elif estimated_age < 35:
-        phase = 'DECLINE'
-        performance_factor = 0.92
-        description = "Déclin - Compensation par expérience"
-        trajectory = 'DECLINING'
-    else:
-        phase = 'LATE_CAREER'
-        performance_factor = 0.85
-        description = "Fin de carrière - Déclin significatif"
-        trajectory = 'STEEP_DECLINE'
-    
-    # Impact sur les edges
-    if phase in ['DECLINE', 'LATE_CAREER']:
-        edge_impact = 1.5
-        fatigue_multiplier = 1.3
-    elif phase == 'EARLY_DECLINE':
-        edge_impact = 0.5
-        fatigue_multiplier = 1.1
-    elif phase == 'PEAK':
-        edge_impact = -0.5
-        fatigue_multiplier = 0.9
-    else:
-        edge_impact = 0
-        fatigue_multiplier = 1.0
-    
-    return {
-        'estimated_age': round(estimated_age, 0),
+    # 16. Age curve
+    phase, performance_factor, description, trajectory, age_edge, fatigue_multiplier = _AGE_PHASES[c['age_phase']]
+    v9['age_curve'] = {
+        'estimated_age': round(c['age'], 0),
         'phase': phase,
         'performance_factor': performance_factor,
         'description': description,
         'trajectory': trajectory,
-        'edge_impact': edge_impact,
+        'edge_impact': age_edge,
         'fatigue_multiplier': fatigue_multiplier,
         'note': "Âge estimé - À enrichir avec données réelles"
     }
 
-
-# ═══════════════════════════════════════════════════════════════════════════════
-# 17. INTERNATIONAL DUTY IMPACT (COMPLET)
-# ═══════════════════════════════════════════════════════════════════════════════
-
-def calculate_intl_duty_impact(defender: dict) -> dict:
-    """
-    Impact complet du retour de sélection nationale
-    """
-    
-    # Estimation de la nationalité et région basée sur le nom
-    # (Dans une vraie implémentation, on aurait les données réelles)
-    name = defender.get('name', '')
-    team = defender.get('team', '')
-    
-    # Détermination de la région (estimation)
-    # Basée sur patterns de noms communs
-    south_american_patterns = ['Silva', 'Santos', 'Rodriguez', 'Martinez', 'Gonzalez', 'Fernandez', 'Alves']
-    african_patterns = ['Sane', 'Diallo', 'Camara', 'Faye', 'Toure', 'Kone', 'Bamba']
-    asian_patterns = ['Kim', 'Park', 'Tomiyasu', 'Endo', 'Son']
-    european_patterns = ['Schmidt', 'Muller', 'Dupont', 'Van', 'De', 'Van Dijk', 'Garcia']
-    
-    region = 'EUROPEAN'  # Default
-    for pattern in south_american_patterns:
-        if pattern.lower() in name.lower():
-            region = 'SOUTH_AMERICAN'
-            break
-    for pattern in african_patterns:
-        if pattern.lower() in name.lower():
-            region = 'AFRICAN'
-            break
-    for pattern in asian_patterns:
-        if pattern.lower() in name.lower():
-            region = 'ASIAN'
-            break
-    
-    # Impact par région
-    regional_impacts = {
-        'SOUTH_AMERICAN': {
-            'travel_impact': 'SEVERE',
-            'avg_travel_km': 10000,
-            'time_zone_diff': 5,
-            'performance_drop': -12,
-            'recovery_matches': 2,
-            'jet_lag_risk': 'HIGH',
-            'altitude_factor': True
-        },
-        'AFRICAN': {
-            'travel_impact': 'HIGH',
-            'avg_travel_km': 6000,
-            'time_zone_diff': 2,
-            'performance_drop': -8,
-            'recovery_matches': 1.5,
-            'jet_lag_risk': 'MEDIUM',
-            'altitude_factor': False
-        },
-        'ASIAN': {
-            'travel_impact': 'SEVERE',
-            'avg_travel_km': 9000,
-            'time_zone_diff': 8,
-            'performance_drop': -10,
-            'recovery_matches': 2,
-            'jet_lag_risk': 'VERY_HIGH',
-            'altitude_factor': False
-        },
-        'EUROPEAN': {
-            'travel_impact': 'LOW',
-            'avg_travel_km': 2000,
-            'time_zone_diff': 1,
-            'performance_drop': -5,
-            'recovery_matches': 1,
-            'jet_lag_risk': 'LOW',
-            'altitude_factor': False
-        }
-    }
-    
-    region_data = regional_impacts.get(region, regional_impacts['EUROPEAN'])
-    
-    # Facteurs supplémentaires
-    # Minutes jouées en sélection (estimation basée sur le profil)
-    intl_importance = 'STARTER' if defender.get('time', 0) > 800 else 'ROTATION'
-    expected_intl_minutes = 180 if intl_importance == 'STARTER' else 90
-    
-    # Compétition importance
-    competition_factors = {
-        'WORLD_CUP_QUALIFIER': 1.3,
-        'CONTINENTAL_CUP': 1.2,
-        'FRIENDLY': 0.8,
-        'DEFAULT': 1.0
-    }
-    
-    # Edge calculations
+    # 17. International duty
+    region = c['region']
+    region_data = REGIONAL_IMPACTS[region]
+    intl_importance = 'STARTER' if c['minutes'] > 800 else 'ROTATION'
     post_intl_edge = abs(region_data['performance_drop']) * 0.3
-    
-    return {
+    v9['intl_duty'] = {
         'estimated_region': region,
         'travel_impact': region_data['travel_impact'],
         'avg_travel_km': region_data['avg_travel_km'],
@@ -1671,7 +1285,7 @@ def calculate_intl_duty_impact(defender: dict) -> dict:
         'jet_lag_risk': region_data['jet_lag_risk'],
         'altitude_factor': region_data['altitude_factor'],
         'intl_importance': intl_importance,
-        'expected_intl_minutes': expected_intl_minutes,
+        'expected_intl_minutes': 180 if intl_importance == 'STARTER' else 90,
         'post_intl_edge': round(post_intl_edge, 1),
         'recommendation': f"Match post-trêve internationale → Goals Over +{post_intl_edge:.1f}% (si {region})",
         'fatigue_compound': region_data['jet_lag_risk'] == 'VERY_HIGH',
@@ -1679,473 +1293,198 @@ def calculate_intl_duty_impact(defender: dict) -> dict:
             f"Voyage {region_data['avg_travel_km']}km",
             f"Décalage horaire {region_data['time_zone_diff']}h",
             f"Drop attendu: {region_data['performance_drop']}%",
-            f"Altitude factor" if region_data['altitude_factor'] else None
+            "Altitude factor" if region_data['altitude_factor'] else None
         ]
     }
 
-
-# ═══════════════════════════════════════════════════════════════════════════════
-# 18. REFEREE PROFILING (DONNÉES RÉELLES)
-# ═══════════════════════════════════════════════════════════════════════════════
-
-def calculate_referee_impact(defender: dict) -> dict:
-    """
-    Profil arbitre avec données détaillées
-    Note: À enrichir avec la base de données arbitres créée
-    """
-    
-    cards_90 = defender.get('cards_90', 0.2) or 0.2
-    red_cards = defender.get('red_cards', 0) or 0
-    league = defender.get('league', '')
-    
-    # Profils d'arbitres types par ligue (données agrégées)
-    # (À remplacer par données réelles de notre base)
-    league_referee_profiles = {
-        'EPL': {
-            'avg_cards_per_game': 3.8,
-            'avg_penalties': 0.28,
-            'strictness': 'MODERATE',
-            'home_bias': 0.52,
-            'card_timing': 'LATE_HEAVY',  # Plus de cartons en 2ème MT
-            'controversial_decisions': 0.15
-        },
-        'La_Liga': {
-            'avg_cards_per_game': 4.5,
-            'avg_penalties': 0.32,
-            'strictness': 'STRICT',
-            'home_bias': 0.54,
-            'card_timing': 'DISTRIBUTED',
-            'controversial_decisions': 0.18
-        },
-        'Bundesliga': {
-            'avg_cards_per_game': 3.2,
-            'avg_penalties': 0.25,
-            'strictness': 'LENIENT',
-            'home_bias': 0.50,
-            'card_timing': 'EARLY_WARNING',
-            'controversial_decisions': 0.10
-        },
-        'Serie_A': {
-            'avg_cards_per_game': 4.2,
-            'avg_penalties': 0.35,
-            'strictness': 'STRICT',
-            'home_bias': 0.55,
-            'card_timing': 'STRICT_ALL_GAME',
-            'controversial_decisions': 0.20
-        },
-        'Ligue_1': {
-            'avg_cards_per_game': 3.6,
-            'avg_penalties': 0.30,
-            'strictness': 'MODERATE',
-            'home_bias': 0.53,
-            'card_timing': 'LATE_HEAVY',
-            'controversial_decisions': 0.14
-        }
-    }
-    
-    league_profile = league_referee_profiles.get(league, league_referee_profiles['EPL'])
-    
-    # Calculer l'interaction joueur × arbitre
-    player_card_rate = cards_90
-    league_avg_cards = league_profile['avg_cards_per_game'] / 22  # Par joueur
-    
-    # Ratio de susceptibilité
-    card_susceptibility = player_card_rate / max(league_avg_cards, 0.1)
-    
-    # Profil d'interaction
-    if card_susceptibility > 2.0:
-        interaction_profile = 'HIGH_RISK'
-        description = f"Très susceptible aux cartons dans cette ligue ({league})"
-        edge_modifier = 3.0
-    elif card_susceptibility > 1.5:
-        interaction_profile = 'ELEVATED_RISK'
-        description = "Risque carton au-dessus de la moyenne"
-        edge_modifier = 1.5
-    elif card_susceptibility > 1.0:
-        interaction_profile = 'AVERAGE_RISK'
-        description = "Risque carton dans la moyenne"
-        edge_modifier = 0.5
-    elif card_susceptibility > 0.5:
-        interaction_profile = 'LOW_RISK'
-        description = "Risque carton sous la moyenne"
-        edge_modifier = -0.5
-    else:
-        interaction_profile = 'MINIMAL_RISK'
-        description = "Très faible risque de carton"
-        edge_modifier = -1.5
-    
-    # Impact du timing des cartons
-    timing_impact = {}
+    # 18. Arbitres
+    league_profile = LEAGUE_REFEREE_PROFILES.get(league, LEAGUE_REFEREE_PROFILES['EPL'])
+    interaction = _REFEREE_PROFILES[c['referee_profile']]
+    description = {
+        'HIGH_RISK': f"Très susceptible aux cartons dans cette ligue ({league})",
+        'ELEVATED_RISK': "Risque carton au-dessus de la moyenne",
+        'AVERAGE_RISK': "Risque carton dans la moyenne",
+        'LOW_RISK': "Risque carton sous la moyenne",
+        'MINIMAL_RISK': "Très faible risque de carton",
+    }[interaction]
     if league_profile['card_timing'] == 'LATE_HEAVY':
-        timing_impact['warning'] = "Arbitres plus stricts en 2ème MT"
-        timing_impact['period_risk'] = {'1H': 0.35, '2H': 0.65}
+        timing_impact = {'warning': "Arbitres plus stricts en 2ème MT", 'period_risk': {'1H': 0.35, '2H': 0.65}}
     elif league_profile['card_timing'] == 'EARLY_WARNING':
-        timing_impact['warning'] = "Cartons préventifs en début de match"
-        timing_impact['period_risk'] = {'1H': 0.55, '2H': 0.45}
+        timing_impact = {'warning': "Cartons préventifs en début de match", 'period_risk': {'1H': 0.55, '2H': 0.45}}
     else:
-        timing_impact['warning'] = "Distribution équilibrée"
-        timing_impact['period_risk'] = {'1H': 0.50, '2H': 0.50}
-    
-    return {
+        timing_impact = {'warning': "Distribution équilibrée", 'period_risk': {'1H': 0.50, '2H': 0.50}}
+    v9['referee'] = {
         'league': league,
         'league_profile': league_profile,
-        'card_susceptibility': round(card_susceptibility, 2),
-        'interaction_profile': interaction_profile,
+        'card_susceptibility': round(c['card_susceptibility'], 2),
+        'interaction_profile': interaction,
         'description': description,
-        'edge_modifier': edge_modifier,
+        'edge_modifier': _REFEREE_EDGE[c['referee_profile']],
         'timing_impact': timing_impact,
         'penalty_risk': 'HIGH' if league_profile['avg_penalties'] > 0.30 else 'MEDIUM',
         'home_advantage_factor': league_profile['home_bias'],
-        'recommendation': f"{'Cards Over value' if interaction_profile == 'HIGH_RISK' else 'Monitor cards' if interaction_profile == 'ELEVATED_RISK' else 'Cards Under possible'}"
+        'recommendation': 'Cards Over value' if interaction == 'HIGH_RISK'
+        else 'Monitor cards' if interaction == 'ELEVATED_RISK' else 'Cards Under possible'
     }
 
+    # 19. Stadium (équipe)
+    v9['stadium'] = frame.team_stadium[team]
 
-# ═══════════════════════════════════════════════════════════════════════════════
-# 19. STADIUM/HOME EFFECT
-# ═══════════════════════════════════════════════════════════════════════════════
-
-def calculate_stadium_effect(defender: dict, team_defense: dict) -> dict:
-    """
-    Performance spécifique domicile/extérieur
-    """
-    
-    # Données home/away depuis team_defense
-    xga_home = team_defense.get('xga_home', 0) or 0
-    ga_home = team_defense.get('ga_home', 0) or 0
-    matches_home = team_defense.get('matches_home', 1) or 1
-    
-    xga_away = team_defense.get('xga_away', 0) or 0
-    ga_away = team_defense.get('ga_away', 0) or 0
-    matches_away = team_defense.get('matches_away', 1) or 1
-    
-    # Moyennes
-    avg_ga_home = ga_home / matches_home
-    avg_ga_away = ga_away / matches_away
-    avg_xga_home = xga_home / matches_home
-    avg_xga_away = xga_away / matches_away
-    
-    # Home advantage
-    home_advantage = avg_ga_away - avg_ga_home
-    
-    # Profils
-    if home_advantage > 0.8:
-        profile = 'FORTRESS'
-        description = f"Forteresse à domicile - {home_advantage:.2f} buts de différence"
-        home_edge = -2.0
-        away_edge = 2.5
-    elif home_advantage > 0.4:
-        profile = 'HOME_STRONG'
-        description = f"Fort à domicile - {home_advantage:.2f} buts de différence"
-        home_edge = -1.0
-        away_edge = 1.5
-    elif home_advantage > -0.2:
-        profile = 'BALANCED'
-        description = "Performance similaire home/away"
-        home_edge = 0
-        away_edge = 0
-    elif home_advantage > -0.5:
-        profile = 'ROAD_WARRIOR'
-        description = "Paradoxalement meilleur à l'extérieur"
-        home_edge = 1.0
-        away_edge = -1.0
-    else:
-        profile = 'AWAY_SPECIALIST'
-        description = "Beaucoup mieux à l'extérieur (rare)"
-        home_edge = 1.5
-        away_edge = -1.5
-    
-    return {
-        'home_performance': {
-            'avg_goals_conceded': round(avg_ga_home, 2),
-            'avg_xGA': round(avg_xga_home, 2),
-            'matches': matches_home
-        },
-        'away_performance': {
-            'avg_goals_conceded': round(avg_ga_away, 2),
-            'avg_xGA': round(avg_xga_away, 2),
-            'matches': matches_away
-        },
-        'home_advantage': round(home_advantage, 2),
-        'profile': profile,
-        'description': description,
-        'edge_impact': {
-            'home': home_edge,
-            'away': away_edge
-        }
-    }
-
-
-# ═══════════════════════════════════════════════════════════════════════════════
-# 20. WEATHER & FIXTURE CONGESTION
-# ═══════════════════════════════════════════════════════════════════════════════
-
-def calculate_weather_congestion(defender: dict, v8_data: dict) -> dict:
-    """
-    Impact météo et enchaînement de matchs
-    """
-    
-    fatigue = v8_data.get('fatigue', {})
-    fatigue_risk = fatigue.get('fatigue_risk', 'LOW')
-    minutes_per_week = fatigue.get('estimated_minutes_per_week', 45)
-    
-    # Fixture congestion analysis
-    if minutes_per_week > 135:  # Plus de 1.5 match/semaine
-        congestion_level = 'CRITICAL'
-        congestion_impact = 4.0
-        congestion_description = "Enchaînement critique - Fatigue majeure"
-    elif minutes_per_week > 100:
-        congestion_level = 'HIGH'
-        congestion_impact = 2.5
-        congestion_description = "Charge élevée - Risque de fatigue"
-    elif minutes_per_week > 70:
-        congestion_level = 'MODERATE'
-        congestion_impact = 1.0
-        congestion_description = "Charge modérée - Gérable"
-    else:
-        congestion_level = 'LOW'
-        congestion_impact = 0
-        congestion_description = "Charge légère - Bien reposé"
-    
-    # Weather impact (générique - à enrichir avec API météo)
-    weather_scenarios = {
-        'RAIN': {
-            'impact': 'More errors, slippery conditions',
-            'edge_modifier': 1.5,
-            'affected_metrics': ['aerial', 'passing', 'positioning']
-        },
-        'WIND': {
-            'impact': 'Long balls unpredictable',
-            'edge_modifier': 1.0,
-            'affected_metrics': ['aerial', 'set_pieces']
-        },
-        'HEAT': {
-            'impact': 'Faster fatigue',
-            'edge_modifier': 2.0,
-            'affected_metrics': ['late_game', 'pressing']
-        },
-        'COLD': {
-            'impact': 'Muscles tighter',
-            'edge_modifier': 0.5,
-            'affected_metrics': ['injuries']
-        },
-        'NORMAL': {
-            'impact': 'Standard conditions',
-            'edge_modifier': 0,
-            'affected_metrics': []
-        }
-    }
-    
-    # Combinaison congestion + fatigue
-    combined_fatigue_risk = 'CRITICAL' if congestion_level == 'CRITICAL' or fatigue_risk == 'HIGH' else \
-                           'HIGH' if congestion_level == 'HIGH' else \
-                           'MODERATE' if congestion_level == 'MODERATE' else 'LOW'
-    
+    # 20. Météo & congestion
+    level, congestion_impact, congestion_description = _CONGESTION[c['congestion']]
+    fatigue_risk = c['fatigue_risk']
     late_game_vulnerability = congestion_impact > 2.0 or fatigue_risk == 'HIGH'
-    
-    return {
+    v9['weather_congestion'] = {
         'congestion': {
-            'level': congestion_level,
+            'level': level,
             'impact': congestion_impact,
             'description': congestion_description,
-            'minutes_per_week': round(minutes_per_week, 0)
+            'minutes_per_week': round(c['minutes_per_week'], 0)
         },
-        'weather_scenarios': weather_scenarios,
-        'combined_fatigue_risk': combined_fatigue_risk,
+        'weather_scenarios': WEATHER_SCENARIOS,
+        'combined_fatigue_risk': 'CRITICAL' if level == 'CRITICAL' or fatigue_risk == 'HIGH' else
+                                 'HIGH' if level == 'HIGH' else 'MODERATE' if level == 'MODERATE' else 'LOW',
         'late_game_vulnerability': late_game_vulnerability,
         'edge_impact': congestion_impact,
-        'recommendation': f"{'Late Goals bet value' if late_game_vulnerability else 'No fatigue edge'}"
+        'recommendation': 'Late Goals bet value' if late_game_vulnerability else 'No fatigue edge'
     }
 
-
-# ═══════════════════════════════════════════════════════════════════════════════
-# PHASE 3: APPLICATION V9.0
-# ═══════════════════════════════════════════════════════════════════════════════
-
-print(f"\n{'═'*80}")
-print("🔬 PHASE 3: ANALYSE QUANT V9.0 (20 DIMENSIONS)")
-print(f"{'═'*80}")
-
-processed = 0
-for d in defenders:
-    if d.get('time', 0) < 400:
-        continue
-    
-    team = d.get('team', '')
-    team_context = teams_context.get(team, {})
-    team_defense = team_defense_dna.get(team, {})
-    team_zones = zone_analysis.get(team, {})
-    team_actions = action_analysis.get(team, {})
-    team_defenders = defenders_by_team.get(team, [])
-    v8_data = d.get('quant_v8', {})
-    
-    # Calculer les 20 dimensions
-    v9_analysis = {}
-    
-    # Finance Quantitative (1-7)
-    v9_analysis['alpha_beta'] = calculate_alpha_beta(d, team_defense, team_defenders)
-    v9_analysis['sharpe'] = calculate_sharpe_ratio(d, v8_data)
-    v9_analysis['kelly'] = calculate_kelly_criterion(d, v8_data, v9_analysis['sharpe'])
-    v9_analysis['correlations'] = calculate_correlation_insights(d)
-    v9_analysis['cvar'] = calculate_cvar(d, v8_data)
-    v9_analysis['drawdown'] = calculate_drawdown(d, team_context)
-    v9_analysis['bayesian'] = calculate_bayesian_update(d, v8_data, team_context)
-    
-    # Advanced States (8)
-    v9_analysis['hidden_markov'] = calculate_hidden_markov(d, v8_data, team_context)
-    
-    # Football Metrics (9-13)
-    v9_analysis['xt_allowed'] = calculate_xt_allowed(d, team_zones, team_actions)
-    v9_analysis['ppda'] = calculate_ppda_individual(d, team_context)
-    v9_analysis['transition'] = calculate_transition_defense(d, team_context)
-    v9_analysis['ball_progression'] = calculate_ball_progression(d, team_zones)
-    v9_analysis['duel_success'] = calculate_duel_success(d, v8_data)
-    
-    # Behavioral (14-17)
-    v9_analysis['tilt'] = calculate_tilt_factor(d, v8_data)
-    v9_analysis['leadership'] = calculate_leadership_effect(d, team_defenders)
-    v9_analysis['age_curve'] = calculate_age_curve(d)
-    v9_analysis['intl_duty'] = calculate_intl_duty_impact(d)
-    
-    # Contextual (18-20)
-    v9_analysis['referee'] = calculate_referee_impact(d)
-    v9_analysis['stadium'] = calculate_stadium_effect(d, team_defense)
-    v9_analysis['weather_congestion'] = calculate_weather_congestion(d, v8_data)
-    
-    # ═══════════════════════════════════════════════════════════════════════════
-    # SYNTHÈSE EDGE V9.0
-    # ═══════════════════════════════════════════════════════════════════════════
-    
-    v8_total_edge = v8_data.get('edge_synthesis', {}).get('v8_total_edge', 0)
-    
-    # Collecter tous les edge impacts V9
-    v9_edge_components = {
-        'alpha_beta': v9_analysis['alpha_beta'].get('edge_adjustment', 0),
-        'correlations': v9_analysis['correlations'].get('total_correlation_edge', 0),
-        'drawdown': (v9_analysis['drawdown'].get('edge_multiplier', 1.0) - 1.0) * 10,
-        'hidden_markov': v9_analysis['hidden_markov'].get('edge_modifier', 0),
-        'xt_allowed': v9_analysis['xt_allowed'].get('edge_impact', 0),
-        'ppda': v9_analysis['ppda'].get('edge_impact', 0),
-        'transition': v9_analysis['transition'].get('edge_modifier', 0),
-        'ball_progression': v9_analysis['ball_progression'].get('edge_impact', 0),
-        'duel_success': v9_analysis['duel_success'].get('edge_impact', 0),
-        'tilt': v9_analysis['tilt'].get('edge_impact', 0),
-        'leadership': v9_analysis['leadership'].get('edge_if_leader_absent', 0) * 0.5,  # Pondéré
-        'age_curve': v9_analysis['age_curve'].get('edge_impact', 0),
-        'intl_duty': v9_analysis['intl_duty'].get('post_intl_edge', 0) * 0.3,  # Pondéré (occasionnel)
-        'referee': v9_analysis['referee'].get('edge_modifier', 0),
-        'weather_congestion': v9_analysis['weather_congestion'].get('edge_impact', 0)
+    # ─── Synthèse edge V9.0 ────────────────────────────────────────────────────
+    v8_total_edge = c['v8_edge']
+    components = {
+        'alpha_beta': v9['alpha_beta']['edge_adjustment'],
+        'correlations': v9['correlations']['total_correlation_edge'],
+        'drawdown': (v9['drawdown']['edge_multiplier'] - 1.0) * 10,
+        'hidden_markov': v9['hidden_markov']['edge_modifier'],
+        'xt_allowed': v9['xt_allowed']['edge_impact'],
+        'ppda': v9['ppda']['edge_impact'],
+        'transition': v9['transition']['edge_modifier'],
+        'ball_progression': v9['ball_progression']['edge_impact'],
+        'duel_success': v9['duel_success']['edge_impact'],
+        'tilt': v9['tilt']['edge_impact'],
+        'leadership': v9['leadership']['edge_if_leader_absent'] * 0.5,  # Pondéré
+        'age_curve': v9['age_curve']['edge_impact'],
+        'intl_duty': v9['intl_duty']['post_intl_edge'] * 0.3,  # Pondéré (occasionnel)
+        'referee': v9['referee']['edge_modifier'],
+        'weather_congestion': v9['weather_congestion']['edge_impact']
     }
-    
-    v9_adjustment = sum(v9_edge_components.values())
-    
-    # Sharpe ratio ajustement du sizing
-    sharpe_multiplier = v9_analysis['sharpe'].get('sizing_multiplier', 1.0)
-    
-    # Kelly recommendation
-    kelly_stake = v9_analysis['kelly'].get('kelly_final', 0)
-    
-    # Total V9 Edge
-    v9_total_edge = (v8_total_edge + v9_adjustment) * sharpe_multiplier
-    
-    v9_analysis['edge_synthesis'] = {
+    v9_adjustment = sum(components.values())
+    v9_total_edge = (v8_total_edge + v9_adjustment) * sizing_multiplier
+    v9['edge_synthesis'] = {
         'v8_base_edge': round(v8_total_edge, 1),
-        'v9_components': {k: round(v, 1) for k, v in v9_edge_components.items() if abs(v) > 0.5},
+        'v9_components': {k: round(v, 1) for k, v in components.items() if abs(v) > 0.5},
         'v9_adjustment': round(v9_adjustment, 1),
-        'sharpe_multiplier': round(sharpe_multiplier, 2),
+        'sharpe_multiplier': round(sizing_multiplier, 2),
         'v9_total_edge': round(v9_total_edge, 1),
-        'kelly_stake': round(kelly_stake, 2),
-        'quality': v9_analysis['sharpe'].get('quality', 'MODERATE')
+        'kelly_stake': round(v9['kelly']['kelly_final'], 2),
+        'quality': quality
     }
-    
-    # ═══════════════════════════════════════════════════════════════════════════
-    # SIGNATURE V9.0
-    # ═══════════════════════════════════════════════════════════════════════════
-    
+
+    # ─── Signature V9.0 ────────────────────────────────────────────────────────
     sig_parts = []
-    
-    # Alpha/Beta
-    ab = v9_analysis['alpha_beta']
+    ab = v9['alpha_beta']
     if ab['profile'] == 'PROBLEM_AMPLIFIER':
         sig_parts.append(f"AMPLIFICATEUR (α={ab['alpha']:+.2f}|β={ab['beta']:.2f})")
     elif ab['profile'] == 'VALUE_CREATOR':
         sig_parts.append(f"CRÉATEUR (α={ab['alpha']:+.2f})")
-    
-    # Hidden Markov
-    hm = v9_analysis['hidden_markov']
-    if hm['state_category'].startswith('CRISIS'):
-        sig_parts.append(f"STATE:{hm['current_state']}")
-    
-    # Sharpe
-    if v9_analysis['sharpe']['quality'] in ['EXCEPTIONAL', 'EXCELLENT']:
-        sig_parts.append(f"SHARPE:{v9_analysis['sharpe']['sharpe_ratio']:.1f}")
-    
-    # Transition
-    tr = v9_analysis['transition']
-    if tr['profile'] in ['TRANSITION_LIABILITY', 'TRANSITION_DISASTER']:
-        sig_parts.append(f"TRANS:{tr['profile'][:8]}")
-    
-    # PPDA
-    ppda = v9_analysis['ppda']
-    if ppda['profile'] in ['PASSIVE_DEFENDER', 'SPECTATOR']:
-        sig_parts.append(f"PPDA:{ppda['profile'][:8]}")
-    
-    # Tilt
-    tilt = v9_analysis['tilt']
-    if tilt['profile'] in ['MAJOR_TILTER', 'TILTER']:
-        sig_parts.append(f"TILT:{tilt['compound_error_risk']:.0f}%")
-    
-    # CVaR
-    cvar = v9_analysis['cvar']
-    if cvar['risk_category'] == 'CATASTROPHIC':
-        sig_parts.append(f"CVaR95:{cvar['CVaR_95']:.1f}")
-    
-    v9_analysis['signature_v9'] = ' | '.join(sig_parts) if sig_parts else f"PROFIL:{ab['profile']}"
-    
-    # Fingerprint V9
-    v9_analysis['fingerprint_v9'] = f"V9-E{int(v9_total_edge)}-S{v9_analysis['sharpe']['sharpe_ratio']:.1f}-{hm['current_state'][:4]}"
-    
-    # Assigner
-    d['quant_v9'] = v9_analysis
-    processed += 1
-
-print(f"   ✅ {processed} défenseurs analysés (20 dimensions)")
+    if category.startswith('CRISIS'):
+        sig_parts.append(f"STATE:{state}")
+    if quality in ['EXCEPTIONAL', 'EXCELLENT']:
+        sig_parts.append(f"SHARPE:{v9['sharpe']['sharpe_ratio']:.1f}")
+    if transition_profile in ['TRANSITION_LIABILITY', 'TRANSITION_DISASTER']:
+        sig_parts.append(f"TRANS:{transition_profile[:8]}")
+    if ppda_profile in ['PASSIVE_DEFENDER', 'SPECTATOR']:
+        sig_parts.append(f"PPDA:{ppda_profile[:8]}")
+    if tilt_profile in ['MAJOR_TILTER', 'TILTER']:
+        sig_parts.append(f"TILT:{v9['tilt']['compound_error_risk']:.0f}%")
+    if risk_category == 'CATASTROPHIC':
+        sig_parts.append(f"CVaR95:{v9['cvar']['CVaR_95']:.1f}")
+    v9['signature_v9'] = ' | '.join(sig_parts) if sig_parts else f"PROFIL:{ab['profile']}"
+    v9['fingerprint_v9'] = f"V9-E{int(v9_total_edge)}-S{v9['sharpe']['sharpe_ratio']:.1f}-{state[:4]}"
+    return v9
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
-# PHASE 4: SAUVEGARDE
+# PHASE 4: PIPELINE
 # ═══════════════════════════════════════════════════════════════════════════════
 
-print(f"\n{'═'*80}")
-print("💾 PHASE 4: SAUVEGARDE")
-print(f"{'═'*80}")
+_FRAME_COLUMNS = ('v8_edge', 'volatility', 'impact', 'cs_rate', 'cards', 'xgbuildup', 'minutes', 'var_95',
+                  'prior_card', 'prior_3plus', 'clutch_rating', 'fatigue_risk', 'minutes_per_week')
+
+
+def analyze_defenders(defenders: Sequence[dict], sources: DefenderSources) -> List[dict]:
+    """quant_v9 de chaque défenseur fourni (déjà qualifiés), dans le même ordre."""
+    if not defenders:
+        return []
+    frame = DefenderFrame.from_defenders(defenders, sources)
+    dims = compute_dimensions(frame)
+    # Colonnes -> listes Python une fois (float natifs pour round/format/JSON)
+    cols = {k: v.tolist() for k, v in dims.items()}
+    cols.update({k: getattr(frame, k).tolist() for k in _FRAME_COLUMNS})
+    return [_assemble(frame, cols, i) for i in range(len(frame))]
+
+
+def _analyze_chunk(payload):
+    defenders, sources = payload
+    return analyze_defenders(defenders, sources)
+
+
+def enrich_defenders(defenders: List[dict], sources: DefenderSources, workers: int = 1,
+                     min_minutes: int = MIN_MINUTES) -> int:
+    """
+    Ajoute quant_v9 aux défenseurs ayant au moins min_minutes.
+
+    Les group-by (alpha, leader) étant par équipe, chaque ligue est un lot
+    indépendant: workers > 1 les répartit sur des process.
+
+    Returns:
+        Nombre de défenseurs analysés
+    """
+    qualified = [d for d in defenders if (d.get('time') or 0) >= min_minutes]
+    if workers <= 1:
+        results = analyze_defenders(qualified, sources)
+        for d, v9 in zip(qualified, results):
+            d['quant_v9'] = v9
+        return len(qualified)
+
+    # Lot = ligue de l'équipe (première apparition), pour ne jamais couper une équipe
+    team_league: Dict[str, str] = {}
+    chunks: Dict[str, List[dict]] = {}
+    for d in qualified:
+        league = team_league.setdefault(d.get('team', ''), d.get('league', ''))
+        chunks.setdefault(league, []).append(d)
+
+    batches = list(chunks.values())
+    payloads = [(batch, sources.subset({d.get('team', '') for d in batch})) for batch in batches]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch, results in zip(batches, pool.map(_analyze_chunk, payloads)):
+            for d, v9 in zip(batch, results):
+                d['quant_v9'] = v9
+    return len(qualified)
 
-with open(DEFENDER_DIR / 'defender_dna_quant_v9.json', 'w') as f:
-    json.dump(defenders, f, indent=2, ensure_ascii=False)
-print(f"   ✅ defender_dna_quant_v9.json")
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # PHASE 5: RAPPORT
 # ═══════════════════════════════════════════════════════════════════════════════
 
-print(f"\n{'═'*80}")
-print("📊 PHASE 5: RAPPORT QUANT V9.0 - HEDGE FUND GRADE 3.0")
-print(f"{'═'*80}")
-
-# Exemples détaillés
-examples = ['Toti', 'Gabriel']
+def print_report(defenders: List[dict], processed: int, examples: Sequence[str] = ('Toti', 'Gabriel')):
+    print(f"\n{'═'*80}")
+    print("📊 PHASE 5: RAPPORT QUANT V9.0 - HEDGE FUND GRADE 3.0")
+    print(f"{'═'*80}")
 
-for name in examples:
-    player = next((d for d in defenders if name in d.get('name', '') and d.get('quant_v9')), None)
-    if player:
+    for name in examples:
+        player = next((d for d in defenders if name in d.get('name', '') and d.get('quant_v9')), None)
+        if not player:
+            continue
         v9 = player['quant_v9']
-        
+
         print(f"\n{'═'*80}")
         print(f"👤 {player['name']} ({player['team']} - {player['league']})")
         print(f"{'═'*80}")
-        
+
         print(f"\n📛 SIGNATURE V9: {v9['signature_v9']}")
         print(f"🔑 FINGERPRINT: {v9['fingerprint_v9']}")
-        
-        # Alpha/Beta
+
         ab = v9['alpha_beta']
         print(f"\n{'─'*60}")
         print(f"1️⃣ ALPHA/BETA DECOMPOSITION")
@@ -2154,54 +1493,47 @@ for name in examples:
         print(f"   ε (variance): {ab['epsilon']:.3f}")
         print(f"   Profil: {ab['profile']}")
         print(f"   → {ab['description']}")
-        
-        # Sharpe
+
         sh = v9['sharpe']
         print(f"\n{'─'*60}")
         print(f"2️⃣ SHARPE RATIO")
         print(f"   Sharpe: {sh['sharpe_ratio']:.2f} ({sh['quality']})")
         print(f"   Sizing: {sh['sizing_recommendation']} (×{sh['sizing_multiplier']:.2f})")
-        
-        # Kelly
+
         ke = v9['kelly']
         print(f"\n{'─'*60}")
         print(f"3️⃣ KELLY CRITERION")
         print(f"   Kelly Full: {ke['kelly_full']:.2f}%")
         print(f"   Kelly Adjusted: {ke['kelly_adjusted']:.2f}%")
         print(f"   Recommendation: {ke['recommendation']}")
-        
-        # Correlations
+
         co = v9['correlations']
         print(f"\n{'─'*60}")
         print(f"4️⃣ CORRELATIONS")
         print(f"   Corrélations trouvées: {co['correlation_count']}")
-        for name_c, data in co['correlations'].items():
+        for data in co['correlations'].values():
             print(f"   • {data['name']}: {data['description']}")
-        
-        # CVaR
+
         cv = v9['cvar']
         print(f"\n{'─'*60}")
         print(f"5️⃣ CVaR (Expected Shortfall)")
         print(f"   CVaR90: {cv['CVaR_90']:.2f} | CVaR95: {cv['CVaR_95']:.2f} | CVaR99: {cv['CVaR_99']:.2f}")
         print(f"   Catégorie: {cv['risk_category']}")
         print(f"   → {cv['description']}")
-        
-        # Drawdown
+
         dd = v9['drawdown']
         print(f"\n{'─'*60}")
         print(f"6️⃣ DRAWDOWN ANALYSIS")
         print(f"   Status: {dd['drawdown_status']} ({dd['drawdown_depth']})")
         print(f"   Forme: {dd['form_context']}")
         print(f"   → {dd['recommendation']}")
-        
-        # Bayesian
+
         ba = v9['bayesian']
         print(f"\n{'─'*60}")
         print(f"7️⃣ BAYESIAN UPDATING")
         print(f"   Prior P(carton): {ba['prior']['P_card']:.0f}% → Posterior: {ba['posterior']['P_card']:.0f}%")
         print(f"   Shift: {ba['bayesian_shift']['card_shift']:+.1f}%")
-        
-        # Hidden Markov
+
         hm = v9['hidden_markov']
         print(f"\n{'─'*60}")
         print(f"8️⃣ HIDDEN MARKOV MODEL (12 états)")
@@ -2209,16 +1541,14 @@ for name in examples:
         print(f"   Probabilité: {hm['state_probability']*100:.0f}%")
         print(f"   → {hm['state_description']}")
         print(f"   Prédiction: {hm['next_state_prediction']}")
-        
-        # xT
+
         xt = v9['xt_allowed']
         print(f"\n{'─'*60}")
         print(f"9️⃣ EXPECTED THREAT ALLOWED")
         print(f"   xT Total: {xt['total_xt_allowed']:.4f}")
         print(f"   Profil: {xt['xt_profile']}")
         print(f"   Zones danger: {[z['zone'] for z in xt['danger_zones'][:3]]}")
-        
-        # PPDA
+
         pp = v9['ppda']
         print(f"\n{'─'*60}")
         print(f"🔟 PPDA INDIVIDUEL (8 profils)")
@@ -2229,8 +1559,7 @@ for name in examples:
         print(f"   Faiblesses: {pp['weaknesses'][:2]}")
         print(f"   Ideal opponent: {pp['ideal_opponent']}")
         print(f"   Nightmare: {pp['nightmare_opponent']}")
-        
-        # Transition
+
         tr = v9['transition']
         print(f"\n{'─'*60}")
         print(f"1️⃣1️⃣ TRANSITION DEFENSE (6 profils)")
@@ -2238,8 +1567,7 @@ for name in examples:
         print(f"   Profil: {tr['profile']}")
         print(f"   → {tr['profile_description']}")
         print(f"   vs Fast teams: {tr['vs_fast_teams']}")
-        
-        # Tilt
+
         ti = v9['tilt']
         print(f"\n{'─'*60}")
         print(f"1️⃣4️⃣ TILT FACTOR")
@@ -2247,8 +1575,7 @@ for name in examples:
         print(f"   Profil: {ti['profile']}")
         print(f"   Risque erreur composée: {ti['compound_error_risk']:.0f}%")
         print(f"   → {ti['recommendation']}")
-        
-        # International
+
         it = v9['intl_duty']
         print(f"\n{'─'*60}")
         print(f"1️⃣7️⃣ INTERNATIONAL DUTY")
@@ -2256,11 +1583,10 @@ for name in examples:
         print(f"   Impact voyage: {it['travel_impact']}")
         print(f"   Drop attendu: {it['expected_performance_drop']}%")
         print(f"   Jet lag risk: {it['jet_lag_risk']}")
-        
-        # Edge Synthesis
+
         es = v9['edge_synthesis']
         print(f"\n{'─'*60}")
-        print(f"�� SYNTHÈSE EDGE V9.0")
+        print(f"💰 SYNTHÈSE EDGE V9.0")
         print(f"   V8 Base: {es['v8_base_edge']:+.1f}%")
         print(f"   V9 Adjustment: {es['v9_adjustment']:+.1f}%")
         print(f"   Composants V9:")
@@ -2272,22 +1598,55 @@ for name in examples:
         print(f"   📊 Kelly Stake: {es['kelly_stake']:.2f}%")
         print(f"   ⭐ Quality: {es['quality']}")
 
-# Top 25
-print(f"\n{'═'*80}")
-print("💰 TOP 25 DÉFENSEURS PAR EDGE V9.0")
-print(f"{'═'*80}")
-
-ranked = sorted([d for d in defenders if d.get('quant_v9')], 
-                key=lambda x: x['quant_v9']['edge_synthesis']['v9_total_edge'], reverse=True)
-
-print(f"\n{'Rank':<5}│{'Nom':<22}│{'Équipe':<20}│{'V8':<7}│{'V9':<7}│{'Sharpe':<7}│{'Kelly':<6}│{'State':<12}")
-print("─" * 95)
-for i, d in enumerate(ranked[:25], 1):
-    v9 = d['quant_v9']
-    es = v9['edge_synthesis']
-    print(f"{i:<5}│{d['name'][:20]:<22}│{d['team'][:18]:<20}│{es['v8_base_edge']:+5.1f}%│{es['v9_total_edge']:+5.1f}%│{v9['sharpe']['sharpe_ratio']:5.2f}│{es['kelly_stake']:4.2f}%│{v9['hidden_markov']['current_state'][:10]:<12}")
-
-print(f"\n{'═'*80}")
-print(f"✅ DEFENDER DNA QUANT V9.0 - HEDGE FUND GRADE 3.0 COMPLET")
-print(f"   20 dimensions | {processed} défenseurs | ADN 100% unique")
-print(f"{'═'*80}")
+    print(f"\n{'═'*80}")
+    print("💰 TOP 25 DÉFENSEURS PAR EDGE V9.0")
+    print(f"{'═'*80}")
+
+    ranked = sorted([d for d in defenders if d.get('quant_v9')],
+                    key=lambda x: x['quant_v9']['edge_synthesis']['v9_total_edge'], reverse=True)
+
+    print(f"\n{'Rank':<5}│{'Nom':<22}│{'Équipe':<20}│{'V8':<7}│{'V9':<7}│{'Sharpe':<7}│{'Kelly':<6}│{'State':<12}")
+    print("─" * 95)
+    for i, d in enumerate(ranked[:25], 1):
+        v9 = d['quant_v9']
+        es = v9['edge_synthesis']
+        print(f"{i:<5}│{d['name'][:20]:<22}│{d['team'][:18]:<20}│{es['v8_base_edge']:+5.1f}%│{es['v9_total_edge']:+5.1f}%│{v9['sharpe']['sharpe_ratio']:5.2f}│{es['kelly_stake']:4.2f}%│{v9['hidden_markov']['current_state'][:10]:<12}")
+
+    print(f"\n{'═'*80}")
+    print(f"✅ DEFENDER DNA QUANT V9.0 - HEDGE FUND GRADE 3.0 COMPLET")
+    print(f"   20 dimensions | {processed} défenseurs | ADN 100% unique")
+    print(f"{'═'*80}")
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description='Defender DNA Quant V9.0 (batch)')
+    parser.add_argument('--workers', type=int, default=1, help='Process en parallèle (une ligue par lot)')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR)
+    parser.add_argument('--no-report', action='store_true', help='Ne pas afficher le rapport')
+    args = parser.parse_args(argv)
+
+    print("═" * 80)
+    print("🧬 DEFENDER DNA QUANT V9.0 - HEDGE FUND GRADE 3.0")
+    print(f"   {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("═" * 80)
+
+    defender_dir = args.data_dir / 'defender_dna'
+    defenders = load_defenders(defender_dir / 'defender_dna_quant_v8.json')
+    sources = load_sources(args.data_dir)
+    print(f"   ✅ {len(defenders)} défenseurs (V8), {len(sources.teams_context)} équipes context, "
+          f"{len(sources.team_defense_dna)} équipes defense DNA")
+
+    start = time.perf_counter()
+    processed = enrich_defenders(defenders, sources, workers=args.workers)
+    print(f"   ✅ {processed} défenseurs analysés (20 dimensions) en {time.perf_counter() - start:.2f}s")
+
+    with open(defender_dir / 'defender_dna_quant_v9.json', 'w') as f:
+        json.dump(defenders, f, indent=2, ensure_ascii=False)
+    print(f"   ✅ defender_dna_quant_v9.json")
+
+    if not args.no_report:
+        print_report(defenders, processed)
+
+
+if __name__ == '__main__':
+    main()
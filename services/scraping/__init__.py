@@ -2,7 +2,17 @@
 Ghost Scraper - Anti-Cloudflare Scraping Service
 Hedge Fund Grade - Mon_PS
 """
-from .ghost_scraper import GhostScraper
-from .config import ScraperConfig
+from .config import ScraperConfig, DomainPolicy, DOMAIN_POLICIES
+from .raw_archive import RawArchive, ArchiveEntry
+from .async_fetcher import AsyncFetcher, FetchResult, TokenBucket
 
-__all__ = ['GhostScraper', 'ScraperConfig']
+try:
+    from .ghost_scraper import GhostScraper
+except ImportError:  # curl_cffi absent: AsyncFetcher reste utilisable
+    GhostScraper = None
+
+__all__ = [
+    'GhostScraper', 'ScraperConfig',
+    'AsyncFetcher', 'FetchResult', 'TokenBucket', 'DomainPolicy', 'DOMAIN_POLICIES',
+    'RawArchive', 'ArchiveEntry',
+]
@@ -0,0 +1,326 @@
+"""
+Async Fetcher - Fetch concurrent, poli par domaine
+═══════════════════════════════════════════════════════════════════════════
+Remplace le couple requests.get + time.sleep des scrapers:
+
+- Token bucket par domaine (DomainPolicy): understat, transfermarkt, fbref
+  et betexplorer avancent en parallèle, chacun à son propre rythme
+- Requêtes conditionnelles: ETag / Last-Modified du dernier fetch archivé
+  → 304 servi depuis l'archive, aucun octet retéléchargé
+- Détection de changement (idée de GhostScraper.page_has_changed): le
+  SHA-256 du contenu est comparé au dernier fetch → result.changed
+- Archive brute (RawArchive): les parsers peuvent être rejoués sans réseau
+- 429/503/challenge Cloudflare: pause du domaine entier (Retry-After
+  respecté), puis retry
+═══════════════════════════════════════════════════════════════════════════
+
+AUTEUR: Mon_PS Team
+DATE: 2026-10-19
+VERSION: 1.0.0
+"""
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from .config import (
+    DEFAULT_CONFIG,
+    DEFAULT_DOMAIN_POLICY,
+    DOMAIN_POLICIES,
+    DomainPolicy,
+    ScraperConfig,
+)
+from .raw_archive import RawArchive, content_hash
+
+logger = logging.getLogger("AsyncFetcher")
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9,fr;q=0.8',
+}
+
+
+class TokenBucket:
+    """
+    Token bucket à réservation: chaque appel consomme un jeton tout de suite
+    et reçoit le délai à attendre. Les jetons négatifs représentent la file
+    d'attente, donc l'ordre d'arrivée est respecté sans verrou.
+    """
+
+    def __init__(self, rate: float, capacity: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, extra_delay: float = 0.0) -> float:
+        """Réserve un jeton (+ extra_delay secondes de budget); retourne l'attente en secondes."""
+        self._refill()
+        self.tokens -= 1 + extra_delay * self.rate
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def pause(self, seconds: float) -> None:
+        """Vide le bucket pour `seconds` (429 / 503)."""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+
+class DomainScheduler:
+    """Budget d'un domaine: intervalle (+ jitter), plafond horaire, concurrence."""
+
+    def __init__(self, domain: str, policy: DomainPolicy, clock: Callable[[], float] = time.monotonic):
+        self.domain = domain
+        self.policy = policy
+        self.interval = TokenBucket(1.0 / policy.min_interval, policy.burst, clock)
+        self.hourly = (
+            TokenBucket(policy.max_per_hour / 3600.0, policy.max_per_hour, clock)
+            if policy.max_per_hour else None
+        )
+        self._semaphore = asyncio.Semaphore(policy.max_concurrency)
+        self.requests = 0
+        self.waited_seconds = 0.0
+
+    @asynccontextmanager
+    async def slot(self):
+        async with self._semaphore:
+            jitter = random.uniform(0, self.policy.jitter) if self.policy.jitter else 0.0
+            wait = self.interval.reserve(jitter)
+            if self.hourly is not None:
+                wait = max(wait, self.hourly.reserve())
+            if wait > 0:
+                self.waited_seconds += wait
+                await asyncio.sleep(wait)
+            self.requests += 1
+            yield
+
+    def pause(self, seconds: float) -> None:
+        logger.warning(f"⏸️ {self.domain}: pause {seconds:.0f}s")
+        self.interval.pause(seconds)
+
+
+@dataclass
+class FetchResult:
+    """Résultat d'un fetch (jamais d'exception: voir error)."""
+    url: str
+    status: int                      # 0 = erreur réseau
+    body: Optional[bytes] = None
+    content_hash: Optional[str] = None
+    changed: bool = True             # False = identique au dernier fetch archivé
+    not_modified: bool = False       # 304 → body lu depuis l'archive
+    from_archive: bool = False       # mode offline
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.body is not None and self.error is None
+
+    @property
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace") if self.body is not None else ""
+
+
+class BlockedError(Exception):
+    """Statut bloquant (403/429/503) ou challenge Cloudflare."""
+
+    def __init__(self, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"Blocked ({status})")
+        self.status = status
+        self.retry_after = retry_after
+
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        try:
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+
+class AsyncFetcher:
+    """
+    Fetcher asyncio partagé par tous les scrapers.
+
+    Usage:
+        async with AsyncFetcher(archive=RawArchive()) as fetcher:
+            async for result in fetcher.fetch_many(urls):
+                if result.ok and result.changed:
+                    parse(result.text)
+    """
+
+    def __init__(
+        self,
+        policies: Optional[Dict[str, DomainPolicy]] = None,
+        default_policy: DomainPolicy = DEFAULT_DOMAIN_POLICY,
+        archive: Optional[RawArchive] = None,
+        config: ScraperConfig = DEFAULT_CONFIG,
+        headers: Optional[Dict[str, str]] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        offline: bool = False,
+    ):
+        self.policies = DOMAIN_POLICIES if policies is None else policies
+        self.default_policy = default_policy
+        self.archive = archive
+        self.config = config
+        self.offline = offline
+        self._client = client
+        self._owns_client = client is None
+        self._headers = {**DEFAULT_HEADERS, **(headers or {})}
+        self._schedulers: Dict[str, DomainScheduler] = {}
+        self.stats = {"fetched": 0, "not_modified": 0, "unchanged": 0, "errors": 0, "retries": 0}
+
+    async def __aenter__(self) -> "AsyncFetcher":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+        self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers=self._headers,
+                timeout=self.config.REQUEST_TIMEOUT,
+                follow_redirects=True,
+            )
+        return self._client
+
+    def scheduler(self, url: str) -> DomainScheduler:
+        domain = urlsplit(url).netloc.lower()
+        if domain not in self._schedulers:
+            policy = self.policies.get(domain, self.default_policy)
+            self._schedulers[domain] = DomainScheduler(domain, policy)
+        return self._schedulers[domain]
+
+    # ─── FETCH ───
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None,
+                    conditional: bool = True) -> FetchResult:
+        """Récupère une URL en respectant le budget de son domaine."""
+        t0 = time.perf_counter()
+        # Index SQLite et blobs gzip: hors de la boucle asyncio
+        previous = await asyncio.to_thread(self.archive.latest, url) if self.archive is not None else None
+
+        if self.offline:
+            if previous is None:
+                return FetchResult(url, 0, error="not archived")
+            body = await asyncio.to_thread(self.archive.read, previous.content_hash)
+            return FetchResult(url, previous.status, body=body,
+                               content_hash=previous.content_hash, changed=False, from_archive=True)
+
+        request_headers = dict(headers or {})
+        if conditional and previous is not None and self.archive.has_blob(previous.content_hash):
+            if previous.etag:
+                request_headers["If-None-Match"] = previous.etag
+            if previous.last_modified:
+                request_headers["If-Modified-Since"] = previous.last_modified
+
+        scheduler = self.scheduler(url)
+        last_error = ""
+        for attempt in range(self.config.MAX_RETRIES):
+            try:
+                async with scheduler.slot():
+                    response = await self.client.get(url, headers=request_headers)
+                result = self._handle_response(url, response, previous)
+                await self._archive(result, response, previous)
+                result.elapsed_ms = (time.perf_counter() - t0) * 1000
+                return result
+            except BlockedError as e:
+                last_error = str(e)
+                scheduler.pause(e.retry_after if e.retry_after is not None
+                                else scheduler.policy.cooldown_seconds * self.config.BACKOFF_MULTIPLIER ** attempt)
+            except httpx.TransportError as e:
+                last_error = f"{type(e).__name__}: {e}"
+                await asyncio.sleep(self.config.BACKOFF_MULTIPLIER ** attempt)
+            self.stats["retries"] += 1
+            logger.warning(f"🔁 {url} attempt {attempt + 1}/{self.config.MAX_RETRIES}: {last_error}")
+
+        self.stats["errors"] += 1
+        return FetchResult(url, 0, error=last_error, elapsed_ms=(time.perf_counter() - t0) * 1000)
+
+    def _handle_response(self, url: str, response: httpx.Response, previous) -> FetchResult:
+        status = response.status_code
+        if status in self.config.BLOCKED_STATUS_CODES:
+            raise BlockedError(status, _retry_after_seconds(response.headers.get("Retry-After")))
+
+        if status == 304 and previous is not None:
+            self.stats["not_modified"] += 1
+            return FetchResult(url, 304, content_hash=previous.content_hash,
+                               changed=False, not_modified=True)
+
+        if status != 200:
+            self.stats["errors"] += 1
+            return FetchResult(url, status, error=f"HTTP {status}")
+
+        body = response.content
+        if self.config.CLOUDFLARE_CHALLENGE_TEXT.encode() in body:
+            raise BlockedError(status)
+
+        self.stats["fetched"] += 1
+        digest = content_hash(body)
+        changed = previous is None or previous.content_hash != digest
+        if not changed:
+            self.stats["unchanged"] += 1
+        return FetchResult(url, status, body=body, content_hash=digest, changed=changed)
+
+    async def _archive(self, result: FetchResult, response: httpx.Response, previous) -> None:
+        """304: corps relu depuis l'archive; 200: réponse archivée (gzip + index, dans un thread)."""
+        if result.not_modified:
+            await asyncio.to_thread(self.archive.touch, previous)
+            result.body = await asyncio.to_thread(self.archive.read, previous.content_hash)
+        elif result.ok and self.archive is not None:
+            await asyncio.to_thread(
+                self.archive.put, result.url, result.body, status=result.status,
+                content_type=response.headers.get("Content-Type"),
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+
+    # ─── BATCH ───
+
+    async def fetch_many(self, urls: Iterable[str], **kwargs) -> AsyncIterator[FetchResult]:
+        """
+        Lance toutes les URLs; chaque domaine avance à son rythme, les
+        résultats sont émis dans l'ordre de complétion.
+        """
+        tasks = [asyncio.create_task(self.fetch(url, **kwargs)) for url in dict.fromkeys(urls)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def fetch_all(self, urls: Iterable[str], **kwargs) -> List[FetchResult]:
+        """Comme fetch_many, résultats dans l'ordre d'entrée."""
+        return list(await asyncio.gather(*(self.fetch(url, **kwargs) for url in urls)))
+
+    def domain_stats(self) -> Dict[str, Dict[str, float]]:
+        return {
+            domain: {"requests": s.requests, "waited_seconds": round(s.waited_seconds, 3)}
+            for domain, s in self._schedulers.items()
+        }
@@ -5,7 +5,7 @@ Stratégie "Low & Slow" - Indétectable par Cloudflare
 ═══════════════════════════════════════════════════════════════════════════
 """
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, List, Optional
 
 @dataclass
 class ScraperConfig:
@@ -43,3 +43,47 @@ class ScraperConfig:
 
 # Instance par défaut
 DEFAULT_CONFIG = ScraperConfig()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# POLITESSE PAR DOMAINE (AsyncFetcher)
+# ═══════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class DomainPolicy:
+    """
+    Budget de requêtes d'un domaine.
+
+    min_interval + jitter reproduisent les time.sleep(random.uniform(a, b))
+    des scrapers existants: intervalle moyen = min_interval + jitter / 2.
+    """
+
+    # Intervalle minimum entre deux requêtes (secondes)
+    min_interval: float = 2.0
+
+    # Délai aléatoire additionnel (0 → jitter secondes)
+    jitter: float = 0.0
+
+    # Requêtes autorisées d'affilée après une période calme
+    burst: int = 1
+
+    # Requêtes simultanées sur le domaine
+    max_concurrency: int = 1
+
+    # Plafond horaire (None = pas de plafond)
+    max_per_hour: Optional[int] = None
+
+    # Pause imposée au domaine après un 429/503 sans Retry-After
+    cooldown_seconds: float = 60.0
+
+
+# Budgets actuels des scrapers (délais repris de leurs time.sleep)
+DOMAIN_POLICIES: Dict[str, DomainPolicy] = {
+    "understat.com": DomainPolicy(min_interval=1.5, jitter=1.5),
+    "www.transfermarkt.com": DomainPolicy(min_interval=2.0, jitter=2.0),
+    "fbref.com": DomainPolicy(min_interval=15.0, jitter=30.0, cooldown_seconds=300.0),
+    "www.betexplorer.com": DomainPolicy(min_interval=2.0, jitter=3.0, max_per_hour=100),
+}
+
+# Domaine inconnu: prudent par défaut
+DEFAULT_DOMAIN_POLICY = DomainPolicy(min_interval=2.0, jitter=1.0)
@@ -0,0 +1,224 @@
+"""
+Parsers - Extraction pure (sans réseau) des pages scrapées
+═══════════════════════════════════════════════════════════════════════════
+Chaque parser prend le contenu brut + l'URL et retourne une liste de dicts.
+Les scrapers les appellent juste après le fetch, et `reparse` les rejoue
+sur l'archive (RawArchive) sans aucun accès réseau.
+
+Un parser = une fonction de module (picklable pour le pool de process)
+enregistrée dans PARSERS avec le motif d'URL qu'elle sait lire.
+═══════════════════════════════════════════════════════════════════════════
+
+AUTEUR: Mon_PS Team
+DATE: 2026-10-19
+VERSION: 1.0.0
+"""
+import json
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Pattern
+
+Records = List[dict]
+
+
+@dataclass(frozen=True)
+class ParserSpec:
+    """Parser enregistré: nom, motif d'URL, fonction (body, url) -> records."""
+    name: str
+    url_pattern: Pattern
+    func: Callable[[bytes, str], Records]
+
+
+def _text(body: bytes) -> str:
+    return body.decode("utf-8", errors="replace")
+
+
+def _soup(body: bytes, features: str = "html.parser"):
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(_text(body), features)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# UNDERSTAT
+# ═══════════════════════════════════════════════════════════════════════════
+
+_DATES_DATA = re.compile(r"var datesData\s*=\s*JSON\.parse\('(.+?)'\)")
+
+
+def parse_understat_team_dates(body: bytes, url: str = "") -> Records:
+    """Page équipe (HTML): matchs joués avec xG, depuis `var datesData`."""
+    match = _DATES_DATA.search(_text(body))
+    if not match:
+        return []
+    decoded_data = match.group(1).encode().decode('unicode_escape')
+    matches = json.loads(decoded_data)
+
+    processed = []
+    for m in matches:
+        if not m.get('isResult'):
+            continue  # Skip future matches
+
+        processed.append({
+            'match_id': m.get('id'),
+            'date': m.get('datetime', '')[:10],
+            'home_team': m.get('h', {}).get('title', ''),
+            'away_team': m.get('a', {}).get('title', ''),
+            'home_goals': int(m.get('goals', {}).get('h', 0)),
+            'away_goals': int(m.get('goals', {}).get('a', 0)),
+            'home_xg': float(m.get('xG', {}).get('h', 0) or 0),
+            'away_xg': float(m.get('xG', {}).get('a', 0) or 0),
+        })
+    return processed
+
+
+def parse_understat_league_matches(body: bytes, url: str = "") -> Records:
+    """API getLeagueData/{league}/{season}: matchs bruts (dates)."""
+    return json.loads(body).get('dates', [])
+
+
+def parse_understat_league_teams(body: bytes, url: str = "") -> Records:
+    """API getLeagueData/{league}/{season}: équipes avec leur nom d'URL."""
+    teams = json.loads(body).get('teams', {})
+    result = []
+    for team_id, team_data in teams.items():
+        title = team_data.get('title', '')
+        # Convertir nom en format URL (espaces → underscores)
+        result.append({'id': team_id, 'title': title, 'url_name': title.replace(' ', '_')})
+    return result
+
+
+def parse_understat_team_statistics(body: bytes, url: str = "") -> Records:
+    """API getTeamData/{team}/{season}: statistiques (gameState, timing, ...)."""
+    statistics = json.loads(body).get('statistics', {})
+    return [statistics] if statistics else []
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# TRANSFERMARKT
+# ═══════════════════════════════════════════════════════════════════════════
+
+def parse_transfermarkt_scorers(body: bytes, url: str = "") -> Records:
+    """Page leistungsdaten: buteurs / passeurs (goals ou assists > 0)."""
+    table = _soup(body).find('table', class_='items')
+    if not table:
+        return []
+    tbody = table.find('tbody')
+    if not tbody:
+        return []
+
+    scorers = []
+    for row in tbody.find_all('tr', class_=['odd', 'even']):
+        try:
+            # Nom du joueur
+            name_cell = row.find('td', class_='hauptlink')
+            if not name_cell:
+                continue
+
+            # Récupérer toutes les valeurs numériques
+            numeric_values = []
+            for cell in row.find_all('td'):
+                text = cell.get_text(strip=True).replace("'", "").replace(",", "")
+                if text.isdigit():
+                    numeric_values.append(int(text))
+
+            # Skip si pas assez de données
+            if len(numeric_values) < 6:
+                continue
+
+            # Indices: [#, age, in_squad, games, goals, assists, ...]
+            goals, assists = numeric_values[4], numeric_values[5]
+            if goals > 0 or assists > 0:
+                scorers.append({'name': name_cell.get_text(strip=True), 'goals': goals, 'assists': assists})
+        except Exception:
+            continue
+    return scorers
+
+
+def parse_transfermarkt_injuries(body: bytes, url: str = "") -> Records:
+    """Page sperrenundverletzungen: joueurs blessés / suspendus."""
+    injuries = []
+    for row in _soup(body).find_all('tr', class_=['odd', 'even']):
+        try:
+            name_cell = row.find('td', class_='hauptlink')
+            if not name_cell:
+                continue
+            # Type de blessure
+            injury_cell = row.find('td', class_='zentriert')
+            injuries.append({
+                'name': name_cell.get_text(strip=True),
+                'injury_type': injury_cell.get_text(strip=True) if injury_cell else 'Unknown',
+            })
+        except Exception:
+            continue
+    return injuries
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BETEXPLORER
+# ═══════════════════════════════════════════════════════════════════════════
+
+_BETEXPLORER_MATCH_HREF = re.compile(r'/football/[^/]+/[^/]+/[^/]+-[^/]+/[a-zA-Z0-9]+/?$')
+_SCORE_CLASS = re.compile(r'.*score.*', re.I)
+
+
+def parse_betexplorer_league_matches(body: bytes, url: str = "") -> Records:
+    """Page results/ ou fixtures/ d'une ligue: match_id, équipes, score."""
+    table = _soup(body, 'lxml').find('table', {'class': 'table-main'})
+    if not table:
+        return []
+
+    matches = []
+    for row in table.find_all('tr'):
+        # Chercher le lien du match
+        link = row.find('a', href=_BETEXPLORER_MATCH_HREF)
+        if not link:
+            continue
+
+        href = link['href']
+        teams = link.text.strip().split(' - ')
+        # Parser "Team1 - Team2"
+        if len(teams) < 2:
+            continue
+
+        # Chercher le score
+        score_elem = row.find('td', {'class': _SCORE_CLASS})
+        matches.append({
+            'match_id': href.rstrip('/').split('/')[-1],
+            'match_url': href,
+            'home_team': teams[0].strip(),
+            'away_team': teams[1].strip(),
+            'score': score_elem.text.strip() if score_elem else None,
+        })
+    return matches
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# REGISTRE
+# ═══════════════════════════════════════════════════════════════════════════
+
+PARSERS: Dict[str, ParserSpec] = {
+    spec.name: spec for spec in [
+        ParserSpec("understat_team_dates", re.compile(r"^https://understat\.com/team/[^/]+/\d{4}$"),
+                   parse_understat_team_dates),
+        ParserSpec("understat_league_matches", re.compile(r"^https://understat\.com/getLeagueData/"),
+                   parse_understat_league_matches),
+        ParserSpec("understat_league_teams", re.compile(r"^https://understat\.com/getLeagueData/"),
+                   parse_understat_league_teams),
+        ParserSpec("understat_team_statistics", re.compile(r"^https://understat\.com/getTeamData/"),
+                   parse_understat_team_statistics),
+        ParserSpec("transfermarkt_scorers", re.compile(r"^https://www\.transfermarkt\.com/.+/leistungsdaten/"),
+                   parse_transfermarkt_scorers),
+        ParserSpec("transfermarkt_injuries", re.compile(r"^https://www\.transfermarkt\.com/.+/sperrenundverletzungen/"),
+                   parse_transfermarkt_injuries),
+        ParserSpec("betexplorer_league_matches", re.compile(r"^https://www\.betexplorer\.com/football/.+/(results|fixtures)/$"),
+                   parse_betexplorer_league_matches),
+    ]
+}
+
+
+def parsers_for(url: str, names: Optional[List[str]] = None) -> List[ParserSpec]:
+    """Parsers applicables à une URL (restreints à `names` si fourni)."""
+    return [
+        spec for spec in PARSERS.values()
+        if (names is None or spec.name in names) and spec.url_pattern.search(url)
+    ]
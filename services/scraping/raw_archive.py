@@ -0,0 +1,236 @@
+"""
+Raw Archive - Réponses HTTP brutes, stockées une seule fois
+═══════════════════════════════════════════════════════════════════════════
+Chaque réponse 200 est écrite en gzip sous son SHA-256 (content-addressed):
+une page identique d'un jour à l'autre ne coûte qu'une ligne d'index.
+
+L'index SQLite garde une entrée par (url, fetch_date) avec les validateurs
+HTTP (ETag / Last-Modified) utilisés par AsyncFetcher pour les requêtes
+conditionnelles, et le hash qui remplace le hash MD5 de GhostScraper.
+
+Arborescence:
+    {root}/index.sqlite
+    {root}/blobs/ab/abcdef....gz
+═══════════════════════════════════════════════════════════════════════════
+
+AUTEUR: Mon_PS Team
+DATE: 2026-10-19
+VERSION: 1.0.0
+"""
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+logger = logging.getLogger("RawArchive")
+
+DEFAULT_ARCHIVE_DIR = Path("/home/Mon_ps/data/raw_archive")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fetches (
+    url TEXT NOT NULL,
+    fetch_date TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    content_type TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    PRIMARY KEY (url, fetch_date)
+);
+CREATE INDEX IF NOT EXISTS idx_fetches_url_time ON fetches (url, fetched_at);
+"""
+
+
+@dataclass
+class ArchiveEntry:
+    """Une ligne de l'index (le contenu est lu à la demande)."""
+    url: str
+    fetch_date: str
+    fetched_at: str
+    status: int
+    content_hash: str
+    size: int
+    content_type: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+def content_hash(body: bytes) -> str:
+    """SHA-256 hexadécimal du contenu brut."""
+    return hashlib.sha256(body).hexdigest()
+
+
+def blob_path(root: Path, digest: str) -> Path:
+    return Path(root) / "blobs" / digest[:2] / f"{digest}.gz"
+
+
+def read_blob(root: Path, digest: str) -> bytes:
+    """Lecture d'un blob sans ouvrir l'index (workers de reparse)."""
+    with gzip.open(blob_path(root, digest), "rb") as f:
+        return f.read()
+
+
+class RawArchive:
+    """
+    Archive locale des réponses brutes.
+
+    Usage:
+        archive = RawArchive()
+        archive.put(url, body, etag='"abc"')
+        entry = archive.latest(url)
+        html = archive.read(entry.content_hash).decode()
+    """
+
+    def __init__(self, root: Path = DEFAULT_ARCHIVE_DIR):
+        self.root = Path(root)
+        self.blob_dir = self.root / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.root / "index.sqlite", check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+
+    def close(self) -> None:
+        self._db.close()
+
+    # ─── BLOBS ───
+
+    def _blob_path(self, digest: str) -> Path:
+        return blob_path(self.root, digest)
+
+    def has_blob(self, digest: str) -> bool:
+        return self._blob_path(digest).exists()
+
+    def read(self, digest: str) -> bytes:
+        """Contenu brut d'un hash (FileNotFoundError si absent)."""
+        return read_blob(self.root, digest)
+
+    def _write_blob(self, digest: str, body: bytes) -> None:
+        path = self._blob_path(digest)
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with gzip.open(tmp, "wb", compresslevel=6) as f:
+            f.write(body)
+        os.replace(tmp, path)
+
+    # ─── INDEX ───
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        status: int = 200,
+        content_type: Optional[str] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        fetched_at: Optional[datetime] = None,
+    ) -> ArchiveEntry:
+        """
+        Archive une réponse. Un second fetch le même jour remplace l'entrée
+        du jour; le blob n'est écrit que si le contenu est nouveau.
+        """
+        fetched_at = fetched_at or datetime.now(timezone.utc)
+        digest = content_hash(body)
+        self._write_blob(digest, body)
+
+        entry = ArchiveEntry(
+            url=url,
+            fetch_date=fetched_at.date().isoformat(),
+            fetched_at=fetched_at.isoformat(),
+            status=status,
+            content_hash=digest,
+            size=len(body),
+            content_type=content_type,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO fetches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (entry.url, entry.fetch_date, entry.fetched_at, entry.status, entry.content_hash,
+                 entry.size, entry.content_type, entry.etag, entry.last_modified),
+            )
+            self._db.commit()
+        return entry
+
+    def touch(self, entry: ArchiveEntry, fetched_at: Optional[datetime] = None) -> ArchiveEntry:
+        """Enregistre un 304: même contenu, nouvelle date de fetch."""
+        fetched_at = fetched_at or datetime.now(timezone.utc)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO fetches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (entry.url, fetched_at.date().isoformat(), fetched_at.isoformat(), entry.status,
+                 entry.content_hash, entry.size, entry.content_type, entry.etag, entry.last_modified),
+            )
+            self._db.commit()
+        return ArchiveEntry(**{**entry.__dict__, "fetch_date": fetched_at.date().isoformat(),
+                               "fetched_at": fetched_at.isoformat()})
+
+    def latest(self, url: str) -> Optional[ArchiveEntry]:
+        """Dernière entrée archivée pour l'URL (None si jamais vue)."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM fetches WHERE url = ? ORDER BY fetched_at DESC LIMIT 1", (url,)
+            ).fetchone()
+        return ArchiveEntry(*row) if row else None
+
+    def entries(self, url_prefix: str = "", since: Optional[str] = None,
+                until: Optional[str] = None) -> Iterator[ArchiveEntry]:
+        """Entrées dont l'URL commence par url_prefix, fetch_date dans [since, until]."""
+        query = "SELECT * FROM fetches WHERE url >= ? AND url < ?"
+        params = [url_prefix, url_prefix + "￿"]
+        if since:
+            query += " AND fetch_date >= ?"
+            params.append(since)
+        if until:
+            query += " AND fetch_date <= ?"
+            params.append(until)
+        query += " ORDER BY url, fetched_at"
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        for row in rows:
+            yield ArchiveEntry(*row)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM fetches").fetchone()[0]
+
+
+# Instance partagée (scrapers synchrones)
+_archive: Optional[RawArchive] = None
+
+
+def get_archive() -> RawArchive:
+    """Archive par défaut (DEFAULT_ARCHIVE_DIR)."""
+    global _archive
+    if _archive is None:
+        _archive = RawArchive()
+    return _archive
+
+
+def archive_response(url: str, response, archive: Optional[RawArchive] = None) -> None:
+    """
+    Archive une réponse requests/httpx 200. Ne lève jamais: l'archive ne
+    doit pas casser un scrape.
+    """
+    if response.status_code != 200:
+        return
+    try:
+        (archive or get_archive()).put(
+            url, response.content, status=response.status_code,
+            content_type=response.headers.get("Content-Type"),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+    except Exception as e:
+        logger.warning(f"Could not archive {url}: {e}")
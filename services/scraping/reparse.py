@@ -0,0 +1,168 @@
+"""
+Reparse - Rejoue les parsers sur l'archive brute, sans réseau
+═══════════════════════════════════════════════════════════════════════════
+Après une correction de parser, retraiter une saison = relire les blobs
+archivés, pas re-scraper.
+
+- Sélection par préfixe d'URL / fenêtre de fetch_date / parser
+- latest_only (défaut): une seule version par URL (la plus récente)
+- Un blob partagé par plusieurs URLs/dates n'est parsé qu'une fois par parser
+- Parsing réparti sur les cœurs (ProcessPoolExecutor); les workers lisent
+  les blobs directement, l'index SQLite reste dans le process parent
+
+Usage:
+    python -m services.scraping.reparse --prefix https://understat.com/team/ \\
+        --since 2025-08-01 --workers 8 --out /tmp/understat_teams.jsonl
+═══════════════════════════════════════════════════════════════════════════
+
+AUTEUR: Mon_PS Team
+DATE: 2026-10-19
+VERSION: 1.0.0
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .parsers import PARSERS, parsers_for
+from .raw_archive import DEFAULT_ARCHIVE_DIR, ArchiveEntry, RawArchive, read_blob
+
+logger = logging.getLogger("Reparse")
+
+
+@dataclass
+class ReparseTask:
+    """Un blob à passer dans un parser, et les (url, fetch_date) qui y renvoient."""
+    parser: str
+    content_hash: str
+    sources: List[Tuple[str, str]] = field(default_factory=list)
+
+
+@dataclass
+class ReparseStats:
+    entries: int = 0
+    tasks: int = 0
+    records: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+
+
+def plan(
+    archive: RawArchive,
+    url_prefix: str = "",
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    parsers: Optional[Sequence[str]] = None,
+    latest_only: bool = True,
+) -> Tuple[List[ReparseTask], int]:
+    """Tâches (parser, blob) à exécuter + nombre d'entrées d'index retenues."""
+    selected: Dict[str, ArchiveEntry] = {}
+    entries: List[ArchiveEntry] = []
+    for entry in archive.entries(url_prefix, since=since, until=until):
+        if latest_only:
+            selected[entry.url] = entry   # trié par fetched_at: le dernier gagne
+        else:
+            entries.append(entry)
+    if latest_only:
+        entries = list(selected.values())
+
+    tasks: Dict[Tuple[str, str], ReparseTask] = {}
+    names = list(parsers) if parsers else None
+    for entry in entries:
+        for spec in parsers_for(entry.url, names):
+            key = (spec.name, entry.content_hash)
+            task = tasks.setdefault(key, ReparseTask(spec.name, entry.content_hash))
+            task.sources.append((entry.url, entry.fetch_date))
+    return list(tasks.values()), len(entries)
+
+
+def _run_task(root: str, parser: str, digest: str, url: str) -> Tuple[List[dict], Optional[str]]:
+    """Worker: lit un blob et applique le parser (jamais d'exception)."""
+    try:
+        return PARSERS[parser].func(read_blob(Path(root), digest), url), None
+    except Exception as e:
+        return [], f"{type(e).__name__}: {e}"
+
+
+def reparse(
+    archive: RawArchive,
+    tasks: Sequence[ReparseTask],
+    workers: Optional[int] = None,
+    stats: Optional[ReparseStats] = None,
+) -> Iterator[dict]:
+    """
+    Exécute les tâches sur `workers` process (1 = dans le process courant)
+    et émet un dict par record: {parser, url, fetch_date, record}.
+    """
+    stats = stats or ReparseStats()
+    stats.tasks = len(tasks)
+    workers = workers or os.cpu_count() or 1
+    t0 = time.perf_counter()
+    root = str(archive.root)
+    args = [(root, task.parser, task.content_hash, task.sources[0][0]) for task in tasks]
+
+    if workers == 1:
+        outputs = (_run_task(*a) for a in args)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        outputs = executor.map(_run_task, *zip(*args), chunksize=max(1, len(args) // (workers * 8))) if args else iter(())
+
+    try:
+        for task, (records, error) in zip(tasks, outputs):
+            if error:
+                stats.errors += 1
+                logger.warning(f"❌ {task.parser} {task.sources[0][0]}: {error}")
+                continue
+            for url, fetch_date in task.sources:
+                for record in records:
+                    stats.records += 1
+                    yield {"parser": task.parser, "url": url, "fetch_date": fetch_date, "record": record}
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        stats.seconds = time.perf_counter() - t0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rejoue les parsers sur l'archive brute (sans réseau)")
+    parser.add_argument("--archive", default=str(DEFAULT_ARCHIVE_DIR), help="Racine de l'archive")
+    parser.add_argument("--prefix", default="", help="Préfixe d'URL (ex: https://understat.com/team/)")
+    parser.add_argument("--since", help="fetch_date minimum (YYYY-MM-DD)")
+    parser.add_argument("--until", help="fetch_date maximum (YYYY-MM-DD)")
+    parser.add_argument("--parser", action="append", choices=sorted(PARSERS), help="Parser(s) à rejouer")
+    parser.add_argument("--all-versions", action="store_true", help="Toutes les dates, pas seulement la dernière")
+    parser.add_argument("--workers", type=int, default=None, help="Process (défaut: nombre de cœurs)")
+    parser.add_argument("--out", help="Fichier JSONL de sortie (défaut: stdout)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)s | %(message)s')
+
+    archive = RawArchive(Path(args.archive))
+    tasks, n_entries = plan(archive, args.prefix, args.since, args.until, args.parser,
+                            latest_only=not args.all_versions)
+    stats = ReparseStats(entries=n_entries)
+
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        for row in reparse(archive, tasks, args.workers, stats):
+            out.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+    finally:
+        if args.out:
+            out.close()
+
+    logger.info(
+        f"✅ Reparse: {stats.entries} pages, {stats.tasks} blobs×parsers, "
+        f"{stats.records} records, {stats.errors} erreurs en {stats.seconds:.1f}s"
+    )
+    return 1 if stats.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
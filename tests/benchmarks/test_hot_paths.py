@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests de la suite de benchmarks hot paths
+
+Vérifie que chaque benchmark s'exécute sur les fixtures synthétiques
+(sans DB ni Redis) et que la comparaison de baselines détecte les régressions.
+"""
+
+from pathlib import Path
+
+import pytest
+import sys
+sys.path.insert(0, '/home/Mon_ps')
+
+from benchmarks.hot_paths import BENCHMARKS, BenchmarkResult, compare, load_baseline, run_suite, save_baseline
+from benchmarks.hot_paths.harness import MISSING_BASELINE
+
+
+def _result(name, median_us=100.0, peak=10.0):
+    return BenchmarkResult(
+        name=name, rounds=10, mean_us=median_us, median_us=median_us, p95_us=median_us,
+        min_us=median_us, ops_per_sec=1e6 / median_us, alloc_peak_kib=peak, alloc_blocks_per_call=1.0,
+    )
+
+
+@pytest.mark.parametrize("name", list(BENCHMARKS))
+def test_benchmark_runs_on_synthetic_inputs(name):
+    """Chaque hot path tourne sur les stand-ins et produit des mesures cohérentes"""
+    [result] = run_suite([name], rounds=3, warmup=1, alloc_rounds=1)
+
+    assert result.name == name
+    assert 0 < result.min_us <= result.median_us <= result.p95_us
+    assert result.ops_per_sec > 0
+    assert result.alloc_peak_kib >= 0
+
+
+def test_compare_flags_regressions_above_threshold():
+    """Seules les métriques dégradées au-delà du seuil sont signalées"""
+    baseline = {"a": _result("a"), "b": _result("b")}
+    current = [_result("a", median_us=120.0), _result("b", median_us=200.0, peak=30.0), _result("new")]
+
+    with pytest.warns(UserWarning, match="new"):
+        regressions = compare(current, baseline, threshold=0.25, allow_missing=True)
+
+    assert {(r.name, r.metric) for r in regressions} == {("b", "median_us"), ("b", "alloc_peak_kib")}
+    assert regressions[0].ratio == pytest.approx(2.0)
+
+
+def test_compare_fails_on_missing_baseline():
+    """Un benchmark absent de la baseline échoue par défaut"""
+    (missing,) = compare([_result("a"), _result("new")], {"a": _result("a")})
+
+    assert (missing.name, missing.metric) == ("new", MISSING_BASELINE)
+    assert "aucune baseline" in str(missing)
+
+
+def test_reference_baseline_covers_suite():
+    """La baseline de référence couvre tous les benchmarks de la suite"""
+    reference = load_baseline(Path(__file__).parents[2] / "benchmarks/hot_paths/baselines/reference.json")
+
+    assert sorted(set(BENCHMARKS) - set(reference)) == []
+
+
+def test_baseline_round_trip(tmp_path):
+    """Une baseline sauvegardée se recharge à l'identique"""
+    path = tmp_path / "baseline.json"
+    save_baseline([_result("a"), _result("b", 50.0)], path)
+
+    loaded = load_baseline(path)
+
+    assert loaded["b"] == _result("b", 50.0)
+    assert compare([_result("a")], loaded) == []
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests du pipeline batch Defender DNA Quant V9
+
+Import sans effet de bord, group-by équipe (alpha leave-one-out, leader),
+états HMM par priorité, et sortie identique en série et par ligues en
+parallèle.
+"""
+
+import sys
+sys.path.insert(0, '/home/Mon_ps/scripts/v8_enrichment')
+
+import defender_dna_quant_v9 as v9
+from defender_dna_quant_v9 import DefenderSources, enrich_defenders
+
+
+def _defender(name, team, impact, league='EPL', time=900, **extra):
+    d = {'name': name, 'team': team, 'league': league, 'time': time,
+         'impact_goals_conceded': impact, 'clean_sheet_rate_with': 30,
+         'goals_conceded_per_match_with': 1.2, 'cards_90': 0.15, 'xGBuildup_90': 0.2,
+         'quant_v8': {'edge_synthesis': {'v8_total_edge': 5.0}}}
+    d.update(extra)
+    return d
+
+
+def _sources(teams, form='WDLWD', trending='STABLE', avg_against=1.2):
+    context = {t: {'momentum_dna': {'form_last_5': form, 'trending': trending,
+                                    'clean_sheets_last_5': 1, 'avg_goals_against': avg_against}}
+               for t in teams}
+    defense = {t: {'matches_played': 10, 'ga_total': 12, 'xga_total': 11.0} for t in teams}
+    return DefenderSources(teams_context=context, team_defense_dna=defense)
+
+
+def test_import_has_no_side_effects():
+    assert not hasattr(v9, 'defenders')
+    assert callable(v9.main)
+
+
+def test_alpha_leave_one_out_and_leader_per_team():
+    defenders = [
+        _defender('A', 'Red', 0.6), _defender('B', 'Red', 0.0), _defender('C', 'Red', -0.3),
+        _defender('D', 'Blue', 0.2), _defender('Bench', 'Red', 2.0, time=100),
+    ]
+    processed = enrich_defenders(defenders, _sources(['Red', 'Blue']))
+
+    assert processed == 4
+    assert 'quant_v9' not in defenders[-1]
+    a, b, c, d = (x['quant_v9'] for x in defenders[:4])
+    assert a['alpha_beta']['alpha'] == round(0.6 - (0.0 - 0.3) / 2, 3)
+    assert c['alpha_beta']['alpha'] == round(-0.3 - 0.3, 3)
+    assert d['alpha_beta']['alpha'] == 0.2  # seul de son équipe
+
+    assert a['leadership']['is_leader'] and a['leadership']['role'] == 'DEFENSIVE_LEADER'
+    assert a['leadership']['dependency_score'] == 0.75
+    assert b['leadership']['leader_name'] == 'A'
+    assert b['leadership']['role'] == 'LEADER_DEPENDENT'
+    assert d['leadership']['leader_name'] == 'D'
+
+
+def test_hidden_markov_state_priority():
+    defenders = [
+        _defender('Crisis', 'Down', -0.6, cards_90=0.3),
+        _defender('Liability', 'Flat', -0.7, clean_sheet_rate_with=10),
+        _defender('Neutral', 'Flat', 0.1),
+    ]
+    sources = _sources(['Flat'])
+    sources.teams_context['Down'] = {'momentum_dna': {'form_last_5': 'LLLLW', 'trending': 'DOWN',
+                                                      'clean_sheets_last_5': 0, 'avg_goals_against': 2.4}}
+    enrich_defenders(defenders, sources)
+
+    states = [d['quant_v9']['hidden_markov'] for d in defenders]
+    assert states[0]['current_state'] == 'CONFIDENCE_CRISIS'
+    assert states[0]['transitions']['stay_in_crisis'] == 0.65
+    assert defenders[0]['quant_v9']['signature_v9'].startswith('STATE:CONFIDENCE_CRISIS')
+    assert states[1]['current_state'] == 'LIABILITY_CONFIRMED'
+    assert states[2]['current_state'] == 'STABLE_AVERAGE'
+    assert defenders[0]['quant_v9']['drawdown']['drawdown_status'] == 'IN_CRISIS'
+
+
+def test_parallel_by_league_matches_serial():
+    leagues = ['EPL', 'La_Liga', 'Serie_A']
+    rows = [
+        _defender(f"P{k}", f"T{k % 6}", round((k % 7 - 3) * 0.17, 2), league=leagues[k % 6 % 3],
+                  cards_90=0.05 * (k % 6), xGBuildup_90=0.04 * (k % 5))
+        for k in range(60)
+    ]
+    sources = _sources([f"T{i}" for i in range(6)], form='LLWDL', trending='DOWN')
+    serial = [dict(d) for d in rows]
+    parallel = [dict(d) for d in rows]
+
+    assert enrich_defenders(serial, sources) == 60
+    assert enrich_defenders(parallel, sources, workers=2) == 60
+    assert [d['quant_v9'] for d in serial] == [d['quant_v9'] for d in parallel]
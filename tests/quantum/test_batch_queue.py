@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Tests de la file de batch /analyze/batch (InMemoryJobStore + BatchWorker)
+
+Vérifie le checkpoint par match, la progression, les retries avec backoff,
+la reprise des baux expirés et le contrat HTTP (réponse immédiate + polling).
+"""
+
+import asyncio
+
+import pytest
+import sys
+sys.path.insert(0, '/home/Mon_ps')
+
+from fastapi.testclient import TestClient
+
+from quantum.services.batch_queue import BatchWorker, InMemoryJobStore
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _payloads(n):
+    return [{"home_team": f"Home{i}", "away_team": f"Away{i}"} for i in range(n)]
+
+
+def test_results_are_checkpointed_per_match():
+    store = InMemoryJobStore()
+    batch_id = store.create_batch(_payloads(3))
+
+    async def handler(payload):
+        return {"scenarios": len(payload["home_team"])}
+
+    worker = BatchWorker(store, handler)
+    assert asyncio.run(worker.run_once()) is True
+
+    partial = store.status(batch_id).to_dict()
+    assert partial["status"] == "running"
+    assert (partial["completed"], partial["pending"]) == (1, 2)
+    assert partial["results"] == [{
+        "position": 0, "match": "Home0 vs Away0", "success": True, "attempts": 1,
+        "result": {"scenarios": 5},
+    }]
+
+    assert asyncio.run(worker.drain()) == 2
+    final = store.status(batch_id).to_dict()
+    assert final["status"] == "completed"
+    assert final["progress"] == 1.0
+
+
+def test_failed_match_is_retried_with_backoff_then_given_up():
+    clock = Clock()
+    store = InMemoryJobStore(max_attempts=2, retry_delay=10, clock=clock)
+    batch_id = store.create_batch(_payloads(2))
+
+    async def handler(payload):
+        if payload["home_team"] == "Home1":
+            raise RuntimeError("engine down")
+        return {}
+
+    worker = BatchWorker(store, handler)
+    asyncio.run(worker.drain())
+    # Home1 attend son backoff: pas encore réclamable
+    assert store.claim("other") is None
+    assert store.status(batch_id).counts == {"done": 1, "pending": 1}
+
+    clock.now += 10
+    asyncio.run(worker.drain())
+
+    status = store.status(batch_id).to_dict()
+    assert status["status"] == "completed_with_errors"
+    assert status["results"][1] == {
+        "position": 1, "match": "Home1 vs Away1", "success": False, "attempts": 2, "error": "engine down",
+    }
+
+
+def test_expired_lease_is_reclaimed():
+    clock = Clock()
+    store = InMemoryJobStore(lease_seconds=60, clock=clock)
+    store.create_batch(_payloads(1))
+
+    first = store.claim("crashed-worker")
+    assert store.claim("other") is None
+
+    clock.now += 61
+    again = store.claim("other")
+    assert again.task_id == first.task_id
+    assert again.attempts == 2
+
+
+def test_task_that_keeps_killing_its_worker_is_failed():
+    clock = Clock()
+    store = InMemoryJobStore(max_attempts=2, lease_seconds=60, clock=clock)
+    batch_id = store.create_batch(_payloads(1))
+
+    for _ in range(2):
+        assert store.claim("crashed-worker") is not None
+        clock.now += 61
+
+    # Tentatives épuisées: plus de nouveau bail, le batch se termine
+    assert store.claim("other") is None
+    status = store.status(batch_id).to_dict()
+    assert status["status"] == "completed_with_errors"
+    assert status["results"] == [{
+        "position": 0, "match": "Home0 vs Away0", "success": False, "attempts": 2,
+        "error": "lease expired after 2 attempts (worker crashed or timed out)",
+    }]
+
+
+def test_api_queues_immediately_and_exposes_progress(monkeypatch):
+    import quantum.api as api
+
+    store = InMemoryJobStore()
+    monkeypatch.setattr(api, "_batch_store", store)
+    monkeypatch.setattr(api, "_local_workers", [])
+    monkeypatch.setattr(api, "LOCAL_BATCH_WORKERS", 0)  # pas de worker: on observe la file
+
+    client = TestClient(api.app)
+    response = client.post("/analyze/batch", json={"matches": _payloads(2)})
+
+    assert response.status_code == 202
+    body = response.json()
+    assert body["total"] == 2 and body["status"] == "queued"
+    assert body["status_url"] == f"/analyze/batch/{body['batch_id']}"
+
+    status = client.get(body["status_url"]).json()
+    assert (status["pending"], status["results"]) == (2, [])
+    assert client.get("/analyze/batch/batch_unknown").status_code == 404
+    assert client.post("/analyze/batch", json={"matches": []}).status_code == 422
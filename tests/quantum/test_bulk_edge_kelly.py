@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests des versions bulk de EdgeCalculator et KellySizer (chess_engine)
+
+Vérifie que calculate_bulk reproduit cellule par cellule les calculs
+scalaires (_find_best_edge / calculate) sur un slate synthétique.
+"""
+
+import random
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '/home/Mon_ps')
+
+from quantum.chess_engine.execution.kelly_sizer import KellySizer
+from quantum.chess_engine.probability.edge_calculator import EdgeCalculator
+
+MARKETS = ["home", "draw", "away", "over_25", "btts_yes", "corners_over", "unknown_market"]
+TIERS = ["ELITE", "GOLD", "SILVER", "STANDARD", "UNRATED"]
+
+
+@pytest.fixture
+def slate():
+    rng = random.Random(7)
+    n = 40
+    probs = np.array([[rng.uniform(0.05, 0.9) for _ in MARKETS] for _ in range(n)])
+    odds = np.array([[rng.choice([rng.uniform(1.05, 6.0), 1.0]) for _ in MARKETS] for _ in range(n)])
+    tiers = [rng.choice(TIERS) for _ in range(n)]
+    return probs, odds, tiers
+
+
+def test_edge_bulk_matches_scalar(slate):
+    probs, odds, tiers = slate
+    calculator = EdgeCalculator()
+
+    bulk = calculator.calculate_bulk(probs, odds, MARKETS, tiers)
+
+    for i, tier in enumerate(tiers):
+        for j, market in enumerate(MARKETS):
+            best = calculator._find_best_edge(market, {"x": probs[i, j]}, {"x": odds[i, j]}, tier)
+            assert bulk["valid"][i, j] == (odds[i, j] > 1.0)
+            assert bulk["has_edge"][i, j] == best["has_edge"]
+            if best["selection"] is not None:
+                assert bulk["edge_net"][i, j] == pytest.approx(best["edge_net"])
+                assert bulk["min_edge_required"][i, j] == pytest.approx(best["min_edge_required"])
+                assert bulk["tax_applied"][i, j] == pytest.approx(best["tax_applied"])
+                assert bulk["confidence"][i, j] == pytest.approx(best["confidence"])
+    assert np.isnan(bulk["edge_net"][~bulk["valid"]]).all()
+
+
+def test_kelly_bulk_matches_scalar(slate):
+    probs, odds, tiers = slate
+    edges = EdgeCalculator().calculate_bulk(probs, odds, MARKETS, tiers)
+    sizer = KellySizer()
+
+    stakes = sizer.calculate_bulk(edges["edge_net"], odds, edges["confidence"], tiers)
+
+    for i, tier in enumerate(tiers):
+        for j in range(len(MARKETS)):
+            scalar = sizer.calculate(edges["edge_net"][i, j], odds[i, j], edges["confidence"][i, j], tier)
+            assert stakes["stake_pct"][i, j] == pytest.approx(scalar["stake_pct"])
+            assert stakes["kelly_full"][i, j] == pytest.approx(scalar["kelly_full"])
+
+
+@pytest.mark.parametrize("confidence,odds,expected", [
+    (0.50, 1.50, (1.0, 1.2)),
+    (0.65, 2.20, (1.2, 0.8)),
+    (0.80, 2.80, (1.5, 0.6)),
+    (0.49, 1.49, (0.7, 1.4)),
+])
+def test_multiplier_bounds(confidence, odds, expected):
+    """Bornes des paliers: même côté en scalaire et en bulk"""
+    sizer = KellySizer()
+    scalar = sizer.calculate(0.05, odds, confidence, "ELITE")
+    bulk = sizer.calculate_bulk(np.array([[0.05]]), np.array([[odds]]), np.array([[confidence]]), "ELITE")
+
+    assert (scalar["confidence_mult"], scalar["odds_mult"]) == expected
+    assert (bulk["confidence_mult"][0, 0], bulk["odds_mult"][0, 0]) == expected
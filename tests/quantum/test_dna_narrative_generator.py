@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour DNANarrativeGenerator
+
+Vérifie les axes précalculés (AxisTable), les rangs par ligue par
+recherche binaire, et le cache des profils par version des données.
+"""
+
+import json
+import os
+
+import pytest
+import sys
+sys.path.insert(0, '/home/Mon_ps')
+
+from quantum.profilers.dna_narrative_generator import (
+    AXIS_NAMES, DNANarrativeGenerator, percentile_bands
+)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FIXTURES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _team(league, possession, ppda=None, style="MID_BLOCK"):
+    return {
+        "context": {"league": league, "history": {"ppda": ppda} if ppda else {}},
+        "tactical": {"possession_pct": possession, "defensive_style": style},
+        "defense": {"percentiles": {"open_play": 60, "home": 70, "away": 35}},
+    }
+
+
+TEAMS = {
+    "Arsenal": _team("EPL", 58, ppda=8.5),
+    "Brighton": _team("EPL", 55, ppda=16),
+    "Burnley": _team("EPL", 40, style="DEEP_BLOCK"),
+    "Everton": _team("EPL", 44),
+    "Lazio": _team("Serie A", 52, ppda=11),
+    "Monaco": _team("Ligue 1", 50, style="HIGH_BLOCK"),
+}
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "team_dna_unified_v2.json"
+    path.write_text(json.dumps({"teams": TEAMS}))
+    return path
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TESTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_axes_and_bands(data_file):
+    gen = DNANarrativeGenerator(str(data_file))
+    axes = gen.generate_profile("arsenal")["axes"]
+
+    assert list(axes) == AXIS_NAMES
+    assert axes["pressing_intensity"]["score"] == pytest.approx(75.0)
+    assert axes["pressing_intensity"]["percentile"] == "HIGH"
+    assert axes["transition_defense"]["score"] == 75  # open_play + 15 si pressing > 70
+    assert axes["possession_control"]["score"] == pytest.approx((58 - 35) / 35 * 100)
+
+    # PPDA 16 = borne basse inversée: 0 (pas -0)
+    brighton = gen.generate_profile("Brighton")
+    assert str(brighton["axes"]["pressing_intensity"]["score"]) == "0.0"
+    assert "-0/100" not in brighton["narrative"]
+
+    assert gen.generate_profile("Burnley")["axes"]["block_depth"]["raw_value"] == 30
+    assert list(percentile_bands([19.9, 20, 35, 64.9, 80])) == [0, 1, 2, 2, 4]
+    assert gen._get_percentile(65) == "HIGH"
+
+
+def test_league_percentiles(data_file):
+    gen = DNANarrativeGenerator(str(data_file))
+    profiles = gen.generate_all_profiles()["profiles"]
+
+    possession = {t: p["axes"]["possession_control"]["league_percentile"] for t, p in profiles.items()}
+    assert possession["Arsenal"] == 100.0
+    assert possession["Brighton"] == 75.0
+    assert possession["Burnley"] == 25.0
+    assert possession["Lazio"] == 100.0  # seule équipe de sa ligue
+
+
+def test_profiles_cached_by_data_version(data_file):
+    gen = DNANarrativeGenerator(str(data_file))
+    first = gen.generate_all_profiles()
+    assert gen.generate_all_profiles() is first
+    assert gen.generate_profile("Lazio") is first["profiles"]["Lazio"]
+    assert not gen.refresh()
+
+    teams = dict(TEAMS, Lazio=_team("Serie A", 65, ppda=11))
+    data_file.write_text(json.dumps({"teams": teams}))
+    stat = data_file.stat()
+    os.utime(data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert gen.refresh()
+    second = gen.generate_all_profiles()
+    assert second is not first
+    assert second["data_version"] != first["data_version"]
+    assert second["profiles"]["Lazio"]["axes"]["possession_control"]["score"] == pytest.approx(85.714, abs=1e-3)
+
+
+def test_unknown_and_broken_teams(data_file):
+    data_file.write_text(json.dumps({"teams": dict(TEAMS, Broken={"context": []})}))
+    gen = DNANarrativeGenerator(str(data_file))
+
+    result = gen.generate_all_profiles()
+    assert result["count"] == len(TEAMS)
+    assert [e["team"] for e in result["errors"]] == ["Broken"]
+
+    with pytest.raises(KeyError):
+        gen.generate_profile("Real Madrid")
+    with pytest.raises(AttributeError):
+        gen.generate_profile("Broken")
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour VectorizedBacktester
+
+Vérifie que le moteur vectorisé reproduit exactement la boucle
+QuantumBacktesterQuant2.analyze_team sur des matchs synthétiques.
+"""
+
+import asyncio
+import random
+import sqlite3
+
+import pytest
+import sys
+sys.path.insert(0, '/home/Mon_ps')
+
+from quantum.services.backtester_quant2 import QuantumBacktesterQuant2
+from quantum.services.vectorized_backtester import MatchFrame, VectorizedBacktester, load_match_frame
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FIXTURES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+TEAMS = ["Arsenal", "Brighton", "Lazio", "Monaco", "Sevilla", "Augsburg"]
+
+TEAM_DNA = {
+    "Arsenal": {"tier": "ELITE", "style": "attacking", "diesel_factor": 0.7, "best_market": "btts_yes"},
+    "Brighton": {"tier": "GOLD", "style": "offensive", "late_game_killer": True},
+    "Lazio": {"tier": "GOLD", "style": "defensive", "best_market": "under_25"},
+    "Monaco": {"tier": "SILVER", "style": "balanced", "diesel_factor": 0.4},
+    "Sevilla": {"tier": "SILVER", "style": "conservative", "best_market": "draw"},
+}
+
+
+@pytest.fixture
+def matches():
+    rng = random.Random(42)
+    rows = []
+    for i in range(240):
+        home, away = rng.sample(TEAMS, 2)
+        rows.append({
+            "id": i,
+            "match_date": f"2025-{1 + i // 30:02d}-{1 + i % 28:02d}",
+            "home_team": home,
+            "away_team": away,
+            "home_goals": rng.randint(0, 4),
+            "away_goals": rng.randint(0, 3),
+            "home_xg": round(rng.uniform(0.2, 2.8), 2),
+            "away_xg": round(rng.uniform(0.2, 2.2), 2),
+            "league": "EPL" if i % 2 else "Serie A",
+        })
+    return rows
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TESTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_run_matches_loop_backtester(matches):
+    """Les résultats par équipe × stratégie sont identiques à la boucle"""
+    engine = VectorizedBacktester(MatchFrame.from_records(matches), TEAM_DNA)
+    vectorized = engine.run(min_matches=1)
+
+    loop = QuantumBacktesterQuant2()
+    for team in TEAMS:
+        team_matches = [m for m in matches if team in (m["home_team"], m["away_team"])]
+        expected = asyncio.run(loop.analyze_team(team, team_matches, TEAM_DNA.get(team, {})))
+        got = vectorized[team]
+
+        assert got.total_matches == expected.total_matches
+        assert got.best_strategy == expected.best_strategy
+        for sid, exp in expected.strategy_results.items():
+            res = got.strategy_results[sid]
+            assert (res.bets, res.wins, res.losses) == (exp.bets, exp.wins, exp.losses)
+            assert res.profit == pytest.approx(exp.profit)
+            assert res.xg_supported_losses == exp.xg_supported_losses
+            assert res.bad_analysis_losses == exp.bad_analysis_losses
+
+
+def test_min_matches_filters_teams(matches):
+    """Les équipes sous le seuil de matchs sont exclues"""
+    engine = VectorizedBacktester(MatchFrame.from_records(matches[:3]), TEAM_DNA)
+    assert engine.run(min_matches=5) == {}
+
+
+def test_limit_per_team_keeps_latest_matches(matches):
+    """Comme la boucle: chaque équipe est jugée sur ses N derniers matchs"""
+    engine = VectorizedBacktester(MatchFrame.from_records(matches), TEAM_DNA)
+    vectorized = engine.run(min_matches=1, limit_per_team=20)
+
+    loop = QuantumBacktesterQuant2()
+    for team in TEAMS:
+        team_matches = [m for m in matches if team in (m["home_team"], m["away_team"])]
+        latest = sorted(team_matches, key=lambda m: (m["match_date"], m["id"]))[-20:]
+        expected = asyncio.run(loop.analyze_team(team, latest, TEAM_DNA.get(team, {})))
+        got = vectorized[team]
+
+        assert got.total_matches == 20
+        for sid, exp in expected.strategy_results.items():
+            res = got.strategy_results[sid]
+            assert (res.bets, res.wins) == (exp.bets, exp.wins)
+            assert res.profit == pytest.approx(exp.profit)
+
+    assert engine.run(min_matches=5, limit_per_team=4) == {}
+
+
+def test_real_odds_override_defaults(matches):
+    """Les cotes réelles remplacent les cotes moyennes quand elles existent"""
+    for m in matches:
+        m["odds_over25"] = 3.0
+    frame = MatchFrame.from_records(matches, odds_columns={"over_25": "odds_over25"})
+    engine = VectorizedBacktester(frame, TEAM_DNA)
+
+    league = engine.aggregate("league")
+    total = sum(r["MARKET_OVER25"].wins for r in league.values())
+    bets = sum(r["MARKET_OVER25"].bets for r in league.values())
+    profit = sum(r["MARKET_OVER25"].profit for r in league.values())
+    assert profit == pytest.approx(total * 2.0 - (bets - total))
+
+
+def test_aggregate_by_tier_sums_teams(matches):
+    """L'agrégat par tier est la somme des équipes du tier"""
+    engine = VectorizedBacktester(MatchFrame.from_records(matches), TEAM_DNA)
+    by_team = engine.aggregate("team")
+    by_tier = engine.aggregate("tier")
+
+    gold = by_team["Brighton"]["MARKET_BTTS_YES"].profit + by_team["Lazio"]["MARKET_BTTS_YES"].profit
+    assert by_tier["GOLD"]["MARKET_BTTS_YES"].profit == pytest.approx(gold)
+    assert set(by_tier) == {"ELITE", "GOLD", "SILVER", "UNKNOWN"}
+
+    with pytest.raises(ValueError):
+        engine.aggregate("coach")
+
+
+def test_walk_forward_is_out_of_sample(matches):
+    """Chaque pli ne joue que des matchs postérieurs à sa fenêtre d'entraînement"""
+    engine = VectorizedBacktester(MatchFrame.from_records(matches), TEAM_DNA)
+    folds = engine.walk_forward(n_splits=3)
+
+    assert [f["fold"] for f in folds] == [1, 2, 3]
+    for fold in folds:
+        assert fold["train_end"] < fold["test_end"]
+        assert 0 <= fold["wins"] <= fold["bets"]
+    assert folds == engine.walk_forward(n_splits=3)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CHARGEMENT DB
+# ═══════════════════════════════════════════════════════════════════════════════
+
+MATCH_RESULTS_SCHEMA = """
+    CREATE TABLE match_results (
+        match_id TEXT PRIMARY KEY, home_team TEXT, away_team TEXT,
+        sport TEXT, league TEXT, commence_time TEXT,
+        score_home INTEGER, score_away INTEGER, outcome TEXT,
+        is_finished BOOLEAN, last_updated TEXT
+    )
+"""
+
+
+class _DictCursor:
+    """RealDictCursor-like (placeholders %s, lignes dict) sur sqlite."""
+
+    def __init__(self, conn):
+        self.cur = conn.cursor()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cur.close()
+
+    def execute(self, sql, params=()):
+        self.cur.execute(sql.replace("%s", "?"), params)
+
+    def fetchall(self):
+        columns = [c[0] for c in self.cur.description]
+        return [dict(zip(columns, row)) for row in self.cur.fetchall()]
+
+
+class _Connection:
+    def __init__(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.execute(MATCH_RESULTS_SCHEMA)
+
+    def cursor(self, cursor_factory=None):
+        return _DictCursor(self.conn)
+
+
+def test_load_match_frame_sql_runs_on_schema():
+    """La requête tourne sur le schéma réel de match_results"""
+    conn = _Connection()
+    conn.conn.executemany(
+        "INSERT INTO match_results (match_id, home_team, away_team, sport, league, commence_time,"
+        " score_home, score_away, is_finished) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            ("a", "Arsenal", "Chelsea", "soccer_epl", None, "2026-09-01", 2, 1, True),
+            ("b", "Lyon", "Lille", "soccer", "Ligue 1", "2026-09-02", 0, 0, True),
+            ("c", "Arsenal", "Lyon", "soccer_epl", None, "2026-09-03", None, None, False),
+        ],
+    )
+
+    frame = load_match_frame(conn)
+    assert len(frame) == 2
+    assert sorted(frame.league_names) == ["Ligue 1", "soccer_epl"]  # league, sinon sport
+    assert len(load_match_frame(conn, since="2026-09-02")) == 1
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests de l'instrumentation UnifiedBrain
+
+Vérifie les spans par étape de analyze_match (sur les stand-ins des
+benchmarks, sans DB), les sinks et le dump du profiler échantillonné.
+"""
+
+import logging
+import time
+
+import pytest
+import sys
+sys.path.insert(0, '/home/Mon_ps')
+
+from benchmarks.hot_paths.stand_ins import load_fixtures
+from benchmarks.hot_paths.suite import _synthetic_adapter
+from quantum_core.brain.instrumentation import BrainInstrumentation, NoOpTracer
+from quantum_core.brain.unified_brain import UnifiedBrain
+
+
+@pytest.fixture
+def brain():
+    fixtures = load_fixtures()
+    brain = UnifiedBrain()
+    brain._data_hub_adapter = _synthetic_adapter(fixtures)
+    brain._initialized = True
+    brain._instrumentation = BrainInstrumentation()
+    return brain, fixtures
+
+
+def test_default_instrumentation_is_noop(monkeypatch):
+    """Sans variable d'environnement: pas d'OTel, pas de profiler"""
+    monkeypatch.delenv("BRAIN_OTEL_ENABLED", raising=False)
+    monkeypatch.delenv("BRAIN_PROFILE_SLOW_MS", raising=False)
+    instrumentation = BrainInstrumentation.from_env()
+
+    assert isinstance(instrumentation.tracer, NoOpTracer)
+    assert instrumentation.slow_threshold_ms is None
+
+
+def test_analyze_match_emits_stage_spans(brain):
+    """Chaque étape (I/O, engines, calculateurs, edges, Kelly) a son span"""
+    brain, fixtures = brain
+    traces = []
+    brain.instrumentation.add_sink(traces.append)
+
+    home, away = fixtures["matchups"][0]
+    prediction = brain.analyze_match(home, away, market_odds=fixtures["market_odds"])
+
+    [trace] = traces
+    timings = trace.stage_timings()
+    for stage in ("data_hub", "engine.matchup", "engine.chain", "fusion",
+                  "calc.correct_score", "calc.team_totals", "edges", "kelly", "quality"):
+        assert stage in timings
+    assert prediction.stage_timings_ms == timings
+    # Spans contigus: leur somme couvre toute l'analyse
+    assert sum(timings.values()) == pytest.approx(trace.total_ms, rel=0.05)
+
+
+def test_failed_analysis_still_reaches_sinks(brain):
+    """Une exception n'empêche pas la trace d'être publiée"""
+    brain, _ = brain
+    traces = []
+    brain.instrumentation.add_sink(traces.append)
+    brain._data_hub_adapter = None
+
+    with pytest.raises(AttributeError):
+        brain.analyze_match("Liverpool", "Arsenal")
+
+    assert traces[0].failed is True
+
+
+def test_profiler_dumps_slow_analysis(caplog):
+    """Au-delà du seuil, les fonctions dominantes sont loggées"""
+    instrumentation = BrainInstrumentation(slow_threshold_ms=5, profile_interval_ms=0.5)
+
+    def busy_stage():
+        end = time.perf_counter() + 0.06
+        while time.perf_counter() < end:
+            pass
+
+    with caplog.at_level(logging.WARNING, logger="quantum_core.brain.instrumentation"):
+        trace = instrumentation.start("Liverpool", "Arsenal")
+        busy_stage()
+        trace.checkpoint("busy")
+        instrumentation.finish(trace)
+
+    assert trace.profile
+    funcs = [func for func, _, _ in trace.profile]
+    assert any("busy_stage" in func for func in funcs)
+    # Les frames au-dessus de l'appelant de start() (pytest) sont exclues
+    assert not any("pytest_pyfunc_call" in func for func in funcs)
+    assert "Analyse lente Liverpool vs Arsenal" in caplog.text
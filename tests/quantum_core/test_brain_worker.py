@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests du worker UnifiedBrain persistant
+
+Serveur sur un socket Unix temporaire avec le cerveau des stand-ins des
+benchmarks (sans DB): prechauffage unique, analyses servies au client mince,
+rechargement a chaud quand la version des donnees change, traces par etape
+renvoyees au client, refus d'un port TCP avec la cle par defaut.
+"""
+
+import os
+import stat
+
+import pytest
+import sys
+sys.path.insert(0, '/home/Mon_ps')
+
+from benchmarks.hot_paths.stand_ins import load_fixtures
+from benchmarks.hot_paths.suite import _synthetic_adapter
+from quantum_core.brain.unified_brain import UnifiedBrain
+from quantum_core.brain.worker import (
+    DEFAULT_AUTHKEY, BrainClient, BrainServer, BrainWorkerError, BrainWorkerUnavailable, connect_brain
+)
+
+
+@pytest.fixture
+def worker(tmp_path):
+    fixtures = load_fixtures()
+    built = []
+    version = {"value": 1}
+
+    def factory():
+        brain = UnifiedBrain()
+        brain._data_hub_adapter = _synthetic_adapter(fixtures)
+        brain._initialized = True
+        built.append(brain)
+        return brain
+
+    server = BrainServer(
+        address=str(tmp_path / "brain.sock"), authkey="test",
+        brain_factory=factory, version_probe=lambda: version["value"], reload_interval=3600,
+    )
+    server.start()
+    client = BrainClient(server.address, authkey="test")
+    yield server, client, built, version, fixtures
+    client.close()
+    server.stop()
+
+
+def test_client_gets_predictions_from_warm_brain(worker):
+    server, client, built, _, fixtures = worker
+    home, away = fixtures["matchups"][0]
+
+    remote = client.analyze_match(home, away, market_odds=fixtures["market_odds"])
+    local = built[0].analyze_match(home, away, market_odds=fixtures["market_odds"])
+
+    # Engines charges au demarrage, pas a la premiere requete
+    assert set(built[0]._engines) == set(UnifiedBrain.ENGINE_MAP)
+    assert remote.home_win_prob == local.home_win_prob
+    assert remote.market_edges.keys() == local.market_edges.keys()
+    assert client.get_stats()["matches_analyzed"] == 2
+    assert len(built) == 1
+
+
+def test_stage_timings_reach_client_sinks(worker):
+    server, client, _, _, fixtures = worker
+    home, away = fixtures["matchups"][0]
+    traces = []
+    client.instrumentation.add_sink(traces.append)
+
+    prediction = client.analyze_match(home, away, market_odds=fixtures["market_odds"])
+
+    (trace,) = traces
+    assert (trace.home, trace.away) == (home, away)
+    assert trace.stage_timings() == prediction.stage_timings_ms
+    assert client.ping() is True and len(traces) == 1
+
+
+def test_hot_reload_only_when_data_version_changes(worker):
+    server, client, built, version, _ = worker
+
+    assert server.check_reload() is False
+    version["value"] = 2
+    assert server.check_reload() is True
+    assert server.brain is built[1]
+    assert client.status()["reloads"] == 1
+
+
+def test_remote_errors_and_unavailable_worker(worker, tmp_path, monkeypatch):
+    server, client, _, _, _ = worker
+
+    with pytest.raises(BrainWorkerError, match="AttributeError"):
+        client._call("_ensure_initialized")
+
+    missing = BrainClient(str(tmp_path / "absent.sock"), authkey="test")
+    with pytest.raises(BrainWorkerUnavailable):
+        missing.ping()
+
+    import quantum_core.brain.unified_brain as unified_brain
+    monkeypatch.setattr(unified_brain, "_brain_instance", "local")
+    assert connect_brain(str(tmp_path / "absent.sock"), authkey="test") == "local"
+    assert isinstance(connect_brain(server.address, authkey="test"), BrainClient)
+
+
+def test_unix_socket_default_and_tcp_needs_real_authkey(worker, monkeypatch):
+    server, _, _, _, _ = worker
+    assert stat.S_IMODE(os.stat(server.address).st_mode) == 0o660
+
+    monkeypatch.delenv("BRAIN_WORKER_AUTHKEY", raising=False)
+    for authkey in (None, DEFAULT_AUTHKEY):
+        with pytest.raises(BrainWorkerError, match="BRAIN_WORKER_AUTHKEY"):
+            BrainServer(address=("127.0.0.1", 0), authkey=authkey)
+
+    monkeypatch.setenv("BRAIN_WORKER_ADDRESS", "127.0.0.1:7700")
+    with pytest.raises(BrainWorkerError):
+        BrainServer()
+    monkeypatch.setenv("BRAIN_WORKER_AUTHKEY", "s3cret")
+    assert BrainServer().address == ("127.0.0.1", 7700)
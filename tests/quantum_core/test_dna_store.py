@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests du store DNA colonne (memmap)
+
+Vérifie l'aller-retour JSON -> store (enregistrements, meta, colonnes
+numériques et texte), le fallback JSON quand le store est absent ou périmé,
+et le branchement de UnifiedLoader sur le store.
+"""
+
+import json
+import os
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '/home/Mon_ps')
+
+from quantum_core.data import dna_store as ds
+
+
+TEAMS = {
+    "Liverpool": {"league": "EPL", "tactical": {"ppda": 8.5, "press": True}, "tags": ["GEGENPRESS"]},
+    "Arsenal": {"league": "EPL", "tactical": {"ppda": 10.0}, "style": "possession"},
+    "Brest": {"league": 1, "tactical": {"ppda": "n/a"}},
+}
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "team_dna.json"
+    path.write_text(json.dumps({"metadata": {"version": "2.0"}, "teams": TEAMS}))
+    return path
+
+
+def test_roundtrip_records_and_columns(source, tmp_path):
+    out = ds.build_store(source, "teams", tmp_path / "store")
+    store = ds.DNAStore(out)
+
+    assert list(store) == ["Liverpool", "Arsenal", "Brest"]
+    assert dict(store) == TEAMS
+    assert "Arsenal" in store and "Chelsea" not in store
+    assert store.meta == {"metadata": {"version": "2.0"}}
+
+    press = store.column("tactical.press")
+    assert isinstance(press, np.memmap)
+    assert press[0] == 1.0 and np.isnan(press[1]) and np.isnan(press[2])
+    # Chemins mixtes (nombre et texte) non exposés en colonne
+    assert "tactical.ppda" not in store.columns and "league" not in store.columns
+    assert store.column("style").tolist() == [None, "possession", None]
+    with pytest.raises(KeyError):
+        store.column("tags")
+
+
+def test_load_section_prefers_fresh_store(source, tmp_path):
+    root = tmp_path / "columnar"
+    assert isinstance(ds.load_section(source, "teams", root), dict)
+
+    ds.build_store(source, "teams", ds.store_dir_for(source, root))
+    teams = ds.load_section(source, "teams", root)
+    assert isinstance(teams, ds.DNAStore)
+    assert teams["Liverpool"]["tactical"]["ppda"] == 8.5
+    assert ds.open_store(source, "players", root) is None
+
+    # Source modifiée après conversion: store ignoré
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert isinstance(ds.load_section(source, "teams", root), dict)
+
+
+def test_unified_loader_reads_store(source, tmp_path, monkeypatch):
+    from quantum.loaders import unified_loader as ul
+
+    root = tmp_path / "columnar"
+    ds.build_store(source, "teams", ds.store_dir_for(source, root))
+    monkeypatch.setattr(ds, "DEFAULT_STORE_ROOT", root)
+    monkeypatch.setitem(ul.FILES, "teams", source)
+
+    loader = ul.UnifiedLoader()
+    assert isinstance(loader._teams, ds.DNAStore)
+    assert loader.get_team("liverpool")["tactical"]["ppda"] == 8.5
+    assert set(loader.get_all_teams()) == set(TEAMS)
+
+
+PLAYERS = {
+    "mohamed_salah_liverpool": {"meta": {"team": "Liverpool", "position": "F M S"}, "xg": 12.1},
+    "alisson_liverpool": {"meta": {"team": "Liverpool", "position": "GK", "position_category": "GK"}},
+    "bukayo_saka_arsenal": {"meta": {"team": "Arsenal", "position": "F M"}},
+    "william_saliba_arsenal": {"meta": {"team": "Arsenal", "position_category": "CB"}},
+    "free_agent": {"position": "D", "age": 31},
+}
+
+
+def test_text_column_without_decoding(tmp_path):
+    source = tmp_path / "players.json"
+    source.write_text(json.dumps({"players": PLAYERS}))
+    store = ds.DNAStore(ds.build_store(source, "players", tmp_path / "store"))
+
+    assert store.text_column("meta.team").tolist() == ["Liverpool", "Liverpool", "Arsenal", "Arsenal", None]
+    assert store.text_column("meta.nationality").tolist() == [None] * 5  # feuille absente partout
+    assert store.text_column("xg") is None  # numérique: via les enregistrements
+    assert store.manifest["mixed"] == []
+    assert store._decode.cache_info().misses == 0
+
+
+def test_unified_loader_filters_on_columns(tmp_path, monkeypatch):
+    from quantum.loaders import unified_loader as ul
+
+    source = tmp_path / "player_dna_unified.json"
+    source.write_text(json.dumps({"players": PLAYERS}))
+    monkeypatch.setitem(ul.FILES, "players", source)
+
+    json_loader = ul.UnifiedLoader()
+    expected_team = json_loader.get_players_by_team("Arsenal")
+    expected_def = json_loader.get_players_by_position("DEF")
+    expected_stats = json_loader.get_stats()["players"]
+
+    root = tmp_path / "columnar"
+    ds.build_store(source, "players", ds.store_dir_for(source, root))
+    monkeypatch.setattr(ds, "DEFAULT_STORE_ROOT", root)
+    loader = ul.UnifiedLoader()
+    store = loader._players
+    assert isinstance(store, ds.DNAStore)
+
+    assert [p["_key"] for p in loader.get_players_by_team("Arsenal")] == \
+        [p["_key"] for p in expected_team] == ["bukayo_saka_arsenal", "william_saliba_arsenal"]
+    # Seuls les joueurs retenus sont décodés
+    assert store._decode.cache_info().misses == 2
+
+    assert loader.get_players_by_position("DEF") == expected_def
+    assert {p["_key"] for p in expected_def} == {"william_saliba_arsenal", "free_agent"}
+    assert loader.get_stats()["players"] == expected_stats
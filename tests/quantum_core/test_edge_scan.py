@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests du scan d'edges vectorisé (quantum_core/brain/edge_scan)
+
+Vérifie les formules cellule par cellule (taxe/seuil du registre, Kelly,
+signaux), la résolution des alias de cotes, l'égalité de la boucle scalaire
+d'un match (market_edges) avec le scan et le scan d'un slate complet via
+UnifiedBrain.
+"""
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '/home/Mon_ps')
+
+from benchmarks.hot_paths.stand_ins import load_fixtures
+from benchmarks.hot_paths.suite import _synthetic_adapter
+from quantum_core.brain.edge_scan import (
+    MARKET_INDEX, MARKETS, SCALAR_MAX_ODDS, market_edges, odds_matrix, probability_matrix, scan_edges,
+)
+from quantum_core.brain.models import LIQUIDITY_TAX, MIN_EDGE_BY_MARKET, MarketType, SignalStrength
+from quantum_core.brain.unified_brain import UnifiedBrain
+
+
+def test_scan_matches_scalar_formulas():
+    """Edges, Kelly et signaux identiques aux formules de l'ancienne boucle"""
+    probs = [{"home_win": 0.60, "over_2.5": 0.40, "btts_yes": 0.5}]
+    odds = [{"1": 2.10, "o25": 2.0}]
+
+    scan = scan_edges(probability_matrix(probs), odds_matrix(odds))
+    edges = scan.market_edges(0)
+
+    assert set(edges) == {"home_win", "over_2.5"}  # btts sans cote: ignoré
+
+    home = edges["home_win"]
+    tax = LIQUIDITY_TAX[MarketType.HOME_WIN]
+    expected = 0.60 - 1 / 2.10 - 0.01 - tax
+    assert home.edge_after_liquidity == pytest.approx(expected)
+    assert home.kelly_fraction == pytest.approx(min(0.10, expected / 1.10 * 0.5))
+    assert home.min_edge_required == MIN_EDGE_BY_MARKET[MarketType.HOME_WIN]
+    assert home.meets_threshold is True
+    assert home.signal_strength == SignalStrength.STRONG_BET
+    assert home.fair_odds == pytest.approx(1 / 0.60)
+
+    over = edges["over_2.5"]
+    assert over.edge_after_liquidity == pytest.approx(0.40 - 0.5 - 0.01 - LIQUIDITY_TAX[MarketType.OVER_25])
+    assert over.kelly_fraction == 0.0
+    assert over.signal_strength == SignalStrength.FADE
+    assert over.meets_threshold is False
+
+
+def test_odds_matrix_resolves_aliases_in_order():
+    """Premier alias présent gagne; le nom canonique n'est pas toujours un alias"""
+    matrix = odds_matrix([{"home": 1.9, "home_win": 2.5, "X": 3.4, "over_2.5": 1.8}])
+
+    assert matrix[0, MARKET_INDEX["home_win"]] == 1.9
+    assert matrix[0, MARKET_INDEX["draw"]] == 3.4
+    assert np.isnan(matrix[0, MARKET_INDEX["over_2.5"]])
+
+
+def test_invalid_odds_are_never_sized():
+    """Cote <= 1: edge calculé, mais ni Kelly ni seuil positif"""
+    probs = np.full((1, len(MARKETS)), 0.9)
+    odds = np.full((1, len(MARKETS)), 1.0)
+
+    scan = scan_edges(probs, odds)
+
+    assert scan.available.all()
+    assert not scan.kelly_fraction.any()
+
+
+def test_scalar_market_edges_match_scan():
+    """Boucle scalaire d'un match = ligne du scan vectorisé, champ par champ"""
+    rng = np.random.default_rng(7)
+    probs = {m.value: float(p) for m, p in zip(MARKETS, rng.uniform(0.02, 0.95, len(MARKETS)))}
+    probs["draw"] = None
+    names = ["1", "X", "o25", "btts", "corners_over_95"]
+    odds = {name: float(o) for name, o in zip(names, rng.uniform(0.9, 6.0, len(names)))}
+    odds.update({m.value: float(o) for m, o in zip(MARKETS[30:60], rng.uniform(1.01, 8.0, 30))})
+    odds["dc_1x"] = 0.0
+    assert len(odds) <= SCALAR_MAX_ODDS
+
+    scalar = market_edges(probs, odds)
+    vector = scan_edges(probability_matrix([probs]), odds_matrix([odds])).market_edges(0)
+
+    assert list(scalar) == list(vector)
+    assert scalar == vector
+
+
+def test_scan_slate_covers_all_matches():
+    """Un slate N × 99 en un appel, opportunités triées par Kelly"""
+    fixtures = load_fixtures()
+    brain = UnifiedBrain()
+    brain._data_hub_adapter = _synthetic_adapter(fixtures)
+    brain._initialized = True
+    odds = fixtures["market_odds"]
+    matchups = fixtures["matchups"][:4]
+
+    predictions = [brain.analyze_match(home, away, market_odds=odds) for home, away in matchups]
+    scan = brain.scan_slate(predictions, [odds] * len(predictions))
+
+    assert scan.shape == (len(matchups), len(MARKETS))
+    for i, prediction in enumerate(predictions):
+        row = scan.market_edges(i)
+        assert row.keys() == prediction.market_edges.keys()
+        for name, edge in row.items():
+            assert edge.edge_after_liquidity == pytest.approx(prediction.market_edges[name].edge_after_liquidity)
+
+    kellys = [scan.kelly_fraction[i, MARKETS.index(m)] for i, m in scan.opportunities()]
+    assert kellys == sorted(kellys, reverse=True)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests du modèle Goalscorer (index par équipe + risques concurrents)
+
+Vérifie l'index TeamSquad construit au chargement, la cohérence des
+probabilités first/last (partition de "au moins un but") et l'effet des
+splits timing sur first vs last.
+"""
+
+import json
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '/home/Mon_ps')
+
+from quantum_core.brain import goalscorer as gs
+
+
+def _profile(name, team, goals, early, late):
+    rest = (1.0 - early - late) / 4
+    return {
+        "player_name": name, "team_name": team, "total_goals": goals,
+        "matches_with_goal": goals, "total_xg": goals * 0.9, "minutes_played": 0,
+        "pct_0_15": early, "pct_16_30": rest, "pct_31_45": rest,
+        "pct_46_60": rest, "pct_61_75": rest, "pct_76_90": late,
+    }
+
+
+@pytest.fixture
+def calculator(tmp_path, monkeypatch):
+    profiles = {
+        "1": _profile("Early Bird", "Liverpool", 10, early=0.6, late=0.0),
+        "2": _profile("Clutch", "Liverpool", 10, early=0.0, late=0.6),
+        "3": _profile("Striker", "Arsenal", 8, early=0.15, late=0.15),
+        "4": _profile("Bench", "Arsenal", 0, early=0.0, late=0.0),
+    }
+    (tmp_path / "profiles.json").write_text(json.dumps(profiles))
+    (tmp_path / "teams.json").write_text(json.dumps({"Liverpool FC": {"scored_first_rate": 0.6}}))
+    monkeypatch.setattr(gs, "PROFILES_FILE", tmp_path / "profiles.json")
+    monkeypatch.setattr(gs, "TEAM_STATS_FILE", tmp_path / "teams.json")
+    for attr in ("_profiles", "_team_stats", "_squads", "_team_stats_index"):
+        monkeypatch.setattr(gs.GoalscorerDataLoader, attr, None)
+    return gs.GoalscorerCalculator()
+
+
+def test_team_index_built_once(calculator):
+    squad = calculator.data.get_team_squad("ARSENAL")
+    assert squad.player_names == ["Striker", "Bench"]
+    assert squad.eligible.tolist() == [True, False]
+    assert np.allclose(squad.timing_weights.sum(axis=1), 1.0)
+
+    players = calculator.data.get_team_players("arsenal")
+    assert players[0]["player_id"] == "3"
+    assert "player_id" not in calculator.data.get_player_profile("3")
+    assert calculator.data.get_team_first_gs_stats("Liverpool") == {"scored_first_rate": 0.6}
+
+
+def test_first_and_last_partition_goals():
+    team_xg = np.array([1.6, 1.1])
+    player_lambda = np.array([[0.1] * 6, [0.05] * 6, [0.08] * 6])
+    probs = gs.competing_risks(player_lambda, np.array([0, 0, 1]), team_xg)
+
+    p_goal = 1 - probs["no_goals"]
+    assert probs["no_goals"] == pytest.approx(np.exp(-team_xg.sum()))
+    assert probs["team_first"].sum() == pytest.approx(p_goal)
+    assert probs["team_last"].sum() == pytest.approx(p_goal)
+    assert probs["first"][0] < probs["team_first"][0]
+
+
+def test_timing_splits_drive_first_vs_last(calculator):
+    analysis = calculator.analyze_match("Liverpool", "Arsenal", 1.8, 1.0, top_n=5)
+
+    odds = {p.player_name: p for p in analysis.anytime_rankings}
+    assert set(odds) == {"Early Bird", "Clutch", "Striker"}
+    assert odds["Early Bird"].first_gs_prob > odds["Clutch"].first_gs_prob
+    assert odds["Clutch"].last_gs_prob > odds["Early Bird"].last_gs_prob
+    assert odds["Early Bird"].anytime_prob == pytest.approx(odds["Clutch"].anytime_prob)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests du moteur in-play (price_in_play)
+
+Vérifie la couverture des 99 marchés, l'égalité avec le pricing pré-match
+à la minute 0, le sens des mises à jour (but, carton rouge, temps qui
+passe) et le règlement des marchés au coup de sifflet final.
+MatchPrior.from_ratings part d'un fit TeamRatings réel.
+"""
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '/home/Mon_ps')
+
+from quantum_core.brain.models import MarketType
+from quantum_core.probability.in_play import (
+    InPlayState, MatchPrior, price_in_play, remaining_lambdas
+)
+from quantum_core.probability.score_engine import score_matrix
+from quantum_core.probability.team_ratings import MatchArrays, fit_ratings
+
+PRIOR = MatchPrior(lambda_home=1.6, lambda_away=1.1, rho=-0.1)
+
+
+def test_all_markets_priced():
+    prices = price_in_play(PRIOR, InPlayState(minute=30, home_goals=1))
+
+    assert set(prices) == {m.value for m in MarketType}
+    assert all(0.0 <= p <= 1.0 for p in prices.values())
+    assert sum(prices[k] for k in ("home_win", "draw", "away_win")) == pytest.approx(1.0)
+    assert sum(v for k, v in prices.items() if k.startswith("dr_")) == pytest.approx(1.0)
+
+
+def test_kickoff_matches_pre_match_distribution():
+    prices = price_in_play(PRIOR, InPlayState())
+    dist = score_matrix(PRIOR.lambda_home, PRIOR.lambda_away, rho=PRIOR.rho, max_goals=10)
+
+    assert prices["home_win"] == pytest.approx(float(dist.home_win()), abs=1e-9)
+    assert prices["over_2.5"] == pytest.approx(float(dist.over(2.5)), abs=1e-9)
+    assert prices["cs_1_0"] == pytest.approx(float(dist.score(1, 0)), abs=1e-9)
+    assert prices["ah_home_m05"] == pytest.approx(prices["home_win"])
+    assert prices["dnb_home"] == pytest.approx(prices["home_win"] / (1 - prices["draw"]))
+
+
+def test_updates_move_prices_the_right_way():
+    base = price_in_play(PRIOR, InPlayState(minute=20))
+    goal = price_in_play(PRIOR, InPlayState(minute=20, home_goals=1))
+    red = price_in_play(PRIOR, InPlayState(minute=20, home_red=1))
+    later = price_in_play(PRIOR, InPlayState(minute=70))
+
+    assert goal["home_win"] > base["home_win"] and goal["btts_no"] < 1
+    assert goal["cs_0_0"] == 0.0 and goal["over_0.5"] == 1.0
+    assert red["home_win"] < base["home_win"] < later["draw"] + base["home_win"]
+    assert remaining_lambdas(PRIOR, InPlayState(minute=20, home_red=1))[1].sum() > \
+        remaining_lambdas(PRIOR, InPlayState(minute=20))[1].sum()
+    assert later["under_2.5"] > base["under_2.5"]
+    assert later["draw"] > base["draw"]
+
+
+def test_full_time_settles_markets():
+    state = InPlayState(minute=90, home_goals=2, away_goals=1, corners=9, cards=5, ht_score=(0, 1))
+    prices = price_in_play(PRIOR, state)
+
+    assert prices["home_win"] == prices["cs_2_1"] == prices["dr_2_1"] == 1.0
+    assert prices["over_2.5"] == prices["btts_yes"] == prices["odd_goals"] == 1.0
+    assert prices["ht_away_win"] == prices["score_both_halves_yes"] == 1.0
+    assert prices["btts_both_halves_no"] == 1.0
+    assert prices["corners_over_8.5"] == prices["cards_over_4.5"] == 1.0
+    assert prices["ah_home_m05"] == 1.0 and prices["ah_home_m15"] == 0.0
+    assert prices["ah_home_m10"] == 0.5  # push: demi-mise
+    assert prices["draw"] == prices["dr_x_x"] == prices["under_2.5"] == 0.0
+
+
+def test_prior_from_fitted_ratings():
+    rng = np.random.default_rng(3)
+    rows = [
+        {"home_team": f"{league}-{h}", "away_team": f"{league}-{a}",
+         "score_home": rng.poisson(1.5), "score_away": rng.poisson(1.1),
+         "commence_time": f"2026-{1 + day // 28:02d}-{1 + day % 28:02d}", "league": league}
+        for day in range(0, 168, 3)
+        for league in ("EPL", "LIGA")
+        for h, a in ((day % 6, (day + 1) % 6), ((day + 2) % 6, (day + 4) % 6))
+    ]
+    rows.append({"home_team": "EPL-0", "away_team": "LIGA-1", "score_home": 1, "score_away": 1,
+                 "commence_time": "2026-06-01", "league": "CUP"})
+    ratings = fit_ratings(MatchArrays.from_records(rows))
+
+    prior = MatchPrior.from_ratings(ratings, "EPL-0", "EPL-1", corners_expected=11.0)
+    assert (prior.lambda_home, prior.lambda_away) == pytest.approx(ratings.lambdas("EPL-0", "EPL-1"))
+    assert prior.rho == ratings.rho and prior.corners_expected == 11.0
+
+    # Ligue du match: intercept / avantage du terrain de la coupe; ligue inconnue = défaut
+    cup = MatchPrior.from_ratings(ratings, "EPL-0", "LIGA-1", league="CUP")
+    default = MatchPrior.from_ratings(ratings, "EPL-0", "LIGA-1", league="Unknown")
+    assert cup.lambda_home != default.lambda_home
+    assert (default.lambda_home, default.lambda_away) == pytest.approx(ratings.lambdas("EPL-0", "LIGA-1"))
+    assert price_in_play(prior, InPlayState(minute=10))["home_win"] > 0
+
+    with pytest.raises(KeyError):
+        MatchPrior.from_ratings(ratings, "EPL-0", "Unknown FC")
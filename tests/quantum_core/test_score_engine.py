@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests du moteur de distributions de scores (score_engine)
+
+Vérifie les PMF (table de grille = calcul direct), la correction
+Dixon-Coles, les réductions de marchés contre des sommes explicites,
+le calcul par lot, la délégation de ScoreMatrix et l'accord de la boucle
+scalaire de HalfTimeCalculator avec half_time_split.
+"""
+
+import math
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '/home/Mon_ps')
+
+from quantum_core.probability.poisson import DixonColesModel, get_all_market_probabilities
+from quantum_core.probability.score_engine import (
+    half_time_split, poisson_over, poisson_pmf, score_matrix
+)
+
+
+def _pmf(k, lam):
+    return lam ** k * math.exp(-lam) / math.factorial(k)
+
+
+def test_pmf_grid_lookup_matches_direct_computation():
+    on_grid = poisson_pmf(1.37, 6)
+    off_grid = poisson_pmf(1.3700001, 6)
+
+    assert on_grid == pytest.approx([_pmf(k, 1.37) for k in range(7)], rel=1e-12)
+    assert off_grid == pytest.approx(on_grid, rel=1e-5)
+    assert poisson_pmf(0.0, 3).tolist() == [1.0, 0.0, 0.0, 0.0]
+    assert poisson_over(2.4, 8.5) == pytest.approx(1 - sum(_pmf(k, 2.4) for k in range(9)))
+
+
+def test_market_reductions_match_explicit_sums():
+    lh, la, rho = 1.8, 1.1, -0.13
+    dist = score_matrix(lh, la, rho=rho, max_goals=8)
+
+    cells = {}
+    for h in range(9):
+        for a in range(9):
+            tau = {(0, 0): 1 - lh * la * rho, (0, 1): 1 + lh * rho, (1, 0): 1 + la * rho, (1, 1): 1 - rho}
+            cells[(h, a)] = _pmf(h, lh) * _pmf(a, la) * tau.get((h, a), 1.0)
+    total = sum(cells.values())
+
+    def p(cond):
+        return sum(v for (h, a), v in cells.items() if cond(h, a)) / total
+
+    markets = dist.markets()
+    assert markets["home_win"] == pytest.approx(p(lambda h, a: h > a))
+    assert markets["draw"] == pytest.approx(p(lambda h, a: h == a))
+    assert markets["over_25"] == pytest.approx(p(lambda h, a: h + a > 2.5))
+    assert markets["under_35"] == pytest.approx(p(lambda h, a: h + a < 3.5))
+    assert markets["btts_yes"] == pytest.approx(p(lambda h, a: h > 0 and a > 0))
+    assert markets["away_over_15"] == pytest.approx(p(lambda h, a: a > 1.5))
+    assert markets["clean_sheet_home"] == pytest.approx(p(lambda h, a: a == 0))
+    assert markets["odd_goals"] == pytest.approx(p(lambda h, a: (h + a) % 2 == 1))
+    assert dist.top_scores(1)[0][0] == max(cells, key=cells.get)
+
+
+def test_slate_batch_equals_per_match():
+    lambda_home = np.array([0.9, 1.6, 2.7])
+    lambda_away = np.array([1.4, 1.0, 0.6])
+
+    slate = score_matrix(lambda_home, lambda_away, rho=-0.1).markets()
+
+    for i in range(3):
+        single = score_matrix(lambda_home[i], lambda_away[i], rho=-0.1).markets()
+        for market, value in single.items():
+            assert slate[market][i] == pytest.approx(value)
+
+
+def test_half_time_split_and_score_matrix_delegation():
+    first, second = half_time_split(1.5, 1.0, ht_ratio=0.45)
+    assert first.over(0.5) == pytest.approx(1 - math.exp(-2.5 * 0.45), abs=1e-9)
+    assert second.over(0.5) == pytest.approx(1 - math.exp(-2.5 * 0.55), abs=1e-9)
+
+    matrix = DixonColesModel().calculate_score_matrix(1.8, 1.2)
+    markets = get_all_market_probabilities(matrix)
+    assert markets["over_25"] == pytest.approx(matrix.distribution.over(2.5))
+    assert markets["score_1_1"] == matrix.get_prob(1, 1)
+    assert sum(matrix.probabilities.values()) == pytest.approx(1.0, abs=1e-3)
+
+
+def test_half_time_calculator_matches_engine():
+    from quantum_core.brain.half_time import HalfTimeCalculator
+
+    analysis = HalfTimeCalculator().calculate(
+        expected_goals=2.7, home_win_prob=0.45, draw_prob=0.27, away_win_prob=0.28,
+        expected_home_goals=1.6, expected_away_goals=1.1,
+    )
+    ratio = analysis.expected_home_ht_goals / 1.6
+    first, _ = half_time_split(1.6, 1.1, ht_ratio=ratio, max_goals=4)
+
+    assert analysis.ht_home_win_prob == pytest.approx(float(first.home_win()), abs=1e-12)
+    assert analysis.ht_draw_prob == pytest.approx(float(first.draw()), abs=1e-12)
+    assert analysis.ht_away_win_prob == pytest.approx(float(first.away_win()), abs=1e-12)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Tests du modèle de ratings Dixon-Coles (team_ratings)
+
+Matchs synthétiques tirés de paramètres connus: le fit doit retrouver
+les forces, le warm start converger plus vite, le walk-forward ne jamais
+voir le futur et le JSON sauvegardé redonner les mêmes lambdas.
+La requête de load_match_results tourne sur le schéma de match_results.
+"""
+
+import sqlite3
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '/home/Mon_ps')
+
+from quantum_core.probability.team_ratings import (
+    MatchArrays, TeamRatings, fit_ratings, load_match_results, load_ratings, walk_forward_lambdas
+)
+
+START = date(2025, 8, 1)
+
+
+def _season(seed=0, n_leagues=2, n_teams=16, days=360, cup=True):
+    rng = np.random.default_rng(seed)
+    attack = rng.normal(0, 0.3, (n_leagues, n_teams))
+    defence = rng.normal(0, 0.3, (n_leagues, n_teams))
+    rows = []
+    for day in range(0, days, 4):
+        when = (START + timedelta(days=day)).isoformat()
+        for league in range(n_leagues):
+            perm = rng.permutation(n_teams)
+            for h, a in zip(perm[::2], perm[1::2]):
+                lambda_home = np.exp(0.1 + 0.25 + attack[league, h] - defence[league, a])
+                lambda_away = np.exp(0.1 + attack[league, a] - defence[league, h])
+                rows.append({
+                    "home_team": f"L{league}-{h}", "away_team": f"L{league}-{a}",
+                    "score_home": rng.poisson(lambda_home), "score_away": rng.poisson(lambda_away),
+                    "commence_time": when, "league": f"L{league}",
+                })
+        if cup and day % 28 == 0:
+            rows.append({
+                "home_team": f"L0-{day % n_teams}", "away_team": f"L1-{(day + 5) % n_teams}",
+                "home_goals": rng.poisson(1.4), "away_goals": rng.poisson(1.1),
+                "match_date": when, "league": "CUP",
+            })
+    return rows, attack
+
+
+def test_fit_recovers_team_strengths():
+    rows, attack = _season()
+    ratings = fit_ratings(MatchArrays.from_records(rows))
+
+    fitted = [ratings.attack[ratings.team_id(f"L0-{i}")] for i in range(16)]
+    assert np.corrcoef(fitted, attack[0])[0, 1] > 0.9
+    assert ratings.iterations < 200
+    assert ratings.home_advantage[ratings.leagues.index("L0")] == pytest.approx(0.25, abs=0.1)
+    assert not ratings.has("Unknown FC")
+
+    lambda_home, lambda_away = ratings.lambdas("L0-1", "L0-2")
+    totals = ratings.score_distribution("L0-1", "L0-2").total_goals()
+    assert float(totals @ np.arange(len(totals))) == pytest.approx(lambda_home + lambda_away, rel=1e-2)
+
+
+def test_warm_start_converges_faster_to_same_fit():
+    rows, _ = _season()
+    matches = MatchArrays.from_records(rows)
+    last = matches.days.max()
+    before = fit_ratings(matches.select(matches.days < last), as_of=last)
+
+    cold = fit_ratings(matches, as_of=last)
+    warm = fit_ratings(matches, as_of=last, previous=before)
+
+    assert warm.iterations < cold.iterations
+    np.testing.assert_allclose(warm.attack, cold.attack, atol=1e-4)
+    assert warm.log_likelihood == pytest.approx(cold.log_likelihood, rel=1e-6)
+
+
+def test_walk_forward_has_no_lookahead():
+    rows, _ = _season(days=200, cup=False)
+    matches = MatchArrays.from_records(rows)
+    lambda_home, lambda_away = walk_forward_lambdas(matches, refit_every_days=14, min_history_days=60)
+
+    # Modifier un score futur ne change aucun lambda antérieur
+    late = np.flatnonzero(matches.days >= matches.days.min() + 150)[0]
+    tampered = matches.select(np.ones(len(matches), dtype=bool))
+    tampered.home_goals = matches.home_goals.copy()
+    tampered.home_goals[late] += 5
+    tampered_home, _ = walk_forward_lambdas(tampered, refit_every_days=14, min_history_days=60)
+
+    early = matches.days < matches.days.min() + 150
+    assert np.isnan(lambda_home[matches.days < matches.days.min() + 60]).all()
+    np.testing.assert_array_equal(lambda_home[early], tampered_home[early])
+    assert np.isfinite(lambda_away[~np.isnan(lambda_home)]).all()
+
+
+def test_save_and_load_round_trip(tmp_path):
+    rows, _ = _season(days=120)
+    ratings = fit_ratings(MatchArrays.from_records(rows))
+    path = tmp_path / "team_ratings.json"
+    ratings.save(path)
+
+    loaded = load_ratings(path)
+    assert isinstance(loaded, TeamRatings)
+    assert loaded is load_ratings(path)
+    assert loaded.lambdas("L1-3", "L1-7") == pytest.approx(ratings.lambdas("L1-3", "L1-7"))
+    assert loaded.rho == ratings.rho and loaded.as_of == ratings.as_of
+    assert load_ratings(tmp_path / "missing.json") is None
+
+    # Un nouveau fit sauvegardé dans le process est relu sans attendre l'intervalle
+    refit = fit_ratings(MatchArrays.from_records(rows[: len(rows) // 2]))
+    refit.save(path)
+    assert load_ratings(path).n_matches == refit.n_matches != ratings.n_matches
+
+
+# Colonnes écrites par fetch_scores_odds_api / football_data_service / fetch_results_football_data_v2
+MATCH_RESULTS_SCHEMA = """
+    CREATE TABLE match_results (
+        match_id TEXT PRIMARY KEY, home_team TEXT, away_team TEXT,
+        sport TEXT, league TEXT, commence_time TEXT,
+        score_home INTEGER, score_away INTEGER, outcome TEXT,
+        is_finished BOOLEAN, last_updated TEXT
+    )
+"""
+
+
+class _Cursor:
+    """Curseur psycopg2-like (placeholders %s, context manager) sur sqlite."""
+
+    def __init__(self, conn):
+        self.cur = conn.cursor()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cur.close()
+
+    def execute(self, sql, params=()):
+        self.cur.execute(sql.replace("%s", "?"), params)
+
+    @property
+    def description(self):
+        return self.cur.description
+
+    def fetchall(self):
+        return self.cur.fetchall()
+
+
+class _Connection:
+    def __init__(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.execute(MATCH_RESULTS_SCHEMA)
+
+    def cursor(self):
+        return _Cursor(self.conn)
+
+
+def test_load_match_results_sql_runs_on_schema():
+    conn = _Connection()
+    conn.conn.executemany(
+        "INSERT INTO match_results (match_id, home_team, away_team, sport, league, commence_time,"
+        " score_home, score_away, is_finished) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            ("a", "Arsenal", "Chelsea", "soccer_epl", None, "2026-09-01", 2, 1, True),
+            ("b", "Lyon", "Lille", "soccer", "Ligue 1", "2026-09-02", 0, 0, True),
+            ("c", "Arsenal", "Lyon", "soccer_epl", None, "2026-09-03", None, None, False),
+        ],
+    )
+
+    matches = load_match_results(conn)
+    assert len(matches) == 2
+    assert sorted(matches.leagues) == ["Ligue 1", "soccer_epl"]  # league, sinon sport
+    assert len(load_match_results(conn, since="2026-09-02")) == 1
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests AsyncFetcher contre un serveur de fixtures local
+
+Vérifie la politesse par domaine (intervalle respecté par domaine, domaines
+en parallèle), les requêtes conditionnelles (ETag → 304 servi depuis
+l'archive), la détection de contenu inchangé, le retry sur 429 et le mode
+offline.
+"""
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+import sys
+sys.path.insert(0, '/home/Mon_ps')
+
+from services.scraping import AsyncFetcher, DomainPolicy, RawArchive, TokenBucket
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.hits.append((self.headers["Host"], self.path, time.monotonic()))
+        if self.path == "/limited" and server.limited_left > 0:
+            server.limited_left -= 1
+            self.send_response(429)
+            self.send_header("Retry-After", "0.1")
+            self.end_headers()
+            return
+
+        page = server.pages.get(self.path)
+        if page is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        body, etag = page
+        if etag and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _FixtureHandler)
+    httpd.hits = []
+    httpd.limited_left = 1
+    httpd.pages = {f"/page/{i}": (f"<html>{i}</html>".encode(), None) for i in range(3)}
+    httpd.pages["/etag"] = (b"<html>etag</html>", '"v1"')
+    httpd.pages["/limited"] = (b"ok", None)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _hosts(server):
+    port = server.server_address[1]
+    return f"127.0.0.1:{port}", f"localhost:{port}"
+
+
+def test_token_bucket_queues_reservations():
+    now = [0.0]
+    bucket = TokenBucket(rate=2.0, capacity=1, clock=lambda: now[0])
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.5, 1.0]
+    now[0] = 2.0
+    assert bucket.reserve() == 0.0
+
+
+def test_domains_run_in_parallel_within_budget(server, tmp_path):
+    a, b = _hosts(server)
+    policies = {a: DomainPolicy(min_interval=0.2), b: DomainPolicy(min_interval=0.2)}
+    urls = [f"http://{host}/page/{i}" for i in range(3) for host in (a, b)]
+    sent = {a: [], b: []}
+
+    async def on_request(request):
+        sent[request.url.netloc.decode()].append(time.monotonic())
+
+    async def run():
+        client = httpx.AsyncClient(event_hooks={"request": [on_request]})
+        async with AsyncFetcher(policies=policies, archive=RawArchive(tmp_path), client=client) as fetcher:
+            t0 = time.perf_counter()
+            results = [r async for r in fetcher.fetch_many(urls)]
+            wall = time.perf_counter() - t0
+        await client.aclose()
+        return results, wall
+
+    results, wall = asyncio.run(run())
+    assert all(r.ok for r in results) and len(results) == 6
+    # 3 requêtes par domaine à 0.2s d'intervalle ≈ 0.4s; en séquentiel ≈ 1.0s
+    assert wall < 0.8
+    for host in (a, b):
+        assert len(sent[host]) == 3
+        assert min(t2 - t1 for t1, t2 in zip(sent[host], sent[host][1:])) >= 0.19
+
+
+def test_conditional_fetch_and_unchanged_detection(server, tmp_path):
+    host, _ = _hosts(server)
+    fast = {host: DomainPolicy(min_interval=0.01, burst=5)}
+    archive = RawArchive(tmp_path)
+
+    async def run():
+        async with AsyncFetcher(policies=fast, archive=archive) as fetcher:
+            first = await fetcher.fetch_all([f"http://{host}/etag", f"http://{host}/page/0"])
+            second = await fetcher.fetch_all([f"http://{host}/etag", f"http://{host}/page/0"])
+            server.pages["/page/0"] = (b"<html>updated</html>", None)
+            third = await fetcher.fetch(f"http://{host}/page/0")
+            return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert all(r.status == 200 and r.changed for r in first)
+
+    etag, page = second
+    assert etag.status == 304 and etag.not_modified and not etag.changed
+    assert etag.body == b"<html>etag</html>"
+    assert page.status == 200 and not page.changed
+    assert third.changed and third.text == "<html>updated</html>"
+    assert archive.latest(f"http://{host}/etag").etag == '"v1"'
+
+
+def test_retry_after_then_offline_replay(server, tmp_path):
+    host, _ = _hosts(server)
+    fast = {host: DomainPolicy(min_interval=0.01)}
+    url = f"http://{host}/limited"
+
+    async def run():
+        async with AsyncFetcher(policies=fast, archive=RawArchive(tmp_path)) as fetcher:
+            online = await fetcher.fetch(url)
+            stats = dict(fetcher.stats)
+        async with AsyncFetcher(policies=fast, archive=RawArchive(tmp_path), offline=True) as fetcher:
+            return online, stats, await fetcher.fetch(url), await fetcher.fetch(url + "?missing")
+
+    online, stats, replay, missing = asyncio.run(run())
+    assert online.ok and online.body == b"ok"
+    assert stats["retries"] == 1
+    assert replay.from_archive and replay.body == b"ok"
+    assert missing.error == "not archived"
+    assert len(server.hits) == 2
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests du reparse offline sur l'archive brute
+
+Vérifie la déduplication des blobs (une page identique sur plusieurs jours
+n'est stockée et parsée qu'une fois), la sélection latest_only / fenêtre de
+dates, et l'exécution multi-process sans réseau.
+"""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+import sys
+sys.path.insert(0, '/home/Mon_ps')
+
+from services.scraping import reparse as rp
+from services.scraping.parsers import parse_understat_team_dates, parsers_for
+from services.scraping.raw_archive import RawArchive
+
+
+def _team_page(matches):
+    encoded = json.dumps(matches).replace('"', '\\x22')
+    return f"<script>var datesData = JSON.parse('{encoded}')</script>".encode()
+
+
+def _match(match_id, result=True):
+    return {"id": match_id, "isResult": result, "datetime": "2025-09-01 15:00:00",
+            "h": {"title": "Liverpool"}, "a": {"title": "Arsenal"},
+            "goals": {"h": "2", "a": "1"}, "xG": {"h": "1.8", "a": "0.9"}}
+
+
+def _day(day):
+    return datetime(2025, 9, day, 6, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = RawArchive(tmp_path)
+    team = "https://understat.com/team/Liverpool/2025"
+    league = "https://understat.com/getLeagueData/EPL/2025"
+    page_v1 = _team_page([_match("1"), _match("2", result=False)])
+    archive.put(team, page_v1, fetched_at=_day(1))
+    archive.put(team, page_v1, fetched_at=_day(2))
+    archive.put(team, _team_page([_match("1"), _match("2")]), fetched_at=_day(3))
+    archive.put(league, json.dumps({"dates": [{"id": "1"}], "teams": {"87": {"title": "Aston Villa"}}}).encode(),
+                fetched_at=_day(3))
+    return archive
+
+
+def test_team_page_parser():
+    records = parse_understat_team_dates(_team_page([_match("1"), _match("2", result=False)]))
+    assert records == [{
+        "match_id": "1", "date": "2025-09-01", "home_team": "Liverpool", "away_team": "Arsenal",
+        "home_goals": 2, "away_goals": 1, "home_xg": 1.8, "away_xg": 0.9,
+    }]
+    names = [p.name for p in parsers_for("https://understat.com/getLeagueData/EPL/2025")]
+    assert names == ["understat_league_matches", "understat_league_teams"]
+
+
+def test_identical_pages_stored_and_parsed_once(archive):
+    assert len(archive) == 4
+    assert len(list(archive.blob_dir.glob("*/*.gz"))) == 3
+
+    tasks, n_entries = rp.plan(archive, "https://understat.com/team/", until="2025-09-02",
+                               latest_only=False)
+    assert n_entries == 2
+    assert len(tasks) == 1 and len(tasks[0].sources) == 2
+
+    rows = list(rp.reparse(archive, tasks, workers=1))
+    assert [(r["fetch_date"], r["record"]["match_id"]) for r in rows] == [
+        ("2025-09-01", "1"), ("2025-09-02", "1")]
+
+
+def test_parallel_reparse_latest_versions(archive):
+    tasks, n_entries = rp.plan(archive)
+    assert n_entries == 2
+    stats = rp.ReparseStats()
+
+    rows = list(rp.reparse(archive, tasks, workers=2, stats=stats))
+    by_parser = {}
+    for row in rows:
+        by_parser.setdefault(row["parser"], []).append(row["record"])
+
+    assert [m["match_id"] for m in by_parser["understat_team_dates"]] == ["1", "2"]
+    assert by_parser["understat_league_teams"] == [{"id": "87", "title": "Aston Villa", "url_name": "Aston_Villa"}]
+    assert by_parser["understat_league_matches"] == [{"id": "1"}]
+    assert (stats.tasks, stats.records, stats.errors) == (3, 4, 0)
+
+
+def test_cli_writes_jsonl(archive, tmp_path):
+    out = tmp_path / "out.jsonl"
+    code = rp.main(["--archive", str(archive.root), "--parser", "understat_league_teams",
+                    "--workers", "1", "--out", str(out)])
+    assert code == 0
+    rows = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [r["record"]["url_name"] for r in rows] == ["Aston_Villa"]